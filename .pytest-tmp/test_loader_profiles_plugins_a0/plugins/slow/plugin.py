@@ -0,0 +1,21 @@
+
+import time
+
+from app.plugins.base import ScannerPlugin
+
+
+class SlowScanner(ScannerPlugin):
+    def activate(self, controller):
+        self._enabled = True
+        return True
+
+    def deactivate(self):
+        self._enabled = False
+        return True
+
+    def get_scan_types(self):
+        return ["slow"]
+
+    def scan(self, scan_type, params=None):
+        time.sleep((params or {}).get("sec", 0))
+        return []
@@ -0,0 +1,51 @@
+
+import socket
+import threading
+import time
+
+from app.plugins.base import ScannerPlugin
+
+
+class ProbePlugin(ScannerPlugin):
+    def activate(self, controller):
+        self.controller = controller
+        self.seen = []
+        self._enabled = True
+        return True
+
+    def deactivate(self):
+        return True
+
+    def get_scan_types(self):
+        return ["spin", "sleep", "status", "events", "thread_connect"]
+
+    def on_event(self, event, payload):
+        self.seen.append([event, payload])
+
+    def scan(self, scan_type, params=None):
+        params = params or {}
+        if scan_type == "spin":
+            end = time.thread_time() + params["sec"]
+            while time.thread_time() < end:
+                pass
+            return []
+        if scan_type == "sleep":
+            time.sleep(params["sec"])
+            return []
+        if scan_type == "status":
+            return [self.controller.get_status()]
+        if scan_type == "events":
+            return self.seen
+        if scan_type == "thread_connect":
+            out = {}
+
+            def run():
+                try:
+                    socket.socket().connect(("127.0.0.1", 9))
+                except Exception as e:
+                    out["error"] = type(e).__name__
+
+            worker = threading.Thread(target=run)
+            worker.start()
+            worker.join()
+            return [out]
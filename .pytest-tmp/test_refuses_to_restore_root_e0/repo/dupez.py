@@ -0,0 +1 @@
+# real launcher
@@ -0,0 +1 @@
+# legitimate source code
@@ -12,6 +12,7 @@ Usage::
     python -m app.cli status                        # Show engine status
     python -m app.cli devices                       # List known devices
     python -m app.cli plugins                       # List plugins
+    python -m app.cli plugins --profile             # Per-plugin hook timing
     python -m app.cli diagnostics                   # Run safe diagnostics
     python -m app.cli health --json                 # Unified network health
     python -m app.cli privacy scan                  # Inventory local private runtime data
@@ -291,6 +292,32 @@ def cmd_plugins(controller: Any, args: argparse.Namespace) -> None:
         status = "active" if p["active"] else ("error" if p.get("error") else "inactive")
         print(f"  {p['name']:<20} {p['version']:<10} {p['type']:<12} {status:<10} {p['description'][:40]}")
 
+    if getattr(args, "profile", False):
+        _print_plugin_profiles(info)
+
+
+def _print_plugin_profiles(info: list) -> None:
+    """Per-plugin hook timing table for ``plugins --profile``."""
+    for p in info:
+        profile = p.get("profile") or {}
+        hooks = profile.get("hooks") or {}
+        print(f"\n[*] {p['name']}: {profile.get('calls', 0)} call(s), "
+              f"{profile.get('total_ms', 0.0):.1f} ms total, "
+              f"budget soft {profile.get('soft_budget_ms', 0):g} ms / "
+              f"hard {profile.get('hard_budget_ms', 0):g} ms "
+              f"(scan/apply/remove: {profile.get('long_soft_budget_ms', 0):g} / "
+              f"{profile.get('long_hard_budget_ms', 0):g} ms)")
+        if profile.get("disabled"):
+            print(f"    DISABLED: {profile.get('disabled_reason')}")
+        if not hooks:
+            print("    (no calls recorded)")
+            continue
+        print(f"    {'Hook':<16} {'Calls':>7} {'Total ms':>10} {'Mean ms':>9} {'Max ms':>9} {'Soft':>5} {'Hard':>5}  Histogram")
+        for hook, h in sorted(hooks.items()):
+            buckets = " ".join(f"{k}:{v}" for k, v in h["histogram"].items() if v)
+            print(f"    {hook:<16} {h['calls']:>7} {h['total_ms']:>10.2f} {h['mean_ms']:>9.3f} "
+                  f"{h['max_ms']:>9.2f} {h['soft_overruns']:>5} {h['hard_overruns']:>5}  {buckets}")
+
 
 def cmd_diagnostics(controller: Any, args: argparse.Namespace) -> None:
     """Run safe diagnostics without starting the packet engine."""
@@ -999,7 +1026,12 @@ def main() -> None:
         help="Include active operation deadlines in machine-readable JSON",
     )
     subparsers.add_parser("devices", help="List known devices")
-    subparsers.add_parser("plugins", help="List plugins")
+    p_plugins = subparsers.add_parser("plugins", help="List plugins")
+    p_plugins.add_argument(
+        "--profile",
+        action="store_true",
+        help="Show per-hook call counts, timing and budget state",
+    )
 
     p_diag = subparsers.add_parser("diagnostics", help="Run safe diagnostics")
     p_diag.add_argument("--show-commands", action="store_true",
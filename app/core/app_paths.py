@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import json
 import os
 import shutil
@@ -110,19 +109,20 @@ class MigrationResult:
         }
 
 
-def _sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+def _sha256(path: Path, *, cached: bool = True) -> str:
+    from app.core.file_integrity import file_digest, hash_file
+
+    if cached:
+        return file_digest(path, "sha256")
+    return hash_file(path, ("sha256",))["sha256"]
 
 
 def _copy_verified(source: Path, destination: Path) -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
     tmp = destination.with_suffix(destination.suffix + ".migrating")
     shutil.copy2(source, tmp)
-    if _sha256(source) != _sha256(tmp):
+    # The temporary copy is renamed away next; don't cache it by path.
+    if _sha256(source) != _sha256(tmp, cached=False):
         tmp.unlink(missing_ok=True)
         raise OSError(f"verification failed for {source.name}")
     os.replace(tmp, destination)
@@ -45,7 +45,6 @@ import json
 import threading
 import time
 import urllib.error
-import urllib.request
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set
@@ -282,6 +281,28 @@ def _validate_webhook_url(url: str) -> str:
 
 # ── Sink base + concrete sinks ───────────────────────────────────────
 
+def _post_webhook(url: str, body: bytes, timeout: float) -> None:
+    """POST *body* as JSON over a pooled ``secure_http`` connection.
+
+    *url* already passed :func:`_validate_webhook_url`, which is stricter
+    than ``validate_url`` except that it allows localhost relays, so the
+    generic check is skipped here.
+    """
+    from app.core.secure_http import secure_request
+
+    secure_request(
+        "POST", url,
+        headers={
+            "Content-Type": "application/json",
+            "User-Agent": "DupeZ-AuditWebhook/1.0",
+        },
+        body=body,
+        timeout=timeout,
+        max_bytes=64 * 1024,
+        validate=False,
+    )
+
+
 class AuditSink(ABC):
     """Base class. Subclasses override :meth:`_post`."""
 
@@ -346,23 +367,12 @@ class GenericWebhookSink(AuditSink):
             "payload": payload,
             "ts": time.time(),
         }).encode("utf-8")
-        req = urllib.request.Request(
-            self.url,
-            data=body,
-            headers={
-                "Content-Type": "application/json",
-                "User-Agent": "DupeZ-AuditWebhook/1.0",
-            },
-            method="POST",
-        )
         try:
-            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
-                if resp.status >= 400:
-                    log_warning(
-                        f"GenericWebhookSink HTTP {resp.status} from {self.url}"
-                    )
+            _post_webhook(self.url, body, self._timeout)
+        except urllib.error.HTTPError as exc:
+            log_warning(f"GenericWebhookSink HTTP {exc.code} from {self.url}")
         except urllib.error.URLError as exc:
-            log_warning(f"GenericWebhookSink urlopen failed: {exc}")
+            log_warning(f"GenericWebhookSink request failed: {exc}")
 
 
 class DiscordWebhookSink(AuditSink):
@@ -416,23 +426,12 @@ class DiscordWebhookSink(AuditSink):
         }
         if self._avatar_url:
             body["avatar_url"] = self._avatar_url
-        req = urllib.request.Request(
-            self.url,
-            data=json.dumps(body).encode("utf-8"),
-            headers={
-                "Content-Type": "application/json",
-                "User-Agent": "DupeZ-AuditWebhook/1.0",
-            },
-            method="POST",
-        )
         try:
-            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
-                if resp.status >= 400:
-                    log_warning(
-                        f"DiscordWebhookSink HTTP {resp.status}"
-                    )
+            _post_webhook(self.url, json.dumps(body).encode("utf-8"), self._timeout)
+        except urllib.error.HTTPError as exc:
+            log_warning(f"DiscordWebhookSink HTTP {exc.code}")
         except urllib.error.URLError as exc:
-            log_warning(f"DiscordWebhookSink urlopen failed: {exc}")
+            log_warning(f"DiscordWebhookSink request failed: {exc}")
 
 
 # ── Registry + emit helper ───────────────────────────────────────────
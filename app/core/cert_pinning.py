@@ -71,6 +71,7 @@ __all__ = [
     "spki_hash",
     "chain_spki_hashes",
     "enforce_pin",
+    "peer_chain_ders",
     "pinned_https_open",
     "capture_chain_for_host",
 ]
@@ -165,6 +166,23 @@ def _audit_observed(host: str, observed: List[str], *, decision: str) -> None:
 
 # ── HTTPS connector with post-handshake pin enforcement ──────────────
 
+def peer_chain_ders(sock: ssl.SSLSocket) -> List[bytes]:
+    """DER certs the peer presented on *sock*: the verified chain when the
+    stdlib exposes it, else just the leaf (still useful for leaf pinning)."""
+    chain_ders: List[bytes] = []
+    try:
+        leaf = sock.getpeercert(binary_form=True)
+        if leaf:
+            chain_ders.append(leaf)
+        getter = getattr(sock, "get_verified_chain", None)
+        if callable(getter):
+            full = getter()
+            chain_ders = list(full) if full else chain_ders
+    except (AttributeError, OSError):
+        pass
+    return chain_ders
+
+
 def pinned_https_open(
     url: str,
     *,
@@ -210,22 +228,7 @@ def pinned_https_open(
     )
     try:
         conn.connect()
-        sock = conn.sock
-        chain_ders: List[bytes] = []
-        try:
-            # leaf cert
-            leaf = sock.getpeercert(binary_form=True)
-            if leaf:
-                chain_ders.append(leaf)
-            # In some stdlib versions get_verified_chain() exists; if
-            # so, use it for the full chain. Otherwise we only have
-            # the leaf, which is still useful for leaf-key pinning.
-            getter = getattr(sock, "get_verified_chain", None)
-            if callable(getter):
-                full = getter()
-                chain_ders = list(full) if full else chain_ders
-        except (AttributeError, OSError):
-            pass
+        chain_ders = peer_chain_ders(conn.sock)
 
         try:
             enforce_pin(host, chain_ders)
@@ -22,10 +22,12 @@ from app.core.cut_chain import (
 from app.core.operation_journal import OperationJournal
 from app.core.safety_policy import SafetyPolicy
 from app.core.scheduler import DisruptionScheduler
+from app.core.status_bus import StatusBus
 from app.core.state import AppSettings, AppState, Device
 from app.firewall import blocker
 from app.logs.logger import log_error, log_info, log_network_scan
 from app.network import device_scan
+from app.network.inventory import DeviceInventory, get_inventory
 from app.plugins.loader import PluginLoader
 from app.utils.helpers import mask_ip
 
@@ -122,6 +124,7 @@ class AppController:
         *,
         disruption_manager: Any = None,
         device_cache: Any = None,
+        device_inventory: Optional[DeviceInventory] = None,
         save_all: Optional[Callable[[], bool]] = None,
         state: Optional[AppState] = None,
         plugin_loader: Any = None,
@@ -144,6 +147,7 @@ class AppController:
         if self.safety_policy.dry_run:
             disruption_manager = disruption_manager or _DryRunManager()
             device_cache = device_cache or _DryRunCache()
+            device_inventory = device_inventory or DeviceInventory(store=None)
             save_all = save_all or (lambda: True)
             plugin_loader = plugin_loader or _InactiveService()
 
@@ -159,6 +163,7 @@ class AppController:
 
         self._disruption_manager = disruption_manager
         self._device_cache = device_cache
+        self._device_inventory = device_inventory
         self._save_all = save_all
         self._lifecycle_lock = threading.Lock()
         self._started = False
@@ -192,6 +197,9 @@ class AppController:
         self.plugin_loader = (
             plugin_loader if plugin_loader is not None else PluginLoader()
         )
+        # Shared sampler for GUI/overlay status consumers; starts on the
+        # first subscription.
+        self.status_bus = StatusBus.for_controller(self)
         if auto_start:
             self.start()
 
@@ -201,6 +209,12 @@ class AppController:
             if self._started:
                 return
             try:
+                if not self.safety_policy.dry_run:
+                    # Verify plugin signatures while the engine comes up;
+                    # _init_plugins() picks up the result.
+                    prefetch = getattr(self.plugin_loader, "start_discovery", None)
+                    if callable(prefetch):
+                        prefetch()
                 self._load_device_cache()
                 self._init_engine()
                 if self.safety_policy.dry_run:
@@ -643,8 +657,13 @@ class AppController:
             ),
         }
 
-    def get_active_operations(self) -> List[Dict[str, Any]]:
-        """Return active scope and deadline state without raw parameters."""
+    def get_active_operations(self, *, detail: bool = False) -> List[Dict[str, Any]]:
+        """Return active scope and deadline state without raw parameters.
+
+        ``detail=True`` also carries the unmasked ``ip`` and the
+        ``preset`` name, for in-process consumers (the status bus and the
+        overlay) that join on the address and mask it when rendering.
+        """
         from app.core.scenario_report import fingerprint_params
 
         now_unix = time.time()
@@ -674,6 +693,9 @@ class AppController:
                 "automatic_stop_armed": deadline["automatic_stop_armed"],
                 "process_running": bool(status.get("process_running", False)),
             })
+            if detail:
+                operations[-1]["ip"] = ip
+                operations[-1]["preset"] = (status.get("params") or {}).get("_preset")
         return sorted(operations, key=lambda item: item["target"])
 
     def get_clumsy_status(self) -> Dict:
@@ -717,11 +739,16 @@ class AppController:
 
     # ── Device scanning ───────────────────────────────────────────
 
-    def scan_devices(self, quick: bool = True) -> List[Dict]:
+    def scan_devices(
+        self, quick: bool = True,
+        on_device: Optional[Callable[[Dict], None]] = None,
+    ) -> List[Dict]:
         """Scan for devices on the local network.
 
         Called from a background thread in the GUI, so we call
-        ``scan_network()`` synchronously here.
+        ``scan_network()`` synchronously here. *on_device* receives each
+        real device as the scanner finds it (and again when its details
+        resolve), before the final list is returned.
         """
         start_time = time.time()
         try:
@@ -733,14 +760,21 @@ class AppController:
 
             # Lazy import — EnhancedNetworkScanner is heavy and depends on Qt
             from app.network.enhanced_scanner import EnhancedNetworkScanner
-            scanner = EnhancedNetworkScanner()
+            inventory = self._device_inventory or get_inventory()
+            scanner = EnhancedNetworkScanner(inventory=inventory)
+            if on_device is not None:
+                def _relay(device: Dict) -> None:
+                    if self._is_real_device(device):
+                        on_device(device)
+                scanner.device_found.connect(_relay)
+                scanner.device_updated.connect(_relay)
             devices = scanner.scan_network(quick_scan=quick)
 
             real_devices = [d for d in devices if self._is_real_device(d)]
             for d in real_devices:
                 log_info(f"Found device: {mask_ip(d['ip'])} — {d.get('hostname', 'Unknown')}")
 
-            self.state.update_devices(real_devices)
+            self.state.apply_device_changes(inventory.record_scan(real_devices))
             self._save_device_cache(real_devices)
 
             duration = time.time() - start_time
@@ -983,9 +1017,25 @@ class AppController:
 
     # ── Shutdown ──────────────────────────────────────────────────
 
+    @staticmethod
+    def _log_query_cache_stats() -> None:
+        """Report how many system-query spawns the shared cache saved."""
+        try:
+            from app.core.query_cache import get_query_cache
+            stats = get_query_cache().stats()
+        except Exception:
+            return
+        if stats["spawns"] or stats["saved"]:
+            log_info(
+                f"System query cache: {stats['saved']} spawn(s) saved this session "
+                f"({stats['hits']} cached, {stats['coalesced']} coalesced, "
+                f"{stats['spawns']} spawned)"
+            )
+
     def shutdown(self) -> None:
-        """Graceful shutdown: plugins → scan → scheduler → engine → save."""
+        """Graceful shutdown: status bus → plugins → scan → scheduler → engine → save."""
         with self._lifecycle_lock:
+            self.status_bus.stop()
             if not self._started:
                 self.stop_automatic_workflow()
                 return
@@ -1014,6 +1064,7 @@ class AppController:
                 except Exception as exc:
                     errors.append(f"{name}: {exc}")
                     log_error(f"Shutdown step failed ({name}): {exc}")
+            self._log_query_cache_stats()
             self._started = False
             if errors:
                 log_error(
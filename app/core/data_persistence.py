@@ -508,6 +508,17 @@ class CollectionManager(AutoSaveMixin):
         self.items.append(item)
         self.save_changes(self.items)
 
+    def extend(self, items: List[Dict]) -> None:
+        """Append every item in *items* and persist once.
+
+        Bulk paths (CSV/XLSX import) use this instead of calling
+        :meth:`add` per row, which would rewrite the file each time.
+        """
+        if not items:
+            return
+        self.items.extend(items)
+        self.save_changes(self.items)
+
     def update(self, key_value: str, updates: Dict) -> None:
         """Update the first item whose key field matches *key_value*."""
         for item in self.items:
@@ -572,6 +583,9 @@ class AccountManager(CollectionManager):
     def add_account(self, a: Dict) -> None:
         self.add(a)
 
+    def add_accounts(self, accounts: List[Dict]) -> None:
+        self.extend(accounts)
+
     def update_account(self, name: str, u: Dict) -> None:
         self.update(name, u)
 
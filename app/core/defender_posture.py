@@ -150,9 +150,9 @@ $latest = $detections | Select-Object -First 1
 }} | ConvertTo-Json -Compress
 """
     try:
-        from app.core import safe_subprocess
+        from app.core.query_cache import run_query
 
-        result = safe_subprocess.run(
+        result = run_query(
             [str(powershell), "-NoProfile", "-NonInteractive", "-Command", script],
             timeout=8,
             expect_returncode=(0,),
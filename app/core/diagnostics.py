@@ -132,10 +132,20 @@ def _check_windivert_files() -> CheckResult:
 
     missing = [n for n, p in candidates if not (p and os.path.exists(p))]
     if not missing:
+        # Short SHA-256s to compare against the published release hashes.
+        # Cached by file identity, so repeat runs cost a stat per file.
+        try:
+            from app.core.file_integrity import file_digest
+            hashes = ", ".join(
+                f"{n} sha256={file_digest(p, 'sha256')[:16]}" for n, p in candidates
+            )
+            detail = f" ({hashes})"
+        except OSError:
+            detail = ""
         return CheckResult(
             name="WinDivert driver",
             status=CheckStatus.PASS,
-            message="WinDivert.dll + WinDivert64.sys present",
+            message=f"WinDivert.dll + WinDivert64.sys present{detail}",
         )
     return CheckResult(
         name="WinDivert driver",
@@ -477,6 +487,56 @@ def _check_episode_store() -> CheckResult:
         )
 
 
+def _check_dayz_servers() -> CheckResult:
+    """Query configured favorites/known servers concurrently over A2S
+    (through the shared A2S cache, so a recent answer is reused)."""
+    try:
+        from app.network.a2s_cache import get_a2s_cache
+        from app.network.a2s_engine import configured_servers
+
+        targets = configured_servers()
+        if not targets:
+            return CheckResult(
+                name="DayZ server reachability",
+                status=CheckStatus.PASS,
+                message="no favorite or known servers configured",
+            )
+        results = get_a2s_cache().get_info_many(targets)
+        up = [r for r in results if r.reachable]
+        if not up:
+            return CheckResult(
+                name="DayZ server reachability",
+                status=CheckStatus.WARN,
+                message=f"none of {len(results)} configured server(s) answered A2S_INFO",
+                fix_hint=(
+                    "Check the query ports in dayz_servers.json (the Steam "
+                    "query port, not the game port) and that outbound UDP "
+                    "is allowed. Some hosts disable the query port entirely."
+                ),
+            )
+        fastest = up[0]
+        down = [f"{r.host}:{r.port}" for r in results if not r.reachable]
+        return CheckResult(
+            name="DayZ server reachability",
+            status=CheckStatus.PASS if not down else CheckStatus.WARN,
+            message=(
+                f"{len(up)}/{len(results)} server(s) answered; fastest "
+                f"{fastest.snapshot.server_name!r} in {fastest.rtt_ms:.0f} ms"
+                + (f"; no answer from {', '.join(down[:5])}" if down else "")
+            ),
+            fix_hint="" if not down else (
+                "Unanswered servers may be offline, rate-limiting queries, "
+                "or listed with the game port instead of the query port."
+            ),
+        )
+    except Exception as exc:
+        return CheckResult(
+            name="DayZ server reachability",
+            status=CheckStatus.WARN,
+            message=f"check failed: {exc}",
+        )
+
+
 def _check_operation_journal() -> CheckResult:
     """Report whether a prior run left network state requiring recovery."""
     try:
@@ -694,6 +754,11 @@ ALL_CHECKS: List[DiagnosticCheck] = [
         description="Verify the episode recorder data directory",
         runner=_check_episode_store,
     ),
+    DiagnosticCheck(
+        name="dayz_servers",
+        description="Query configured DayZ servers over A2S, concurrently",
+        runner=_check_dayz_servers,
+    ),
 ]
 
 
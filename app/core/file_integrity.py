@@ -0,0 +1,340 @@
+"""
+Process-wide file digest service with a persistent, HMAC-sealed cache.
+
+Several places hash whole files to check them against a pinned value:
+the running executable (:mod:`app.core.self_verify`), plugin entry
+points (:mod:`app.plugins.signing`), a downloaded installer
+(:mod:`app.core.update_verify`), migrated user data
+(:mod:`app.core.app_paths`) and the bundled WinDivert binaries
+(:mod:`app.core.diagnostics`). They all go through this module.
+
+* :func:`hash_file` streams a file once through any number of hashlib
+  digests. Files of :data:`MMAP_THRESHOLD` bytes or more are
+  memory-mapped and fed to the digests in large slices (hashlib
+  releases the GIL for those), so no Python-level copy of the data is
+  made.
+* :class:`IntegrityCache` remembers digests per file together with the
+  file's identity ``(size, mtime_ns, ctime_ns, inode / file index,
+  device)``. An unchanged file costs one ``stat``; any change is a miss
+  and the file is re-hashed. The identity is taken before hashing and
+  re-checked after, so a file rewritten mid-hash is never recorded.
+
+Persistence
+-----------
+Records are written to ``<user_root>/cache/file_integrity.json``, each
+sealed with HMAC-SHA384 under a per-install key from
+:mod:`app.core.secret_store` (``kind="core.file_integrity.hmac"``).
+Records whose MAC does not verify are dropped at load, so editing the
+cache file cannot make a modified file pass. Without a secret store the
+cache still works for the life of the process, it just is not saved.
+
+The residual gap is the one :mod:`app.plugins.verify_cache` documents:
+a same-user writer that restores size, mtime, inode AND ctime. ctime
+cannot be set from user space on POSIX.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import hmac
+import json
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from app.logs.logger import log_warning
+
+__all__ = [
+    "CACHE_SECRET_KIND",
+    "FileTooLargeError",
+    "IntegrityCache",
+    "MMAP_THRESHOLD",
+    "file_digest",
+    "file_digests",
+    "file_identity",
+    "get_integrity_cache",
+    "hash_file",
+]
+
+CACHE_SECRET_KIND = "core.file_integrity.hmac"
+CACHE_SCHEMA = "dupez.file-integrity-cache.v1"
+MAX_RECORDS = 4096
+
+# Below this a buffered read is as fast as a mapping and cheaper to set up.
+MMAP_THRESHOLD = 4 * 1024 * 1024
+_READ_CHUNK = 1024 * 1024
+_MMAP_SLICE = 8 * 1024 * 1024
+
+PathLike = Union[str, "os.PathLike[str]"]
+Identity = Tuple[int, int, int, int, int]
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a file exceeds the caller's ``max_bytes`` cap."""
+
+
+def file_identity(path: PathLike) -> Optional[Identity]:
+    """``(size, mtime_ns, ctime_ns, inode, device)`` of *path*, or None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino, st.st_dev)
+
+
+def _check_size(path: PathLike, size: int, max_bytes: Optional[int]) -> None:
+    if max_bytes is not None and size > max_bytes:
+        raise FileTooLargeError(
+            f"{os.path.basename(path)} exceeds {max_bytes} bytes"
+        )
+
+
+def hash_file(
+    path: PathLike,
+    algorithms: Iterable[str] = ("sha256",),
+    *,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, str]:
+    """Hex digests of *path* for every hashlib name in *algorithms*.
+
+    The file is read once whatever the number of digests. Raises
+    :class:`OSError` if it cannot be read and :class:`FileTooLargeError`
+    if it is (or grows while being read) larger than *max_bytes*.
+    """
+    hashers = {name: hashlib.new(name) for name in dict.fromkeys(algorithms)}
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        _check_size(path, size, max_bytes)
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, len(view), _MMAP_SLICE):
+                        piece = view[start:start + _MMAP_SLICE]
+                        for h in hashers.values():
+                            h.update(piece)
+                        piece.release()
+                finally:
+                    view.release()
+        else:
+            buf = bytearray(_READ_CHUNK)
+            view = memoryview(buf)
+            total = 0
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                total += n
+                _check_size(path, total, max_bytes)
+                for h in hashers.values():
+                    h.update(view[:n])
+    return {name: h.hexdigest() for name, h in hashers.items()}
+
+
+class IntegrityCache:
+    """``file identity -> {algorithm: digest}`` records, shared process-wide.
+
+    Thread-safe. Records live in memory for the whole process; with a
+    *path* and *key* they are also loaded from and saved to disk.
+    """
+
+    def __init__(self, path: Optional[Path] = None, key: Optional[bytes] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._key = bytes(key) if key else None
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.bytes_hashed = 0
+        if self.persistent:
+            self._load()
+
+    @classmethod
+    def load_default(cls) -> "IntegrityCache":
+        """Cache under ``user_root()/cache``; memory-only if no key is available."""
+        try:
+            from app.core.app_paths import user_root
+            from app.core.secret_store import get_or_create_secret
+
+            key = get_or_create_secret(CACHE_SECRET_KIND)
+            return cls(user_root() / "cache" / "file_integrity.json", key)
+        except Exception as e:
+            log_warning(
+                f"File integrity cache not persisted ({type(e).__name__}); "
+                "digests are kept for this session only"
+            )
+            return cls()
+
+    @property
+    def persistent(self) -> bool:
+        return self.path is not None and self._key is not None
+
+    # ── Lookups ──────────────────────────────────────────────────
+
+    def digests(
+        self,
+        path: PathLike,
+        algorithms: Iterable[str] = ("sha256",),
+        *,
+        max_bytes: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Cached :func:`hash_file`; reads the file only when it changed
+        or when an algorithm was not asked for before."""
+        wanted = list(dict.fromkeys(algorithms))
+        name = os.path.realpath(path)
+        ident = file_identity(name)
+        if ident is None:
+            # Let the open() below raise the real error.
+            return hash_file(name, wanted, max_bytes=max_bytes)
+        _check_size(name, ident[0], max_bytes)
+        with self._lock:
+            record = self._records.get(name)
+            known = record["digests"] if record and record["id"] == ident else {}
+            if all(a in known for a in wanted):
+                self.hits += 1
+                return {a: known[a] for a in wanted}
+            self.misses += 1
+        missing = [a for a in wanted if a not in known]
+        fresh = hash_file(name, missing, max_bytes=max_bytes)
+        with self._lock:
+            self.bytes_hashed += ident[0]
+        if file_identity(name) == ident:
+            self._store(name, ident, {**known, **fresh})
+        return {a: known.get(a) or fresh[a] for a in wanted}
+
+    def digest(
+        self,
+        path: PathLike,
+        algorithm: str = "sha256",
+        *,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        return self.digests(path, (algorithm,), max_bytes=max_bytes)[algorithm]
+
+    def forget(self, path: PathLike) -> None:
+        with self._lock:
+            if self._records.pop(os.path.realpath(path), None) is not None:
+                self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "records": len(self._records),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_hashed": self.bytes_hashed,
+                "persistent": self.persistent,
+            }
+
+    def _store(self, name: str, ident: Identity, digests: Dict[str, str]) -> None:
+        with self._lock:
+            self._records.pop(name, None)
+            self._records[name] = {"id": ident, "digests": digests}
+            while len(self._records) > MAX_RECORDS:
+                self._records.pop(next(iter(self._records)))
+            self._dirty = True
+
+    # ── Persistence ──────────────────────────────────────────────
+
+    def _mac(self, name: str, ident: Any, digests: Dict[str, str]) -> str:
+        assert self._key is not None
+        payload = json.dumps(
+            [CACHE_SCHEMA, name, list(ident), sorted(digests.items())],
+            separators=(",", ":"),
+        ).encode("utf-8")
+        return hmac.new(self._key, payload, hashlib.sha384).hexdigest()
+
+    def _load(self) -> None:
+        assert self.path is not None
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log_warning(f"File integrity cache unreadable, rebuilding: {e}")
+            return
+        if not (
+            isinstance(raw, dict)
+            and raw.get("schema") == CACHE_SCHEMA
+            and isinstance(raw.get("records"), dict)
+        ):
+            return
+        for name, record in raw["records"].items():
+            try:
+                ident = tuple(int(v) for v in record["id"])
+                digests = {str(k): str(v) for k, v in record["digests"].items()}
+                mac = record["mac"]
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+            if len(ident) == 5 and isinstance(mac, str) and hmac.compare_digest(
+                mac, self._mac(name, ident, digests)
+            ):
+                self._records[name] = {"id": ident, "digests": digests}
+
+    def save(self) -> None:
+        """Write the records back if anything changed (atomic replace)."""
+        if not self.persistent:
+            return
+        assert self.path is not None
+        with self._lock:
+            if not self._dirty:
+                return
+            records = {
+                name: {
+                    "id": list(r["id"]),
+                    "digests": r["digests"],
+                    "mac": self._mac(name, r["id"], r["digests"]),
+                }
+                for name, r in self._records.items()
+            }
+            self._dirty = False
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(
+                json.dumps({"schema": CACHE_SCHEMA, "records": records}),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log_warning(f"File integrity cache not saved: {e}")
+
+
+_cache: Optional[IntegrityCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_integrity_cache() -> IntegrityCache:
+    """The process-wide cache, loaded on first use and saved at exit."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cache = IntegrityCache.load_default()
+                atexit.register(cache.save)
+                _cache = cache
+    return _cache
+
+
+def file_digests(
+    path: PathLike,
+    algorithms: Iterable[str] = ("sha256",),
+    *,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, str]:
+    """:meth:`IntegrityCache.digests` on the process-wide cache."""
+    return get_integrity_cache().digests(path, algorithms, max_bytes=max_bytes)
+
+
+def file_digest(
+    path: PathLike,
+    algorithm: str = "sha256",
+    *,
+    max_bytes: Optional[int] = None,
+) -> str:
+    """:meth:`IntegrityCache.digest` on the process-wide cache."""
+    return get_integrity_cache().digest(path, algorithm, max_bytes=max_bytes)
@@ -14,7 +14,7 @@ from app.core.diagnostics import CheckStatus, run_all_checks
 from app.core.operation_journal import OperationJournal
 from app.core.operator_acknowledgement import acknowledgement_status
 from app.core.updater import CURRENT_VERSION
-from app.utils.helpers import mask_ips_in_text, mask_macs_in_text
+from app.utils.helpers import mask_ip, mask_ips_in_text, mask_macs_in_text
 
 SCHEMA = "dupez.network-health.v1"
 
@@ -98,6 +98,28 @@ def _collect_route_summary() -> Dict[str, Any]:
         }
 
 
+def _collect_latency_summary() -> Dict[str, Any]:
+    """Rolling RTT stats for targets the shared latency sampler is watching.
+
+    Never starts the sampler: a health report should not begin probing.
+    """
+    try:
+        from app.network.latency_probe import peek_latency_service
+
+        service = peek_latency_service()
+        if service is None:
+            return {"available": False, "icmp": None, "targets": []}
+        targets = []
+        for label, stats in sorted(service.snapshot().items()):
+            entry = stats.to_dict()
+            ip, _, port = label.partition(":")
+            entry["target"] = mask_ip(ip) + (f":{port}" if port else "")
+            targets.append(entry)
+        return {"available": True, "icmp": service.icmp_mode, "targets": targets}
+    except Exception as exc:
+        return {"available": False, "error": _sanitize(str(exc)), "targets": []}
+
+
 def _collect_safety_summary() -> Dict[str, Any]:
     summary: Dict[str, Any] = {
         "acknowledgement": acknowledgement_status(),
@@ -169,6 +191,7 @@ def build_network_health_snapshot() -> Dict[str, Any]:
         "network": {
             "adapters": _collect_adapter_summary(),
             "default_route": _collect_route_summary(),
+            "latency": _collect_latency_summary(),
         },
         "safety": _collect_safety_summary(),
         "recovery": {
@@ -41,6 +41,14 @@ Privacy:
 * IP fields are masked the same way the audit log masks them.
 * No write endpoints — read-only.
 
+Data source:
+
+* With a controller that owns a status bus (``app.core.status_bus``),
+  a running server subscribes to the operations + engine-stats fields
+  at 1 Hz and every ``/state`` request renders the bus's latest
+  snapshot — browser polls never reach the controller or the helper
+  pipe. Stand-ins without a bus fall back to ``disrupted_devices``.
+
 Threading:
 
 * :class:`OverlayServer.start` spawns a daemon thread running a
@@ -57,6 +65,14 @@ import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Dict, Optional
 
+from app.core.status_bus import (
+    FIELD_ENGINE_STATS,
+    FIELD_OPERATIONS,
+    StatusBus,
+    StatusSnapshot,
+    StatusSubscription,
+    get_status_bus,
+)
 from app.logs.logger import log_error, log_info, log_warning
 
 
@@ -135,12 +151,16 @@ tick(); setInterval(tick, 1000);
 
 # ── State snapshot ───────────────────────────────────────────────────
 
-def build_state_snapshot(controller: Any) -> Dict[str, Any]:
+def build_state_snapshot(
+    controller: Any,
+    status: Optional[StatusSnapshot] = None,
+) -> Dict[str, Any]:
     """Render the current disruption state as a JSON-ready dict.
 
-    Pulls from ``controller.disrupted_devices`` (the live dict
-    maintained by the disruption manager) and adds the risk score
-    on top. Never raises — failures degrade fields to safe defaults.
+    Renders from *status* (a status-bus snapshot) when given, otherwise
+    from ``controller.disrupted_devices`` (the live dict maintained by
+    the in-process disruption manager), and adds the risk score on top.
+    Never raises — failures degrade fields to safe defaults.
     """
     try:
         from app.utils.helpers import mask_ip
@@ -157,11 +177,15 @@ def build_state_snapshot(controller: Any) -> Dict[str, Any]:
     }
 
     # Active disruptions.
-    try:
-        devices = getattr(controller, "disrupted_devices", {}) or {}
-    except Exception:
-        devices = {}
     now = snapshot["now"]
+    if status is not None:
+        snapshot["active_targets"] = _targets_from_status(status, now, mask_ip)
+        devices = {}
+    else:
+        try:
+            devices = getattr(controller, "disrupted_devices", {}) or {}
+        except Exception:
+            devices = {}
     for ip, info in devices.items():
         try:
             engine = info.get("engine")
@@ -196,9 +220,46 @@ def build_state_snapshot(controller: Any) -> Dict[str, Any]:
     return snapshot
 
 
+def _targets_from_status(
+    status: StatusSnapshot,
+    now: float,
+    mask_ip: Any,
+) -> list:
+    """Join bus operations with per-device engine stats.
+
+    The join is on the raw IP each operation carries; masked addresses
+    collide (every host in a /24 masks alike), so they are only
+    produced here, for display.
+    """
+    targets = []
+    stats = status.get(FIELD_ENGINE_STATS) or {}
+    per_device = stats.get("per_device") or {}
+    for op in status.get(FIELD_OPERATIONS) or ():
+        try:
+            ip = op.get("ip")
+            dev = (per_device.get(ip) if ip else None) or {}
+            started_at = op.get("started_at") or now
+            targets.append({
+                "target_ip": mask_ip(str(ip)) if ip else str(op.get("target") or ""),
+                "preset": op.get("preset") or "?",
+                "methods": list(op.get("methods") or ()),
+                "started_at": started_at,
+                "duration_s": round(now - started_at, 1),
+                "cut_state": dev.get("cut_state", "unknown"),
+                "packets_processed": int(dev.get("packets_processed", 0) or 0),
+                "packets_dropped": int(dev.get("packets_dropped", 0) or 0),
+            })
+        except Exception as exc:
+            log_warning(f"overlay: status target render failed: {exc}")
+    return targets
+
+
 # ── HTTP server ──────────────────────────────────────────────────────
 
-def _make_handler_class(controller: Any) -> type:
+def _make_handler_class(
+    controller: Any,
+    status_bus: Optional[StatusBus] = None,
+) -> type:
     """Build a per-server handler class with the controller closure-bound.
 
     Avoids the multi-instance hazard of attaching the controller as a
@@ -210,11 +271,16 @@ def _make_handler_class(controller: Any) -> type:
         """Read-only HTTP handler."""
 
         _controller = controller
+        _status_bus = status_bus
 
         def do_GET(self) -> None:  # noqa: N802 — http.server API
             if self.path.startswith("/state"):
+                bus = self._status_bus
                 body = json.dumps(
-                    build_state_snapshot(self._controller)
+                    build_state_snapshot(
+                        self._controller,
+                        bus.latest() if bus is not None else None,
+                    )
                 ).encode("utf-8")
                 self._send(200, "application/json", body)
             elif self.path.startswith("/overlay.html") or self.path == "/":
@@ -283,6 +349,7 @@ class OverlayServer:
         self._port = int(port)
         self._server: Optional[ThreadingHTTPServer] = None
         self._thread: Optional[threading.Thread] = None
+        self._status_subscription: Optional[StatusSubscription] = None
 
     @property
     def base_url(self) -> str:
@@ -306,7 +373,12 @@ class OverlayServer:
         """
         if self._server is not None:
             return True
-        handler_cls = _make_handler_class(self._controller)
+        bus = get_status_bus(self._controller)
+        if bus is not None and not {
+            FIELD_OPERATIONS, FIELD_ENGINE_STATS,
+        }.issubset(bus.fields):
+            bus = None
+        handler_cls = _make_handler_class(self._controller, bus)
         try:
             self._server = _NoReuseThreadingHTTPServer(
                 (self._host, self._port), handler_cls
@@ -323,6 +395,14 @@ class OverlayServer:
             daemon=True, name="OverlayServer"
         )
         self._thread.start()
+        if bus is not None:
+            # No-op callback: the subscription only registers demand so
+            # the sampler keeps these fields fresh for /state requests.
+            self._status_subscription = bus.subscribe(
+                lambda _update: None,
+                (FIELD_OPERATIONS, FIELD_ENGINE_STATS),
+                max_rate_hz=1.0,
+            )
         log_info(
             f"OverlayServer listening on {self.base_url}/overlay.html"
         )
@@ -331,6 +411,9 @@ class OverlayServer:
     def stop(self) -> None:
         if self._server is None:
             return
+        if self._status_subscription is not None:
+            self._status_subscription.close()
+            self._status_subscription = None
         try:
             self._server.shutdown()
             self._server.server_close()
@@ -373,12 +373,13 @@ class PatchMonitor:
     def _fetch_news(self) -> List[PatchInfo]:
         """Fetch latest DayZ news from Steam Web API.
 
-        Uses ``secure_get_json`` for TLS-enforced, validated HTTP.
+        Uses ``secure_get_json`` for TLS-enforced, validated HTTP, with
+        the conditional-request cache so an unchanged feed costs a 304.
         """
         try:
             from app.core.secure_http import secure_get_json
 
-            data = secure_get_json(_STEAM_NEWS_URL)
+            data = secure_get_json(_STEAM_NEWS_URL, use_cache=True)
             if data is None:
                 log_error("PatchMonitor: Steam API returned no data")
                 return []
@@ -0,0 +1,245 @@
+# app/core/query_cache.py — TTL / single-flight layer over safe_subprocess
+"""Shared cache for idempotent system-query subprocesses.
+
+Several subsystems ask Windows the same questions within seconds of each
+other — ``arp -a`` (device scan, enhanced scanner, discovery engine),
+the gateway / adapter queries behind ARP spoofing, ``netsh`` firewall
+and forwarding state, and the PowerShell Defender query, whose start-up
+alone costs about a second. Each ask used to be a fresh process.
+
+:func:`run_query` is a drop-in for :func:`app.core.safe_subprocess.run`
+on such queries:
+
+* results are keyed by ``(argv, intent)`` and reused for the intent's
+  TTL from :data:`QUERY_TTLS` (intents not listed there get no reuse,
+  only coalescing); callers needing fresher data pass ``max_age``;
+* concurrent identical requests share one process — the first caller
+  spawns it, the rest wait for its result (or its exception);
+* code that changes what a query would report (adding a firewall rule,
+  toggling forwarding, priming the ARP cache) calls :func:`invalidate`
+  with the affected intents; an answer still in flight when that
+  happens is handed to its waiters but not stored;
+* every real spawn is still audited by ``safe_subprocess``; answers
+  served without one are audited as ``subprocess_cache_hit``.
+
+Each caller's ``expect_returncode`` is checked against the shared
+result, so callers with different expectations can share one spawn.
+:meth:`SubprocessQueryCache.stats` counts spawns and spawns saved; the
+controller logs the session total on shutdown.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from app.core import safe_subprocess
+from app.core.safe_subprocess import SubprocessResult
+
+__all__ = [
+    "ARP_TABLE",
+    "QUERY_TTLS",
+    "SubprocessQueryCache",
+    "get_query_cache",
+    "invalidate",
+    "run_query",
+]
+
+# Shared intent for full ARP-table reads, so every scanner's ``arp -a``
+# lands on the same cache entry.
+ARP_TABLE = "system_query.arp_table"
+
+# Seconds a result stays reusable, per intent.
+QUERY_TTLS: Dict[str, float] = {
+    ARP_TABLE: 2.0,
+    "arp_spoof.gateway_discovery": 30.0,
+    "arp_spoof.gateway_route_print": 30.0,
+    "arp_spoof.gateway_linux": 30.0,
+    "arp_spoof.local_mac_windows": 60.0,
+    "arp_spoof.get_ip_forwarding_state": 10.0,
+    "blocker.show_rule_for_ip": 5.0,
+    "blocker.list_blocked_ips": 5.0,
+    "defender_posture_query": 120.0,
+}
+
+Key = Tuple[Tuple[str, ...], str]
+
+
+@dataclass
+class _Entry:
+    result: SubprocessResult
+    stored_at: float
+
+
+@dataclass
+class _Flight:
+    generation: int
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[SubprocessResult] = None
+    error: Optional[BaseException] = None
+
+
+class SubprocessQueryCache:
+    """Per-intent TTL cache with single-flight spawns. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttls = dict(QUERY_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, _Entry] = {}
+        self._flights: Dict[Key, _Flight] = {}
+        self._generations: Dict[str, int] = {}
+        self._stats = {"spawns": 0, "hits": 0, "coalesced": 0, "invalidations": 0}
+        self._saved_by_intent: Dict[str, int] = {}
+
+    def run(
+        self,
+        argv: Sequence[str],
+        *,
+        intent: str,
+        timeout: float = 15.0,
+        expect_returncode: Optional[Iterable[int]] = (0,),
+        trusted_executable: bool = False,
+        max_age: Optional[float] = None,
+    ) -> SubprocessResult:
+        """:func:`safe_subprocess.run` with reuse; see the module docs."""
+        key: Key = (tuple(str(a) for a in argv), intent)
+        with self._lock:
+            entry = self._fresh(key, max_age)
+            if entry is not None:
+                self._saved(intent, "hits")
+            else:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    self._stats["spawns"] += 1
+                    flight = self._flights[key] = _Flight(self._generations.get(intent, 0))
+                else:
+                    self._saved(intent, "coalesced")
+        if entry is not None:
+            self._audit_hit(key, self._clock() - entry.stored_at, coalesced=False)
+            result = entry.result
+        elif leader:
+            result = self._spawn(key, flight, timeout, trusted_executable)
+        else:
+            # The leader's own timeout bounds its wait; allow some slack.
+            if not flight.done.wait(timeout + 5.0):
+                raise safe_subprocess.SafeSubprocessError(
+                    f"timed out waiting for shared query {intent!r}"
+                )
+            if flight.error is not None:
+                raise flight.error
+            self._audit_hit(key, 0.0, coalesced=True)
+            result = flight.result
+        if expect_returncode is not None:
+            safe_subprocess._check_returncode(
+                key[0], result.returncode, result.stderr, expect_returncode,
+            )
+        return result
+
+    def invalidate(self, *intents: str) -> None:
+        """Forget stored results for *intents* (all intents if none given);
+        answers already in flight for them will not be stored."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            targets = set(intents) or {k[1] for k in (*self._entries, *self._flights)}
+            for intent in targets:
+                self._generations[intent] = self._generations.get(intent, 0) + 1
+            for key in [k for k in self._entries if k[1] in targets]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._stats,
+                "saved": self._stats["hits"] + self._stats["coalesced"],
+                "saved_by_intent": dict(self._saved_by_intent),
+                "entries": len(self._entries),
+                "in_flight": len(self._flights),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ── internals ────────────────────────────────────────────────────
+
+    def _fresh(self, key: Key, max_age: Optional[float]) -> Optional[_Entry]:
+        """Entry young enough for the intent's TTL and *max_age*. Lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        limit = self._ttls.get(key[1], 0.0)
+        if max_age is not None:
+            limit = min(limit, max_age)
+        if self._clock() - entry.stored_at >= limit:
+            return None
+        return entry
+
+    def _saved(self, intent: str, kind: str) -> None:
+        self._stats[kind] += 1
+        self._saved_by_intent[intent] = self._saved_by_intent.get(intent, 0) + 1
+
+    def _spawn(
+        self, key: Key, flight: _Flight, timeout: float, trusted_executable: bool,
+    ) -> SubprocessResult:
+        argv, intent = key
+        try:
+            result = safe_subprocess.run(
+                list(argv), timeout=timeout, expect_returncode=None,
+                trusted_executable=trusted_executable, intent=intent,
+            )
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.result = result
+            return result
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if (flight.error is None
+                        and self._ttls.get(intent, 0.0) > 0
+                        and self._generations.get(intent, 0) == flight.generation):
+                    self._entries[key] = _Entry(flight.result, self._clock())
+            flight.done.set()
+
+    @staticmethod
+    def _audit_hit(key: Key, age_s: float, *, coalesced: bool) -> None:
+        safe_subprocess._audit("subprocess_cache_hit", {
+            "intent": key[1],
+            "argv_preview": safe_subprocess._argv_preview(key[0]),
+            "age_s": round(age_s, 3),
+            "coalesced": coalesced,
+        })
+
+
+_cache: Optional[SubprocessQueryCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> SubprocessQueryCache:
+    """The process-wide cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SubprocessQueryCache()
+        return _cache
+
+
+def run_query(argv: Sequence[str], *, intent: str, **kwargs) -> SubprocessResult:
+    """Run an idempotent system query through the process-wide cache."""
+    return get_query_cache().run(argv, intent=intent, **kwargs)
+
+
+def invalidate(*intents: str) -> None:
+    """Drop cached results for *intents* after a state-changing action."""
+    get_query_cache().invalidate(*intents)
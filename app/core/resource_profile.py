@@ -31,6 +31,8 @@ class StartupResourceProfile:
     available_memory_bytes: Optional[int]
     low_resource: bool
     prewarm_map: bool
+    lazy_views: bool
+    prewarm_views: bool
     qt_max_threads: int
     qt_expiry_timeout_ms: int
     startup_timeout_ms: int
@@ -63,6 +65,7 @@ class StartupResourceProfile:
         return (
             f"cpu={self.cpu_count}, memory={total}, available={available}, "
             f"low_resource={self.low_resource}, prewarm_map={self.prewarm_map}, "
+            f"lazy_views={self.lazy_views}, prewarm_views={self.prewarm_views}, "
             f"qt_threads={self.qt_max_threads}, reason={reason_text}"
         )
 
@@ -167,6 +170,19 @@ def detect_startup_resource_profile(
     prewarm_override = _parse_optional_bool(env.get("DUPEZ_MAP_PREWARM", "auto"))
     prewarm_map = (not low_resource) if prewarm_override is None else prewarm_override
 
+    # Dashboard pages are built on first use by default; idle-time
+    # prewarming of the remaining pages is skipped on constrained systems.
+    lazy_override = _parse_optional_bool(env.get("DUPEZ_LAZY_VIEWS", "auto"))
+    lazy_views = True if lazy_override is None else lazy_override
+    view_prewarm_override = _parse_optional_bool(
+        env.get("DUPEZ_VIEW_PREWARM", "auto")
+    )
+    prewarm_views = (
+        (not low_resource)
+        if view_prewarm_override is None
+        else view_prewarm_override
+    )
+
     default_threads = min(resolved_cpu, 2 if low_resource else 8)
     qt_max_threads = _bounded_int(
         env.get("DUPEZ_QT_MAX_THREADS", default_threads),
@@ -189,6 +205,8 @@ def detect_startup_resource_profile(
         available_memory_bytes=available_memory_bytes,
         low_resource=low_resource,
         prewarm_map=prewarm_map,
+        lazy_views=lazy_views,
+        prewarm_views=prewarm_views,
         qt_max_threads=qt_max_threads,
         qt_expiry_timeout_ms=qt_expiry_timeout_ms,
         startup_timeout_ms=startup_timeout_ms,
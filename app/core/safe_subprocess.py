@@ -42,6 +42,10 @@ they expect.
 This module never returns a raw ``subprocess.Popen`` instance to
 callers; that would let a caller bypass the exit-auditing. The return
 types are plain dataclasses or small audited wrappers.
+
+Idempotent system queries (``arp -a``, ``netsh ... show``, the Defender
+PowerShell query) should go through :func:`app.core.query_cache.run_query`,
+which reuses recent results and coalesces concurrent identical calls.
 """
 
 from __future__ import annotations
@@ -223,6 +227,23 @@ def _argv_preview(argv: Sequence[str], limit: int = 8) -> list:
     return out
 
 
+def _check_returncode(
+    argv: Sequence[str], rc: int, stderr: object,
+    expect_returncode: Optional[Iterable[int]],
+) -> None:
+    """Raise unless *rc* is in *expect_returncode* (``None`` allows any)."""
+    if expect_returncode is None:
+        return
+    allowed: Set[int] = set(expect_returncode)
+    if rc not in allowed:
+        raise SafeSubprocessError(
+            f"subprocess exited with unexpected rc={rc} "
+            f"(allowed={sorted(allowed)}): "
+            f"{_argv_preview(argv)} — stderr head: "
+            f"{stderr[:200] if isinstance(stderr, str) else ''!r}"
+        )
+
+
 # ── Public entrypoints ───────────────────────────────────────────
 
 def run(
@@ -324,15 +345,7 @@ def run(
             f"subprocess timed out after {timeout}s: "
             f"{_argv_preview(clean_argv)}"
         )
-    if expect_returncode is not None:
-        allowed: Set[int] = set(expect_returncode)
-        if rc not in allowed:
-            raise SafeSubprocessError(
-                f"subprocess exited with unexpected rc={rc} "
-                f"(allowed={sorted(allowed)}): "
-                f"{_argv_preview(clean_argv)} — stderr head: "
-                f"{stderr[:200] if isinstance(stderr, str) else ''!r}"
-            )
+    _check_returncode(clean_argv, rc, stderr, expect_returncode)
     return SubprocessResult(
         argv=tuple(clean_argv),
         returncode=rc,
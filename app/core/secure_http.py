@@ -5,11 +5,26 @@ All outbound HTTP requests MUST use this module instead of raw
 urllib.request.  Provides:
   - TLS 1.3 minimum enforcement (fallback to TLS 1.2 if 1.3 unavailable)
   - Certificate verification (always on, no bypass)
+  - SPKI pin enforcement for hosts listed in ``cert_pinning.PINS``
   - Request timeout enforcement
-  - URL validation (scheme, host allowlist/blocklist)
-  - Response size limits
+  - URL validation (scheme, host allowlist/blocklist), also on redirects
+  - Response size limits, enforced while the body streams in
   - User-Agent identification
 
+Connections are pooled: each (scheme, host, port) keeps up to
+``POOL_MAX_IDLE_PER_HOST`` idle keep-alive connections for
+``POOL_IDLE_TIMEOUT_S``, so back-to-back calls to one host (release
+JSON, manifest, signature) pay for one TLS handshake. The idle timeout
+stays well under common server keep-alive limits. A request whose reused
+connection fails while it is being sent is retried once on a fresh one;
+a GET/HEAD is also retried when the connection drops before the status
+line, other methods are not (the server may already have acted).
+
+``secure_get(..., use_cache=True)`` keeps the body with its ETag /
+Last-Modified in an HMAC-sealed on-disk cache (``<user_root>/cache/http``)
+and revalidates with ``If-None-Match`` / ``If-Modified-Since``, so an
+unchanged resource costs a 304.
+
 CNSA 2.0 Compliance:
   - TLS 1.3 preferred (TLS_AES_256_GCM_SHA384 cipher suite)
   - Certificate chain validation via system trust store
@@ -18,17 +33,36 @@ CNSA 2.0 Compliance:
 
 from __future__ import annotations
 
+import atexit
+import base64
+import hashlib
+import hmac
+import http.client
+import io
 import json
+import os
 import ssl
+import threading
+import time
 import urllib.error
-import urllib.request
-from typing import Any, Dict, Optional
+import urllib.parse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.__version__ import __version__ as _DUPEZ_VERSION
 from app.core.validation import validate_url
-from app.logs.logger import log_error, log_info
+from app.logs.logger import log_error, log_info, log_warning
 
-__all__ = ["secure_get", "secure_post_json", "secure_get_json"]
+__all__ = [
+    "HttpResponse",
+    "close_idle_connections",
+    "pool_stats",
+    "secure_get",
+    "secure_get_json",
+    "secure_post_json",
+    "secure_request",
+]
 
 
 # ── Constants ────────────────────────────────────────────────────────
@@ -36,6 +70,14 @@ __all__ = ["secure_get", "secure_post_json", "secure_get_json"]
 DEFAULT_TIMEOUT_S: int = 15
 MAX_RESPONSE_SIZE_BYTES: int = 10 * 1024 * 1024  # 10 MB
 USER_AGENT: str = f"DupeZ/{_DUPEZ_VERSION}"
+POOL_MAX_IDLE_PER_HOST: int = 4
+POOL_IDLE_TIMEOUT_S: float = 10.0
+MAX_REDIRECTS: int = 5
+HTTP_CACHE_SECRET_KIND: str = "core.http_cache.hmac"
+_HTTP_CACHE_SCHEMA = "dupez.http-cache.v1"
+_READ_CHUNK: int = 64 * 1024
+_REDIRECT_CODES = frozenset({301, 302, 303, 307, 308})
+_IDEMPOTENT_RETRY_METHODS = frozenset({"GET", "HEAD"})
 
 # ── TLS Context ──────────────────────────────────────────────────────
 
@@ -81,11 +123,353 @@ def _get_tls_context() -> ssl.SSLContext:
     return _tls_context
 
 
+
+
+# ── Connection pool ──────────────────────────────────────────────────
+
+_PoolKey = Tuple[str, str, int]
+
+
+def _check_pins(host: str, sock: Any) -> None:
+    """Apply ``cert_pinning`` to a fresh TLS connection to a pinned host."""
+    from app.core import cert_pinning
+
+    if host.lower() in cert_pinning.PINS:
+        cert_pinning.enforce_pin(host.lower(), cert_pinning.peer_chain_ders(sock))
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port).
+
+    Connections are handed out exclusively and come back through
+    :meth:`release` only after their response was read to the end.
+    Idle ones older than ``idle_timeout`` are closed on the next
+    acquire/release (no background thread).
+    """
+
+    def __init__(
+        self,
+        max_idle_per_host: int = POOL_MAX_IDLE_PER_HOST,
+        idle_timeout: float = POOL_IDLE_TIMEOUT_S,
+    ) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[_PoolKey, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self.connections = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def acquire(self, key: _PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return ``(connection, reused)``; new connections are connected
+        and pin-checked before they are returned."""
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            idle = self._idle.get(key)
+            while idle:
+                conn, _ = idle.pop()
+                if conn.sock is None:
+                    continue
+                conn.timeout = timeout
+                conn.sock.settimeout(timeout)
+                self.reused += 1
+                return conn, True
+        scheme, host, port = key
+        if scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=_get_tls_context(),
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            conn.connect()
+            if scheme == "https":
+                _check_pins(host, conn.sock)
+        except BaseException:
+            conn.close()
+            raise
+        with self._lock:
+            self.connections += 1
+        return conn, False
+
+    def release(self, key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            idle = self._idle.setdefault(key, [])
+            if conn.sock is not None and len(idle) < self.max_idle_per_host:
+                idle.append((conn, now))
+                return
+        conn.close()
+
+    def _evict_expired(self, now: float) -> None:
+        for key in list(self._idle):
+            keep = []
+            for conn, since in self._idle[key]:
+                if now - since > self.idle_timeout:
+                    conn.close()
+                    self.evicted += 1
+                else:
+                    keep.append((conn, since))
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "reused": self.reused,
+                "evicted": self.evicted,
+                "idle": sum(len(v) for v in self._idle.values()),
+            }
+
+
+_pool = _ConnectionPool()
+atexit.register(_pool.close_all)
+
+
+def close_idle_connections() -> None:
+    """Close every pooled keep-alive connection."""
+    _pool.close_all()
+
+
+def pool_stats() -> Dict[str, int]:
+    """Counters: new connections, reuses, idle evictions, idle now."""
+    return _pool.stats()
+
+
+# ── Conditional-request cache ────────────────────────────────────────
+
+class _HttpCache:
+    """``url -> (validators, body)`` entries sealed with HMAC-SHA384.
+
+    An entry whose MAC does not verify is treated as absent, so editing
+    the cache directory cannot substitute a response body.
+    """
+
+    def __init__(self, root: Path, key: bytes) -> None:
+        self.root = Path(root)
+        self._key = bytes(key)
+
+    def _path(self, url: str) -> Path:
+        return self.root / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def _mac(self, url: str, etag: str, modified: str, body: bytes) -> str:
+        payload = json.dumps(
+            [_HTTP_CACHE_SCHEMA, url, etag, modified, hashlib.sha384(body).hexdigest()],
+            separators=(",", ":"),
+        ).encode("utf-8")
+        return hmac.new(self._key, payload, hashlib.sha384).hexdigest()
+
+    def get(self, url: str) -> Optional[Tuple[str, str, bytes]]:
+        """``(etag, last_modified, body)`` for *url*, or None."""
+        try:
+            raw = json.loads(self._path(url).read_text(encoding="utf-8"))
+            etag, modified = str(raw["etag"]), str(raw["last_modified"])
+            body = base64.b64decode(raw["body"], validate=True)
+            mac = raw["mac"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if raw.get("url") != url or not isinstance(mac, str) or not hmac.compare_digest(
+            mac, self._mac(url, etag, modified, body)
+        ):
+            return None
+        return etag, modified, body
+
+    def put(self, url: str, etag: str, modified: str, body: bytes) -> None:
+        path = self._path(url)
+        tmp = path.with_suffix(".tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({
+                "url": url,
+                "etag": etag,
+                "last_modified": modified,
+                "body": base64.b64encode(body).decode("ascii"),
+                "mac": self._mac(url, etag, modified, body),
+            }), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            log_warning(f"HTTP cache entry not saved: {e}")
+
+
+_http_cache: Optional[_HttpCache] = None
+_http_cache_lock = threading.Lock()
+_http_cache_failed = False
+
+
+def _get_http_cache() -> Optional[_HttpCache]:
+    """The on-disk cache, or None when no secret-store key is available."""
+    global _http_cache, _http_cache_failed
+    if _http_cache is None and not _http_cache_failed:
+        with _http_cache_lock:
+            if _http_cache is None and not _http_cache_failed:
+                try:
+                    from app.core.app_paths import user_root
+                    from app.core.secret_store import get_or_create_secret
+
+                    key = get_or_create_secret(HTTP_CACHE_SECRET_KIND)
+                    _http_cache = _HttpCache(user_root() / "cache" / "http", key)
+                except Exception as e:
+                    _http_cache_failed = True
+                    log_warning(f"HTTP response cache disabled ({type(e).__name__})")
+    return _http_cache
+
+
+# ── Request core ─────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class HttpResponse:
+    """A fully-read response."""
+
+    status: int
+    headers: Any  # http.client.HTTPMessage
+    body: bytes
+    url: str
+    from_cache: bool = False
+
+
+def _read_capped(resp: http.client.HTTPResponse, max_bytes: int) -> bytes:
+    """Read *resp* to the end, failing as soon as it passes *max_bytes*."""
+    buf = io.BytesIO()
+    total = 0
+    while True:
+        chunk = resp.read(min(_READ_CHUNK, max_bytes + 1 - total))
+        if not chunk:
+            return buf.getvalue()
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"Response exceeds max size ({max_bytes} bytes)")
+        buf.write(chunk)
+
+
+def _may_retry_stale(method: str, *, sent: bool) -> bool:
+    """Whether a failure on a reused keep-alive connection may be retried.
+
+    A send that fails means the server closed the idle connection before
+    it could see a whole request, so any method may go again. Once the
+    request is out, the server may have acted on it before dropping the
+    connection; only idempotent methods are safe to send twice.
+    """
+    return not sent or method in _IDEMPOTENT_RETRY_METHODS
+
+
+def _exchange(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    body: Optional[bytes],
+    timeout: float,
+    max_bytes: int,
+) -> HttpResponse:
+    """One request/response on a pooled connection (no redirects)."""
+    parsed = urllib.parse.urlsplit(url)
+    scheme = parsed.scheme.lower()
+    key = (scheme, parsed.hostname or "", parsed.port or (443 if scheme == "https" else 80))
+    target = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+    for attempt in (0, 1):
+        try:
+            conn, reused = _pool.acquire(key, timeout)
+        except (OSError, http.client.HTTPException) as e:
+            raise urllib.error.URLError(e) from e
+        try:
+            conn.request(method, target, body=body, headers=headers)
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            if reused and attempt == 0 and _may_retry_stale(method, sent=False):
+                continue
+            raise urllib.error.URLError(e) from e
+        try:
+            resp = conn.getresponse()
+        except (ConnectionError, ssl.SSLEOFError, http.client.BadStatusLine) as e:
+            conn.close()
+            if reused and attempt == 0 and _may_retry_stale(method, sent=True):
+                continue
+            raise urllib.error.URLError(e) from e
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+        try:
+            data = _read_capped(resp, max_bytes)
+        except ValueError:
+            conn.close()
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+        if resp.will_close:
+            conn.close()
+        else:
+            _pool.release(key, conn)
+        return HttpResponse(resp.status, resp.headers, data, url)
+    raise AssertionError("unreachable")
+
+
+def secure_request(
+    method: str,
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    timeout: float = DEFAULT_TIMEOUT_S,
+    max_bytes: int = MAX_RESPONSE_SIZE_BYTES,
+    require_https: bool = False,
+    validate: bool = True,
+) -> HttpResponse:
+    """Send one request through the pool, following up to
+    ``MAX_REDIRECTS`` redirects (each target re-validated; an
+    https→http redirect is refused).
+
+    ``validate=False`` skips :func:`validate_url` on the initial URL for
+    callers that already applied a stricter policy of their own (the
+    audit webhook sinks' host allowlist, which permits localhost).
+
+    Returns the final response for 2xx/304. Raises
+    :class:`urllib.error.HTTPError` for other statuses,
+    :class:`urllib.error.URLError` on connection/TLS failures and
+    ``ValueError`` for a blocked URL or an oversized body.
+    """
+    if validate:
+        url = validate_url(url, require_https=require_https, context="secure_request")
+    hdrs = {"User-Agent": USER_AGENT}
+    if headers:
+        hdrs.update(headers)
+    for _ in range(MAX_REDIRECTS + 1):
+        resp = _exchange(method, url, hdrs, body, timeout, max_bytes)
+        location = resp.headers.get("Location")
+        if resp.status in _REDIRECT_CODES and location:
+            target = urllib.parse.urljoin(url, location)
+            if url.startswith("https://") and not target.startswith("https://"):
+                raise urllib.error.URLError(f"refusing https→http redirect to {target}")
+            url = validate_url(target, require_https=require_https, context="redirect")
+            if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                method, body = "GET", None
+                hdrs.pop("Content-Type", None)
+            continue
+        if resp.status >= 400 or (resp.status >= 300 and resp.status != 304):
+            raise urllib.error.HTTPError(
+                url, resp.status, http.client.responses.get(resp.status, ""),
+                resp.headers, io.BytesIO(resp.body),
+            )
+        return resp
+    raise urllib.error.URLError(f"too many redirects (>{MAX_REDIRECTS})")
+
+
 # ── Public API ───────────────────────────────────────────────────────
 
 def secure_get(url: str, headers: Optional[Dict[str, str]] = None,
                timeout: int = DEFAULT_TIMEOUT_S,
-               require_https: bool = False) -> bytes:
+               require_https: bool = False,
+               use_cache: bool = False) -> bytes:
     """Perform a validated, TLS-enforced GET request.
 
     Args:
@@ -93,6 +477,8 @@ def secure_get(url: str, headers: Optional[Dict[str, str]] = None,
         headers: Additional request headers
         timeout: Request timeout in seconds
         require_https: If True, reject non-HTTPS URLs
+        use_cache: Revalidate against the on-disk ETag/Last-Modified
+            cache; an unchanged resource is answered from it after a 304
 
     Returns:
         Response body as bytes.
@@ -102,19 +488,28 @@ def secure_get(url: str, headers: Optional[Dict[str, str]] = None,
         urllib.error.URLError: On network errors
     """
     url = validate_url(url, require_https=require_https, context="secure_get")
-
-    hdrs = {"User-Agent": USER_AGENT}
-    if headers:
-        hdrs.update(headers)
-
-    req = urllib.request.Request(url, method="GET", headers=hdrs)
-
-    ctx = _get_tls_context() if url.startswith("https://") else None
-    with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
-        data = resp.read(MAX_RESPONSE_SIZE_BYTES + 1)
-        if len(data) > MAX_RESPONSE_SIZE_BYTES:
-            raise ValueError(f"Response exceeds max size ({MAX_RESPONSE_SIZE_BYTES} bytes)")
-        return data
+    cache = _get_http_cache() if use_cache else None
+    cached = cache.get(url) if cache is not None else None
+    hdrs = dict(headers or {})
+    if cached is not None:
+        etag, modified, _ = cached
+        if etag:
+            hdrs["If-None-Match"] = etag
+        if modified:
+            hdrs["If-Modified-Since"] = modified
+
+    resp = secure_request("GET", url, headers=hdrs, timeout=timeout,
+                          require_https=require_https, validate=False)
+    if resp.status == 304:
+        if cached is None:
+            raise urllib.error.URLError(f"unexpected 304 for {url}")
+        return cached[2]
+    if cache is not None:
+        etag = resp.headers.get("ETag") or ""
+        modified = resp.headers.get("Last-Modified") or ""
+        if etag or modified:
+            cache.put(url, etag, modified, resp.body)
+    return resp.body
 
 
 def secure_post_json(url: str, payload: dict,
@@ -135,36 +530,32 @@ def secure_post_json(url: str, payload: dict,
     """
     url = validate_url(url, require_https=require_https, context="secure_post_json")
 
-    hdrs = {
-        "User-Agent": USER_AGENT,
-        "Content-Type": "application/json",
-    }
+    hdrs = {"Content-Type": "application/json"}
     if headers:
         hdrs.update(headers)
 
     body = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=body, method="POST", headers=hdrs)
-
-    ctx = _get_tls_context() if url.startswith("https://") else None
     try:
-        with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
-            raw = resp.read(MAX_RESPONSE_SIZE_BYTES + 1)
-            if len(raw) > MAX_RESPONSE_SIZE_BYTES:
-                log_error(f"secure_post_json: response exceeds size limit for {url}")
-                return None
-            return json.loads(raw.decode("utf-8"))
-    except (urllib.error.URLError, json.JSONDecodeError) as e:
+        resp = secure_request("POST", url, headers=hdrs, body=body, timeout=timeout,
+                              require_https=require_https, validate=False)
+        return json.loads(resp.body.decode("utf-8"))
+    except ValueError as e:
+        # JSONDecodeError, or the body passed the size limit.
+        log_error(f"secure_post_json failed for {url}: {e}")
+        return None
+    except urllib.error.URLError as e:
         log_error(f"secure_post_json failed for {url}: {e}")
         return None
 
 
 def secure_get_json(url: str, headers: Optional[Dict[str, str]] = None,
                     timeout: int = DEFAULT_TIMEOUT_S,
-                    require_https: bool = False) -> Optional[dict]:
+                    require_https: bool = False,
+                    use_cache: bool = False) -> Optional[dict]:
     """Convenience: GET + JSON parse with full validation."""
     try:
         data = secure_get(url, headers=headers, timeout=timeout,
-                          require_https=require_https)
+                          require_https=require_https, use_cache=use_cache)
         return json.loads(data.decode("utf-8"))
     except (ValueError, json.JSONDecodeError) as e:
         log_error(f"secure_get_json failed for {url}: {e}")
@@ -42,12 +42,13 @@ that case so the dev workflow doesn't trip the check.
 
 from __future__ import annotations
 
-import hashlib
 import os
 import sys
 from pathlib import Path
 from typing import Optional, Tuple
 
+from app.core.file_integrity import file_digest
+
 __all__ = ["verify_self", "exe_signature_path"]
 
 
@@ -64,14 +65,8 @@ def exe_signature_path(exe: Path) -> Path:
 
 
 def _sha256_of_file(path: Path) -> bytes:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.digest()
+    # Through the shared integrity cache: an unchanged exe costs a stat.
+    return bytes.fromhex(file_digest(path, "sha256"))
 
 
 def verify_self() -> Tuple[bool, str]:
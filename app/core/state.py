@@ -180,28 +180,7 @@ class AppState:
         is never empty. The synthesis mirrors the scanner's fallback
         rules (vendor slug + MAC suffix).
         """
-        new_devices = []
-        for d in devices:
-            ip = d.get("ip", "")
-            mac = d.get("mac", "Unknown")
-            vendor = d.get("vendor", "Unknown")
-            hostname = d.get("hostname", "") or ""
-            if not hostname or hostname == "Unknown":
-                try:
-                    from app.network.enhanced_scanner import _synthesize_hostname
-                    hostname = _synthesize_hostname(ip, mac, vendor)
-                except Exception:
-                    hostname = f"device-{ip.replace('.', '-')}" if ip else "device-unknown"
-            new_devices.append(Device(
-                ip=ip,
-                mac=mac,
-                vendor=vendor,
-                hostname=hostname,
-                local=d.get("local", False),
-                traffic=d.get("traffic", 0),
-                last_seen=datetime.now().isoformat(),
-                blocked=d.get("blocked", False),
-            ))
+        new_devices = [self._device_from_dict(d) for d in devices]
 
         with self._lock:
             self.devices = new_devices
@@ -209,6 +188,69 @@ class AppState:
         self.notify_observers("devices_updated", self.devices)
         log_info(f"Updated device list: {len(self.devices)} devices")
 
+    def apply_device_changes(self, changes: Any) -> None:
+        """Apply a scan diff instead of replacing the whole list.
+
+        *changes* is an :class:`~app.network.inventory.DeviceChanges`.
+        Observers get ``devices_changed`` with ``added`` / ``changed``
+        (``Device`` objects) and ``removed`` (IPs), then the usual
+        ``devices_updated`` with the whole list. Devices the scan
+        confirmed unchanged get a fresh ``last_seen``. If the current
+        list is not the diff's base — first scan of a session, a device
+        that moved IP — this falls back to :meth:`update_devices`.
+        """
+        removed = {d.get("ip") for d in changes.removed}
+        incoming = {d.get("ip"): d for d in [*changes.added, *changes.changed]}
+        with self._lock:
+            blocked = {dev.ip for dev in self.devices if dev.blocked}
+            kept = [dev for dev in self.devices
+                    if dev.ip not in removed and dev.ip not in incoming]
+            expected = {d.get("ip") for d in changes.devices}
+            consistent = {dev.ip for dev in kept} | set(incoming) == expected
+        if not consistent:
+            self.update_devices(changes.devices)
+            return
+
+        added = [self._device_from_dict(d) for d in changes.added]
+        changed = [self._device_from_dict(d) for d in changes.changed]
+        for dev in changed:
+            dev.blocked = dev.blocked or dev.ip in blocked
+        now = datetime.now().isoformat()
+        with self._lock:
+            for dev in kept:
+                dev.last_seen = now
+            self.devices = kept + changed + added
+        if added or changed or removed:
+            self.notify_observers("devices_changed", {
+                "added": added, "changed": changed, "removed": sorted(removed),
+            })
+        self.notify_observers("devices_updated", self.devices)
+        log_info(f"Applied device changes: +{len(added)} ~{len(changed)} "
+                 f"-{len(removed)} ({len(self.devices)} devices)")
+
+    @staticmethod
+    def _device_from_dict(d: Dict[str, Any]) -> Device:
+        ip = d.get("ip", "")
+        mac = d.get("mac", "Unknown")
+        vendor = d.get("vendor", "Unknown")
+        hostname = d.get("hostname", "") or ""
+        if not hostname or hostname == "Unknown":
+            try:
+                from app.network.enhanced_scanner import _synthesize_hostname
+                hostname = _synthesize_hostname(ip, mac, vendor)
+            except Exception:
+                hostname = f"device-{ip.replace('.', '-')}" if ip else "device-unknown"
+        return Device(
+            ip=ip,
+            mac=mac,
+            vendor=vendor,
+            hostname=hostname,
+            local=d.get("local", False),
+            traffic=d.get("traffic", 0),
+            last_seen=datetime.now().isoformat(),
+            blocked=d.get("blocked", False),
+        )
+
     def select_device(self, ip: str) -> None:
         """Select a device by IP for subsequent operations."""
         self.selected_ip = ip
@@ -0,0 +1,525 @@
+# app/core/status_bus.py — Push-based controller status bus
+"""
+One sampler thread for every consumer of live controller state.
+
+Before the bus, the dashboard status bar, the tray tooltip, the Clumsy
+engine banner, the live stats panel and the OBS overlay each polled the
+controller on their own timer and spawned a fresh worker thread per
+tick. In split mode every one of those calls is a pipe round-trip to
+the elevated helper, and the same ``get_disrupted_devices()`` answer was
+fetched several times a second by different widgets.
+
+:class:`StatusBus` owns a single daemon sampler. Subscribers declare the
+fields they need and the maximum rate they want them at; the sampler
+only fetches fields somebody is subscribed to, at the fastest rate any
+subscriber asked for, and publishes a versioned immutable
+:class:`StatusSnapshot`. A sample that changes nothing is coalesced —
+the version stays put and nobody is woken. Subscribers receive a
+:class:`StatusUpdate` carrying the fields that changed since their last
+delivery; ``deltas=True`` subscribers get only those fields.
+
+Callbacks run on the sampler thread. GUI consumers re-emit into the Qt
+thread through a ``pyqtSignal``, exactly as the per-poll workers did.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from app.logs.logger import log_error
+
+__all__ = [
+    "FIELD_DEVICE_COUNT",
+    "FIELD_DISRUPTED",
+    "FIELD_ENGINE_STATS",
+    "FIELD_ENGINE_STATUS",
+    "FIELD_OPERATIONS",
+    "StatusBus",
+    "StatusSnapshot",
+    "StatusSubscription",
+    "StatusUpdate",
+    "get_status_bus",
+    "thaw",
+]
+
+FIELD_ENGINE_STATUS = "engine_status"
+FIELD_DISRUPTED = "disrupted"
+FIELD_DEVICE_COUNT = "device_count"
+FIELD_ENGINE_STATS = "engine_stats"
+FIELD_OPERATIONS = "operations"
+
+# Fields that fall due within this window of each other are fetched in
+# the same tick so subscribers on slightly different rates still share
+# one round-trip instead of waking the sampler twice.
+_SAMPLE_SLACK_S = 0.05
+_MIN_INTERVAL_S = 0.05
+_MISSING = object()
+
+
+# ── Immutable values ─────────────────────────────────────────────────
+
+def _freeze(value: Any) -> Any:
+    """Return a deeply read-only copy of a JSON-shaped value."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a frozen snapshot value.
+
+    Consumers that hand snapshot data to code expecting plain ``dict`` /
+    ``list`` objects call this at the edge; the published snapshot itself
+    is shared between subscribers and must never be mutated.
+    """
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Versioned, read-only view of every field sampled so far.
+
+    ``version`` only advances when a field value or a field error
+    changes. ``field_versions`` records the snapshot version at which
+    each field last changed, which is what subscriber deltas key off.
+    """
+
+    version: int = 0
+    sampled_at: float = 0.0
+    values: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({}))
+    field_versions: Mapping[str, int] = field(
+        default_factory=lambda: MappingProxyType({}))
+    errors: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({}))
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+
+@dataclass(frozen=True)
+class StatusUpdate:
+    """One delivery to one subscriber."""
+
+    snapshot: StatusSnapshot
+    changed: FrozenSet[str]
+    values: Mapping[str, Any]
+    errors: Mapping[str, str]
+
+
+class StatusSubscription:
+    """Handle returned by :meth:`StatusBus.subscribe`."""
+
+    def __init__(
+        self,
+        bus: "StatusBus",
+        callback: Callable[[StatusUpdate], None],
+        fields: FrozenSet[str],
+        interval: float,
+        deltas: bool,
+    ) -> None:
+        self._bus = bus
+        self.callback = callback
+        self.fields = fields
+        self.interval = interval
+        self.deltas = deltas
+        self.active = True
+        self._seen: Dict[str, int] = {}
+        self._next_due = 0.0
+
+    def close(self) -> None:
+        """Stop deliveries. Safe to call more than once."""
+        self._bus.unsubscribe(self)
+
+
+@dataclass
+class _Source:
+    name: str
+    fetch: Callable[[], Any]
+    derive: Optional[Callable[[Mapping[str, Any]], Any]] = None
+
+
+# ── Bus ──────────────────────────────────────────────────────────────
+
+class StatusBus:
+    """Single-sampler publish/subscribe hub for controller status."""
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "DupeZStatusBus",
+    ) -> None:
+        self._clock = clock
+        self._name = name
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._sources: Dict[str, _Source] = {}
+        self._subscriptions: List[StatusSubscription] = []
+        self._next_sample: Dict[str, float] = {}
+        self._forced: set[str] = set()
+        self._snapshot = StatusSnapshot()
+        self._counters: Dict[str, int] = {
+            "ticks": 0,
+            "published": 0,
+            "coalesced": 0,
+            "deliveries": 0,
+        }
+        self._fetches: Dict[str, int] = {}
+
+    @classmethod
+    def for_controller(cls, controller: Any, **kwargs: Any) -> "StatusBus":
+        """Build a bus whose sources are the controller's status getters.
+
+        Only getters the controller actually exposes are registered, so
+        lightweight controller stand-ins work without stubbing the rest.
+        ``disrupted`` is derived from the engine status when both are
+        due in the same tick — the engine status already carries the
+        device list, which saves one round-trip in split mode.
+        """
+        bus = cls(**kwargs)
+        if hasattr(controller, "get_clumsy_status"):
+            bus.register_source(FIELD_ENGINE_STATUS, controller.get_clumsy_status)
+        if hasattr(controller, "get_disrupted_devices"):
+            bus.register_source(
+                FIELD_DISRUPTED,
+                controller.get_disrupted_devices,
+                derive=_disrupted_from_status,
+            )
+        if hasattr(controller, "get_devices"):
+            bus.register_source(
+                FIELD_DEVICE_COUNT, lambda: len(controller.get_devices()))
+        if hasattr(controller, "get_engine_stats"):
+            bus.register_source(FIELD_ENGINE_STATS, controller.get_engine_stats)
+        if hasattr(controller, "get_active_operations"):
+            # Raw IPs stay in process; the overlay masks them at render time.
+            bus.register_source(
+                FIELD_OPERATIONS, lambda: controller.get_active_operations(detail=True))
+        return bus
+
+    def register_source(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        *,
+        derive: Optional[Callable[[Mapping[str, Any]], Any]] = None,
+    ) -> None:
+        """Register the getter for *name*.
+
+        Sources are sampled in registration order. *derive* receives the
+        values fetched earlier in the same tick and may return a value
+        for this field instead of calling *fetch*; returning ``None``
+        falls back to *fetch*.
+        """
+        with self._lock:
+            self._sources[name] = _Source(name, fetch, derive)
+            self._fetches.setdefault(name, 0)
+
+    @property
+    def fields(self) -> Sequence[str]:
+        with self._lock:
+            return tuple(self._sources)
+
+    # ── Subscriptions ──────────────────────────────────────────────
+
+    def subscribe(
+        self,
+        callback: Callable[[StatusUpdate], None],
+        fields: Iterable[str],
+        *,
+        max_rate_hz: float = 1.0,
+        deltas: bool = False,
+    ) -> StatusSubscription:
+        """Deliver changes to *fields* at most *max_rate_hz* times a second.
+
+        The first delivery carries every requested field as soon as it
+        has been sampled. Unknown field names raise ``KeyError``.
+        """
+        wanted = frozenset(fields)
+        if max_rate_hz <= 0:
+            raise ValueError("max_rate_hz must be positive")
+        with self._lock:
+            unknown = wanted.difference(self._sources)
+            if unknown:
+                raise KeyError(f"unknown status fields: {sorted(unknown)}")
+            sub = StatusSubscription(
+                self,
+                callback,
+                wanted,
+                max(_MIN_INTERVAL_S, 1.0 / max_rate_hz),
+                deltas,
+            )
+            self._subscriptions.append(sub)
+        self.start()
+        self._wake.set()
+        return sub
+
+    def unsubscribe(self, subscription: StatusSubscription) -> None:
+        with self._lock:
+            subscription.active = False
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def request_refresh(self, fields: Optional[Iterable[str]] = None) -> None:
+        """Sample *fields* (default: every subscribed field) right away.
+
+        Used after a user action so the GUI does not wait out the
+        subscription interval. Repeated requests while a sample is in
+        flight collapse into one follow-up tick.
+        """
+        with self._lock:
+            if fields is None:
+                wanted = set()
+                for sub in self._subscriptions:
+                    wanted.update(sub.fields)
+            else:
+                wanted = set(fields).intersection(self._sources)
+            self._forced.update(wanted)
+        self._wake.set()
+
+    def latest(self) -> StatusSnapshot:
+        """Return the newest published snapshot (never blocks on IPC)."""
+        with self._lock:
+            return self._snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        """Return sampler counters for diagnostics and benchmarks."""
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+            out["fetches"] = dict(self._fetches)
+            out["subscribers"] = len(self._subscriptions)
+            out["version"] = self._snapshot.version
+        return out
+
+    # ── Lifecycle ──────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the sampler thread if it is not already running."""
+        with self._lock:
+            if self._stopped:
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name=self._name,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the sampler for good; later subscriptions stay idle."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._thread = None
+        self._stop_event.set()
+        self._wake.set()
+        if (
+            thread is not None
+            and thread.is_alive()
+            and thread is not threading.current_thread()
+        ):
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.clear()
+            try:
+                delay = self.tick()
+            except Exception as exc:
+                log_error(f"Status bus tick failed: {exc}")
+                delay = 1.0
+            if self._stop_event.is_set():
+                break
+            self._wake.wait(delay)
+
+    # ── Sampling ───────────────────────────────────────────────────
+
+    def tick(self) -> Optional[float]:
+        """Run one sample/deliver pass; return seconds until the next.
+
+        Public so tests and benchmarks can drive the bus synchronously.
+        Returns ``None`` when nothing is subscribed.
+        """
+        now = self._clock()
+        with self._lock:
+            self._counters["ticks"] += 1
+            subs = list(self._subscriptions)
+            intervals: Dict[str, float] = {}
+            for sub in subs:
+                for name in sub.fields:
+                    intervals[name] = min(
+                        intervals.get(name, sub.interval), sub.interval)
+            forced = self._forced
+            self._forced = set()
+            due = [
+                name for name in self._sources
+                if name in intervals and (
+                    name in forced
+                    or now + _SAMPLE_SLACK_S >= self._next_sample.get(name, 0.0)
+                )
+            ]
+            sources = [self._sources[name] for name in due]
+            for name in due:
+                self._next_sample[name] = now + intervals[name]
+
+        if sources:
+            self._sample(sources, now)
+
+        wake_at = [self._next_sample[name] for name in intervals
+                   if name in self._next_sample]
+        pending_at = self._deliver(subs, now, frozenset(forced))
+        wake_at.extend(pending_at)
+        if not wake_at:
+            return None
+        return max(0.0, min(wake_at) - self._clock())
+
+    def _sample(self, sources: List[_Source], now: float) -> None:
+        fresh: Dict[str, Any] = {}
+        with self._lock:
+            errors = dict(self._snapshot.errors)
+        for source in sources:
+            value: Any = _MISSING
+            if source.derive is not None:
+                try:
+                    derived = source.derive(fresh)
+                    if derived is not None:
+                        value = derived
+                except Exception:
+                    value = _MISSING
+            if value is _MISSING:
+                try:
+                    value = source.fetch()
+                except Exception as exc:
+                    errors[source.name] = f"{type(exc).__name__}: {exc}"
+                    continue
+                finally:
+                    with self._lock:
+                        self._fetches[source.name] += 1
+            fresh[source.name] = _freeze(value)
+            errors.pop(source.name, None)
+        self._publish(fresh, errors, now)
+
+    def _publish(
+        self,
+        fresh: Dict[str, Any],
+        errors: Dict[str, str],
+        now: float,
+    ) -> None:
+        with self._lock:
+            current = self._snapshot
+            changed = {
+                name for name, value in fresh.items()
+                if name not in current.values or current.values[name] != value
+            }
+            changed.update(
+                name for name in set(errors).union(current.errors)
+                if errors.get(name) != current.errors.get(name)
+            )
+            if not changed:
+                self._counters["coalesced"] += 1
+                return
+            version = current.version + 1
+            values = dict(current.values)
+            values.update(fresh)
+            field_versions = dict(current.field_versions)
+            for name in changed:
+                field_versions[name] = version
+            self._snapshot = StatusSnapshot(
+                version=version,
+                sampled_at=now,
+                values=MappingProxyType(values),
+                field_versions=MappingProxyType(field_versions),
+                errors=MappingProxyType(dict(errors)),
+            )
+            self._counters["published"] += 1
+
+    def _deliver(
+        self,
+        subs: List[StatusSubscription],
+        now: float,
+        forced: FrozenSet[str],
+    ) -> List[float]:
+        """Deliver pending changes; return due times of throttled ones."""
+        snapshot = self.latest()
+        throttled: List[float] = []
+        for sub in subs:
+            if not sub.active:
+                continue
+            changed = frozenset(
+                name for name in sub.fields
+                if snapshot.field_versions.get(name, 0) != sub._seen.get(name, 0)
+            )
+            if not changed:
+                continue
+            if now + _SAMPLE_SLACK_S < sub._next_due and not (sub.fields & forced):
+                throttled.append(sub._next_due)
+                continue
+            names = changed if sub.deltas else sub.fields
+            update = StatusUpdate(
+                snapshot=snapshot,
+                changed=changed,
+                values=MappingProxyType({
+                    name: snapshot.values[name]
+                    for name in names if name in snapshot.values
+                }),
+                errors=MappingProxyType({
+                    name: snapshot.errors[name]
+                    for name in sub.fields if name in snapshot.errors
+                }),
+            )
+            for name in sub.fields:
+                sub._seen[name] = snapshot.field_versions.get(name, 0)
+            sub._next_due = now + sub.interval
+            with self._lock:
+                self._counters["deliveries"] += 1
+            try:
+                sub.callback(update)
+            except Exception as exc:
+                log_error(f"Status bus subscriber failed: {exc}")
+        return throttled
+
+
+def _disrupted_from_status(fresh: Mapping[str, Any]) -> Any:
+    """Reuse the device list the engine status already carries."""
+    status = fresh.get(FIELD_ENGINE_STATUS)
+    if status is None:
+        return None
+    devices = status.get("disrupted_devices")
+    if isinstance(devices, tuple):
+        return devices
+    return None
+
+
+def get_status_bus(controller: Any) -> Optional[StatusBus]:
+    """Return the controller's shared bus, or ``None`` when it has none."""
+    bus = getattr(controller, "status_bus", None)
+    return bus if isinstance(bus, StatusBus) else None
@@ -0,0 +1,402 @@
+"""
+Binary delta updates between releases.
+
+A signed manifest may list :class:`~app.core.update_verify.UpdatePatch`
+entries: "apply ``<filename>`` to the installer whose SHA-256 is
+``from_sha256`` to get this release's installer". When the updater
+holds a cached copy of that earlier installer it downloads the (much
+smaller) patch instead of the full installer:
+
+1. the patch itself is fetched with
+   :func:`app.core.update_download.download_installer`, so it is
+   resumable and checked against the signed patch hash on the fly;
+2. the cached source installer is checked against ``from_sha256``;
+3. :func:`apply_patch` rebuilds the installer, hashing it as it is
+   written, and only a result matching the signed ``installer.sha256``
+   and size is renamed into place.
+
+Any failure along the way returns ``False`` from :func:`fetch_via_patch`
+and the updater falls back to the full download.
+
+Patch format (``.dzpatch``)
+---------------------------
+::
+
+    b"DZDELTA1"
+    >Q old_size  >Q new_size  32s old_sha256  32s new_sha256
+    xz stream of ops:
+        b"C" >Q offset >I length     copy from the old installer
+        b"I" >I length <bytes>       insert literal bytes
+        b"E"                          end
+
+:func:`make_patch` (used by ``scripts/make-delta.py``) finds copies by
+indexing the old file in fixed blocks under an rsync-style rolling
+checksum, extending every match forwards and backwards byte-exactly.
+How much it saves depends on how much of the installer's bytes survive
+between releases; with solid compression a change early in the payload
+shifts everything after it, so the script reports the saving and a
+release can simply omit patches that are not worth it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import itertools
+import lzma
+import os
+import shutil
+import struct
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.file_integrity import file_digest
+from app.core.update_download import DownloadProgress, download_installer
+from app.core.update_verify import SigVerifyError, UpdateManifest, UpdatePatch
+from app.logs.logger import log_info, log_warning
+
+__all__ = [
+    "DEFAULT_BLOCK_SIZE",
+    "DeltaError",
+    "PATCH_MAGIC",
+    "apply_patch",
+    "fetch_via_patch",
+    "installer_cache_dir",
+    "make_patch",
+    "read_patch_header",
+    "remember_installer",
+]
+
+PATCH_MAGIC = b"DZDELTA1"
+_HEADER = struct.Struct(">QQ32s32s")
+_COPY = struct.Struct(">QI")
+_LEN = struct.Struct(">I")
+DEFAULT_BLOCK_SIZE = 2048
+MAX_CACHED_INSTALLERS = 2
+_MAX_LITERAL = 1024 * 1024
+_IO_CHUNK = 1024 * 1024
+
+
+class DeltaError(ValueError):
+    """A patch is malformed, does not fit its source, or produced the
+    wrong bytes. The updater falls back to a full download."""
+
+
+# ── Patch generation (release side) ──────────────────────────────────
+
+def _weak(block: bytes) -> Tuple[int, int]:
+    a = sum(block) & 0xFFFF
+    b = sum(itertools.accumulate(block)) & 0xFFFF
+    return a, b
+
+
+def _diff(old: bytes, new: bytes, block: int) -> Iterator[Tuple[str, int, int]]:
+    """Yield ``("C", old_offset, length)`` / ``("I", new_offset, length)``."""
+    index: Dict[int, List[int]] = {}
+    for off in range(0, len(old) - block + 1, block):
+        a, b = _weak(old[off:off + block])
+        slots = index.setdefault(a | (b << 16), [])
+        if len(slots) < 8:
+            slots.append(off)
+
+    n = len(new)
+    lit = pos = 0
+    a = b = 0
+    fresh = True
+    while pos + block <= n:
+        if fresh:
+            a, b = _weak(new[pos:pos + block])
+            fresh = False
+        match = -1
+        candidates = index.get(a | (b << 16))
+        if candidates:
+            window = new[pos:pos + block]
+            for off in candidates:
+                if old[off:off + block] == window:
+                    match = off
+                    break
+        if match < 0:
+            if pos + block < n:
+                out, inc = new[pos], new[pos + block]
+                a = (a - out + inc) & 0xFFFF
+                b = (b - block * out + a) & 0xFFFF
+            pos += 1
+            continue
+        start, src = pos, match
+        while start > lit and src > 0 and new[start - 1] == old[src - 1]:
+            start -= 1
+            src -= 1
+        end, src_end = pos + block, match + block
+        while (
+            end + block <= n and src_end + block <= len(old)
+            and new[end:end + block] == old[src_end:src_end + block]
+        ):
+            end += block
+            src_end += block
+        while end < n and src_end < len(old) and new[end] == old[src_end]:
+            end += 1
+            src_end += 1
+        if start > lit:
+            yield "I", lit, start - lit
+        yield "C", src, end - start
+        lit = pos = end
+        fresh = True
+    if lit < n:
+        yield "I", lit, n - lit
+
+
+def make_patch(
+    old_path: os.PathLike,
+    new_path: os.PathLike,
+    out_path: os.PathLike,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Dict[str, int]:
+    """Write a ``.dzpatch`` turning *old_path* into *new_path*.
+
+    Returns sizes and the copied/inserted byte counts.
+    """
+    old = Path(old_path).read_bytes()
+    new = Path(new_path).read_bytes()
+    stats = {"old_size": len(old), "new_size": len(new), "copied": 0, "inserted": 0}
+    comp = lzma.LZMACompressor(format=lzma.FORMAT_XZ, preset=6)
+    pending_copy: Optional[List[int]] = None
+    with open(out_path, "wb") as f:
+        f.write(PATCH_MAGIC)
+        f.write(_HEADER.pack(
+            len(old), len(new),
+            hashlib.sha256(old).digest(), hashlib.sha256(new).digest(),
+        ))
+
+        def flush_copy() -> None:
+            nonlocal pending_copy
+            if pending_copy is not None:
+                f.write(comp.compress(b"C" + _COPY.pack(*pending_copy)))
+                pending_copy = None
+
+        for kind, off, length in _diff(old, new, block_size):
+            if kind == "C":
+                stats["copied"] += length
+                if pending_copy is not None and sum(pending_copy) == off:
+                    pending_copy[1] += length
+                    continue
+                flush_copy()
+                pending_copy = [off, length]
+                continue
+            flush_copy()
+            stats["inserted"] += length
+            for start in range(off, off + length, _MAX_LITERAL):
+                piece = new[start:min(start + _MAX_LITERAL, off + length)]
+                f.write(comp.compress(b"I" + _LEN.pack(len(piece)) + piece))
+        flush_copy()
+        f.write(comp.compress(b"E"))
+        f.write(comp.flush())
+    stats["patch_size"] = os.path.getsize(out_path)
+    return stats
+
+
+# ── Patch application (client side) ──────────────────────────────────
+
+def read_patch_header(path: os.PathLike) -> Tuple[int, int, str, str]:
+    """``(old_size, new_size, old_sha256, new_sha256)`` of a patch file."""
+    with open(path, "rb") as f:
+        head = f.read(len(PATCH_MAGIC) + _HEADER.size)
+    if len(head) != len(PATCH_MAGIC) + _HEADER.size or not head.startswith(PATCH_MAGIC):
+        raise DeltaError("not a DupeZ delta patch")
+    old_size, new_size, old_sha, new_sha = _HEADER.unpack(head[len(PATCH_MAGIC):])
+    return old_size, new_size, old_sha.hex(), new_sha.hex()
+
+
+class _OpStream:
+    """Exact-length reads from the decompressed op stream."""
+
+    def __init__(self, f) -> None:
+        self._f = f
+        self._dec = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+        self._buf = bytearray()
+
+    def read(self, n: int) -> bytes:
+        while len(self._buf) < n:
+            if self._dec.eof:
+                raise DeltaError("patch op stream truncated")
+            raw = b"" if self._dec.needs_input is False else self._f.read(_IO_CHUNK)
+            if not raw and self._dec.needs_input:
+                raise DeltaError("patch op stream truncated")
+            try:
+                self._buf += self._dec.decompress(raw, max_length=_IO_CHUNK + n)
+            except lzma.LZMAError as e:
+                raise DeltaError(f"patch op stream corrupt: {e}") from e
+        out = bytes(self._buf[:n])
+        del self._buf[:n]
+        return out
+
+
+def apply_patch(
+    old_path: os.PathLike,
+    patch_path: os.PathLike,
+    out_path: os.PathLike,
+    *,
+    expected_sha256: str,
+    expected_size: int,
+) -> str:
+    """Rebuild the new installer from *old_path* and *patch_path*.
+
+    The output is hashed as it is written; *out_path* only exists on
+    return if it matches *expected_sha256* / *expected_size*. Returns
+    the SHA-256 hex. Raises :class:`DeltaError` otherwise.
+    """
+    old_size, new_size, _, new_sha = read_patch_header(patch_path)
+    if new_size != expected_size or new_sha != expected_sha256.lower():
+        raise DeltaError("patch does not produce the signed installer")
+    if os.path.getsize(old_path) != old_size:
+        raise DeltaError("patch source size mismatch")
+    digest = hashlib.sha256()
+    written = 0
+    tmp = f"{out_path}.applying"
+    try:
+        with open(old_path, "rb") as old, open(patch_path, "rb") as pf, open(tmp, "wb") as out:
+            pf.seek(len(PATCH_MAGIC) + _HEADER.size)
+            ops = _OpStream(pf)
+
+            def emit(data: bytes) -> None:
+                nonlocal written
+                written += len(data)
+                if written > new_size:
+                    raise DeltaError("patch output exceeds the signed size")
+                digest.update(data)
+                out.write(data)
+
+            while True:
+                op = ops.read(1)
+                if op == b"E":
+                    break
+                if op == b"C":
+                    offset, length = _COPY.unpack(ops.read(_COPY.size))
+                    if offset + length > old_size:
+                        raise DeltaError("patch copies beyond the source installer")
+                    old.seek(offset)
+                    while length:
+                        data = old.read(min(length, _IO_CHUNK))
+                        if not data:
+                            raise DeltaError("source installer shrank while patching")
+                        emit(data)
+                        length -= len(data)
+                elif op == b"I":
+                    (length,) = _LEN.unpack(ops.read(_LEN.size))
+                    emit(ops.read(length))
+                else:
+                    raise DeltaError(f"unknown patch op {op!r}")
+        actual = digest.hexdigest()
+        if written != expected_size or actual != expected_sha256.lower():
+            raise DeltaError(
+                f"patched installer mismatch: {actual} ({written} bytes) != "
+                f"{expected_sha256} ({expected_size} bytes)"
+            )
+        os.replace(tmp, out_path)
+        return actual
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ── Installer cache + updater entry point ────────────────────────────
+
+def installer_cache_dir() -> Path:
+    from app.core.app_paths import user_root
+
+    return user_root() / "cache" / "installers"
+
+
+def remember_installer(path: os.PathLike, manifest: UpdateManifest) -> None:
+    """Keep a verified installer as the source for the next delta.
+
+    Best effort: a hard link when possible, else a copy. Only the newest
+    :data:`MAX_CACHED_INSTALLERS` are kept.
+    """
+    cache = installer_cache_dir()
+    target = cache / f"{manifest.installer_sha256}.exe"
+    try:
+        cache.mkdir(parents=True, exist_ok=True)
+        if not target.exists():
+            tmp = target.with_suffix(".tmp")
+            try:
+                os.link(path, tmp)
+            except OSError:
+                shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+        for stale in sorted(cache.glob("*.exe"), key=lambda p: p.stat().st_mtime)[
+            :-MAX_CACHED_INSTALLERS
+        ]:
+            if stale != target:
+                stale.unlink()
+    except OSError as e:
+        log_warning(f"Installer not cached for delta updates: {e}")
+
+
+def _cached_source(patch: UpdatePatch) -> Optional[Path]:
+    path = installer_cache_dir() / f"{patch.from_sha256}.exe"
+    try:
+        if path.stat().st_size != patch.from_size:
+            return None
+        if file_digest(path, "sha256") != patch.from_sha256:
+            return None
+    except OSError:
+        return None
+    return path
+
+
+def fetch_via_patch(
+    url: str,
+    dest: str,
+    manifest: UpdateManifest,
+    *,
+    on_progress: Optional[Callable[[DownloadProgress], None]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    **download_kwargs,
+) -> bool:
+    """Try to produce *dest* from a cached installer plus a signed patch.
+
+    *url* is the installer URL; patches are fetched from the same
+    directory. Returns ``True`` when *dest* holds the verified
+    installer, ``False`` when the caller should download it in full.
+    """
+    for patch in manifest.patches:
+        source = _cached_source(patch)
+        if source is None:
+            continue
+        patch_url = url.rsplit("/", 1)[0] + "/" + patch.filename
+        patch_dest = f"{dest}.dzpatch"
+        try:
+            download_installer(
+                patch_url, patch_dest,
+                UpdateManifest(
+                    version=manifest.version, released_at=manifest.released_at,
+                    installer_filename=patch.filename,
+                    installer_sha256=patch.sha256, installer_size=patch.size,
+                ),
+                on_progress=on_progress, headers=headers, **download_kwargs,
+            )
+            apply_patch(
+                source, patch_dest, dest,
+                expected_sha256=manifest.installer_sha256,
+                expected_size=manifest.installer_size,
+            )
+        except (DeltaError, SigVerifyError, OSError, http.client.HTTPException) as e:
+            log_warning(
+                f"Delta update from {patch.from_version} failed ({e}); "
+                "falling back to the full installer"
+            )
+            continue
+        finally:
+            try:
+                os.remove(patch_dest)
+            except OSError:
+                pass
+        saved = manifest.installer_size - patch.size
+        log_info(
+            f"Installer rebuilt from {patch.from_version} via a {patch.size}-byte "
+            f"patch ({saved} bytes / {saved * 100 // manifest.installer_size}% "
+            "not downloaded)"
+        )
+        return True
+    return False
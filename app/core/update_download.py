@@ -0,0 +1,318 @@
+"""
+Resumable, hash-while-downloading installer fetch for the updater.
+
+:func:`download_installer` streams the installer named by a verified
+:class:`~app.core.update_verify.UpdateManifest` into ``<dest>.part``
+and feeds every chunk to SHA-256 as it arrives. When the signed size has
+been received, the digest is compared to the signed hash and only then
+is the file renamed to *dest*. There is no second read of the file.
+
+Resume
+------
+Next to the partial file, ``<dest>.part.json`` records the manifest's
+``installer_sha256`` / ``installer_size`` and the server's validator
+(strong ETag or Last-Modified). A dropped connection is retried with
+``Range: bytes=<received>-`` (plus ``If-Range``). Within one process
+the running hash simply continues. A later process hashes the bytes
+already on disk once, then resumes. A server answering ``200`` instead
+of ``206``, a ``Content-Range`` that does not start where we stopped,
+or a sidecar written for a different manifest all restart from byte 0.
+
+Throughput
+----------
+Reads start at 64 KiB and adapt so that one read takes about
+:data:`TARGET_READ_SEC` at the measured rate (16 KiB … 4 MiB).
+Progress callbacks get a :class:`DownloadProgress` carrying an EWMA
+rate and ETA, at most every :data:`PROGRESS_INTERVAL_SEC` plus a final
+one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from app.core.secure_http import _get_tls_context
+from app.core.update_verify import SigVerifyError, UpdateManifest
+from app.logs.logger import log_info, log_warning
+
+__all__ = [
+    "DownloadProgress",
+    "download_installer",
+    "partial_paths",
+]
+
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+START_CHUNK = 64 * 1024
+TARGET_READ_SEC = 0.25
+PROGRESS_INTERVAL_SEC = 0.1
+MAX_RETRIES = 5
+_BACKOFF_SEC = (0.5, 1.0, 2.0, 4.0, 8.0)
+_RATE_ALPHA = 0.3
+
+# Failures worth another attempt; anything else (HTTP 4xx, a size or
+# hash violation) is final.
+_TRANSIENT = (
+    URLError, ConnectionError, socket.timeout, TimeoutError,
+    http.client.IncompleteRead, http.client.RemoteDisconnected,
+)
+
+Opener = Callable[[Request, float], Any]
+
+
+@dataclass(frozen=True)
+class DownloadProgress:
+    """Snapshot passed to ``on_progress``."""
+
+    done: int
+    total: int
+    rate_bps: float
+    eta_sec: Optional[float]
+    resumed_from: int = 0
+    attempt: int = 1
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+
+class _Throughput:
+    """EWMA byte rate and the read size it implies."""
+
+    def __init__(self) -> None:
+        self.rate = 0.0
+        self.chunk = START_CHUNK
+
+    def update(self, nbytes: int, elapsed: float) -> None:
+        if nbytes <= 0:
+            return
+        sample = nbytes / max(elapsed, 1e-6)
+        self.rate = sample if self.rate == 0.0 else (
+            _RATE_ALPHA * sample + (1 - _RATE_ALPHA) * self.rate
+        )
+        want = max(MIN_CHUNK, min(MAX_CHUNK, int(self.rate * TARGET_READ_SEC)))
+        # Move by at most 2x per read so one odd sample cannot swing it.
+        self.chunk = min(max(want, self.chunk // 2), self.chunk * 2)
+
+
+def partial_paths(dest: str) -> Tuple[str, str]:
+    """``(partial file, sidecar)`` paths used while downloading *dest*."""
+    return dest + ".part", dest + ".part.json"
+
+
+def _default_opener(req: Request, timeout: float) -> Any:
+    ctx = _get_tls_context() if req.full_url.startswith("https://") else None
+    return urlopen(req, timeout=timeout, context=ctx)
+
+
+def _validator(headers: Any) -> Optional[str]:
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _range_start(content_range: Optional[str]) -> Optional[int]:
+    # "bytes 1000-1999/5000"
+    try:
+        unit, spec = (content_range or "").split(" ", 1)
+        if unit.strip().lower() != "bytes":
+            return None
+        return int(spec.split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+class _Partial:
+    """``<dest>.part`` plus its sidecar, and the hash of what it holds."""
+
+    def __init__(self, dest: str, manifest: UpdateManifest) -> None:
+        self.path, self.meta_path = partial_paths(dest)
+        self.key = {
+            "sha256": manifest.installer_sha256.lower(),
+            "size": manifest.installer_size,
+        }
+        self.validator: Optional[str] = None
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self._adopt()
+
+    def _adopt(self) -> None:
+        """Pick up a partial left by an earlier run, if it is ours."""
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            size = os.path.getsize(self.path)
+        except (OSError, ValueError):
+            self.discard()
+            return
+        if (
+            not isinstance(meta, dict)
+            or {k: meta.get(k) for k in self.key} != self.key
+            or size > self.key["size"]
+        ):
+            self.discard()
+            return
+        with open(self.path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                self.hasher.update(chunk)
+        self.size = size
+        self.validator = meta.get("validator") or None
+        log_info(f"Resuming update download at {size}/{self.key['size']} bytes")
+
+    def restart(self) -> None:
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        with open(self.path, "wb"):
+            pass
+
+    def write_meta(self) -> None:
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({**self.key, "validator": self.validator}, f)
+
+    def discard(self) -> None:
+        for path in (self.path, self.meta_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.validator = None
+
+
+def download_installer(
+    url: str,
+    dest: str,
+    manifest: UpdateManifest,
+    *,
+    on_progress: Optional[Callable[[DownloadProgress], None]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 60,
+    max_retries: int = MAX_RETRIES,
+    opener: Optional[Opener] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> str:
+    """Download *url* to *dest*, verifying it against *manifest* on the fly.
+
+    Returns the verified SHA-256 hex. Transient network failures are
+    retried (with ``Range``) up to *max_retries* times in a row without
+    progress; the last one is re-raised. Raises :class:`SigVerifyError`
+    if the server sends more than the signed size or the bytes do not
+    hash to the signed value — the partial file is deleted in that case,
+    and kept for a later resume in every other.
+    """
+    opener = opener or _default_opener
+    part = _Partial(dest, manifest)
+    size = manifest.installer_size
+    resumed_from = part.size
+    meter = _Throughput()
+    attempt = 0
+    failures = 0
+    last_report = 0.0
+
+    def report(force: bool = False) -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        if on_progress is None or (not force and now - last_report < PROGRESS_INTERVAL_SEC):
+            return
+        last_report = now
+        eta = (size - part.size) / meter.rate if meter.rate > 0 else None
+        on_progress(DownloadProgress(
+            done=part.size, total=size, rate_bps=meter.rate, eta_sec=eta,
+            resumed_from=resumed_from, attempt=attempt,
+        ))
+
+    while part.size < size:
+        attempt += 1
+        req_headers = dict(headers or {})
+        if part.size:
+            req_headers["Range"] = f"bytes={part.size}-"
+            if part.validator:
+                req_headers["If-Range"] = part.validator
+        progressed = False
+        try:
+            resp = opener(Request(url, headers=req_headers), timeout)
+            try:
+                status = getattr(resp, "status", 200)
+                if part.size and (
+                    status != 206
+                    or _range_start(resp.headers.get("Content-Range")) != part.size
+                ):
+                    log_warning(
+                        f"Update server did not resume at byte {part.size} "
+                        f"(HTTP {status}); restarting download"
+                    )
+                    part.restart()
+                    resumed_from = 0
+                    if status == 206:
+                        # A range we did not ask for: ask again from 0.
+                        continue
+                part.validator = _validator(resp.headers)
+                part.write_meta()
+                with open(part.path, "r+b" if part.size else "wb") as f:
+                    f.seek(part.size)
+                    while True:
+                        t0 = time.monotonic()
+                        chunk = resp.read(meter.chunk)
+                        if not chunk:
+                            break
+                        meter.update(len(chunk), time.monotonic() - t0)
+                        if part.size + len(chunk) > size:
+                            raise SigVerifyError(
+                                f"installer stream exceeded signed size "
+                                f"{size} at {part.size + len(chunk)}"
+                            )
+                        f.write(chunk)
+                        part.hasher.update(chunk)
+                        part.size += len(chunk)
+                        progressed = True
+                        report()
+            finally:
+                resp.close()
+            if part.size < size:
+                raise http.client.IncompleteRead(b"", size - part.size)
+        except SigVerifyError:
+            part.discard()
+            raise
+        except HTTPError as e:
+            if e.code == 416 and part.size:
+                # Our partial no longer fits the remote file; start over.
+                part.discard()
+                continue
+            raise
+        except _TRANSIENT as e:
+            failures = 0 if progressed else failures + 1
+            if failures > max_retries:
+                raise
+            delay = _BACKOFF_SEC[min(failures, len(_BACKOFF_SEC)) - 1] if failures else 0.0
+            log_warning(
+                f"Update download interrupted at {part.size}/{size} bytes "
+                f"({type(e).__name__}: {e}); resuming"
+                + (f" in {delay:.1f}s" if delay else "")
+            )
+            if delay:
+                sleep(delay)
+
+    actual = part.hasher.hexdigest()
+    if actual != part.key["sha256"]:
+        part.discard()
+        raise SigVerifyError(
+            f"installer hash mismatch: {actual} != {manifest.installer_sha256}"
+        )
+    report(force=True)
+    os.replace(part.path, dest)
+    try:
+        os.remove(part.meta_path)
+    except OSError:
+        pass
+    return actual
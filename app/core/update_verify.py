@@ -44,6 +44,18 @@ of the manifest (no re-serialization):
     bytes[0..8]    key_fingerprint = SHA-256(pubkey_pem)[:8]
     bytes[8..72]   ed25519_signature = Ed25519(priv, manifest_bytes)
 
+Optionally the manifest lists binary deltas from earlier releases
+(see :mod:`app.core.update_delta`):
+
+        "patches": [{
+            "from_version": "5.8.0",
+            "from_sha256": "<64 hex of the 5.8.0 installer>",
+            "from_size": 12000000,
+            "filename": "DupeZ_Setup.exe.from-5.8.0.dzpatch",
+            "sha256": "<64 hex of the patch file>",
+            "size": 345678
+        }]
+
 The verifier checks the fingerprint against TRUSTED_PUBKEYS, verifies
 the signature with the matching pubkey, then verifies the installer's
 SHA-256 matches ``installer.sha256``. ONLY THEN does the updater launch
@@ -69,13 +81,14 @@ from __future__ import annotations
 import hashlib
 import json
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
 __all__ = [
     "MANIFEST_SCHEMA",
     "SIG_ENVELOPE_SIZE",
     "SigVerifyError",
     "UpdateManifest",
+    "UpdatePatch",
     "pubkey_fingerprint",
     "verify_manifest",
     "verify_manifest_and_enforce_monotonic",
@@ -131,6 +144,22 @@ class SigVerifyError(ValueError):
 
 # ── Data types ────────────────────────────────────────────────────
 
+@dataclass(frozen=True)
+class UpdatePatch:
+    """A signed binary delta from one earlier installer to this one.
+
+    Applying ``filename`` (``sha256``/``size``) to the installer whose
+    SHA-256 is ``from_sha256`` must reproduce the manifest's installer
+    byte for byte — the result is checked against ``installer.sha256``.
+    """
+    from_version: str
+    from_sha256: str
+    from_size: int
+    filename: str
+    sha256: str
+    size: int
+
+
 @dataclass(frozen=True)
 class UpdateManifest:
     """Parsed, verified update manifest."""
@@ -139,6 +168,7 @@ class UpdateManifest:
     installer_filename: str
     installer_sha256: str
     installer_size: int
+    patches: Tuple[UpdatePatch, ...] = ()
 
 
 # ── Helpers ───────────────────────────────────────────────────────
@@ -287,9 +317,54 @@ def verify_manifest(
         installer_filename=filename,
         installer_sha256=sha256.lower(),
         installer_size=size,
+        patches=_parse_patches(doc.get("patches", [])),
     )
 
 
+def _sha256_field(value: Any, name: str) -> str:
+    if not isinstance(value, str) or len(value) != 64:
+        raise SigVerifyError(f"{name} invalid: {value!r}")
+    try:
+        bytes.fromhex(value)
+    except ValueError as e:
+        raise SigVerifyError(f"{name} not hex: {e}") from e
+    return value.lower()
+
+
+def _parse_patches(raw: Any) -> Tuple[UpdatePatch, ...]:
+    """Validate the optional ``patches`` list (signed, so strict)."""
+    if not isinstance(raw, list) or len(raw) > 16:
+        raise SigVerifyError("manifest.patches must be a list of at most 16 entries")
+    patches = []
+    for i, entry in enumerate(raw):
+        where = f"manifest.patches[{i}]"
+        if not isinstance(entry, dict):
+            raise SigVerifyError(f"{where} must be an object")
+        from_version = entry.get("from_version")
+        filename = entry.get("filename")
+        from_size = entry.get("from_size")
+        size = entry.get("size")
+        if not isinstance(from_version, str) or not from_version:
+            raise SigVerifyError(f"{where}.from_version missing")
+        if not isinstance(filename, str) or not filename or "/" in filename or "\\" in filename:
+            raise SigVerifyError(f"{where}.filename invalid: {filename!r}")
+        for field, value in (("from_size", from_size), ("size", size)):
+            if (
+                not isinstance(value, int) or isinstance(value, bool)
+                or value <= 0 or value > 1024 * 1024 * 1024
+            ):
+                raise SigVerifyError(f"{where}.{field} invalid: {value!r}")
+        patches.append(UpdatePatch(
+            from_version=from_version,
+            from_sha256=_sha256_field(entry.get("from_sha256"), f"{where}.from_sha256"),
+            from_size=from_size,
+            filename=filename,
+            sha256=_sha256_field(entry.get("sha256"), f"{where}.sha256"),
+            size=size,
+        ))
+    return tuple(patches)
+
+
 def verify_manifest_and_enforce_monotonic(
     manifest_bytes: bytes,
     sig_envelope: bytes,
@@ -326,8 +401,10 @@ def verify_installer_sha256(
 ) -> None:
     """Hash the downloaded installer and compare to the signed manifest.
 
-    Streams the file so we don't load multi-hundred-MB installers into
-    memory.
+    Streams (memory-maps) the file so we don't load multi-hundred-MB
+    installers into memory, and goes through the process-wide
+    :mod:`app.core.file_integrity` cache so re-checking the same
+    unchanged download costs a stat.
 
     Raises SigVerifyError on size or hash mismatch.
     """
@@ -341,17 +418,12 @@ def verify_installer_sha256(
             f"installer size mismatch: {actual_size} != {manifest.installer_size}"
         )
 
-    h = hashlib.sha256()
+    from app.core.file_integrity import file_digest
+
     try:
-        with open(installer_path, "rb") as f:
-            while True:
-                chunk = f.read(1024 * 1024)
-                if not chunk:
-                    break
-                h.update(chunk)
+        actual_hash = file_digest(installer_path, "sha256").lower()
     except OSError as e:
         raise SigVerifyError(f"installer unreadable: {e}") from e
-    actual_hash = h.hexdigest().lower()
     if actual_hash != manifest.installer_sha256.lower():
         raise SigVerifyError(
             f"installer hash mismatch: {actual_hash} != {manifest.installer_sha256}"
@@ -20,16 +20,16 @@ import webbrowser
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Tuple
 from urllib.error import URLError
-from urllib.request import Request, urlopen
 
 from app.__version__ import __version__
 from app.core import safe_subprocess
 from app.core.safe_subprocess import SafeSubprocessError
-from app.core.secure_http import _get_tls_context, secure_get
+from app.core.secure_http import secure_get
+from app.core.update_delta import fetch_via_patch, remember_installer
+from app.core.update_download import DownloadProgress, download_installer
 from app.core.update_state import DowngradeRefusedError
 from app.core.update_verify import (
     SigVerifyError,
-    verify_installer_sha256,
     verify_manifest_and_enforce_monotonic,
 )
 from app.logs.logger import log_error, log_info, log_warning
@@ -209,10 +209,13 @@ class UpdateChecker:
         self._checking = True
         try:
             from app.core.secure_http import secure_get_json
+            # Cached by ETag: an unchanged release costs a 304 (which
+            # GitHub does not count against the API rate limit).
             data = secure_get_json(
                 RELEASES_API,
                 headers={"User-Agent": f"DupeZ/{CURRENT_VERSION}"},
                 timeout=10,
+                use_cache=True,
             )
             if not data:
                 return {"update_available": False, "error": "Empty API response"}
@@ -324,7 +327,7 @@ class UpdateChecker:
 
     def download_and_install(
         self,
-        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_progress: Optional[Callable[[DownloadProgress], None]] = None,
         on_done: Optional[Callable[[bool, str], None]] = None,
     ) -> None:
         """Download the new installer to temp and launch it.
@@ -337,8 +340,9 @@ class UpdateChecker:
 
         Parameters
         ----------
-        on_progress : callable(bytes_done, bytes_total)
-            Progress callback (called from background thread).
+        on_progress : callable(DownloadProgress)
+            Progress callback (called from background thread) with bytes
+            done/total, the measured rate and an ETA.
         on_done : callable(success, message)
             Completion callback (called from background thread).
         """
@@ -464,52 +468,36 @@ class UpdateChecker:
                     f"size={manifest.installer_size}"
                 )
 
-                # ── Phase 2: stream-download the installer ────────────
-                log_info(f"Downloading update: {url} → {dest}")
-
-                # Use the hardened TLS context so the installer
-                # download enforces TLS 1.3 and validates certs.
-                req = Request(url, headers={"User-Agent": f"DupeZ/{CURRENT_VERSION}"})
-                ctx = _get_tls_context() if url.startswith("https://") else None
-                resp = urlopen(req, timeout=60, context=ctx)
-                total = int(resp.headers.get("Content-Length", 0)) or manifest.installer_size
-                # Hard cap: refuse to write more than the manifest says.
-                # Prevents an over-long response from filling disk before
-                # the hash check runs.
-                size_cap = manifest.installer_size
-                downloaded = 0
-                chunk_size = 1024 * 64  # 64 KB chunks
-
-                with open(dest, "wb") as f:
-                    while True:
-                        chunk = resp.read(chunk_size)
-                        if not chunk:
-                            break
-                        if downloaded + len(chunk) > size_cap:
-                            raise SigVerifyError(
-                                f"installer stream exceeded signed size "
-                                f"{size_cap} at {downloaded + len(chunk)}"
-                            )
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if on_progress:
-                            on_progress(downloaded, total)
-
-                log_info(f"Download complete: {dest} ({downloaded} bytes)")
-
-                # ── Phase 3: verify installer bytes against manifest ──
+                # ── Phase 2+3: download, hashing as the bytes arrive ──
+                # download_installer() resumes a dropped connection with
+                # an HTTP Range request, refuses more bytes than the
+                # signed size, and only renames the partial file to
+                # `dest` once its SHA-256 matches the signed manifest.
+                # When the manifest lists a patch from an installer we
+                # still hold, fetch_via_patch() rebuilds `dest` from it
+                # under the same signed hash; otherwise (or on any
+                # failure there) the full installer is downloaded.
+                ua = {"User-Agent": f"DupeZ/{CURRENT_VERSION}"}
                 try:
-                    verify_installer_sha256(dest, manifest)
+                    if not fetch_via_patch(url, dest, manifest,
+                                           on_progress=on_progress, headers=ua):
+                        log_info(f"Downloading update: {url} → {dest}")
+                        download_installer(
+                            url, dest, manifest,
+                            on_progress=on_progress, headers=ua,
+                        )
                 except SigVerifyError as e:
                     log_error(f"Update refused: installer hash mismatch: {e}")
                     if on_done:
                         on_done(False, f"Update refused (hash): {e}")
                     return
+                log_info(f"Download complete: {dest} ({manifest.installer_size} bytes)")
 
                 log_info(
                     "Installer hash verified against signed manifest — "
                     "safe to launch."
                 )
+                remember_installer(dest, manifest)
 
                 # Strip MOTW from the now-verified installer
                 try:
@@ -561,8 +549,10 @@ class UpdateChecker:
                     on_done(False, str(exc))
             finally:
                 # If we bailed out before launching the installer, wipe
-                # the partially-downloaded or rejected file so nothing
-                # can pick it up out of band.
+                # the verified-but-unlaunched file so nothing can pick it
+                # up out of band. An interrupted download only exists as
+                # `<dest>.part` and is kept so the next attempt resumes;
+                # a rejected one was already deleted by download_installer.
                 if dest is not None:
                     try:
                         if os.path.exists(dest):
@@ -13,6 +13,7 @@ import threading
 import time
 from typing import Dict, List
 
+from app.core import query_cache as _query_cache
 from app.core import safe_subprocess as _safe_sp
 from app.core.safe_subprocess import SafeSubprocessError as _SafeSpErr
 from app.core.validation import validate_ip as _validate_ip
@@ -45,12 +46,17 @@ def _resolve_netsh() -> str:
     return _safe_sp.resolve_system_binary("netsh")
 
 
+# Cached rule queries that any rule add/delete makes stale.
+_RULE_QUERIES = ("blocker.show_rule_for_ip", "blocker.list_blocked_ips")
+
+
 def _netsh(*args: str, timeout: int = 3, intent: str = "blocker.netsh") -> bool:
     """Run a ``netsh advfirewall firewall`` command.
 
     Routed through safe_subprocess so the System32 path, CREATE_NO_WINDOW
     flag, argv-list policy, and exit-code audit all apply. Returns True
-    only when netsh exits with code 0.
+    only when netsh exits with code 0. Every call here changes rules, so
+    cached rule queries are dropped whatever the outcome.
     """
     try:
         netsh_path = _resolve_netsh()
@@ -68,6 +74,8 @@ def _netsh(*args: str, timeout: int = 3, intent: str = "blocker.netsh") -> bool:
     except Exception as e:
         log_error(f"netsh execution error: {e}")
         return False
+    finally:
+        _query_cache.invalidate(*_RULE_QUERIES)
 
 
 # ── Throttled log helper ──────────────────────────────────────────────
@@ -190,7 +198,7 @@ def is_ip_blocked(ip: str) -> bool:
             return False
 
         netsh_path = _resolve_netsh()
-        res = _safe_sp.run(
+        res = _query_cache.run_query(
             [netsh_path, "advfirewall", "firewall", "show", "rule",
              f"name={_rule_base(ip)}_In"],
             timeout=5.0,
@@ -284,7 +292,7 @@ def get_blocked_ips() -> List[str]:
             return []
 
         netsh_path = _resolve_netsh()
-        res = _safe_sp.run(
+        res = _query_cache.run_query(
             [netsh_path, "advfirewall", "firewall", "show", "rule", "name=all"],
             timeout=10.0,
             expect_returncode=None,
@@ -75,7 +75,7 @@ import os
 import secrets
 from hashlib import sha256
 from pathlib import Path
-from typing import Optional
+from typing import FrozenSet, Iterable, Optional
 
 __all__ = [
     "HANDSHAKE_TIMEOUT_SEC",
@@ -217,15 +217,28 @@ def _unhex(s: str, expected_len: int, field: str) -> bytes:
     return raw
 
 
+def _offered_caps(obj: dict) -> FrozenSet[str]:
+    """Capability names a peer advertised; absent or malformed means none."""
+    caps = obj.get("caps")
+    if not isinstance(caps, list):
+        return frozenset()
+    return frozenset(c for c in caps if isinstance(c, str))
+
+
 def handshake_server(
     secret: bytes,
     read_frame: callable,
     write_frame: callable,
-) -> None:
+    capabilities: Iterable[str] = (),
+) -> FrozenSet[str]:
     """Run the server side of the mutual handshake.
 
     Raises AuthenticationError on bad client proof; HandshakeError on
-    malformed frames or protocol mismatch. Returns normally on success.
+    malformed frames or protocol mismatch. On success returns the
+    connection capabilities: those the client offered in ``caps`` that
+    are also in *capabilities*. A client that predates capability
+    negotiation offers none, so it gets the plain one-request-at-a-time
+    protocol.
 
     The caller MUST NOT dispatch any subsequent Request until this call
     returns without raising.
@@ -247,6 +260,7 @@ def handshake_server(
             f"unsupported handshake version: {hello.get('version')!r}"
         )
     c_nonce = _unhex(hello.get("nonce", ""), NONCE_BYTES, "client nonce")
+    negotiated = _offered_caps(hello) & frozenset(capabilities)
 
     # 2. Send server_hello with proof.
     s_nonce = secrets.token_bytes(NONCE_BYTES)
@@ -275,28 +289,38 @@ def handshake_server(
     if not hmac.compare_digest(expected, provided):
         raise AuthenticationError("client proof failed — rejecting connection")
 
-    # 4. Confirm handshake.
+    # 4. Confirm handshake. ``caps`` is only sent when non-empty so the
+    # frame stays byte-identical for clients that never asked.
     ok = {"type": "handshake_ok"}
+    if negotiated:
+        ok["caps"] = sorted(negotiated)
     write_frame((json.dumps(ok, separators=(",", ":")) + "\n").encode("utf-8"))
+    return negotiated
 
 
 def handshake_client(
     secret: bytes,
     read_frame: callable,
     write_frame: callable,
-) -> None:
+    capabilities: Iterable[str] = (),
+) -> FrozenSet[str]:
     """Run the client side of the mutual handshake.
 
     Raises AuthenticationError if the server proof fails verification;
-    HandshakeError on malformed frames.
+    HandshakeError on malformed frames. On success returns the subset of
+    *capabilities* the server accepted (empty against an older helper,
+    which ignores the ``caps`` field).
     """
     # 1. Send client_hello.
     c_nonce = secrets.token_bytes(NONCE_BYTES)
+    offered = frozenset(capabilities)
     hello = {
         "type": "client_hello",
         "nonce": _hex(c_nonce),
         "version": HANDSHAKE_VERSION,
     }
+    if offered:
+        hello["caps"] = sorted(offered)
     write_frame((json.dumps(hello, separators=(",", ":")) + "\n").encode("utf-8"))
 
     # 2. Read server_hello.
@@ -339,3 +363,4 @@ def handshake_client(
         raise HandshakeError(f"invalid handshake_ok: {e}") from e
     if not isinstance(ok, dict) or ok.get("type") != "handshake_ok":
         raise AuthenticationError(f"handshake did not complete: {ok!r}")
+    return _offered_caps(ok) & offered
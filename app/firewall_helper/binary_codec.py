@@ -0,0 +1,351 @@
+# app/firewall_helper/binary_codec.py
+"""
+Compact typed encoding for the helper IPC's binary frame mode.
+
+Only used on connections that negotiated ``protocol.CAP_BINARY``; JSON is
+the default. The value model is exactly JSON's (None, bool, int, float,
+str, list, dict with string keys), so a payload decodes to the same
+Python object the JSON path would produce — including the key coercion
+``json.dumps`` applies to non-string dict keys.
+
+Layout (one tag byte per value, little-endian fixed-width bodies):
+
+    0x00-0x7f   non-negative int 0..127 in the tag itself
+    0x80-0x8f   map with 0..15 entries          0xde  map, u32 count
+    0x90-0x9f   list with 0..15 items           0xdc  list, u32 count
+    0xa0-0xbf   str with 0..31 UTF-8 bytes      0xd9  str, u8 len
+                                                0xda  str, u32 len
+    0xc0 None   0xc2 False   0xc3 True          0xcb  float64
+    0xd1 int32  0xd2 int64   0xd3 big int (u8 len + signed bytes)
+
+Map keys are interned. Each key is a single token: a byte below 0xfe
+indexes the key table, 0xff is followed by a u16 index, and 0xfe
+introduces a new key (u16 length + UTF-8) that is appended to the table
+for the rest of the frame. The table starts from :data:`STATIC_KEYS`, so
+the envelope fields and the counters ``get_engine_stats`` repeats for
+every device and module cost one byte each.
+
+``STATIC_KEYS`` is part of the wire format: it may only change together
+with the ``CAP_BINARY`` capability name.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Tuple
+
+__all__ = ["STATIC_KEYS", "pack", "unpack"]
+
+STATIC_KEYS: Tuple[str, ...] = (
+    # Request / Response envelopes and common arguments.
+    "request_id", "op", "args", "version", "ok", "result", "error_code",
+    "error_message", "ip", "methods", "params", "action", "payload",
+    "enabled",
+    # Engine counters (native engine get_stats + manager aggregation).
+    "packets_processed", "packets_dropped", "packets_inbound",
+    "packets_outbound", "packets_passed", "send_attempted",
+    "send_succeeded", "send_failed", "send_short", "alive", "target_ip",
+    "engine", "engine_preference", "telemetry_available", "module_stats",
+    "module_activity", "configured_methods", "effective_methods",
+    "shadowed_methods", "startup_verified", "runtime_verification_available",
+    "runtime_verified", "local_effect_verified", "verification_state",
+    "active_engines", "per_device", "detection", "arp_spoof_active",
+    "arp_packets_sent",
+    # Per-module activity and status dictionaries.
+    "method", "state", "direction", "queue_depth", "released", "dropped",
+    "delayed", "duplicated", "count", "started", "running", "mode",
+    "status", "name",
+)
+
+_KEY_INDEX: Dict[str, int] = {k: i for i, k in enumerate(STATIC_KEYS)}
+
+_NONE, _FALSE, _TRUE = 0xC0, 0xC2, 0xC3
+_FLOAT64 = 0xCB
+_INT32, _INT64, _BIGINT = 0xD1, 0xD2, 0xD3
+_STR8, _STR32 = 0xD9, 0xDA
+_LIST32, _MAP32 = 0xDC, 0xDE
+_KEY_NEW, _KEY_WIDE = 0xFE, 0xFF
+
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+_MAX_KEYS = 0xFFFF
+
+
+def _json_key(key: Any) -> str:
+    """Coerce a dict key the way ``json.dumps`` does."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+
+class _Packer:
+    __slots__ = ("out", "keys")
+
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self.keys = dict(_KEY_INDEX)
+
+    def value(self, v: Any) -> None:
+        out = self.out
+        t = type(v)
+        if t is str:
+            self.text(v)
+        elif t is int:
+            self.integer(v)
+        elif t is dict:
+            self.mapping(v)
+        elif v is None:
+            out.append(_NONE)
+        elif t is bool:
+            out.append(_TRUE if v else _FALSE)
+        elif t is float:
+            out.append(_FLOAT64)
+            out += _F64.pack(v)
+        elif t is list or t is tuple:
+            self.sequence(v)
+        # Subclasses (IntEnum, StrEnum, OrderedDict, ...) encode like
+        # their JSON base type.
+        elif isinstance(v, str):
+            self.text(str.__str__(v))
+        elif isinstance(v, bool):
+            out.append(_TRUE if v else _FALSE)
+        elif isinstance(v, int):
+            self.integer(int(v))
+        elif isinstance(v, float):
+            out.append(_FLOAT64)
+            out += _F64.pack(float(v))
+        elif isinstance(v, dict):
+            self.mapping(v)
+        elif isinstance(v, (list, tuple)):
+            self.sequence(v)
+        else:
+            raise TypeError(
+                f"Object of type {type(v).__name__} is not serializable"
+            )
+
+    def text(self, s: str) -> None:
+        out = self.out
+        raw = s.encode("utf-8")
+        n = len(raw)
+        if n < 32:
+            out.append(0xA0 | n)
+        elif n < 256:
+            out.append(_STR8)
+            out.append(n)
+        else:
+            out.append(_STR32)
+            out += _U32.pack(n)
+        out += raw
+
+    def integer(self, i: int) -> None:
+        out = self.out
+        if 0 <= i < 0x80:
+            out.append(i)
+        elif -0x80000000 <= i < 0x80000000:
+            out.append(_INT32)
+            out += _I32.pack(i)
+        elif -0x8000000000000000 <= i < 0x8000000000000000:
+            out.append(_INT64)
+            out += _I64.pack(i)
+        else:
+            raw = i.to_bytes((i.bit_length() + 8) // 8, "little", signed=True)
+            if len(raw) > 255:
+                raise ValueError("integer too large for binary frame")
+            out.append(_BIGINT)
+            out.append(len(raw))
+            out += raw
+
+    def sequence(self, items) -> None:
+        out = self.out
+        n = len(items)
+        if n < 16:
+            out.append(0x90 | n)
+        else:
+            out.append(_LIST32)
+            out += _U32.pack(n)
+        for item in items:
+            self.value(item)
+
+    def mapping(self, d: dict) -> None:
+        out = self.out
+        keys = self.keys
+        n = len(d)
+        if n < 16:
+            out.append(0x80 | n)
+        else:
+            out.append(_MAP32)
+            out += _U32.pack(n)
+        for k, v in d.items():
+            if type(k) is not str:
+                k = _json_key(k)
+            idx = keys.get(k)
+            if idx is None:
+                raw = k.encode("utf-8")
+                if len(raw) > 0xFFFF:
+                    raise ValueError("dict key too long for binary frame")
+                out.append(_KEY_NEW)
+                out += _U16.pack(len(raw))
+                out += raw
+                if len(keys) < _MAX_KEYS:
+                    keys[k] = len(keys)
+            elif idx < _KEY_NEW:
+                out.append(idx)
+            else:
+                out.append(_KEY_WIDE)
+                out += _U16.pack(idx)
+            self.value(v)
+
+
+def pack(value: Any) -> bytes:
+    """Encode a JSON-compatible *value*."""
+    packer = _Packer()
+    packer.value(value)
+    return bytes(packer.out)
+
+
+def _unpack_from(buf: bytes, pos: int, keys: List[str]) -> Tuple[Any, int]:
+    """Decode the value at *pos*; return it and the position after it.
+
+    One flat function with the common tags first: the decoder runs in
+    pure Python, so per-value call and attribute overhead dominates.
+    Slicing past the end of *buf* is caught by the length checks in
+    :func:`unpack` and the ``_need`` guard for fixed-width bodies.
+    """
+    tag = buf[pos]
+    pos += 1
+    if tag < 0x80:
+        return tag, pos
+    if 0xA0 <= tag < 0xC0:
+        end = pos + (tag & 0x1F)
+        _need(buf, end)
+        return buf[pos:end].decode("utf-8"), end
+    if tag < 0xA0:
+        if tag < 0x90:
+            n = tag & 0x0F
+            return _unpack_map(buf, pos, keys, n)
+        n = tag & 0x0F
+        return _unpack_list(buf, pos, keys, n)
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _NONE:
+        return None, pos
+    if tag == _INT32:
+        _need(buf, pos + 4)
+        return _I32.unpack_from(buf, pos)[0], pos + 4
+    if tag == _INT64:
+        _need(buf, pos + 8)
+        return _I64.unpack_from(buf, pos)[0], pos + 8
+    if tag == _FLOAT64:
+        _need(buf, pos + 8)
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    if tag == _STR8:
+        _need(buf, pos + 1)
+        end = pos + 1 + buf[pos]
+        _need(buf, end)
+        return buf[pos + 1:end].decode("utf-8"), end
+    if tag == _STR32:
+        _need(buf, pos + 4)
+        end = pos + 4 + _U32.unpack_from(buf, pos)[0]
+        _need(buf, end)
+        return buf[pos + 4:end].decode("utf-8"), end
+    if tag == _LIST32:
+        _need(buf, pos + 4)
+        return _unpack_list(buf, pos + 4, keys, _U32.unpack_from(buf, pos)[0])
+    if tag == _MAP32:
+        _need(buf, pos + 4)
+        return _unpack_map(buf, pos + 4, keys, _U32.unpack_from(buf, pos)[0])
+    if tag == _BIGINT:
+        _need(buf, pos + 1)
+        end = pos + 1 + buf[pos]
+        _need(buf, end)
+        return int.from_bytes(buf[pos + 1:end], "little", signed=True), end
+    raise ValueError(f"unknown binary tag 0x{tag:02x}")
+
+
+def _need(buf: bytes, end: int) -> None:
+    if end > len(buf):
+        raise ValueError("truncated binary frame")
+
+
+def _unpack_list(buf: bytes, pos: int, keys: List[str], n: int) -> Tuple[list, int]:
+    # Every item takes at least one byte; reject counts that cannot fit
+    # so a forged header can't make us loop for billions of items.
+    _need(buf, pos + n)
+    out = []
+    append = out.append
+    for _ in range(n):
+        tag = buf[pos]
+        if tag < 0x80:
+            append(tag)
+            pos += 1
+        else:
+            value, pos = _unpack_from(buf, pos, keys)
+            append(value)
+    return out, pos
+
+
+def _unpack_map(buf: bytes, pos: int, keys: List[str], n: int) -> Tuple[dict, int]:
+    _need(buf, pos + 2 * n)
+    out = {}
+    for _ in range(n):
+        token = buf[pos]
+        pos += 1
+        if token < _KEY_NEW:
+            if token >= len(keys):
+                raise ValueError(f"unknown key index {token}")
+            key = keys[token]
+        elif token == _KEY_WIDE:
+            _need(buf, pos + 2)
+            idx = _U16.unpack_from(buf, pos)[0]
+            pos += 2
+            if idx >= len(keys):
+                raise ValueError(f"unknown key index {idx}")
+            key = keys[idx]
+        else:
+            _need(buf, pos + 2)
+            end = pos + 2 + _U16.unpack_from(buf, pos)[0]
+            _need(buf, end)
+            key = buf[pos + 2:end].decode("utf-8")
+            pos = end
+            if len(keys) < _MAX_KEYS:
+                keys.append(key)
+        _need(buf, pos + 1)
+        tag = buf[pos]
+        if tag < 0x80:
+            out[key] = tag
+            pos += 1
+        else:
+            out[key], pos = _unpack_from(buf, pos, keys)
+    return out, pos
+
+
+def unpack(data: bytes) -> Any:
+    """Decode one value produced by :func:`pack`; reject trailing bytes."""
+    buf = bytes(data)
+    if not buf:
+        raise ValueError("truncated binary frame")
+    try:
+        result, pos = _unpack_from(buf, 0, list(STATIC_KEYS))
+    except IndexError as e:
+        raise ValueError("truncated binary frame") from e
+    if pos != len(buf):
+        raise ValueError(f"unexpected {len(buf) - pos} bytes after value")
+    return result
@@ -0,0 +1,179 @@
+# app/firewall_helper/fake_backend.py
+"""
+Fake helper process for exercising the split IPC off Windows.
+
+Runs the real ``HelperDispatcher`` against :class:`FakeDisruptionManager`
+(no WinDivert, no Qt) behind a :class:`UnixSocketServer`, so tests and
+``bench/latency_regression.py`` can drive the full proxy → socket →
+dispatcher path across a real process boundary.
+
+    python -m app.firewall_helper.fake_backend --socket /tmp/dupez.sock
+
+The 32-byte shared secret is read as hex from the first line of stdin
+(never argv, which other local users can read). The process prints
+``READY`` once it is listening and exits when stdin closes or a client
+sends ``shutdown``. :func:`spawn_fake_backend` wraps all of that.
+
+This is NOT a production code path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.firewall_helper.protocol import OP_GET_STATUS, Request, Response
+from app.firewall_helper.server import HelperDispatcher
+from app.firewall_helper.snapshot_cache import SNAPSHOT_INTERVAL_SEC
+
+__all__ = ["FakeDisruptionManager", "spawn_fake_backend"]
+
+
+class FakeDisruptionManager:
+    """In-memory manager with the API shape HelperDispatcher calls.
+
+    Every call is deliberately cheap so measurements show transport
+    overhead, not engine work.
+    """
+
+    def __init__(self) -> None:
+        self._started = False
+        self._disrupted: set[str] = set()
+
+    def initialize(self) -> bool:
+        return True
+
+    def start(self) -> None:
+        self._started = True
+
+    def stop(self) -> None:
+        self._started = False
+
+    def disrupt_device(self, ip, methods=None, params=None, **kwargs) -> bool:
+        self._disrupted.add(ip)
+        return True
+
+    def stop_device(self, ip) -> bool:
+        self._disrupted.discard(ip)
+        return True
+
+    def stop_all_devices(self) -> bool:
+        self._disrupted.clear()
+        return True
+
+    def get_disrupted_devices(self) -> List[str]:
+        return list(self._disrupted)
+
+    def get_device_status(self, ip) -> Dict[str, Any]:
+        return {"ip": ip, "active": ip in self._disrupted}
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "started": self._started,
+            "count": len(self._disrupted),
+            "mode": "bench",
+        }
+
+    def get_engine_stats(self) -> Dict[str, Any]:
+        return {"fps": 60, "queue_depth": 0}
+
+    def hotkey_trigger(self, action, payload) -> bool:
+        return True
+
+
+def _handler(dispatcher: HelperDispatcher, service_us: float):
+    if service_us <= 0:
+        return dispatcher.dispatch
+    delay = service_us / 1e6
+
+    def _dispatch(request: Request) -> Response:
+        # Simulated helper work for concurrency measurements.
+        if request.op == OP_GET_STATUS:
+            time.sleep(delay)
+        return dispatcher.dispatch(request)
+
+    return _dispatch
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.firewall_helper.unix_transport import UnixSocketServer
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--socket", required=True)
+    ap.add_argument("--service-us", type=float, default=0.0)
+    ap.add_argument(
+        "--snapshot-ms", type=float, default=SNAPSHOT_INTERVAL_SEC * 1000.0,
+        help="Helper snapshot rebuild interval (0 = rebuild on every poll)",
+    )
+    args = ap.parse_args(argv)
+
+    secret = bytes.fromhex(sys.stdin.readline().strip())
+    dispatcher = HelperDispatcher(
+        FakeDisruptionManager(), snapshot_interval_sec=args.snapshot_ms / 1000.0,
+    )
+    server = UnixSocketServer(
+        _handler(dispatcher, args.service_us), secret, args.socket,
+    )
+    server.start()
+    print("READY", flush=True)
+
+    def _watch_stdin() -> None:
+        sys.stdin.read()  # returns at EOF: the parent went away
+        dispatcher.shutdown_event.set()
+
+    threading.Thread(target=_watch_stdin, name="fake-backend-stdin", daemon=True).start()
+    dispatcher.shutdown_event.wait()
+    server.stop()
+    return 0
+
+
+def spawn_fake_backend(
+    socket_path: str,
+    shared_secret: bytes,
+    *,
+    service_us: float = 0.0,
+    timeout_sec: float = 15.0,
+) -> subprocess.Popen:
+    """Start the fake backend in a child process and wait until it listens.
+
+    Close the returned process's stdin (or send ``shutdown``) to stop it.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.firewall_helper.fake_backend",
+         "--socket", socket_path, "--service-us", str(service_us)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        cwd=root,
+        env=env,
+        text=True,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    proc.stdin.write(shared_secret.hex() + "\n")
+    proc.stdin.flush()
+
+    ready = threading.Event()
+
+    def _wait_ready() -> None:
+        for line in proc.stdout:
+            if line.strip() == "READY":
+                ready.set()
+                return
+
+    threading.Thread(target=_wait_ready, name="fake-backend-ready", daemon=True).start()
+    if not ready.wait(timeout_sec):
+        proc.kill()
+        proc.wait()
+        raise RuntimeError(f"fake backend did not start (exit={proc.returncode})")
+    return proc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
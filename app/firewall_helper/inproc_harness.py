@@ -22,10 +22,10 @@ Usage:
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, FrozenSet
 
 from app.firewall_helper.ipc_client import DisruptionManagerProxy
-from app.firewall_helper.protocol import Request, Response
+from app.firewall_helper.protocol import BINARY_HEADER, CAP_SNAPSHOT, Request, Response
 from app.firewall_helper.server import HelperDispatcher
 
 
@@ -33,11 +33,28 @@ class _LoopbackPipeClient:
     """Stand-in for PipeClient that shortcuts directly to a dispatcher.
 
     Reuses the exact same encode/decode path as the real pipe so the
-    harness exercises every byte of the production serialization.
+    harness exercises every byte of the production serialization. With
+    ``binary=True`` that is the length-prefixed binary frame mode a
+    connection uses after negotiating ``CAP_BINARY``; ``snapshots=True``
+    reports ``CAP_SNAPSHOT`` so the proxy polls with deltas.
     """
 
-    def __init__(self, dispatcher: HelperDispatcher) -> None:
+    def __init__(
+        self,
+        dispatcher: HelperDispatcher,
+        *,
+        binary: bool = False,
+        snapshots: bool = False,
+    ) -> None:
         self._dispatcher = dispatcher
+        self._binary = binary
+        self._capabilities: FrozenSet[str] = (
+            frozenset({CAP_SNAPSHOT}) if snapshots else frozenset()
+        )
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        return self._capabilities
 
     def connect(self, timeout_ms: int = 0) -> None:  # pragma: no cover
         return None
@@ -51,6 +68,11 @@ class _LoopbackPipeClient:
         timeout_ms: int = 0,
     ) -> Response:
         del timeout_ms
+        if self._binary:
+            header = BINARY_HEADER.size
+            decoded_req = Request.decode_binary(request.encode_binary()[header:])
+            response = self._dispatcher.dispatch(decoded_req)
+            return Response.decode_binary(response.encode_binary()[header:])
         # Roundtrip through encode/decode so any protocol bugs surface
         # in the harness exactly the same way they would on the wire.
         wire = request.encode().rstrip(b"\n")
@@ -68,10 +90,21 @@ class LoopbackClient(DisruptionManagerProxy):
     dependencies.
     """
 
-    def __init__(self, disruption_manager: Any) -> None:
+    def __init__(
+        self,
+        disruption_manager: Any,
+        *,
+        binary: bool = False,
+        snapshots: bool = False,
+        snapshot_interval_sec: float = 0.0,
+    ) -> None:
         super().__init__()
-        self._dispatcher = HelperDispatcher(disruption_manager)
-        self._client = _LoopbackPipeClient(self._dispatcher)
+        self._dispatcher = HelperDispatcher(
+            disruption_manager, snapshot_interval_sec=snapshot_interval_sec,
+        )
+        self._client = _LoopbackPipeClient(
+            self._dispatcher, binary=binary, snapshots=snapshots,
+        )
         self._connected = True  # bypass _ensure_helper
 
     def _ensure_helper(self) -> None:
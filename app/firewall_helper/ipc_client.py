@@ -18,11 +18,13 @@ and then keeps the controller API surface unchanged.
 
 from __future__ import annotations
 
+import dataclasses
 import logging
 import threading
 from typing import Any, Dict, List, Optional
 
 from app.firewall_helper.protocol import (
+    CAP_SNAPSHOT,
     ERR_NONE,
     OP_BLOCK_DEVICE,
     OP_CLEAR_ALL_BLOCKS,
@@ -44,9 +46,11 @@ from app.firewall_helper.protocol import (
     OP_STOP_ALL,
     OP_STOP_DEVICE,
     OP_UNBLOCK_DEVICE,
+    MUTATING_OPS,
     Request,
     Response,
 )
+from app.firewall_helper.snapshot_cache import SnapshotMirror
 from app.firewall_helper.transport import (
     FRAME_TIMEOUT_MS,
     MUTATION_TIMEOUT_MS,
@@ -55,19 +59,7 @@ from app.firewall_helper.transport import (
 
 log = logging.getLogger(__name__)
 
-_MUTATING_OPS = frozenset({
-    OP_INITIALIZE,
-    OP_START,
-    OP_STOP,
-    OP_DISRUPT_DEVICE,
-    OP_STOP_DEVICE,
-    OP_STOP_ALL,
-    OP_SET_IP_FORWARDING,
-    OP_BLOCK_DEVICE,
-    OP_UNBLOCK_DEVICE,
-    OP_CLEAR_ALL_BLOCKS,
-    OP_SHUTDOWN,
-})
+_MUTATING_OPS = MUTATING_OPS
 
 
 class DisruptionManagerProxy:
@@ -102,6 +94,9 @@ class DisruptionManagerProxy:
         # for the helper to read on startup. Both sides prove knowledge
         # of this key before any opcode is dispatched.
         self._shared_secret: Optional[bytes] = None
+        # Local copy of the helper's polled snapshots; status queries send
+        # the generation we hold and receive only what changed.
+        self._mirror = SnapshotMirror()
 
     # ── Lifecycle ──────────────────────────────────────────────────
 
@@ -222,6 +217,30 @@ class DisruptionManagerProxy:
             self._helper_spawn_attempted = False
             raise
 
+    def _call_snapshot(self, op: str, args: Optional[Dict[str, Any]] = None) -> Response:
+        """_call for a polled query, using snapshot deltas when negotiated.
+
+        The returned Response carries the full, merged value either way.
+        """
+        self._ensure_helper()
+        if CAP_SNAPSHOT not in getattr(self._client, "capabilities", ()):
+            return self._call(op, args)
+        key = (op, (args or {}).get("ip"))
+        resp = self._call(op, {**(args or {}), **self._mirror.request_args(key)})
+        if not resp.ok:
+            return resp
+        try:
+            merged = self._mirror.merge(key, resp.result)
+        except ValueError as e:
+            # A patch against a copy we no longer hold; merge() dropped
+            # the entry, so this asks for it whole.
+            log.warning("snapshot mirror out of sync (%s) — refetching", e)
+            resp = self._call(op, {**(args or {}), **self._mirror.request_args(key)})
+            if not resp.ok:
+                return resp
+            merged = self._mirror.merge(key, resp.result)
+        return dataclasses.replace(resp, result=merged)
+
     # ── API — matches in-process manager 1:1 ───────────────────────
 
     def initialize(self) -> bool:
@@ -302,7 +321,7 @@ class DisruptionManagerProxy:
 
     def get_device_status(self, ip: str) -> Dict:
         try:
-            resp = self._call(OP_GET_DEVICE_STATUS, {"ip": ip})
+            resp = self._call_snapshot(OP_GET_DEVICE_STATUS, {"ip": ip})
             if not resp.ok:
                 raise RuntimeError(
                     resp.error_message or "helper rejected device-status query"
@@ -316,7 +335,7 @@ class DisruptionManagerProxy:
 
     def get_status(self) -> Dict:
         try:
-            resp = self._call(OP_GET_STATUS)
+            resp = self._call_snapshot(OP_GET_STATUS)
             if not resp.ok:
                 raise RuntimeError(
                     resp.error_message or "helper rejected engine-status query"
@@ -330,7 +349,7 @@ class DisruptionManagerProxy:
 
     def get_engine_stats(self) -> Dict:
         try:
-            resp = self._call(OP_GET_ENGINE_STATS)
+            resp = self._call_snapshot(OP_GET_ENGINE_STATS)
             if not resp.ok:
                 raise RuntimeError(
                     resp.error_message or "helper rejected engine-stats query"
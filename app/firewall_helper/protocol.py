@@ -18,15 +18,41 @@ response frame terminated by LF.
 
 Max frame size enforced at 64 KiB — we never send packet bodies here, so
 this is plenty for control messages.
+
+Pipelining:
+    Peers that both advertise ``CAP_PIPELINE`` during the handshake may
+    keep several requests in flight on one connection. Responses then
+    arrive in completion order and are matched to their request by
+    ``request_id``. Mutating ops are still executed one at a time, in
+    the order they were received; read-only queries may overtake them.
+
+Binary frames:
+    When both peers also advertise ``CAP_BINARY``, every frame after the
+    handshake is ``<u32 big-endian length><payload>`` where the payload is
+    the message's fields, in order, packed by ``binary_codec``. The
+    handshake itself is always JSON, and JSON remains the default: a peer
+    that does not know this exact capability name (an older build or a
+    different binary revision) simply keeps the JSON framing. Version and
+    opcode checks are the same in both modes.
+
+Snapshot deltas:
+    With ``CAP_SNAPSHOT`` negotiated, ``get_status``, ``get_engine_stats``
+    and ``get_device_status`` accept ``since_generation`` and ``epoch``
+    arguments and reply with only what changed since that generation, or
+    "not modified" (see ``snapshot_cache``). Without those arguments the
+    ops answer exactly as before.
 """
 
 from __future__ import annotations
 
 import json
+import struct
 import threading
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from app.firewall_helper.binary_codec import pack, unpack
+
 PROTOCOL_VERSION = 1
 MAX_FRAME_BYTES = 64 * 1024
 FRAME_TERMINATOR = b"\n"
@@ -80,6 +106,41 @@ ALLOWED_OPS = frozenset({
     OP_SET_IP_FORWARDING,
 })
 
+# Ops that change helper state. The server runs these strictly in arrival
+# order even on a pipelined connection; everything else is a read-only
+# query that may be answered concurrently. The hotkey hook can start or
+# stop disruptions, so it is a mutation too.
+MUTATING_OPS = frozenset({
+    OP_INITIALIZE,
+    OP_START,
+    OP_STOP,
+    OP_DISRUPT_DEVICE,
+    OP_STOP_DEVICE,
+    OP_STOP_ALL,
+    OP_SET_IP_FORWARDING,
+    OP_BLOCK_DEVICE,
+    OP_UNBLOCK_DEVICE,
+    OP_CLEAR_ALL_BLOCKS,
+    OP_HOTKEY_TRIGGER,
+    OP_SHUTDOWN,
+})
+
+# ── Connection capabilities (negotiated in the auth handshake) ──────────
+
+CAP_PIPELINE = "pipeline"
+CAP_BINARY = "binary-v1"
+CAP_SNAPSHOT = "snapshot-delta"
+
+# Polled queries that support ``since_generation`` under CAP_SNAPSHOT.
+SNAPSHOT_OPS = frozenset({
+    OP_GET_STATUS,
+    OP_GET_ENGINE_STATS,
+    OP_GET_DEVICE_STATUS,
+})
+
+# Binary-mode frame header: payload length, big-endian.
+BINARY_HEADER = struct.Struct(">I")
+
 # ── Error codes ─────────────────────────────────────────────────────────
 
 ERR_NONE = 0
@@ -92,6 +153,22 @@ ERR_TIMEOUT = 5
 
 # ── Request / response dataclasses ──────────────────────────────────────
 
+def _binary_frame(fields: list) -> bytes:
+    payload = pack(fields)
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ValueError(f"binary frame too large: {len(payload)} bytes")
+    return BINARY_HEADER.pack(len(payload)) + payload
+
+
+def _binary_fields(raw: bytes, kind: str, count: int) -> list:
+    if len(raw) > MAX_FRAME_BYTES:
+        raise ValueError(f"{kind} frame too large: {len(raw)} bytes")
+    fields = unpack(raw)
+    if not isinstance(fields, list) or len(fields) != count:
+        raise ValueError(f"{kind} frame must be a {count}-field record")
+    return fields
+
+
 _id_lock = threading.Lock()
 _next_id = 0
 
@@ -112,7 +189,18 @@ class Request:
     version: int = PROTOCOL_VERSION
 
     def encode(self) -> bytes:
-        return (json.dumps(asdict(self), separators=(",", ":")) + "\n").encode("utf-8")
+        # Fields in declaration order, like ``asdict`` — which would also
+        # deep-copy ``args`` before serializing it.
+        obj = {
+            "op": self.op,
+            "request_id": self.request_id,
+            "args": self.args,
+            "version": self.version,
+        }
+        return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def encode_binary(self) -> bytes:
+        return _binary_frame([self.version, self.request_id, self.op, self.args])
 
     @staticmethod
     def decode(raw: bytes) -> "Request":
@@ -121,14 +209,28 @@ class Request:
         obj = json.loads(raw.decode("utf-8"))
         if not isinstance(obj, dict):
             raise ValueError("request frame must be JSON object")
-        op = obj.get("op")
+        return Request._build(
+            obj.get("op"),
+            obj.get("request_id", 0),
+            obj.get("args"),
+            obj.get("version", PROTOCOL_VERSION),
+        )
+
+    @staticmethod
+    def decode_binary(raw: bytes) -> "Request":
+        """Decode a binary payload (without its length header)."""
+        version, request_id, op, args = _binary_fields(raw, "request", 4)
+        return Request._build(op, request_id, args, version)
+
+    @staticmethod
+    def _build(op: Any, request_id: Any, args: Any, version: Any) -> "Request":
         if op not in ALLOWED_OPS:
             raise ValueError(f"unknown or disallowed op: {op!r}")
         return Request(
             op=op,
-            request_id=int(obj.get("request_id", 0)),
-            args=obj.get("args") or {},
-            version=int(obj.get("version", PROTOCOL_VERSION)),
+            request_id=int(request_id),
+            args=args or {},
+            version=int(version),
         )
 
 
@@ -142,7 +244,23 @@ class Response:
     version: int = PROTOCOL_VERSION
 
     def encode(self) -> bytes:
-        return (json.dumps(asdict(self), separators=(",", ":")) + "\n").encode("utf-8")
+        # Shallow field dict: ``asdict`` would deep-copy large stats
+        # results only to serialize the copy.
+        obj = {
+            "request_id": self.request_id,
+            "ok": self.ok,
+            "result": self.result,
+            "error_code": self.error_code,
+            "error_message": self.error_message,
+            "version": self.version,
+        }
+        return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def encode_binary(self) -> bytes:
+        return _binary_frame([
+            self.version, self.request_id, self.ok, self.result,
+            self.error_code, self.error_message,
+        ])
 
     @staticmethod
     def decode(raw: bytes) -> "Response":
@@ -160,6 +278,21 @@ class Response:
             version=int(obj.get("version", PROTOCOL_VERSION)),
         )
 
+    @staticmethod
+    def decode_binary(raw: bytes) -> "Response":
+        """Decode a binary payload (without its length header)."""
+        version, request_id, ok, result, error_code, error_message = _binary_fields(
+            raw, "response", 6,
+        )
+        return Response(
+            request_id=int(request_id),
+            ok=bool(ok),
+            result=result,
+            error_code=int(error_code),
+            error_message=str(error_message),
+            version=int(version),
+        )
+
     @classmethod
     def success(cls, request_id: int, result: Any = None) -> "Response":
         return cls(request_id=request_id, ok=True, result=result)
@@ -25,6 +25,7 @@ from app.firewall_helper.protocol import (
     ERR_BAD_REQUEST,
     ERR_INTERNAL,
     ERR_UNKNOWN_OP,
+    MUTATING_OPS,
     OP_BLOCK_DEVICE,
     OP_CLEAR_ALL_BLOCKS,
     OP_DISRUPT_DEVICE,
@@ -48,25 +49,35 @@ from app.firewall_helper.protocol import (
     Request,
     Response,
 )
+from app.firewall_helper.snapshot_cache import SNAPSHOT_INTERVAL_SEC, SnapshotCache
 from app.firewall_helper.transport import PipeServer
 
 log = logging.getLogger(__name__)
 
+# Ops after which cached status snapshots may be wrong.
+_INVALIDATING_OPS = MUTATING_OPS
+
 
 class HelperDispatcher:
     """Translates IPC requests into disruption_manager method calls.
 
     The `disruption_manager` reference is injected at construction time
     so tests can inject a lightweight fake without importing WinDivert.
+
+    Status and stats queries are served from a SnapshotCache rebuilt at
+    most once per `snapshot_interval_sec` (0 = every request) and dropped
+    after every mutating op, so a poll never returns pre-mutation state.
     """
 
     def __init__(
         self,
         disruption_manager: Any,
         blocker_module: Any = None,
+        snapshot_interval_sec: float = 0.0,
     ) -> None:
         self._dm = disruption_manager
         self._blocker = blocker_module  # Optional: None => blocker ops noop
+        self._snapshots = SnapshotCache(snapshot_interval_sec)
         self._shutdown_event = threading.Event()
         self._handlers: Dict[str, Callable[[Request], Response]] = {
             OP_PING: self._h_ping,
@@ -95,6 +106,10 @@ class HelperDispatcher:
     def shutdown_event(self) -> threading.Event:
         return self._shutdown_event
 
+    @property
+    def snapshots(self) -> SnapshotCache:
+        return self._snapshots
+
     def dispatch(self, request: Request) -> Response:
         handler = self._handlers.get(request.op)
         if handler is None:
@@ -112,6 +127,27 @@ class HelperDispatcher:
                 error_code=ERR_INTERNAL,
                 error_message=f"{type(e).__name__}: {e}",
             )
+        finally:
+            if request.op in _INVALIDATING_OPS:
+                self._snapshots.invalidate()
+
+    def _snapshot(self, req: Request, key: Any, build: Callable[[], Any]) -> Response:
+        """Answer a polled query from the snapshot cache.
+
+        With ``since_generation`` (CAP_SNAPSHOT clients) the result is a
+        snapshot_cache reply; otherwise it is the plain value, as before.
+        """
+        args = req.args or {}
+        if "since_generation" in args:
+            return Response.success(
+                req.request_id,
+                self._snapshots.since(
+                    key, build, args.get("since_generation"), args.get("epoch"),
+                ),
+            )
+        if self._snapshots.interval_sec <= 0:
+            return Response.success(req.request_id, build())
+        return Response.success(req.request_id, self._snapshots.get(key, build))
 
     # ── Handlers ───────────────────────────────────────────────────
 
@@ -176,13 +212,17 @@ class HelperDispatcher:
             return Response.failure(
                 req.request_id, ERR_BAD_REQUEST, "missing 'ip'"
             )
-        return Response.success(req.request_id, dict(self._dm.get_device_status(ip)))
+        return self._snapshot(
+            req, (OP_GET_DEVICE_STATUS, ip), lambda: dict(self._dm.get_device_status(ip)),
+        )
 
     def _h_get_status(self, req: Request) -> Response:
-        return Response.success(req.request_id, dict(self._dm.get_status()))
+        return self._snapshot(req, OP_GET_STATUS, lambda: dict(self._dm.get_status()))
 
     def _h_get_engine_stats(self, req: Request) -> Response:
-        return Response.success(req.request_id, dict(self._dm.get_engine_stats()))
+        return self._snapshot(
+            req, OP_GET_ENGINE_STATS, lambda: dict(self._dm.get_engine_stats()),
+        )
 
     def _h_hotkey_trigger(self, req: Request) -> Response:
         action = (req.args or {}).get("action")
@@ -324,7 +364,11 @@ def run_helper_server(
             "Running without auth would expose every ALLOWED_OPS opcode "
             "to every Medium-IL process on the session."
         )
-    dispatcher = HelperDispatcher(disruption_manager, blocker_module=blocker_module)
+    dispatcher = HelperDispatcher(
+        disruption_manager,
+        blocker_module=blocker_module,
+        snapshot_interval_sec=SNAPSHOT_INTERVAL_SEC,
+    )
     server = PipeServer(handler=dispatcher.dispatch, shared_secret=shared_secret)
     server.start()
     log.info("run_helper_server: PipeServer started, dispatcher ready")
@@ -0,0 +1,306 @@
+# app/firewall_helper/snapshot_cache.py
+"""
+Generation-counted snapshots of the helper's polled state.
+
+The GUI polls ``get_status``, ``get_engine_stats`` and
+``get_device_status`` from several widgets, often within the same 100 ms.
+:class:`SnapshotCache` (helper side) rebuilds each snapshot at most once
+per interval, numbers every distinct value with a generation, and can
+answer "what changed since generation N" with a list of patches instead
+of the whole tree. :class:`SnapshotMirror` (main side) applies those
+patches to its local copy.
+
+Reply shapes (the ``result`` of a query sent with ``since_generation``):
+
+    {"epoch": E, "generation": G, "since_generation": B, "not_modified": true}
+    {"epoch": E, "generation": G, "since_generation": B,
+     "patches": [[path, value], [path], ...]}
+    {"epoch": E, "generation": G, "full": value}
+
+``path`` is a list of dict keys; ``[path, value]`` sets that subtree and
+``[path]`` deletes it. ``epoch`` identifies one cache instance, so a
+client whose mirror predates a helper restart gets a full reply instead
+of a patch against the wrong base.
+
+With pipelined requests two polls of one key can be in flight at once
+and their replies can arrive in either order. The mirror therefore
+ignores a reply older than the generation it holds, and applies
+patches only when their echoed base ``since_generation`` is the
+generation it holds; otherwise it drops the entry and the caller
+re-requests it whole.
+
+Only used on connections that negotiated ``protocol.CAP_SNAPSHOT``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.firewall_helper.binary_codec import _json_key
+
+__all__ = [
+    "SNAPSHOT_INTERVAL_SEC",
+    "SnapshotCache",
+    "SnapshotMirror",
+    "apply_patches",
+    "copy_tree",
+    "diff_snapshots",
+]
+
+# Default rebuild interval for the production helper. HelperDispatcher
+# itself defaults to 0 (always rebuild) so fakes mutated directly by
+# tests are never served stale.
+SNAPSHOT_INTERVAL_SEC = 0.1
+
+# Past generations kept per key for computing patches. Pollers normally
+# ask for the previous generation, so a short history covers them.
+_HISTORY = 4
+# Bound on distinct keys (one per polled device IP).
+_MAX_KEYS = 64
+
+
+def copy_tree(value: Any) -> Any:
+    """Deep copy of a JSON-shaped tree with JSON semantics.
+
+    Keys are coerced the way ``json.dumps`` does and tuples become
+    lists, so a helper snapshot compares and patches exactly like the
+    client's decoded copy. Cheaper than ``copy.deepcopy`` (no memo) and
+    than a JSON round-trip.
+    """
+    t = type(value)
+    if t is dict:
+        return {
+            (k if type(k) is str else _json_key(k)): copy_tree(v)
+            for k, v in value.items()
+        }
+    if t is list or t is tuple:
+        return [copy_tree(v) for v in value]
+    if isinstance(value, dict):
+        return copy_tree(dict(value))
+    if isinstance(value, (list, tuple)):
+        return [copy_tree(v) for v in value]
+    return value
+
+
+def diff_snapshots(old: Any, new: Any) -> Optional[List[list]]:
+    """Return patches turning *old* into *new*, or None to send it whole."""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    patches: List[list] = []
+    _diff_into(old, new, [], patches)
+    return patches
+
+
+def _diff_into(old: dict, new: dict, path: List[str], out: List[list]) -> None:
+    for key, value in new.items():
+        if key not in old:
+            out.append([path + [key], value])
+            continue
+        before = old[key]
+        if before == value:
+            continue
+        if isinstance(before, dict) and isinstance(value, dict):
+            _diff_into(before, value, path + [key], out)
+        else:
+            out.append([path + [key], value])
+    for key in old:
+        if key not in new:
+            out.append([path + [key]])
+
+
+def apply_patches(base: dict, patches: List[list]) -> dict:
+    """Return a new tree with *patches* applied; *base* is not modified.
+
+    Dicts along each patched path are copied, untouched subtrees are
+    shared with *base*.
+    """
+    root = dict(base)
+    copied = {id(root)}
+    for patch in patches:
+        if not isinstance(patch, list) or not patch or not isinstance(patch[0], list):
+            raise ValueError(f"malformed snapshot patch: {patch!r}")
+        path = patch[0]
+        if not path:
+            raise ValueError("snapshot patch with empty path")
+        node = root
+        for key in path[:-1]:
+            child = node.get(key)
+            if not isinstance(child, dict):
+                raise ValueError(f"snapshot patch path not found: {path!r}")
+            if id(child) not in copied:
+                child = dict(child)
+                copied.add(id(child))
+                node[key] = child
+            node = child
+        if len(patch) == 2:
+            node[path[-1]] = patch[1]
+        else:
+            node.pop(path[-1], None)
+    return root
+
+
+class _Entry:
+    __slots__ = ("lock", "value", "generation", "built_at", "token", "history", "deltas")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.value: Any = None
+        self.generation = 0
+        self.built_at = float("-inf")
+        self.token = -1
+        self.history: "OrderedDict[int, Any]" = OrderedDict()
+        # Patches from an older generation to the current one, shared by
+        # every poller that asks with the same since_generation.
+        self.deltas: Dict[int, Optional[List[list]]] = {}
+
+
+class SnapshotCache:
+    """Per-key snapshots rebuilt at most once per *interval_sec*.
+
+    Thread-safe: concurrent readers of one key share a single rebuild.
+    :meth:`invalidate` (called after every mutating op) forces the next
+    read of every key to rebuild, even one already in progress.
+    """
+
+    def __init__(self, interval_sec: float = SNAPSHOT_INTERVAL_SEC) -> None:
+        self.interval_sec = max(0.0, float(interval_sec))
+        self.epoch = os.urandom(8).hex()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._token = 0
+        self.rebuilds = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._token += 1
+
+    def _entry(self, key: Hashable) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                while len(self._entries) > _MAX_KEYS:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _current(self, entry: _Entry, build: Callable[[], Any]) -> None:
+        """Refresh *entry* if stale. Caller holds ``entry.lock``."""
+        token = self._token
+        if entry.token == token and time.monotonic() - entry.built_at < self.interval_sec:
+            return
+        value = copy_tree(build())
+        self.rebuilds += 1
+        entry.built_at = time.monotonic()
+        entry.token = token
+        if entry.generation and value == entry.value:
+            return
+        entry.generation += 1
+        entry.value = value
+        entry.history[entry.generation] = value
+        while len(entry.history) > _HISTORY:
+            entry.history.popitem(last=False)
+        entry.deltas.clear()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the current snapshot for *key* (shared; do not mutate)."""
+        entry = self._entry(key)
+        with entry.lock:
+            self._current(entry, build)
+            return entry.value
+
+    def since(
+        self,
+        key: Hashable,
+        build: Callable[[], Any],
+        since_generation: Any,
+        epoch: Any = None,
+    ) -> Dict[str, Any]:
+        """Reply for a client that last saw *since_generation* of *key*."""
+        entry = self._entry(key)
+        with entry.lock:
+            self._current(entry, build)
+            reply: Dict[str, Any] = {"epoch": self.epoch, "generation": entry.generation}
+            if epoch != self.epoch or not isinstance(since_generation, int):
+                reply["full"] = entry.value
+                return reply
+            if since_generation == entry.generation:
+                reply["since_generation"] = since_generation
+                reply["not_modified"] = True
+                return reply
+            if since_generation not in entry.deltas:
+                base = entry.history.get(since_generation)
+                entry.deltas[since_generation] = (
+                    None if base is None else diff_snapshots(base, entry.value)
+                )
+            patches = entry.deltas[since_generation]
+            if patches is None:
+                reply["full"] = entry.value
+            else:
+                reply["since_generation"] = since_generation
+                reply["patches"] = patches
+            return reply
+
+
+class SnapshotMirror:
+    """Main-side copy of the helper's snapshots, updated from replies."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._epoch: Optional[str] = None
+        self._entries: Dict[Hashable, Tuple[int, Any]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._epoch = None
+            self._entries.clear()
+
+    def request_args(self, key: Hashable) -> Dict[str, Any]:
+        """``since_generation``/``epoch`` arguments for the next query."""
+        with self._lock:
+            known = self._entries.get(key)
+            return {
+                "since_generation": known[0] if known is not None else 0,
+                "epoch": self._epoch,
+            }
+
+    def merge(self, key: Hashable, reply: Any) -> Any:
+        """Fold a reply into the mirror and return a private copy of the value.
+
+        Raises ValueError — after dropping the entry, so the next
+        :meth:`request_args` asks for a full copy — when a delta does not
+        apply to the generation held.
+        """
+        if not isinstance(reply, dict) or not isinstance(reply.get("generation"), int):
+            raise TypeError("helper returned an invalid snapshot reply")
+        generation = reply["generation"]
+        with self._lock:
+            if reply.get("epoch") != self._epoch:
+                self._epoch = reply.get("epoch")
+                self._entries.clear()
+            known = self._entries.get(key)
+            if known is not None and generation <= known[0]:
+                # Overtaken by a newer reply to a pipelined poll.
+                value = known[1]
+            elif "full" in reply:
+                value = reply["full"]
+                self._entries[key] = (generation, value)
+            elif known is None or reply.get("since_generation") != known[0]:
+                self._entries.pop(key, None)
+                raise ValueError("snapshot delta against a copy the mirror does not hold")
+            elif reply.get("not_modified"):
+                value = known[1]
+                self._entries[key] = (generation, value)
+            else:
+                try:
+                    value = apply_patches(known[1], reply.get("patches") or [])
+                except ValueError:
+                    self._entries.pop(key, None)
+                    raise
+                self._entries[key] = (generation, value)
+        return copy_tree(value)
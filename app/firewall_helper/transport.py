@@ -16,7 +16,9 @@ This module provides:
     * PipeServer  — helper side. Accepts one client connection at a time,
                     dispatches frames via a user-supplied handler.
     * PipeClient  — main side. Connects to the pipe, sends framed requests,
-                    reads framed responses. Thread-safe via an internal lock.
+                    and demultiplexes responses on one reader thread.
+                    Thread-safe; concurrent calls share the connection
+                    when the helper negotiated ``CAP_PIPELINE``.
 
 Both classes expect `protocol.Request` / `protocol.Response` dataclasses.
 
@@ -28,10 +30,12 @@ from __future__ import annotations
 
 import logging
 import os
+import socket
 import sys
 import threading
 import time
-from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
 
 from app.firewall_helper.auth import (
     AuthenticationError,
@@ -41,8 +45,15 @@ from app.firewall_helper.auth import (
     handshake_server,
 )
 from app.firewall_helper.protocol import (
+    BINARY_HEADER,
+    CAP_BINARY,
+    CAP_PIPELINE,
+    CAP_SNAPSHOT,
+    ERR_BAD_REQUEST,
+    ERR_INTERNAL,
     FRAME_TERMINATOR,
     MAX_FRAME_BYTES,
+    MUTATING_OPS,
     Request,
     Response,
 )
@@ -62,6 +73,19 @@ FRAME_TIMEOUT_MS = 5_000
 # Keep them bounded without reusing the much shorter status-query budget.
 MUTATION_TIMEOUT_MS = 30_000
 
+# Pipelining limits: calls one client may have outstanding, and helper
+# threads answering read-only queries concurrently on one connection.
+MAX_IN_FLIGHT = 32
+QUERY_WORKERS = 4
+
+# The helper accepts every capability it implements; the client decides
+# what to offer. Binary frames stay opt-in on the client side.
+SERVER_CAPABILITIES = (CAP_PIPELINE, CAP_BINARY, CAP_SNAPSHOT)
+BINARY_ENV_VAR = "DUPEZ_IPC_BINARY"
+
+_READ_CHUNK_BYTES = 65536
+_ERROR_PIPE_CONNECTED = 535
+
 
 # ── Import Windows IPC primitives lazily for non-Windows test fakes ─
 
@@ -118,48 +142,317 @@ def _build_cross_il_pipe_sa():
         return None
 
 
-# ── Frame helpers ───────────────────────────────────────────────────────
+# ── Streams and framing ─────────────────────────────────────────────────
+#
+# Everything above the OS handle talks to a small "stream" object with
+# three methods: ``read_chunk() -> bytes`` (b"" on disconnect),
+# ``write(data)`` and ``close()``. The named pipe and a plain stream socket
+# both fit, so the session logic below is shared and testable on Linux.
 
-def _read_frame(pipe_handle, win32file, pywintypes) -> Optional[bytes]:
-    """Read one LF-terminated frame from *pipe_handle*.
+class FrameReader:
+    """Split a byte stream into frames.
 
-    Returns the frame bytes (without the terminator), or None if the peer
-    closed the pipe. Raises on protocol violations (oversized frames).
+    Frames are LF-terminated JSON until :meth:`use_binary` switches the
+    reader to length-prefixed frames (after a handshake that negotiated
+    ``CAP_BINARY``). Bytes that follow a frame are kept for the next call,
+    so a peer may write several frames back to back and a single read may
+    carry more than one of them.
     """
-    buf = bytearray()
-    try:
-        while len(buf) < MAX_FRAME_BYTES:
-            # ReadFile with a modest chunk; loop until we see LF.
-            hr, chunk = win32file.ReadFile(pipe_handle, 4096)
+
+    __slots__ = ("_read_chunk", "_buf", "_scanned", "_binary")
+
+    def __init__(self, read_chunk: Callable[[], bytes]) -> None:
+        self._read_chunk = read_chunk
+        self._buf = bytearray()
+        self._scanned = 0  # bytes already searched for a terminator
+        self._binary = False
+
+    def use_binary(self) -> None:
+        self._binary = True
+
+    def read_frame(self) -> Optional[bytes]:
+        """Return the next frame payload, or None on EOF.
+
+        Raises ValueError if a frame exceeds MAX_FRAME_BYTES.
+        """
+        if self._binary:
+            return self._read_prefixed()
+        while True:
+            idx = self._buf.find(FRAME_TERMINATOR, self._scanned)
+            if idx >= 0:
+                frame = bytes(self._buf[:idx])
+                del self._buf[:idx + 1]
+                self._scanned = 0
+                return frame
+            if len(self._buf) >= MAX_FRAME_BYTES:
+                raise ValueError(
+                    f"frame exceeded {MAX_FRAME_BYTES} bytes without terminator"
+                )
+            self._scanned = len(self._buf)
+            chunk = self._read_chunk()
             if not chunk:
                 return None
-            buf.extend(chunk)
-            term_idx = buf.find(FRAME_TERMINATOR)
-            if term_idx >= 0:
-                frame = bytes(buf[:term_idx])
-                leftover = bytes(buf[term_idx + 1:])
-                if leftover:
-                    # Protocol is one-frame-per-request on control plane;
-                    # leftover implies peer pipelined frames. Reject.
-                    raise ValueError(
-                        f"unexpected {len(leftover)} bytes after frame terminator"
-                    )
-                return frame
-    except pywintypes.error as e:
-        # Broken pipe = clean disconnect.
-        log.debug("pipe read error (treating as disconnect): %s", e)
-        return None
+            self._buf += chunk
+
+    def _read_prefixed(self) -> Optional[bytes]:
+        header = BINARY_HEADER.size
+        while True:
+            if len(self._buf) >= header:
+                (size,) = BINARY_HEADER.unpack_from(self._buf)
+                if size > MAX_FRAME_BYTES:
+                    raise ValueError(f"binary frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+                end = header + size
+                if len(self._buf) >= end:
+                    frame = bytes(self._buf[header:end])
+                    del self._buf[:end]
+                    return frame
+            chunk = self._read_chunk()
+            if not chunk:
+                return None
+            self._buf += chunk
+
+
+class _PipeStream:
+    """Overlapped reads and writes on one named-pipe handle.
+
+    Windows serializes every I/O request on a handle opened without
+    FILE_FLAG_OVERLAPPED, so a reader thread parked in ReadFile would hold
+    up every WriteFile queued behind it. With overlapped I/O the
+    persistent reader and the writers proceed independently; writers
+    still serialize among themselves (one write OVERLAPPED per stream).
+    """
+
+    def __init__(self, handle, win32file, pywintypes) -> None:
+        import win32event
+
+        self.handle = handle
+        self._win32file = win32file
+        self._pywintypes = pywintypes
+        self._read_ov = pywintypes.OVERLAPPED()
+        self._read_ov.hEvent = win32event.CreateEvent(None, True, False, None)
+        self._write_ov = pywintypes.OVERLAPPED()
+        self._write_ov.hEvent = win32event.CreateEvent(None, True, False, None)
+        self._buf = win32file.AllocateReadBuffer(_READ_CHUNK_BYTES)
+        self._closed = False
+
+    def accept(self, win32pipe) -> None:
+        """Wait for a client on a server-side handle."""
+        try:
+            rc = win32pipe.ConnectNamedPipe(self.handle, self._read_ov)
+        except self._pywintypes.error as e:
+            if e.winerror == _ERROR_PIPE_CONNECTED:
+                return
+            raise
+        if rc == _ERROR_PIPE_CONNECTED:
+            return
+        self._win32file.GetOverlappedResult(self.handle, self._read_ov, True)
 
-    raise ValueError(f"frame exceeded {MAX_FRAME_BYTES} bytes without terminator")
+    def read_chunk(self) -> bytes:
+        try:
+            self._win32file.ReadFile(self.handle, self._buf, self._read_ov)
+            n = self._win32file.GetOverlappedResult(self.handle, self._read_ov, True)
+        except self._pywintypes.error as e:
+            # Broken pipe, or the handle was closed under us = disconnect.
+            log.debug("pipe read error (treating as disconnect): %s", e)
+            return b""
+        return bytes(self._buf[:n])
+
+    def write(self, data: bytes) -> None:
+        self._win32file.WriteFile(self.handle, data, self._write_ov)
+        self._win32file.GetOverlappedResult(self.handle, self._write_ov, True)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._win32file.CancelIoEx(self.handle, None)
+        except Exception:
+            pass
+        try:
+            self._win32file.CloseHandle(self.handle)
+        except Exception:
+            pass
+
+
+class SocketStream:
+    """Stream adapter for a connected stream socket.
+
+    Lets the same session code run over ``socket.socketpair()`` in tests
+    and benchmarks on hosts without named pipes.
+    """
+
+    def __init__(self, sock) -> None:
+        self._sock = sock
+        self._closed = False
+
+    def read_chunk(self) -> bytes:
+        try:
+            return self._sock.recv(_READ_CHUNK_BYTES)
+        except OSError as e:
+            log.debug("socket read error (treating as disconnect): %s", e)
+            return b""
+
+    def write(self, data: bytes) -> None:
+        self._sock.sendall(data)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # shutdown() wakes a recv() blocked in another thread;
+            # close() alone does not.
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
 
 
-def _write_frame(pipe_handle, win32file, data: bytes) -> None:
-    """Write one pre-terminated frame to *pipe_handle*."""
-    win32file.WriteFile(pipe_handle, data)
+def _with_deadline(fn: Callable[[], FrozenSet[str]], stream, name: str, message: str):
+    """Run a handshake in a side thread, closing *stream* if it overruns.
+
+    Closing the stream unblocks the side thread's pending read; the
+    caller sees HandshakeError(*message*).
+    """
+    result: list = []
+    exc: list = []
+
+    def _run() -> None:
+        try:
+            result.append(fn())
+        except Exception as e:  # noqa: BLE001 — re-raised on caller thread
+            exc.append(e)
+
+    t = threading.Thread(target=_run, name=name, daemon=True)
+    t.start()
+    t.join(timeout=HANDSHAKE_TIMEOUT_SEC)
+    if t.is_alive():
+        stream.close()
+        raise HandshakeError(message)
+    if exc:
+        raise exc[0]
+    return result[0]
 
 
 # ── Server side (lives in helper process) ───────────────────────────────
 
+def _decode_request(frame: bytes, binary: bool):
+    """Decode *frame*, or return the ERR_BAD_REQUEST response for it."""
+    try:
+        return Request.decode_binary(frame) if binary else Request.decode(frame)
+    except Exception as e:
+        log.warning("PipeServer bad request: %s", e)
+        return Response.failure(
+            request_id=0,
+            error_code=ERR_BAD_REQUEST,
+            error_message=str(e),
+        )
+
+
+def _dispatch(handler: Callable[[Request], Response], request: Request) -> Response:
+    try:
+        return handler(request)
+    except Exception as e:
+        log.exception("PipeServer handler error on op=%s", request.op)
+        return Response.failure(
+            request_id=request.request_id,
+            error_code=ERR_INTERNAL,
+            error_message=f"{type(e).__name__}: {e}",
+        )
+
+
+def _serve_frames(
+    frames: FrameReader,
+    write: Callable[[bytes], None],
+    handler: Callable[[Request], Response],
+    capabilities: FrozenSet[str],
+    stop_event: threading.Event,
+) -> None:
+    binary = CAP_BINARY in capabilities
+    if binary:
+        frames.use_binary()
+    encode = Response.encode_binary if binary else Response.encode
+
+    if CAP_PIPELINE not in capabilities:
+        # Legacy peer: strictly one request, one response.
+        while not stop_event.is_set():
+            frame = frames.read_frame()
+            if frame is None:
+                log.debug("PipeServer client disconnected")
+                return
+            decoded = _decode_request(frame, binary)
+            if isinstance(decoded, Request):
+                decoded = _dispatch(handler, decoded)
+            write(encode(decoded))
+        return
+
+    # Pipelined peer: keep reading while earlier requests run. Mutations
+    # go through a single ordered lane; queries share a small pool so a
+    # status poll is never stuck behind a slow WinDivert start.
+    write_lock = threading.Lock()
+
+    def _send(response: Response) -> None:
+        data = encode(response)
+        with write_lock:
+            try:
+                write(data)
+            except Exception as e:
+                log.debug("PipeServer dropping response %d: %s", response.request_id, e)
+
+    def _run(request: Request) -> None:
+        _send(_dispatch(handler, request))
+
+    ordered = ThreadPoolExecutor(max_workers=1, thread_name_prefix="helper-mutation")
+    queries = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="helper-query")
+    try:
+        while not stop_event.is_set():
+            frame = frames.read_frame()
+            if frame is None:
+                log.debug("PipeServer client disconnected")
+                return
+            decoded = _decode_request(frame, binary)
+            if isinstance(decoded, Response):
+                _send(decoded)
+                continue
+            lane = ordered if decoded.op in MUTATING_OPS else queries
+            lane.submit(_run, decoded)
+    finally:
+        # Requests already accepted still run (a disrupt the GUI sent
+        # just before it went away must not be half-applied).
+        ordered.shutdown(wait=True)
+        queries.shutdown(wait=True)
+
+
+def serve_stream(
+    stream,
+    handler: Callable[[Request], Response],
+    shared_secret: bytes,
+    *,
+    capabilities: Iterable[str] = SERVER_CAPABILITIES,
+    stop_event: Optional[threading.Event] = None,
+) -> None:
+    """Authenticate one connected client, then answer it until it leaves.
+
+    Raises AuthenticationError / HandshakeError if the peer fails the
+    mutual handshake; no request is dispatched in that case. Connection
+    capabilities are the intersection of *capabilities* and what the
+    client offered.
+    """
+    frames = FrameReader(stream.read_chunk)
+    caps = _with_deadline(
+        lambda: handshake_server(shared_secret, frames.read_frame, stream.write, capabilities),
+        stream,
+        name="pipe-handshake-server",
+        message=f"handshake did not complete within {HANDSHAKE_TIMEOUT_SEC}s",
+    )
+    log.info(
+        "PipeServer: handshake complete, client authenticated (caps=%s)",
+        ",".join(sorted(caps)) or "none",
+    )
+    _serve_frames(frames, stream.write, handler, caps, stop_event or threading.Event())
+
+
 class PipeServer:
     """Named-pipe server for the firewall helper.
 
@@ -178,6 +471,9 @@ class PipeServer:
         handler: Callable[[Request], Response],
         shared_secret: bytes,
         pipe_name: str = DEFAULT_PIPE_NAME,
+        *,
+        pipeline: bool = True,
+        binary: bool = True,
     ) -> None:
         if not isinstance(shared_secret, (bytes, bytearray)) or len(shared_secret) != 32:
             raise ValueError(
@@ -187,6 +483,10 @@ class PipeServer:
         self.handler = handler
         self.shared_secret = bytes(shared_secret)
         self.pipe_name = pipe_name
+        self.capabilities = tuple(
+            cap for cap, enabled in ((CAP_PIPELINE, pipeline), (CAP_BINARY, binary))
+            if enabled
+        ) + (CAP_SNAPSHOT,)
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
@@ -203,10 +503,10 @@ class PipeServer:
     def stop(self, wait_timeout_sec: float = 5.0) -> None:
         """Signal the server to stop and wake any blocked accept call.
 
-        The blocking `ConnectNamedPipe` inside `_serve_forever` is woken
+        The pending `ConnectNamedPipe` inside `_serve_forever` is woken
         by issuing a no-op self-connect via `CreateFile` against our own
-        pipe — this is the Microsoft-documented pattern for graceful
-        named-pipe shutdown without needing overlapped I/O.
+        pipe — the Microsoft-documented pattern for graceful named-pipe
+        shutdown.
         """
         self._stop.set()
         # Wake the accept loop by briefly connecting to ourselves.
@@ -240,10 +540,11 @@ class PipeServer:
 
         while not self._stop.is_set():
             pipe_handle = None
+            stream: Optional[_PipeStream] = None
             try:
                 pipe_handle = win32pipe.CreateNamedPipe(
                     self.pipe_name,
-                    win32pipe.PIPE_ACCESS_DUPLEX,
+                    win32pipe.PIPE_ACCESS_DUPLEX | win32file.FILE_FLAG_OVERLAPPED,
                     (
                         win32pipe.PIPE_TYPE_BYTE
                         | win32pipe.PIPE_READMODE_BYTE
@@ -256,22 +557,26 @@ class PipeServer:
                     0,        # default timeout
                     pipe_sa,  # cross-IL SD (Medium-IL GUI can open)
                 )
-                win32pipe.ConnectNamedPipe(pipe_handle, None)
+                stream = _PipeStream(pipe_handle, win32file, pywintypes)
+                stream.accept(win32pipe)
                 log.info("PipeServer client connected")
                 # ── Mutual auth BEFORE any dispatch (H2 / ADR-0001 §6) ──
                 # Any process on the same session can open the pipe
                 # (SDDL grants WD+AU), so every connection MUST prove
                 # knowledge of the shared secret before we accept a
-                # single request frame.
+                # single request frame. serve_stream enforces that.
                 try:
-                    self._do_handshake(pipe_handle, win32file, pywintypes)
+                    serve_stream(
+                        stream,
+                        self.handler,
+                        self.shared_secret,
+                        capabilities=self.capabilities,
+                        stop_event=self._stop,
+                    )
                 except AuthenticationError as e:
                     log.warning("PipeServer: rejecting unauthenticated client: %s", e)
-                    continue
                 except HandshakeError as e:
                     log.warning("PipeServer: malformed handshake, dropping: %s", e)
-                    continue
-                self._serve_client(pipe_handle, win32file, pywintypes)
             except Exception as e:
                 # ERROR_PIPE_BUSY (231) means another helper instance already
                 # owns this pipe — don't spam the log; back off for a second
@@ -293,113 +598,269 @@ class PipeServer:
                         win32pipe.DisconnectNamedPipe(pipe_handle)
                     except Exception:
                         pass
-                    try:
-                        win32file.CloseHandle(pipe_handle)
-                    except Exception:
-                        pass
+                    if stream is not None:
+                        stream.close()
+                    else:
+                        try:
+                            win32file.CloseHandle(pipe_handle)
+                        except Exception:
+                            pass
 
         log.info("PipeServer stopped")
 
-    def _do_handshake(self, pipe_handle, win32file, pywintypes) -> None:
-        """Run the mutual auth handshake on an accepted pipe.
 
-        Budget is HANDSHAKE_TIMEOUT_SEC — we enforce this by running
-        the handshake in a side thread and joining on a deadline. On
-        timeout we raise HandshakeError, which the accept loop treats
-        as a disconnect.
+# ── Client side (lives in main GUI process) ─────────────────────────────
 
-        The handshake itself uses the same frame primitives as the
-        dispatch loop (_read_frame / _write_frame), so WinDivert's
-        pipe buffer semantics apply identically.
-        """
-        def _reader() -> Optional[bytes]:
-            return _read_frame(pipe_handle, win32file, pywintypes)
+class _PendingCall:
+    __slots__ = ("done", "response", "error")
 
-        def _writer(data: bytes) -> None:
-            _write_frame(pipe_handle, win32file, data)
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[Response] = None
+        self.error: Optional[BaseException] = None
 
-        exc: list = []
 
-        def _run() -> None:
-            try:
-                handshake_server(self.shared_secret, _reader, _writer)
-            except Exception as e:  # noqa: BLE001 — re-raised on main thread below
-                exc.append(e)
-
-        t = threading.Thread(target=_run, name="pipe-handshake-server", daemon=True)
-        t.start()
-        t.join(timeout=HANDSHAKE_TIMEOUT_SEC)
-        if t.is_alive():
-            # Pipe read is still blocked — slam the pipe so the reader
-            # unblocks with an error, then treat as a timeout.
-            try:
-                win32file.CloseHandle(pipe_handle)
-            except Exception:
-                pass
-            raise HandshakeError(
-                f"handshake did not complete within {HANDSHAKE_TIMEOUT_SEC}s"
-            )
-        if exc:
-            raise exc[0]
-        log.info("PipeServer: handshake complete, client authenticated")
+class _Session:
+    """One authenticated connection: its stream, reader and open calls."""
 
-    def _serve_client(self, pipe_handle, win32file, pywintypes) -> None:
-        while not self._stop.is_set():
-            frame = _read_frame(pipe_handle, win32file, pywintypes)
-            if frame is None:
-                log.debug("PipeServer client disconnected")
+    def __init__(self, stream, capabilities: FrozenSet[str]) -> None:
+        self.stream = stream
+        self.capabilities = capabilities
+        self.pipelined = CAP_PIPELINE in capabilities
+        self.binary = CAP_BINARY in capabilities
+        self.slots = threading.BoundedSemaphore(MAX_IN_FLIGHT if self.pipelined else 1)
+        self.write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pending: Dict[int, _PendingCall] = {}
+        self._error: Optional[BaseException] = None
+
+    def register(self, request_id: int) -> _PendingCall:
+        pending = _PendingCall()
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if request_id in self._pending:
+                raise ValueError(f"request_id {request_id} is already in flight")
+            self._pending[request_id] = pending
+        return pending
+
+    def discard(self, request_id: int) -> bool:
+        """Forget *request_id*; False if its response already arrived."""
+        with self._lock:
+            return self._pending.pop(request_id, None) is not None
+
+    def resolve(self, response: Response) -> bool:
+        with self._lock:
+            pending = self._pending.pop(response.request_id, None)
+        if pending is None:
+            return False
+        pending.response = response
+        pending.done.set()
+        return True
+
+    def close(self, error: BaseException) -> None:
+        with self._lock:
+            if self._error is not None:
                 return
-            try:
-                request = Request.decode(frame)
-            except Exception as e:
-                log.warning("PipeServer bad request: %s", e)
-                response = Response.failure(
-                    request_id=0,
-                    error_code=2,  # ERR_BAD_REQUEST
-                    error_message=str(e),
-                )
-                _write_frame(pipe_handle, win32file, response.encode())
-                continue
+            self._error = error
+            pending, self._pending = self._pending, {}
+        self.stream.close()
+        for call in pending.values():
+            call.error = error
+            call.done.set()
+
+
+class FramedClient:
+    """Transport-independent client half of the helper connection.
+
+    Subclasses open the OS connection and pass the resulting stream to
+    :meth:`attach`, which runs the mutual-auth handshake and starts one
+    long-lived reader thread. The reader matches each response to its
+    caller by ``request_id``. When the helper agreed to ``CAP_PIPELINE``
+    up to ``MAX_IN_FLIGHT`` calls from different threads share the
+    connection at once; otherwise calls go one at a time, as before.
+
+    Every call has its own deadline. A timed-out call on a pipelined
+    connection just abandons its slot (a late response is dropped); on a
+    one-at-a-time connection the connection is closed instead, since
+    every later call would queue behind the stalled one.
+
+    Binary frames (``CAP_BINARY``) are offered only when *binary* is true,
+    or when it is None and ``DUPEZ_IPC_BINARY=1`` is set; otherwise the
+    connection speaks line-delimited JSON.
+    """
+
+    def __init__(
+        self,
+        shared_secret: bytes,
+        *,
+        pipeline: bool = True,
+        binary: Optional[bool] = None,
+    ) -> None:
+        if not isinstance(shared_secret, (bytes, bytearray)) or len(shared_secret) != 32:
+            raise ValueError(
+                f"{type(self).__name__}.shared_secret must be 32 bytes (see "
+                "app.firewall_helper.auth.generate_token)"
+            )
+        self.shared_secret = bytes(shared_secret)
+        if binary is None:
+            binary = os.environ.get(BINARY_ENV_VAR, "").strip() == "1"
+        offer = [CAP_SNAPSHOT]
+        if pipeline:
+            offer.append(CAP_PIPELINE)
+        if binary:
+            offer.append(CAP_BINARY)
+        self._offer: Tuple[str, ...] = tuple(offer)
+        self._lock = threading.Lock()
+        self._session: Optional[_Session] = None
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        session = self._session
+        return session.capabilities if session is not None else frozenset()
+
+    @property
+    def pipelined(self) -> bool:
+        session = self._session
+        return session is not None and session.pipelined
+
+    @property
+    def binary(self) -> bool:
+        session = self._session
+        return session is not None and session.binary
+
+    def attach(self, stream) -> None:
+        """Authenticate over a freshly connected *stream* and start reading.
+
+        Closes the stream and re-raises if the handshake fails.
+        """
+        frames = FrameReader(stream.read_chunk)
+        try:
+            caps = _with_deadline(
+                lambda: handshake_client(
+                    self.shared_secret, frames.read_frame, stream.write, self._offer,
+                ),
+                stream,
+                name="pipe-handshake-client",
+                message=f"client handshake timed out after {HANDSHAKE_TIMEOUT_SEC}s",
+            )
+        except BaseException:
+            stream.close()
+            raise
+        self._start_session(stream, frames, caps)
+
+    def _start_session(self, stream, frames: FrameReader, capabilities) -> _Session:
+        session = _Session(stream, frozenset(capabilities))
+        if session.binary:
+            frames.use_binary()
+        with self._lock:
+            previous, self._session = self._session, session
+        if previous is not None:
+            previous.close(ConnectionError("connection replaced"))
+        threading.Thread(
+            target=self._read_loop,
+            args=(session, frames),
+            name="firewall-helper-reader",
+            daemon=True,
+        ).start()
+        return session
+
+    def _read_loop(self, session: _Session, frames: FrameReader) -> None:
+        error: BaseException = ConnectionError(
+            f"{type(self).__name__} peer disconnected"
+        )
+        try:
+            while True:
+                frame = frames.read_frame()
+                if frame is None:
+                    break
+                if session.binary:
+                    response = Response.decode_binary(frame)
+                else:
+                    response = Response.decode(frame)
+                if not session.resolve(response):
+                    log.debug(
+                        "dropping response for abandoned request %d",
+                        response.request_id,
+                    )
+        except Exception as e:
+            log.warning("helper connection reader stopped: %s", e)
+            error = ConnectionError(f"{type(self).__name__} read failed: {e}")
+        self._drop(session, error)
 
+    def _drop(self, session: _Session, error: BaseException) -> None:
+        with self._lock:
+            if self._session is session:
+                self._session = None
+        session.close(error)
+
+    def close(self) -> None:
+        session = self._session
+        if session is not None:
+            self._drop(session, ConnectionError(f"{type(self).__name__} closed"))
+
+    def call(
+        self,
+        request: Request,
+        timeout_ms: int = FRAME_TIMEOUT_MS,
+    ) -> Response:
+        """Send *request* and wait up to *timeout_ms* for its response."""
+        session = self._session
+        if session is None:
+            raise RuntimeError(f"{type(self).__name__}.call before connect()")
+        if timeout_ms <= 0:
+            raise ValueError(f"{type(self).__name__}.call timeout_ms must be positive")
+
+        name = type(self).__name__
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        if not session.slots.acquire(timeout=timeout_ms / 1000.0):
+            raise TimeoutError(
+                f"{name}.call timed out after {timeout_ms} ms waiting to send "
+                f"(op={request.op})"
+            )
+        try:
+            pending = session.register(request.request_id)
+            data = request.encode_binary() if session.binary else request.encode()
             try:
-                response = self.handler(request)
+                with session.write_lock:
+                    session.stream.write(data)
             except Exception as e:
-                log.exception("PipeServer handler error on op=%s", request.op)
-                response = Response.failure(
-                    request_id=request.request_id,
-                    error_code=3,  # ERR_INTERNAL
-                    error_message=f"{type(e).__name__}: {e}",
+                session.discard(request.request_id)
+                self._drop(session, ConnectionError(f"{name} write failed: {e}"))
+                raise ConnectionError(f"{name} write failed: {e}") from e
+
+            arrived = pending.done.wait(max(0.0, deadline - time.monotonic()))
+            if not arrived and session.discard(request.request_id):
+                if not session.pipelined:
+                    self._drop(session, ConnectionError(f"{name} call timed out"))
+                raise TimeoutError(
+                    f"{name}.call timed out after {timeout_ms} ms (op={request.op})"
                 )
+            pending.done.wait()  # raced with the reader: already resolved
+            if pending.error is not None:
+                raise pending.error
+            return pending.response
+        finally:
+            session.slots.release()
 
-            _write_frame(pipe_handle, win32file, response.encode())
-
-
-# ── Client side (lives in main GUI process) ─────────────────────────────
 
-class PipeClient:
+class PipeClient(FramedClient):
     """Named-pipe client used by the main GUI to talk to the helper.
 
-    Thread-safe: a single internal lock serializes frame send/receive so
-    multiple GUI threads can share one client instance.
+    Thread-safe: any number of GUI threads may share one instance (see
+    :class:`FramedClient` for how concurrent calls are multiplexed).
     """
 
     def __init__(
         self,
         shared_secret: bytes,
         pipe_name: str = DEFAULT_PIPE_NAME,
+        *,
+        pipeline: bool = True,
+        binary: Optional[bool] = None,
     ) -> None:
-        if not isinstance(shared_secret, (bytes, bytearray)) or len(shared_secret) != 32:
-            raise ValueError(
-                "PipeClient.shared_secret must be 32 bytes (see "
-                "app.firewall_helper.auth.generate_token)"
-            )
-        self.shared_secret = bytes(shared_secret)
+        super().__init__(shared_secret, pipeline=pipeline, binary=binary)
         self.pipe_name = pipe_name
-        self._handle = None
-        self._lock = threading.Lock()
-        self._win32pipe = None
-        self._win32file = None
-        self._pywintypes = None
 
     def connect(self, timeout_ms: int = CONNECT_TIMEOUT_MS) -> None:
         """Open the pipe and complete mutual auth.
@@ -410,161 +871,50 @@ class PipeClient:
         the mutual-auth handshake before any Request frame is sent —
         see ADR-0001 §6 / auth.handshake_client.
         """
-        self._win32pipe, self._win32file, self._pywintypes = _import_win32()
+        win32pipe, win32file, pywintypes = _import_win32()
 
         deadline = time.monotonic() + (timeout_ms / 1000.0)
         last_err: Optional[Exception] = None
         while time.monotonic() < deadline:
+            handle = None
             try:
-                self._handle = self._win32file.CreateFile(
+                handle = win32file.CreateFile(
                     self.pipe_name,
-                    self._win32file.GENERIC_READ | self._win32file.GENERIC_WRITE,
+                    win32file.GENERIC_READ | win32file.GENERIC_WRITE,
                     0,
                     None,
-                    self._win32file.OPEN_EXISTING,
-                    0,
+                    win32file.OPEN_EXISTING,
+                    win32file.FILE_FLAG_OVERLAPPED,
                     None,
                 )
                 # Match server mode.
-                self._win32pipe.SetNamedPipeHandleState(
-                    self._handle,
-                    self._win32pipe.PIPE_READMODE_BYTE,
+                win32pipe.SetNamedPipeHandleState(
+                    handle,
+                    win32pipe.PIPE_READMODE_BYTE,
                     None,
                     None,
                 )
-                log.info("PipeClient connected to %s, running handshake...", self.pipe_name)
-                # Run handshake BEFORE declaring the client usable.
-                self._run_client_handshake()
-                log.info("PipeClient handshake complete — authenticated to helper")
-                return
-            except (AuthenticationError, HandshakeError):
-                # Hard fail on auth: we're talking to the wrong helper
-                # or the secret is stale. Close the handle and raise —
-                # the caller should NOT retry without a fresh token.
-                try:
-                    if self._handle is not None:
-                        self._win32file.CloseHandle(self._handle)
-                        self._handle = None
-                except Exception:
-                    pass
-                raise
-            except self._pywintypes.error as e:
+                stream = _PipeStream(handle, win32file, pywintypes)
+            except pywintypes.error as e:
+                if handle is not None:
+                    try:
+                        win32file.CloseHandle(handle)
+                    except Exception:
+                        pass
                 last_err = e
                 time.sleep(0.05)
+                continue
+            log.info("PipeClient connected to %s, running handshake...", self.pipe_name)
+            # Hard fail on auth: we're talking to the wrong helper or the
+            # secret is stale. attach() closes the pipe and re-raises —
+            # the caller should NOT retry without a fresh token.
+            self.attach(stream)
+            log.info(
+                "PipeClient handshake complete — authenticated to helper "
+                "(pipelined=%s, binary=%s)", self.pipelined, self.binary,
+            )
+            return
 
         raise TimeoutError(
             f"PipeClient.connect timed out after {timeout_ms} ms: {last_err}"
         )
-
-    def _run_client_handshake(self) -> None:
-        """Run the mutual-auth handshake over the currently open pipe."""
-        if self._handle is None:
-            raise RuntimeError("PipeClient._run_client_handshake before CreateFile")
-
-        def _reader() -> Optional[bytes]:
-            return _read_frame(self._handle, self._win32file, self._pywintypes)
-
-        def _writer(data: bytes) -> None:
-            _write_frame(self._handle, self._win32file, data)
-
-        # Enforce the same timeout budget as the server.
-        exc: list = []
-
-        def _run() -> None:
-            try:
-                handshake_client(self.shared_secret, _reader, _writer)
-            except Exception as e:  # noqa: BLE001 — re-raised on main thread
-                exc.append(e)
-
-        t = threading.Thread(target=_run, name="pipe-handshake-client", daemon=True)
-        t.start()
-        t.join(timeout=HANDSHAKE_TIMEOUT_SEC)
-        if t.is_alive():
-            # Kill the pipe to unblock the background reader, then raise.
-            try:
-                self._win32file.CloseHandle(self._handle)
-            except Exception:
-                pass
-            self._handle = None
-            raise HandshakeError(
-                f"client handshake timed out after {HANDSHAKE_TIMEOUT_SEC}s"
-            )
-        if exc:
-            raise exc[0]
-
-    def close(self) -> None:
-        with self._lock:
-            if self._handle is not None:
-                try:
-                    self._win32file.CloseHandle(self._handle)
-                except Exception:
-                    pass
-                self._handle = None
-
-    def call(
-        self,
-        request: Request,
-        timeout_ms: int = FRAME_TIMEOUT_MS,
-    ) -> Response:
-        """Send *request* and wait a bounded time for its response.
-
-        Synchronous ``ReadFile`` has no useful response deadline for a byte
-        mode named pipe. Run that one read in a daemon thread and close the
-        handle if the helper stalls. Closing the handle unblocks the Windows
-        read and ensures the next proxy operation performs a fresh handshake.
-        """
-        if self._handle is None:
-            raise RuntimeError("PipeClient.call before connect()")
-        if timeout_ms <= 0:
-            raise ValueError("PipeClient.call timeout_ms must be positive")
-
-        with self._lock:
-            # Keep the exact OS handle for this exchange. On timeout
-            # ``self._handle`` is invalidated immediately; the reader thread
-            # must never observe a later replacement connection.
-            request_handle = self._handle
-            _write_frame(request_handle, self._win32file, request.encode())
-            frames: list[Optional[bytes]] = []
-            errors: list[BaseException] = []
-
-            def _read_response() -> None:
-                try:
-                    frames.append(
-                        _read_frame(
-                            request_handle,
-                            self._win32file,
-                            self._pywintypes,
-                        )
-                    )
-                except BaseException as exc:  # propagated on caller thread
-                    errors.append(exc)
-
-            reader = threading.Thread(
-                target=_read_response,
-                name="firewall-helper-response",
-                daemon=True,
-            )
-            reader.start()
-            reader.join(timeout=timeout_ms / 1000.0)
-            if reader.is_alive():
-                self._handle = None
-                try:
-                    self._win32file.CloseHandle(request_handle)
-                except Exception:
-                    pass
-                raise TimeoutError(
-                    f"PipeClient.call timed out after {timeout_ms} ms "
-                    f"(op={request.op})"
-                )
-            if errors:
-                raise errors[0]
-            frame = frames[0] if frames else None
-            if frame is None:
-                raise ConnectionError("PipeClient peer disconnected")
-            response = Response.decode(frame)
-            if response.request_id != request.request_id:
-                raise RuntimeError(
-                    f"PipeClient response id mismatch: "
-                    f"expected {request.request_id}, got {response.request_id}"
-                )
-            return response
@@ -0,0 +1,310 @@
+# app/firewall_helper/unix_transport.py
+"""
+Unix-domain-socket transport for the split-elevation IPC.
+
+Same contract as the named-pipe transport in ``transport.py`` — the same
+framing (JSON, or binary when negotiated), the same mutual-auth handshake
+from ``auth.py``, the same capability negotiation and pipelining — over an
+``AF_UNIX`` stream socket. DupeZ ships on Windows only; this exists so the
+split path can run, be tested and be benchmarked across a real process
+boundary on Linux CI and dev machines.
+
+    * UnixSocketServer — helper side, mirrors PipeServer.
+    * UnixSocketClient — main side, mirrors PipeClient.
+    * UnixSocketProxy  — DisruptionManagerProxy over a UnixSocketClient
+                         (connects, never spawns an elevated helper).
+
+Access control mirrors the pipe's: the socket lives in a 0700 directory
+with mode 0600 (the PIPE_REJECT_REMOTE_CLIENTS / SDDL analogue), peers
+whose ``SO_PEERCRED`` uid is not allowed are dropped before the handshake,
+and every accepted peer must still pass the HMAC handshake before any
+request is dispatched.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from app.firewall_helper.auth import AuthenticationError, HandshakeError
+from app.firewall_helper.ipc_client import DisruptionManagerProxy
+from app.firewall_helper.protocol import (
+    CAP_BINARY,
+    CAP_PIPELINE,
+    CAP_SNAPSHOT,
+    Request,
+    Response,
+)
+from app.firewall_helper.transport import (
+    CONNECT_TIMEOUT_MS,
+    FramedClient,
+    SocketStream,
+    serve_stream,
+)
+
+__all__ = [
+    "UnixSocketClient",
+    "UnixSocketProxy",
+    "UnixSocketServer",
+    "default_socket_path",
+]
+
+log = logging.getLogger(__name__)
+
+_SOCKET_NAME = "firewall_helper.sock"
+
+
+def _current_uid() -> Optional[int]:
+    getuid = getattr(os, "getuid", None)
+    return getuid() if getuid is not None else None
+
+
+def default_socket_path() -> str:
+    """Per-user socket path (``$XDG_RUNTIME_DIR`` when available)."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base and os.path.isdir(base):
+        return os.path.join(base, "dupez", _SOCKET_NAME)
+    owner = _current_uid()
+    suffix = f"-{owner}" if owner is not None else ""
+    return os.path.join(tempfile.gettempdir(), f"dupez{suffix}", _SOCKET_NAME)
+
+
+def _peer_uid(conn: socket.socket) -> Optional[int]:
+    """Return the connecting process's uid, or None where unsupported."""
+    so_peercred = getattr(socket, "SO_PEERCRED", None)
+    if so_peercred is None:
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, so_peercred, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid
+
+
+class UnixSocketServer:
+    """AF_UNIX server for the firewall helper.
+
+    Like PipeServer it serves one client at a time and loops back to
+    accept the next one when a client disconnects.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Request], Response],
+        shared_secret: bytes,
+        socket_path: Optional[str] = None,
+        *,
+        pipeline: bool = True,
+        binary: bool = True,
+        allowed_uids: Optional[Iterable[int]] = None,
+    ) -> None:
+        if not isinstance(shared_secret, (bytes, bytearray)) or len(shared_secret) != 32:
+            raise ValueError(
+                "UnixSocketServer.shared_secret must be 32 bytes (see "
+                "app.firewall_helper.auth.generate_token)"
+            )
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("UnixSocketServer requires AF_UNIX sockets")
+        self.handler = handler
+        self.shared_secret = bytes(shared_secret)
+        self.socket_path = socket_path or default_socket_path()
+        self.capabilities = tuple(
+            cap for cap, enabled in ((CAP_PIPELINE, pipeline), (CAP_BINARY, binary))
+            if enabled
+        ) + (CAP_SNAPSHOT,)
+        if allowed_uids is None:
+            owner = _current_uid()
+            allowed_uids = () if owner is None else (owner,)
+        self.allowed_uids = frozenset(allowed_uids)
+        self._stop = threading.Event()
+        self._listener: Optional[socket.socket] = None
+        self._active: Optional[SocketStream] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("UnixSocketServer already started")
+        self._listener = self._bind()
+        self._thread = threading.Thread(
+            target=self._serve_forever,
+            name="firewall-helper-unix-server",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _bind(self) -> socket.socket:
+        directory = os.path.dirname(self.socket_path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.chmod(directory, 0o700)
+        try:
+            os.unlink(self.socket_path)  # stale socket from a crashed helper
+        except FileNotFoundError:
+            pass
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(1)
+        log.info("UnixSocketServer listening on %s", self.socket_path)
+        return listener
+
+    def stop(self, wait_timeout_sec: float = 5.0) -> None:
+        """Stop accepting, drop the active client and remove the socket."""
+        self._stop.set()
+        active = self._active
+        if active is not None:
+            active.close()
+        # Wake the blocked accept() the same way PipeServer.stop does:
+        # connect to ourselves.
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.settimeout(0.5)
+                s.connect(self.socket_path)
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=wait_timeout_sec)
+
+    def _serve_forever(self) -> None:
+        listener = self._listener
+        assert listener is not None
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn, _ = listener.accept()
+                except OSError as e:
+                    if self._stop.is_set():
+                        break
+                    log.error("UnixSocketServer accept error: %s", e)
+                    time.sleep(0.1)
+                    continue
+                if self._stop.is_set():
+                    conn.close()
+                    break
+                self._serve_client(conn)
+        finally:
+            listener.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            log.info("UnixSocketServer stopped")
+
+    def _serve_client(self, conn: socket.socket) -> None:
+        stream = SocketStream(conn)
+        try:
+            uid = _peer_uid(conn)
+            if uid is not None and self.allowed_uids and uid not in self.allowed_uids:
+                log.warning("UnixSocketServer: rejecting peer uid %d", uid)
+                return
+            log.info("UnixSocketServer client connected")
+            self._active = stream
+            serve_stream(
+                stream,
+                self.handler,
+                self.shared_secret,
+                capabilities=self.capabilities,
+                stop_event=self._stop,
+            )
+        except AuthenticationError as e:
+            log.warning("UnixSocketServer: rejecting unauthenticated client: %s", e)
+        except HandshakeError as e:
+            log.warning("UnixSocketServer: malformed handshake, dropping: %s", e)
+        except Exception as e:
+            log.error("UnixSocketServer error: %s", e)
+        finally:
+            self._active = None
+            stream.close()
+
+
+class UnixSocketClient(FramedClient):
+    """AF_UNIX counterpart of PipeClient."""
+
+    def __init__(
+        self,
+        shared_secret: bytes,
+        socket_path: Optional[str] = None,
+        *,
+        pipeline: bool = True,
+        binary: Optional[bool] = None,
+    ) -> None:
+        super().__init__(shared_secret, pipeline=pipeline, binary=binary)
+        self.socket_path = socket_path or default_socket_path()
+
+    def connect(self, timeout_ms: int = CONNECT_TIMEOUT_MS) -> None:
+        """Connect, retrying while the helper is still starting, then auth.
+
+        Authentication failures are raised immediately (no retry), as in
+        PipeClient.connect.
+        """
+        deadline = time.monotonic() + (timeout_ms / 1000.0)
+        last_err: Optional[Exception] = None
+        while time.monotonic() < deadline:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                sock.close()
+                last_err = e
+                time.sleep(0.05)
+                continue
+            self.attach(SocketStream(sock))
+            log.info(
+                "UnixSocketClient authenticated to %s (pipelined=%s, binary=%s)",
+                self.socket_path, self.pipelined, self.binary,
+            )
+            return
+        raise TimeoutError(
+            f"UnixSocketClient.connect timed out after {timeout_ms} ms: {last_err}"
+        )
+
+
+class UnixSocketProxy(DisruptionManagerProxy):
+    """DisruptionManagerProxy that talks to a helper over a Unix socket.
+
+    The helper must already be running (there is no elevation step off
+    Windows); after a transport failure the next call reconnects.
+    """
+
+    def __init__(
+        self,
+        shared_secret: bytes,
+        socket_path: Optional[str] = None,
+        *,
+        pipeline: bool = True,
+        binary: Optional[bool] = None,
+        connect_timeout_ms: int = 2000,
+    ) -> None:
+        super().__init__()
+        self._shared_secret = bytes(shared_secret)
+        self._socket_path = socket_path
+        self._pipeline = pipeline
+        self._binary = binary
+        self._connect_timeout_ms = connect_timeout_ms
+
+    def _ensure_helper(self) -> None:
+        if self._connected:
+            return
+        with self._lock:
+            if self._connected:
+                return
+            client = UnixSocketClient(
+                self._shared_secret,
+                self._socket_path,
+                pipeline=self._pipeline,
+                binary=self._binary,
+            )
+            client.connect(timeout_ms=self._connect_timeout_ms)
+            self._client = client
+            self._connected = True
+
+    @property
+    def client(self) -> Optional[UnixSocketClient]:
+        return self._client
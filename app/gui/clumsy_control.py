@@ -40,6 +40,14 @@ from PyQt6.QtWidgets import (
 )
 
 from app.core.data_persistence import nickname_manager
+from app.core.status_bus import (
+    FIELD_DISRUPTED,
+    FIELD_ENGINE_STATUS,
+    StatusSubscription,
+    StatusUpdate,
+    get_status_bus,
+    thaw,
+)
 from app.logs.logger import log_error, log_info
 from app.utils.helpers import mask_ip as _log_mask_ip
 
@@ -133,6 +141,7 @@ class ClumsyControlView(QWidget):
     scan_started = pyqtSignal()
     scan_finished = pyqtSignal(list)
     _scan_results_ready = pyqtSignal(list)   # internal: thread-safe scan delivery
+    _scan_device_ready = pyqtSignal(dict)    # internal: one device mid-scan
     _automatic_event_ready = pyqtSignal(int, object)
     _status_snapshot_ready = pyqtSignal(int, object, object)
     _status_snapshot_failed = pyqtSignal(int, str)
@@ -206,7 +215,7 @@ class ClumsyControlView(QWidget):
         self._automatic_ui_generation = 0
         self._automatic_target_ip: Optional[str] = None
         self._status_poll_generation = 0
-        self._status_poll_in_flight = False
+        self._status_subscription: Optional[StatusSubscription] = None
         self._clumsy_status_snapshot: Dict[str, Any] = {}
         self._disrupted_devices_snapshot: frozenset[str] = frozenset()
         self._status_snapshot_ready.connect(self._apply_status_snapshot)
@@ -222,10 +231,8 @@ class ClumsyControlView(QWidget):
         self._connect_signals()
         self._apply_network_availability()
 
-        # Auto-refresh disruption status
-        self.status_timer = QTimer(self)
-        self.status_timer.timeout.connect(self._refresh_disruption_status)
-        self.status_timer.start(2000)
+        # Disruption status is pushed by the controller's status bus
+        self._subscribe_status_bus()
 
         # Session timer display
         self.session_timer = QTimer(self)
@@ -236,12 +243,6 @@ class ClumsyControlView(QWidget):
         if self.controller and hasattr(self.controller, 'scheduler'):
             self.controller.scheduler._on_macro_step = self._on_macro_step_event
 
-        # Stats dashboard refresh
-        self.stats_refresh_timer = QTimer(self)
-        self.stats_refresh_timer.timeout.connect(
-            lambda: self._stats_panel.refresh() if hasattr(self, '_stats_panel') else None)
-        self.stats_refresh_timer.start(1500)
-
     def _apply_network_availability(self) -> None:
         """Disable new mutations when startup recovery is fail-closed."""
         available = bool(
@@ -266,17 +267,15 @@ class ClumsyControlView(QWidget):
         )
 
     def stop_background_refresh(self) -> None:
-        """Stop GUI refresh timers and reject any late status result."""
+        """Drop bus subscriptions, stop timers, reject any late result."""
         self._status_poll_generation += 1
-        self._status_poll_in_flight = False
-        for timer_name in (
-            "status_timer",
-            "session_timer",
-            "stats_refresh_timer",
-        ):
-            timer = getattr(self, timer_name, None)
-            if timer is not None:
-                timer.stop()
+        subscription = self._status_subscription
+        self._status_subscription = None
+        if subscription is not None:
+            subscription.close()
+        timer = getattr(self, "session_timer", None)
+        if timer is not None:
+            timer.stop()
         stats_panel = getattr(self, "_stats_panel", None)
         if stats_panel is not None and hasattr(stats_panel, "stop_refresh"):
             stats_panel.stop_refresh()
@@ -876,6 +875,7 @@ class ClumsyControlView(QWidget):
         self.btn_stop.clicked.connect(self._on_stop)
         self.btn_stop_all.clicked.connect(self._on_stop_all)
         self._scan_results_ready.connect(self._update_device_table)
+        self._scan_device_ready.connect(self._on_scan_device)
         self._automatic_event_ready.connect(self._on_automatic_event)
 
     # ── Scanning ────────────────────────────────────────────────────
@@ -888,7 +888,8 @@ class ClumsyControlView(QWidget):
 
         if self.controller:
             def _scan():
-                devices = self.controller.scan_devices()
+                devices = self.controller.scan_devices(
+                    on_device=self._scan_device_ready.emit)
                 self._scan_results_ready.emit(devices if isinstance(devices, list) else [])
             threading.Thread(target=_scan, daemon=True).start()
         else:
@@ -928,12 +929,34 @@ class ClumsyControlView(QWidget):
 
         self._apply_device_filter()
 
+    def _on_scan_device(self, device: dict) -> None:
+        """Slot: show a device as soon as the scanner confirms it.
+
+        Rows are keyed by IP, so the later ``device_updated`` copy
+        (hostname resolved) replaces the first one in place.
+        """
+        ip = device.get('ip')
+        if not ip:
+            return
+        devices = list(self.devices)  # earlier lists went out via scan_finished
+        for i, d in enumerate(devices):
+            if (d.ip if hasattr(d, 'ip') else d.get('ip')) == ip:
+                devices[i] = device
+                break
+        else:
+            devices.append(device)
+        self.devices = devices
+        self._apply_device_filter(announce=False)
+
     def _on_network_filter_changed(self, text: str) -> None:
         """Refilter device table when network combo changes."""
         self._apply_device_filter()
 
-    def _apply_device_filter(self) -> Any:
-        """Rebuild visible rows from ``self.devices`` honouring the network filter."""
+    def _apply_device_filter(self, announce: bool = True) -> Any:
+        """Rebuild visible rows from ``self.devices`` honouring the network filter.
+
+        *announce* emits ``scan_finished``; streamed mid-scan rows skip it.
+        """
         self.device_table.setRowCount(0)
         self._row_checkboxes = []
 
@@ -1014,7 +1037,8 @@ class ClumsyControlView(QWidget):
             self.device_count_label.setText(f"{total} devices found")
         else:
             self.device_count_label.setText(f"{visible_count} of {total} devices ({network_filter})")
-        self.scan_finished.emit(self.devices)
+        if announce:
+            self.scan_finished.emit(self.devices)
 
     def _update_target_label(self) -> None:
         """Update the target label based on current selection state."""
@@ -1544,6 +1568,7 @@ class ClumsyControlView(QWidget):
                     failed.append(ip)
 
             self._refresh_device_table_status()
+            self._refresh_disruption_status()
 
             if failed:
                 QMessageBox.warning(
@@ -1576,6 +1601,7 @@ class ClumsyControlView(QWidget):
             self._disruption_timers.pop(ip, None)
             log_info(f"Disruption stopped on {_log_mask_ip(ip)}")
         self._refresh_device_table_status()
+        self._refresh_disruption_status()
         self._end_smart_session()
 
     def _on_stop_all(self) -> None:
@@ -1595,6 +1621,7 @@ class ClumsyControlView(QWidget):
             self._disruption_timers.clear()
             log_info("All disruptions stopped")
             self._refresh_device_table_status()
+            self._refresh_disruption_status()
             self._end_smart_session()
 
     # ── Scheduled / timed disruption + macros ──────────────────────
@@ -2028,39 +2055,46 @@ class ClumsyControlView(QWidget):
 
     # ── Status refresh ──────────────────────────────────────────────
 
-    def _refresh_disruption_status(self) -> None:
-        """Request one controller status snapshot outside the Qt thread."""
-        controller = self.controller
-        if controller is None:
-            self._render_disruption_status({})
+    def _subscribe_status_bus(self) -> None:
+        """Receive engine status + disrupted devices from the status bus."""
+        bus = get_status_bus(self.controller)
+        if bus is None:
+            self._refresh_disruption_status()
             return
-        if self._status_poll_in_flight:
+        if self._status_subscription is not None:
             return
-
-        self._status_poll_generation += 1
         generation = self._status_poll_generation
-        self._status_poll_in_flight = True
 
-        def _fetch() -> None:
-            try:
-                status = controller.get_clumsy_status()
-                disrupted = controller.get_disrupted_devices()
+        def _on_update(update: StatusUpdate) -> None:
+            # Runs on the bus sampler thread — hop to Qt via the signal.
+            error = next(iter(update.errors.values()), "")
+            if error:
+                self._status_snapshot_failed.emit(generation, error)
+                return
+            if (
+                FIELD_ENGINE_STATUS in update.values
+                and FIELD_DISRUPTED in update.values
+            ):
                 self._status_snapshot_ready.emit(
                     generation,
-                    status,
-                    disrupted,
-                )
-            except Exception as exc:
-                self._status_snapshot_failed.emit(
-                    generation,
-                    f"{type(exc).__name__}: {exc}",
+                    thaw(update.values[FIELD_ENGINE_STATUS]),
+                    thaw(update.values[FIELD_DISRUPTED]),
                 )
 
-        threading.Thread(
-            target=_fetch,
-            daemon=True,
-            name="DupeZClumsyStatusRefresh",
-        ).start()
+        self._status_subscription = bus.subscribe(
+            _on_update,
+            (FIELD_ENGINE_STATUS, FIELD_DISRUPTED),
+            max_rate_hz=0.5,
+        )
+
+    def _refresh_disruption_status(self) -> None:
+        """Ask the status bus for an immediate engine/disruption refresh."""
+        if self.controller is None:
+            self._render_disruption_status({})
+            return
+        bus = get_status_bus(self.controller)
+        if bus is not None:
+            bus.request_refresh((FIELD_ENGINE_STATUS, FIELD_DISRUPTED))
 
     @pyqtSlot(int, object, object)
     def _apply_status_snapshot(
@@ -2072,7 +2106,6 @@ class ClumsyControlView(QWidget):
         """Apply only the newest worker result on the Qt thread."""
         if generation != self._status_poll_generation:
             return
-        self._status_poll_in_flight = False
 
         if not isinstance(status, dict):
             self._apply_status_snapshot_error(
@@ -2102,10 +2135,9 @@ class ClumsyControlView(QWidget):
         generation: int,
         message: str,
     ) -> None:
-        """Release the in-flight guard while preserving last-known devices."""
+        """Report a failed snapshot while preserving last-known devices."""
         if generation != self._status_poll_generation:
             return
-        self._status_poll_in_flight = False
         log_error(f"Disruption status refresh error: {message}")
         self.clumsy_status_label.setText(f"Engine: Error - {message}")
         self.clumsy_status_label.setStyleSheet(
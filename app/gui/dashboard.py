@@ -11,9 +11,8 @@ from __future__ import annotations
 
 import gc
 import os
-import threading
 import webbrowser
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from PyQt6.QtCore import (
     Q_ARG,
@@ -42,10 +41,18 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from app.core.status_bus import (
+    FIELD_DEVICE_COUNT,
+    FIELD_DISRUPTED,
+    StatusSubscription,
+    StatusUpdate,
+    get_status_bus,
+)
 from app.core.updater import CURRENT_VERSION
 from app.gui.clumsy_control import ClumsyControlView
 from app.gui.dayz_account_tracker import DayZAccountTracker
 from app.gui.dayz_map_gui_new import DayZMapGUI, consume_prewarmed_map_gui
+from app.gui.lazy_view import LazyView, ViewPrewarmer
 from app.gui.network_tools import NetworkToolsView
 from app.gui.panels.help_panel import HelpPanel
 from app.gui.settings_dialog import SettingsDialog
@@ -219,13 +226,23 @@ class DupeZDashboard(QMainWindow):
     _dashboard_snapshot_ready = pyqtSignal(int, int, object)
     _dashboard_snapshot_failed = pyqtSignal(int, str)
 
-    def __init__(self, controller: Any = None) -> None:
+    def __init__(
+        self,
+        controller: Any = None,
+        *,
+        lazy_views: bool = True,
+        prewarm_views: bool = True,
+    ) -> None:
         super().__init__()
         self.controller = controller
+        self._lazy_views = lazy_views
+        self._prewarm_views = prewarm_views
+        self._view_hosts: Dict[str, LazyView] = {}
+        self._view_prewarmer: Optional[ViewPrewarmer] = None
         self._minimize_to_tray: bool = True
         self._force_quit: bool = False
         self._dashboard_poll_generation = 0
-        self._dashboard_poll_in_flight = False
+        self._status_subscription: Optional[StatusSubscription] = None
         self._device_count_snapshot = 0
         self._disrupted_devices_snapshot: frozenset[str] = frozenset()
         self._dashboard_snapshot_ready.connect(
@@ -251,15 +268,16 @@ class DupeZDashboard(QMainWindow):
         self._register_gui_toast()
         self._check_npcap_on_startup()
 
-        # Periodic timers
-        self._status_timer = QTimer(self)
-        self._status_timer.timeout.connect(self._update_status_bar)
-        self._status_timer.start(3000)
+        # Status bar + tray are pushed by the controller's status bus;
+        # only the local psutil header stats still run on a timer.
+        self._subscribe_status_bus()
 
         self._stats_timer = QTimer(self)
         self._stats_timer.timeout.connect(self._update_header_stats)
         self._stats_timer.start(2000)
 
+        self._start_view_prewarm()
+
     # ── UI Construction ─────────────────────────────────────────────
 
     def _setup_ui(self) -> None:
@@ -447,29 +465,21 @@ class DupeZDashboard(QMainWindow):
 
         cl.addWidget(self.sidebar_rail)
 
-        # Stacked views
+        # Stacked views. Clumsy Control is the landing page and is built
+        # eagerly; every other page is a LazyView built on first show or
+        # by the idle prewarmer, whichever comes first.
         self.view_stack = QStackedWidget()
         self.clumsy_view = ClumsyControlView(controller=self.controller)
-        # Adopt the splash-prewarmed map widget if main.py built one.
-        # Fallback to a cold construction so dashboard still builds
-        # cleanly when prewarm was skipped or failed.
-        self.map_view = consume_prewarmed_map_gui() or DayZMapGUI()
-        self.accounts_view = DayZAccountTracker()
-        # NetworkToolsView adopts the AI / Smart Ops and GPC tabs built inside
-        # ClumsyControlView. Panels stay owned by clumsy_view so their event
-        # handlers (selected_ip, disrupt, etc.) keep working after reparenting.
-        ai_tab = getattr(self.clumsy_view, "_ai_panel", None)
-        gpc_tab = getattr(self.clumsy_view, "_gpc_panel", None)
-        lan_cut_tab = getattr(self.clumsy_view, "_lan_cut_panel", None)
-        self.nettools_view = NetworkToolsView(
-            controller=self.controller, ai_tab=ai_tab, gpc_tab=gpc_tab,
-            lan_cut_tab=lan_cut_tab,
+        self._add_view("clumsy", "Clumsy Control", widget=self.clumsy_view)
+        # Adopt the splash-prewarmed map widget (or the LazyDayZMapGUI
+        # placeholder on constrained systems) if main.py built one.
+        self._add_view(
+            "map", "iZurvive Map", DayZMapGUI,
+            widget=consume_prewarmed_map_gui(),
         )
-        self.help_view = HelpPanel()
-        for view in (self.clumsy_view, self.map_view,
-                     self.accounts_view, self.nettools_view,
-                     self.help_view):
-            self.view_stack.addWidget(view)
+        self._add_view("accounts", "Account Tracker", DayZAccountTracker)
+        self._add_view("nettools", "Network Tools", self._create_nettools_view)
+        self._add_view("help", "Getting Started", HelpPanel)
 
         # Plugin panels (extends sidebar + view stack)
         self._load_plugin_panels(sl)
@@ -477,6 +487,77 @@ class DupeZDashboard(QMainWindow):
         cl.addWidget(self.view_stack, 1)
         parent_layout.addWidget(content, 1)
 
+    def _add_view(
+        self,
+        key: str,
+        name: str,
+        factory: Optional[Callable[[], QWidget]] = None,
+        *,
+        widget: Optional[QWidget] = None,
+        pause_hidden: bool = True,
+    ) -> int:
+        """Append a (possibly lazy) page to the view stack; return its index."""
+        host = LazyView(factory, name=name, widget=widget, pause_hidden=pause_hidden)
+        self._view_hosts[key] = host
+        if not self._lazy_views:
+            host.load_now()
+        return self.view_stack.addWidget(host)
+
+    def _view_widget(self, key: str) -> Optional[QWidget]:
+        """Return the real view for *key*, constructing it if necessary."""
+        host = self._view_hosts.get(key)
+        if host is None:
+            return None
+        host.load_now()
+        return host.widget
+
+    @property
+    def map_view(self) -> Optional[QWidget]:
+        return self._view_widget("map")
+
+    @property
+    def accounts_view(self) -> Optional[QWidget]:
+        return self._view_widget("accounts")
+
+    @property
+    def nettools_view(self) -> Optional[QWidget]:
+        return self._view_widget("nettools")
+
+    @property
+    def help_view(self) -> Optional[QWidget]:
+        return self._view_widget("help")
+
+    def _create_nettools_view(self) -> NetworkToolsView:
+        """Build Network Tools around the tabs ClumsyControlView owns."""
+        # NetworkToolsView adopts the AI / Smart Ops and GPC tabs built inside
+        # ClumsyControlView. Panels stay owned by clumsy_view so their event
+        # handlers (selected_ip, disrupt, etc.) keep working after reparenting.
+        return NetworkToolsView(
+            controller=self.controller,
+            ai_tab=getattr(self.clumsy_view, "_ai_panel", None),
+            gpc_tab=getattr(self.clumsy_view, "_gpc_panel", None),
+            lan_cut_tab=getattr(self.clumsy_view, "_lan_cut_panel", None),
+        )
+
+    def _start_view_prewarm(self) -> None:
+        """Queue unbuilt pages for idle-time construction, in priority order.
+
+        The map is left out: a cold DayZMapGUI spins up Chromium, and
+        main.py has already decided whether this machine prewarms it.
+        """
+        if not self._lazy_views or not self._prewarm_views:
+            return
+        order = ["accounts", "nettools", "help"]
+        order.extend(k for k in self._view_hosts if k.startswith("plugin:"))
+        pending = [
+            self._view_hosts[k] for k in order
+            if k in self._view_hosts and not self._view_hosts[k].is_loaded
+        ]
+        if not pending:
+            return
+        self._view_prewarmer = ViewPrewarmer(pending, parent=self)
+        self._view_prewarmer.start()
+
     @staticmethod
     def _nav_btn(icon: str, tooltip: str) -> QPushButton:
         """Create a sidebar navigation button."""
@@ -520,11 +601,16 @@ class DupeZDashboard(QMainWindow):
             for loaded in ui_plugins:
                 try:
                     info = loaded.instance.get_panel_info()
-                    widget = loaded.instance.create_widget(parent=self.view_stack)
-                    if widget is None:
-                        continue
-                    view_idx = self.view_stack.count()
-                    self.view_stack.addWidget(widget)
+                    key = f"plugin:{loaded.name}"
+                    # The plugin owns its panel's timers; don't park them.
+                    view_idx = self._add_view(
+                        key,
+                        info.get("tooltip", loaded.name),
+                        lambda plugin=loaded.instance: plugin.create_widget(
+                            parent=self.view_stack,
+                        ),
+                        pause_hidden=False,
+                    )
 
                     btn = self._nav_btn(
                         info.get("icon", "\U0001f50c"),
@@ -535,12 +621,27 @@ class DupeZDashboard(QMainWindow):
                     )
                     self.nav_buttons.append(btn)
                     sidebar_layout.addWidget(btn, 0, Qt.AlignmentFlag.AlignHCenter)
+                    # A plugin with no widget gets no button. The page stays
+                    # in the stack so nav_buttons keeps matching its indices.
+                    host = self._view_hosts[key]
+                    host.empty.connect(
+                        lambda b=btn, i=view_idx: self._drop_plugin_panel(b, i),
+                    )
+                    if host.is_empty:
+                        self._drop_plugin_panel(btn, view_idx)
+                        continue
                     log_info(f"Plugin UI panel loaded: {loaded.name}")
                 except Exception as exc:
                     log_error(f"Failed to load plugin UI panel '{loaded.name}': {exc}")
         except Exception as exc:
             log_error(f"Plugin panel loading error: {exc}")
 
+    def _drop_plugin_panel(self, btn: QPushButton, index: int) -> None:
+        """Hide the nav button of a plugin panel that has no widget."""
+        btn.setVisible(False)
+        if self.view_stack.currentIndex() == index:
+            self.switch_view(0)
+
     # ── Header stats ────────────────────────────────────────────────
 
     def _update_header_stats(self) -> None:
@@ -827,36 +928,45 @@ class DupeZDashboard(QMainWindow):
         self._gpu_tier_label.setToolTip(tooltip)
         self.status_bar.addPermanentWidget(self._gpu_tier_label)
 
-    def _update_status_bar(self) -> None:
-        """Request the shared status-bar/tray snapshot off the Qt thread."""
-        controller = self.controller
-        if controller is None or self._dashboard_poll_in_flight:
+    def _subscribe_status_bus(self) -> None:
+        """Receive device/disruption counts from the shared status bus."""
+        bus = get_status_bus(self.controller)
+        if bus is None or self._status_subscription is not None:
             return
-
-        self._dashboard_poll_generation += 1
         generation = self._dashboard_poll_generation
-        self._dashboard_poll_in_flight = True
 
-        def _fetch() -> None:
-            try:
-                devices = controller.get_devices()
-                disrupted = controller.get_disrupted_devices()
+        def _on_update(update: StatusUpdate) -> None:
+            # Runs on the bus sampler thread — hop to Qt via the signal.
+            error = next(iter(update.errors.values()), "")
+            if error:
+                self._dashboard_snapshot_failed.emit(generation, error)
+            if FIELD_DISRUPTED in update.values:
                 self._dashboard_snapshot_ready.emit(
                     generation,
-                    len(devices),
-                    disrupted,
-                )
-            except Exception as exc:
-                self._dashboard_snapshot_failed.emit(
-                    generation,
-                    f"{type(exc).__name__}: {exc}",
+                    int(update.values.get(
+                        FIELD_DEVICE_COUNT, self._device_count_snapshot)),
+                    update.values[FIELD_DISRUPTED],
                 )
 
-        threading.Thread(
-            target=_fetch,
-            daemon=True,
-            name="DupeZDashboardStatusRefresh",
-        ).start()
+        self._status_subscription = bus.subscribe(
+            _on_update,
+            (FIELD_DEVICE_COUNT, FIELD_DISRUPTED),
+            max_rate_hz=0.5,
+        )
+
+    def _update_status_bar(self) -> None:
+        """Ask the status bus for an immediate status-bar/tray refresh."""
+        bus = get_status_bus(self.controller)
+        if bus is not None:
+            bus.request_refresh((FIELD_DEVICE_COUNT, FIELD_DISRUPTED))
+
+    def _unsubscribe_status_bus(self) -> None:
+        """Drop the bus subscription and reject any queued late result."""
+        self._dashboard_poll_generation += 1
+        subscription = self._status_subscription
+        self._status_subscription = None
+        if subscription is not None:
+            subscription.close()
 
     @pyqtSlot(int, int, object)
     def _apply_dashboard_status_snapshot(
@@ -868,7 +978,6 @@ class DupeZDashboard(QMainWindow):
         """Update status bar and tray from the newest worker result."""
         if generation != self._dashboard_poll_generation:
             return
-        self._dashboard_poll_in_flight = False
         if not isinstance(disrupted, (list, tuple, set, frozenset)):
             self._apply_dashboard_status_error(
                 generation,
@@ -898,10 +1007,9 @@ class DupeZDashboard(QMainWindow):
         generation: int,
         message: str,
     ) -> None:
-        """Release the guard after a failed snapshot without clearing state."""
+        """Log a failed snapshot without clearing last-known state."""
         if generation != self._dashboard_poll_generation:
             return
-        self._dashboard_poll_in_flight = False
         log_error(f"Dashboard status refresh error: {message}")
 
     # ── Signal wiring ───────────────────────────────────────────────
@@ -918,6 +1026,9 @@ class DupeZDashboard(QMainWindow):
                         f"Scan complete \u2014 {len(devs)} devices", 3000,
                     ),
                 )
+                self.clumsy_view.scan_finished.connect(
+                    lambda _devs: self._update_status_bar(),
+                )
             # Re-apply nav button styles whenever the global theme changes
             try:
                 from app.themes.theme_manager import get_theme_manager
@@ -1455,13 +1566,20 @@ class DupeZDashboard(QMainWindow):
         # Show a simple progress message
         self.statusBar().showMessage("Downloading update...", 0)
 
-        def on_progress(done: int, total: int) -> None:
-            if total > 0:
-                pct = int(done / total * 100)
+        def on_progress(progress) -> None:
+            if progress.total > 0:
+                pct = int(progress.fraction * 100)
+                text = f"Downloading update... {pct}%"
+                if progress.rate_bps > 0:
+                    text += f" ({progress.rate_bps / 1_048_576:.1f} MB/s"
+                    if progress.eta_sec is not None:
+                        mins, secs = divmod(int(progress.eta_sec), 60)
+                        text += f", {mins}:{secs:02d} left"
+                    text += ")"
                 QMetaObject.invokeMethod(
                     self.statusBar(), "showMessage",
                     Qt.ConnectionType.QueuedConnection,
-                    Q_ARG(str, f"Downloading update... {pct}%"),
+                    Q_ARG(str, text),
                     Q_ARG(int, 0),
                 )
 
@@ -1802,10 +1920,10 @@ class DupeZDashboard(QMainWindow):
             return
 
         try:
-            self._dashboard_poll_generation += 1
-            self._dashboard_poll_in_flight = False
-            self._status_timer.stop()
+            self._unsubscribe_status_bus()
             self._stats_timer.stop()
+            if self._view_prewarmer is not None:
+                self._view_prewarmer.stop()
             if hasattr(self, "clumsy_view"):
                 self.clumsy_view.stop_background_refresh()
 
@@ -12,11 +12,14 @@ from __future__ import annotations
 
 import csv
 import os
+import threading
 from copy import deepcopy
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QColor, QFont
 from PyQt6.QtWidgets import (
     QAbstractItemView,
@@ -29,6 +32,7 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QMenu,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QSizePolicy,
     QTableWidget,
@@ -281,6 +285,488 @@ def _filter_dayz_accounts(
         out.append(account)
     return out
 
+# ── Streaming import / export pipeline ─────────────────────────────
+#
+# Everything in this section is Qt-free and touches neither the widget
+# nor ``account_manager``: the tracker runs it on a worker thread and
+# commits the returned batch on the GUI thread in a single save. Rows
+# are streamed (openpyxl read-only mode / chunked ``csv.reader``),
+# headers are normalized once per file, and duplicates are rejected
+# against a lower-cased name set instead of a linear scan per row.
+
+#: Rows pulled from the CSV reader per chunk; cancellation and progress
+#: are checked once per chunk.
+_CSV_CHUNK_ROWS: int = 2000
+
+#: Rows between cancellation / progress checks on the XLSX path.
+_XLSX_PROGRESS_ROWS: int = 1000
+
+#: Cap on per-row error strings kept for the import summary dialog.
+_IMPORT_ERROR_SAMPLE: int = 20
+
+#: Rows scanned for a header, and data rows sampled for account-column
+#: inference when the header cell for the name column is blank.
+_XLSX_HEADER_SCAN_ROWS: int = 5
+_XLSX_INFER_SAMPLE_ROWS: int = 5
+
+#: Header synonyms for the optional "Bases" section below the account rows.
+_XLSX_BASE_HEADERS: Dict[str, str] = {
+    'base': 'base_name', 'bases': 'base_name', 'name': 'base_name',
+    'code': 'base_code',
+    'location': 'base_location', 'loc': 'base_location',
+    'status': 'base_status', 'notes': 'base_notes',
+}
+
+_OPENPYXL_MISSING_MSG: str = (
+    "openpyxl is required for XLSX import/export.\n\n"
+    "Install it with:\npip install openpyxl"
+)
+
+
+class _TransferCancelled(Exception):
+    """Raised inside the pipeline when the operator cancels a transfer."""
+
+
+@dataclass
+class _ImportSummary:
+    """Outcome of one streamed import; ``accounts`` is the uncommitted batch."""
+
+    fmt: str
+    accounts: List[Dict[str, Any]] = field(default_factory=list)
+    imported: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    bases: int = 0
+    rows_read: int = 0
+    delimiter: str = ""
+    unmapped: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    error_count: int = 0
+
+    def note_error(self, message: str) -> None:
+        """Count a rejected row, keeping only the first few messages."""
+        self.error_count += 1
+        if len(self.errors) < _IMPORT_ERROR_SAMPLE:
+            self.errors.append(message)
+
+
+def _account_key(name: Any) -> str:
+    """Case-insensitive identity used for duplicate detection."""
+    return str(name or "").strip().lower()
+
+
+def _validate_account_row(data: Dict[str, Any]) -> str:
+    """Return ``""`` when *data* is importable, else a short rejection reason."""
+    account = str(data.get('account', '') or '').strip()
+    if not account or len(account) < 2:
+        return f"account too short: '{account}'"
+    if not any(c.isalnum() for c in account):
+        return f"no alphanumeric chars: '{account}'"
+    email = str(data.get('email', '') or '').strip()
+    if email and '@' not in email:
+        return f"bad email: '{email}'"
+    return ""
+
+
+def _cell_text(row: Tuple[Any, ...], col_idx: int) -> str:
+    """Stripped text of 1-based *col_idx* in a values-only *row* ('' if absent)."""
+    if col_idx > len(row):
+        return ""
+    val = row[col_idx - 1]
+    return "" if val is None else str(val).strip()
+
+
+def _check_cancel(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise _TransferCancelled()
+
+
+def _iter_csv_account_rows(
+    file_path: str,
+    summary: _ImportSummary,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Yield ``(row_label, field_dict)`` for every CSV data row.
+
+    Handles a UTF-8 BOM (``utf-8-sig``), sniffs the delimiter from a
+    4 KB probe, maps header cells through :func:`_normalize_header` /
+    :data:`_XLSX_KNOWN_HEADERS` once, and falls back to positional
+    :data:`_XLSX_DEFAULT_FIELDS` when no header is recognized — in
+    which case the first line is treated as data.
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8-sig',
+              errors='replace') as probe:
+        sample = probe.read(4096)
+    delimiter = ','
+    if sample.strip():
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+        except csv.Error:
+            delimiter = ','
+    summary.delimiter = delimiter
+
+    with open(file_path, 'r', newline='', encoding='utf-8-sig',
+              errors='replace') as fh:
+        reader = csv.reader(fh, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        col_map: List[Tuple[int, str]] = []
+        for idx, raw in enumerate(header):
+            norm = _normalize_header(raw)
+            if norm in _XLSX_KNOWN_HEADERS:
+                col_map.append((idx, _XLSX_KNOWN_HEADERS[norm]))
+            elif raw:
+                summary.unmapped.append(str(raw))
+
+        line_no = 1
+        if not col_map:
+            log_warning(
+                f"CSV headers unrecognized; falling back to positional "
+                f"mapping. Unmapped: {header}"
+            )
+            summary.unmapped = []
+            col_map = list(enumerate(_XLSX_DEFAULT_FIELDS))
+            yield "row 1", _map_csv_row(header, col_map)
+
+        while True:
+            _check_cancel(cancel_event)
+            chunk = list(islice(reader, _CSV_CHUNK_ROWS))
+            if not chunk:
+                break
+            for row in chunk:
+                line_no += 1
+                yield f"row {line_no}", _map_csv_row(row, col_map)
+
+
+def _map_csv_row(row: List[str], col_map: List[Tuple[int, str]]) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    width = len(row)
+    for idx, fld in col_map:
+        if idx < width:
+            val = row[idx].strip()
+            if val or fld not in out:
+                out[fld] = val
+    return out
+
+
+def _iter_xlsx_account_rows(
+    file_path: str,
+    summary: _ImportSummary,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Yield ``(row_label, field_dict)`` for every XLSX account row.
+
+    Streams the active sheet in openpyxl read-only mode. Only the first
+    few rows are buffered (header detection plus the v5.6.7 blank
+    account-header inference); everything after is read once. A
+    "Bases" section below the accounts ends the account rows and is
+    counted into ``summary.bases``.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        # Some writers emit a stale <dimension>; read rows as they are.
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        head = list(islice(rows, _XLSX_HEADER_SCAN_ROWS + _XLSX_INFER_SAMPLE_ROWS))
+
+        # --- Detect header row and column mapping ---
+        header_row = 0
+        header_map: Dict[int, str] = {}
+        for row_idx, row in enumerate(head[:_XLSX_HEADER_SCAN_ROWS], start=1):
+            matches = {}
+            for col_idx, val in enumerate(row, start=1):
+                if val is None:
+                    continue
+                norm = _normalize_header(val)
+                if norm and norm in _XLSX_KNOWN_HEADERS:
+                    matches[col_idx] = _XLSX_KNOWN_HEADERS[norm]
+            if len(matches) >= 2:
+                header_row = row_idx
+                header_map = matches
+                break
+
+        if not header_row:
+            # No recognizable header row — positional fallback, row 1 is data.
+            header_map = {i: f for i, f in enumerate(_XLSX_DEFAULT_FIELDS, start=1)}
+
+        # Account-column inference (v5.6.7): the name column often has a
+        # blank header cell. Adopt the leftmost unmapped column with text
+        # in at least two of the sampled data rows.
+        if "account" not in header_map.values():
+            sample = head[header_row:header_row + _XLSX_INFER_SAMPLE_ROWS]
+            width = max((len(r) for r in head), default=0)
+            for col_idx in range(1, width + 1):
+                if col_idx in header_map:
+                    continue
+                if sum(1 for r in sample if _cell_text(r, col_idx)) >= 2:
+                    header_map[col_idx] = "account"
+                    log_info(
+                        f"XLSX account column inferred at col {col_idx} "
+                        f"(header cell was blank; data rows have text)"
+                    )
+                    break
+
+        log_info(f"XLSX header detected at row {header_row}: {header_map}")
+        columns = sorted(header_map.items())
+
+        def _data_rows():
+            yield from enumerate(head[header_row:], start=header_row + 1)
+            yield from enumerate(rows, start=len(head) + 1)
+
+        bases_map: Optional[Dict[int, str]] = None
+        for row_idx, row in _data_rows():
+            if row_idx % _XLSX_PROGRESS_ROWS == 0:
+                _check_cancel(cancel_event)
+            if bases_map is not None:
+                if any(_cell_text(row, c) for c in range(1, len(row) + 1)):
+                    summary.bases += 1
+                continue
+
+            first = _cell_text(row, 1)
+            if first and 'base' in first.lower():
+                second = row[1] if len(row) > 1 else None
+                if second is None or _normalize_header(second) in _XLSX_KNOWN_HEADERS:
+                    bases_map = {
+                        c: _XLSX_BASE_HEADERS[_cell_text(row, c).lower()]
+                        for c in range(1, len(row) + 1)
+                        if _cell_text(row, c).lower() in _XLSX_BASE_HEADERS
+                    }
+                    log_info(f"XLSX bases section detected at row {row_idx}")
+                    continue
+
+            yield f"row {row_idx}", {f: _cell_text(row, c) for c, f in columns}
+    finally:
+        wb.close()
+
+
+def _stream_import_accounts(
+    file_path: str,
+    existing_names: Set[str],
+    *,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> _ImportSummary:
+    """Parse, validate and dedupe *file_path* into an uncommitted batch.
+
+    *existing_names* holds :func:`_account_key` values already in the
+    tracker; rows colliding with them (or with earlier rows of the same
+    file) are skipped as duplicates. *progress* receives
+    ``(rows_read, estimated_total)`` where the total is ``0`` when it
+    cannot be estimated. Raises :class:`_TransferCancelled` when
+    *cancel_event* is set — nothing is returned for a cancelled import.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    is_xlsx = ext in ('.xlsx', '.xlsm')
+    summary = _ImportSummary(fmt="XLSX" if is_xlsx else "CSV")
+    total = _estimate_row_count(file_path, is_xlsx)
+    rows = (_iter_xlsx_account_rows if is_xlsx else _iter_csv_account_rows)(
+        file_path, summary, cancel_event,
+    )
+
+    seen = set(existing_names)
+    stamp = datetime.now()
+    now = stamp.isoformat()
+    id_prefix = "xlsx" if is_xlsx else "imported"
+    id_suffix = stamp.timestamp()
+    step = _XLSX_PROGRESS_ROWS if is_xlsx else _CSV_CHUNK_ROWS
+
+    for label, row_data in rows:
+        summary.rows_read += 1
+        if progress is not None and summary.rows_read % step == 0:
+            progress(summary.rows_read, total)
+        if not any(row_data.values()):
+            continue
+        try:
+            account_data = {f: row_data.get(f, '') for f in ACCOUNT_FIELDS}
+            if account_data['status']:
+                account_data['status'] = _canon_status(account_data['status'])
+            else:
+                account_data['status'] = 'Ready'
+            if account_data['station']:
+                account_data['station'] = _canon_station(account_data['station'])
+
+            reason = _validate_account_row(account_data)
+            if reason:
+                summary.skipped += 1
+                summary.note_error(f"{label}: {reason}")
+                continue
+            key = _account_key(account_data['account'])
+            if key in seen:
+                summary.skipped += 1
+                summary.duplicates += 1
+                continue
+            seen.add(key)
+
+            summary.imported += 1
+            account_data.update(
+                last_seen=now, created_date=now,
+                id=f"{id_prefix}_{summary.imported}_{id_suffix}",
+            )
+            summary.accounts.append(account_data)
+        except Exception as e:
+            summary.skipped += 1
+            summary.note_error(f"{label}: {e}")
+
+    _check_cancel(cancel_event)
+    if progress is not None:
+        progress(summary.rows_read, summary.rows_read)
+    return summary
+
+
+def _estimate_row_count(file_path: str, is_xlsx: bool) -> int:
+    """Best-effort row count for progress reporting (``0`` = unknown)."""
+    try:
+        if is_xlsx:
+            import openpyxl
+            wb = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                return int(wb.active.max_row or 0)
+            finally:
+                wb.close()
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as fh:
+            probe = fh.read(65536)
+        lines = probe.count(b'\n')
+        if not lines:
+            return 0
+        return max(1, int(size * lines / len(probe)))
+    except Exception:
+        return 0
+
+
+def _write_accounts_csv(
+    file_path: str,
+    accounts: List[Dict[str, Any]],
+    *,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> int:
+    """Write *accounts* to *file_path* as CSV; returns the row count.
+
+    Output goes to a ``.part`` sibling that replaces *file_path* only on
+    success, so a cancelled or failed export never leaves a truncated file.
+    """
+    total = len(accounts)
+    tmp = f"{file_path}.part"
+    try:
+        with open(tmp, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh)
+            writer.writerow(TABLE_HEADERS)
+            for start in range(0, total, _CSV_CHUNK_ROWS):
+                _check_cancel(cancel_event)
+                writer.writerows(
+                    [a.get(f, '') for f in ACCOUNT_FIELDS]
+                    for a in accounts[start:start + _CSV_CHUNK_ROWS]
+                )
+                if progress is not None:
+                    progress(min(start + _CSV_CHUNK_ROWS, total), total)
+        os.replace(tmp, file_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return total
+
+
+def _write_accounts_xlsx(
+    file_path: str,
+    accounts: List[Dict[str, Any]],
+    *,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> int:
+    """Write *accounts* to a styled XLSX workbook with a frozen header row.
+
+    Uses openpyxl's write-only mode so rows stream to disk instead of
+    building the whole sheet in memory. Same ``.part`` + replace
+    semantics as :func:`_write_accounts_csv`.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+
+    fields = list(ACCOUNT_FIELDS)
+    total = len(accounts)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Accounts")
+
+    # Named styles are registered once and referenced by name per cell,
+    # which is markedly cheaper than assigning border/alignment/font
+    # objects to every one of 11 x N cells.
+    side = Side(style='thin', color='1A2A3A')
+    thin_border = Border(left=side, right=side, top=side, bottom=side)
+    plain_align = Alignment(vertical='center', wrap_text=False)
+    wrap_align = Alignment(vertical='center', wrap_text=True)
+    wb.add_named_style(NamedStyle(
+        name="acct_header", border=thin_border,
+        font=Font(bold=True, color="FFFFFF", size=11),
+        fill=PatternFill('solid', fgColor="16213E"),
+        alignment=Alignment(horizontal='center', vertical='center'),
+    ))
+    wb.add_named_style(NamedStyle(name="acct_plain", border=thin_border, alignment=plain_align))
+    wb.add_named_style(NamedStyle(name="acct_wrap", border=thin_border, alignment=wrap_align))
+    status_styles: Dict[str, str] = {}
+    for status, c in STATUS_COLORS.items():
+        style_name = f"acct_status_{status.lower().replace(' ', '_')}"
+        wb.add_named_style(NamedStyle(
+            name=style_name, border=thin_border, alignment=plain_align,
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill('solid', fgColor=f'{c.red():02X}{c.green():02X}{c.blue():02X}'),
+        ))
+        status_styles[status] = style_name
+    styles = ["acct_wrap" if f in ('holding', 'notes') else "acct_plain" for f in fields]
+    status_col = fields.index('status')
+
+    # Column widths must be declared before the first row in write-only mode.
+    widths = [len(h) for h in TABLE_HEADERS]
+    for account in accounts:
+        for i, f in enumerate(fields):
+            val = account.get(f, '')
+            if val:
+                n = len(str(val))
+                if n > widths[i]:
+                    widths[i] = n
+    for i, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = min(w + 4, 50)
+    ws.freeze_panes = 'A2'
+
+    def _cell(value, style_name):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style_name
+        return cell
+
+    ws.append([_cell(h, "acct_header") for h in TABLE_HEADERS])
+    for n, account in enumerate(accounts, start=1):
+        if n % _XLSX_PROGRESS_ROWS == 0:
+            _check_cancel(cancel_event)
+            if progress is not None:
+                progress(n, total)
+        row = [_cell(account.get(f, ''), styles[i]) for i, f in enumerate(fields)]
+        status_style = status_styles.get(account.get('status', ''))
+        if status_style is not None:
+            row[status_col].style = status_style
+        ws.append(row)
+
+    _check_cancel(cancel_event)
+    tmp = f"{file_path}.part"
+    try:
+        wb.save(tmp)
+        os.replace(tmp, file_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    if progress is not None:
+        progress(total, total)
+    log_info(f"XLSX export saved to {file_path}")
+    return total
+
+
 # ── QSS constants ──────────────────────────────────────────────────
 
 _TRACKER_QSS: str = """
@@ -364,6 +850,11 @@ class DayZAccountTracker(QWidget):
     rest of the dashboard remains usable.
     """
 
+    # Worker → GUI delivery for background import/export (see _start_transfer).
+    _transfer_progress = pyqtSignal(int, int, int)   # generation, done, total
+    _transfer_done = pyqtSignal(int, object)         # generation, result
+    _transfer_failed = pyqtSignal(int, str)          # generation, message ("" = cancelled)
+
     def __init__(self, controller: Any = None) -> None:
         super().__init__()
         self.controller: Any = controller
@@ -371,6 +862,14 @@ class DayZAccountTracker(QWidget):
         self.current_account: Optional[Dict[str, Any]] = None
         self.selected_accounts: Set[str] = set()
         self._active_status_filter: Optional[str] = None
+        self._transfer_generation = 0
+        self._transfer_kind: Optional[str] = None
+        self._transfer_cancel: Optional[threading.Event] = None
+        self._transfer_dialog: Optional[QProgressDialog] = None
+        self._transfer_label = ""
+        self._transfer_progress.connect(self._apply_transfer_progress)
+        self._transfer_done.connect(self._apply_transfer_result)
+        self._transfer_failed.connect(self._apply_transfer_error)
 
         try:
             self._build_ui()
@@ -1175,12 +1674,17 @@ class DayZAccountTracker(QWidget):
                 "Edit or replace them with your own accounts.")
         log_info(f"Template loaded: {len(_TEMPLATE_ACCOUNTS)} accounts")
 
-    def _refresh_after_import(self) -> None:
-        """Common post-import refresh: save, rebuild table, update stats."""
-        try:
-            account_manager.save_changes(account_manager.accounts)
-        except Exception as e:
-            log_error(f"Failed to save imports: {e}")
+    def _refresh_after_import(self, *, persist: bool = True) -> None:
+        """Common post-import refresh: save, rebuild table, update stats.
+
+        Pass ``persist=False`` when the caller already committed the batch
+        (e.g. via ``account_manager.add_accounts``).
+        """
+        if persist:
+            try:
+                account_manager.save_changes(account_manager.accounts)
+            except Exception as e:
+                log_error(f"Failed to save imports: {e}")
         self.account_table.clearContents()
         self.account_table.setRowCount(0)
         self.accounts = account_manager.accounts.copy()
@@ -1242,21 +1746,19 @@ class DayZAccountTracker(QWidget):
     # ── Import / Export ─────────────────────────────────────────────
 
     def _upload_accounts(self) -> None:
-        """Prompt for a CSV or XLSX file and import its rows."""
+        """Prompt for a CSV or XLSX file and import it on a worker thread."""
         try:
             from PyQt6.QtWidgets import QFileDialog
 
             file_path, _ = QFileDialog.getOpenFileName(
                 self, "Select Account File", "",
-                "All Supported (*.xlsx *.xls *.csv);;Excel Files (*.xlsx *.xls);;CSV Files (*.csv);;All Files (*)",
+                "All Supported (*.xlsx *.csv);;Excel Files (*.xlsx);;CSV Files (*.csv);;All Files (*)",
             )
 
             if file_path:
                 ext = os.path.splitext(file_path)[1].lower()
-                if ext in ('.xlsx', '.xls'):
-                    self._process_xlsx_file(file_path)
-                elif ext == '.csv':
-                    self._process_csv_file(file_path)
+                if ext in ('.xlsx', '.xlsm', '.csv'):
+                    self._start_import(file_path)
                 else:
                     QMessageBox.warning(self, "Unsupported File",
                         f"File type '{ext}' is not supported. Use .xlsx or .csv files.")
@@ -1265,371 +1767,199 @@ class DayZAccountTracker(QWidget):
             log_error(f"Failed to upload accounts: {e}")
             QMessageBox.critical(self, "Error", f"Failed to upload accounts: {e}")
 
-    def _process_xlsx_file(self, file_path: str) -> None:
-        """Import accounts from an XLSX workbook with auto-detected headers."""
-        try:
-            import openpyxl
+    # ── Background transfer plumbing ────────────────────────────────
 
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            sheet = wb.active
+    def _start_import(self, file_path: str) -> None:
+        """Stream *file_path* through the import pipeline off the GUI thread.
 
-            # --- Detect header row and column mapping ---
-            header_row_idx: Optional[int] = None
-            header_map: Dict[int, str] = {}
+        The worker sees only a snapshot of existing account names; the
+        parsed batch is committed by :meth:`_apply_import_result` on the
+        GUI thread in one save.
+        """
+        existing = {_account_key(a.get('account', '')) for a in account_manager.accounts}
+        name = os.path.basename(file_path)
 
-            for row_idx in range(1, min(6, sheet.max_row + 1)):
-                row_vals = []
-                for col_idx in range(1, sheet.max_column + 1):
-                    cell_val = sheet.cell(row=row_idx, column=col_idx).value
-                    if cell_val is not None:
-                        row_vals.append((col_idx, _normalize_header(cell_val)))
+        def _job(progress, cancel_event):
+            return _stream_import_accounts(
+                file_path, existing, progress=progress, cancel_event=cancel_event,
+            )
 
-                matches = {}
-                for col_idx, val in row_vals:
-                    if val and val in _XLSX_KNOWN_HEADERS:
-                        matches[col_idx] = _XLSX_KNOWN_HEADERS[val]
+        self._start_transfer("import", f"Importing {name}...", _job)
 
-                if len(matches) >= 2:
-                    header_row_idx = row_idx
-                    header_map = matches
-                    break
+    def _start_export(self, file_path: str, accounts: List[Dict[str, Any]]) -> None:
+        """Write *accounts* to *file_path* (CSV or XLSX) off the GUI thread."""
+        snapshot = [dict(a) for a in accounts]
+        is_xlsx = os.path.splitext(file_path)[1].lower() == '.xlsx'
+        writer = _write_accounts_xlsx if is_xlsx else _write_accounts_csv
 
-            if header_row_idx is None:
-                # No recognizable header row — positional fallback.
-                # We start at row 1 so that row 1 is treated as data, not header.
-                header_row_idx = 0
-                for col_idx in range(1, min(len(_XLSX_DEFAULT_FIELDS) + 1, sheet.max_column + 1)):
-                    header_map[col_idx] = _XLSX_DEFAULT_FIELDS[col_idx - 1]
-
-            # v5.6.7: account-name column inference.
-            #
-            # User-supplied workbooks frequently have the account name in
-            # column A but leave that header cell blank (the name acts as
-            # the de-facto row label, while EMAIL / STATUS / etc. are
-            # explicit headers starting in column B). Before this fix
-            # the auto-detector would happily map every other column,
-            # leave column A unmapped, and then silently skip every row
-            # because row_data['account'] was always empty.
-            #
-            # Heuristic: if no column in header_map currently resolves
-            # to "account", scan unmapped columns left-to-right; for
-            # each candidate, look at the next several data rows and
-            # count cells that contain text. The first column with
-            # consistent text content gets adopted as the account
-            # column. We bias toward the leftmost candidate because
-            # spreadsheet convention puts the row-label there.
-            if "account" not in header_map.values() and header_row_idx >= 0:
-                inferred_col = None
-                unmapped_cols = [
-                    c for c in range(1, sheet.max_column + 1)
-                    if c not in header_map
-                ]
-                # Sample up to 5 data rows immediately after the header.
-                sample_start = max(1, header_row_idx + 1)
-                sample_end = min(sample_start + 5, sheet.max_row + 1)
-                for col_idx in unmapped_cols:
-                    text_cells = 0
-                    for row_idx in range(sample_start, sample_end):
-                        val = sheet.cell(row=row_idx, column=col_idx).value
-                        if val is not None and str(val).strip():
-                            text_cells += 1
-                    # Require at least 2 rows of text to avoid mistaking a
-                    # sparse / "notes only on row 3" column for the name.
-                    if text_cells >= 2:
-                        inferred_col = col_idx
-                        break
-                if inferred_col is not None:
-                    header_map[inferred_col] = "account"
-                    log_info(
-                        f"XLSX account column inferred at col {inferred_col} "
-                        f"(header cell was blank; data rows have text)"
-                    )
+        def _job(progress, cancel_event):
+            count = writer(file_path, snapshot, progress=progress, cancel_event=cancel_event)
+            return {"fmt": "XLSX" if is_xlsx else "CSV", "count": count, "path": file_path}
 
-            log_info(f"XLSX header detected at row {header_row_idx}: {header_map}")
-
-            # --- Parse account rows ---
-            accounts_imported = 0
-            accounts_skipped = 0
-            bases_data = []
-
-            # Detect where "Bases" section starts
-            bases_start_row = None
-            for row_idx in range(header_row_idx + 1, sheet.max_row + 1):
-                cell_a = sheet.cell(row=row_idx, column=1).value
-                if cell_a and 'base' in str(cell_a).strip().lower():
-                    cell_b = sheet.cell(row=row_idx, column=2).value
-                    if cell_b is None or _normalize_header(cell_b) in _XLSX_KNOWN_HEADERS:
-                        bases_start_row = row_idx
-                        log_info(f"XLSX bases section detected at row {bases_start_row}")
-                        break
+        self._start_transfer("export", f"Exporting {len(snapshot)} accounts...", _job)
 
-            account_end_row = bases_start_row if bases_start_row else sheet.max_row + 1
-
-            # When header_row_idx == 0 (positional fallback), start reading at row 1.
-            data_start_row = max(1, header_row_idx + 1)
-
-            for row_idx in range(data_start_row, account_end_row):
-                try:
-                    row_data = {}
-                    is_empty = True
-                    for col_idx, field in header_map.items():
-                        cell_val = sheet.cell(row=row_idx, column=col_idx).value
-                        if cell_val is not None:
-                            val = str(cell_val).strip()
-                            if val:
-                                is_empty = False
-                            row_data[field] = val
-                        else:
-                            row_data[field] = ''
-
-                    if is_empty:
-                        continue
-
-                    account_name = row_data.get('account', '').strip()
-                    if not account_name or len(account_name) < 2:
-                        accounts_skipped += 1
-                        continue
-
-                    # Canonicalize status / station casing so color chips still match.
-                    if row_data.get('status'):
-                        row_data['status'] = _canon_status(row_data['status'])
-                    if row_data.get('station'):
-                        row_data['station'] = _canon_station(row_data['station'])
-
-                    now = datetime.now().isoformat()
-                    account_data = {f: row_data.get(f, 'Ready' if f == 'status' else '')
-                                    for f in ACCOUNT_FIELDS}
-                    account_data.update(last_seen=now, created_date=now,
-                                        id=f"xlsx_{accounts_imported + 1}_{datetime.now().timestamp()}")
-
-                    if self._try_import_account(account_data):
-                        accounts_imported += 1
-                    else:
-                        accounts_skipped += 1
-
-                except Exception as e:
-                    accounts_skipped += 1
-                    log_error(f"XLSX error at row {row_idx}: {e}")
-                    continue
+    def _start_transfer(self, kind: str, label: str, job: Callable[..., Any]) -> None:
+        """Run *job(progress, cancel_event)* on a daemon thread.
 
-            # --- Parse bases section if present ---
-            bases_imported = 0
-            if bases_start_row:
-                bases_header_map = {}
-                row_vals = []
-                for col_idx in range(1, sheet.max_column + 1):
-                    cell_val = sheet.cell(row=bases_start_row, column=col_idx).value
-                    if cell_val is not None:
-                        row_vals.append((col_idx, str(cell_val).strip().lower()))
-
-                base_headers = {
-                    'base': 'base_name', 'bases': 'base_name', 'name': 'base_name',
-                    'code': 'base_code',
-                    'location': 'base_location', 'loc': 'base_location',
-                    'status': 'base_status', 'notes': 'base_notes',
-                }
-                for col_idx, val in row_vals:
-                    if val in base_headers:
-                        bases_header_map[col_idx] = base_headers[val]
-
-                for row_idx in range(bases_start_row + 1, sheet.max_row + 1):
-                    base_row = {}
-                    is_empty = True
-                    for col_idx in range(1, sheet.max_column + 1):
-                        cell_val = sheet.cell(row=row_idx, column=col_idx).value
-                        if cell_val is not None and str(cell_val).strip():
-                            is_empty = False
-                            field = bases_header_map.get(col_idx, f'col_{col_idx}')
-                            base_row[field] = str(cell_val).strip()
-                    if not is_empty:
-                        bases_data.append(base_row)
-                        bases_imported += 1
-
-                log_info(f"XLSX bases imported: {bases_imported}")
-
-            self._refresh_after_import()
-
-            msg = (f"Import completed!\n\n"
-                   f"Accounts imported: {accounts_imported}\n"
-                   f"Accounts skipped: {accounts_skipped}\n"
-                   f"Total accounts: {len(self.accounts)}")
-            if bases_imported > 0:
-                msg += f"\n\nBases found: {bases_imported}"
-            QMessageBox.information(self, "XLSX Import Complete", msg)
-            log_info(f"XLSX import done: {accounts_imported} imported, {accounts_skipped} skipped, {bases_imported} bases")
-
-        except ImportError:
-            log_error("openpyxl not installed")
-            QMessageBox.critical(self, "Missing Library",
-                "openpyxl is required for XLSX import.\n\nInstall it with:\npip install openpyxl")
-        except Exception as e:
-            log_error(f"Failed to process XLSX file: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to process XLSX file:\n{e}")
-
-    def _process_csv_file(self, file_path: str) -> None:
-        """Import accounts from a CSV file with header-based column mapping.
-
-        Handles:
-            * UTF-8 BOM (``encoding='utf-8-sig'``) so Excel-exported CSVs
-              round-trip cleanly.
-            * Delimiter sniffing (comma, semicolon, tab, pipe) via
-              :class:`csv.Sniffer` with a comma fallback.
-            * Expanded header synonyms / tag-identifiers via
-              :func:`_normalize_header` + :data:`_XLSX_KNOWN_HEADERS`.
-            * Positional fallback when no header row is recognized,
-              using :data:`_XLSX_DEFAULT_FIELDS` (which now matches
-              :data:`ACCOUNT_FIELDS` exactly).
-            * Canonical casing for ``status`` / ``station`` values so
-              ``"ready"`` from a foreign CSV still renders with the
-              correct color chip.
+        Results, progress and failures come back through the
+        ``_transfer_*`` signals tagged with a generation number so a
+        late completion from a superseded or cancelled transfer is
+        ignored. Only one transfer runs at a time.
         """
-        try:
-            accounts_imported = 0
-            accounts_skipped = 0
-            unmapped_headers: List[str] = []
-
-            # --- Delimiter sniff on a small probe buffer ---
-            with open(file_path, 'r', newline='', encoding='utf-8-sig',
-                      errors='replace') as probe:
-                sample = probe.read(4096)
-            dialect_delim = ','
-            if sample.strip():
-                try:
-                    dialect = csv.Sniffer().sniff(sample, delimiters=',;\t|')
-                    dialect_delim = dialect.delimiter
-                except csv.Error:
-                    dialect_delim = ','
-
-            with open(file_path, 'r', newline='', encoding='utf-8-sig',
-                      errors='replace') as file:
-                reader = csv.DictReader(file, delimiter=dialect_delim)
-
-                csv_col_map: Dict[str, str] = {}
-                if reader.fieldnames:
-                    for col_name in reader.fieldnames:
-                        if col_name is None:
-                            continue
-                        norm = _normalize_header(col_name)
-                        if norm in _XLSX_KNOWN_HEADERS:
-                            csv_col_map[col_name] = _XLSX_KNOWN_HEADERS[norm]
-                        else:
-                            unmapped_headers.append(str(col_name))
-
-                # Positional fallback: if we recognized no headers but the
-                # file has a row, assume the canonical ACCOUNT_FIELDS order.
-                positional_fallback = False
-                if not csv_col_map and reader.fieldnames:
-                    log_warning(
-                        f"CSV headers unrecognized; falling back to positional "
-                        f"mapping. Unmapped: {reader.fieldnames}"
-                    )
-                    positional_fallback = True
-                    # The DictReader already consumed the first row as headers;
-                    # treat those header cells as the first data row.
-                    first_row_vals = list(reader.fieldnames or [])
-                else:
-                    first_row_vals = None
-
-                def _row_iter():
-                    if positional_fallback and first_row_vals:
-                        yield 1, first_row_vals  # synthetic row from headers
-                    for idx, r in enumerate(reader, start=2):
-                        yield idx, r
-
-                for row_num, row in _row_iter():
-                    try:
-                        account_data: Dict[str, str] = {f: '' for f in ACCOUNT_FIELDS}
-                        account_data['status'] = 'Ready'
-
-                        if positional_fallback and isinstance(row, list):
-                            for col_idx, val in enumerate(row):
-                                if col_idx >= len(_XLSX_DEFAULT_FIELDS):
-                                    break
-                                field = _XLSX_DEFAULT_FIELDS[col_idx]
-                                if val is not None and str(val).strip():
-                                    account_data[field] = str(val).strip()
-                        else:
-                            for csv_col, field in csv_col_map.items():
-                                val = row.get(csv_col, '') if isinstance(row, dict) else ''
-                                if val:
-                                    account_data[field] = str(val).strip()
-
-                        # Canonicalize status / station casing.
-                        if account_data.get('status'):
-                            account_data['status'] = _canon_status(account_data['status'])
-                        if account_data.get('station'):
-                            account_data['station'] = _canon_station(account_data['station'])
-
-                        now = datetime.now().isoformat()
-                        account_data.update(
-                            last_seen=now, created_date=now,
-                            id=f"imported_{accounts_imported + 1}_{datetime.now().timestamp()}",
-                        )
-
-                        if self._try_import_account(account_data):
-                            accounts_imported += 1
-                        else:
-                            accounts_skipped += 1
-
-                    except Exception as e:
-                        accounts_skipped += 1
-                        log_error(f"Error processing row {row_num}: {e}")
-                        continue
-
-            self._refresh_after_import()
-
-            detail = (f"Delimiter: {dialect_delim!r}\n"
-                      f"Accounts imported: {accounts_imported}\n"
-                      f"Accounts skipped: {accounts_skipped}\n\n"
-                      f"Total accounts: {len(self.accounts)}")
-            if unmapped_headers:
-                detail += f"\n\nUnmapped headers (ignored): {', '.join(unmapped_headers)}"
-            QMessageBox.information(self, "CSV Import Complete", detail)
-            log_info(
-                f"CSV import completed: {accounts_imported} imported, "
-                f"{accounts_skipped} skipped, delim={dialect_delim!r}, "
-                f"unmapped={unmapped_headers}"
-            )
-
-        except Exception as e:
-            log_error(f"Failed to process CSV file: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to process CSV file:\n{e}")
+        if self._transfer_kind is not None:
+            QMessageBox.information(self, "Transfer In Progress",
+                "An import or export is already running.")
+            return
+        self._transfer_generation += 1
+        generation = self._transfer_generation
+        cancel_event = threading.Event()
+        self._transfer_cancel = cancel_event
+        self._transfer_kind = kind
+        self._set_transfer_controls_enabled(False)
+
+        dialog = QProgressDialog(label, "Cancel", 0, 0, self)
+        dialog.setWindowTitle("Import" if kind == "import" else "Export")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(400)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(cancel_event.set)
+        self._transfer_dialog = dialog
+        self._transfer_label = label
+        self.status_label.setText(label)
+
+        def _progress(done: int, total: int) -> None:
+            self._transfer_progress.emit(generation, done, total)
+
+        def _run() -> None:
+            try:
+                result = job(_progress, cancel_event)
+            except _TransferCancelled:
+                self._transfer_failed.emit(generation, "")
+            except ImportError:
+                self._transfer_failed.emit(generation, _OPENPYXL_MISSING_MSG)
+            except Exception as exc:
+                self._transfer_failed.emit(generation, str(exc) or type(exc).__name__)
+            else:
+                self._transfer_done.emit(generation, result)
+
+        threading.Thread(
+            target=_run,
+            daemon=True,
+            name=f"DupeZAccount{kind.title()}",
+        ).start()
+
+    def _finish_transfer(self) -> Optional[str]:
+        """Tear down dialog/state for the current transfer; returns its kind."""
+        kind = self._transfer_kind
+        self._transfer_kind = None
+        self._transfer_cancel = None
+        if self._transfer_dialog is not None:
+            self._transfer_dialog.close()
+            self._transfer_dialog.deleteLater()
+            self._transfer_dialog = None
+        self._set_transfer_controls_enabled(True)
+        return kind
+
+    def _set_transfer_controls_enabled(self, enabled: bool) -> None:
+        for attr in ("upload_btn", "export_csv_btn"):
+            btn = getattr(self, attr, None)
+            if btn is not None:
+                btn.setEnabled(enabled)
+
+    def _apply_transfer_progress(self, generation: int, done: int, total: int) -> None:
+        if generation != self._transfer_generation or self._transfer_dialog is None:
+            return
+        dialog = self._transfer_dialog
+        if total > 0:
+            if dialog.maximum() != total:
+                dialog.setMaximum(total)
+            dialog.setValue(min(done, total))
+        dialog.setLabelText(f"{self._transfer_label}\n{done:,} rows")
+
+    def _apply_transfer_error(self, generation: int, message: str) -> None:
+        if generation != self._transfer_generation:
+            return
+        kind = self._finish_transfer() or "transfer"
+        if not message:
+            self.status_label.setText(f"{kind.title()} cancelled")
+            log_info(f"Account {kind} cancelled by operator")
+            return
+        log_error(f"Account {kind} failed: {message}")
+        if message == _OPENPYXL_MISSING_MSG:
+            QMessageBox.critical(self, "Missing Library", message)
+        else:
+            QMessageBox.critical(self, "Error", f"Account {kind} failed:\n{message}")
+        self.status_label.setText(f"{kind.title()} failed")
 
-    def _try_import_account(self, account_data: dict) -> bool:
-        """Validate, dedup, and add a single account. Returns True if imported.
+    def _apply_transfer_result(self, generation: int, result: object) -> None:
+        if generation != self._transfer_generation:
+            return
+        kind = self._finish_transfer()
+        if kind == "import" and isinstance(result, _ImportSummary):
+            self._apply_import_result(result)
+        elif kind == "export" and isinstance(result, dict):
+            fmt, count = result.get("fmt", ""), result.get("count", 0)
+            self.status_label.setText(f"Exported {count} accounts to {fmt}")
+            QMessageBox.information(self, "Export Complete",
+                f"Exported {count} account(s) to {fmt}.")
+            log_info(f"Exported {count} accounts to {fmt}")
+
+    def _apply_import_result(self, summary: _ImportSummary) -> None:
+        """Commit a finished import batch and report the summary."""
+        # Accounts added by hand while the worker ran were not in its
+        # name snapshot; drop any batch rows that now collide.
+        current = {_account_key(a.get('account', '')) for a in account_manager.accounts}
+        batch = [a for a in summary.accounts if _account_key(a['account']) not in current]
+        late_dupes = len(summary.accounts) - len(batch)
+        summary.imported -= late_dupes
+        summary.skipped += late_dupes
+        summary.duplicates += late_dupes
 
-        Only adds to ``account_manager`` (the source of truth).
-        ``self.accounts`` is refreshed from the manager after the
-        import batch completes via ``_refresh_after_import``.
-        """
-        if not self._validate_account_data(account_data):
-            return False
-        if self._is_duplicate_account(account_data):
-            log_warning(f"Skipped duplicate: {account_data.get('account', '')}")
-            return False
         try:
-            account_manager.accounts.append(account_data)
+            account_manager.add_accounts(batch)
         except Exception as e:
-            log_warning(f"Failed to add account to manager: {e}")
-            return False
-        log_info(f"Imported account: {account_data['account']}")
-        return True
+            log_error(f"Failed to save imports: {e}")
+        self._refresh_after_import(persist=False)
+
+        lines = []
+        if summary.delimiter:
+            lines.append(f"Delimiter: {summary.delimiter!r}")
+        lines += [f"Accounts imported: {summary.imported}",
+                  f"Accounts skipped: {summary.skipped}"]
+        if summary.duplicates:
+            lines.append(f"  duplicates: {summary.duplicates}")
+        lines.append(f"\nTotal accounts: {len(self.accounts)}")
+        if summary.bases:
+            lines.append(f"\nBases found: {summary.bases}")
+        if summary.unmapped:
+            lines.append(f"\nUnmapped headers (ignored): {', '.join(summary.unmapped)}")
+        if summary.errors:
+            shown = "\n".join(summary.errors)
+            more = summary.error_count - len(summary.errors)
+            if more > 0:
+                shown += f"\n... and {more} more"
+            lines.append(f"\nRejected rows:\n{shown}")
+
+        self.status_label.setText(
+            f"Imported {summary.imported} account(s), skipped {summary.skipped}")
+        QMessageBox.information(self, f"{summary.fmt} Import Complete",
+            "Import completed!\n\n" + "\n".join(lines))
+        log_info(
+            f"{summary.fmt} import done: {summary.imported} imported, "
+            f"{summary.skipped} skipped ({summary.duplicates} duplicates, "
+            f"{summary.error_count} invalid), {summary.bases} bases, "
+            f"delim={summary.delimiter!r}, unmapped={summary.unmapped}"
+        )
 
     # ── Validation helpers ──────────────────────────────────────────
 
     def _validate_account_data(self, data: Dict[str, str]) -> bool:
         """Return *True* if *data* contains a valid account name."""
         try:
-            account = data.get('account', '').strip()
-            if not account or len(account) < 2:
-                log_warning(f"Validation failed: account too short: '{account}'")
-                return False
-            if account.isspace() or not any(c.isalnum() for c in account):
-                log_warning(f"Validation failed: no alphanumeric chars: '{account}'")
-                return False
-            email = data.get('email', '').strip()
-            if email and '@' not in email:
-                log_warning(f"Validation failed: bad email: '{email}'")
+            reason = _validate_account_row(data)
+            if reason:
+                log_warning(f"Validation failed: {reason}")
                 return False
             return True
         except Exception as e:
@@ -1666,93 +1996,12 @@ class DayZAccountTracker(QWidget):
             )
 
             if file_path:
-                ext = os.path.splitext(file_path)[1].lower()
-
-                if ext == '.xlsx':
-                    self._export_xlsx(file_path)
-                else:
-                    with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                        writer = csv.writer(file)
-                        writer.writerow(TABLE_HEADERS)
-                        for account in self.accounts:
-                            writer.writerow([account.get(f, '') for f in ACCOUNT_FIELDS])
-
-                fmt = "XLSX" if ext == '.xlsx' else "CSV"
-                self.status_label.setText(f"Exported {len(self.accounts)} accounts to {fmt}")
-                QMessageBox.information(self, "Export Complete",
-                    f"Exported {len(self.accounts)} accounts to {fmt}.")
-                log_info(f"Exported {len(self.accounts)} accounts to {fmt}")
+                self._start_export(file_path, self.accounts)
 
         except Exception as e:
             log_error(f"Failed to export accounts: {e}")
             QMessageBox.critical(self, "Error", f"Failed to export accounts: {e}")
 
-    def _export_xlsx(self, file_path: str) -> None:
-        """Write accounts to a styled XLSX workbook with frozen header row."""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Accounts"
-
-            headers = list(TABLE_HEADERS)
-            fields = list(ACCOUNT_FIELDS)
-
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            header_fill = PatternFill('solid', fgColor="16213E")
-            header_align = Alignment(horizontal='center', vertical='center')
-            thin_border = Border(
-                left=Side(style='thin', color='1A2A3A'),
-                right=Side(style='thin', color='1A2A3A'),
-                top=Side(style='thin', color='1A2A3A'),
-                bottom=Side(style='thin', color='1A2A3A'),
-            )
-
-            for col_idx, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col_idx, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_align
-                cell.border = thin_border
-
-            status_fills = {k: PatternFill('solid', fgColor=f'{c.red():02X}{c.green():02X}{c.blue():02X}')
-                           for k, c in STATUS_COLORS.items()}
-            status_col_idx = fields.index('status') + 1 if 'status' in fields else None
-
-            for row_idx, account in enumerate(self.accounts, 2):
-                for col_idx, field in enumerate(fields, 1):
-                    cell = ws.cell(row=row_idx, column=col_idx, value=account.get(field, ''))
-                    cell.border = thin_border
-                    cell.alignment = Alignment(vertical='center', wrap_text=(field in ('holding', 'notes')))
-
-                if status_col_idx:
-                    status_val = account.get('status', '')
-                    status_cell = ws.cell(row=row_idx, column=status_col_idx)
-                    if status_val in status_fills:
-                        status_cell.fill = status_fills[status_val]
-                        status_cell.font = Font(bold=True, color="FFFFFF")
-
-            for col_idx in range(1, len(headers) + 1):
-                max_len = len(headers[col_idx - 1])
-                for row_idx in range(2, len(self.accounts) + 2):
-                    val = ws.cell(row=row_idx, column=col_idx).value
-                    if val:
-                        max_len = max(max_len, len(str(val)))
-                ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = min(max_len + 4, 50)
-
-            ws.freeze_panes = 'A2'
-            wb.save(file_path)
-            log_info(f"XLSX export saved to {file_path}")
-
-        except ImportError:
-            QMessageBox.critical(self, "Missing Library",
-                "openpyxl is required for XLSX export.\n\nInstall it with:\npip install openpyxl")
-        except Exception as e:
-            log_error(f"XLSX export failed: {e}")
-            raise
-
     # ── Bulk operations ─────────────────────────────────────────────
 
     def _show_bulk_operations(self) -> None:
@@ -1927,7 +2176,7 @@ class DayZAccountTracker(QWidget):
             QMessageBox.critical(self, "Error", f"Failed to show bulk operations: {e}")
 
     def _export_subset(self, subset: List[Dict[str, Any]]) -> None:
-        """Export a subset of accounts to XLSX via save dialog."""
+        """Export a subset of accounts to XLSX/CSV via save dialog."""
         try:
             from PyQt6.QtWidgets import QFileDialog
             file_path, _ = QFileDialog.getSaveFileName(
@@ -1937,24 +2186,7 @@ class DayZAccountTracker(QWidget):
             )
             if not file_path:
                 return
-
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext == '.xlsx':
-                # Temporarily swap accounts for export
-                orig = self.accounts
-                self.accounts = subset
-                self._export_xlsx(file_path)
-                self.accounts = orig
-            else:
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(TABLE_HEADERS)
-                    for acc in subset:
-                        writer.writerow([acc.get(field, '') for field in ACCOUNT_FIELDS])
-
-            fmt = "XLSX" if ext == '.xlsx' else "CSV"
-            QMessageBox.information(self, "Export Complete",
-                f"Exported {len(subset)} account(s) to {fmt}.")
+            self._start_export(file_path, subset)
         except Exception as e:
             log_error(f"Failed to export subset: {e}")
             QMessageBox.critical(self, "Error", f"Export failed: {e}")
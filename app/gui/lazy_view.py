@@ -0,0 +1,287 @@
+# app/gui/lazy_view.py — Deferred dashboard view construction
+"""Stack pages that build their real view on first use.
+
+The dashboard used to construct every sidebar view before the main window
+could paint: the account tracker, all four Network Tools tabs (each with its
+own refresh timer), the help panel and every plugin panel. :class:`LazyView`
+generalizes the :class:`~app.gui.lazy_dayz_map.LazyDayZMapGUI` placeholder —
+it holds a factory and builds the real widget the first time the page is
+shown. :class:`ViewPrewarmer` builds the remaining pages one at a time when
+the Qt event loop is idle, so the first click on a tab is usually already
+warm without putting construction on the time-to-first-paint path.
+
+A view the placeholder built itself has its timers paused while its page is
+hidden and resumed when it is shown again. Views that need finer control
+implement ``pause_background()`` / ``resume_background()`` and are called
+instead. Adopted widgets (``widget=``) and pages created with
+``pause_hidden=False`` — e.g. plugin panels, whose timers belong to the
+plugin — are left running. A factory may return ``None`` for "nothing to
+show"; the page then emits :attr:`LazyView.empty` instead of an error.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional, Sequence
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QLabel, QPushButton, QVBoxLayout, QWidget
+
+from app.logs.logger import log_error, log_info
+
+__all__ = ["LazyView", "ViewPrewarmer"]
+
+ViewFactory = Callable[[], QWidget]
+
+
+class LazyView(QWidget):
+    """Placeholder page that constructs its view on first show."""
+
+    loaded = pyqtSignal(object)
+    empty = pyqtSignal()
+
+    def __init__(
+        self,
+        factory: Optional[ViewFactory] = None,
+        *,
+        name: str = "view",
+        widget: Optional[QWidget] = None,
+        placeholder_text: Optional[str] = None,
+        pause_hidden: bool = True,
+        parent: Optional[QWidget] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._factory = factory
+        self._name = name
+        self._widget: Optional[QWidget] = None
+        self._loading = False
+        self._attempted = False
+        self._empty = False
+        self._pause_hidden = pause_hidden
+        self._owns_widget = False
+        self._paused_timers: List[QTimer] = []
+        self.load_ms: Optional[float] = None
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(24, 24, 24, 24)
+        self._layout.setSpacing(12)
+
+        self._status = QLabel(placeholder_text or f"Loading {name}…")
+        self._status.setWordWrap(True)
+        self._status.setStyleSheet(
+            "color: #94a3b8; font-size: 14px; background: #0a0e1a; "
+            "padding: 28px; border-radius: 8px;"
+        )
+        self._layout.addStretch(1)
+        self._layout.addWidget(self._status)
+
+        self._retry = QPushButton(f"Retry loading {name}")
+        self._retry.setVisible(False)
+        self._retry.clicked.connect(self.retry)
+        self._layout.addWidget(self._retry)
+        self._layout.addStretch(1)
+
+        if widget is not None:
+            self._mount(widget, owned=False)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._widget is not None
+
+    @property
+    def is_empty(self) -> bool:
+        """The factory ran and had no view to offer."""
+        return self._empty
+
+    @property
+    def widget(self) -> Optional[QWidget]:
+        """The real view, or ``None`` until it has been constructed."""
+        return self._widget
+
+    # ── Qt events ───────────────────────────────────────────────────
+
+    def showEvent(self, event) -> None:  # noqa: N802 — Qt override
+        super().showEvent(event)
+        if self.is_loaded:
+            self.resume_timers()
+        elif not self._loading and not self._attempted:
+            # Let QStackedWidget complete the switch and paint the
+            # placeholder before constructing the view on the GUI thread.
+            QTimer.singleShot(0, self.load_now)
+
+    def hideEvent(self, event) -> None:  # noqa: N802 — Qt override
+        super().hideEvent(event)
+        self.pause_timers()
+
+    # ── Construction ────────────────────────────────────────────────
+
+    def _resolve_factory(self) -> ViewFactory:
+        if self._factory is None:
+            raise RuntimeError(f"no factory registered for {self._name}")
+        return self._factory
+
+    def load_now(self) -> bool:
+        """Construct and mount the real view once. Return whether it loaded."""
+        if self.is_loaded:
+            return True
+        if self._loading:
+            return False
+
+        self._loading = True
+        self._attempted = True
+        self._retry.setVisible(False)
+        started = time.perf_counter()
+        try:
+            widget = self._resolve_factory()()
+            if widget is None:
+                self._empty = True
+                self._status.setText(f"{self._name} has nothing to show.")
+                log_info(f"View: {self._name} factory returned no widget")
+                self.empty.emit()
+                return False
+            if not isinstance(widget, QWidget):
+                raise TypeError(f"{self._name} factory did not return a QWidget")
+            self._mount(widget, owned=True)
+            self.load_ms = (time.perf_counter() - started) * 1000.0
+            log_info(f"View: {self._name} constructed in {self.load_ms:.0f} ms")
+            return True
+        except Exception as exc:
+            self._status.setText(
+                f"{self._name} could not initialize.\n\n"
+                f"{type(exc).__name__}: {exc}\n\n"
+                "You can retry without restarting DupeZ."
+            )
+            self._retry.setVisible(True)
+            log_error(f"Lazy view initialization failed ({self._name}): {exc}")
+            return False
+        finally:
+            self._loading = False
+
+    def _mount(self, widget: QWidget, *, owned: bool) -> None:
+        self._layout.removeWidget(self._status)
+        self._status.deleteLater()
+        self._layout.removeWidget(self._retry)
+        self._retry.deleteLater()
+        while self._layout.count():
+            item = self._layout.takeAt(0)
+            if item.widget() is not None:
+                item.widget().setParent(None)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(0)
+        self._layout.addWidget(widget)
+        self._widget = widget
+        self._owns_widget = owned and self._pause_hidden
+        widget.show()
+        if not self.isVisible():
+            # Built while hidden (prewarm or eager adoption): keep its
+            # timers parked until the page is actually shown.
+            self.pause_timers()
+        self.loaded.emit(widget)
+
+    def retry(self) -> None:
+        """Allow an explicit retry after a recoverable initialization error."""
+        if self.is_loaded or self._loading or self._empty:
+            return
+        self._attempted = False
+        self.load_now()
+
+    # ── Background pause/resume ─────────────────────────────────────
+
+    def pause_timers(self) -> None:
+        """Stop the mounted view's active timers while the page is hidden."""
+        widget = self._widget
+        if widget is None or not self._owns_widget:
+            return
+        hook = getattr(widget, "pause_background", None)
+        if callable(hook):
+            hook()
+            return
+        for timer in widget.findChildren(QTimer):
+            if timer.isActive():
+                timer.stop()
+                self._paused_timers.append(timer)
+
+    def resume_timers(self) -> None:
+        """Restart the timers :meth:`pause_timers` stopped."""
+        widget = self._widget
+        if widget is None or not self._owns_widget:
+            return
+        hook = getattr(widget, "resume_background", None)
+        if callable(hook):
+            hook()
+            return
+        paused, self._paused_timers = self._paused_timers, []
+        for timer in paused:
+            try:
+                timer.start()
+            except RuntimeError:
+                # The view deleted the timer while it was parked.
+                continue
+
+
+class ViewPrewarmer(QObject):
+    """Build pending :class:`LazyView` pages in priority order when idle.
+
+    One page is constructed per idle slot: a zero-interval single-shot timer
+    only fires once Qt has drained its pending events, and a short gap between
+    pages lets input and paint events interleave with construction.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(
+        self,
+        views: Sequence[LazyView],
+        *,
+        start_delay_ms: int = 1500,
+        gap_ms: int = 200,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._queue: List[LazyView] = list(views)
+        self._start_delay_ms = max(0, int(start_delay_ms))
+        self._gap_ms = max(0, int(gap_ms))
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._arm_idle)
+        self._idle = QTimer(self)
+        self._idle.setSingleShot(True)
+        self._idle.setInterval(0)
+        self._idle.timeout.connect(self._build_next)
+        self._stopped = False
+
+    @property
+    def pending(self) -> List[LazyView]:
+        return [view for view in self._queue if not view.is_loaded]
+
+    def start(self) -> None:
+        """Begin prewarming after the start delay (first paint goes first)."""
+        if self._stopped:
+            return
+        self._timer.start(self._start_delay_ms)
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._timer.stop()
+        self._idle.stop()
+
+    def _arm_idle(self) -> None:
+        if not self._stopped:
+            self._idle.start()
+
+    def _build_next(self) -> None:
+        if self._stopped:
+            return
+        while self._queue and self._queue[0].is_loaded:
+            self._queue.pop(0)
+        if not self._queue:
+            self._stopped = True
+            self.finished.emit()
+            return
+        view = self._queue.pop(0)
+        view.load_now()
+        self._timer.start(self._gap_ms)
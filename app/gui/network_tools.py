@@ -4,7 +4,7 @@
 
 Provides four tabbed panels:
 
-* **TrafficMonitorWidget** — real-time per-interface bandwidth via ``psutil``.
+* **TrafficMonitorWidget** — per-interface bandwidth and history via ``psutil``.
 * **LatencyOverlayWidget** — continuous ping/jitter with optional floating overlay.
 * **PortScannerWidget** — quick TCP connect-scan with preset port lists.
 * **ConnectionMapperWidget** — live connection table + text topology view.
@@ -15,15 +15,23 @@ and communicates results back via ``pyqtSignal`` for thread-safe GUI updates.
 
 from __future__ import annotations
 
-import re
 import socket
 import subprocess
-import sys
 import threading
 import time
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import Q_ARG, QMetaObject, Qt, QTimer, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import (
+    Q_ARG,
+    QAbstractTableModel,
+    QMetaObject,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    QTimer,
+    pyqtSignal,
+    pyqtSlot,
+)
 from PyQt6.QtGui import QColor, QCursor
 from PyQt6.QtWidgets import (
     QCheckBox,
@@ -35,6 +43,7 @@ from PyQt6.QtWidgets import (
     QMessageBox,
     QProgressBar,
     QPushButton,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QTabWidget,
@@ -43,6 +52,14 @@ from PyQt6.QtWidgets import (
 )
 
 from app.logs.logger import log_error
+from app.network.connection_tracker import (
+    Connection,
+    ConnectionDiff,
+    ConnectionKey,
+    ConnectionTracker,
+)
+from app.network.latency_probe import LatencyStats, LatencyWatch, get_latency_service
+from app.network.traffic_history import TrafficSampler, downsample, get_traffic_sampler
 from app.utils.helpers import _NO_WINDOW
 
 __all__ = [
@@ -164,37 +181,18 @@ COMMON_SCAN_PORTS: List[int] = [
 
 WEB_SCAN_PORTS: List[int] = [80, 443, 8080, 8443, 3000, 5000, 8000, 8888, 9090]
 
-_PING_FLAG: str = "-n" if sys.platform == "win32" else "-c"
-
 # Sparkline block characters, ordered low → high.
 _SPARK_CHARS: str = "▁▂▃▄▅▆▇█"
 
 
 # ── Helpers ─────────────────────────────────────────────────────────
 
-def _run_ping(target: str, timeout: int = 1000) -> float:
-    """Execute a single ICMP ping and return RTT in milliseconds.
-
-    Returns ``-1.0`` on timeout or any failure.
-    """
-    try:
-        import ipaddress
-        try:
-            clean = str(ipaddress.IPv4Address(str(target).strip()))
-        except (ipaddress.AddressValueError, ValueError):
-            return -1.0
-        from app.core import safe_subprocess as _safe_sp
-        ping_path = _safe_sp.PING or _safe_sp.resolve_system_binary("PING")
-        res = _safe_sp.run(
-            [ping_path, _PING_FLAG, "1", "-w", str(timeout), clean],
-            timeout=5.0,
-            expect_returncode=None,
-            intent="network_tools.ping_rtt",
-        )
-        match = re.search(r"time[=<](\d+\.?\d*)", res.stdout)
-        return float(match.group(1)) if match else -1.0
-    except Exception:
-        return -1.0
+def _sparkline(values: List[float]) -> str:
+    """Render *values* as block characters scaled to their own peak."""
+    if not values:
+        return ""
+    peak = max(values) or 1.0
+    return "".join(_SPARK_CHARS[min(int((v / peak) * 7), 7)] for v in values)
 
 
 def _color_for_latency(ms: float) -> str:
@@ -209,17 +207,39 @@ def _color_for_latency(ms: float) -> str:
 # ── TrafficMonitorWidget ────────────────────────────────────────────
 
 class TrafficMonitorWidget(QWidget):
-    """Real-time per-interface bandwidth display powered by ``psutil``.
-
-    Refreshes every 2 seconds, showing bytes sent/received and an
-    aggregate rate bar.  The ``QTimer`` is parented to ``self`` so it is
-    automatically destroyed with the widget.
+    """Per-interface bandwidth display with recent history.
+
+    Rates and history come from the shared
+    :class:`~app.network.traffic_history.TrafficSampler`, which samples
+    once a second on its own thread and keeps collecting while this tab is
+    hidden. The 2 s ``QTimer`` (parented to ``self``) only repaints: rows
+    are added or removed when the interface set changes, and a cell is
+    rewritten only when its text changes.
     """
 
-    def __init__(self, controller: Any = None, parent: Optional[QWidget] = None) -> None:
+    _REFRESH_MS: int = 2000
+    _ADDR_TTL_S: float = 30.0
+    _TREND_POINTS: int = 24
+    _TOTAL_POINTS: int = 60
+    _SPANS: Tuple[Tuple[str, str], ...] = (
+        ("Last 10 min", "1s"),
+        ("Last 2 h", "10s"),
+        ("Last 24 h", "1m"),
+    )
+
+    def __init__(
+        self,
+        controller: Any = None,
+        parent: Optional[QWidget] = None,
+        *,
+        sampler: Optional[TrafficSampler] = None,
+    ) -> None:
         super().__init__(parent)
         self.controller = controller
-        self._prev_counters: Dict[str, Any] = {}
+        self._sampler = sampler or get_traffic_sampler()
+        self._rows: List[str] = []
+        self._addrs: Dict[str, str] = {}
+        self._addrs_at: float = float("-inf")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -230,12 +250,12 @@ class TrafficMonitorWidget(QWidget):
 
         # Interface table
         self.table = QTableWidget()
-        self.table.setColumnCount(5)
+        self.table.setColumnCount(6)
         self.table.setHorizontalHeaderLabels(
-            ["Interface", "IP", "Bytes Sent", "Bytes Recv", "Rate (KB/s)"],
+            ["Interface", "IP", "Bytes Sent", "Bytes Recv", "Rate (KB/s)", "Trend"],
         )
         hdr = self.table.horizontalHeader()
-        for col in range(5):
+        for col in range(6):
             hdr.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
@@ -258,77 +278,119 @@ class TrafficMonitorWidget(QWidget):
         bar_row.addWidget(self.bw_bar, 1)
         layout.addLayout(bar_row)
 
-        # Auto-refresh (parent=self → automatic cleanup on widget destroy)
+        # History sparkline for the combined rate
+        history_row = QHBoxLayout()
+        self.span_combo = QComboBox()
+        self.span_combo.setStyleSheet(_NT_COMBO_QSS)
+        for label, resolution in self._SPANS:
+            self.span_combo.addItem(label, resolution)
+        self.span_combo.currentIndexChanged.connect(lambda _i: self._refresh())
+        history_row.addWidget(self.span_combo)
+        self.history_label = QLabel("")
+        self.history_label.setStyleSheet(
+            "color: #64748b; font-family: monospace; font-size: 11px;"
+        )
+        history_row.addWidget(self.history_label, 1)
+        layout.addLayout(history_row)
+
+        # Repaint only (parent=self → automatic cleanup on widget destroy)
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._refresh)
-        self._timer.start(2000)
+        self._timer.start(self._REFRESH_MS)
         self._refresh()
 
     # ── Public API ──────────────────────────────────────────────────
 
     def cleanup(self) -> None:
-        """Stop the refresh timer explicitly (called by parent container)."""
+        """Stop the refresh timer explicitly (called by parent container).
+
+        The shared sampler keeps running; other views may read it.
+        """
         self._timer.stop()
 
     # ── Internal ────────────────────────────────────────────────────
 
     def _refresh(self) -> None:
-        """Pull fresh counters from psutil and update the table."""
-        try:
-            import psutil
-        except ImportError:
-            return
-
+        """Repaint the table and sparklines from the sampler's latest state."""
         try:
-            counters = psutil.net_io_counters(pernic=True)
-            addrs = psutil.net_if_addrs()
-
-            self.table.setRowCount(0)
+            latest = self._sampler.latest()
+            names = [
+                name for name in sorted(latest)
+                if not (name.lower().startswith("lo") or "loopback" in name.lower())
+            ]
+            addrs = self._interface_addresses(names)
+            names = [name for name in names if addrs.get(name)]
+
+            if names != self._rows:
+                self.table.setRowCount(len(names))
+                self._rows = names
+
+            resolution = self.span_combo.currentData() or "1s"
             total_rate = 0.0
-
-            for iface, io in counters.items():
-                # Skip loopback
-                if iface.lower().startswith("lo") or "loopback" in iface.lower():
-                    continue
-
-                ip = self._first_ipv4(addrs.get(iface, []))
-                if not ip:
-                    continue
-
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-
-                # Calculate rate from previous sample
-                rate = 0.0
-                prev = self._prev_counters.get(iface)
-                if prev is not None:
-                    dt = 2.0  # refresh interval in seconds
-                    rate = ((io.bytes_sent - prev.bytes_sent)
-                            + (io.bytes_recv - prev.bytes_recv)) / dt / 1024.0
-                self._prev_counters[iface] = io
+            for row, name in enumerate(names):
+                io = latest[name]
+                rate = io.total_rate / 1024.0
                 total_rate += rate
-
-                self.table.setItem(row, 0, QTableWidgetItem(iface))
-                self.table.setItem(row, 1, QTableWidgetItem(ip))
-                self.table.setItem(row, 2, QTableWidgetItem(f"{io.bytes_sent / 1048576:.1f} MB"))
-                self.table.setItem(row, 3, QTableWidgetItem(f"{io.bytes_recv / 1048576:.1f} MB"))
-
-                rate_item = QTableWidgetItem(f"{rate:.1f}")
+                self._set_cell(row, 0, name)
+                self._set_cell(row, 1, addrs[name])
+                self._set_cell(row, 2, f"{io.bytes_sent / 1048576:.1f} MB")
+                self._set_cell(row, 3, f"{io.bytes_recv / 1048576:.1f} MB")
                 if rate > 500:
-                    rate_item.setForeground(QColor("#ff4444"))
+                    color = "#ff4444"
                 elif rate > 100:
-                    rate_item.setForeground(QColor("#fbbf24"))
+                    color = "#fbbf24"
                 else:
-                    rate_item.setForeground(QColor("#00ff88"))
-                self.table.setItem(row, 4, rate_item)
+                    color = "#00ff88"
+                self._set_cell(row, 4, f"{rate:.1f}", color)
+                trend = self._sampler.total_history([name], resolution)
+                self._set_cell(row, 5, _sparkline(downsample(trend, self._TREND_POINTS)))
 
             mb_per_sec = total_rate / 1024.0
             self.bw_bar.setValue(min(100, int(mb_per_sec)))
             self.bw_bar.setFormat(f"{mb_per_sec:.2f} MB/s")
 
+            history = self._sampler.total_history(names, resolution)
+            if history:
+                peak = max(history) / 1048576.0
+                self.history_label.setText(
+                    f"{_sparkline(downsample(history, self._TOTAL_POINTS))}"
+                    f"  peak {peak:.2f} MB/s"
+                )
+            else:
+                self.history_label.setText("collecting…")
+
         except Exception as exc:
             log_error(f"Traffic monitor error: {exc}")
 
+    def _set_cell(self, row: int, col: int, text: str, color: Optional[str] = None) -> None:
+        """Write a table cell only if its text or colour actually changed."""
+        item = self.table.item(row, col)
+        if item is None:
+            item = QTableWidgetItem(text)
+            self.table.setItem(row, col, item)
+        elif item.text() != text:
+            item.setText(text)
+        if color is not None and item.foreground().color().name() != color:
+            item.setForeground(QColor(color))
+
+    def _interface_addresses(self, names: List[str]) -> Dict[str, str]:
+        """IPv4 per interface; ``net_if_addrs`` is re-read only every 30 s
+        or when an interface appears that has not been seen yet."""
+        now = time.monotonic()
+        stale = now - self._addrs_at > self._ADDR_TTL_S
+        if stale or any(name not in self._addrs for name in names):
+            try:
+                import psutil
+
+                self._addrs = {
+                    iface: self._first_ipv4(entries)
+                    for iface, entries in psutil.net_if_addrs().items()
+                }
+            except Exception as exc:
+                log_error(f"Traffic monitor address lookup failed: {exc}")
+            self._addrs_at = now
+        return self._addrs
+
     @staticmethod
     def _first_ipv4(addrs: list) -> str:
         """Return the first IPv4 address from an ``psutil`` address list."""
@@ -346,19 +408,18 @@ class LatencyOverlayWidget(QWidget):
     When the **FLOAT** button is pressed, a small transparent always-on-top
     ``_FloatingLatency`` window is spawned — useful as an in-game overlay.
 
-    Thread-safety: ``_history`` is only mutated inside the background
-    thread; the GUI thread receives computed values via ``_ping_result``
-    signal, so no lock is required.
+    Sampling is done by the shared
+    :class:`~app.network.latency_probe.LatencyProbeService`; its thread
+    hands each new :class:`LatencyStats` to the GUI thread through the
+    ``_ping_result`` signal, so no lock is required.
     """
 
-    _ping_result = pyqtSignal(float, float, float)  # avg_ms, jitter_ms, loss_%
+    _ping_result = pyqtSignal(object)  # LatencyStats
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self._target_ip: str = ""
-        self._running: bool = False
-        self._thread: Optional[threading.Thread] = None
-        self._history: List[float] = []
+        self._watch: Optional[LatencyWatch] = None
         self._float_win: Optional[_FloatingLatency] = None
 
         layout = QVBoxLayout(self)
@@ -422,96 +483,61 @@ class LatencyOverlayWidget(QWidget):
     # ── Public API ──────────────────────────────────────────────────
 
     def cleanup(self) -> None:
-        """Stop the ping thread (called by parent container on teardown)."""
-        self._running = False
+        """Stop sampling (called by parent container on teardown)."""
+        self._stop_watch()
 
     # ── Internal ────────────────────────────────────────────────────
 
     def _toggle_ping(self) -> None:
-        """Start or stop the continuous ping loop."""
-        if self._running:
-            self._running = False
-            self.btn_start.setText("START")
-            self.btn_start.setStyleSheet(_NT_GREEN_BTN)
+        """Start or stop sampling the target."""
+        if self._watch is not None:
+            self._stop_watch()
             return
 
         target = self.target_input.text().strip()
         if not target:
             return
+        try:
+            self._watch = get_latency_service().watch(target, self._ping_result.emit)
+        except ValueError:
+            self.ping_label.setText("Ping: invalid IPv4 target")
+            return
         self._target_ip = target
-        self._running = True
-        self._history.clear()
         self.btn_start.setText("STOP")
         self.btn_start.setStyleSheet(_NT_RED_BTN)
-        self._thread = threading.Thread(target=self._ping_loop, daemon=True)
-        self._thread.start()
-
-    def _ping_loop(self) -> None:
-        """Background: continuously ping target and emit averaged results."""
-        history: List[float] = []
-        # Track all attempts (True=success, False=timeout) for loss %.
-        attempts: List[bool] = []
-        _MAX_ATTEMPTS = 60
-
-        while self._running:
-            rtt = _run_ping(self._target_ip)
-            success = rtt >= 0
-            attempts.append(success)
-            if len(attempts) > _MAX_ATTEMPTS:
-                attempts = attempts[-_MAX_ATTEMPTS:]
-
-            # Compute loss over the sliding window of attempts.
-            loss_pct = (
-                (attempts.count(False) / len(attempts)) * 100.0
-                if attempts else 0.0
-            )
 
-            if success:
-                history.append(rtt)
-                if len(history) > 60:
-                    history = history[-60:]
-
-                avg = sum(history) / len(history)
-                jitter = 0.0
-                if len(history) > 1:
-                    diffs = [abs(history[i] - history[i - 1])
-                             for i in range(1, len(history))]
-                    jitter = sum(diffs) / len(diffs)
-
-                # Store snapshot for sparkline (read from GUI thread)
-                self._history = list(history)
-                self._ping_result.emit(avg, jitter, loss_pct)
-            else:
-                self._ping_result.emit(-1.0, 0.0, loss_pct)
-
-            time.sleep(1)
+    def _stop_watch(self) -> None:
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+        self.btn_start.setText("START")
+        self.btn_start.setStyleSheet(_NT_GREEN_BTN)
 
-    @pyqtSlot(float, float, float)
-    def _update_display(self, avg_ms: float, jitter_ms: float, loss_pct: float) -> None:
-        """Slot: update stat labels and sparkline from latest ping batch."""
-        if avg_ms < 0:
+    @pyqtSlot(object)
+    def _update_display(self, stats: LatencyStats) -> None:
+        """Slot: update stat labels and sparkline from the latest sample."""
+        if self._watch is None:
+            return
+        self.loss_label.setText(f"Loss: {stats.loss_pct:.0f}%")
+        if not stats.reachable or stats.mean_ms is None:
             self.ping_label.setText("Ping: TIMEOUT")
             self.ping_label.setStyleSheet(
                 "color: #ff4444; font-size: 22px; font-weight: bold;"
             )
             return
 
+        avg_ms = stats.mean_ms
         color = _color_for_latency(avg_ms)
         self.ping_label.setText(f"Ping: {avg_ms:.0f} ms")
         self.ping_label.setStyleSheet(
             f"color: {color}; font-size: 22px; font-weight: bold;"
         )
-        self.jitter_label.setText(f"Jitter: {jitter_ms:.1f} ms")
-        self.loss_label.setText(f"Loss: {loss_pct:.0f}%")
+        self.jitter_label.setText(f"Jitter: {stats.jitter_ms:.1f} ms")
 
-        # Mini text sparkline (last 30 samples)
-        recent = self._history[-30:]
+        # Mini text sparkline (last 30 replies)
+        recent = [v for v in stats.history if v is not None][-30:]
         if recent:
-            peak = max(recent) or 1.0
-            bars = "".join(
-                _SPARK_CHARS[min(int((v / peak) * 7), 7)] for v in recent
-            )
-            self.graph_label.setText(f"Last 30: {bars}")
+            self.graph_label.setText(f"Last 30: {_sparkline(recent)}")
 
     def _open_floating(self) -> None:
         """Spawn a small always-on-top latency overlay window."""
@@ -528,7 +554,7 @@ class _FloatingLatency(QWidget):
     Draggable via left-click; right-click closes.
     """
 
-    _ping_result = pyqtSignal(float)
+    _ping_result = pyqtSignal(object)  # LatencyStats
 
     _LABEL_QSS_TEMPLATE: str = (
         "color: {color}; font-size: 16px; font-weight: bold;"
@@ -540,7 +566,7 @@ class _FloatingLatency(QWidget):
     def __init__(self, target_ip: str) -> None:
         super().__init__()
         self._target: str = target_ip
-        self._running: bool = True
+        self._watch: Optional[LatencyWatch] = None
         self._drag_origin: Optional[Any] = None  # QPoint or None
 
         self.setWindowTitle("DupeZ Latency")
@@ -567,21 +593,23 @@ class _FloatingLatency(QWidget):
 
         self._ping_result.connect(self._update)
 
-        self._thread = threading.Thread(target=self._ping_loop, daemon=True)
-        self._thread.start()
+        try:
+            self._watch = get_latency_service().watch(target_ip, self._ping_result.emit)
+        except ValueError:
+            self.label.setText("Ping: invalid IPv4 target")
+            self.label.setStyleSheet(
+                self._LABEL_QSS_TEMPLATE.format(color="#ff4444")
+            )
 
     # ── Internal ────────────────────────────────────────────────────
 
-    def _ping_loop(self) -> None:
-        """Background: emit one ping result per second."""
-        while self._running:
-            self._ping_result.emit(_run_ping(self._target))
-            time.sleep(1)
-
-    @pyqtSlot(float)
-    def _update(self, ms: float) -> None:
-        """Slot: refresh label text and colour from latest ping."""
-        if ms < 0:
+    @pyqtSlot(object)
+    def _update(self, stats: LatencyStats) -> None:
+        """Slot: refresh label text and colour from the latest sample."""
+        if self._watch is None:
+            return
+        ms = stats.last_ms
+        if ms is None:
             self.label.setText(f"Ping {self._target}: TIMEOUT")
             self.label.setStyleSheet(
                 self._LABEL_QSS_TEMPLATE.format(color="#ff4444")
@@ -596,7 +624,9 @@ class _FloatingLatency(QWidget):
     # ── Qt event overrides ──────────────────────────────────────────
 
     def closeEvent(self, event: Any) -> None:  # noqa: N802
-        self._running = False
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
         event.accept()
 
     def mousePressEvent(self, event: Any) -> None:  # noqa: N802
@@ -779,24 +809,159 @@ class PortScannerWidget(QWidget):
 
 # ── ConnectionMapperWidget ──────────────────────────────────────────
 
+_CONNECTION_HEADERS: Tuple[str, ...] = (
+    "Proto", "Local Port", "Remote IP", "Remote Port",
+    "State", "PID", "Process", "Hostname",
+)
+_STATE_COLUMN: int = 4
+
+_CONNECTION_FILTERS: Dict[str, Callable[[Connection], bool]] = {
+    "TCP Only": lambda c: c.proto == "TCP",
+    "UDP Only": lambda c: c.proto == "UDP",
+    "Established Only": lambda c: c.state == "ESTABLISHED",
+    "Gaming Ports": lambda c: c.rport in GAMING_PORTS or c.lport in GAMING_PORTS,
+}
+
+
+def _row_ranges(rows: List[int]) -> List[Tuple[int, int]]:
+    """Collapse row numbers into ``(first, last)`` runs, highest run first."""
+    ranges: List[Tuple[int, int]] = []
+    for row in sorted(rows, reverse=True):
+        if ranges and ranges[-1][0] == row + 1:
+            ranges[-1] = (row, ranges[-1][1])
+        else:
+            ranges.append((row, row))
+    return ranges
+
+
+class ConnectionTableModel(QAbstractTableModel):
+    """Connection rows updated in place from :class:`ConnectionDiff` s.
+
+    Removed rows are taken out in contiguous runs, changed rows emit
+    ``dataChanged`` for that row only, and new connections are appended,
+    so the view keeps its scroll position and selection across samples.
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._rows: List[Connection] = []
+        self._index: Dict[ConnectionKey, int] = {}
+
+    # ── Qt model interface ──────────────────────────────────────────
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(_CONNECTION_HEADERS)
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return _CONNECTION_HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        conn = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return (
+                conn.proto,
+                str(conn.lport),
+                conn.rip,
+                str(conn.rport),
+                conn.state,
+                str(conn.pid) if conn.pid else "—",
+                conn.process,
+                conn.hostname,
+            )[col]
+        if role == Qt.ItemDataRole.ForegroundRole and col == _STATE_COLUMN:
+            return QColor(_STATE_COLORS.get(conn.state, "#6b7280"))
+        return None
+
+    # ── Diffs ───────────────────────────────────────────────────────
+
+    def connection(self, row: int) -> Connection:
+        return self._rows[row]
+
+    def connections(self) -> List[Connection]:
+        return list(self._rows)
+
+    def apply(self, diff: ConnectionDiff) -> None:
+        """Apply one sample's changes with row-level notifications."""
+        removed = [self._index[k] for k in diff.removed if k in self._index]
+        for first, last in _row_ranges(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+        if removed:
+            self._index = {conn.key: row for row, conn in enumerate(self._rows)}
+
+        last_col = len(_CONNECTION_HEADERS) - 1
+        new: List[Connection] = []
+        for conn in (*diff.changed, *diff.added):
+            row = self._index.get(conn.key)
+            if row is None:
+                new.append(conn)
+                continue
+            self._rows[row] = conn
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_col))
+        if new:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+            for conn in new:
+                self._index[conn.key] = len(self._rows)
+                self._rows.append(conn)
+            self.endInsertRows()
+
+
+class _ConnectionFilterProxy(QSortFilterProxyModel):
+    """Shows the rows of a :class:`ConnectionTableModel` matching a predicate."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._predicate: Optional[Callable[[Connection], bool]] = None
+
+    def set_predicate(self, predicate: Optional[Callable[[Connection], bool]]) -> None:
+        self._predicate = predicate
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self._predicate is None:
+            return True
+        return self._predicate(self.sourceModel().connection(source_row))
+
+
 class ConnectionMapperWidget(QWidget):
     """Live connection table + text-art topology view.
 
-    Uses ``psutil.net_connections()`` to enumerate TCP/UDP sockets,
-    groups by remote IP, optionally resolves hostnames, and renders
-    both a compact topology diagram and a full detail table.
+    A :class:`~app.network.connection_tracker.ConnectionTracker` samples
+    ``psutil.net_connections()`` on its own thread — every second while
+    sockets come and go, backing off to ten seconds while nothing
+    changes — and only non-empty diffs are sent to the GUI thread. The
+    table is a :class:`ConnectionTableModel` behind a filter proxy, so a
+    sample touches just the rows that changed; the topology and summary
+    are rebuilt only when a diff arrives or the filter changes.
     """
 
-    _refresh_done = pyqtSignal(list)  # list of connection dicts
-
-    _MAX_RESOLVE_CACHE: int = 512
+    _changes_ready = pyqtSignal(object)  # ConnectionDiff
 
-    def __init__(self, controller: Any = None, parent: Optional[QWidget] = None) -> None:
+    def __init__(
+        self,
+        controller: Any = None,
+        parent: Optional[QWidget] = None,
+        *,
+        tracker: Optional[ConnectionTracker] = None,
+    ) -> None:
         super().__init__(parent)
         self.controller = controller
         self._running: bool = False
-        self._thread: Optional[threading.Thread] = None
-        self._resolve_cache: Dict[str, str] = {}
+        self._tracker = tracker or ConnectionTracker()
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -814,15 +979,15 @@ class ConnectionMapperWidget(QWidget):
         ctrl_row.addWidget(self.btn_start)
 
         self.filter_combo = QComboBox()
-        self.filter_combo.addItems([
-            "All", "TCP Only", "UDP Only", "Established Only", "Gaming Ports",
-        ])
+        self.filter_combo.addItems(["All", *_CONNECTION_FILTERS])
         self.filter_combo.setStyleSheet(_NT_COMBO_QSS)
+        self.filter_combo.currentTextChanged.connect(self._on_filter_changed)
         ctrl_row.addWidget(self.filter_combo)
 
         self.chk_resolve = QCheckBox("Resolve Hostnames")
         self.chk_resolve.setChecked(False)
         self.chk_resolve.setStyleSheet("color: #94a3b8;")
+        self.chk_resolve.toggled.connect(self._on_resolve_toggled)
         ctrl_row.addWidget(self.chk_resolve)
 
         ctrl_row.addStretch()
@@ -843,15 +1008,14 @@ class ConnectionMapperWidget(QWidget):
         self.topo_label.setMinimumHeight(80)
         layout.addWidget(self.topo_label)
 
-        # Connection detail table
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Proto", "Local Port", "Remote IP", "Remote Port",
-            "State", "PID", "Hostname",
-        ])
+        # Connection detail table (model/view; rows updated from diffs)
+        self.model = ConnectionTableModel(self)
+        self._proxy = _ConnectionFilterProxy(self)
+        self._proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self._proxy)
         hdr = self.table.horizontalHeader()
-        for col in range(7):
+        for col in range(len(_CONNECTION_HEADERS)):
             hdr.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
@@ -863,20 +1027,22 @@ class ConnectionMapperWidget(QWidget):
         self.summary_label.setStyleSheet("color: #64748b; font-size: 11px;")
         layout.addWidget(self.summary_label)
 
-        self._refresh_done.connect(self._update_display)
+        self._changes_ready.connect(self._apply_changes)
 
     # ── Public API ──────────────────────────────────────────────────
 
     def cleanup(self) -> None:
-        """Stop the mapping thread (called by parent container)."""
+        """Stop the sampling thread (called by parent container)."""
         self._running = False
+        self._tracker.stop()
 
     # ── Internal ────────────────────────────────────────────────────
 
     def _toggle_mapping(self) -> None:
-        """Start or stop the background connection-enumeration loop."""
+        """Start or stop the background connection tracker."""
         if self._running:
             self._running = False
+            self._tracker.stop()
             self.btn_start.setText("START MAPPING")
             self.btn_start.setStyleSheet(_NT_GREEN_BTN_LG)
             self.status_label.setText("Stopped")
@@ -885,98 +1051,41 @@ class ConnectionMapperWidget(QWidget):
             self.btn_start.setText("STOP")
             self.btn_start.setStyleSheet(_NT_RED_BTN_LG)
             self.status_label.setText("Mapping...")
-            self._thread = threading.Thread(
-                target=self._map_loop, daemon=True,
-            )
-            self._thread.start()
-
-    def _map_loop(self) -> None:
-        """Background: collect connection data every 3 seconds."""
-        while self._running:
-            try:
-                import psutil
-                raw = psutil.net_connections(kind="inet")
-            except ImportError:
-                return
-            except Exception as exc:
-                log_error(f"Connection mapper error: {exc}")
-                time.sleep(3)
-                continue
+            # Emitted from the tracker thread; queued onto the GUI thread.
+            self._tracker.start(self._changes_ready.emit)
 
-            connections: List[Dict[str, Any]] = []
-            resolve = self.chk_resolve.isChecked()
-
-            for conn in raw:
-                if not conn.raddr:
-                    continue
-                rip = conn.raddr.ip
-                if rip.startswith("127.") or rip == "::1":
-                    continue
-
-                proto = "TCP" if conn.type == socket.SOCK_STREAM else "UDP"
-                hostname = self._maybe_resolve(rip) if resolve else ""
-
-                connections.append({
-                    "proto": proto,
-                    "lport": conn.laddr.port if conn.laddr else 0,
-                    "rip": rip,
-                    "rport": conn.raddr.port,
-                    "state": getattr(conn, "status", ""),
-                    "pid": conn.pid or 0,
-                    "hostname": hostname,
-                })
-
-            self._refresh_done.emit(connections)
-            time.sleep(3)
-
-    def _maybe_resolve(self, ip: str) -> str:
-        """Resolve an IP to a hostname, with caching and size cap."""
-        cached = self._resolve_cache.get(ip)
-        if cached is not None:
-            return cached
+    def _on_resolve_toggled(self, checked: bool) -> None:
+        self._tracker.resolve_hostnames = checked
+        if self._running:
+            self._tracker.wake()
+
+    def _on_filter_changed(self, text: str) -> None:
+        self._proxy.set_predicate(_CONNECTION_FILTERS.get(text))
+        self._render_views()
+
+    @pyqtSlot(object)
+    def _apply_changes(self, diff: ConnectionDiff) -> None:
+        """Slot: apply one diff to the table, then redraw the summaries."""
+        self.model.apply(diff)
+        self._render_views()
+        self.status_label.setText(
+            f"Updated {time.strftime('%H:%M:%S')} "
+            f"(+{len(diff.added)} / -{len(diff.removed)} / ~{len(diff.changed)})"
+        )
 
-        try:
-            hostname = socket.getfqdn(ip)
-            if hostname == ip:
-                hostname = ""
-        except Exception:
-            hostname = ""
-
-        if len(self._resolve_cache) >= self._MAX_RESOLVE_CACHE:
-            self._resolve_cache.clear()
-        self._resolve_cache[ip] = hostname
-        return hostname
-
-    @pyqtSlot(list)
-    def _update_display(self, connections: list) -> None:
-        """Slot: apply filter, rebuild topology and table."""
-        filtered = self._apply_filter(connections)
-
-        # Group by remote IP
-        ip_map: Dict[str, List[Dict]] = {}
+    def _render_views(self) -> None:
+        """Rebuild topology and summary from the rows passing the filter."""
+        predicate = _CONNECTION_FILTERS.get(self.filter_combo.currentText())
+        filtered = [
+            c for c in self.model.connections() if predicate is None or predicate(c)
+        ]
+        ip_map: Dict[str, List[Connection]] = {}
         for conn in filtered:
-            ip_map.setdefault(conn["rip"], []).append(conn)
-
+            ip_map.setdefault(conn.rip, []).append(conn)
         self._render_topology(ip_map)
-        self._render_table(filtered)
         self._render_summary(filtered, ip_map)
-        self.status_label.setText(f"Updated {time.strftime('%H:%M:%S')}")
-
-    def _apply_filter(self, connections: list) -> list:
-        """Return the subset matching the current combo-box filter."""
-        filt = self.filter_combo.currentText()
-        filters: Dict[str, Callable] = {
-            "TCP Only": lambda c: c["proto"] == "TCP",
-            "UDP Only": lambda c: c["proto"] == "UDP",
-            "Established Only": lambda c: c["state"] == "ESTABLISHED",
-            "Gaming Ports": lambda c: (
-                c["rport"] in GAMING_PORTS or c["lport"] in GAMING_PORTS
-            ),
-        }
-        fn = filters.get(filt)
-        return [c for c in connections if fn(c)] if fn else list(connections)
-
-    def _render_topology(self, ip_map: Dict[str, list]) -> None:
+
+    def _render_topology(self, ip_map: Dict[str, List[Connection]]) -> None:
         """Build the text-art topology label from grouped connections."""
         if not ip_map:
             self.topo_label.setText("  No active connections matching filter.")
@@ -988,9 +1097,9 @@ class ConnectionMapperWidget(QWidget):
 
         top_ips = sorted(ip_map.items(), key=lambda x: len(x[1]), reverse=True)[:12]
         for rip, conns in top_ips:
-            host = conns[0].get("hostname") or ""
+            host = conns[0].hostname
             label = f"{rip}" + (f" ({host})" if host else "")
-            ports = sorted({c["rport"] for c in conns})
+            ports = sorted({c.rport for c in conns})
             port_str = ", ".join(str(p) for p in ports[:6])
             if len(ports) > 6:
                 port_str += f" +{len(ports) - 6}"
@@ -1001,35 +1110,15 @@ class ConnectionMapperWidget(QWidget):
 
         self.topo_label.setText("\n".join(lines))
 
-    def _render_table(self, filtered: list) -> None:
-        """Populate the detail table from filtered connections."""
-        self.table.setRowCount(0)
-        for conn in filtered:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(conn["proto"]))
-            self.table.setItem(row, 1, QTableWidgetItem(str(conn["lport"])))
-            self.table.setItem(row, 2, QTableWidgetItem(conn["rip"]))
-            self.table.setItem(row, 3, QTableWidgetItem(str(conn["rport"])))
-
-            state_item = QTableWidgetItem(conn["state"])
-            state_item.setForeground(
-                QColor(_STATE_COLORS.get(conn["state"], "#6b7280"))
-            )
-            self.table.setItem(row, 4, state_item)
-
-            self.table.setItem(
-                row, 5, QTableWidgetItem(str(conn["pid"]) if conn["pid"] else "—"),
-            )
-            self.table.setItem(row, 6, QTableWidgetItem(conn["hostname"]))
-
-    def _render_summary(self, filtered: list, ip_map: Dict[str, list]) -> None:
+    def _render_summary(
+        self, filtered: List[Connection], ip_map: Dict[str, List[Connection]],
+    ) -> None:
         """Update the summary label with connection statistics."""
-        tcp = sum(1 for c in filtered if c["proto"] == "TCP")
-        udp = sum(1 for c in filtered if c["proto"] == "UDP")
+        tcp = sum(1 for c in filtered if c.proto == "TCP")
+        udp = sum(1 for c in filtered if c.proto == "UDP")
         gaming = sum(
             1 for c in filtered
-            if c["rport"] in GAMING_PORTS or c["lport"] in GAMING_PORTS
+            if c.rport in GAMING_PORTS or c.lport in GAMING_PORTS
         )
         self.summary_label.setText(
             f"{len(filtered)} connections | {len(ip_map)} unique IPs | "
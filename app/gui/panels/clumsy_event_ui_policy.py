@@ -163,13 +163,17 @@ def install_clumsy_event_ui_policy() -> None:
 
     def set_queue_running(panel: Any, running: bool) -> None:
         original_set_queue_running(panel, running)
-        advanced = getattr(
-            panel._clumsy_view,
-            "_clumsy_advanced_param_adapter",
-            None,
-        )
-        if advanced is not None:
-            advanced.setEnabled(not running)
+        try:
+            advanced = getattr(
+                panel._clumsy_view,
+                "_clumsy_advanced_param_adapter",
+                None,
+            )
+            if advanced is not None:
+                advanced.setEnabled(not running)
+        except RuntimeError:
+            # The Clumsy view was deleted first during teardown.
+            return
 
     def advanced_init(panel: ClumsyAdvancedPanel, *args: Any, **kwargs: Any) -> None:
         original_advanced_init(panel, *args, **kwargs)
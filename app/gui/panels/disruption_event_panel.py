@@ -243,8 +243,14 @@ class DisruptionEventPanel(QGroupBox):
             "btn_run_macro",
         ):
             button = getattr(self._clumsy_view, name, None)
-            if button is not None:
+            if button is None:
+                continue
+            try:
                 button.setEnabled(not running)
+            except RuntimeError:
+                # The owning view is torn down before this panel when the
+                # Network Tools tab never adopted it (lazy dashboard pages).
+                continue
 
     def _enforce_clumsy_direction(self) -> None:
         """Make explicit Clumsy selection immediately representable.
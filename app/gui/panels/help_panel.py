@@ -511,9 +511,10 @@ can't hit this target class.</p>
 
 <p style='color:{_TEXT_MUTED}; font-size:12px; margin-top:8px;'>
 <b style='color:{_AMBER};'>Tip:</b> If the Device Table vendor column shows
-<b>Unknown</b> for a device with a real MAC, scapy's MANUFDB isn't loading —
-check logs for a scapy import error. v5.6 chains the full ~35k-entry IEEE
-OUI database as a fallback to the 60-entry curated gaming table.</p>
+<b>Unknown</b> for a device with a real MAC, check logs for an
+"OUI database load failed" error. Behind the 60-entry curated gaming table
+sits the bundled IEEE OUI registry (~50k prefixes, including MA-M / MA-S
+sub-assignments); a randomized (private) MAC has no vendor by design.</p>
 
 <p style='color:{_TEXT}; font-size:12px; margin-top:10px;'>
 <b style='color:{_GREEN};'>✓ WiFi disruption (v5.7.2):</b> Pick a device from
@@ -42,6 +42,7 @@ class LanCutPanel(QWidget):
     """Scans the local /24, lists devices, cuts any one with a click."""
 
     _scan_done = pyqtSignal(list)
+    _scan_device = pyqtSignal(dict)    # one device, as soon as it is found
     _a2s_update = pyqtSignal(object)   # A2SSnapshot; object to avoid metatype reg
 
     def __init__(self, parent_view, parent=None) -> None:
@@ -54,6 +55,7 @@ class LanCutPanel(QWidget):
         self._a2s_baseline: Optional[int] = None
         self._setup_ui()
         self._scan_done.connect(self._on_scan_done)
+        self._scan_device.connect(self._on_scan_device)
         self._a2s_update.connect(self._on_a2s_snapshot)
         # Defer first scan so UI renders before the network thread runs
         QTimer.singleShot(500, self._start_scan)
@@ -207,7 +209,7 @@ class LanCutPanel(QWidget):
         def _work() -> None:
             try:
                 from app.network.device_scan import scan_devices
-                devices = scan_devices(quick=True)
+                devices = scan_devices(quick=True, on_device=self._scan_device.emit)
             except Exception as exc:
                 log_error(f"[LAN CUT] scan failed: {exc}")
                 devices = []
@@ -221,28 +223,8 @@ class LanCutPanel(QWidget):
 
         self.table.setRowCount(0)
         for dev in devices:
-            ip = dev.get("ip") or ""
-            if not ip:
-                continue
-            mac = dev.get("mac") or "—"
-            host = dev.get("hostname") or dev.get("device_type") or ""
-            active = ip in self._arp_spoofers
-
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(ip))
-            self.table.setItem(row, 1, QTableWidgetItem(mac))
-            self.table.setItem(row, 2, QTableWidgetItem(host))
-
-            status_text = "CUT" if active else "online"
-            status_item = QTableWidgetItem(status_text)
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 3, status_item)
-
-            btn = QPushButton("RESTORE" if active else "CUT")
-            btn.setStyleSheet(self._btn_qss(active))
-            btn.clicked.connect(lambda _=False, _ip=ip: self._toggle(_ip))
-            self.table.setCellWidget(row, 4, btn)
+            if dev.get("ip"):
+                self._fill_row(self.table.rowCount(), dev)
 
         self.table.resizeColumnToContents(0)
         self.table.resizeColumnToContents(1)
@@ -250,6 +232,36 @@ class LanCutPanel(QWidget):
         self.table.resizeColumnToContents(4)
         self._refresh_active_count()
 
+    def _on_scan_device(self, dev: Dict) -> None:
+        """Add or update one row while the sweep is still running."""
+        ip = dev.get("ip") or ""
+        if not ip:
+            return
+        row = self._row_of(ip)
+        self._fill_row(self.table.rowCount() if row is None else row, dev)
+
+    def _fill_row(self, row: int, dev: Dict) -> None:
+        ip = dev["ip"]
+        mac = dev.get("mac") or "—"
+        host = dev.get("hostname") or dev.get("device_type") or ""
+        active = ip in self._arp_spoofers
+
+        if row >= self.table.rowCount():
+            self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(ip))
+        self.table.setItem(row, 1, QTableWidgetItem(mac))
+        self.table.setItem(row, 2, QTableWidgetItem(host))
+
+        status_text = "CUT" if active else "online"
+        status_item = QTableWidgetItem(status_text)
+        status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row, 3, status_item)
+
+        btn = QPushButton("RESTORE" if active else "CUT")
+        btn.setStyleSheet(self._btn_qss(active))
+        btn.clicked.connect(lambda _=False, _ip=ip: self._toggle(_ip))
+        self.table.setCellWidget(row, 4, btn)
+
     # ------------------------------------------------------------------
     # Cut / restore
     # ------------------------------------------------------------------
@@ -346,17 +358,23 @@ class LanCutPanel(QWidget):
     # ------------------------------------------------------------------
     # Table helpers
     # ------------------------------------------------------------------
-    def _refresh_row_for(self, ip: str) -> None:
+    def _row_of(self, ip: str) -> Optional[int]:
         for row in range(self.table.rowCount()):
             item = self.table.item(row, 0)
             if item and item.text() == ip:
-                active = ip in self._arp_spoofers
-                self.table.item(row, 3).setText("CUT" if active else "online")
-                btn = self.table.cellWidget(row, 4)
-                if isinstance(btn, QPushButton):
-                    btn.setText("RESTORE" if active else "CUT")
-                    btn.setStyleSheet(self._btn_qss(active))
-                return
+                return row
+        return None
+
+    def _refresh_row_for(self, ip: str) -> None:
+        row = self._row_of(ip)
+        if row is None:
+            return
+        active = ip in self._arp_spoofers
+        self.table.item(row, 3).setText("CUT" if active else "online")
+        btn = self.table.cellWidget(row, 4)
+        if isinstance(btn, QPushButton):
+            btn.setText("RESTORE" if active else "CUT")
+            btn.setStyleSheet(self._btn_qss(active))
 
     def _refresh_active_count(self) -> None:
         self.active_label.setText(f"Active cuts: {len(self._arp_spoofers)}")
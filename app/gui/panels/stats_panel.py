@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-import threading
+from typing import Optional
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
@@ -11,6 +11,13 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
+from app.core.status_bus import (
+    FIELD_ENGINE_STATS,
+    StatusSubscription,
+    StatusUpdate,
+    get_status_bus,
+    thaw,
+)
 from app.logs.logger import log_error
 
 __all__ = ["StatsPanel"]
@@ -37,10 +44,11 @@ class StatsPanel(QWidget):
         super().__init__(parent)
         self._view = parent_view  # back-ref to ClumsyControlView
         self._stats_generation = 0
-        self._stats_in_flight = False
+        self._stats_subscription: Optional[StatusSubscription] = None
         self._stats_ready.connect(self._apply_stats_result)
         self._stats_failed.connect(self._apply_stats_error)
         self._setup_ui()
+        self._subscribe_status_bus()
 
     # ------------------------------------------------------------------
     # UI construction
@@ -208,47 +216,50 @@ class StatsPanel(QWidget):
     # ------------------------------------------------------------------
     # Refresh
     # ------------------------------------------------------------------
-    def refresh(self) -> None:
-        """Fetch live engine data without blocking the Qt event loop."""
-        controller = self._view.controller
-        if not controller or not hasattr(controller, 'get_engine_stats'):
+    def _subscribe_status_bus(self) -> None:
+        """Receive engine telemetry pushes from the controller's status bus."""
+        bus = get_status_bus(self._view.controller)
+        if bus is None or FIELD_ENGINE_STATS not in bus.fields:
             return
-        if self._stats_in_flight:
-            return
-        self._stats_generation += 1
         generation = self._stats_generation
-        self._stats_in_flight = True
 
-        def _fetch() -> None:
-            try:
+        def _on_update(update: StatusUpdate) -> None:
+            # Runs on the bus sampler thread — hop to Qt via the signal.
+            error = update.errors.get(FIELD_ENGINE_STATS)
+            if error:
+                self._stats_failed.emit(generation, error)
+            elif FIELD_ENGINE_STATS in update.values:
                 self._stats_ready.emit(
-                    generation,
-                    controller.get_engine_stats(),
-                )
-            except Exception as exc:
-                self._stats_failed.emit(generation, str(exc))
+                    generation, thaw(update.values[FIELD_ENGINE_STATS]))
+
+        self._stats_subscription = bus.subscribe(
+            _on_update,
+            (FIELD_ENGINE_STATS,),
+            max_rate_hz=1 / 1.5,
+        )
 
-        threading.Thread(
-            target=_fetch,
-            daemon=True,
-            name="DupeZStatsRefresh",
-        ).start()
+    def refresh(self) -> None:
+        """Ask the status bus for fresh engine data right away."""
+        bus = get_status_bus(self._view.controller)
+        if bus is not None and self._stats_subscription is not None:
+            bus.request_refresh((FIELD_ENGINE_STATS,))
 
     def stop_refresh(self) -> None:
-        """Invalidate any late worker result during parent shutdown."""
+        """Drop the bus subscription and reject any queued late result."""
         self._stats_generation += 1
-        self._stats_in_flight = False
+        subscription = self._stats_subscription
+        self._stats_subscription = None
+        if subscription is not None:
+            subscription.close()
 
     def _apply_stats_error(self, generation: int, message: str) -> None:
         if generation != self._stats_generation:
             return
-        self._stats_in_flight = False
         log_error(f"Stats refresh error: {message}")
 
     def _apply_stats_result(self, generation: int, stats: object) -> None:
         if generation != self._stats_generation:
             return
-        self._stats_in_flight = False
         if not isinstance(stats, dict):
             log_error("Stats refresh error: engine returned non-dict telemetry")
             return
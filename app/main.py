@@ -441,7 +441,11 @@ def main() -> None:
         from app.gui.dashboard import DupeZDashboard
         from app.gui.hotkey import HotkeyListener
 
-        window = DupeZDashboard(controller=controller)
+        window = DupeZDashboard(
+            controller=controller,
+            lazy_views=resource_profile.lazy_views,
+            prewarm_views=resource_profile.prewarm_views,
+        )
 
         hotkey = HotkeyListener(callback=controller.toggle_lag)
         hotkey.start()
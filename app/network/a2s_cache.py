@@ -0,0 +1,292 @@
+# app/network/a2s_cache.py — process-wide A2S result cache
+"""Shared, single-flight cache for A2S_INFO / A2S_PLAYER results.
+
+Every :class:`~app.network.a2s_probe.A2SProbe`, the diagnostics check
+and any view that shows server state used to query the server on its
+own, so two consumers of the same server doubled the query traffic
+(and the odds of being rate-limited). :func:`get_a2s_cache` returns one
+:class:`A2SCache` per process:
+
+* entries are keyed by ``(host, port, kind)`` with ``kind`` ``"info"``
+  or ``"players"``; a reachable result lives ``ttl_s``, a failed one
+  only ``negative_ttl_s`` so a blip is retried soon;
+* callers may ask for fresher data than the TTL with ``max_age``;
+* concurrent misses for one key collapse into a single query — the
+  first caller runs it, the rest wait for its result (*coalesced*);
+* the last good challenge per server is kept for ``challenge_ttl_s``
+  and sent up front, which saves the handshake round trip;
+* :meth:`A2SCache.subscribe` callbacks fire whenever a key is
+  refreshed, whoever triggered the refresh.
+
+Counters (hits, misses, coalesced, …) are in :meth:`A2SCache.stats`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.logs.logger import log_error
+from app.network import a2s_probe
+from app.network.a2s_probe import A2SSnapshot
+
+__all__ = [
+    "A2SCache",
+    "get_a2s_cache",
+]
+
+DEFAULT_TTL_S = 2.0
+DEFAULT_NEGATIVE_TTL_S = 0.5
+DEFAULT_CHALLENGE_TTL_S = 30.0
+
+INFO = "info"
+PLAYERS = "players"
+
+Key = Tuple[str, int, str]
+Listener = Callable[[Key, Any], None]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    ok: bool
+    stored_at: float
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+
+
+class A2SCache:
+    """TTL cache with single-flight refresh. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = DEFAULT_TTL_S,
+        negative_ttl_s: float = DEFAULT_NEGATIVE_TTL_S,
+        challenge_ttl_s: float = DEFAULT_CHALLENGE_TTL_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_s = float(ttl_s)
+        self._negative_ttl_s = float(negative_ttl_s)
+        self._challenge_ttl_s = float(challenge_ttl_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, _Entry] = {}
+        self._flights: Dict[Key, _Flight] = {}
+        self._challenges: Dict[Tuple[str, int], Tuple[bytes, float]] = {}
+        self._listeners: Dict[Key, List[Listener]] = {}
+        self._stats = {
+            "hits": 0, "misses": 0, "coalesced": 0,
+            "negative_hits": 0, "challenge_reuse": 0,
+        }
+
+    # ── queries ──────────────────────────────────────────────────────
+
+    def get_info(
+        self, host: str, port: int, *,
+        timeout_s: float = 1.0, max_age: Optional[float] = None,
+    ) -> A2SSnapshot:
+        """A2S_INFO for (host, port), from cache when fresh enough."""
+        return self._get((host, int(port), INFO), timeout_s, max_age, self._fetch_info)
+
+    def get_players(
+        self, host: str, port: int, *,
+        timeout_s: float = 1.0, max_age: Optional[float] = None,
+    ) -> Tuple[Tuple[str, ...], Optional[str]]:
+        """A2S_PLAYER ``(names, error)`` for (host, port)."""
+        return self._get((host, int(port), PLAYERS), timeout_s, max_age, self._fetch_players)
+
+    def get_info_many(
+        self, targets: Iterable[Tuple[str, int]], *,
+        timeout_s: float = 1.5, max_age: Optional[float] = None,
+        **engine_kwargs: Any,
+    ):
+        """Batch A2S_INFO: cached entries are reused, the misses go out
+        together through :class:`~app.network.a2s_engine.A2SQueryEngine`.
+        Returns :class:`~app.network.a2s_engine.A2SQueryResult` sorted
+        by RTT."""
+        from app.network.a2s_engine import A2SQueryEngine, A2SQueryResult, _by_rtt
+
+        keys = list(dict.fromkeys((str(h), int(p), INFO) for h, p in targets))
+        values: Dict[Key, A2SSnapshot] = {}
+        waiting: Dict[Key, _Flight] = {}
+        leading: Dict[Key, _Flight] = {}
+        with self._lock:
+            for key in keys:
+                cached = self._fresh(key, max_age)
+                if cached is not None:
+                    values[key] = cached.value
+                elif key in self._flights:
+                    self._stats["coalesced"] += 1
+                    waiting[key] = self._flights[key]
+                else:
+                    self._stats["misses"] += 1
+                    leading[key] = self._flights[key] = _Flight()
+        try:
+            if leading:
+                engine = A2SQueryEngine(timeout_s=timeout_s, **engine_kwargs)
+                for result in engine.iter_info((h, p) for h, p, _ in leading):
+                    key = (result.host, result.port, INFO)
+                    values[key] = result.snapshot
+                    self._complete(key, leading.pop(key), result.snapshot, result.reachable)
+        finally:
+            for key, flight in leading.items():
+                self._complete(key, flight, _unreachable("query aborted"), False)
+        for key, flight in waiting.items():
+            values[key] = self._wait(flight, timeout_s, _unreachable("timeout"))
+        return _by_rtt([A2SQueryResult(h, p, values[(h, p, k)]) for h, p, k in keys])
+
+    # ── subscribers / introspection ──────────────────────────────────
+
+    def subscribe(self, host: str, port: int, callback: Listener, kind: str = INFO) -> None:
+        """Call ``callback(key, value)`` after every refresh of the key."""
+        with self._lock:
+            self._listeners.setdefault((host, int(port), kind), []).append(callback)
+
+    def unsubscribe(self, host: str, port: int, callback: Listener, kind: str = INFO) -> None:
+        with self._lock:
+            listeners = self._listeners.get((host, int(port), kind), [])
+            if callback in listeners:
+                listeners.remove(callback)
+
+    def peek(self, host: str, port: int, kind: str = INFO) -> Optional[Any]:
+        """Last stored value regardless of age, without querying."""
+        with self._lock:
+            entry = self._entries.get((host, int(port), kind))
+            return entry.value if entry else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "in_flight": len(self._flights),
+                "challenges": len(self._challenges),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._challenges.clear()
+
+    # ── internals ────────────────────────────────────────────────────
+
+    def _fresh(self, key: Key, max_age: Optional[float]) -> Optional[_Entry]:
+        """Entry usable for *max_age*; updates hit counters. Lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        limit = self._ttl_s if entry.ok else self._negative_ttl_s
+        if max_age is not None:
+            limit = min(limit, max_age)
+        if self._clock() - entry.stored_at > limit:
+            return None
+        self._stats["hits" if entry.ok else "negative_hits"] += 1
+        return entry
+
+    def _get(self, key: Key, timeout_s: float, max_age: Optional[float], fetch) -> Any:
+        with self._lock:
+            cached = self._fresh(key, max_age)
+            if cached is not None:
+                return cached.value
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+        if not leader:
+            return self._wait(flight, timeout_s, _failure(key[2], "timeout"))
+        value, ok = _failure(key[2], "query failed"), False
+        try:
+            value, ok = fetch(key, timeout_s)
+        finally:
+            self._complete(key, flight, value, ok)
+        return value
+
+    def _wait(self, flight: _Flight, timeout_s: float, fallback: Any) -> Any:
+        # The leader may need two round trips (challenge) plus slack.
+        if flight.done.wait(2 * timeout_s + 1.0):
+            return flight.value
+        return fallback
+
+    def _complete(self, key: Key, flight: _Flight, value: Any, ok: bool) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(value=value, ok=ok, stored_at=self._clock())
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            listeners = list(self._listeners.get(key, ()))
+        flight.value = value
+        flight.done.set()
+        for cb in listeners:
+            try:
+                cb(key, value)
+            except Exception as exc:  # noqa: BLE001
+                log_error(f"[A2S] cache subscriber raised: {exc}")
+
+    def _challenge(self, host: str, port: int) -> Optional[bytes]:
+        with self._lock:
+            held = self._challenges.get((host, port))
+            if held is None:
+                return None
+            if self._clock() - held[1] > self._challenge_ttl_s:
+                del self._challenges[(host, port)]
+                return None
+            self._stats["challenge_reuse"] += 1
+            return held[0]
+
+    def _remember_challenge(self, host: str, port: int, challenge: Optional[bytes]) -> None:
+        with self._lock:
+            if challenge:
+                self._challenges[(host, port)] = (challenge, self._clock())
+            else:
+                self._challenges.pop((host, port), None)
+
+    def _fetch_info(self, key: Key, timeout_s: float) -> Tuple[A2SSnapshot, bool]:
+        host, port, _ = key
+        snap, challenge = a2s_probe._query_info(
+            host, port, timeout_s, self._challenge(host, port),
+        )
+        self._remember_challenge(host, port, challenge)
+        return snap, snap.reachable
+
+    def _fetch_players(self, key: Key, timeout_s: float):
+        host, port, _ = key
+        names, error, challenge = a2s_probe._query_players(
+            host, port, timeout_s, self._challenge(host, port),
+        )
+        self._remember_challenge(host, port, challenge)
+        return (names, error), error is None
+
+
+def _unreachable(error: str) -> A2SSnapshot:
+    return A2SSnapshot(
+        ts=time.time(), reachable=False, player_count=None,
+        max_players=None, server_name=None, error=error,
+    )
+
+
+def _failure(kind: str, error: str) -> Any:
+    """Failed result in the shape callers of *kind* unpack."""
+    return _unreachable(error) if kind == INFO else ((), error)
+
+
+_cache: Optional[A2SCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_a2s_cache() -> A2SCache:
+    """The process-wide cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = A2SCache()
+        return _cache
@@ -0,0 +1,402 @@
+# app/network/a2s_engine.py — concurrent A2S_INFO queries
+"""Batch A2S_INFO for server-list reachability checks.
+
+:func:`app.network.a2s_probe.query_info_once` is one blocking socket
+per query, so checking N servers sequentially costs up to
+N × timeout. :class:`A2SQueryEngine` instead keeps every query in
+flight on one non-blocking UDP socket per address family and
+multiplexes replies with :mod:`selectors`:
+
+* up to ``max_in_flight`` outstanding queries, each with its own
+  deadline (``timeout_s`` from its first send);
+* sends are paced by a token bucket (``send_rate`` per second) so a
+  large list does not burst hundreds of datagrams at the router;
+* S2C_CHALLENGE replies are answered immediately on the same socket,
+  split (multi-packet, optionally bzip2) replies are reassembled;
+* replies are matched to queries by source address, so a stray or
+  spoofed datagram from anywhere else is ignored.
+
+Host names are resolved before the event loop starts, on a small thread
+pool (:data:`RESOLVE_WORKERS`): ``getaddrinfo`` blocks, and one slow DNS
+answer inside the loop would stall every query in flight and skew the
+send pacing. The loop itself only ever sees address tuples.
+
+:meth:`A2SQueryEngine.iter_info` yields results as they complete —
+with all queries issued together that is RTT order — and
+:func:`query_info_many` collects them sorted by RTT, unreachable
+servers last.
+
+:func:`configured_servers` reads the ``favorites`` / ``known_servers``
+lists from ``dayz_servers.json`` for the diagnostics check. Each entry is
+one server's Steam *query* port (not the game port), either as a string
+or an object::
+
+    "favorites": [
+        "203.0.113.10:27016",
+        "[2001:db8::10]:27016",
+        {"ip": "203.0.113.11", "query_port": 27017, "name": "optional"}
+    ]
+
+Objects take the host from ``ip``, ``host`` or ``address`` and the port
+from ``query_port`` or ``port`` (an integer, 1-65535). Other keys are
+ignored; entries matching neither form are skipped with a warning.
+"""
+
+from __future__ import annotations
+
+import json
+import selectors
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.logs.logger import log_warning
+from app.network.a2s_probe import (
+    _A2S_INFO,
+    _HEADER_SINGLE,
+    _S2A_INFO,
+    _S2C_CHALLENGE,
+    A2SSnapshot,
+    _parse_info,
+    _SplitAssembler,
+    _unwrap,
+)
+
+__all__ = [
+    "A2SQueryEngine",
+    "A2SQueryResult",
+    "configured_servers",
+    "query_info_many",
+]
+
+DEFAULT_TIMEOUT_S = 1.5
+DEFAULT_MAX_IN_FLIGHT = 256
+DEFAULT_SEND_RATE = 200.0
+_SEND_BURST = 32
+RESOLVE_WORKERS = 8
+_RECV_BUF = 65535
+
+Target = Tuple[str, int]
+_Resolved = Tuple[int, Tuple[Any, ...]]
+
+
+@dataclass(frozen=True)
+class A2SQueryResult:
+    """One server's A2S_INFO outcome."""
+    host: str
+    port: int
+    snapshot: A2SSnapshot
+
+    @property
+    def reachable(self) -> bool:
+        return self.snapshot.reachable
+
+    @property
+    def rtt_ms(self) -> Optional[float]:
+        return self.snapshot.rtt_ms
+
+
+@dataclass
+class _Query:
+    host: str
+    port: int
+    sock: socket.socket
+    addr: Tuple[Any, ...]
+    sent_at: float
+    deadline: float
+    rtt_ms: Optional[float] = None
+    challenged: bool = False
+    assembler: _SplitAssembler = field(default_factory=_SplitAssembler)
+    aliases: List[Target] = field(default_factory=list)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self.rate = float(rate)
+        self.burst = float(max(1, burst))
+        self.tokens = self.burst
+        self.stamp = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait(self, now: float) -> float:
+        self._refill(now)
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+
+def _failed(error: str) -> A2SSnapshot:
+    return A2SSnapshot(
+        ts=time.time(), reachable=False, player_count=None,
+        max_players=None, server_name=None, error=error,
+    )
+
+
+def _by_rtt(results: List[A2SQueryResult]) -> List[A2SQueryResult]:
+    # Stable: unreachable servers keep completion order at the end.
+    return sorted(results, key=lambda r: (
+        not r.reachable, r.rtt_ms if r.reachable and r.rtt_ms is not None else 0.0,
+    ))
+
+
+class A2SQueryEngine:
+    """Runs batches of A2S_INFO queries concurrently.
+
+    Not thread-safe; each call to :meth:`iter_info` owns its sockets
+    for the duration of the batch. Run it on a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        send_rate: float = DEFAULT_SEND_RATE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._timeout_s = float(timeout_s)
+        self._max_in_flight = max(1, int(max_in_flight))
+        self._send_rate = max(1.0, float(send_rate))
+        self._clock = clock
+
+    def query_info(self, targets: Iterable[Target]) -> List[A2SQueryResult]:
+        """All results, reachable servers first by ascending RTT."""
+        return _by_rtt(list(self.iter_info(targets)))
+
+    def iter_info(self, targets: Iterable[Target]) -> Iterator[A2SQueryResult]:
+        """Yield one result per distinct target, in completion order."""
+        resolved = self._resolve_all(dict.fromkeys((str(h), int(p)) for h, p in targets))
+        pending: Deque[Tuple[str, int, _Resolved]] = deque()
+        for (host, port), outcome in resolved.items():
+            if isinstance(outcome, str):
+                yield A2SQueryResult(host, port, _failed(outcome))
+            else:
+                pending.append((host, port, outcome))
+        sel = selectors.DefaultSelector()
+        socks: Dict[int, socket.socket] = {}
+        inflight: Dict[Tuple[Any, ...], _Query] = {}
+        bucket = _TokenBucket(self._send_rate, _SEND_BURST, self._clock())
+
+        def finish(q: _Query, snap: A2SSnapshot) -> List[A2SQueryResult]:
+            inflight.pop(q.addr[:2], None)
+            return [A2SQueryResult(h, p, snap) for h, p in [(q.host, q.port), *q.aliases]]
+
+        try:
+            while pending or inflight:
+                now = self._clock()
+                for q in [q for q in inflight.values() if now >= q.deadline]:
+                    yield from finish(q, A2SSnapshot(
+                        ts=time.time(), reachable=False, player_count=None,
+                        max_players=None, server_name=None, rtt_ms=q.rtt_ms,
+                        error="timeout",
+                    ))
+
+                while pending and len(inflight) < self._max_in_flight and bucket.take(now):
+                    host, port, (family, addr) = pending.popleft()
+                    try:
+                        if addr[:2] in inflight:
+                            inflight[addr[:2]].aliases.append((host, port))
+                            continue
+                        sock = socks.get(family)
+                        if sock is None:
+                            sock = socks[family] = self._open(family)
+                            sel.register(sock, selectors.EVENT_READ)
+                        sock.sendto(_HEADER_SINGLE + _A2S_INFO, addr)
+                    except OSError as exc:
+                        yield A2SQueryResult(host, port, _failed(f"send failed: {exc}"))
+                        continue
+                    sent = self._clock()
+                    inflight[addr[:2]] = _Query(
+                        host=host, port=port, sock=sock, addr=addr,
+                        sent_at=sent, deadline=sent + self._timeout_s,
+                    )
+
+                if not inflight:
+                    if pending:
+                        time.sleep(bucket.wait(self._clock()))
+                    continue
+                now = self._clock()
+                wait = min(q.deadline for q in inflight.values()) - now
+                if pending and len(inflight) < self._max_in_flight:
+                    wait = min(wait, bucket.wait(now))
+                for key, _ in sel.select(max(0.0, wait)):
+                    yield from self._drain(key.fileobj, inflight, finish)
+        finally:
+            sel.close()
+            for sock in socks.values():
+                sock.close()
+
+    # ── internals ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _resolve(host: str, port: int, flags: int = 0) -> _Resolved:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM, flags=flags)
+        infos.sort(key=lambda i: i[0] != socket.AF_INET)
+        family, _, _, _, addr = infos[0]
+        return family, addr
+
+    @classmethod
+    def _resolve_all(cls, targets: Iterable[Target]) -> Dict[Target, Union[_Resolved, str]]:
+        """Address for every target, or an error string, in target order.
+
+        Literal addresses are converted inline; names go to a thread pool
+        so a slow resolver costs the batch one lookup's time, not N.
+        """
+        out: Dict[Target, Union[_Resolved, str]] = {}
+        names: List[Target] = []
+        for target in targets:
+            try:
+                out[target] = cls._resolve(*target, flags=socket.AI_NUMERICHOST)
+            except socket.gaierror:
+                out[target] = ""
+                names.append(target)
+            except OSError as exc:
+                out[target] = f"resolve failed: {exc}"
+
+        def lookup(target: Target) -> Union[_Resolved, str]:
+            try:
+                return cls._resolve(*target)
+            except OSError as exc:
+                return f"resolve failed: {exc}"
+
+        if names:
+            with ThreadPoolExecutor(
+                max_workers=min(RESOLVE_WORKERS, len(names)),
+                thread_name_prefix="DupeZA2SResolve",
+            ) as pool:
+                for target, outcome in zip(names, pool.map(lookup, names)):
+                    out[target] = outcome
+        return out
+
+    @staticmethod
+    def _open(family: int) -> socket.socket:
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        # Windows reports an earlier ICMP port-unreachable as a
+        # ConnectionResetError on the *next* recvfrom; turn that off.
+        if hasattr(socket, "SIO_UDP_CONNRESET"):
+            try:
+                sock.ioctl(socket.SIO_UDP_CONNRESET, False)
+            except OSError:
+                pass
+        return sock
+
+    def _drain(self, sock, inflight, finish) -> Iterator[A2SQueryResult]:
+        while True:
+            try:
+                data, addr = sock.recvfrom(_RECV_BUF)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue
+            except OSError as exc:
+                log_warning(f"[A2S] recv failed: {exc}")
+                return
+            q = inflight.get(addr[:2])
+            if q is None:
+                continue
+            now = self._clock()
+            if q.rtt_ms is None:
+                q.rtt_ms = (now - q.sent_at) * 1000.0
+            try:
+                payload = _unwrap(data, q.assembler)
+                if payload is None:
+                    continue
+                kind = payload[0]
+                if kind == _S2C_CHALLENGE and not q.challenged and len(payload) >= 5:
+                    q.challenged = True
+                    sock.sendto(_HEADER_SINGLE + _A2S_INFO + payload[1:5], q.addr)
+                    continue
+                if kind != _S2A_INFO:
+                    yield from finish(q, _failed(f"unexpected response byte 0x{kind:02x}"))
+                    continue
+                name, players, max_players = _parse_info(payload)
+            except (ValueError, IndexError, OSError) as exc:
+                yield from finish(q, _failed(f"bad response: {exc}"))
+                continue
+            yield from finish(q, A2SSnapshot(
+                ts=time.time(), reachable=True, player_count=players,
+                max_players=max_players, server_name=name, rtt_ms=q.rtt_ms,
+            ))
+
+
+def query_info_many(
+    targets: Iterable[Target],
+    *,
+    on_result: Optional[Callable[[A2SQueryResult], None]] = None,
+    **engine_kwargs: Any,
+) -> List[A2SQueryResult]:
+    """Query every target concurrently; results sorted by RTT.
+
+    *on_result* is called as each server answers or times out, for
+    callers that want to stream rows into a view.
+    """
+    engine = A2SQueryEngine(**engine_kwargs)
+    results: List[A2SQueryResult] = []
+    for result in engine.iter_info(targets):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return _by_rtt(results)
+
+
+def _parse_target(entry: Any) -> Optional[Target]:
+    """``"host:port"`` or ``{"ip"|"host"|"address": ..., "query_port"|"port": ...}``."""
+    if isinstance(entry, str):
+        host, sep, port = entry.strip().rpartition(":")
+        host = host.strip("[]")
+        if sep and host and port.isdigit() and 0 < int(port) < 65536:
+            return host, int(port)
+        return None
+    if isinstance(entry, dict):
+        host = entry.get("ip") or entry.get("host") or entry.get("address")
+        port = entry.get("query_port") or entry.get("port")
+        if (isinstance(host, str) and host and isinstance(port, int)
+                and not isinstance(port, bool) and 0 < port < 65536):
+            return host, port
+    return None
+
+
+def configured_servers(path: Optional[Path] = None) -> List[Target]:
+    """Servers listed under ``favorites`` and ``known_servers``.
+
+    See the module docstring for the entry schema; invalid entries are
+    logged and skipped, duplicates keep their first position.
+    """
+    if path is None:
+        from app.core.app_paths import config_dir
+
+        path = config_dir() / "dayz_servers.json"
+    try:
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        log_warning(f"[A2S] cannot read server list {path}: {exc}")
+        return []
+    targets: Dict[Target, None] = {}
+    for section in ("favorites", "known_servers"):
+        entries = doc.get(section) if isinstance(doc, dict) else None
+        if entries is not None and not isinstance(entries, list):
+            log_warning(f"[A2S] {path}: '{section}' should be a list, ignoring it")
+            continue
+        for index, entry in enumerate(entries or ()):
+            target = _parse_target(entry)
+            if target is None:
+                log_warning(
+                    f"[A2S] {path}: skipping {section}[{index}]; expected "
+                    f"\"host:query_port\" or {{\"ip\": ..., \"query_port\": ...}}"
+                )
+                continue
+            targets[target] = None
+    return list(targets)
@@ -28,16 +28,21 @@ Design constraints:
   means the server rate-limited us. We back off, we don't retry tight.
 * **Never blocks the packet hot path.** All I/O on the probe thread.
 * **Free tool.** No external deps — stdlib socket + struct only.
+
+Checking many servers at once (favorites, known servers) goes through
+:mod:`app.network.a2s_engine`, which shares the protocol helpers here.
 """
 
 from __future__ import annotations
 
+import bz2
 import socket
 import struct
 import threading
 import time
+import zlib
 from dataclasses import dataclass, field
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from app.logs.logger import log_error, log_info, log_warning
 
@@ -77,23 +82,94 @@ class A2SSnapshot:
 # ----------------------------------------------------------------------
 # Low-level: single query helpers
 # ----------------------------------------------------------------------
-def _recv_single(sock: socket.socket) -> bytes:
-    """Receive one packet; strip single-packet header. Returns payload
-    starting with the response type byte. Raises on split packets (rare
-    for small queries)."""
-    data, _ = sock.recvfrom(4096)
+_MAX_SPLIT_PARTS = 32
+_MAX_PAYLOAD = 64 * 1024
+
+
+class _SplitAssembler:
+    """Reassembles Source multi-packet responses.
+
+    Each fragment is ``FE FF FF FF | id:int32 | total:u8 | number:u8 |
+    size:u16 | body``. When the id's high bit is set the joined body is
+    bzip2-compressed and the first fragment also carries the
+    decompressed size and CRC32.
+    """
+
+    def __init__(self) -> None:
+        self._parts: Dict[int, Dict[int, bytes]] = {}
+
+    def feed(self, data: bytes) -> Optional[bytes]:
+        """Add one fragment; return the whole packet once complete."""
+        if len(data) < 12:
+            raise ValueError("short split-packet header")
+        pid, total, number, _size = struct.unpack_from("<IBBH", data, 4)
+        if not 0 < total <= _MAX_SPLIT_PARTS or number >= total:
+            raise ValueError(f"bad split-packet index {number}/{total}")
+        parts = self._parts.setdefault(pid, {})
+        parts[number] = data[12:]
+        if len(parts) < total:
+            return None
+        del self._parts[pid]
+        whole = b"".join(parts[i] for i in range(total))
+        if pid & 0x80000000:
+            want, crc = struct.unpack_from("<II", whole)
+            if want > _MAX_PAYLOAD:
+                raise ValueError(f"compressed response too large ({want} bytes)")
+            try:
+                whole = bz2.BZ2Decompressor().decompress(whole[8:], max_length=want)
+            except OSError as exc:
+                raise ValueError(f"bad compressed response: {exc}") from exc
+            if len(whole) != want or zlib.crc32(whole) != crc:
+                raise ValueError("compressed response failed CRC")
+        return whole
+
+
+def _unwrap(data: bytes, assembler: _SplitAssembler) -> Optional[bytes]:
+    """Strip the packet header. Returns the payload (starting with the
+    response type byte), or None while a split response is incomplete."""
     if data[:4] == _HEADER_SPLIT:
-        raise RuntimeError("split-packet response not supported")
-    if data[:4] != _HEADER_SINGLE:
-        raise RuntimeError(f"bad header: {data[:4]!r}")
+        whole = assembler.feed(data)
+        if whole is None:
+            return None
+        data = whole
+    if data[:4] != _HEADER_SINGLE or len(data) < 5:
+        raise ValueError(f"bad header: {data[:4]!r}")
     return data[4:]
 
 
+def _recv_single(sock: socket.socket) -> bytes:
+    """Receive one response; strip the header, reassembling split
+    responses. Returns payload starting with the response type byte."""
+    assembler = _SplitAssembler()
+    while True:
+        data, _ = sock.recvfrom(4096)
+        try:
+            payload = _unwrap(data, assembler)
+        except ValueError as exc:
+            raise RuntimeError(str(exc)) from exc
+        if payload is not None:
+            return payload
+
+
 def _read_cstr(buf: bytes, off: int) -> Tuple[str, int]:
     end = buf.index(b"\x00", off)
     return buf[off:end].decode("utf-8", errors="replace"), end + 1
 
 
+def _parse_info(payload: bytes) -> Tuple[str, int, int]:
+    """``(server_name, players, max_players)`` from an S2A_INFO payload."""
+    off = 2  # skip type byte + protocol byte
+    name, off = _read_cstr(payload, off)
+    _map, off = _read_cstr(payload, off)
+    _folder, off = _read_cstr(payload, off)
+    _game, off = _read_cstr(payload, off)
+    off += 2  # app id (short)
+    players = payload[off]; off += 1
+    max_players = payload[off]; off += 1
+    # remaining fields (bots, server type, env, visibility, vac…) ignored
+    return name, int(players), int(max_players)
+
+
 def query_info_once(
     host: str,
     port: int,
@@ -101,14 +177,26 @@ def query_info_once(
 ) -> A2SSnapshot:
     """One-shot A2S_INFO. Returns a snapshot with player_count or an
     unreachable snapshot on timeout."""
+    return _query_info(host, port, timeout_s)[0]
+
+
+def _query_info(
+    host: str,
+    port: int,
+    timeout_s: float = _DEFAULT_TIMEOUT_S,
+    challenge: Optional[bytes] = None,
+) -> Tuple[A2SSnapshot, Optional[bytes]]:
+    """A2S_INFO, optionally leading with a known *challenge* to skip the
+    handshake round trip. Returns (snapshot, challenge still valid)."""
     t0 = time.time()
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.settimeout(timeout_s)
     try:
-        sock.sendto(_HEADER_SINGLE + _A2S_INFO, (host, port))
+        sock.sendto(_HEADER_SINGLE + _A2S_INFO + (challenge or b""), (host, port))
         payload = _recv_single(sock)
 
-        # Some servers (Source 2008+) require a challenge even for A2S_INFO
+        # Some servers (Source 2008+) require a challenge even for A2S_INFO;
+        # a stale cached one is answered with a fresh challenge too.
         if payload[:1] == bytes([_S2C_CHALLENGE]):
             challenge = payload[1:5]
             sock.sendto(_HEADER_SINGLE + _A2S_INFO + challenge, (host, port))
@@ -119,37 +207,27 @@ def query_info_once(
                 ts=time.time(), reachable=False, player_count=None,
                 max_players=None, server_name=None,
                 error=f"unexpected response byte 0x{payload[0]:02x}",
-            )
-
-        # Parse A2S_INFO response (goldsrc/source combined)
-        off = 2  # skip type byte + protocol byte
-        name, off = _read_cstr(payload, off)
-        _map, off = _read_cstr(payload, off)
-        _folder, off = _read_cstr(payload, off)
-        _game, off = _read_cstr(payload, off)
-        off += 2  # app id (short)
-        players = payload[off]; off += 1
-        max_players = payload[off]; off += 1
-        # remaining fields (bots, server type, env, visibility, vac…) ignored
+            ), challenge
 
+        name, players, max_players = _parse_info(payload)
         return A2SSnapshot(
             ts=time.time(),
             reachable=True,
-            player_count=int(players),
-            max_players=int(max_players),
+            player_count=players,
+            max_players=max_players,
             server_name=name,
             rtt_ms=(time.time() - t0) * 1000.0,
-        )
+        ), challenge
     except socket.timeout:
         return A2SSnapshot(
             ts=time.time(), reachable=False, player_count=None,
             max_players=None, server_name=None, error="timeout",
-        )
+        ), None
     except Exception as exc:  # noqa: BLE001 — probe is best-effort
         return A2SSnapshot(
             ts=time.time(), reachable=False, player_count=None,
             max_players=None, server_name=None, error=str(exc),
-        )
+        ), None
     finally:
         sock.close()
 
@@ -159,20 +237,35 @@ def _query_players_once(
 ) -> Tuple[Tuple[str, ...], Optional[str]]:
     """Best-effort A2S_PLAYER. Returns (names, error). Many servers
     strip names — absence is not failure."""
+    names, error, _ = _query_players(host, port, timeout_s)
+    return names, error
+
+
+def _query_players(
+    host: str,
+    port: int,
+    timeout_s: float = _DEFAULT_TIMEOUT_S,
+    challenge: Optional[bytes] = None,
+) -> Tuple[Tuple[str, ...], Optional[str], Optional[bytes]]:
+    """A2S_PLAYER, reusing a known *challenge* when given. Returns
+    (names, error, challenge still valid)."""
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.settimeout(timeout_s)
     try:
-        # Challenge handshake
-        sock.sendto(_HEADER_SINGLE + _A2S_PLAYER + b"\xff\xff\xff\xff", (host, port))
-        payload = _recv_single(sock)
-        if payload[:1] != bytes([_S2C_CHALLENGE]):
-            return tuple(), f"no challenge (got 0x{payload[0]:02x})"
-        challenge = payload[1:5]
-
-        sock.sendto(_HEADER_SINGLE + _A2S_PLAYER + challenge, (host, port))
+        # Challenge handshake (skipped when the cached challenge holds)
+        sock.sendto(
+            _HEADER_SINGLE + _A2S_PLAYER + (challenge or b"\xff\xff\xff\xff"),
+            (host, port),
+        )
         payload = _recv_single(sock)
+        if payload[:1] == bytes([_S2C_CHALLENGE]):
+            challenge = payload[1:5]
+            sock.sendto(_HEADER_SINGLE + _A2S_PLAYER + challenge, (host, port))
+            payload = _recv_single(sock)
+        elif challenge is None:
+            return tuple(), f"no challenge (got 0x{payload[0]:02x})", None
         if payload[:1] != bytes([_S2A_PLAYER]):
-            return tuple(), f"bad response (0x{payload[0]:02x})"
+            return tuple(), f"bad response (0x{payload[0]:02x})", challenge
 
         count = payload[1]
         off = 2
@@ -182,11 +275,11 @@ def _query_players_once(
             name, off = _read_cstr(payload, off)
             off += 4 + 4  # score (long) + duration (float)
             names.append(name)
-        return tuple(names), None
+        return tuple(names), None, challenge
     except socket.timeout:
-        return tuple(), "timeout"
+        return tuple(), "timeout", None
     except Exception as exc:  # noqa: BLE001
-        return tuple(), str(exc)
+        return tuple(), str(exc), None
     finally:
         sock.close()
 
@@ -268,14 +361,23 @@ class A2SProbe:
 
     # ------------- thread --------------------
     def _run(self) -> None:
+        from app.network.a2s_cache import get_a2s_cache
+
+        # Shared with every other probe / view of this server: a result
+        # no older than one poll interval is as good as our own query.
+        cache = get_a2s_cache()
         backoff = self._interval_s
         while not self._stop.is_set():
-            snap = query_info_once(self._host, self._port, self._timeout_s)
+            snap = cache.get_info(
+                self._host, self._port,
+                timeout_s=self._timeout_s, max_age=self._interval_s,
+            )
 
             roster_names: Tuple[str, ...] = tuple()
             if self._include_roster and snap.reachable:
-                roster_names, roster_err = _query_players_once(
-                    self._host, self._port, self._timeout_s,
+                roster_names, roster_err = cache.get_players(
+                    self._host, self._port,
+                    timeout_s=self._timeout_s, max_age=self._interval_s,
                 )
                 if roster_err and roster_err != "timeout":
                     log_warning(f"[A2S] roster fetch: {roster_err}")
@@ -52,7 +52,7 @@ import threading
 import time
 from typing import Optional, Tuple
 
-from app.core import safe_subprocess
+from app.core import query_cache, safe_subprocess
 from app.core.safe_subprocess import (
     ARP as _SP_ARP,
     IPCONFIG as _SP_IPCONFIG,
@@ -145,7 +145,7 @@ def _gateway_windows() -> Optional[str]:
         log_error("ipconfig path not resolved at startup — skipping")
         return None
     try:
-        result = safe_subprocess.run(
+        result = query_cache.run_query(
             [_SP_IPCONFIG],
             timeout=5.0,
             intent="arp_spoof.gateway_discovery",
@@ -164,7 +164,7 @@ def _gateway_windows() -> Optional[str]:
     if not _SP_ROUTE:
         return None
     try:
-        result = safe_subprocess.run(
+        result = query_cache.run_query(
             [_SP_ROUTE, "print", "0.0.0.0"],
             timeout=5.0,
             intent="arp_spoof.gateway_route_print",
@@ -197,7 +197,7 @@ def _gateway_linux() -> Optional[str]:
         log_error("`ip` binary not found on PATH")
         return None
     try:
-        result = safe_subprocess.run(
+        result = query_cache.run_query(
             [ip_bin, "route", "show", "default"],
             timeout=5.0,
             intent="arp_spoof.gateway_linux",
@@ -236,7 +236,7 @@ def _local_mac_windows(target_ip: Optional[str] = None) -> Optional[bytes]:
             s.connect((target_ip or "8.8.8.8", 80))
             local_ip = s.getsockname()[0]
 
-        result = safe_subprocess.run(
+        result = query_cache.run_query(
             [_SP_IPCONFIG, "/all"],
             timeout=5.0,
             intent="arp_spoof.local_mac_windows",
@@ -345,6 +345,7 @@ def _ping_once(ip: str) -> None:
         )
     except SafeSubprocessError:
         pass
+    query_cache.invalidate(query_cache.ARP_TABLE)
 
 
 def _mac_from_arp_windows(ip: str) -> Optional[bytes]:
@@ -549,7 +550,7 @@ def _get_ip_forwarding_state() -> bool:
     if not _SP_NETSH:
         return False
     try:
-        result = safe_subprocess.run(
+        result = query_cache.run_query(
             [_SP_NETSH, "interface", "ipv4", "show", "global"],
             timeout=5.0,
             intent="arp_spoof.get_ip_forwarding_state",
@@ -600,6 +601,7 @@ def _set_ip_forwarding(enable: bool) -> bool:
             timeout=10.0,
             intent="arp_spoof.set_ip_forwarding",
         )
+        query_cache.invalidate("arp_spoof.get_ip_forwarding_state")
         log_info(f"IP forwarding {state}")
         return True
     except SafeSubprocessError as e:
@@ -0,0 +1,315 @@
+# app/network/connection_tracker.py — Incremental socket table for the mapper
+"""Connection tracking with per-sample diffs for the Network Tools mapper.
+
+The connection mapper used to call ``psutil.net_connections()`` every
+three seconds and hand the whole list to the GUI, which cleared and
+repopulated its table and rebuilt the topology text each time — on a
+machine with a browser and a game launcher open that is thousands of
+rows recreated per tick, nearly all of them unchanged.
+
+:class:`ConnectionTracker` keeps the last sample keyed by
+:class:`ConnectionKey` — ``(laddr, raddr, proto, pid)`` — and turns each
+new sample into a :class:`ConnectionDiff` of added, removed and changed
+connections (a state transition, or a hostname or process name arriving
+late). Unchanged connections keep their :class:`Connection` object, so a
+quiet sample allocates little beyond psutil's own list.
+
+* Process names come from a pid → name cache; an entry is dropped once
+  its pid no longer owns any socket, so a recycled pid is looked up
+  afresh.
+* Reverse DNS (off by default) is cached per remote IP, capped at
+  :data:`MAX_HOSTNAMES` entries.
+* The sampling thread adapts its interval: it returns to
+  ``min_interval_s`` whenever a sample changed something and doubles up
+  to ``max_interval_s`` while nothing does. :meth:`wake` forces an early
+  sample (e.g. after hostname resolution is switched on).
+
+The tracker is independent of Qt; the widget receives diffs through the
+``on_change`` callback on the sampling thread and forwards them with a
+queued signal.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.logs.logger import log_error
+
+__all__ = [
+    "MAX_HOSTNAMES",
+    "Connection",
+    "ConnectionDiff",
+    "ConnectionKey",
+    "ConnectionTracker",
+]
+
+MAX_HOSTNAMES: int = 512
+
+ConnectionReader = Callable[[], Iterable[Any]]
+ProcessNamer = Callable[[int], str]
+HostResolver = Callable[[str], str]
+
+
+class ConnectionKey(NamedTuple):
+    """Identity of a socket across samples."""
+
+    laddr: Tuple[str, int]
+    raddr: Tuple[str, int]
+    proto: str
+    pid: int
+
+
+@dataclass(frozen=True)
+class Connection:
+    """One remote socket as shown in the mapper."""
+
+    key: ConnectionKey
+    state: str = ""
+    process: str = ""
+    hostname: str = ""
+
+    @property
+    def proto(self) -> str:
+        return self.key.proto
+
+    @property
+    def lport(self) -> int:
+        return self.key.laddr[1]
+
+    @property
+    def rip(self) -> str:
+        return self.key.raddr[0]
+
+    @property
+    def rport(self) -> int:
+        return self.key.raddr[1]
+
+    @property
+    def pid(self) -> int:
+        return self.key.pid
+
+
+@dataclass
+class ConnectionDiff:
+    """Changes between two consecutive samples."""
+
+    added: List[Connection] = field(default_factory=list)
+    removed: List[ConnectionKey] = field(default_factory=list)
+    changed: List[Connection] = field(default_factory=list)
+    total: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def _psutil_connections() -> Iterable[Any]:
+    import psutil
+
+    return psutil.net_connections(kind="inet")
+
+
+def _psutil_process_name(pid: int) -> str:
+    import psutil
+
+    try:
+        return psutil.Process(pid).name()
+    except (psutil.Error, OSError):
+        return ""
+
+
+def _reverse_dns(ip: str) -> str:
+    try:
+        hostname = socket.getfqdn(ip)
+    except Exception:
+        return ""
+    return "" if hostname == ip else hostname
+
+
+def _is_loopback(ip: str) -> bool:
+    return ip.startswith("127.") or ip == "::1"
+
+
+class ConnectionTracker:
+    """Diff successive ``net_connections`` samples. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        reader: Optional[ConnectionReader] = None,
+        process_namer: Optional[ProcessNamer] = None,
+        resolver: Optional[HostResolver] = None,
+        min_interval_s: float = 1.0,
+        max_interval_s: float = 10.0,
+        name: str = "DupeZConnections",
+    ) -> None:
+        self._reader = reader or _psutil_connections
+        self._process_namer = process_namer or _psutil_process_name
+        self._resolver = resolver or _reverse_dns
+        self._min_interval_s = max(0.1, float(min_interval_s))
+        self._max_interval_s = max(self._min_interval_s, float(max_interval_s))
+        self._interval_s = self._min_interval_s
+        self._name = name
+        # Re-entrant so the sampling thread can sample and deliver the
+        # diff as one step: diffs must reach the consumer in order.
+        self._lock = threading.RLock()
+        self._connections: Dict[ConnectionKey, Connection] = {}
+        self._process_names: Dict[int, str] = {}
+        self._hostnames: Dict[str, str] = {}
+        self._resolve_hostnames = False
+        self._stats = {"samples": 0, "unchanged": 0, "process_lookups": 0}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- sampling ----------------------------------------------------------
+
+    @property
+    def resolve_hostnames(self) -> bool:
+        return self._resolve_hostnames
+
+    @resolve_hostnames.setter
+    def resolve_hostnames(self, value: bool) -> None:
+        self._resolve_hostnames = bool(value)
+
+    def sample(self) -> ConnectionDiff:
+        """Read the socket table once and return what changed since the last read."""
+        raw = self._reader()
+        with self._lock:
+            resolve = self._resolve_hostnames
+            previous = self._connections
+            current: Dict[ConnectionKey, Connection] = {}
+            diff = ConnectionDiff()
+            for conn in raw:
+                raddr = conn.raddr
+                if not raddr or _is_loopback(raddr.ip):
+                    continue
+                laddr = conn.laddr
+                key = ConnectionKey(
+                    (laddr.ip, laddr.port) if laddr else ("", 0),
+                    (raddr.ip, raddr.port),
+                    "TCP" if conn.type == socket.SOCK_STREAM else "UDP",
+                    conn.pid or 0,
+                )
+                if key in current:
+                    continue
+                state = getattr(conn, "status", "") or ""
+                process = self._process_name(key.pid)
+                hostname = self._hostname(raddr.ip) if resolve else ""
+                old = previous.get(key)
+                if old is None:
+                    entry = Connection(key, state, process, hostname)
+                    diff.added.append(entry)
+                elif (old.state, old.process, old.hostname) != (state, process, hostname):
+                    entry = Connection(key, state, process, hostname)
+                    diff.changed.append(entry)
+                else:
+                    entry = old
+                current[key] = entry
+            diff.removed = [key for key in previous if key not in current]
+            diff.total = len(current)
+            self._connections = current
+
+            live_pids = {key.pid for key in current}
+            for pid in [p for p in self._process_names if p not in live_pids]:
+                del self._process_names[pid]
+
+            self._stats["samples"] += 1
+            if diff:
+                self._interval_s = self._min_interval_s
+            else:
+                self._stats["unchanged"] += 1
+                self._interval_s = min(self._interval_s * 2, self._max_interval_s)
+            return diff
+
+    # -- readers -----------------------------------------------------------
+
+    @property
+    def interval_s(self) -> float:
+        """Delay before the sampling thread's next read."""
+        return self._interval_s
+
+    def connections(self) -> List[Connection]:
+        with self._lock:
+            return list(self._connections.values())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "connections": len(self._connections),
+                "cached_processes": len(self._process_names),
+                "cached_hostnames": len(self._hostnames),
+            }
+
+    # -- thread lifecycle --------------------------------------------------
+
+    def start(self, on_change: Callable[[ConnectionDiff], None]) -> None:
+        """Sample on a daemon thread, calling *on_change* with each
+        non-empty diff (from that thread)."""
+        if self._thread is not None and self._thread.is_alive() and not self._stop.is_set():
+            return
+        # A fresh event per run: a thread still finishing its last read
+        # after stop() exits on its own event instead of being revived.
+        self._stop = threading.Event()
+        self._interval_s = self._min_interval_s
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop, on_change), daemon=True, name=self._name,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 0.0) -> None:
+        """Stop sampling; waits up to *timeout* for the thread to exit."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if timeout > 0 and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def wake(self) -> None:
+        """Sample now instead of waiting out the current interval."""
+        # No lock: the sampling thread may hold it through slow reverse DNS.
+        self._interval_s = self._min_interval_s
+        self._wake.set()
+
+    def _run(self, stop: threading.Event, on_change: Callable[[ConnectionDiff], None]) -> None:
+        failures = 0
+        while not stop.is_set():
+            try:
+                with self._lock:
+                    diff = self.sample()
+                    if diff and not stop.is_set():
+                        on_change(diff)
+                failures = 0
+            except ImportError:
+                log_error("Connection tracker: psutil is not available")
+                return
+            except Exception as exc:
+                failures += 1
+                if failures == 1:
+                    log_error(f"Connection tracker error: {exc}")
+            self._wake.wait(self._interval_s)
+            self._wake.clear()
+
+    # -- internals ---------------------------------------------------------
+
+    def _process_name(self, pid: int) -> str:
+        """Cached process name for *pid*. Lock held."""
+        if not pid:
+            return ""
+        name = self._process_names.get(pid)
+        if name is None:
+            self._stats["process_lookups"] += 1
+            name = self._process_names[pid] = self._process_namer(pid)
+        return name
+
+    def _hostname(self, ip: str) -> str:
+        """Cached reverse-DNS name for *ip*. Lock held."""
+        hostname = self._hostnames.get(ip)
+        if hostname is None:
+            if len(self._hostnames) >= MAX_HOSTNAMES:
+                self._hostnames.clear()
+            hostname = self._hostnames[ip] = self._resolver(ip)
+        return hostname
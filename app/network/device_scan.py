@@ -3,13 +3,16 @@
 Network device scanner using native Python methods.
 
 Provides ARP-table lookups, ICMP ping, and TCP port probing for
-device discovery on the local /24 subnet.  A thread pool handles
-concurrent scanning with conservative resource limits.
+device discovery on the local /24 subnet.  Subnet sweeps run on the
+asyncio engine in :mod:`app.network.discovery`; the thread pool here
+serves single-host lookups and :func:`scan_ip_batch`.
 """
 
 from __future__ import annotations
 
 import functools
+import itertools
+import os
 import platform
 import re
 import socket
@@ -20,18 +23,21 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 from contextlib import contextmanager
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from app.logs.logger import log_error, log_info
 
 _IS_WINDOWS = platform.system().lower() == "windows"
+from app.network.inventory import DeviceChanges, DeviceInventory, get_inventory
 from app.network.shared import HOSTNAME_VENDORS, lookup_vendor
 from app.utils.helpers import _NO_WINDOW, mask_ip
 
 try:
+    from app.core import query_cache as _query_cache
     from app.core import safe_subprocess as _safe_sp
     from app.core.safe_subprocess import SafeSubprocessError as _SafeSpErr
 except Exception:  # pragma: no cover
+    _query_cache = None  # type: ignore[assignment]
     _safe_sp = None  # type: ignore[assignment]
     _SafeSpErr = Exception  # type: ignore[misc,assignment]
 
@@ -51,6 +57,7 @@ __all__ = [
     "get_device_info_safe",
     "scan_network_range_advanced",
     "scan_devices",
+    "scan_device_changes",
     "scan_devices_full",
     "get_network_info",
     "clear_cache",
@@ -68,12 +75,23 @@ CACHE_DURATION_S: int = 60
 # Concurrent scanning limits.
 _MAX_SCAN_WORKERS: int = 5
 _MAX_CONCURRENT_SOCKETS: int = 10
-# Batch size for IP sweep.
-_SCAN_BATCH_SIZE: int = 10
-# Pause between scan batches (seconds).
-_SCAN_BATCH_PAUSE_S: float = 0.2
 # ARP-table ping-then-retry delay (seconds).
 _ARP_RETRY_DELAY_S: float = 0.1
+# ICMP echo identifier (per process) and sequence numbers (per probe).
+_ICMP_IDENT: int = os.getpid() & 0xFFFF
+_icmp_seq = itertools.count(1)
+
+
+def _is_echo_reply(packet: bytes, ident: int, seq: int) -> bool:
+    """True if *packet* (IP header + ICMP) is the echo reply to ``(ident, seq)``."""
+    if not packet:
+        return False
+    ihl = (packet[0] & 0x0F) * 4
+    if len(packet) < ihl + 8:
+        return False
+    icmp_type, code, _, reply_ident, reply_seq = struct.unpack_from("!BBHHH", packet, ihl)
+    return icmp_type == 0 and code == 0 and reply_ident == ident and reply_seq == seq
+
 
 # ── Error decorator ───────────────────────────────────────────────────
 
@@ -125,20 +143,33 @@ class NativeNetworkScanner:
             return False
 
     def _icmp_ping_windows(self, ip: str) -> bool:
-        """Windows-specific ICMP ping using raw sockets."""
+        """Windows-specific ICMP ping using raw sockets.
+
+        A raw ICMP socket receives every ICMP packet addressed to this
+        host, including replies to other probes running at the same
+        time, so only an echo reply from *ip* carrying this probe's
+        identifier and sequence number counts.
+        """
         sock = None
+        seq = next(_icmp_seq) & 0xFFFF
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
-            sock.settimeout(self.icmp_timeout)
 
-            icmp_header = struct.pack("!BBHHH", 8, 0, 0, 12345, 1)
+            icmp_header = struct.pack("!BBHHH", 8, 0, 0, _ICMP_IDENT, seq)
             icmp_data = b"DupeZ Ping"
             checksum = self._calculate_checksum(icmp_header + icmp_data)
-            icmp_header = struct.pack("!BBHHH", 8, 0, checksum, 12345, 1)
+            icmp_header = struct.pack("!BBHHH", 8, 0, checksum, _ICMP_IDENT, seq)
 
             sock.sendto(icmp_header + icmp_data, (ip, 0))
-            sock.recvfrom(1024)
-            return True
+            deadline = time.monotonic() + self.icmp_timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                sock.settimeout(remaining)
+                packet, addr = sock.recvfrom(1024)
+                if addr[0] == ip and _is_echo_reply(packet, _ICMP_IDENT, seq):
+                    return True
         except socket.timeout:
             return False
         except Exception as e:
@@ -218,11 +249,11 @@ class NativeNetworkScanner:
             if _safe_sp is None:
                 return []
             arp_path = _safe_sp.ARP or _safe_sp.resolve_system_binary("arp")
-            res = _safe_sp.run(
+            res = _query_cache.run_query(
                 [arp_path, "-a"],
                 timeout=5.0,
                 expect_returncode=None,
-                intent="device_scan.windows_arp_enumerate",
+                intent=_query_cache.ARP_TABLE,
             )
             ips: List[str] = []
             for m in re.finditer(r"(\d+\.\d+\.\d+\.\d+)", res.stdout):
@@ -389,53 +420,61 @@ def scan_ip_batch(ip_list: List[str]) -> List[str]:
     return found
 
 
-def get_device_info_safe(ip: str, local_ip: str) -> Optional[Dict]:
-    """Build a device info dict for *ip*.  Returns None on failure."""
+def _resolve_hostname(ip: str) -> str:
+    """Reverse-resolve *ip*; first real hit wins, else ``"Unknown"``."""
+    try:
+        name = socket.getfqdn(ip)
+        if name and name != ip and "." in name:
+            return name
+    except Exception:
+        pass
     try:
-        mac = get_mac_address_safe(ip)
-        vendor = get_vendor_info(mac) if mac else "Unknown"
+        name = socket.gethostbyaddr(ip)[0]
+        if name and name != ip:
+            return name
+    except Exception:
+        pass
+    return "Unknown"
+
+
+def _build_device(
+    ip: str, mac: Optional[str], hostname: str, local_ip: str,
+) -> Dict:
+    """Assemble the device dict the GUI and controller expect."""
+    vendor = get_vendor_info(mac) if mac else "Unknown"
 
-        # Resolve hostname through multiple channels. First real hit wins.
-        hostname = "Unknown"
+    # Override vendor from hostname patterns BEFORE synthesizing a
+    # fallback, since HOSTNAME_VENDORS only matches real names.
+    vendor = HOSTNAME_VENDORS.get(hostname.lower(), vendor)
+
+    # Final fallback: synthesize a readable label so the Hostname
+    # column is never blank/"Unknown" in the GUI. Uses the same
+    # helper as EnhancedNetworkScanner for consistent labels.
+    if not hostname or hostname == "Unknown":
         try:
-            name = socket.getfqdn(ip)
-            if name and name != ip and "." in name:
-                hostname = name
+            from app.network.enhanced_scanner import _synthesize_hostname
+            hostname = _synthesize_hostname(ip, mac or "", vendor or "")
         except Exception:
-            pass
-        if hostname == "Unknown":
-            try:
-                name = socket.gethostbyaddr(ip)[0]
-                if name and name != ip:
-                    hostname = name
-            except Exception:
-                pass
+            hostname = f"device-{ip.replace('.', '-')}"
 
-        # Override vendor from hostname patterns BEFORE synthesizing a
-        # fallback, since HOSTNAME_VENDORS only matches real names.
-        vendor = HOSTNAME_VENDORS.get(hostname.lower(), vendor)
+    return {
+        "ip": ip,
+        "mac": mac or "Unknown",
+        "vendor": vendor,
+        "hostname": hostname,
+        "local": ip == local_ip,
+        "traffic": 0,
+        "last_seen": time.strftime("%H:%M:%S"),
+    }
 
-        # Final fallback: synthesize a readable label so the Hostname
-        # column is never blank/"Unknown" in the GUI. Uses the same
-        # helper as EnhancedNetworkScanner for consistent labels.
-        if not hostname or hostname == "Unknown":
-            try:
-                from app.network.enhanced_scanner import _synthesize_hostname
-                hostname = _synthesize_hostname(ip, mac or "", vendor or "")
-            except Exception:
-                hostname = f"device-{ip.replace('.', '-')}"
-
-        device: Dict = {
-            "ip": ip,
-            "mac": mac or "Unknown",
-            "vendor": vendor,
-            "hostname": hostname,
-            "local": ip == local_ip,
-            "traffic": 0,
-            "last_seen": time.strftime("%H:%M:%S"),
-        }
 
-        log_info(f"Found device: {mask_ip(ip)} ({vendor})")
+def get_device_info_safe(ip: str, local_ip: str) -> Optional[Dict]:
+    """Build a device info dict for *ip*.  Returns None on failure."""
+    try:
+        device = _build_device(
+            ip, get_mac_address_safe(ip), _resolve_hostname(ip), local_ip,
+        )
+        log_info(f"Found device: {mask_ip(ip)} ({device['vendor']})")
         return device
     except Exception as e:
         log_error(f"Device info error for {mask_ip(ip)}: {e}")
@@ -445,70 +484,123 @@ def get_device_info_safe(ip: str, local_ip: str) -> Optional[Dict]:
 @handle_network_error
 def scan_network_range_advanced(
     network: str, start: int = 1, end: int = 254, quick_scan: bool = False,
+    on_device: Optional[Callable[[Dict], None]] = None,
+    inventory: Optional[DeviceInventory] = None,
 ) -> List[Dict]:
-    """Scan a /24 network range for devices."""
-    devices: List[Dict] = []
-    local_ip = get_local_ip()
-    found_ips: List[str] = []
+    """Scan a /24 network range for devices.
 
-    try:
-        scan_range = list(range(1, 255)) if quick_scan else list(range(start, end + 1))
+    Runs on :class:`~app.network.discovery.DiscoveryEngine`: every host
+    is probed concurrently and ARP-cache entries count immediately.
+    *on_device* is called with each device dict as soon as the host is
+    confirmed, and again with the updated dict once its hostname/MAC
+    arrive — consumers should key rows by ``ip``.
 
-        # Scan in small batches
-        for i in range(0, len(scan_range), _SCAN_BATCH_SIZE):
-            batch = scan_range[i : i + _SCAN_BATCH_SIZE]
-            batch_ips = [f"{network}.{n}" for n in batch]
-            found_ips.extend(scan_ip_batch(batch_ips))
-            time.sleep(_SCAN_BATCH_PAUSE_S)
+    With an *inventory*, hosts it saw recently are carried over without
+    probing, cached hostnames are reused within their TTL, and every
+    device is recorded; the caller commits the scan.
+    """
+    from app.network.discovery import DiscoveryEngine, HostFound
 
-        # Supplement with ARP table
-        try:
-            arp_ips = scan_arp_table_safe()
-            for ip in arp_ips:
-                if ip not in found_ips:
-                    found_ips.append(ip)
-        except Exception as e:
-            log_error(f"ARP scan error: {e}")
-
-        # Gather device info in parallel
-        executor = get_executor()
-        futures = [
-            executor.submit(get_device_info_safe, ip, local_ip)
-            for ip in found_ips
-        ]
-        for future in as_completed(futures, timeout=60):
-            try:
-                device = future.result()
-                if device:
-                    devices.append(device)
-            except (TimeoutError, Exception) as e:
-                log_error(f"Device info collection error: {e}")
+    devices: Dict[str, Dict] = {}
+    hostnames: Dict[str, str] = {}
+    resolved: Dict[str, str] = {}
+    macs: Dict[str, Optional[str]] = {}
+    local_ip = get_local_ip()
 
-        devices.sort(key=lambda x: (not x["local"], socket.inet_aton(x["ip"])))
+    def enrich(ip: str, mac: Optional[str]) -> Dict:
+        if inventory is not None:
+            cached = inventory.cached_enrichment(ip, mac, "hostname")
+            if cached is not None:
+                return {"hostname": cached}
+        name = resolved[ip] = _resolve_hostname(ip)
+        return {"hostname": name}
+
+    def publish(ip: str) -> None:
+        device = devices[ip] = _build_device(
+            ip, macs.get(ip), hostnames.get(ip, "Unknown"), local_ip,
+        )
+        if on_device is not None:
+            try:
+                on_device(dict(device))
+            except Exception as e:
+                log_error(f"Device callback error for {mask_ip(ip)}: {e}")
 
+    try:
+        scan_range = range(1, 255) if quick_scan else range(start, end + 1)
+        targets = [f"{network}.{n}" for n in scan_range]
+        if inventory is not None:
+            targets, carried = inventory.plan(targets)
+            for device in carried:
+                devices[device["ip"]] = device
+                if on_device is not None:
+                    on_device(dict(device))
+            log_info(f"Inventory: {len(carried)} fresh device(s) carried over, "
+                     f"probing {len(targets)} address(es)")
+        engine = DiscoveryEngine(
+            tcp_ports=_PROBE_PORTS,
+            tcp_timeout=_native_scanner.port_timeout,
+            icmp_probe=_native_scanner._icmp_ping_windows if _IS_WINDOWS else None,
+            icmp_concurrency=_MAX_SCAN_WORKERS,
+            enricher=enrich,
+        )
+        for event in engine.run(targets):
+            if isinstance(event, HostFound):
+                macs[event.ip] = event.mac
+                publish(event.ip)
+                log_info(
+                    f"Found device: {mask_ip(event.ip)} "
+                    f"({devices[event.ip]['vendor']}, via {event.method})"
+                )
+                continue
+            changed = False
+            if event.info.get("mac") and not macs.get(event.ip):
+                macs[event.ip] = event.info["mac"]
+                changed = True
+            name = event.info.get("hostname")
+            if name and name != "Unknown":
+                hostnames[event.ip] = name
+                changed = True
+            if changed:
+                publish(event.ip)
+        if inventory is not None:
+            for ip in macs:
+                fresh = {"hostname": resolved[ip]} if ip in resolved else None
+                inventory.observe(devices[ip], fresh)
     except Exception as e:
         log_error(f"Advanced network scan error: {e}")
 
-    return devices
+    return sorted(
+        devices.values(),
+        key=lambda x: (not x["local"], socket.inet_aton(x["ip"])),
+    )
 
 
 @handle_network_error
-def scan_devices(quick: bool = True) -> List[Dict]:
-    """Main scan entry point with caching."""
+def scan_devices(
+    quick: bool = True, on_device: Optional[Callable[[Dict], None]] = None,
+) -> List[Dict]:
+    """Main scan entry point with caching.
+
+    *on_device* streams devices as they are found (see
+    :func:`scan_network_range_advanced`); cached results are replayed
+    through it too.
+    """
     global _device_cache, _cache_timestamp
 
     try:
         current_time = time.time()
+        cached: List[Dict] = []
         with _cache_lock:
             if current_time - _cache_timestamp < CACHE_DURATION_S and _device_cache:
                 log_info(f"Using cached device list ({len(_device_cache)} devices)")
-                return list(_device_cache.values())
-
-        local_ip = get_local_ip()
-        network = ".".join(local_ip.split(".")[:-1])
+                cached = list(_device_cache.values())
+        if cached:
+            if on_device is not None:
+                for device in cached:
+                    on_device(dict(device))
+            return cached
 
-        log_info(f"Scanning network: {network}.0/24")
-        devices = scan_network_range_advanced(network, quick_scan=quick)
+        devices, _ = _scan_local_network(quick, on_device, get_inventory())
 
         with _cache_lock:
             _device_cache = {d["ip"]: d for d in devices}
@@ -521,6 +613,38 @@ def scan_devices(quick: bool = True) -> List[Dict]:
         return []
 
 
+def scan_device_changes(
+    quick: bool = True,
+    on_device: Optional[Callable[[Dict], None]] = None,
+    inventory: Optional[DeviceInventory] = None,
+) -> DeviceChanges:
+    """Scan the local /24 and return what changed since the last scan.
+
+    Bypasses the short in-memory cache; the inventory decides what needs
+    probing. ``DeviceChanges.devices`` is the full current list.
+    """
+    _, changes = _scan_local_network(quick, on_device, inventory or get_inventory())
+    return changes
+
+
+def _scan_local_network(
+    quick: bool,
+    on_device: Optional[Callable[[Dict], None]],
+    inventory: DeviceInventory,
+) -> Tuple[List[Dict], DeviceChanges]:
+    local_ip = get_local_ip()
+    network = ".".join(local_ip.split(".")[:-1])
+
+    log_info(f"Scanning network: {network}.0/24")
+    devices = scan_network_range_advanced(
+        network, quick_scan=quick, on_device=on_device, inventory=inventory,
+    )
+    changes = inventory.commit_scan()
+    log_info(f"Inventory diff: +{len(changes.added)} ~{len(changes.changed)} "
+             f"-{len(changes.removed)}")
+    return devices, changes
+
+
 def scan_devices_full() -> List[Dict]:
     """Full network scan (no quick mode)."""
     return scan_devices(quick=False)
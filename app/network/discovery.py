@@ -0,0 +1,324 @@
+# app/network/discovery.py
+"""
+Asyncio LAN discovery engine shared by both scanners.
+
+The old sweeps probed fixed-size batches on a thread pool with a pause
+between batches, then made a second pass for device details; nothing
+reached the GUI until the whole /24 was done. :class:`DiscoveryEngine`
+runs one event loop instead:
+
+* every target is probed concurrently under a host limit
+  (``concurrency``) and a socket limit (``max_sockets``) — no batches,
+  no sleeps;
+* a host is *confirmed* by the first of: a TCP connect to any probe
+  port that is accepted **or refused** (an RST proves the host is up),
+  the optional blocking ``icmp_probe``, or an entry in the ARP cache;
+  ICMP is only tried once every TCP probe has missed, and at most
+  ``icmp_concurrency`` echo probes run at once;
+* the ARP cache is read once at the start and again after probing
+  (probes populate it), so silent devices that only answer ARP — most
+  consoles — still show up, and late MACs are attached;
+* each confirmed host is yielded as a :class:`HostFound` immediately;
+  enrichment (``enricher(ip, mac)`` — reverse DNS, vendor, …) runs as a
+  second stream and arrives later as :class:`HostEnriched`.
+
+:meth:`DiscoveryEngine.events` is the async iterator; :meth:`run` drives
+it from ordinary (worker-thread) code, which is how the thread-based
+scanners and their Qt signals consume it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import platform
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from app.logs.logger import log_error
+
+try:
+    from app.core import query_cache as _query_cache
+    from app.core import safe_subprocess as _safe_sp
+except Exception:  # pragma: no cover
+    _query_cache = None  # type: ignore[assignment]
+    _safe_sp = None  # type: ignore[assignment]
+
+__all__ = [
+    "DEFAULT_TCP_PORTS",
+    "DiscoveryEngine",
+    "HostEnriched",
+    "HostFound",
+    "read_arp_table",
+]
+
+_IS_WINDOWS = platform.system().lower() == "windows"
+
+# Ports probed for liveness: common services plus console/streaming ones.
+DEFAULT_TCP_PORTS = (80, 443, 22, 53, 139, 445, 8080, 8443, 3074, 9295, 62078)
+DEFAULT_CONCURRENCY = 64
+DEFAULT_MAX_SOCKETS = 256
+DEFAULT_TCP_TIMEOUT_S = 0.4
+DEFAULT_ICMP_CONCURRENCY = 8
+DEFAULT_ENRICH_CONCURRENCY = 16
+
+_ARP_PAIR_RE = re.compile(
+    r"(\d{1,3}(?:\.\d{1,3}){3})\s+([0-9a-fA-F]{2}(?:[:-][0-9a-fA-F]{2}){5})"
+)
+_EXCLUDED_PREFIXES = ("169.254.", "224.", "239.", "255.", "0.")
+
+
+@dataclass(frozen=True)
+class HostFound:
+    """A confirmed host. ``method`` is ``arp``, ``tcp`` or ``icmp``."""
+    ip: str
+    mac: Optional[str]
+    method: str
+    rtt_ms: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class HostEnriched:
+    """Extra fields for an already-yielded host (hostname, vendor, mac…)."""
+    ip: str
+    info: Dict[str, Any] = field(default_factory=dict)
+
+
+Event = Union[HostFound, HostEnriched]
+
+
+def _usable_mac(mac: str) -> bool:
+    mac = mac.replace("-", ":").lower()
+    if mac in ("00:00:00:00:00:00", "ff:ff:ff:ff:ff:ff"):
+        return False
+    try:
+        return not int(mac.split(":")[0], 16) & 1  # multicast
+    except ValueError:
+        return False
+
+
+def read_arp_table() -> Dict[str, str]:
+    """``{ip: mac}`` from the OS ARP cache (``/proc/net/arp`` or ``arp -a``)."""
+    table: Dict[str, str] = {}
+    try:
+        if _IS_WINDOWS:
+            if _safe_sp is None:
+                return table
+            arp_path = _safe_sp.ARP or _safe_sp.resolve_system_binary("arp")
+            res = _query_cache.run_query(
+                [arp_path, "-a"], timeout=5.0, expect_returncode=None,
+                intent=_query_cache.ARP_TABLE,
+            )
+            pairs = _ARP_PAIR_RE.findall(res.stdout or "")
+        else:
+            with open("/proc/net/arp", "r") as f:
+                next(f, None)
+                pairs = [
+                    (parts[0], parts[3]) for parts in (line.split() for line in f)
+                    if len(parts) >= 4
+                ]
+        for ip, mac in pairs:
+            if not ip.startswith(_EXCLUDED_PREFIXES) and _usable_mac(mac):
+                table[ip] = mac.replace("-", ":").lower()
+    except Exception as e:
+        log_error(f"ARP table read failed: {e}")
+    return table
+
+
+class DiscoveryEngine:
+    """Concurrent host discovery over asyncio. One instance per sweep
+    configuration; each :meth:`events` / :meth:`run` call is a sweep."""
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_sockets: int = DEFAULT_MAX_SOCKETS,
+        tcp_ports: Sequence[int] = DEFAULT_TCP_PORTS,
+        tcp_timeout: float = DEFAULT_TCP_TIMEOUT_S,
+        icmp_probe: Optional[Callable[[str], bool]] = None,
+        icmp_concurrency: int = DEFAULT_ICMP_CONCURRENCY,
+        arp_reader: Optional[Callable[[], Dict[str, str]]] = read_arp_table,
+        enricher: Optional[Callable[[str, Optional[str]], Optional[Dict[str, Any]]]] = None,
+        enrich_concurrency: int = DEFAULT_ENRICH_CONCURRENCY,
+    ) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self.max_sockets = max(1, int(max_sockets))
+        self.tcp_ports = tuple(tcp_ports)
+        self.tcp_timeout = float(tcp_timeout)
+        self.icmp_probe = icmp_probe
+        self.icmp_concurrency = max(1, int(icmp_concurrency))
+        self.arp_reader = arp_reader
+        self.enricher = enricher
+        self.enrich_concurrency = max(1, int(enrich_concurrency))
+
+    # ── sync bridge ──────────────────────────────────────────────────
+
+    def run(self, ips: Iterable[str]) -> Iterator[Event]:
+        """Yield events from a private event loop on the calling thread."""
+        loop = asyncio.new_event_loop()
+        agen = self.events(ips)
+        try:
+            while True:
+                try:
+                    event = loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield event
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
+
+    # ── async stream ─────────────────────────────────────────────────
+
+    async def events(self, ips: Iterable[str]) -> AsyncIterator[Event]:
+        targets = list(dict.fromkeys(ips))
+        wanted = set(targets)
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(
+            max_workers=self.concurrency + self.enrich_concurrency,
+            thread_name_prefix="Discovery",
+        )
+        queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue()
+        host_sem = asyncio.Semaphore(self.concurrency)
+        sock_sem = asyncio.Semaphore(self.max_sockets)
+        icmp_sem = asyncio.Semaphore(self.icmp_concurrency)
+        enrich_sem = asyncio.Semaphore(self.enrich_concurrency)
+        found: Dict[str, HostFound] = {}
+        arp: Dict[str, str] = {}
+        enrich_tasks: Set[asyncio.Task] = set()
+
+        def blocking(fn, *args):
+            return loop.run_in_executor(pool, fn, *args)
+
+        async def enrich(host: HostFound) -> None:
+            async with enrich_sem:
+                try:
+                    info = await blocking(self.enricher, host.ip, host.mac)
+                except Exception as e:
+                    log_error(f"Discovery enrichment failed for {host.ip}: {e}")
+                    return
+            if info:
+                queue.put_nowait(HostEnriched(host.ip, dict(info)))
+
+        def confirm(ip: str, method: str, rtt_ms: Optional[float] = None) -> None:
+            if ip in found:
+                return
+            host = found[ip] = HostFound(ip, arp.get(ip), method, rtt_ms)
+            queue.put_nowait(host)
+            if self.enricher is not None:
+                task = loop.create_task(enrich(host))
+                enrich_tasks.add(task)
+                task.add_done_callback(enrich_tasks.discard)
+
+        async def read_arp(final: bool) -> None:
+            if self.arp_reader is None:
+                return
+            if final and _query_cache is not None:
+                # Probing just filled the OS ARP cache; a read cached
+                # from before the sweep would hide the new entries.
+                _query_cache.invalidate(_query_cache.ARP_TABLE)
+            try:
+                table = await blocking(self.arp_reader)
+            except Exception as e:
+                log_error(f"Discovery ARP read failed: {e}")
+                return
+            for ip, mac in table.items():
+                if ip not in wanted:
+                    continue
+                known = found.get(ip)
+                if known is None:
+                    arp[ip] = mac
+                    confirm(ip, "arp")
+                elif known.mac is None and ip not in arp and final:
+                    arp[ip] = mac
+                    queue.put_nowait(HostEnriched(ip, {"mac": mac}))
+
+        async def probe(ip: str) -> None:
+            async with host_sem:
+                if ip in found:
+                    return
+                hit = await self._probe_host(ip, sock_sem, icmp_sem, blocking)
+            if hit is not None:
+                confirm(ip, *hit)
+
+        async def drive() -> None:
+            try:
+                await asyncio.gather(read_arp(False), *(probe(ip) for ip in targets))
+                await read_arp(True)
+                while enrich_tasks:
+                    await asyncio.gather(*list(enrich_tasks))
+            finally:
+                queue.put_nowait(None)
+
+        driver = loop.create_task(drive())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            await driver
+        finally:
+            for task in (driver, *enrich_tasks):
+                task.cancel()
+            await asyncio.gather(driver, *enrich_tasks, return_exceptions=True)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _probe_host(self, ip: str, sock_sem, icmp_sem, blocking):
+        """First positive probe as ``(method, rtt_ms)``, or None."""
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+
+        async def tcp(port: int):
+            async with sock_sem:
+                try:
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection(ip, port), self.tcp_timeout,
+                    )
+                except ConnectionRefusedError:
+                    pass  # RST: the host is there, the port is closed
+                except (OSError, asyncio.TimeoutError):
+                    return None
+                else:
+                    writer.close()
+                return "tcp", (loop.time() - t0) * 1000.0
+
+        probes = [loop.create_task(tcp(p)) for p in self.tcp_ports]
+        try:
+            for next_done in asyncio.as_completed(probes):
+                try:
+                    hit = await next_done
+                except Exception:
+                    continue
+                if hit is not None:
+                    return hit
+        finally:
+            for task in probes:
+                task.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+
+        if self.icmp_probe is None:
+            return None
+        # Echo probes are blocking calls (raw sockets or ``ping``
+        # processes); keep them for hosts TCP missed and cap how many
+        # are outstanding.
+        async with icmp_sem:
+            t0 = loop.time()
+            try:
+                alive = await blocking(self.icmp_probe, ip)
+            except Exception:
+                return None
+        return ("icmp", (loop.time() - t0) * 1000.0) if alive else None
@@ -6,6 +6,10 @@ Provides ARP-first device discovery with MAC deduplication, console
 detection (PlayStation, Xbox, Nintendo), and Qt signal integration
 for real-time GUI updates.
 
+IP sweeps run on :class:`app.network.discovery.DiscoveryEngine` and
+stream through ``device_found`` / ``device_updated`` as hosts are
+confirmed and enriched.
+
 NOTE: ``EnhancedNetworkScanner`` inherits ``QObject`` to expose Qt
 signals.  This means it cannot be instantiated without a running
 ``QApplication``.  For headless/test use, call the module-level
@@ -21,7 +25,6 @@ import socket
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
@@ -41,9 +44,11 @@ from app.utils.helpers import _NO_WINDOW, mask_ip
 # argv validation, timeouts, and audit events. Guarded import so the
 # module still imports on non-Windows / test environments.
 try:
+    from app.core import query_cache as _query_cache
     from app.core import safe_subprocess as _safe_sp
     from app.core.safe_subprocess import SafeSubprocessError as _SafeSpErr
 except Exception:  # pragma: no cover
+    _query_cache = None  # type: ignore[assignment]
     _safe_sp = None  # type: ignore[assignment]
     _SafeSpErr = Exception  # type: ignore[misc,assignment]
 
@@ -75,8 +80,10 @@ _IS_WINDOWS = platform.system().lower() == "windows"
 __all__ = ["NetworkDevice", "EnhancedNetworkScanner"]
 
 
-def _run_system_command(argv: List[str], *, timeout: float, intent: str):
-    """Run a system command through safe_subprocess when available."""
+def _run_system_command(argv: List[str], *, timeout: float, intent: str,
+                        cached: bool = False):
+    """Run a system command through safe_subprocess when available.
+    *cached* routes idempotent queries through the shared query cache."""
     if _safe_sp is None:
         return None
     try:
@@ -85,7 +92,8 @@ def _run_system_command(argv: List[str], *, timeout: float, intent: str):
             getattr(_safe_sp, exe_name.upper(), "")
             or _safe_sp.resolve_system_binary(exe_name)
         )
-        return _safe_sp.run(
+        runner = _query_cache.run_query if cached else _safe_sp.run
+        return runner(
             [exe_path, *argv[1:]],
             timeout=timeout,
             expect_returncode=None,
@@ -103,34 +111,22 @@ def _run_system_command(argv: List[str], *, timeout: float, intent: str):
 # literal string "Unknown" — every device shows SOMETHING the user
 # can visually disambiguate, even if the label is synthesized.
 
-def _mdns_lookup(ip: str, timeout: float = 0.6) -> str:
-    """Best-effort mDNS / zeroconf reverse lookup.
+def _mdns_lookup(ip: str) -> str:
+    """Best-effort mDNS reverse lookup.
 
     Many modern consumer devices — PS5, Xbox Series, Apple TV, HomePod,
     Chromecast, smart TVs — never answer traditional reverse DNS but
-    DO answer mDNS on a local hotspot. If the optional ``zeroconf``
-    library isn't installed, this returns "" silently so scans still
-    work on minimal installs.
+    DO answer mDNS on a local hotspot. Goes through the shared
+    :class:`~app.network.mdns.MDNSResolver`, so lookups running at the
+    same time share one query window and answers are cached by TTL.
+    Returns "" on a miss.
     """
     try:
-        from zeroconf import Zeroconf  # type: ignore
+        from app.network.mdns import get_mdns_resolver
+        name = get_mdns_resolver().resolve(ip)
     except Exception:
         return ""
-
-    try:
-        zc = Zeroconf()
-        try:
-            # Reverse PTR via zeroconf's address resolver
-            info = zc.get_service_info("_services._dns-sd._udp.local.", ip)
-            if info and info.server:
-                name = info.server.rstrip(".")
-                if name and name != ip:
-                    return name
-        finally:
-            zc.close()
-    except Exception:
-        pass
-    return ""
+    return name if name and name != ip else ""
 
 
 def _synthesize_hostname(ip: str, mac: str, vendor: str) -> str:
@@ -222,6 +218,9 @@ _SERVICE_NAMES: Dict[int, str] = {
     443: "HTTPS", 993: "IMAPS", 995: "POP3S", 8080: "HTTP-Alt",
 }
 
+# Liveness probe ports for the IP sweep (accepted or refused = host up).
+_SWEEP_PORTS = (80, 443, 22, 21, 23, 25, 53, 110, 143, 993, 995, 8080, 8443)
+
 
 class EnhancedNetworkScanner(QObject):
     """ARP-first network scanner with Qt signal integration.
@@ -231,13 +230,19 @@ class EnhancedNetworkScanner(QObject):
 
     # Qt signals
     device_found = pyqtSignal(dict)
+    device_updated = pyqtSignal(dict)   # hostname/MAC arrived for a found device
     scan_progress = pyqtSignal(int, int)
     scan_complete = pyqtSignal(list)
     scan_error = pyqtSignal(str)
     status_update = pyqtSignal(str)
 
-    def __init__(self, max_threads: int = 20, timeout: int = 1) -> None:
+    def __init__(
+        self, max_threads: int = 20, timeout: int = 1, inventory=None,
+    ) -> None:
         super().__init__()
+        # Optional DeviceInventory: fresh hosts skip the sweep and cached
+        # hostnames are reused instead of re-running DNS/NetBIOS/mDNS.
+        self.inventory = inventory
         self.max_threads = max_threads
         self.timeout = timeout
         self.scan_results: List[Dict] = []
@@ -300,6 +305,11 @@ class EnhancedNetworkScanner(QObject):
                 except ValueError as e:
                     log_error(f"Invalid network_range '{network_range}': {e}")
 
+            if self.inventory is not None:
+                arp_devices = [self._with_cached_hostname(d) for d in arp_devices]
+            for device in arp_devices:
+                self._emit_device(self.device_found, device)
+
             # IP sweep only if ARP found nothing (avoids hotspot ghost IPs)
             if not arp_devices:
                 sweep_range = network_range or "192.168.1.0/24"
@@ -371,53 +381,114 @@ class EnhancedNetworkScanner(QObject):
     # ── IP scanning ───────────────────────────────────────────────
 
     def _scan_ips(self, ip_addresses: List[str], quick_scan: bool) -> List[Dict]:
-        """Scan IPs via thread pool."""
-        devices: List[Dict] = []
+        """Sweep IPs on the asyncio discovery engine.
+
+        ``device_found`` fires as each host is confirmed (TCP, ping or
+        ARP); ``device_updated`` fires when its hostname — and, for a
+        full scan, its open ports — have been resolved in the
+        background. ``max_threads`` bounds the blocking lookups.
+        """
+        from app.network.discovery import DiscoveryEngine, HostFound
+
+        devices: Dict[str, Dict] = {}
+        details: Dict[str, Dict] = {}
+        resolved: Dict[str, Dict] = {}
+        inventory = self.inventory
         try:
             if sys.is_finalizing():
-                return devices
-
-            with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-                future_to_ip = {
-                    executor.submit(self._scan_single_ip, ip, quick_scan): ip
-                    for ip in ip_addresses
-                }
-                for future in as_completed(future_to_ip):
+                return []
+
+            if inventory is not None:
+                ip_addresses, carried = inventory.plan(ip_addresses)
+                for device in carried:
+                    devices[device["ip"]] = device
+                    self._emit_device(self.device_found, device)
+
+            def cached(ip: str, mac: Optional[str], name: str):
+                if inventory is None:
+                    return None
+                return inventory.cached_enrichment(ip, mac, name)
+
+            def enrich(ip: str, mac: Optional[str]) -> Dict:
+                fresh: Dict = {}
+                info: Dict = {"hostname": cached(ip, mac, "hostname")}
+                if info["hostname"] is None:
+                    info["hostname"] = fresh["hostname"] = self._resolve_hostname(ip)
+                if not quick_scan:
+                    held = cached(ip, mac, "ports")
+                    if held is None:
+                        held = fresh["ports"] = self._scan_ports(ip)[0]
+                    info["ports"] = list(held)
+                    info["services"] = [
+                        _SERVICE_NAMES.get(p, f"Unknown-{p}") for p in held
+                    ]
+                resolved[ip] = fresh
+                return info
+
+            engine = DiscoveryEngine(
+                tcp_ports=_SWEEP_PORTS,
+                tcp_timeout=0.5,
+                concurrency=self.max_threads,
+                icmp_probe=self._ping_host,
+                enricher=enrich,
+                enrich_concurrency=self.max_threads,
+            )
+            total = len(ip_addresses)
+            for event in engine.run(ip_addresses):
+                ip = event.ip
+                if isinstance(event, HostFound):
+                    details[ip] = {"mac": event.mac or "Unknown",
+                                   "method": f"sweep_{event.method}"}
+                    devices[ip] = self._sweep_device(ip, details[ip], event.rtt_ms)
+                    self._emit_device(self.device_found, devices[ip])
                     try:
-                        result = future.result()
-                        if result:
-                            devices.append(result)
-                    except Exception as e:
-                        log_error(f"IP scan error: {e}")
+                        self.scan_progress.emit(len(devices), total)
+                    except RuntimeError:
+                        pass
+                    continue
+                details[ip].update(event.info)
+                devices[ip] = self._sweep_device(
+                    ip, details[ip], devices[ip].get("response_time"),
+                )
+                self._emit_device(self.device_updated, devices[ip])
+            if inventory is not None:
+                for ip, detail in details.items():
+                    inventory.observe(devices[ip], resolved.get(ip))
         except RuntimeError as e:
             if "interpreter shutdown" in str(e):
-                log_error("Thread pool failed: interpreter shutting down")
+                log_error("Discovery failed: interpreter shutting down")
             else:
-                log_error("Thread pool failed", exception=e)
+                log_error("Discovery failed", exception=e)
         except Exception as e:
-            log_error("Thread pool failed", exception=e)
-
-        return devices
-
-    def _scan_single_ip(self, ip: str, quick_scan: bool) -> Optional[Dict]:
-        """Probe a single IP using multiple detection methods."""
-        try:
-            if not (self._ping_host(ip) or self._check_arp_table_for_ip(ip)
-                    or self._quick_port_scan(ip) or self._check_dns_resolution(ip)):
-                return None
-
-            mac, hostname = self._get_device_info(ip)
-            device = self._make_device_info(ip, mac, hostname, "multi_method")
+            log_error("Discovery failed", exception=e)
 
-            if not quick_scan:
-                ports, services = self._scan_ports(ip)
-                device["ports"] = ports
-                device["services"] = services
+        return list(devices.values())
 
+    def _sweep_device(self, ip: str, detail: Dict, rtt_ms: Optional[float]) -> Dict:
+        device = self._make_device_info(
+            ip, detail.get("mac", "Unknown"), detail.get("hostname", "Unknown"),
+            detail["method"],
+        )
+        device["response_time"] = rtt_ms or 0.0
+        device["ports"] = detail.get("ports", [])
+        device["services"] = detail.get("services", [])
+        return device
+
+    def _with_cached_hostname(self, device: Dict) -> Dict:
+        name = self.inventory.cached_enrichment(device["ip"], device.get("mac"), "hostname")
+        if not name or name == "Unknown":
             return device
-        except Exception as e:
-            log_error(f"Single IP scan error for {mask_ip(ip)}", exception=e)
-            return None
+        return self._make_device_info(
+            device["ip"], device.get("mac", "Unknown"), name,
+            device.get("detection_method", "unknown"),
+        )
+
+    @staticmethod
+    def _emit_device(signal, device: Dict) -> None:
+        try:
+            signal.emit(dict(device))
+        except RuntimeError:
+            pass  # receiver deleted mid-scan
 
     # ── Device info construction ──────────────────────────────────
 
@@ -482,48 +553,27 @@ class EnhancedNetworkScanner(QObject):
         except Exception:
             return False
 
-    def _get_device_info(self, ip: str) -> Tuple[str, str]:
-        """Return (mac, hostname) for *ip*.
+    def _resolve_hostname(self, ip: str) -> str:
+        """Return a hostname for *ip*, or ``"Unknown"``.
 
-        Hostname resolution is attempted through multiple channels in
-        order; the first non-empty result wins. "" / "Unknown" / an IP
-        literal are all treated as misses so later fallbacks can fire.
+        Resolution is attempted through multiple channels in order; the
+        first non-empty result wins. "" / "Unknown" / an IP literal are
+        all treated as misses so later fallbacks can fire.
 
             1. ``socket.gethostbyaddr`` — reverse DNS via system resolver
             2. ``socket.getfqdn``       — alternate resolver code path
             3. NetBIOS (Windows)        — ``nbtstat -a`` <00> UNIQUE
-            4. mDNS / zeroconf          — answers PS5/Xbox/Apple hotspots
+            4. mDNS (shared resolver)   — answers PS5/Xbox/Apple hotspots
 
         If all four miss, ``_make_device_info`` will synthesize a label
         from vendor + MAC suffix so the GUI column is never empty.
         """
-        mac = "Unknown"
         hostname = "Unknown"
 
         try:
-            # ARP lookup
             clean_ip = _ip_for_argv(ip)
             if clean_ip is None:
-                return mac, hostname
-            arp_stdout = ""
-            if _IS_WINDOWS:
-                res = _run_system_command(
-                    ["arp", "-a", clean_ip],
-                    timeout=5.0,
-                    intent="scanner.arp_query_per_ip",
-                )
-            else:
-                res = _run_system_command(
-                    ["arp", "-n", clean_ip],
-                    timeout=5.0,
-                    intent="scanner.arp_query_per_ip",
-                )
-            if res and res.returncode == 0:
-                arp_stdout = res.stdout
-            if arp_stdout:
-                m = re.search(r"([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}", arp_stdout)
-                if m:
-                    mac = m.group(0)
+                return hostname
 
             # 1. Reverse DNS
             try:
@@ -564,8 +614,8 @@ class EnhancedNetworkScanner(QObject):
                 except Exception:
                     pass
 
-            # 4. mDNS / zeroconf fallback — best effort, no-op if lib
-            #    isn't installed. Consoles on a hotspot subnet (PS5,
+            # 4. mDNS fallback — best effort, batched with any other
+            #    lookups in flight. Consoles on a hotspot subnet (PS5,
             #    Xbox, Apple TV) announce themselves here even when
             #    reverse DNS / NetBIOS are silent.
             if hostname == "Unknown":
@@ -574,9 +624,9 @@ class EnhancedNetworkScanner(QObject):
                     hostname = name
 
         except Exception as e:
-            log_error(f"Device info lookup failed for {mask_ip(ip)}", exception=e)
+            log_error(f"Hostname lookup failed for {mask_ip(ip)}", exception=e)
 
-        return mac, hostname
+        return hostname
 
     # ── Console detection ─────────────────────────────────────────
 
@@ -654,25 +704,6 @@ class EnhancedNetworkScanner(QObject):
                 pass
         return ports, services
 
-    def _quick_port_scan(self, ip: str) -> bool:
-        """Return True if any common port is open on *ip*."""
-        for port in [80, 443, 22, 21, 23, 25, 53, 110, 143, 993, 995, 8080, 8443]:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(1)
-                    if sock.connect_ex((ip, port)) == 0:
-                        return True
-            except Exception:
-                continue
-        return False
-
-    def _check_dns_resolution(self, ip: str) -> bool:
-        """Return True if *ip* has a reverse DNS entry."""
-        try:
-            return socket.gethostbyaddr(ip)[0] != ip
-        except Exception:
-            return False
-
     @staticmethod
     def _get_traffic_info(ip: str) -> Tuple[int, int]:
         """Return (bytes_sent, bytes_recv) for connections to *ip*.
@@ -707,13 +738,15 @@ class EnhancedNetworkScanner(QObject):
                 res = _run_system_command(
                     ["arp", "-a"],
                     timeout=5.0,
-                    intent="scanner.arp_table_sweep_windows",
+                    intent=_query_cache.ARP_TABLE,
+                    cached=True,
                 )
             else:
                 res = _run_system_command(
                     ["arp", "-n"],
                     timeout=5.0,
-                    intent="scanner.arp_table_sweep",
+                    intent=_query_cache.ARP_TABLE,
+                    cached=True,
                 )
             if not res or res.returncode != 0:
                 return []
@@ -900,49 +933,6 @@ class EnhancedNetworkScanner(QObject):
     def _is_valid_mac(mac: str) -> bool:
         return bool(_MAC_RE.match(mac))
 
-    # ── ARP cache (avoids per-IP subprocess) ──────────────────────
-
-    _arp_cache_ips: set = set()
-    _arp_cache_time: float = 0.0
-    _arp_cache_lock = threading.Lock()
-    _ARP_CACHE_TTL: float = 10.0
-    _ARP_IP_RE = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
-
-    def _check_arp_table_for_ip(self, ip: str) -> bool:
-        """Return True if *ip* is in the cached ARP table.
-
-        Membership lookup is O(1) against a pre-parsed set of IPs. The
-        prior implementation did a substring scan across the raw ARP
-        output blob, which was O(len(output)) per call and O(N ·
-        len(output)) across a full sweep.
-        """
-        try:
-            now = time.time()
-            with self._arp_cache_lock:
-                if now - self._arp_cache_time > self._ARP_CACHE_TTL or not self._arp_cache_ips:
-                    arp_stdout = ""
-                    if _IS_WINDOWS:
-                        res = _run_system_command(
-                            ["arp", "-a"],
-                            timeout=5.0,
-                            intent="scanner.arp_cache_refresh",
-                        )
-                    else:
-                        res = _run_system_command(
-                            ["arp", "-n"],
-                            timeout=5.0,
-                            intent="scanner.arp_cache_refresh",
-                        )
-                    arp_stdout = res.stdout if res and res.returncode == 0 else ""
-                    if arp_stdout:
-                        self._arp_cache_ips = set(self._ARP_IP_RE.findall(arp_stdout))
-                    else:
-                        self._arp_cache_ips = set()
-                    self._arp_cache_time = now
-                return ip in self._arp_cache_ips
-        except Exception:
-            return False
-
     # ── GUI compatibility methods ─────────────────────────────────
 
     def start(self) -> None:
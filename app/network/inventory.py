@@ -0,0 +1,333 @@
+# app/network/inventory.py
+"""
+Persistent LAN device inventory.
+
+Scans used to start from nothing: every re-scan probed the whole /24
+and re-ran reverse DNS / NetBIOS / mDNS for devices we already knew,
+and the only memory between launches was a flat device list.
+:class:`DeviceInventory` keeps one entry per device, keyed by MAC (or
+``ip:<addr>`` until a MAC is known), with:
+
+* ``first_seen`` / ``last_seen`` epoch times — a host seen within
+  ``fresh_s`` is not re-probed (:meth:`DeviceInventory.plan`), and one
+  not seen for ``age_out_s`` is dropped;
+* enrichment results (``hostname``, ``ports``…) stamped with when they
+  were resolved, reused until their per-field TTL runs out
+  (:meth:`DeviceInventory.cached_enrichment`);
+* the set of devices present after the last scan, so
+  :meth:`DeviceInventory.commit_scan` can report a
+  :class:`DeviceChanges` diff instead of a whole new list.
+
+The inventory is saved through the persistence layer as
+``device_inventory.json`` after every committed scan.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.logs.logger import log_error, log_info
+
+__all__ = [
+    "DeviceChanges",
+    "DeviceInventory",
+    "get_inventory",
+]
+
+DATA_TYPE = "device_inventory"
+SCHEMA_VERSION = 1
+
+DEFAULT_FRESH_S = 120.0
+DEFAULT_AGE_OUT_S = 7 * 24 * 3600.0
+DEFAULT_ENRICH_TTLS: Dict[str, float] = {
+    "hostname": 6 * 3600.0,
+    "ports": 3600.0,
+}
+
+# Fields whose change makes a device "changed" in the diff.
+_DIFF_FIELDS = ("ip", "mac", "hostname", "vendor")
+
+
+@dataclass
+class DeviceChanges:
+    """Result of one committed scan. ``removed`` holds the last known
+    dicts of devices that were present before and are not now."""
+    added: List[Dict] = field(default_factory=list)
+    changed: List[Dict] = field(default_factory=list)
+    removed: List[Dict] = field(default_factory=list)
+    devices: List[Dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def _mac_key(mac: Optional[str]) -> Optional[str]:
+    if not mac or mac == "Unknown":
+        return None
+    return mac.replace("-", ":").lower()
+
+
+class DeviceInventory:
+    """MAC-keyed device inventory with enrichment TTLs. Thread-safe.
+
+    *store* is anything with the :class:`~app.core.data_persistence.AutoSaveMixin`
+    interface (``load_saved_data`` / ``save_changes``); the default is
+    the ``device_inventory`` data type. ``None`` keeps it in memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        store: Any = "default",
+        fresh_s: float = DEFAULT_FRESH_S,
+        age_out_s: float = DEFAULT_AGE_OUT_S,
+        enrich_ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if store == "default":
+            from app.core.data_persistence import AutoSaveMixin
+            store = AutoSaveMixin(DATA_TYPE)
+        self._store = store
+        self.fresh_s = float(fresh_s)
+        self.age_out_s = float(age_out_s)
+        self.enrich_ttls = dict(DEFAULT_ENRICH_TTLS if enrich_ttls is None else enrich_ttls)
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._present: Set[str] = set()
+        self._seen: Set[str] = set()
+        self._snapshot: Dict[str, Tuple] = {}
+        self._load()
+
+    # ── scan planning ────────────────────────────────────────────────
+
+    def plan(self, ips: Iterable[str]) -> Tuple[List[str], List[Dict]]:
+        """Split *ips* into ``(to_probe, carried)``: addresses that are
+        unknown or stale, and device dicts for hosts seen within
+        ``fresh_s`` that can skip probing this round."""
+        now = self._clock()
+        with self._lock:
+            fresh = {
+                e["device"]["ip"]: e for e in self._entries.values()
+                if now - e["last_seen"] <= self.fresh_s
+            }
+            probe: List[str] = []
+            carried: List[Dict] = []
+            for ip in ips:
+                entry = fresh.get(ip)
+                if entry is None:
+                    probe.append(ip)
+                else:
+                    carried.append(dict(entry["device"]))
+                    self._seen.add(self._key_of(entry["device"]))
+            return probe, carried
+
+    def cached_enrichment(
+        self, ip: str, mac: Optional[str], name: str,
+    ) -> Optional[Any]:
+        """Last resolved value of *name* for the device, if within TTL."""
+        ttl = self.enrich_ttls.get(name)
+        if ttl is None:
+            return None
+        with self._lock:
+            entry = self._find(ip, mac)
+            if entry is None:
+                return None
+            held = entry["enriched"].get(name)
+            if held is None or self._clock() - held["at"] > ttl:
+                return None
+            return held["value"]
+
+    # ── recording ────────────────────────────────────────────────────
+
+    def observe(self, device: Dict, enriched: Optional[Dict[str, Any]] = None) -> None:
+        """Record *device* as seen now. *enriched* holds freshly resolved
+        raw values (e.g. ``{"hostname": "Unknown"}`` for a lookup that
+        missed) whose timestamps restart their TTL."""
+        ip = device.get("ip")
+        if not ip:
+            return
+        now = self._clock()
+        with self._lock:
+            key, ip_key = self._key_of(device), f"ip:{ip}"
+            entry = self._entries.get(key)
+            if key != ip_key and ip_key in self._entries:
+                # MAC learned for a device so far keyed by address.
+                by_ip = self._entries.pop(ip_key)
+                self._seen.discard(ip_key)
+                if ip_key in self._present:
+                    self._present.discard(ip_key)
+                    self._present.add(key)
+                    self._snapshot[key] = self._snapshot.pop(ip_key, ())
+                if entry is None:
+                    entry = by_ip
+            if entry is None and key == ip_key:
+                found = self._find(ip, None)
+                if found is not None:
+                    entry, key = found, self._key_of(found["device"])
+                    device = {**device, "mac": found["device"].get("mac", "Unknown")}
+            if entry is None:
+                entry = {"first_seen": now, "enriched": {}}
+            entry["device"] = dict(device)
+            entry["last_seen"] = now
+            for name, value in (enriched or {}).items():
+                entry["enriched"][name] = {"value": value, "at": now}
+            self._entries[key] = entry
+            self._seen.add(key)
+
+    def commit_scan(self) -> DeviceChanges:
+        """Close the current scan: diff against the previous one, age
+        out old entries and persist."""
+        now = self._clock()
+        with self._lock:
+            seen, previous = self._seen, self._present
+            changes = DeviceChanges()
+            for key in seen:
+                device = dict(self._entries[key]["device"])
+                changes.devices.append(device)
+                if key not in previous:
+                    changes.added.append(device)
+                elif self._snapshot.get(key) != _diff_view(device):
+                    changes.changed.append(device)
+            for key in previous - seen:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    changes.removed.append(dict(entry["device"]))
+            expired = [
+                k for k, e in self._entries.items()
+                if k not in seen and now - e["last_seen"] > self.age_out_s
+            ]
+            for key in expired:
+                del self._entries[key]
+            for bucket in (changes.added, changes.changed, changes.removed, changes.devices):
+                bucket.sort(key=_ip_order)
+            self._present, self._seen = set(seen), set()
+            self._snapshot = {
+                k: _diff_view(self._entries[k]["device"]) for k in self._present
+            }
+        if expired:
+            log_info(f"Device inventory: aged out {len(expired)} device(s)")
+        self.save()
+        return changes
+
+    def record_scan(self, devices: Iterable[Dict]) -> DeviceChanges:
+        """Observe a complete device list and commit it in one go.
+
+        Devices the scanner already recorded this round (observed, or
+        carried over by :meth:`plan`) are left as they are, so a
+        carried host does not look freshly confirmed.
+        """
+        for device in devices:
+            with self._lock:
+                if self._key_of(device) in self._seen:
+                    continue
+            self.observe(device)
+        return self.commit_scan()
+
+    # ── introspection / persistence ──────────────────────────────────
+
+    def devices(self) -> List[Dict]:
+        """Devices present after the last committed scan."""
+        with self._lock:
+            return [dict(self._entries[k]["device"]) for k in self._present
+                    if k in self._entries]
+
+    def entry(self, ip: str, mac: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            found = self._find(ip, mac)
+            return None if found is None else {
+                **found, "device": dict(found["device"]),
+                "enriched": dict(found["enriched"]),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def save(self) -> None:
+        if self._store is None:
+            return
+        with self._lock:
+            data = {
+                "version": SCHEMA_VERSION,
+                "present": sorted(self._present),
+                "entries": {k: dict(e) for k, e in self._entries.items()},
+            }
+        try:
+            self._store.save_changes(data, force=True)
+        except Exception as e:
+            log_error(f"Device inventory save failed: {e}")
+
+    def _load(self) -> None:
+        if self._store is None:
+            return
+        try:
+            data = self._store.load_saved_data({}) or {}
+            if data.get("version") != SCHEMA_VERSION:
+                return
+            entries = {
+                str(k): e for k, e in data.get("entries", {}).items()
+                if isinstance(e, dict) and isinstance(e.get("device"), dict)
+                and isinstance(e.get("last_seen"), (int, float))
+            }
+            for e in entries.values():
+                e.setdefault("first_seen", e["last_seen"])
+                e.setdefault("enriched", {})
+            self._entries = entries
+            self._present = {k for k in data.get("present", []) if k in entries}
+            self._snapshot = {
+                k: _diff_view(entries[k]["device"]) for k in self._present
+            }
+        except Exception as e:
+            log_error(f"Device inventory load failed: {e}")
+
+    # ── internals (lock held) ────────────────────────────────────────
+
+    @staticmethod
+    def _key_of(device: Dict) -> str:
+        return _mac_key(device.get("mac")) or f"ip:{device.get('ip', '')}"
+
+    def _find(self, ip: str, mac: Optional[str]) -> Optional[Dict[str, Any]]:
+        key = _mac_key(mac)
+        if key:
+            # A known MAC that is not in the inventory is a new device,
+            # even on a reused address; only a MAC-less record of that
+            # address can be the same one.
+            return self._entries.get(key) or self._entries.get(f"ip:{ip}")
+        if f"ip:{ip}" in self._entries:
+            return self._entries[f"ip:{ip}"]
+        # Newest entry currently holding this address.
+        best = None
+        for entry in self._entries.values():
+            if entry["device"].get("ip") == ip and (
+                best is None or entry["last_seen"] > best["last_seen"]
+            ):
+                best = entry
+        return best
+
+
+def _ip_order(device: Dict) -> Tuple:
+    try:
+        return tuple(int(p) for p in device.get("ip", "").split("."))
+    except ValueError:
+        return (999,)
+
+
+def _diff_view(device: Dict) -> Tuple:
+    return tuple(device.get(f) for f in _DIFF_FIELDS)
+
+
+_inventory: Optional[DeviceInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> DeviceInventory:
+    """The process-wide inventory, loaded from disk on first use."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = DeviceInventory()
+        return _inventory
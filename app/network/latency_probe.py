@@ -0,0 +1,654 @@
+# app/network/latency_probe.py — Shared multi-target latency sampler
+"""One background thread that measures RTT to every watched target.
+
+The latency overlays used to run one thread per widget, each spawning
+``ping.exe`` once a second through :mod:`app.core.safe_subprocess` and
+regex-parsing its stdout. :class:`LatencyProbeService` replaces that with a
+single sampler: every interval it sends one probe to each watched target
+from one thread and waits for all replies together in one ``select``.
+
+Probe methods, per target:
+
+* **icmp** — echo request on a shared raw ICMP socket (administrator on
+  Windows, root on POSIX) or Linux's unprivileged ``SOCK_DGRAM`` ICMP
+  socket when ``net.ipv4.ping_group_range`` allows it.
+* **tcp**  — non-blocking connect timing. A refused connection is still a
+  reply: the RST comes back from the host, which is what we are timing.
+* **udp**  — a datagram to an unused port; the host's ICMP
+  port-unreachable surfaces as ``ECONNREFUSED`` on the connected socket.
+
+Targets with an explicit port are always timed with TCP connect. Otherwise
+ICMP is used when a socket could be opened, and the TCP/UDP fallbacks are
+raced (first reply wins) when it could not.
+
+Each target keeps a fixed-size :class:`LatencyWindow`. Rolling mean,
+jitter, loss and percentiles are recomputed once per sample on the sampler
+thread and published as an immutable :class:`LatencyStats`, so readers
+never sort or average anything themselves.
+"""
+
+from __future__ import annotations
+
+import errno
+import ipaddress
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.logs.logger import log_error, log_info
+
+__all__ = [
+    "LatencyProbeService",
+    "LatencyStats",
+    "LatencyWatch",
+    "LatencyWindow",
+    "get_latency_service",
+    "peek_latency_service",
+    "probe_once",
+]
+
+DEFAULT_INTERVAL_S: float = 1.0
+DEFAULT_TIMEOUT_S: float = 0.9
+DEFAULT_WINDOW: int = 60
+DEFAULT_TCP_PORT: int = 443
+DEFAULT_UDP_PORT: int = 33434  # classic traceroute base port — rarely bound
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+_PAYLOAD_TAG = b"DupeZ-lat"
+
+# connect_ex() results that mean "in progress" rather than "failed".
+_CONNECT_PENDING = {
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    errno.EALREADY,
+    10035,  # WSAEWOULDBLOCK
+}
+# A refusal is an answer from the host, so it still yields an RTT.
+_CONNECT_REFUSED = {errno.ECONNREFUSED, 10061}  # 10061 = WSAECONNREFUSED
+
+ProbeKey = Tuple[str, Optional[int]]
+ProbeResult = Optional[Tuple[float, str]]  # (rtt_ms, method) or None = lost
+StatsCallback = Callable[["LatencyStats"], None]
+
+
+def _clean_target(target: str) -> str:
+    """Accept only IPv4 literals — the same rule the ping helpers enforced."""
+    try:
+        return str(ipaddress.IPv4Address(str(target).strip()))
+    except (ipaddress.AddressValueError, ValueError):
+        raise ValueError(f"not an IPv4 address: {target!r}") from None
+
+
+def _label(key: ProbeKey) -> str:
+    ip, port = key
+    return ip if port is None else f"{ip}:{port}"
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+# ── Rolling statistics ────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class LatencyStats:
+    """Rolling statistics for one target over the last ``window`` samples.
+
+    ``history`` holds the window oldest → newest, ``None`` for lost
+    samples. RTT fields are ``None`` until the first reply arrives.
+    """
+
+    target: str
+    method: str
+    last_ms: Optional[float]
+    mean_ms: Optional[float]
+    jitter_ms: float
+    loss_pct: float
+    min_ms: Optional[float]
+    max_ms: Optional[float]
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    p99_ms: Optional[float]
+    sent: int
+    received: int
+    updated_at: float
+    history: Tuple[Optional[float], ...]
+
+    @property
+    def reachable(self) -> bool:
+        return self.last_ms is not None
+
+    def to_dict(self) -> Dict[str, object]:
+        def _r(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 2)
+
+        return {
+            "target": self.target,
+            "method": self.method,
+            "last_ms": _r(self.last_ms),
+            "mean_ms": _r(self.mean_ms),
+            "jitter_ms": round(self.jitter_ms, 2),
+            "loss_pct": round(self.loss_pct, 1),
+            "p50_ms": _r(self.p50_ms),
+            "p95_ms": _r(self.p95_ms),
+            "p99_ms": _r(self.p99_ms),
+            "sent": self.sent,
+            "received": self.received,
+        }
+
+
+def _percentile(ordered: Sequence[float], pct: int) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))  # integer ceil
+    return ordered[rank - 1]
+
+
+class LatencyWindow:
+    """Fixed-size ring of RTT samples with precomputed statistics."""
+
+    def __init__(self, target: str, size: int = DEFAULT_WINDOW) -> None:
+        self.target = target
+        self._samples: Deque[Optional[float]] = deque(maxlen=max(2, int(size)))
+        self._method = ""
+        self.stats = self._compute(0.0)
+
+    def push(self, rtt_ms: Optional[float], method: str = "", now: float = 0.0) -> LatencyStats:
+        """Record one sample (``None`` = lost) and return the new stats."""
+        self._samples.append(None if rtt_ms is None else float(rtt_ms))
+        if method:
+            self._method = method
+        self.stats = self._compute(now)
+        return self.stats
+
+    def _compute(self, now: float) -> LatencyStats:
+        samples = tuple(self._samples)
+        ok = [value for value in samples if value is not None]
+        ordered = sorted(ok)
+        jitter = 0.0
+        if len(ok) > 1:
+            jitter = sum(abs(b - a) for a, b in zip(ok, ok[1:])) / (len(ok) - 1)
+        return LatencyStats(
+            target=self.target,
+            method=self._method,
+            last_ms=samples[-1] if samples else None,
+            mean_ms=(sum(ok) / len(ok)) if ok else None,
+            jitter_ms=jitter,
+            loss_pct=((len(samples) - len(ok)) / len(samples) * 100.0) if samples else 0.0,
+            min_ms=ordered[0] if ordered else None,
+            max_ms=ordered[-1] if ordered else None,
+            p50_ms=_percentile(ordered, 50),
+            p95_ms=_percentile(ordered, 95),
+            p99_ms=_percentile(ordered, 99),
+            sent=len(samples),
+            received=len(ok),
+            updated_at=now,
+            history=samples,
+        )
+
+
+# ── Probe round ───────────────────────────────────────────────────────
+
+def _open_icmp_socket() -> Tuple[Optional[socket.socket], str]:
+    """Open a raw ICMP socket, or a datagram one where the kernel allows it."""
+    kinds = [("raw", socket.SOCK_RAW)]
+    if hasattr(socket, "SOCK_DGRAM") and os.name != "nt":
+        kinds.append(("dgram", socket.SOCK_DGRAM))
+    for name, kind in kinds:
+        try:
+            sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except (OSError, AttributeError):
+            continue
+        sock.setblocking(False)
+        return sock, name
+    return None, "unavailable"
+
+
+class _Prober:
+    """Send one probe per target and collect every reply in one select."""
+
+    def __init__(
+        self,
+        *,
+        icmp: Optional[bool] = None,
+        fallback: Sequence[str] = ("tcp", "udp"),
+        tcp_port: int = DEFAULT_TCP_PORT,
+        udp_port: int = DEFAULT_UDP_PORT,
+    ) -> None:
+        self._icmp_wanted = icmp
+        self._icmp_sock: Optional[socket.socket] = None
+        self.icmp_mode = "disabled" if icmp is False else "unopened"
+        self._fallback = tuple(m for m in fallback if m in ("tcp", "udp")) or ("tcp",)
+        self._tcp_port = int(tcp_port)
+        self._udp_port = int(udp_port)
+        self._ident = (os.getpid() ^ id(self)) & 0xFFFF
+        self._seq = 0
+
+    def _icmp(self) -> Optional[socket.socket]:
+        if self.icmp_mode == "unopened":
+            self._icmp_sock, self.icmp_mode = _open_icmp_socket()
+            if self._icmp_sock is None and self._icmp_wanted:
+                log_error("Latency probe: ICMP socket unavailable, using fallback timing")
+        return self._icmp_sock
+
+    def close(self) -> None:
+        if self._icmp_sock is not None:
+            try:
+                self._icmp_sock.close()
+            except OSError:
+                pass
+            self._icmp_sock = None
+        if self.icmp_mode in ("raw", "dgram"):
+            self.icmp_mode = "unopened"
+
+    def probe(self, keys: Sequence[ProbeKey], timeout_s: float) -> Dict[ProbeKey, ProbeResult]:
+        results: Dict[ProbeKey, ProbeResult] = {key: None for key in keys}
+        if not keys:
+            return results
+        sel = selectors.DefaultSelector()
+        live: Dict[ProbeKey, List[object]] = {key: [] for key in keys}
+        icmp_pending: Dict[int, Tuple[ProbeKey, float]] = {}
+        icmp_sock = None
+        try:
+            for key in keys:
+                ip, port = key
+                if port is not None:
+                    self._start_tcp(sel, live, results, key, port)
+                    continue
+                sock = self._icmp()
+                if sock is not None and self._send_icmp(sock, ip, key, icmp_pending):
+                    if icmp_sock is None:
+                        icmp_sock = sock
+                        sel.register(sock, selectors.EVENT_READ, ("icmp", None, 0.0))
+                    live[key].append("icmp")
+                    continue
+                for method in self._fallback:
+                    if method == "tcp":
+                        self._start_tcp(sel, live, results, key, self._tcp_port)
+                    else:
+                        self._start_udp(sel, live, key)
+                    if results[key] is not None:
+                        break
+
+            deadline = time.perf_counter() + max(0.01, float(timeout_s))
+            while any(live.values()):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                for sel_key, _mask in sel.select(remaining):
+                    kind, key, started = sel_key.data
+                    now = time.perf_counter()
+                    if kind == "icmp":
+                        self._read_icmp(sel_key.fileobj, now, icmp_pending, results, live)
+                        continue
+                    sock = sel_key.fileobj
+                    if sock not in live.get(key, ()):
+                        continue  # closed earlier in this batch: key resolved
+                    answered = self._answered(kind, sock)
+                    sel.unregister(sock)
+                    sock.close()
+                    live[key].remove(sock)
+                    if answered and results[key] is None:
+                        results[key] = ((now - started) * 1000.0, kind)
+                        self._drop(sel, live, key)
+        finally:
+            for key in list(live):
+                self._drop(sel, live, key)
+            if icmp_sock is not None:
+                try:
+                    sel.unregister(icmp_sock)
+                except (KeyError, ValueError):
+                    pass
+            sel.close()
+        return results
+
+    # -- per-method helpers ------------------------------------------------
+
+    @staticmethod
+    def _drop(sel: selectors.BaseSelector, live: Dict[ProbeKey, List[object]], key: ProbeKey) -> None:
+        for item in live.pop(key, []):
+            if isinstance(item, socket.socket):
+                try:
+                    sel.unregister(item)
+                except (KeyError, ValueError):
+                    pass
+                item.close()
+
+    def _start_tcp(self, sel, live, results, key: ProbeKey, port: int) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        started = time.perf_counter()
+        try:
+            err = sock.connect_ex((key[0], port))
+        except OSError as exc:
+            err = exc.errno or -1
+        if err in _CONNECT_PENDING:
+            sel.register(sock, selectors.EVENT_WRITE, ("tcp", key, started))
+            live[key].append(sock)
+            return
+        sock.close()
+        if err == 0 or err in _CONNECT_REFUSED:
+            results[key] = ((time.perf_counter() - started) * 1000.0, "tcp")
+            self._drop(sel, live, key)
+
+    def _start_udp(self, sel, live, key: ProbeKey) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        try:
+            sock.connect((key[0], self._udp_port))
+            started = time.perf_counter()
+            sock.send(_PAYLOAD_TAG)
+        except OSError:
+            sock.close()
+            return
+        sel.register(sock, selectors.EVENT_READ, ("udp", key, started))
+        live[key].append(sock)
+
+    @staticmethod
+    def _answered(kind: str, sock: socket.socket) -> bool:
+        if kind == "tcp":
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            return err == 0 or err in _CONNECT_REFUSED
+        try:
+            sock.recv(512)
+            return True
+        except (ConnectionRefusedError, ConnectionResetError):
+            return True  # ICMP port unreachable — the host answered
+        except OSError:
+            return False
+
+    def _send_icmp(self, sock: socket.socket, ip: str, key: ProbeKey,
+                   pending: Dict[int, Tuple[ProbeKey, float]]) -> bool:
+        self._seq = (self._seq + 1) & 0xFFFF
+        seq = self._seq
+        payload = _PAYLOAD_TAG + struct.pack("!d", time.time())
+        header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, 0, self._ident, seq)
+        packet = struct.pack(
+            "!BBHHH", _ICMP_ECHO_REQUEST, 0, _checksum(header + payload), self._ident, seq,
+        ) + payload
+        try:
+            pending[seq] = (key, time.perf_counter())
+            sock.sendto(packet, (ip, 0))
+            return True
+        except OSError:
+            pending.pop(seq, None)
+            return False
+
+    def _read_icmp(self, sock, now: float, pending, results, live) -> None:
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            icmp = data
+            if self.icmp_mode == "raw" and data and data[0] >> 4 == 4:
+                icmp = data[(data[0] & 0x0F) * 4:]
+            if len(icmp) < 8:
+                continue
+            kind, _code, _csum, ident, seq = struct.unpack("!BBHHH", icmp[:8])
+            if kind != _ICMP_ECHO_REPLY:
+                continue
+            # The kernel rewrites the identifier on datagram ICMP sockets.
+            if self.icmp_mode == "raw" and ident != self._ident:
+                continue
+            entry = pending.get(seq)
+            if entry is None or entry[0][0] != addr[0]:
+                continue
+            key, started = pending.pop(seq)
+            if results.get(key) is None:
+                results[key] = ((now - started) * 1000.0, "icmp")
+            live.pop(key, None)
+
+
+# ── Service ───────────────────────────────────────────────────────────
+
+class LatencyWatch:
+    """Handle returned by :meth:`LatencyProbeService.watch`."""
+
+    def __init__(self, service: "LatencyProbeService", key: ProbeKey,
+                 callback: Optional[StatsCallback]) -> None:
+        self._service = service
+        self.key = key
+        self.callback = callback
+        self.closed = False
+
+    @property
+    def target(self) -> str:
+        return _label(self.key)
+
+    @property
+    def stats(self) -> Optional[LatencyStats]:
+        return self._service.stats(*self.key)
+
+    def close(self) -> None:
+        self._service._release(self)
+
+
+class _Target:
+    __slots__ = ("window", "watches")
+
+    def __init__(self, label: str, window: int) -> None:
+        self.window = LatencyWindow(label, window)
+        self.watches: List[LatencyWatch] = []
+
+
+class LatencyProbeService:
+    """Sample RTT to every watched target from one background thread."""
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = DEFAULT_INTERVAL_S,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        window: int = DEFAULT_WINDOW,
+        icmp: Optional[bool] = None,
+        fallback: Sequence[str] = ("tcp", "udp"),
+        tcp_port: int = DEFAULT_TCP_PORT,
+        udp_port: int = DEFAULT_UDP_PORT,
+        prober: Optional[Callable[[Sequence[ProbeKey], float], Dict[ProbeKey, ProbeResult]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "DupeZLatency",
+    ) -> None:
+        self._interval_s = max(0.05, float(interval_s))
+        self._timeout_s = min(max(0.01, float(timeout_s)), self._interval_s)
+        self._window = int(window)
+        self._native = _Prober(icmp=icmp, fallback=fallback,
+                               tcp_port=tcp_port, udp_port=udp_port)
+        self._probe = prober or self._native.probe
+        self._clock = clock
+        self._name = name
+        self._lock = threading.Lock()
+        self._targets: Dict[ProbeKey, _Target] = {}
+        self._next_due = 0.0
+        self._rounds = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- subscriptions -----------------------------------------------------
+
+    def watch(self, target: str, callback: Optional[StatsCallback] = None,
+              *, port: Optional[int] = None) -> LatencyWatch:
+        """Start sampling *target* (shared with other watchers of it).
+
+        *callback* is invoked on the sampler thread with the new
+        :class:`LatencyStats` after every sample. Raises ``ValueError``
+        for anything but an IPv4 literal.
+        """
+        key: ProbeKey = (_clean_target(target), None if port is None else int(port))
+        handle = LatencyWatch(self, key, callback)
+        with self._lock:
+            entry = self._targets.get(key)
+            if entry is None:
+                entry = self._targets[key] = _Target(_label(key), self._window)
+                self._next_due = 0.0  # sample the new target right away
+            entry.watches.append(handle)
+            self.start()
+        self._wake.set()
+        return handle
+
+    def _release(self, handle: LatencyWatch) -> None:
+        with self._lock:
+            handle.closed = True
+            entry = self._targets.get(handle.key)
+            if entry is None or handle not in entry.watches:
+                return
+            entry.watches.remove(handle)
+            if not entry.watches:
+                del self._targets[handle.key]
+
+    # -- readers -----------------------------------------------------------
+
+    def stats(self, target: str, port: Optional[int] = None) -> Optional[LatencyStats]:
+        try:
+            key: ProbeKey = (_clean_target(target), port)
+        except ValueError:
+            return None
+        entry = self._targets.get(key)
+        return entry.window.stats if entry is not None else None
+
+    def snapshot(self) -> Dict[str, LatencyStats]:
+        """Latest stats for every watched target, keyed by ``ip[:port]``."""
+        with self._lock:
+            return {_label(key): entry.window.stats for key, entry in self._targets.items()}
+
+    @property
+    def icmp_mode(self) -> str:
+        """``raw``/``dgram`` when ICMP is in use, else why it is not."""
+        return self._native.icmp_mode
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds
+
+    # -- sampling ----------------------------------------------------------
+
+    def tick(self) -> Optional[float]:
+        """Run one probe round if due. Return seconds until the next one.
+
+        Returns ``None`` when nothing is watched (the thread then sleeps
+        until :meth:`watch` wakes it).
+        """
+        with self._lock:
+            keys = list(self._targets)
+        if not keys:
+            return None
+        started = self._clock()
+        if started < self._next_due:
+            return self._next_due - started
+
+        results = self._probe(keys, self._timeout_s)
+        now = self._clock()
+        deliveries: List[Tuple[LatencyWatch, LatencyStats]] = []
+        with self._lock:
+            self._rounds += 1
+            self._next_due = started + self._interval_s
+            for key in keys:
+                entry = self._targets.get(key)
+                if entry is None:
+                    continue  # unwatched while the round was in flight
+                result = results.get(key)
+                rtt, method = result if result is not None else (None, "")
+                stats = entry.window.push(rtt, method, now)
+                deliveries.extend(
+                    (watch, stats) for watch in entry.watches if watch.callback is not None
+                )
+        for watch, stats in deliveries:
+            self._deliver(watch, stats)
+        return max(0.0, self._next_due - self._clock())
+
+    def _deliver(self, watch: LatencyWatch, stats: LatencyStats) -> None:
+        if watch.closed:
+            return
+        try:
+            watch.callback(stats)
+        except RuntimeError as exc:
+            # A Qt widget was deleted without closing its watch.
+            log_info(f"Latency probe: dropping watch for {watch.target} ({exc})")
+            watch.close()
+        except Exception as exc:
+            log_error(f"Latency probe callback failed for {watch.target}: {exc}")
+
+    # -- thread lifecycle --------------------------------------------------
+
+    def start(self) -> None:
+        if self._stopped.is_set():
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self._name)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stopped.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._native.close()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                delay = self.tick()
+            except Exception as exc:
+                log_error(f"Latency probe round failed: {exc}")
+                delay = self._interval_s
+            self._wake.wait(delay)
+            self._wake.clear()
+        self._native.close()
+
+
+# ── Module-level helpers ──────────────────────────────────────────────
+
+_service: Optional[LatencyProbeService] = None
+_service_lock = threading.Lock()
+
+
+def get_latency_service() -> LatencyProbeService:
+    """Return the process-wide latency sampler, creating it if needed."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = LatencyProbeService()
+    return _service
+
+
+def peek_latency_service() -> Optional[LatencyProbeService]:
+    """Return the shared sampler only if something already created it."""
+    return _service
+
+
+def probe_once(target: str, timeout_s: float = 1.0, *,
+               port: Optional[int] = None) -> Optional[float]:
+    """Measure one RTT to *target* without the background sampler.
+
+    Uses the same ICMP-then-TCP/UDP strategy. Returns milliseconds, or
+    ``None`` on timeout or an invalid target.
+    """
+    try:
+        key: ProbeKey = (_clean_target(target), port)
+    except ValueError:
+        return None
+    prober = _Prober()
+    try:
+        result = prober.probe([key], timeout_s).get(key)
+    finally:
+        prober.close()
+    return result[0] if result is not None else None
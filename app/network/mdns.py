@@ -0,0 +1,312 @@
+# app/network/mdns.py
+"""
+Shared mDNS reverse-name resolver.
+
+Consoles, Apple TVs, Chromecasts and most IoT boxes never answer normal
+reverse DNS but do answer multicast DNS. The scanner used to build a
+``zeroconf.Zeroconf()`` per IP — new multicast sockets and threads each
+time — and block up to 0.6 s on it, sequentially across the subnet.
+
+:class:`MDNSResolver` uses one plain UDP socket per query *window*
+instead, with no third-party dependency:
+
+* callers asking for different IPs at about the same time join one
+  batch (the first caller waits ``gather_s`` for company, then leads);
+* the batch sends reverse ``PTR`` questions for every IP, packed
+  several per packet, to the mDNS group (QU bit set, so answers come
+  back unicast to our ephemeral port), plus one direct unicast query
+  to each IP's port 5353, which many responders also honour;
+* answers (``PTR`` and ``A`` records, answer or additional section)
+  are collected passively until every IP is named or ``window_s``
+  runs out;
+* names are cached for their record TTL (capped at ``max_ttl_s``),
+  misses for ``negative_ttl_s``.
+
+:func:`get_mdns_resolver` returns the process-wide instance.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import select
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.logs.logger import log_error
+
+__all__ = [
+    "MDNSResolver",
+    "get_mdns_resolver",
+]
+
+MDNS_GROUP = "224.0.0.251"
+MDNS_PORT = 5353
+
+DEFAULT_WINDOW_S = 0.6
+DEFAULT_GATHER_S = 0.05
+DEFAULT_NEGATIVE_TTL_S = 60.0
+DEFAULT_MAX_TTL_S = 3600.0
+
+_TYPE_A = 1
+_TYPE_PTR = 12
+_CLASS_IN = 1
+_QU_BIT = 0x8000
+_QUESTIONS_PER_PACKET = 24   # ~30 bytes each: stays well under one MTU
+_MAX_PACKET = 9000
+
+
+def _reverse_name(ip: str) -> str:
+    return ".".join(reversed(ip.split("."))) + ".in-addr.arpa"
+
+
+def _encode_name(name: str) -> bytes:
+    out = bytearray()
+    for label in name.rstrip(".").split("."):
+        raw = label.encode("utf-8")
+        out += bytes([len(raw)]) + raw
+    return bytes(out + b"\x00")
+
+
+def build_query(ips: Iterable[str], *, unicast_response: bool = True) -> bytes:
+    """A standard query with one reverse PTR question per IP."""
+    ips = list(ips)
+    qclass = _CLASS_IN | (_QU_BIT if unicast_response else 0)
+    body = b"".join(
+        _encode_name(_reverse_name(ip)) + struct.pack("!HH", _TYPE_PTR, qclass)
+        for ip in ips
+    )
+    return struct.pack("!HHHHHH", 0, 0, len(ips), 0, 0, 0) + body
+
+
+def _read_name(buf: bytes, off: int) -> Tuple[str, int]:
+    """Decode a (possibly compressed) name; returns ``(name, next_off)``."""
+    labels: List[str] = []
+    end = None
+    for _ in range(128):  # pointer-loop guard
+        length = buf[off]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = off + 2
+            off = ((length & 0x3F) << 8) | buf[off + 1]
+            continue
+        off += 1
+        if length == 0:
+            return ".".join(labels), (end if end is not None else off)
+        labels.append(buf[off:off + length].decode("utf-8", "replace"))
+        off += length
+    raise ValueError("name compression loop")
+
+
+def parse_response(buf: bytes) -> List[Tuple[str, int, int, object]]:
+    """``(owner, type, ttl, value)`` for every PTR/A record in *buf*.
+    PTR values are names, A values dotted quads."""
+    _, flags, qd, an, ns, ar = struct.unpack_from("!HHHHHH", buf, 0)
+    if not flags & 0x8000:
+        return []  # a query, not a response
+    off = 12
+    for _ in range(qd):
+        _, off = _read_name(buf, off)
+        off += 4
+    records = []
+    for _ in range(an + ns + ar):
+        owner, off = _read_name(buf, off)
+        rtype, _, ttl, rdlen = struct.unpack_from("!HHIH", buf, off)
+        off += 10
+        if rtype == _TYPE_PTR:
+            records.append((owner, rtype, ttl, _read_name(buf, off)[0]))
+        elif rtype == _TYPE_A and rdlen == 4:
+            records.append((owner, rtype, ttl, socket.inet_ntoa(buf[off:off + 4])))
+        off += rdlen
+    return records
+
+
+def _ip_from_reverse(owner: str) -> Optional[str]:
+    parts = owner.lower().rstrip(".").split(".")
+    if len(parts) != 6 or parts[4:] != ["in-addr", "arpa"]:
+        return None
+    try:
+        return str(ipaddress.IPv4Address(".".join(reversed(parts[:4]))))
+    except ValueError:
+        return None
+
+
+@dataclass
+class _Batch:
+    ips: Set[str] = field(default_factory=set)
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class MDNSResolver:
+    """Batched, caching mDNS reverse lookups. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        window_s: float = DEFAULT_WINDOW_S,
+        gather_s: float = DEFAULT_GATHER_S,
+        negative_ttl_s: float = DEFAULT_NEGATIVE_TTL_S,
+        max_ttl_s: float = DEFAULT_MAX_TTL_S,
+        group: Tuple[str, int] = (MDNS_GROUP, MDNS_PORT),
+        unicast_port: int = MDNS_PORT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_s = float(window_s)
+        self.gather_s = float(gather_s)
+        self.negative_ttl_s = float(negative_ttl_s)
+        self.max_ttl_s = float(max_ttl_s)
+        self._group = group
+        self._unicast_port = int(unicast_port)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[str, float]] = {}  # ip -> (name, expires)
+        self._gathering: Optional[_Batch] = None
+        self._in_flight: Dict[str, _Batch] = {}
+        self.windows = 0  # query windows opened, for diagnostics/tests
+
+    # ── public API ───────────────────────────────────────────────────
+
+    def cached(self, ip: str) -> Optional[str]:
+        """Cached name (``""`` for a cached miss), or None if unknown."""
+        with self._lock:
+            return self._cached_locked(ip)
+
+    def resolve(self, ip: str) -> str:
+        """mDNS name for *ip*, or ``""``. Joins whatever batch is being
+        gathered, so concurrent callers share one query window."""
+        with self._lock:
+            hit = self._cached_locked(ip)
+            if hit is not None:
+                return hit
+            batch = self._in_flight.get(ip)
+            leader = False
+            if batch is None:
+                batch = self._gathering
+                if batch is None:
+                    batch = self._gathering = _Batch()
+                    leader = True
+                batch.ips.add(ip)
+        if leader:
+            time.sleep(self.gather_s)
+            with self._lock:
+                self._gathering = None
+                for member in batch.ips:
+                    self._in_flight[member] = batch
+            self._run(batch)
+        else:
+            batch.done.wait(self.gather_s + self.window_s + 1.0)
+        return self.cached(ip) or ""
+
+    def resolve_many(self, ips: Iterable[str]) -> Dict[str, str]:
+        """Resolve every IP in one window; ``{ip: name}`` for the hits."""
+        batch = _Batch()
+        with self._lock:
+            for ip in ips:
+                if self._cached_locked(ip) is None and ip not in self._in_flight:
+                    batch.ips.add(ip)
+                    self._in_flight[ip] = batch
+        if batch.ips:
+            self._run(batch)
+        return {ip: name for ip in ips if (name := self.cached(ip))}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # ── internals ────────────────────────────────────────────────────
+
+    def _cached_locked(self, ip: str) -> Optional[str]:
+        held = self._cache.get(ip)
+        if held is None:
+            return None
+        if self._clock() >= held[1]:
+            del self._cache[ip]
+            return None
+        return held[0]
+
+    def _run(self, batch: _Batch) -> None:
+        try:
+            names = self._query(sorted(batch.ips))
+        except Exception as e:
+            log_error(f"mDNS query failed: {e}")
+            names = {}
+        now = self._clock()
+        with self._lock:
+            for ip in batch.ips:
+                name, ttl = names.get(ip, ("", self.negative_ttl_s))
+                self._cache[ip] = (name, now + ttl)
+                if self._in_flight.get(ip) is batch:
+                    del self._in_flight[ip]
+        batch.done.set()
+
+    def _query(self, ips: List[str]) -> Dict[str, Tuple[str, float]]:
+        """One window: send everything, then listen. ``{ip: (name, ttl)}``."""
+        self.windows += 1
+        wanted = set(ips)
+        found: Dict[str, Tuple[str, float]] = {}
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 255)
+            sock.setblocking(False)
+            sock.bind(("", 0))
+            for i in range(0, len(ips), _QUESTIONS_PER_PACKET):
+                self._send(sock, build_query(ips[i:i + _QUESTIONS_PER_PACKET]), self._group)
+            for ip in ips:
+                self._send(sock, build_query([ip], unicast_response=False),
+                           (ip, self._unicast_port))
+
+            deadline = self._clock() + self.window_s
+            while wanted - found.keys():
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                readable, _, _ = select.select([sock], [], [], remaining)
+                if not readable:
+                    break
+                try:
+                    data, _ = sock.recvfrom(_MAX_PACKET)
+                except (BlockingIOError, ConnectionResetError):
+                    continue  # ICMP port unreachable surfaces here on Windows
+                self._absorb(data, wanted, found)
+        finally:
+            sock.close()
+        return found
+
+    @staticmethod
+    def _send(sock: socket.socket, packet: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            sock.sendto(packet, addr)
+        except OSError:
+            pass  # unreachable target / no multicast route: others still go
+
+    def _absorb(self, data: bytes, wanted: Set[str],
+                found: Dict[str, Tuple[str, float]]) -> None:
+        try:
+            records = parse_response(data)
+        except (struct.error, IndexError, ValueError):
+            return
+        for owner, rtype, ttl, value in records:
+            if ttl <= 0:
+                continue  # goodbye record
+            if rtype == _TYPE_PTR:
+                ip, name = _ip_from_reverse(owner), str(value)
+                if ip in wanted:
+                    found[ip] = (name.rstrip("."), min(float(ttl), self.max_ttl_s))
+            elif value in wanted and value not in found:
+                found[str(value)] = (owner.rstrip("."), min(float(ttl), self.max_ttl_s))
+
+
+_resolver: Optional[MDNSResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_mdns_resolver() -> MDNSResolver:
+    """The process-wide resolver (its cache outlives single scans)."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = MDNSResolver()
+        return _resolver
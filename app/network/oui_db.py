@@ -0,0 +1,203 @@
+# app/network/oui_db.py
+"""
+Bundled IEEE OUI database.
+
+Vendor lookups used to fall back from the curated ``VENDOR_OUIS`` table
+to scapy's ``MANUFDB`` — a multi-megabyte import that parses ~50k text
+lines into a dict on first miss, only matches 24-bit OUIs, and is not
+there at all on installs without scapy.
+
+``app/resources/oui.bin`` is a prebuilt, compact copy of the registry
+(built by ``scripts/build_oui_db.py``). It is loaded with one file read
+into flat arrays:
+
+* three sorted key tables — MA-S (36-bit), MA-M (28-bit) and MA-L
+  (24-bit) prefixes — each with a parallel array of name indexes;
+* a string table holding every distinct organisation name once, as
+  UTF-8 with an offset array.
+
+:meth:`OUIDatabase.lookup` binary-searches the longest prefix first, so
+a MAC from a block the IEEE sub-assigned resolves to the sub-assignee
+rather than to the block owner; MACs outside such blocks go straight to
+the 24-bit table.
+
+File layout (little-endian)::
+
+    header   "DZOU", version u16, index width u16 (2 or 4),
+             count36 u32, count28 u32, count24 u32, name count u32
+    36-bit   count36 × u64 keys, count36 × index
+    28-bit   count28 × u32 keys, count28 × index
+    24-bit   count24 × u32 keys, count24 × index
+    names    (name count + 1) × u32 offsets, UTF-8 blob
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from struct import Struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.logs.logger import log_error
+
+__all__ = [
+    "DEFAULT_PATH",
+    "OUIDatabase",
+    "build_database",
+    "get_oui_database",
+]
+
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "oui.bin",
+)
+
+MAGIC = b"DZOU"
+VERSION = 1
+_HEADER = Struct("<4sHHIIII")
+_PREFIX_BITS = (36, 28, 24)  # lookup order: longest first
+_KEY_TYPES = {36: "Q", 28: "I", 24: "I"}
+_SEPARATORS = str.maketrans("", "", ":-. ")
+
+
+def _le_array(typecode: str, data: memoryview) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def _mac_int(mac: str) -> Optional[int]:
+    digits = mac.translate(_SEPARATORS)
+    if len(digits) != 12:
+        return None
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+
+class OUIDatabase:
+    """Read-only OUI → organisation table. Thread-safe once built."""
+
+    def __init__(self, data: bytes) -> None:
+        view = memoryview(data)
+        magic, version, width, n36, n28, n24, n_names = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION or width not in (2, 4):
+            raise ValueError("not an OUI database (bad header)")
+        index_type = "H" if width == 2 else "I"
+        off = _HEADER.size
+        self._tables: List[Tuple[int, array, array]] = []
+        for bits, count in zip(_PREFIX_BITS, (n36, n28, n24)):
+            key_size = array(_KEY_TYPES[bits]).itemsize
+            keys = _le_array(_KEY_TYPES[bits], view[off:off + count * key_size])
+            off += count * key_size
+            names = _le_array(index_type, view[off:off + count * width])
+            off += count * width
+            if len(keys) != count or len(names) != count:
+                raise ValueError("truncated OUI database")
+            self._tables.append((48 - bits, keys, names))
+        # MA-M / MA-S blocks are carved out of a few hundred 24-bit OUIs;
+        # only MACs under one of those need the longer tables searched.
+        self._split = frozenset(
+            k >> (bits - 24) for bits, (_, keys, _) in zip(_PREFIX_BITS[:2], self._tables)
+            for k in keys
+        )
+        self._offsets = _le_array("I", view[off:off + (n_names + 1) * 4])
+        off += (n_names + 1) * 4
+        self._blob = bytes(view[off:])
+        if len(self._offsets) != n_names + 1 or self._offsets[-1] != len(self._blob):
+            raise ValueError("truncated OUI database")
+        self._names: Dict[int, str] = {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "OUIDatabase":
+        with open(path, "rb") as fh:
+            return cls(fh.read())
+
+    def lookup(self, mac: str) -> Optional[str]:
+        """Organisation registered for *mac* (any common notation), or None."""
+        value = _mac_int(mac)
+        if value is None:
+            return None
+        tables = self._tables if value >> 24 in self._split else self._tables[2:]
+        for shift, keys, names in tables:
+            key = value >> shift
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                return self._name(names[i])
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(keys) for _, keys, _ in self._tables)
+
+    def _name(self, index: int) -> str:
+        name = self._names.get(index)
+        if name is None:
+            raw = self._blob[self._offsets[index]:self._offsets[index + 1]]
+            name = self._names.setdefault(index, raw.decode("utf-8"))
+        return name
+
+
+def build_database(entries: Iterable[Tuple[int, int, str]]) -> bytes:
+    """Serialise ``(bits, prefix, name)`` entries — *prefix* being the
+    top *bits* bits of the MAC as an int, *bits* one of 24/28/36.
+    A later duplicate prefix replaces an earlier one."""
+    by_bits: Dict[int, Dict[int, str]] = {bits: {} for bits in _PREFIX_BITS}
+    for bits, prefix, name in entries:
+        if bits not in by_bits:
+            raise ValueError(f"unsupported prefix length /{bits}")
+        if not 0 <= prefix < 1 << bits:
+            raise ValueError(f"prefix {prefix:#x} does not fit in {bits} bits")
+        by_bits[bits][prefix] = name
+
+    interned: Dict[str, int] = {}
+    for bits in _PREFIX_BITS:
+        for name in by_bits[bits].values():
+            interned.setdefault(name, len(interned))
+    width = 2 if len(interned) <= 0xFFFF else 4
+    index_type = "H" if width == 2 else "I"
+
+    def le(arr: array) -> bytes:
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr.tobytes()
+
+    parts = [_HEADER.pack(MAGIC, VERSION, width,
+                          *(len(by_bits[b]) for b in _PREFIX_BITS), len(interned))]
+    for bits in _PREFIX_BITS:
+        table = sorted(by_bits[bits].items())
+        parts.append(le(array(_KEY_TYPES[bits], (k for k, _ in table))))
+        parts.append(le(array(index_type, (interned[n] for _, n in table))))
+    encoded = [name.encode("utf-8") for name in interned]
+    offsets = array("I", [0])
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+    parts.append(le(offsets))
+    parts.append(b"".join(encoded))
+    return b"".join(parts)
+
+
+_database: Optional[OUIDatabase] = None
+_database_tried = False
+_database_lock = threading.Lock()
+
+
+def get_oui_database() -> Optional[OUIDatabase]:
+    """The bundled database, loaded on first use; None if it is missing
+    or unreadable (callers then fall back to other sources)."""
+    global _database, _database_tried
+    with _database_lock:
+        if not _database_tried:
+            _database_tried = True
+            try:
+                _database = OUIDatabase.load()
+            except FileNotFoundError:
+                _database = None
+            except Exception as e:
+                log_error(f"OUI database load failed: {e}")
+                _database = None
+        return _database
@@ -4,13 +4,16 @@ Shared OUI / vendor-lookup tables used by device_scan and enhanced_scanner.
 
 The ``VENDOR_OUIS`` dict maps the first three octets of a MAC address
 (lowercase, colon-separated) to a vendor name.  ``HOSTNAME_VENDORS``
-maps known hostnames (lowercase) to a vendor override.
+maps known hostnames (lowercase) to a vendor override.  Misses go to
+the bundled IEEE registry in :mod:`app.network.oui_db`.
 """
 
 from __future__ import annotations
 
 from typing import Dict
 
+from app.network.oui_db import get_oui_database
+
 __all__ = ["lookup_vendor"]
 
 # Common MAC OUI prefixes -> vendor name
@@ -138,9 +141,8 @@ HOSTNAME_VENDORS: Dict[str, str] = {
 }
 
 
-# Lazy-loaded scapy OUI DB (~35k entries). Imported on first miss in
-# the curated table so we only pay the cost if needed. Falls back to
-# "Unknown" if scapy isn't installed.
+# Lazy-loaded scapy OUI DB. Only consulted when the bundled database
+# (app/resources/oui.bin) is missing from the install.
 _SCAPY_MANUFDB = None
 _SCAPY_MANUFDB_TRIED = False
 
@@ -175,7 +177,8 @@ def lookup_vendor(mac: str) -> str:
 
     Accepts any common MAC format: colon, hyphen, or dot-separated.
     Consults the curated ``VENDOR_OUIS`` table first (fast, gaming-focused),
-    then falls back to scapy's full IEEE OUI database when installed.
+    then the bundled IEEE OUI database (MA-L/MA-M/MA-S prefixes), and
+    scapy's ``MANUFDB`` only if the bundled file is unavailable.
     """
     if not mac or mac.lower() in ("unknown", ""):
         return "Unknown"
@@ -191,4 +194,7 @@ def lookup_vendor(mac: str) -> str:
     hit = VENDOR_OUIS.get(prefix)
     if hit:
         return hit
+    db = get_oui_database()
+    if db is not None:
+        return db.lookup(cleaned) or "Unknown"
     return _scapy_manuf_lookup(cleaned)
@@ -0,0 +1,345 @@
+# app/network/traffic_history.py — Per-interface bandwidth history
+"""Multi-resolution traffic rate history for the Network Tools monitor.
+
+:class:`TrafficSampler` reads ``psutil.net_io_counters(pernic=True)`` once a
+second on a small daemon thread and turns each counter delta into a rate
+using the *measured* monotonic interval, not the nominal one. Rates are
+stored per interface and direction in :class:`MultiResolutionSeries`, a
+stack of array-backed rings:
+
+    ========  ==========  ============
+    tier      step        retention
+    ========  ==========  ============
+    ``1s``    1 second    10 minutes
+    ``10s``   10 seconds  2 hours
+    ``1m``    1 minute    24 hours
+    ========  ==========  ============
+
+Coarser tiers hold the time-weighted mean of the samples in each bucket, so
+a one-minute point is the true average rate over that minute. If sampling
+stalls (machine sleep, a long GIL hold), the missed buckets are filled with
+the average rate over the gap rather than left as zeros.
+
+The sampler is independent of Qt: it keeps collecting while the traffic tab
+is hidden and its refresh timer is parked. Memory is fixed at roughly 44 KB
+per interface.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.logs.logger import log_error
+
+__all__ = [
+    "RESOLUTIONS",
+    "InterfaceRates",
+    "MultiResolutionSeries",
+    "RingBuffer",
+    "TrafficSampler",
+    "downsample",
+    "get_traffic_sampler",
+]
+
+# name -> (step seconds, capacity)
+RESOLUTIONS: Dict[str, Tuple[float, int]] = {
+    "1s": (1.0, 600),
+    "10s": (10.0, 720),
+    "1m": (60.0, 1440),
+}
+
+CounterReader = Callable[[], Dict[str, Any]]
+
+
+class RingBuffer:
+    """Fixed-capacity ring of doubles backed by :class:`array.array`."""
+
+    __slots__ = ("_data", "_head", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        self._data = array("d", bytes(8 * max(1, int(capacity))))
+        self._head = 0  # next write position
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        self._data[self._head] = value
+        self._head = (self._head + 1) % len(self._data)
+        if self._size < len(self._data):
+            self._size += 1
+
+    def fill(self, value: float, count: int) -> None:
+        """Append *value* ``count`` times (bounded by the capacity)."""
+        for _ in range(min(int(count), len(self._data))):
+            self.append(value)
+
+    def values(self, last: Optional[int] = None) -> List[float]:
+        """Return up to *last* values, oldest first."""
+        n = self._size if last is None else max(0, min(int(last), self._size))
+        start = (self._head - n) % len(self._data)
+        if start + n <= len(self._data):
+            return self._data[start:start + n].tolist()
+        return (self._data[start:] + self._data[:self._head]).tolist()
+
+
+class _Tier:
+    __slots__ = ("step", "ring", "_bucket", "_area", "_span")
+
+    def __init__(self, step: float, capacity: int) -> None:
+        self.step = float(step)
+        self.ring = RingBuffer(capacity)
+        self._bucket: Optional[int] = None
+        self._area = 0.0  # rate × seconds accumulated in the open bucket
+        self._span = 0.0
+
+    def add(self, t: float, rate: float, dt: float) -> None:
+        bucket = int(t // self.step)
+        if self._bucket is None:
+            self._bucket = bucket
+        elif bucket != self._bucket:
+            if self._span > 0:
+                self.ring.append(self._area / self._span)
+            skipped = bucket - self._bucket - 1
+            if skipped > 0:
+                self.ring.fill(rate, skipped)
+            self._bucket = bucket
+            self._area = self._span = 0.0
+        self._area += rate * dt
+        self._span += dt
+
+    def values(self, last: Optional[int] = None) -> List[float]:
+        """Closed buckets plus the open one, oldest first."""
+        if self._span <= 0:
+            return self.ring.values(last)
+        limit = self.ring.capacity if last is None else min(int(last), self.ring.capacity)
+        if limit <= 0:
+            return []
+        closed = self.ring.values(limit - 1)
+        closed.append(self._area / self._span)
+        return closed
+
+
+class MultiResolutionSeries:
+    """One rate series kept at every resolution in :data:`RESOLUTIONS`."""
+
+    __slots__ = ("_tiers",)
+
+    def __init__(self, resolutions: Optional[Dict[str, Tuple[float, int]]] = None) -> None:
+        self._tiers = {
+            name: _Tier(step, capacity)
+            for name, (step, capacity) in (resolutions or RESOLUTIONS).items()
+        }
+
+    def add(self, t: float, rate: float, dt: float) -> None:
+        """Record *rate* measured over the *dt* seconds ending at *t*."""
+        for tier in self._tiers.values():
+            tier.add(t, rate, dt)
+
+    def values(self, resolution: str = "1s", last: Optional[int] = None) -> List[float]:
+        return self._tiers[resolution].values(last)
+
+
+def downsample(values: Sequence[float], width: int) -> List[float]:
+    """Reduce *values* to at most *width* points, keeping each chunk's peak.
+
+    Peaks rather than means so a short burst stays visible in a sparkline.
+    """
+    n = len(values)
+    if width <= 0 or n == 0:
+        return []
+    if n <= width:
+        return list(values)
+    out = []
+    for i in range(width):
+        lo = i * n // width
+        hi = max(lo + 1, (i + 1) * n // width)
+        out.append(max(values[lo:hi]))
+    return out
+
+
+@dataclass(frozen=True)
+class InterfaceRates:
+    """Latest counters and rates (bytes per second) for one interface."""
+
+    name: str
+    bytes_sent: int
+    bytes_recv: int
+    sent_rate: float
+    recv_rate: float
+    sampled_at: float
+
+    @property
+    def total_rate(self) -> float:
+        return self.sent_rate + self.recv_rate
+
+
+class _Interface:
+    __slots__ = ("sent", "recv", "latest")
+
+    def __init__(self, latest: InterfaceRates) -> None:
+        self.sent = MultiResolutionSeries()
+        self.recv = MultiResolutionSeries()
+        self.latest = latest
+
+
+def _psutil_counters() -> Dict[str, Any]:
+    import psutil
+
+    return psutil.net_io_counters(pernic=True)
+
+
+class TrafficSampler:
+    """Sample per-interface byte counters into multi-resolution history."""
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = 1.0,
+        reader: Optional[CounterReader] = None,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "DupeZTraffic",
+    ) -> None:
+        self._interval_s = max(0.1, float(interval_s))
+        self._reader = reader or _psutil_counters
+        self._clock = clock
+        self._name = name
+        self._lock = threading.Lock()
+        self._ifaces: Dict[str, _Interface] = {}
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- sampling ----------------------------------------------------------
+
+    def sample(self) -> int:
+        """Read counters once and record rates. Return interfaces updated."""
+        counters = self._reader()
+        now = self._clock()
+        updated = 0
+        with self._lock:
+            self._samples += 1
+            for name, io in counters.items():
+                sent, recv = int(io.bytes_sent), int(io.bytes_recv)
+                entry = self._ifaces.get(name)
+                if entry is None:
+                    self._ifaces[name] = _Interface(
+                        InterfaceRates(name, sent, recv, 0.0, 0.0, now)
+                    )
+                    continue
+                prev = entry.latest
+                dt = now - prev.sampled_at
+                if dt < self._interval_s * 0.25:
+                    # Two reads back to back (e.g. a widget priming the
+                    # sampler just as its thread starts) would turn a few
+                    # bytes into a huge spurious rate; keep the baseline.
+                    continue
+                # Counters reset when an adapter is re-enabled (or wrap on
+                # 32-bit platforms); treat a negative delta as a fresh start.
+                sent_rate = (sent - prev.bytes_sent) / dt if sent >= prev.bytes_sent else 0.0
+                recv_rate = (recv - prev.bytes_recv) / dt if recv >= prev.bytes_recv else 0.0
+                entry.sent.add(now, sent_rate, dt)
+                entry.recv.add(now, recv_rate, dt)
+                entry.latest = InterfaceRates(name, sent, recv, sent_rate, recv_rate, now)
+                updated += 1
+            for gone in set(self._ifaces) - set(counters):
+                del self._ifaces[gone]
+        return updated
+
+    # -- readers -----------------------------------------------------------
+
+    @property
+    def samples(self) -> int:
+        return self._samples
+
+    def latest(self) -> Dict[str, InterfaceRates]:
+        with self._lock:
+            return {name: entry.latest for name, entry in self._ifaces.items()}
+
+    def history(
+        self,
+        name: str,
+        resolution: str = "1s",
+        last: Optional[int] = None,
+    ) -> Tuple[List[float], List[float]]:
+        """``(sent, recv)`` rate series for *name*, oldest first."""
+        with self._lock:
+            entry = self._ifaces.get(name)
+            if entry is None:
+                return [], []
+            return entry.sent.values(resolution, last), entry.recv.values(resolution, last)
+
+    def total_history(
+        self,
+        names: Sequence[str],
+        resolution: str = "1s",
+        last: Optional[int] = None,
+    ) -> List[float]:
+        """Combined sent+recv rate across *names*, aligned on the newest point."""
+        totals: List[float] = []
+        with self._lock:
+            for name in names:
+                entry = self._ifaces.get(name)
+                if entry is None:
+                    continue
+                for series in (entry.sent, entry.recv):
+                    values = series.values(resolution, last)
+                    if len(values) > len(totals):
+                        totals[:0] = [0.0] * (len(values) - len(totals))
+                    offset = len(totals) - len(values)
+                    for i, value in enumerate(values):
+                        totals[offset + i] += value
+        return totals
+
+    # -- thread lifecycle --------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self._name)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            started = self._clock()
+            try:
+                self.sample()
+                failures = 0
+            except Exception as exc:
+                failures += 1
+                if failures == 1:
+                    log_error(f"Traffic sampler error: {exc}")
+            elapsed = self._clock() - started
+            self._stop.wait(max(0.05, self._interval_s - elapsed))
+
+
+_sampler: Optional[TrafficSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_traffic_sampler() -> TrafficSampler:
+    """Return the process-wide sampler, started on first use."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = TrafficSampler()
+    _sampler.start()
+    return _sampler
@@ -9,7 +9,9 @@ Plugin types:
 * :class:`UIPanelPlugin`    — Adds new sidebar views to the dashboard.
 * :class:`GenericPlugin`    — Runs background logic with controller access.
 
-All plugins receive a reference to ``AppController`` on activation.
+All plugins receive a reference to ``AppController`` on activation —
+or, when run out of process by :mod:`app.plugins.host`, a read-only
+stand-in fed with status snapshots.
 """
 
 from __future__ import annotations
@@ -43,6 +45,9 @@ class PluginBase(ABC):
         """Called when the plugin is unloaded.  Clean up resources."""
         ...
 
+    def on_event(self, event: str, payload: Dict[str, Any]) -> None:
+        """Called for each event published to plugins.  Default: ignore."""
+
     @property
     def enabled(self) -> bool:
         return self._enabled
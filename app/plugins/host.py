@@ -0,0 +1,569 @@
+# app/plugins/host.py — Out-of-process plugin host
+"""Run plugins in worker processes instead of the GUI interpreter.
+
+In-process plugins share the GIL with the dashboard and the controller,
+so one CPU-heavy plugin shows up as dropped GUI frames.
+:class:`PluginHostPool` starts one worker process per plugin *group*
+(the manifest's optional ``host_group``, default: the plugin's own name)
+running :mod:`app.plugins.host_worker`, and hands :class:`PluginLoader`
+a proxy instance whose methods are calls into that worker.
+
+Channels per worker:
+
+* control — newline-delimited JSON over the child's stdin/stdout:
+  load / call / stats / stop requests and their replies, plus a one-line
+  ``kick`` when a push finds the worker parked on an empty ring;
+* events — a :class:`~app.plugins.shm_ring.ShmRing` carrying published
+  events and status snapshots (``PluginBase.on_event`` /
+  ``controller.get_status()`` in the worker).
+
+Budgets: every call waits at most ``call_timeout_sec``; a worker that
+misses it is killed, since a busy Python thread cannot be interrupted
+from outside. A call that used more than ``cpu_budget_sec`` of CPU
+earns its plugin a strike, and ``max_strikes`` strikes stop the worker.
+Workers run at lowered OS priority.
+
+Capabilities: unchanged from in-process loading. Calls and events run
+inside :func:`app.plugins.sandbox.plugin_scope` in the worker, and
+threads a plugin starts are held to the group's shared capabilities
+(:func:`~app.plugins.sandbox.set_process_scope`), which in process they
+are not.
+
+UI panel plugins build ``QWidget`` objects and stay in process. Opt in
+with ``DUPEZ_PLUGIN_HOST=1``; frozen builds cannot start
+``python -m app.plugins.host_worker`` and always load in process.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.logs.logger import log_error, log_info, log_warning
+from app.plugins.base import DisruptionPlugin, GenericPlugin, ScannerPlugin
+from app.plugins.sandbox import SandboxViolation
+from app.plugins.shm_ring import DEFAULT_RING_BYTES, ShmRing
+
+__all__ = [
+    "HOSTED_TYPES",
+    "PluginHostError",
+    "PluginHostPool",
+    "PluginHostTimeout",
+    "plugin_host_enabled",
+]
+
+# Plugin types that can run out of process.
+HOSTED_TYPES = frozenset({"generic", "scanner", "disruption"})
+
+CALL_TIMEOUT_SEC = 5.0
+CPU_BUDGET_SEC = 1.0
+MAX_STRIKES = 3
+START_TIMEOUT_SEC = 15.0
+_LATENCY_SAMPLES = 512
+
+
+class PluginHostError(RuntimeError):
+    """A hosted plugin call failed in or because of its worker."""
+
+
+class PluginHostTimeout(PluginHostError):
+    """A hosted plugin call exceeded its wall-clock budget."""
+
+
+def plugin_host_enabled() -> bool:
+    """True if ``DUPEZ_PLUGIN_HOST`` asks for out-of-process plugins."""
+    if getattr(sys, "frozen", False):
+        return False
+    return os.environ.get("DUPEZ_PLUGIN_HOST", "").strip().lower() in {
+        "1", "true", "yes", "on",
+    }
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": ordered[len(ordered) // 2] * 1000.0,
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000.0,
+    }
+
+
+# ── Worker handle ─────────────────────────────────────────────────
+
+class _WorkerHandle:
+    """One worker process: control pipe, event ring, reply demux."""
+
+    def __init__(self, group: str, ring_bytes: int) -> None:
+        self.group = group
+        self.plugins: Dict[str, "_HostedPluginMixin"] = {}
+        self.ring = ShmRing.create(ring_bytes)
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._push_lock = threading.Lock()
+        self._kicked = 0
+        self._pending: Dict[int, List[Any]] = {}
+        self._pending_lock = threading.Lock()
+        self.alive = True
+
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+        try:
+            self.proc = subprocess.Popen(
+                [sys.executable, "-m", "app.plugins.host_worker"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=root,
+                env=env,
+                close_fds=True,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        except OSError:
+            self.ring.close()
+            raise
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self._ready = threading.Event()
+        threading.Thread(
+            target=self._read_replies,
+            name=f"DupeZPluginHost-{group}",
+            daemon=True,
+        ).start()
+        try:
+            self._send({"group": group, "ring": self.ring.name})
+        except OSError:
+            pass
+        if not self._ready.wait(START_TIMEOUT_SEC) or not self.alive:
+            self.kill()
+            raise PluginHostError(f"plugin worker {group!r} failed to start")
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        line = json.dumps(message, default=str).encode("utf-8") + b"\n"
+        with self._write_lock:
+            self.proc.stdin.write(line)
+            self.proc.stdin.flush()
+
+    def _read_replies(self) -> None:
+        for line in self.proc.stdout:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            if reply.get("ready"):
+                self._ready.set()
+                continue
+            with self._pending_lock:
+                slot = self._pending.pop(reply.get("id"), None)
+            if slot is not None:
+                slot[1] = reply
+                slot[0].set()
+        self.alive = False
+        self._ready.set()
+        with self._pending_lock:
+            waiting, self._pending = list(self._pending.values()), {}
+        for slot in waiting:
+            slot[0].set()
+
+    def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        if not self.alive:
+            raise PluginHostError(f"plugin worker {self.group!r} is not running")
+        rid = next(self._ids)
+        slot: List[Any] = [threading.Event(), None]
+        with self._pending_lock:
+            self._pending[rid] = slot
+        try:
+            self._send(dict(message, id=rid))
+        except OSError as e:
+            with self._pending_lock:
+                self._pending.pop(rid, None)
+            raise PluginHostError(f"plugin worker {self.group!r} pipe closed: {e}") from e
+        if not slot[0].wait(timeout):
+            with self._pending_lock:
+                self._pending.pop(rid, None)
+            raise PluginHostTimeout(
+                f"plugin worker {self.group!r} did not answer "
+                f"{message.get('op')} within {timeout:.1f}s"
+            )
+        if slot[1] is None:
+            raise PluginHostError(f"plugin worker {self.group!r} exited")
+        return slot[1]
+
+    def push(self, record: bytes) -> bool:
+        """Queue an event record; kick the worker if it is parked."""
+        if not self.alive:
+            return False
+        with self._push_lock:
+            if not self.alive:
+                return False
+            ok = self.ring.push(record)
+            # Read the park state only after publishing the record: a
+            # worker parking concurrently either sees the record on its
+            # re-check or is already parked here. One kick per park.
+            token = self.ring.park_token() if ok else 0
+            kick = token != 0 and token != self._kicked
+            if kick:
+                self._kicked = token
+        if kick:
+            try:
+                self._send({"op": "kick"})
+            except OSError:
+                pass
+        return ok
+
+    def stop(self, timeout: float) -> None:
+        if self.alive:
+            try:
+                self.request({"op": "stop"}, timeout)
+            except PluginHostError:
+                pass
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        self.kill()
+
+    def kill(self) -> None:
+        self.alive = False
+        if self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        with self._push_lock:
+            try:
+                self.ring.close()
+            except Exception:
+                pass
+
+
+# ── Proxies ───────────────────────────────────────────────────────
+
+class _HostedPluginMixin:
+    """Plugin instance whose methods run in a worker process."""
+
+    def _bind(self, pool: "PluginHostPool", name: str, group: str) -> None:
+        self._pool = pool
+        self._name = name
+        self._group = group
+
+    def _call(self, method: str, *args: Any) -> Any:
+        return self._pool.call(self._name, method, *args)
+
+    def activate(self, controller: Any) -> bool:
+        # Activation happens in the worker at load time.
+        self.controller = controller
+        return self._enabled
+
+    def deactivate(self) -> bool:
+        self._enabled = False
+        return self._pool.unload(self._name)
+
+    def on_event(self, event: str, payload: Dict[str, Any]) -> None:
+        self._pool.publish(event, payload, plugins=[self._name])
+
+
+class HostedGenericPlugin(_HostedPluginMixin, GenericPlugin):
+    pass
+
+
+class HostedScannerPlugin(_HostedPluginMixin, ScannerPlugin):
+    def get_scan_types(self) -> List[str]:
+        return self._call("get_scan_types")
+
+    def scan(self, scan_type: str, params: Optional[Dict] = None) -> List[Dict]:
+        return self._call("scan", scan_type, params)
+
+
+class HostedDisruptionPlugin(_HostedPluginMixin, DisruptionPlugin):
+    def get_methods(self) -> Dict[str, str]:
+        return self._call("get_methods")
+
+    def apply(self, ip: str, method: str, params: Optional[Dict] = None) -> bool:
+        return self._call("apply", ip, method, params)
+
+    def remove(self, ip: str, method: str) -> bool:
+        return self._call("remove", ip, method)
+
+
+_PROXY_TYPES = {
+    "generic": HostedGenericPlugin,
+    "scanner": HostedScannerPlugin,
+    "disruption": HostedDisruptionPlugin,
+}
+
+
+class _PluginStats:
+    __slots__ = ("calls", "timeouts", "strikes", "cpu_sec", "latency")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.timeouts = 0
+        self.strikes = 0
+        self.cpu_sec = 0.0
+        self.latency: "deque[float]" = deque(maxlen=_LATENCY_SAMPLES)
+
+
+# ── Pool ──────────────────────────────────────────────────────────
+
+class PluginHostPool:
+    """Worker processes for out-of-process plugins, one per group.
+
+    Workers start on the first :meth:`load` for their group and stop
+    when their last plugin is unloaded (or on :meth:`shutdown`).
+    """
+
+    def __init__(
+        self,
+        *,
+        call_timeout_sec: float = CALL_TIMEOUT_SEC,
+        cpu_budget_sec: float = CPU_BUDGET_SEC,
+        max_strikes: int = MAX_STRIKES,
+        ring_bytes: int = DEFAULT_RING_BYTES,
+    ) -> None:
+        self.call_timeout_sec = call_timeout_sec
+        self.cpu_budget_sec = cpu_budget_sec
+        self.max_strikes = max_strikes
+        self.ring_bytes = ring_bytes
+        self._lock = threading.RLock()
+        self._workers: Dict[str, _WorkerHandle] = {}
+        self._groups: Dict[str, str] = {}  # plugin -> group
+        self._stats: Dict[str, _PluginStats] = {}
+        self._status_subscription = None
+
+    # ── Lifecycle ────────────────────────────────────────────────
+
+    def _worker(self, group: str) -> _WorkerHandle:
+        with self._lock:
+            worker = self._workers.get(group)
+            if worker is None or not worker.alive:
+                try:
+                    worker = _WorkerHandle(group, self.ring_bytes)
+                except OSError as e:
+                    raise PluginHostError(f"plugin worker {group!r} failed to start: {e}") from e
+                self._workers[group] = worker
+            return worker
+
+    def load(self, manifest: Any) -> _HostedPluginMixin:
+        """Import and activate *manifest*'s plugin in its group's worker.
+
+        Returns the proxy instance; raises :class:`PluginHostError` (or
+        :class:`SandboxViolation` if activation was blocked).
+        """
+        name = manifest.name
+        group = getattr(manifest, "host_group", "") or name
+        proxy_type = _PROXY_TYPES.get(manifest.plugin_type)
+        if proxy_type is None:
+            raise PluginHostError(f"plugin type {manifest.plugin_type!r} cannot be hosted")
+        worker = self._worker(group)
+        reply = worker.request({
+            "op": "load",
+            "plugin": {
+                "name": name,
+                "plugin_dir": manifest.plugin_dir,
+                "entry_point": manifest.entry_point,
+                "plugin_type": manifest.plugin_type,
+                "capabilities": sorted(manifest.capabilities),
+                "entry_sha384": getattr(manifest, "entry_sha384", ""),
+            },
+        }, self.call_timeout_sec)
+        self._raise_for(reply)
+
+        proxy = proxy_type()
+        proxy._bind(self, name, group)
+        proxy._enabled = bool(reply.get("result"))
+        with self._lock:
+            self._groups[name] = group
+            self._stats[name] = _PluginStats()
+            worker.plugins[name] = proxy
+        log_info(f"Plugin '{name}' hosted in worker {group!r} (pid {worker.proc.pid})")
+        return proxy
+
+    def unload(self, name: str) -> bool:
+        """Deactivate *name*; stop its worker if it was the last plugin."""
+        with self._lock:
+            group = self._groups.pop(name, None)
+            worker = self._workers.get(group) if group else None
+            if worker is None:
+                return False
+            worker.plugins.pop(name, None)
+            last = not worker.plugins
+        try:
+            ok = bool(self._call_on(worker, name, "deactivate"))
+        except PluginHostError as e:
+            log_warning(f"Hosted plugin '{name}' deactivate failed: {e}")
+            ok = False
+        if last:
+            with self._lock:
+                if self._workers.get(group) is worker and not worker.plugins:
+                    del self._workers[group]
+            worker.stop(self.call_timeout_sec)
+        return ok
+
+    def shutdown(self) -> None:
+        """Stop every worker (deactivating their plugins)."""
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+            self._groups.clear()
+            sub, self._status_subscription = self._status_subscription, None
+        if sub is not None:
+            sub.close()
+        for worker in workers:
+            for proxy in worker.plugins.values():
+                proxy._enabled = False
+            worker.stop(self.call_timeout_sec)
+
+    # ── Calls ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _raise_for(reply: Dict[str, Any]) -> None:
+        if reply.get("ok"):
+            return
+        message = str(reply.get("error") or "hosted plugin call failed")
+        if reply.get("violation"):
+            raise SandboxViolation(message)
+        raise PluginHostError(message)
+
+    def call(self, name: str, method: str, *args: Any) -> Any:
+        """Invoke *method* on hosted plugin *name* within the budgets."""
+        with self._lock:
+            group = self._groups.get(name)
+            worker = self._workers.get(group) if group else None
+        if worker is None:
+            raise PluginHostError(f"plugin {name!r} is not hosted")
+        return self._call_on(worker, name, method, *args)
+
+    def _call_on(self, worker: _WorkerHandle, name: str, method: str, *args: Any) -> Any:
+        stats = self._stats.setdefault(name, _PluginStats())
+        stats.calls += 1
+        t0 = time.perf_counter()
+        try:
+            reply = worker.request(
+                {"op": "call", "plugin": name, "method": method, "args": list(args)},
+                self.call_timeout_sec,
+            )
+        except PluginHostTimeout:
+            stats.timeouts += 1
+            log_error(
+                f"Hosted plugin '{name}' exceeded {self.call_timeout_sec:.1f}s "
+                f"in {method}() — stopping worker {worker.group!r}"
+            )
+            self._discard(worker)
+            raise
+        stats.latency.append(time.perf_counter() - t0)
+        cpu = float(reply.get("cpu") or 0.0)
+        stats.cpu_sec += cpu
+        if cpu > self.cpu_budget_sec:
+            stats.strikes += 1
+            log_warning(
+                f"Hosted plugin '{name}' used {cpu:.2f}s CPU in {method}() "
+                f"(budget {self.cpu_budget_sec:.2f}s, strike {stats.strikes}/{self.max_strikes})"
+            )
+            if stats.strikes >= self.max_strikes:
+                log_error(f"Hosted plugin '{name}' over CPU budget — stopping worker {worker.group!r}")
+                self._discard(worker)
+        self._raise_for(reply)
+        return reply.get("result")
+
+    def _discard(self, worker: _WorkerHandle) -> None:
+        with self._lock:
+            if self._workers.get(worker.group) is worker:
+                del self._workers[worker.group]
+            for name in worker.plugins:
+                self._groups.pop(name, None)
+                worker.plugins[name]._enabled = False
+        worker.kill()
+
+    # ── Events ───────────────────────────────────────────────────
+
+    def publish(
+        self,
+        event: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        plugins: Optional[List[str]] = None,
+    ) -> int:
+        """Deliver *event* to hosted plugins; returns workers reached.
+
+        Best-effort: an event that does not fit a worker's ring is dropped
+        and counted in :meth:`stats`.
+        """
+        message: Dict[str, Any] = {"k": "event", "e": event, "v": payload or {}}
+        if plugins is not None:
+            message["p"] = list(plugins)
+        record = json.dumps(message, default=str)
+        return self._broadcast(record.encode("utf-8"), plugins)
+
+    def publish_status(self, snapshot: Dict[str, Any]) -> int:
+        """Replace the status snapshot workers' ``controller.get_status()`` returns."""
+        record = json.dumps({"k": "status", "v": snapshot}, default=str)
+        return self._broadcast(record.encode("utf-8"), None)
+
+    def _broadcast(self, record: bytes, plugins: Optional[List[str]]) -> int:
+        with self._lock:
+            if plugins is None:
+                workers = list(self._workers.values())
+            else:
+                groups = {self._groups.get(p) for p in plugins}
+                workers = [w for g, w in self._workers.items() if g in groups]
+        return sum(1 for w in workers if w.push(record))
+
+    def attach_status_bus(self, bus: Any, *, max_rate_hz: float = 1.0) -> None:
+        """Forward every field of an :class:`app.core.status_bus.StatusBus`."""
+        from app.core.status_bus import thaw
+
+        def _forward(update: Any) -> None:
+            if self._workers:
+                self.publish_status(thaw(dict(update.snapshot.values)))
+
+        with self._lock:
+            if self._status_subscription is not None:
+                return
+            self._status_subscription = bus.subscribe(
+                _forward, bus.fields, max_rate_hz=max_rate_hz,
+            )
+
+    # ── Reporting ────────────────────────────────────────────────
+
+    def stats(self, *, timeout: float = 1.0) -> Dict[str, Dict[str, Any]]:
+        """Per-plugin call latency and CPU, merged with worker-side counters."""
+        with self._lock:
+            workers = list(self._workers.values())
+            groups = dict(self._groups)
+            local = dict(self._stats)
+        remote: Dict[str, Dict[str, Any]] = {}
+        for worker in workers:
+            try:
+                reply = worker.request({"op": "stats"}, timeout)
+            except PluginHostError:
+                continue
+            result = reply.get("result") or {}
+            for name, values in (result.get("plugins") or {}).items():
+                remote[name] = dict(
+                    values,
+                    pid=result.get("pid"),
+                    worker_cpu_sec=result.get("process_cpu_sec"),
+                    dropped_events=worker.ring.dropped,
+                )
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, stats in local.items():
+            out[name] = dict(
+                remote.get(name, {}),
+                group=groups.get(name),
+                hosted=name in groups,
+                calls=stats.calls,
+                timeouts=stats.timeouts,
+                strikes=stats.strikes,
+                call_cpu_sec=stats.cpu_sec,
+                call_latency_ms=_percentiles(stats.latency),
+            )
+        return out
@@ -0,0 +1,330 @@
+# app/plugins/host_worker.py — Plugin worker process entry point
+"""Child side of the out-of-process plugin host.
+
+Started by :class:`app.plugins.host.PluginHostPool` as::
+
+    python -m app.plugins.host_worker
+
+The first stdin line is a JSON object ``{"group": ..., "ring": ...}``
+naming this worker's group and the :class:`~app.plugins.shm_ring.ShmRing`
+to read events from. After that stdin carries one JSON request per line
+and stdout one JSON reply per line:
+
+    {"id": 1, "op": "load", "plugin": {...}}         -> import + activate
+    {"id": 2, "op": "call", "plugin": "x", "method": "scan", "args": [...]}
+    {"id": 3, "op": "stats"}
+    {"id": 4, "op": "stop"}
+    {"op": "kick"}                                    -> drain the ring, no reply
+
+Replies are ``{"id": N, "ok": true, "result": ..., "cpu": sec, "wall": sec}``
+or ``{"id": N, "ok": false, "error": "...", "violation": bool}``.
+
+The plugin's own ``print`` output goes to stderr: fd 1 is re-pointed
+there once the protocol has its private copy of the pipe.
+
+Capabilities are enforced by :mod:`app.plugins.sandbox` exactly as in
+process — every call and event runs inside :func:`plugin_scope` — and
+additionally for threads the plugin starts itself, through a process
+scope holding the capabilities every plugin in this worker shares.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.plugins.base import PluginBase
+from app.plugins.loader import import_plugin_class
+from app.plugins.sandbox import (
+    SandboxViolation,
+    activate_sandbox,
+    plugin_scope,
+    set_process_scope,
+)
+from app.plugins.shm_ring import ShmRing
+from app.plugins.signing import _sha384_file
+
+__all__ = ["HostedController", "main"]
+
+# Methods the host may invoke on a plugin instance.
+CALLABLE_METHODS = frozenset({
+    "deactivate",
+    "get_methods",
+    "apply",
+    "remove",
+    "get_scan_types",
+    "scan",
+})
+
+_LATENCY_SAMPLES = 256
+
+
+class HostedController:
+    """Read-only stand-in for ``AppController`` inside a worker.
+
+    Holds the latest status snapshot the host pushed through the ring.
+    """
+
+    def __init__(self) -> None:
+        self._status: Dict[str, Any] = {}
+
+    def update(self, snapshot: Dict[str, Any]) -> None:
+        self._status = snapshot
+
+    def get_status(self) -> Dict[str, Any]:
+        return self._status
+
+    def get_devices(self) -> List[Dict[str, Any]]:
+        return list(self._status.get("devices") or [])
+
+
+class _Hosted:
+    def __init__(self, spec: Dict[str, Any], instance: PluginBase) -> None:
+        self.name: str = spec["name"]
+        self.capabilities = frozenset(spec.get("capabilities") or ())
+        self.instance = instance
+        self.calls = 0
+        self.events = 0
+        self.errors = 0
+        self.violations = 0
+        self.call_cpu = 0.0
+        self.event_cpu = 0.0
+        self.call_wall: "deque[float]" = deque(maxlen=_LATENCY_SAMPLES)
+        self.event_wall: "deque[float]" = deque(maxlen=_LATENCY_SAMPLES)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "events": self.events,
+            "errors": self.errors,
+            "violations": self.violations,
+            "call_cpu_sec": self.call_cpu,
+            "event_cpu_sec": self.event_cpu,
+            "event_wall_ms": _percentiles(self.event_wall),
+        }
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": ordered[len(ordered) // 2] * 1000.0,
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000.0,
+    }
+
+
+def _lower_priority() -> None:
+    """Let the GUI process win CPU contention against plugin work."""
+    try:
+        if hasattr(os, "nice"):
+            os.nice(10)
+        else:
+            import psutil
+
+            psutil.Process().nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+    except Exception:
+        pass
+
+
+class _Worker:
+    def __init__(self, group: str, ring: ShmRing, out) -> None:
+        self.group = group
+        self.ring = ring
+        self._out = out
+        self.controller = HostedController()
+        self.plugins: Dict[str, _Hosted] = {}
+
+    def reply(self, message: Dict[str, Any]) -> None:
+        self._out.write(json.dumps(message, default=str).encode("utf-8") + b"\n")
+        self._out.flush()
+
+    def _timed(self, hosted: _Hosted, fn, *args):
+        """Run ``fn(*args)`` in *hosted*'s scope; return (result, cpu, wall)."""
+        cpu0, wall0 = time.thread_time(), time.perf_counter()
+        try:
+            with plugin_scope(hosted.name, hosted.capabilities):
+                result = fn(*args)
+        finally:
+            cpu = time.thread_time() - cpu0
+            wall = time.perf_counter() - wall0
+        return result, cpu, wall
+
+    def _narrow_process_scope(self) -> None:
+        caps = None
+        for hosted in self.plugins.values():
+            caps = hosted.capabilities if caps is None else caps & hosted.capabilities
+        set_process_scope(f"host:{self.group}", caps or ())
+
+    # ── Ops ───────────────────────────────────────────────────────
+
+    def load(self, spec: Dict[str, Any]) -> bool:
+        name = spec["name"]
+        if name in self.plugins:
+            raise ValueError(f"plugin {name!r} already loaded in this worker")
+        entry = Path(spec["plugin_dir"]) / spec["entry_point"]
+        pinned = spec.get("entry_sha384") or ""
+        # The file was verified in the GUI process; make sure it is still
+        # the same file now that this process imports it.
+        if pinned and _sha384_file(entry) != pinned:
+            raise ValueError(f"plugin {name!r} entry file changed since verification")
+
+        # Import and instantiate un-scoped, activate scoped: the same
+        # split PluginLoader._load_plugin uses in process.
+        _module, cls = import_plugin_class(
+            name, spec["plugin_dir"], spec["entry_point"], spec["plugin_type"],
+        )
+        if cls is None:
+            raise ValueError(f"plugin {name!r} has no plugin class")
+        hosted = _Hosted(spec, cls())
+        self.plugins[name] = hosted
+        self._narrow_process_scope()
+        try:
+            ok, _, _ = self._timed(hosted, hosted.instance.activate, self.controller)
+        except BaseException:
+            del self.plugins[name]
+            self._narrow_process_scope()
+            raise
+        return bool(ok)
+
+    def call(self, name: str, method: str, args: List[Any]):
+        hosted = self.plugins.get(name)
+        if hosted is None:
+            raise KeyError(f"plugin {name!r} is not loaded in this worker")
+        if method not in CALLABLE_METHODS:
+            raise ValueError(f"method {method!r} is not callable on hosted plugins")
+        hosted.calls += 1
+        result, cpu, wall = self._timed(hosted, getattr(hosted.instance, method), *args)
+        hosted.call_cpu += cpu
+        hosted.call_wall.append(wall)
+        if method == "deactivate":
+            del self.plugins[name]
+            self._narrow_process_scope()
+        return result, cpu, wall
+
+    def drain(self) -> None:
+        """Deliver queued records, then park until the host kicks again."""
+        self.ring.unpark()
+        while True:
+            record = self.ring.pop()
+            if record is None:
+                if self.ring.park():
+                    return
+                continue
+            try:
+                message = json.loads(record)
+            except ValueError:
+                continue
+            if message.get("k") == "status":
+                self.controller.update(message.get("v") or {})
+                continue
+            event, payload = message.get("e", ""), message.get("v") or {}
+            targets = message.get("p")
+            for hosted in list(self.plugins.values()):
+                if targets is not None and hosted.name not in targets:
+                    continue
+                hosted.events += 1
+                try:
+                    _, cpu, wall = self._timed(hosted, hosted.instance.on_event, event, payload)
+                except SandboxViolation:
+                    hosted.violations += 1
+                    continue
+                except Exception:
+                    hosted.errors += 1
+                    continue
+                hosted.event_cpu += cpu
+                hosted.event_wall.append(wall)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "process_cpu_sec": time.process_time(),
+            "ring_pending": self.ring.pending(),
+            "plugins": {name: h.stats() for name, h in self.plugins.items()},
+        }
+
+    def handle(self, request: Dict[str, Any]) -> bool:
+        """Serve one request; False once the worker should exit."""
+        op = request.get("op")
+        if op == "kick":
+            self.drain()
+            return True
+        rid = request.get("id")
+        # Events queued before this request are delivered first.
+        self.drain()
+        try:
+            if op == "load":
+                self.reply({"id": rid, "ok": True, "result": self.load(request["plugin"])})
+            elif op == "call":
+                result, cpu, wall = self.call(
+                    request["plugin"], request["method"], list(request.get("args") or []),
+                )
+                self.reply({"id": rid, "ok": True, "result": result, "cpu": cpu, "wall": wall})
+            elif op == "stats":
+                self.reply({"id": rid, "ok": True, "result": self.stats()})
+            elif op == "stop":
+                for hosted in list(self.plugins.values()):
+                    try:
+                        self._timed(hosted, hosted.instance.deactivate)
+                    except Exception:
+                        pass
+                self.reply({"id": rid, "ok": True, "result": True})
+                return False
+            else:
+                self.reply({"id": rid, "ok": False, "error": f"unknown op {op!r}"})
+        except SandboxViolation as e:
+            plugin = self.plugins.get(str(request.get("plugin")))
+            if plugin is not None:
+                plugin.violations += 1
+            self.reply({"id": rid, "ok": False, "error": str(e), "violation": True})
+        except Exception as e:
+            plugin = self.plugins.get(str(request.get("plugin")))
+            if plugin is not None:
+                plugin.errors += 1
+            traceback.print_exc(file=sys.stderr)
+            self.reply({"id": rid, "ok": False, "error": f"{type(e).__name__}: {e}"})
+        return True
+
+
+def main() -> int:
+    # Keep private copies of the protocol pipes, then point fd 0/1 away
+    # so plugin prints cannot corrupt the framing.
+    proto_in = os.fdopen(os.dup(0), "rb", buffering=0)
+    proto_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    init = json.loads(proto_in.readline() or b"{}")
+    ring = ShmRing.attach(init["ring"])
+    _lower_priority()
+    activate_sandbox()
+    worker = _Worker(str(init.get("group") or "default"), ring, proto_out)
+    # Strictest until the first plugin is loaded.
+    set_process_scope(f"host:{worker.group}", ())
+    worker.reply({"ready": True, "pid": os.getpid()})
+    try:
+        for line in proto_in:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            if not worker.handle(request):
+                break
+    finally:
+        ring.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,8 +12,10 @@ import importlib.util
 import json
 import os
 import sys
+import threading
 import traceback
-from typing import Any, Dict, List, Optional, Type
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from app.core.validation import validate_json_size
 from app.logs.logger import log_info, log_error, log_warning
@@ -24,6 +26,13 @@ from app.plugins.base import (
     ScannerPlugin,
     UIPanelPlugin,
 )
+from app.plugins.host import (
+    HOSTED_TYPES,
+    PluginHostError,
+    PluginHostPool,
+    plugin_host_enabled,
+)
+from app.plugins.profiling import PluginProfiler, instrument
 from app.plugins.sandbox import (
     SandboxViolation,
     activate_sandbox,
@@ -35,6 +44,7 @@ from app.plugins.signing import (
     SignedPluginManifest,
     verify_plugin_manifest,
 )
+from app.plugins.verify_cache import VerificationCache
 
 __all__ = [
     "MANIFEST_VERSION",
@@ -51,6 +61,9 @@ MANIFEST_VERSION = "1.0"
 # Required manifest fields
 REQUIRED_FIELDS = {"name", "version", "description", "type", "entry_point"}
 VALID_TYPES = {"disruption", "scanner", "ui_panel", "generic"}
+# Plugins verified concurrently during discovery (hashing and Ed25519
+# release the GIL).
+DISCOVERY_WORKERS = min(8, (os.cpu_count() or 2))
 INPROCESS_PRIVILEGED_CAPABILITIES = frozenset({
     "disruption.raw_packet",
     "process.spawn",
@@ -80,6 +93,58 @@ TYPE_CLASS_MAP: Dict[str, Type[PluginBase]] = {
     "generic": GenericPlugin,
 }
 
+
+def import_plugin_class(
+    name: str,
+    plugin_dir: str,
+    entry_point: str,
+    plugin_type: str,
+) -> Tuple[str, Optional[Type[PluginBase]]]:
+    """Import a plugin's entry file; return ``(module_name, plugin_class)``.
+
+    ``plugin_class`` is ``None`` (and the module is dropped again) when
+    the module defines no subclass of the base class for *plugin_type*.
+    Exceptions raised while executing the module propagate. Shared by
+    :class:`PluginLoader` and the out-of-process plugin worker.
+    """
+    entry_path = os.path.join(plugin_dir, entry_point)
+
+    # Dynamic import from file path
+    module_name = f"dupez_plugin_{name.replace(' ', '_').replace('-', '_')}"
+    spec = importlib.util.spec_from_file_location(module_name, entry_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Failed to create module spec for {entry_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+
+    # Add plugin dir to sys.path temporarily for relative imports
+    added_to_path = False
+    if plugin_dir not in sys.path:
+        sys.path.insert(0, plugin_dir)
+        added_to_path = True
+
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        # Remove from sys.path immediately — only needed during exec_module
+        if added_to_path and plugin_dir in sys.path:
+            sys.path.remove(plugin_dir)
+
+    # Find the plugin class — look for a class that inherits from PluginBase
+    expected_base = TYPE_CLASS_MAP.get(plugin_type, PluginBase)
+    _base_classes = {PluginBase, DisruptionPlugin, ScannerPlugin, UIPanelPlugin, GenericPlugin}
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (isinstance(attr, type) and issubclass(attr, expected_base)
+                and attr not in _base_classes):
+            return module_name, attr
+
+    # Clean up sys.modules on failure
+    sys.modules.pop(module_name, None)
+    return module_name, None
+
+
 class PluginManifest:
     """Parsed and validated plugin manifest.
 
@@ -105,6 +170,9 @@ class PluginManifest:
         self.url: str = data.get("url", "")
         self.min_dupez_version: str = data.get("min_dupez_version", "4.0.0")
         self.dependencies: List[str] = data.get("dependencies", [])
+        # Plugins sharing a host_group share one worker process when
+        # out-of-process hosting is enabled.
+        self.host_group: str = str(data.get("host_group") or self.name)
         self.plugin_dir: str = plugin_dir
         self.capabilities: frozenset = (
             signed.capabilities if signed else frozenset()
@@ -147,11 +215,22 @@ class PluginLoader:
 
     Usage:
         loader = PluginLoader(plugins_dir="plugins")
-        loader.discover()
+        loader.start_discovery()   # optional: verify in the background
+        loader.discover()          # joins the background run if started
         loader.load_all(controller)
+
+    Pass ``host=PluginHostPool()`` (or set ``DUPEZ_PLUGIN_HOST=1``) to
+    run generic, scanner and disruption plugins in worker processes.
     """
 
-    def __init__(self, plugins_dir: str = None) -> None:
+    def __init__(
+        self,
+        plugins_dir: str = None,
+        *,
+        verify_cache: Optional[VerificationCache] = None,
+        host: Optional[PluginHostPool] = None,
+        profiler: Optional[PluginProfiler] = None,
+    ) -> None:
         if plugins_dir is None:
             # Default: <project_root>/plugins
             if getattr(sys, 'frozen', False):
@@ -164,23 +243,65 @@ class PluginLoader:
         self.manifests: Dict[str, PluginManifest] = {}   # name -> manifest
         self.plugins: Dict[str, LoadedPlugin] = {}        # name -> loaded plugin
         self._controller = None
+        # Loaded lazily on first discovery (touches the secret store).
+        self._verify_cache = verify_cache
+        self._discovery_lock = threading.Lock()
+        self._pending_discovery: Optional[Future] = None
+        # Out-of-process worker pool; None loads everything in process.
+        if host is None and plugin_host_enabled():
+            host = PluginHostPool()
+        self._host = host
+        # Times every call into a plugin; over-budget plugins get disabled.
+        self.profiler = profiler if profiler is not None else PluginProfiler()
+        if self.profiler.on_disable is None:
+            self.profiler.on_disable = self._disable_over_budget
 
         # Install the capability sandbox exactly once. Safe to call
         # repeatedly — internal flag guards against double-install.
         activate_sandbox()
 
     # Discovery
+    def start_discovery(self) -> Future:
+        """Begin :meth:`discover`'s verification work on a background thread.
+
+        The next :meth:`discover` call returns this run's result instead
+        of scanning again. Calling it twice reuses the pending run.
+        """
+        with self._discovery_lock:
+            if self._pending_discovery is None:
+                future: Future = Future()
+                self._pending_discovery = future
+
+                def _run() -> None:
+                    try:
+                        future.set_result(self._scan())
+                    except BaseException as e:
+                        future.set_exception(e)
+
+                threading.Thread(
+                    target=_run, name="DupeZPluginDiscovery", daemon=True,
+                ).start()
+            return self._pending_discovery
+
     def discover(self) -> List[PluginManifest]:
         """Scan plugins directory for valid plugin folders with manifest.json."""
+        with self._discovery_lock:
+            pending, self._pending_discovery = self._pending_discovery, None
+        manifests = pending.result() if pending is not None else self._scan()
         self.manifests.clear()
+        for manifest in manifests:
+            self.manifests[manifest.name] = manifest
+        return manifests
 
+    def _scan(self) -> List[PluginManifest]:
+        """Find and verify every plugin folder; verification runs in parallel."""
         if not os.path.isdir(self.plugins_dir):
             log_info(f"Plugins directory not found: {self.plugins_dir}")
             os.makedirs(self.plugins_dir, exist_ok=True)
             return []
 
-        found = []
-        for entry in os.listdir(self.plugins_dir):
+        candidates: List[Tuple[str, str]] = []
+        for entry in sorted(os.listdir(self.plugins_dir)):
             plugin_dir = os.path.join(self.plugins_dir, entry)
             if not os.path.isdir(plugin_dir):
                 continue
@@ -189,10 +310,24 @@ class PluginLoader:
             if not os.path.isfile(manifest_path):
                 log_warning(f"Plugin folder '{entry}' missing manifest.json — skipping")
                 continue
+            candidates.append((manifest_path, plugin_dir))
+
+        if not candidates:
+            log_info("Plugin discovery complete: 0 plugin(s) found")
+            return []
+
+        if self._verify_cache is None:
+            self._verify_cache = VerificationCache.load_default()
+        workers = min(DISCOVERY_WORKERS, len(candidates))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="DupeZPluginVerify",
+        ) as pool:
+            parsed = list(pool.map(lambda c: self._parse_manifest(*c), candidates))
+        self._verify_cache.save()
 
-            manifest = self._parse_manifest(manifest_path, plugin_dir)
+        found = []
+        for manifest in parsed:
             if manifest:
-                self.manifests[manifest.name] = manifest
                 found.append(manifest)
                 log_info(f"Discovered plugin: {manifest.name} v{manifest.version} ({manifest.plugin_type})")
 
@@ -212,7 +347,7 @@ class PluginLoader:
         """
         # ── Signature verification ( first ) ───────────────────
         try:
-            signed = verify_plugin_manifest(path)
+            signed = verify_plugin_manifest(path, cache=self._verify_cache)
         except PluginSigError as e:
             log_error(f"Plugin at {plugin_dir!r} REJECTED: {e}")
             try:
@@ -351,6 +486,13 @@ class PluginLoader:
                 self.plugins[name] = plugin
                 loaded.append(plugin)
 
+        if self._host is not None:
+            from app.core.status_bus import get_status_bus
+
+            bus = get_status_bus(controller)
+            if bus is not None:
+                self._host.attach_status_bus(bus)
+
         log_info(f"Plugin loading complete: {len(loaded)}/{len(self.manifests)} loaded successfully")
         return loaded
 
@@ -390,6 +532,9 @@ class PluginLoader:
             log_error(f"Plugin entry path escapes plugins directory: {real_entry}")
             return None
 
+        if self._host is not None and manifest.plugin_type in HOSTED_TYPES:
+            return self._load_hosted(manifest)
+
         try:
             # Audit trail
             try:
@@ -403,45 +548,13 @@ class PluginLoader:
             except Exception:
                 pass
 
-            # Dynamic import from file path
-            module_name = f"dupez_plugin_{manifest.name.replace(' ', '_').replace('-', '_')}"
-            spec = importlib.util.spec_from_file_location(module_name, entry_path)
-            if spec is None or spec.loader is None:
-                log_error(f"Failed to create module spec for {entry_path}")
-                return None
-
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-
-            # Add plugin dir to sys.path temporarily for relative imports
-            added_to_path = False
-            if manifest.plugin_dir not in sys.path:
-                sys.path.insert(0, manifest.plugin_dir)
-                added_to_path = True
-
-            try:
-                spec.loader.exec_module(module)
-            finally:
-                # Remove from sys.path immediately — only needed during exec_module
-                if added_to_path and manifest.plugin_dir in sys.path:
-                    sys.path.remove(manifest.plugin_dir)
-
-            # Find the plugin class — look for a class that inherits from PluginBase
-            expected_base = TYPE_CLASS_MAP.get(manifest.plugin_type, PluginBase)
-            plugin_class = None
-
-            _base_classes = {PluginBase, DisruptionPlugin, ScannerPlugin, UIPanelPlugin, GenericPlugin}
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and issubclass(attr, expected_base)
-                        and attr not in _base_classes):
-                    plugin_class = attr
-                    break
-
+            module_name, plugin_class = import_plugin_class(
+                manifest.name, manifest.plugin_dir, manifest.entry_point,
+                manifest.plugin_type,
+            )
             if plugin_class is None:
+                expected_base = TYPE_CLASS_MAP.get(manifest.plugin_type, PluginBase)
                 log_error(f"Plugin '{manifest.name}' has no class inheriting from {expected_base.__name__}")
-                # Clean up sys.modules on failure
-                sys.modules.pop(module_name, None)
                 return None
 
             # Instantiate and activate INSIDE the capability sandbox.
@@ -450,6 +563,8 @@ class PluginLoader:
             # SandboxViolation when the plugin attempts an op it didn't
             # declare a matching capability for.
             instance = plugin_class()
+            self.profiler.reset(manifest.name)
+            instrument(instance, manifest.name, self.profiler)
             with plugin_scope(manifest.name, manifest.capabilities):
                 try:
                     success = instance.activate(self._controller)
@@ -487,6 +602,94 @@ class PluginLoader:
             log_error(f"Failed to load plugin '{manifest.name}': {e}\n{traceback.format_exc()}")
             return None
 
+    def _load_hosted(self, manifest: PluginManifest) -> Optional[LoadedPlugin]:
+        """Load *manifest* into its worker process via the plugin host."""
+        try:
+            from app.logs.audit import audit_event
+            audit_event("plugin_load_attempt", {
+                "name": manifest.name,
+                "version": manifest.version,
+                "type": manifest.plugin_type,
+                "entry_point": manifest.entry_point,
+                "host_group": manifest.host_group,
+            })
+        except Exception:
+            pass
+
+        try:
+            instance = self._host.load(manifest)
+        except SandboxViolation as sv:
+            log_error(f"Plugin '{manifest.name}' blocked by sandbox: {sv}")
+            try:
+                from app.logs.audit import audit_event
+                audit_event("plugin_sandbox_violation", {
+                    "name": manifest.name,
+                    "reason": str(sv),
+                })
+            except Exception:
+                pass
+            return None
+        except PluginHostError as e:
+            log_error(f"Failed to load plugin '{manifest.name}' in plugin host: {e}")
+            return None
+        self.profiler.reset(manifest.name)
+        instrument(instance, manifest.name, self.profiler)
+        instance.activate(self._controller)
+
+        loaded = LoadedPlugin(manifest, instance)
+        loaded.active = instance.enabled
+        if loaded.active:
+            log_info(
+                f"Plugin '{manifest.name}' activated out of process "
+                f"[{manifest.sig_state.value}] "
+                f"caps={sorted(manifest.capabilities) or 'none'}"
+            )
+        else:
+            loaded.error = "activate() returned False"
+            log_warning(f"Plugin '{manifest.name}' activate() returned False")
+        return loaded
+
+    # Events
+    def publish_event(self, event: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Deliver *event* to every active plugin's ``on_event``.
+
+        Hosted plugins receive it through their worker's event ring;
+        in-process plugins are called here, inside their sandbox scope.
+        """
+        payload = payload or {}
+        if self._host is not None:
+            self._host.publish(event, payload)
+        for plugin in self.get_active_plugins():
+            if plugin.manifest.plugin_type in HOSTED_TYPES and self._host is not None:
+                continue
+            try:
+                with plugin_scope(plugin.name, plugin.manifest.capabilities):
+                    plugin.instance.on_event(event, payload)
+            except Exception as e:
+                log_warning(f"Plugin '{plugin.name}' on_event({event!r}) failed: {e}")
+
+    def get_host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-plugin CPU and latency for hosted plugins (empty in process)."""
+        return self._host.stats() if self._host is not None else {}
+
+    def _disable_over_budget(self, name: str, reason: str) -> None:
+        """Profiler callback: take a plugin that keeps blowing its hard budget offline."""
+        log_error(f"Plugin '{name}' disabled: {reason}")
+        try:
+            from app.logs.audit import audit_event
+            audit_event("plugin_budget_disabled", {"name": name, "reason": reason})
+        except Exception:
+            pass
+        plugin = self.plugins.get(name)
+        if plugin is None:
+            return
+        plugin.active = False
+        plugin.error = f"disabled: {reason}"
+        try:
+            plugin.instance.deactivate()
+        except Exception as e:
+            log_warning(f"Plugin '{name}' deactivate after budget overrun failed: {e}")
+
     # Unloading
     def unload_plugin(self, name: str) -> bool:
         """Deactivate and unload a plugin by name."""
@@ -513,6 +716,8 @@ class PluginLoader:
         """Deactivate and unload all plugins."""
         for name in list(self.plugins.keys()):
             self.unload_plugin(name)
+        if self._host is not None:
+            self._host.shutdown()
 
     # ── Queries ────────────────────────────────────────────────────
 
@@ -556,5 +761,6 @@ class PluginLoader:
                 "error": loaded.error if loaded else None,
                 "sig_state": manifest.sig_state.value,
                 "capabilities": sorted(manifest.capabilities),
+                "profile": self.profiler.snapshot(name),
             })
         return info
@@ -0,0 +1,266 @@
+# app/plugins/profiling.py — Per-plugin hook timing and time budgets
+"""Time every call into a plugin and hold plugins to time budgets.
+
+:func:`instrument` replaces a loaded plugin instance's entry points
+(``activate``, ``scan``, ``create_widget``, ``on_event``, ...) with thin
+wrappers that time each call with ``perf_counter_ns`` and feed
+:class:`PluginProfiler`. Callers keep calling ``loaded.instance.scan()``
+and the dashboard keeps calling ``create_widget()``; the timing is
+attributed to the plugin's name without any call site changing.
+
+Per plugin and hook the profiler keeps the call count, cumulative and
+max time, and a fixed-bucket histogram (see :data:`HISTOGRAM_BOUNDS_MS`).
+
+Budgets:
+
+* soft — a call slower than ``soft_budget_ms`` logs a warning (the first
+  overrun per hook, then every 100th);
+* hard — a call slower than ``hard_budget_ms`` counts an overrun, and
+  ``max_overruns`` of them disable the plugin through the ``on_disable``
+  callback. ``activate``/``deactivate`` only get soft warnings: first
+  loads legitimately do one-off work.
+
+The budgets target the quick hooks (events, widget and metadata calls).
+:data:`LONG_RUNNING_HOOKS` — a scan sweeping a subnet, an apply setting
+up a disruption — are held to their own, much larger pair
+(``long_soft_budget_ms`` / ``long_hard_budget_ms``).
+
+Defaults come from ``DUPEZ_PLUGIN_SOFT_BUDGET_MS`` /
+``DUPEZ_PLUGIN_HARD_BUDGET_MS`` / ``DUPEZ_PLUGIN_LONG_SOFT_BUDGET_MS`` /
+``DUPEZ_PLUGIN_LONG_HARD_BUDGET_MS`` / ``DUPEZ_PLUGIN_MAX_OVERRUNS``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.logs.logger import log_warning
+
+__all__ = [
+    "HISTOGRAM_BOUNDS_MS",
+    "LONG_RUNNING_HOOKS",
+    "PROFILED_HOOKS",
+    "PluginDisabledError",
+    "PluginProfiler",
+    "instrument",
+]
+
+# Upper bounds (ms) of the histogram buckets; a final bucket catches the rest.
+HISTOGRAM_BOUNDS_MS = (0.1, 1.0, 5.0, 16.0, 50.0, 100.0, 500.0, 1000.0)
+_BOUNDS_NS = tuple(int(b * 1_000_000) for b in HISTOGRAM_BOUNDS_MS)
+_BUCKET_LABELS = tuple(f"<={b:g}ms" for b in HISTOGRAM_BOUNDS_MS) + (
+    f">{HISTOGRAM_BOUNDS_MS[-1]:g}ms",
+)
+
+# Every entry point DupeZ calls on a plugin instance (see app.plugins.base).
+PROFILED_HOOKS = (
+    "activate",
+    "deactivate",
+    "on_event",
+    "get_methods",
+    "apply",
+    "remove",
+    "get_scan_types",
+    "scan",
+    "get_panel_info",
+    "create_widget",
+)
+_SOFT_ONLY_HOOKS = frozenset({"activate", "deactivate"})
+LONG_RUNNING_HOOKS = frozenset({"scan", "apply", "remove"})
+_WARN_EVERY = 100
+
+DEFAULT_SOFT_BUDGET_MS = 16.0
+DEFAULT_HARD_BUDGET_MS = 1000.0
+DEFAULT_LONG_SOFT_BUDGET_MS = 1000.0
+DEFAULT_LONG_HARD_BUDGET_MS = 30_000.0
+DEFAULT_MAX_OVERRUNS = 3
+
+
+class PluginDisabledError(RuntimeError):
+    """Raised when calling into a plugin its hard budget disabled."""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float(os.environ.get(name, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+class _HookStats:
+    __slots__ = ("calls", "total_ns", "max_ns", "buckets", "soft", "hard")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(_BOUNDS_NS) + 1)
+        self.soft = 0
+        self.hard = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "mean_ms": (self.total_ns / self.calls / 1e6) if self.calls else 0.0,
+            "soft_overruns": self.soft,
+            "hard_overruns": self.hard,
+            "histogram": dict(zip(_BUCKET_LABELS, self.buckets)),
+        }
+
+
+class PluginProfiler:
+    """Per-plugin, per-hook call timing with soft and hard budgets.
+
+    Thread-safe. ``on_disable(name, reason)`` is called once, outside the
+    profiler's lock, when a plugin runs out of hard-budget overruns.
+    """
+
+    def __init__(
+        self,
+        *,
+        soft_budget_ms: Optional[float] = None,
+        hard_budget_ms: Optional[float] = None,
+        long_soft_budget_ms: Optional[float] = None,
+        long_hard_budget_ms: Optional[float] = None,
+        max_overruns: Optional[int] = None,
+        on_disable: Optional[Callable[[str, str], None]] = None,
+    ) -> None:
+        self.soft_budget_ms = soft_budget_ms if soft_budget_ms is not None else _env_float(
+            "DUPEZ_PLUGIN_SOFT_BUDGET_MS", DEFAULT_SOFT_BUDGET_MS)
+        self.hard_budget_ms = hard_budget_ms if hard_budget_ms is not None else _env_float(
+            "DUPEZ_PLUGIN_HARD_BUDGET_MS", DEFAULT_HARD_BUDGET_MS)
+        self.long_soft_budget_ms = (
+            long_soft_budget_ms if long_soft_budget_ms is not None else _env_float(
+                "DUPEZ_PLUGIN_LONG_SOFT_BUDGET_MS", DEFAULT_LONG_SOFT_BUDGET_MS))
+        self.long_hard_budget_ms = (
+            long_hard_budget_ms if long_hard_budget_ms is not None else _env_float(
+                "DUPEZ_PLUGIN_LONG_HARD_BUDGET_MS", DEFAULT_LONG_HARD_BUDGET_MS))
+        self.max_overruns = max_overruns if max_overruns is not None else int(_env_float(
+            "DUPEZ_PLUGIN_MAX_OVERRUNS", DEFAULT_MAX_OVERRUNS))
+        self.on_disable = on_disable
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, _HookStats]] = {}
+        self._overruns: Dict[str, int] = {}
+        self._disabled: Dict[str, str] = {}
+
+    def budgets_for(self, hook: str) -> Tuple[float, float]:
+        """``(soft_ms, hard_ms)`` that calls to *hook* are held to."""
+        if hook in LONG_RUNNING_HOOKS:
+            return self.long_soft_budget_ms, self.long_hard_budget_ms
+        return self.soft_budget_ms, self.hard_budget_ms
+
+    def record(self, plugin: str, hook: str, elapsed_ns: int) -> None:
+        soft_ms, hard_ms = self.budgets_for(hook)
+        soft_ns = int(soft_ms * 1_000_000)
+        hard_ns = int(hard_ms * 1_000_000)
+        disable_reason = None
+        warn = False
+        with self._lock:
+            hooks = self._stats.get(plugin)
+            if hooks is None:
+                hooks = self._stats[plugin] = {}
+            stats = hooks.get(hook)
+            if stats is None:
+                stats = hooks[hook] = _HookStats()
+            stats.calls += 1
+            stats.total_ns += elapsed_ns
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+            stats.buckets[bisect.bisect_left(_BOUNDS_NS, elapsed_ns)] += 1
+            if elapsed_ns > soft_ns:
+                stats.soft += 1
+                warn = stats.soft % _WARN_EVERY == 1
+            if elapsed_ns > hard_ns and hook not in _SOFT_ONLY_HOOKS:
+                stats.hard += 1
+                count = self._overruns[plugin] = self._overruns.get(plugin, 0) + 1
+                if count >= self.max_overruns and plugin not in self._disabled:
+                    disable_reason = (
+                        f"{count} call(s) over their hard budget "
+                        f"({hook}: {hard_ms:g} ms; last took {elapsed_ns / 1e6:.1f} ms)"
+                    )
+                    self._disabled[plugin] = disable_reason
+        if warn:
+            log_warning(
+                f"Plugin '{plugin}' {hook}() took {elapsed_ns / 1e6:.1f} ms "
+                f"(soft budget {soft_ms:g} ms, overrun #{stats.soft})"
+            )
+        if disable_reason is not None and self.on_disable is not None:
+            self.on_disable(plugin, disable_reason)
+
+    def is_disabled(self, plugin: str) -> bool:
+        return plugin in self._disabled
+
+    def disabled_reason(self, plugin: str) -> Optional[str]:
+        return self._disabled.get(plugin)
+
+    def reset(self, plugin: str) -> None:
+        """Forget *plugin*'s numbers and re-enable it (e.g. on reload)."""
+        with self._lock:
+            self._stats.pop(plugin, None)
+            self._overruns.pop(plugin, None)
+            self._disabled.pop(plugin, None)
+
+    def snapshot(self, plugin: str) -> Dict[str, Any]:
+        """Timing for *plugin*: per-hook stats plus totals and budget state."""
+        with self._lock:
+            hooks = {name: s.to_dict() for name, s in self._stats.get(plugin, {}).items()}
+            overruns = self._overruns.get(plugin, 0)
+            disabled = self._disabled.get(plugin)
+        return {
+            "hooks": hooks,
+            "calls": sum(h["calls"] for h in hooks.values()),
+            "total_ms": sum(h["total_ms"] for h in hooks.values()),
+            "max_ms": max((h["max_ms"] for h in hooks.values()), default=0.0),
+            "hard_overruns": overruns,
+            "disabled": disabled is not None,
+            "disabled_reason": disabled,
+            "soft_budget_ms": self.soft_budget_ms,
+            "hard_budget_ms": self.hard_budget_ms,
+            "long_soft_budget_ms": self.long_soft_budget_ms,
+            "long_hard_budget_ms": self.long_hard_budget_ms,
+        }
+
+    def plugins(self) -> List[str]:
+        with self._lock:
+            return sorted(self._stats)
+
+
+def _timed(profiler: PluginProfiler, plugin: str, hook: str, method: Callable) -> Callable:
+    clock = time.perf_counter_ns
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if hook != "deactivate" and profiler.is_disabled(plugin):
+            raise PluginDisabledError(
+                f"plugin {plugin!r} is disabled: {profiler.disabled_reason(plugin)}"
+            )
+        t0 = clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            profiler.record(plugin, hook, clock() - t0)
+
+    wrapper.__dupez_profiled__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def instrument(instance: Any, plugin: str, profiler: PluginProfiler) -> Any:
+    """Route *instance*'s entry points through *profiler*; returns *instance*.
+
+    Wrappers are stored on the instance, so the class (and any other
+    instance of it) is untouched. Calling twice is harmless.
+    """
+    for hook in PROFILED_HOOKS:
+        method = getattr(instance, hook, None)
+        if not callable(method) or getattr(method, "__dupez_profiled__", False):
+            continue
+        setattr(instance, hook, _timed(profiler, plugin, hook, method))
+    return instance
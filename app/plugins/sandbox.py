@@ -51,11 +51,10 @@ Usage
 from __future__ import annotations
 
 import contextlib
-import re
 import sys
 import threading
 from dataclasses import dataclass, field
-from typing import Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 __all__ = [
     "SandboxViolation",
@@ -63,6 +62,8 @@ __all__ = [
     "plugin_scope",
     "current_plugin_name",
     "snapshot_violations",
+    "sandbox_stats",
+    "set_process_scope",
 ]
 
 
@@ -76,9 +77,29 @@ class SandboxViolation(RuntimeError):
 class _PluginContext:
     name: str
     capabilities: frozenset
+    # event -> violation message (None = allowed) for condition-free
+    # rules; shared per (name, capabilities), see _decision_memo.
+    decisions: Dict[str, Optional[str]] = field(
+        default_factory=dict, compare=False, repr=False,
+    )
+
+
+class _ScopeLocal(threading.local):
+    # Class-level default: a thread that never entered a scope reads an
+    # empty tuple instead of paying for a failed attribute lookup on
+    # every audit event.
+    stack: Sequence[_PluginContext] = ()
+    # Set on the thread that called set_process_scope: the worker's own
+    # control loop is not plugin code.
+    exempt: bool = False
 
 
-_thread_local = threading.local()
+_thread_local = _ScopeLocal()
+
+# Scope applied to threads that have none of their own. Only plugin
+# worker processes set it (see set_process_scope); in the GUI process
+# it stays empty and un-scoped threads are not mediated.
+_process_stack: Sequence[_PluginContext] = ()
 
 _installed = False
 _install_lock = threading.Lock()
@@ -89,8 +110,8 @@ _violations: list[dict] = []
 
 
 def _stack() -> list:
-    s = getattr(_thread_local, "stack", None)
-    if s is None:
+    s = _thread_local.stack
+    if type(s) is not list:
         s = []
         _thread_local.stack = s
     return s
@@ -110,23 +131,29 @@ def snapshot_violations() -> list[dict]:
 
 # ── Event policy ──────────────────────────────────────────────────
 #
-# Map sys.audit event prefixes to the capability required.
+# Map sys.audit event names to the capability required.
 # This list is intentionally conservative — anything not explicitly
 # matched here is allowed to pass (the sandbox doesn't exhaustively
 # whitelist stdlib behavior). New entries tighten the screws over time.
+#
+# Rules are checked in list order; the first rule that matches the event
+# (and whose condition, if any, holds) decides. The hook never walks this
+# list at event time: :func:`_compile_rules` turns it into an exact-name
+# dict plus a prefix trie, and each event name is resolved once.
 
-@dataclass
+@dataclass(frozen=True)
 class _EventRule:
-    # Regex on the event name; ``None`` means the arg-based check runs
-    # unconditionally (used only for "open").
-    pattern: re.Pattern
+    # Event names matched exactly.
+    events: tuple = ()
+    # Event-name prefixes (``"os.exec"`` covers ``os.execv`` etc.).
+    prefixes: tuple = ()
     # Capability required. If ``None`` the rule always denies when
     # ``condition`` returns True — used for sinks with no legitimate
     # plugin use case (e.g. ``exec`` of compiled bytecode streams).
-    capability: Optional[str]
+    capability: Optional[str] = None
     # Extra per-args predicate; if provided and returns False, the rule
     # doesn't apply to this specific event instance.
-    condition: Optional[callable] = None
+    condition: Optional[Callable[[tuple], bool]] = None
     # Human-readable reason surfaced in violations.
     reason: str = ""
 
@@ -158,33 +185,31 @@ def _condition_unsafe_import(args: tuple) -> bool:
 _RULES: list[_EventRule] = [
     # Raw sockets / WinDivert-level opens.
     _EventRule(
-        pattern=re.compile(r"^socket\.(connect|bind|sendto|recvfrom)$"),
+        events=("socket.connect", "socket.bind", "socket.sendto", "socket.recvfrom"),
         capability="network.scan",
         reason="raw/UDP/TCP socket I/O",
     ),
     # urllib / http.client both raise http.client.send / urllib.Request.
     _EventRule(
-        pattern=re.compile(r"^(http\.client|urllib\.Request|ssl\.wrap_socket)"),
+        prefixes=("http.client", "urllib.Request", "ssl.wrap_socket"),
         capability="network.http",
         reason="HTTP(S) request",
     ),
     # Process spawn paths.
     _EventRule(
-        pattern=re.compile(
-            r"^(subprocess\.Popen|os\.(system|popen|exec|spawn))"
-        ),
+        prefixes=("subprocess.Popen", "os.system", "os.popen", "os.exec", "os.spawn"),
         capability="process.spawn",
         reason="child process creation",
     ),
     # File opens (write side) — read-only opens are permitted.
     _EventRule(
-        pattern=re.compile(r"^open$"),
+        events=("open",),
         capability="fs.write_user_data",
         condition=_condition_open_write,
         reason="file open for write",
     ),
     _EventRule(
-        pattern=re.compile(r"^os\.(remove|unlink|rename|rmdir|chmod|chown)$"),
+        events=("os.remove", "os.unlink", "os.rename", "os.rmdir", "os.chmod", "os.chown"),
         capability="fs.write_user_data",
         reason="file-system mutation",
     ),
@@ -192,27 +217,106 @@ _RULES: list[_EventRule] = [
     # didn't vet. ``exec``/``compile`` of arbitrary buffers is the
     # classic loader-of-a-loader RCE ladder.
     _EventRule(
-        pattern=re.compile(r"^(exec|compile)$"),
+        events=("exec", "compile"),
         capability=None,
         reason="dynamic code execution (exec/compile)",
     ),
     _EventRule(
-        pattern=re.compile(r"^import$"),
+        events=("import",),
         capability=None,
         condition=_condition_unsafe_import,
         reason="ctypes import can bypass the in-process capability policy",
     ),
     _EventRule(
-        pattern=re.compile(r"^ctypes\."),
+        prefixes=("ctypes.",),
         capability=None,
         reason="native memory/library access bypasses plugin policy",
     ),
 ]
 
 
+# ── Compiled dispatch ─────────────────────────────────────────────
+
+_TRIE_RULES = ""  # key holding the rule indices that end at a trie node
+
+
+def _compile_rules(rules: list) -> Tuple[Dict[str, Tuple[int, ...]], dict]:
+    """Index *rules* by exact event name and by prefix (character trie)."""
+    exact: Dict[str, List[int]] = {}
+    trie: dict = {}
+    for i, rule in enumerate(rules):
+        for name in rule.events:
+            exact.setdefault(name, []).append(i)
+        for prefix in rule.prefixes:
+            node = trie
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node.setdefault(_TRIE_RULES, []).append(i)
+    return {k: tuple(v) for k, v in exact.items()}, trie
+
+
+_EXACT, _PREFIX_TRIE = _compile_rules(_RULES)
+
+# Event name -> rules that apply to it, in _RULES order. Filled lazily
+# the first time a plugin scope sees a name; () for irrelevant events.
+# CPython raises a few hundred distinct event names, so it stays small.
+_resolved: Dict[str, Tuple[_EventRule, ...]] = {}
+
+
+def _resolve(event: str) -> Tuple[_EventRule, ...]:
+    indices = list(_EXACT.get(event, ()))
+    node = _PREFIX_TRIE
+    for ch in event:
+        node = node.get(ch)
+        if node is None:
+            break
+        indices.extend(node.get(_TRIE_RULES, ()))
+    rules = tuple(_RULES[i] for i in sorted(set(indices)))
+    _resolved[event] = rules
+    return rules
+
+
+# (plugin name, capabilities) -> that plugin's decision memo, shared by
+# every scope it enters so the memo survives across callbacks.
+_decision_memos: Dict[Tuple[str, frozenset], Dict[str, Optional[str]]] = {}
+_decision_memos_lock = threading.Lock()
+_MAX_DECISION_MEMOS = 256
+
+
+def _decision_memo(name: str, capabilities: frozenset) -> Dict[str, Optional[str]]:
+    key = (name, capabilities)
+    with _decision_memos_lock:
+        memo = _decision_memos.get(key)
+        if memo is None:
+            if len(_decision_memos) >= _MAX_DECISION_MEMOS:
+                _decision_memos.clear()
+            memo = _decision_memos[key] = {}
+        return memo
+
+
+# Per-process counters (approximate under thread races; diagnostics only).
+_counters: Dict[str, int] = {
+    "scoped_events": 0,
+    "rule_checks": 0,
+    "decision_cache_hits": 0,
+    "violations": 0,
+}
+
+
+def sandbox_stats() -> Dict[str, int]:
+    """Return a copy of the audit-hook counters.
+
+    ``scoped_events`` counts events seen while a plugin scope was active,
+    ``rule_checks`` those that matched at least one rule, and
+    ``decision_cache_hits`` the checks answered from a plugin's memo.
+    """
+    return dict(_counters)
+
+
 # ── Audit hook ────────────────────────────────────────────────────
 
 def _record_violation(event: str, reason: str, plugin: str) -> None:
+    _counters["violations"] += 1
     with _violations_lock:
         _violations.append({
             "event": event,
@@ -224,43 +328,67 @@ def _record_violation(event: str, reason: str, plugin: str) -> None:
             del _violations[:-1000]
 
 
+def _decide(ctx: _PluginContext, event: str, rule: _EventRule) -> Optional[str]:
+    """Return a violation message if *rule* denies *ctx*, else None."""
+    required = rule.capability
+    if required is None:
+        # Hard deny.
+        return (
+            f"plugin {ctx.name!r} attempted disallowed op {event!r} "
+            f"({rule.reason})"
+        )
+    if required not in ctx.capabilities:
+        return (
+            f"plugin {ctx.name!r} lacks capability {required!r} "
+            f"(triggered by {event!r} — {rule.reason})"
+        )
+    # Capability declared — allow.
+    return None
+
+
 def _audit_hook(event: str, args: tuple) -> None:
     """Global audit hook — dispatches to per-plugin capability check.
 
     The hook runs on every thread. If there's no plugin scope on the
-    current thread's stack, it returns without doing anything; the
-    normal DupeZ code runs un-interrupted.
+    current thread's stack (and no process scope), it returns without
+    doing anything; the normal DupeZ code runs un-interrupted. Inside a scope an irrelevant
+    event costs one dict lookup.
     """
-    s = getattr(_thread_local, "stack", None)
+    s = _thread_local.stack
     if not s:
+        s = _process_stack
+        if not s or _thread_local.exempt:
+            return
+    _counters["scoped_events"] += 1
+    rules = _resolved.get(event)
+    if rules is None:
+        rules = _resolve(event)
+    if not rules:
         return
+    _counters["rule_checks"] += 1
     ctx: _PluginContext = s[-1]
 
-    for rule in _RULES:
-        if not rule.pattern.match(event):
-            continue
-        if rule.condition is not None:
+    for rule in rules:
+        if rule.condition is None:
+            # Condition-free rules always decide, and the decision only
+            # depends on the plugin's capabilities: memoize it.
+            decisions = ctx.decisions
+            if event in decisions:
+                _counters["decision_cache_hits"] += 1
+                message = decisions[event]
+            else:
+                message = decisions[event] = _decide(ctx, event, rule)
+        else:
             try:
                 if not rule.condition(args):
                     continue
             except Exception:
                 # Rule condition errored — assume it applies (deny).
                 pass
-        required = rule.capability
-        if required is None:
-            # Hard deny.
+            message = _decide(ctx, event, rule)
+        if message is not None:
             _record_violation(event, rule.reason, ctx.name)
-            raise SandboxViolation(
-                f"plugin {ctx.name!r} attempted disallowed op {event!r} "
-                f"({rule.reason})"
-            )
-        if required not in ctx.capabilities:
-            _record_violation(event, rule.reason, ctx.name)
-            raise SandboxViolation(
-                f"plugin {ctx.name!r} lacks capability {required!r} "
-                f"(triggered by {event!r} — {rule.reason})"
-            )
-        # Capability declared — allow.
+            raise SandboxViolation(message)
         return
 
 
@@ -283,10 +411,28 @@ def activate_sandbox() -> None:
 
 # ── Scope helpers ─────────────────────────────────────────────────
 
+def set_process_scope(name: str, capabilities: Iterable[str]) -> None:
+    """Mediate every thread of this process under *name*'s capabilities.
+
+    Threads inside a :func:`plugin_scope` still use that scope, and the
+    calling thread stays exempt. Meant for plugin worker processes,
+    where threads a plugin starts would otherwise run un-scoped.
+    Installs the audit hook if needed.
+    """
+    global _process_stack
+    _thread_local.exempt = True
+    caps = frozenset(capabilities)
+    _process_stack = (
+        _PluginContext(name=name, capabilities=caps, decisions=_decision_memo(name, caps)),
+    )
+    activate_sandbox()
+
+
 @contextlib.contextmanager
 def plugin_scope(name: str, capabilities: Iterable[str]):
     """Push a plugin capability scope for the current thread."""
-    ctx = _PluginContext(name=name, capabilities=frozenset(capabilities))
+    caps = frozenset(capabilities)
+    ctx = _PluginContext(name=name, capabilities=caps, decisions=_decision_memo(name, caps))
     s = _stack()
     s.append(ctx)
     try:
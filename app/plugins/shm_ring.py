@@ -0,0 +1,176 @@
+# app/plugins/shm_ring.py — Shared-memory event ring for hosted plugins
+"""Single-producer / single-consumer byte ring in shared memory.
+
+The plugin host (:mod:`app.plugins.host`) pushes events and status
+snapshots to each worker process through one of these, so a burst of
+events costs a ``memcpy`` each instead of a pipe write each. The pipe
+to the worker only carries calls, replies and a one-line "kick" when
+the consumer has parked itself to wait for one.
+
+Layout::
+
+    [0:8)    write position (u64, monotonically increasing, producer-owned)
+    [8:16)   read position  (u64, monotonically increasing, consumer-owned)
+    [16:24)  park counter   (u64, consumer-owned; odd while parked)
+    [24:64)  reserved
+    [64:)    data — records of ``u32 length`` + payload, wrapping at capacity
+
+Each side only ever stores its own position and reads the other's, so
+no lock is needed between exactly one producer and one consumer. When
+the ring is full :meth:`ShmRing.push` drops the record and returns
+False; events are best-effort and the next status snapshot supersedes
+the last one anyway.
+
+Wake-ups: before blocking, the consumer calls :meth:`ShmRing.park`,
+which marks it parked and then re-checks for records, so a record
+pushed while it was deciding to sleep is never stranded. After each
+push the producer reads :meth:`ShmRing.park_token` and kicks once per
+park (the counter changes on every park), however many records follow.
+"""
+
+from __future__ import annotations
+
+import struct
+from multiprocessing import shared_memory
+from typing import Optional
+
+__all__ = ["DEFAULT_RING_BYTES", "ShmRing"]
+
+DEFAULT_RING_BYTES = 1 << 20
+
+_POS = struct.Struct("<Q")
+_LEN = struct.Struct("<I")
+_WRITE_OFF = 0
+_READ_OFF = 8
+_PARK_OFF = 16
+_DATA_OFF = 64
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """Stop this process's resource tracker from unlinking *shm* at exit.
+
+    Before Python 3.13 attaching to an existing segment registers it as
+    if this process created it; the creator owns cleanup.
+    """
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+
+class ShmRing:
+    """Byte-record ring over :class:`multiprocessing.shared_memory.SharedMemory`.
+
+    Create it with :meth:`create` in the producer and open the other end
+    with :meth:`attach` (by :attr:`name`) in the consumer.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self.capacity = shm.size - _DATA_OFF
+        self.dropped = 0
+
+    @classmethod
+    def create(cls, capacity: int = DEFAULT_RING_BYTES) -> "ShmRing":
+        if capacity < 64:
+            raise ValueError("ring capacity too small")
+        shm = shared_memory.SharedMemory(create=True, size=_DATA_OFF + capacity)
+        shm.buf[:_DATA_OFF] = bytes(_DATA_OFF)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmRing":
+        shm = shared_memory.SharedMemory(name=name)
+        _untrack(shm)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _pos(self, offset: int) -> int:
+        return _POS.unpack_from(self._buf, offset)[0]
+
+    def pending(self) -> int:
+        """Bytes written and not yet consumed."""
+        return self._pos(_WRITE_OFF) - self._pos(_READ_OFF)
+
+    def _copy_in(self, pos: int, data: bytes) -> None:
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        base = _DATA_OFF + start
+        self._buf[base:base + first] = data[:first]
+        if first < len(data):
+            rest = len(data) - first
+            self._buf[_DATA_OFF:_DATA_OFF + rest] = data[first:]
+
+    def _copy_out(self, pos: int, size: int) -> bytes:
+        start = pos % self.capacity
+        first = min(size, self.capacity - start)
+        base = _DATA_OFF + start
+        out = bytes(self._buf[base:base + first])
+        if first < size:
+            out += bytes(self._buf[_DATA_OFF:_DATA_OFF + size - first])
+        return out
+
+    def push(self, payload: bytes) -> bool:
+        """Append one record (producer side). False if it doesn't fit."""
+        need = _LEN.size + len(payload)
+        write = self._pos(_WRITE_OFF)
+        if need > self.capacity - (write - self._pos(_READ_OFF)):
+            self.dropped += 1
+            return False
+        self._copy_in(write, _LEN.pack(len(payload)) + payload)
+        # Publish only after the record bytes are in place.
+        _POS.pack_into(self._buf, _WRITE_OFF, write + need)
+        return True
+
+    def pop(self) -> Optional[bytes]:
+        """Remove and return the oldest record (consumer side), or None."""
+        read = self._pos(_READ_OFF)
+        if read == self._pos(_WRITE_OFF):
+            return None
+        (size,) = _LEN.unpack(self._copy_out(read, _LEN.size))
+        payload = self._copy_out(read + _LEN.size, size)
+        _POS.pack_into(self._buf, _READ_OFF, read + _LEN.size + size)
+        return payload
+
+    def park(self) -> bool:
+        """Consumer: announce that it is about to block for a kick.
+
+        Returns False, and stays unparked, if records arrived meanwhile.
+        """
+        token = self._pos(_PARK_OFF)
+        if not token & 1:
+            _POS.pack_into(self._buf, _PARK_OFF, token + 1)
+        if self.pending():
+            self.unpark()
+            return False
+        return True
+
+    def unpark(self) -> None:
+        """Consumer: it is awake and draining again."""
+        token = self._pos(_PARK_OFF)
+        if token & 1:
+            _POS.pack_into(self._buf, _PARK_OFF, token + 1)
+
+    def park_token(self) -> int:
+        """Producer: the consumer's current park (odd), or 0 if it is awake."""
+        token = self._pos(_PARK_OFF)
+        return token if token & 1 else 0
+
+    def close(self) -> None:
+        """Detach; the creating side also destroys the segment."""
+        self._buf = None  # type: ignore[assignment]
+        try:
+            self._shm.close()
+        finally:
+            if self._owner:
+                try:
+                    self._shm.unlink()
+                except FileNotFoundError:
+                    pass
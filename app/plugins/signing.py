@@ -61,7 +61,12 @@ import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from app.core.file_integrity import FileTooLargeError, file_digest, hash_file
+
+if TYPE_CHECKING:
+    from app.plugins.verify_cache import VerificationCache
 
 __all__ = [
     "MANIFEST_VERSION",
@@ -160,22 +165,26 @@ def pubkey_fingerprint(pubkey_pem: str) -> bytes:
     return hashlib.sha256(pubkey_pem.encode("utf-8")).digest()[:FINGERPRINT_SIZE]
 
 
-def _sha384_file(path: Path) -> str:
-    """Return the SHA-384 hex of *path*, streaming to avoid RAM spikes."""
-    h = hashlib.sha384()
-    total = 0
-    with path.open("rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-            total += len(chunk)
-            if total > MAX_ENTRY_BYTES:
-                raise PluginSigError(
-                    f"plugin entry {path.name} exceeds {MAX_ENTRY_BYTES} bytes"
-                )
-    return h.hexdigest()
+def _pinned_scope(pinned: Iterable[str]) -> str:
+    """Cache scope for a pinned-key set: changes whenever a key does."""
+    fps = sorted(pubkey_fingerprint(pem).hex() for pem in pinned)
+    return hashlib.sha256(",".join(fps).encode("ascii")).hexdigest()[:16]
+
+
+def _sha384_file(path: Path, *, cached: bool = False) -> str:
+    """Return the SHA-384 hex of *path*, streaming to avoid RAM spikes.
+
+    ``cached=True`` goes through the process-wide
+    :mod:`app.core.file_integrity` cache.
+    """
+    try:
+        if cached:
+            return file_digest(path, "sha384", max_bytes=MAX_ENTRY_BYTES)
+        return hash_file(path, ("sha384",), max_bytes=MAX_ENTRY_BYTES)["sha384"]
+    except FileTooLargeError:
+        raise PluginSigError(
+            f"plugin entry {path.name} exceeds {MAX_ENTRY_BYTES} bytes"
+        ) from None
 
 
 def _load_ed25519_pubkey(pem: str):
@@ -223,6 +232,8 @@ def _validate_capabilities(raw: object) -> frozenset:
 def verify_plugin_manifest(
     manifest_path: str,
     trusted_pubkeys_pem: Optional[Iterable[str]] = None,
+    *,
+    cache: Optional["VerificationCache"] = None,
 ) -> SignedPluginManifest:
     """Verify a plugin's manifest + signature + entry-point hash.
 
@@ -230,6 +241,10 @@ def verify_plugin_manifest(
         manifest_path: absolute path to ``<plugin_dir>/manifest.json``.
         trusted_pubkeys_pem: override for testing; defaults to the
             module-level :data:`TRUSTED_PUBKEYS_PEM`.
+        cache: optional :class:`~app.plugins.verify_cache.VerificationCache`.
+            Unchanged entry files are not re-hashed, and a manifest whose
+            exact bytes were already verified under the same pinned key
+            skips the Ed25519 check. Every other check still runs.
 
     Returns:
         A :class:`SignedPluginManifest` with sig_state set to
@@ -242,6 +257,7 @@ def verify_plugin_manifest(
     if trusted_pubkeys_pem is None:
         trusted_pubkeys_pem = TRUSTED_PUBKEYS_PEM
     pinned = list(trusted_pubkeys_pem)
+    scope = _pinned_scope(pinned)
 
     mpath = Path(manifest_path)
     plugin_dir = mpath.parent
@@ -315,7 +331,10 @@ def verify_plugin_manifest(
 
     # 3. Entry-file integrity — HARD even in dev mode. This catches a
     #    hand-edited `.py` inside a signed plugin bundle.
-    actual_entry_hash = _sha384_file(real_entry)
+    if cache is not None:
+        actual_entry_hash = cache.digest(real_entry, scope, _sha384_file)
+    else:
+        actual_entry_hash = _sha384_file(real_entry, cached=True)
     if actual_entry_hash != entry_sha384.lower():
         raise PluginSigError(
             f"entry_point hash mismatch for {name}: "
@@ -382,13 +401,20 @@ def verify_plugin_manifest(
     except ImportError as e:  # pragma: no cover
         raise PluginSigError(f"cryptography library unavailable: {e}") from e
 
-    pubkey = _load_ed25519_pubkey(matched_pem)
-    try:
-        pubkey.verify(signature, manifest_bytes)
-    except InvalidSignature as e:
-        raise PluginSigError(
-            f"plugin {name!r}: Ed25519 signature invalid: {e}"
-        ) from e
+    # The cached fact is "these exact manifest bytes carry a valid
+    # signature from this pinned key", so it is keyed on their digest.
+    manifest_digest = hashlib.sha384(manifest_bytes).hexdigest()
+    sig_scope = f"sig:{scope}:{fingerprint.hex()}"
+    if cache is None or cache.lookup(mpath, sig_scope) != manifest_digest:
+        pubkey = _load_ed25519_pubkey(matched_pem)
+        try:
+            pubkey.verify(signature, manifest_bytes)
+        except InvalidSignature as e:
+            raise PluginSigError(
+                f"plugin {name!r}: Ed25519 signature invalid: {e}"
+            ) from e
+        if cache is not None:
+            cache.store(mpath, sig_scope, manifest_digest)
 
     return SignedPluginManifest(
         name=name, version=version, description=description,
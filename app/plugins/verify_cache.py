@@ -0,0 +1,213 @@
+"""
+Persistent cache of plugin file digests for :mod:`app.plugins.signing`.
+
+Hashing every pinned entry file at every startup is the slow part of
+plugin discovery. This cache remembers, per file, the digest computed
+last time together with the file's identity:
+
+    (real path, size, mtime_ns, ctime_ns, inode / file index, device)
+
+plus a *scope* string — the fingerprint of the pinned plugin pubkeys —
+so rotating keys invalidates every record. A lookup only returns a
+digest when the file's current identity matches exactly; anything else
+is a miss and the caller re-hashes.
+
+Integrity
+---------
+Each record is sealed with HMAC-SHA384 under a per-install key from
+:mod:`app.core.secret_store` (``kind="plugins.verify_cache.hmac"``).
+Records whose MAC does not verify are ignored, so writing the cache file
+cannot make a modified plugin pass: an attacker would need the key as
+well. When the secret store is unavailable the cache is disabled and
+every file is hashed, exactly as before.
+
+What it does NOT protect against: a same-user writer that rewrites a
+file in place and then restores size, mtime AND inode. On POSIX
+``ctime`` is part of the identity and cannot be set from user space;
+on Windows it is the creation time. That writer can equally swap the
+file between verification and import, so the cache adds no new gap.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.file_integrity import file_identity
+from app.logs.logger import log_warning
+
+__all__ = [
+    "CACHE_SECRET_KIND",
+    "VerificationCache",
+    "default_cache_path",
+]
+
+CACHE_SECRET_KIND = "plugins.verify_cache.hmac"
+CACHE_SCHEMA = "dupez.plugin-verify-cache.v1"
+# Plugins come and go; keep the file from growing without bound.
+MAX_RECORDS = 4096
+
+
+def default_cache_path() -> Path:
+    from app.core.app_paths import user_root
+
+    return user_root() / "cache" / "plugin_verify.json"
+
+
+def _identity(path: Path) -> Optional[List[int]]:
+    ident = file_identity(path)
+    return list(ident) if ident is not None else None
+
+
+class VerificationCache:
+    """HMAC-sealed ``(file identity, scope) -> digest`` records.
+
+    Thread-safe; discovery verifies plugins in parallel against one
+    instance. Call :meth:`save` once verification is done.
+    """
+
+    def __init__(self, path: Optional[Path], key: Optional[bytes]) -> None:
+        self.path = Path(path) if path is not None else None
+        self._key = bytes(key) if key else None
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.enabled:
+            self._load()
+
+    @classmethod
+    def load_default(cls) -> "VerificationCache":
+        """Cache at :func:`default_cache_path`; disabled if no key is available."""
+        try:
+            from app.core.secret_store import get_or_create_secret
+
+            key = get_or_create_secret(CACHE_SECRET_KIND)
+            return cls(default_cache_path(), key)
+        except Exception as e:
+            log_warning(
+                f"Plugin verification cache disabled ({type(e).__name__}); "
+                "hashing every plugin file"
+            )
+            return cls(None, None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and self._key is not None
+
+    # ── Records ──────────────────────────────────────────────────
+
+    def _mac(self, name: str, ident: List[int], scope: str, digest: str) -> str:
+        assert self._key is not None
+        payload = json.dumps(
+            [CACHE_SCHEMA, name, ident, scope, digest], separators=(",", ":"),
+        ).encode("utf-8")
+        return hmac.new(self._key, payload, hashlib.sha384).hexdigest()
+
+    def lookup(self, path: Path, scope: str) -> Optional[str]:
+        """Return the cached digest if *path* is unchanged, else None."""
+        if not self.enabled:
+            return None
+        name = os.path.realpath(path)
+        ident = _identity(Path(name))
+        with self._lock:
+            record = self._records.get(f"{scope}|{name}")
+        if (
+            ident is None
+            or record is None
+            or record.get("id") != ident
+            or not isinstance(record.get("digest"), str)
+            or not isinstance(record.get("mac"), str)
+            or not hmac.compare_digest(
+                record["mac"], self._mac(name, ident, scope, record["digest"])
+            )
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record["digest"]
+
+    def store(
+        self,
+        path: Path,
+        scope: str,
+        digest: str,
+        ident: Optional[List[int]] = None,
+    ) -> None:
+        """Record *digest* for *path* as it was when *ident* was taken
+        (default: its identity now)."""
+        if not self.enabled:
+            return
+        name = os.path.realpath(path)
+        if ident is None:
+            ident = _identity(Path(name))
+            if ident is None:
+                return
+        record = {
+            "id": ident,
+            "digest": digest,
+            "mac": self._mac(name, ident, scope, digest),
+        }
+        with self._lock:
+            self._records[f"{scope}|{name}"] = record
+            self._dirty = True
+
+    def digest(self, path: Path, scope: str, compute: Callable[[Path], str]) -> str:
+        """Cached ``compute(path)``; re-computes only when the file changed.
+
+        The identity is taken before hashing and re-checked after, so a
+        file rewritten mid-hash is never recorded under its new identity.
+        """
+        cached = self.lookup(path, scope)
+        if cached is not None:
+            return cached
+        before = _identity(path) if self.enabled else None
+        value = compute(path)
+        if before is not None and _identity(path) == before:
+            self.store(path, scope, value, before)
+        return value
+
+    # ── Persistence ──────────────────────────────────────────────
+
+    def _load(self) -> None:
+        assert self.path is not None
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log_warning(f"Plugin verification cache unreadable, rebuilding: {e}")
+            return
+        if (
+            isinstance(raw, dict)
+            and raw.get("schema") == CACHE_SCHEMA
+            and isinstance(raw.get("records"), dict)
+        ):
+            self._records = {
+                k: v for k, v in raw["records"].items() if isinstance(v, dict)
+            }
+
+    def save(self) -> None:
+        """Write the records back if anything changed (atomic replace)."""
+        if not self.enabled:
+            return
+        assert self.path is not None
+        with self._lock:
+            if not self._dirty:
+                return
+            records = dict(list(self._records.items())[-MAX_RECORDS:])
+            self._dirty = False
+        body = json.dumps({"schema": CACHE_SCHEMA, "records": records})
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(body, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log_warning(f"Plugin verification cache not saved: {e}")
@@ -54,9 +54,6 @@ _MAC_ADDRESS_PATTERN: re.Pattern = re.compile(
     r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$'
 )
 
-# Ping response time extraction pattern
-_PING_TIME_PATTERN: re.Pattern = re.compile(r'time[=<](\d+(?:\.\d+)?)')
-
 # Well-known service ports (immutable — no reason to rebuild per call)
 COMMON_PORTS: Dict[str, int] = {
     "HTTP": 80,
@@ -270,45 +267,17 @@ def format_duration(seconds: float) -> str:
 def ping_host(host: str, timeout: float = 1.0) -> Tuple[bool, float]:
     """Ping a host and return (reachable, response_time_ms).
 
-    Uses the system ping command. Returns (False, 0.0) on failure.
+    One probe through :func:`app.network.latency_probe.probe_once` (ICMP
+    where permitted, TCP/UDP connect timing otherwise) — no ``ping``
+    subprocess. Returns (False, 0.0) on failure.
     """
     try:
-        import ipaddress
-        try:
-            clean_host = str(ipaddress.IPv4Address(str(host).strip()))
-        except (ipaddress.AddressValueError, ValueError):
-            return False, 0.0
-
-        timeout_ms = str(int(timeout * 1000))
-        stdout = ""
-        rc = -1
-        try:
-            from app.core import safe_subprocess as _safe_sp
-            if _IS_WINDOWS:
-                ping_path = _safe_sp.PING or _safe_sp.resolve_system_binary("PING")
-                argv = [ping_path, "-n", "1", "-w", timeout_ms, clean_host]
-            else:
-                ping_path = _safe_sp.resolve_system_binary("ping")
-                argv = [ping_path, "-c", "1", "-W", str(int(timeout)), clean_host]
-                res = _safe_sp.run(
-                    argv,
-                    timeout=timeout + 1.0,
-                    expect_returncode=None,
-                    intent="helpers.ping_host",
-                )
-            stdout = res.stdout
-            rc = res.returncode
-        except Exception:
-            return False, 0.0
-
-        if rc == 0:
-            time_match = _PING_TIME_PATTERN.search(stdout)
-            response_time = float(time_match.group(1)) if time_match else 0.0
-            return True, response_time
-        return False, 0.0
+        from app.network.latency_probe import probe_once
 
+        rtt = probe_once(host, timeout)
+        return (True, rtt) if rtt is not None else (False, 0.0)
     except Exception as e:
-        _log_error(f"Ping failed for {host}: {e}")
+        _log_error(f"Ping failed for {mask_ip(str(host))}: {e}")
         return False, 0.0
 
 
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# bench/account_import_bench.py
+"""
+Account tracker import/export benchmark — 100k-row CSV and XLSX.
+
+Generates synthetic DayZ account files and drives the same streaming
+pipeline the tracker's worker thread runs
+(``_stream_import_accounts`` / ``_write_accounts_csv`` /
+``_write_accounts_xlsx`` in ``app/gui/dayz_account_tracker.py``).
+
+Reports wall time and rows/s for each phase (plus the tracemalloc peak
+with ``--memory``; tracing slows openpyxl several-fold, so timings are
+taken from a separate untraced run):
+
+    * export  — write N accounts (CSV, XLSX write-only)
+    * import  — stream the file back in, validate, dedupe
+
+The ``legacy-dedupe`` line re-creates the pre-pipeline per-row cost
+model (``csv.DictReader`` + a linear duplicate scan over every account
+already accepted). That model is O(n²), so it runs on ``--legacy-rows``
+rows (default 10k) rather than the full file; the number to compare is
+rows/s.
+
+Run:
+    python bench/account_import_bench.py                 # 100k rows, csv + xlsx
+    python bench/account_import_bench.py --rows 20000 --format csv --memory
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _synthetic_accounts(n: int) -> List[Dict[str, str]]:
+    statuses = ("Ready", "Storage", "Dead", "Offline", "Blood Infection")
+    stations = ("Raider Kit", "Geared", "Pox Kit", "")
+    out = []
+    for i in range(n):
+        out.append({
+            "account": f"Survivor {i:06d}",
+            "email": f"s{i}@example.invalid" if i % 3 else "",
+            "location": "Chernarus - Tisy" if i % 2 else "Livonia - Coast",
+            "value": ("High", "Medium", "Low")[i % 3],
+            "status": statuses[i % len(statuses)],
+            "station": stations[i % len(stations)],
+            "gear": "Plate Carrier, Combat Helmet",
+            "holding": "M4-A1, Bandages x4",
+            "loadout": "M4 + ACOG",
+            "needs": "Ammo" if i % 4 else "-",
+            "notes": f"row {i}",
+        })
+    # A sprinkle of duplicates and invalid rows so the dedupe/validate
+    # paths are exercised, not just the happy path.
+    for i in range(0, n, 97):
+        out[i]["account"] = out[max(0, i - 1)]["account"]
+    for i in range(5, n, 211):
+        out[i]["email"] = "not-an-email"
+    return out
+
+
+_TRACE_MEMORY = False
+
+
+def _measure(fn: Callable[[], object]) -> Tuple[float, float, object]:
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = float("nan")
+    if _TRACE_MEMORY:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def _report(name: str, rows: int, elapsed: float, peak_mb: float) -> None:
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    mem = f"  peak={peak_mb:7.1f} MiB" if _TRACE_MEMORY else ""
+    print(f"  {name:18s} rows={rows:7d}  time={elapsed:7.2f} s  "
+          f"rate={rate:9.0f} rows/s{mem}")
+
+
+def _legacy_dedupe(path: str, limit: int, fields: List[str]) -> int:
+    """Pre-pipeline cost model: DictReader + linear duplicate scan per row."""
+    accepted: List[Dict[str, str]] = []
+    with open(path, "r", newline="", encoding="utf-8-sig") as fh:
+        reader = csv.DictReader(fh)
+        for n, row in enumerate(reader):
+            if n >= limit:
+                break
+            name = (row.get("Account") or "").strip().lower()
+            if any(a["account"].strip().lower() == name for a in accepted):
+                continue
+            accepted.append({f: row.get(f.title(), "") for f in fields})
+    return len(accepted)
+
+
+def run(fmt: str, rows: int, legacy_rows: int, workdir: str) -> None:
+    from app.gui import dayz_account_tracker as tracker
+
+    print(f"\n[{fmt}] {rows} rows")
+    accounts = _synthetic_accounts(rows)
+    path = os.path.join(workdir, f"accounts.{fmt}")
+    writer = tracker._write_accounts_xlsx if fmt == "xlsx" else tracker._write_accounts_csv
+
+    elapsed, peak, _ = _measure(lambda: writer(path, accounts))
+    _report("export", rows, elapsed, peak)
+    print(f"  {'':18s} file={os.path.getsize(path) / (1024 * 1024):.1f} MiB")
+
+    elapsed, peak, summary = _measure(
+        lambda: tracker._stream_import_accounts(path, set()))
+    _report("import", summary.rows_read, elapsed, peak)
+    print(f"  {'':18s} imported={summary.imported} duplicates={summary.duplicates} "
+          f"invalid={summary.error_count}")
+
+    if fmt == "csv" and legacy_rows > 0:
+        n = min(rows, legacy_rows)
+        elapsed, peak, _ = _measure(
+            lambda: _legacy_dedupe(path, n, list(tracker.ACCOUNT_FIELDS)))
+        _report("legacy-dedupe", n, elapsed, peak)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--format", choices=["csv", "xlsx", "both"], default="both")
+    ap.add_argument("--legacy-rows", type=int, default=10_000,
+                    help="rows for the O(n^2) legacy dedupe model (0 = skip)")
+    ap.add_argument("--memory", action="store_true",
+                    help="re-run each phase under tracemalloc for peak memory")
+    args = ap.parse_args()
+
+    global _TRACE_MEMORY
+    _TRACE_MEMORY = args.memory
+
+    print("=" * 70)
+    print("DupeZ account tracker streaming import/export benchmark")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory(prefix="dupez-acct-bench-") as workdir:
+        for fmt in ("csv", "xlsx"):
+            if args.format in (fmt, "both"):
+                run(fmt, args.rows, args.legacy_rows, workdir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
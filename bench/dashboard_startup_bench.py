@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# bench/dashboard_startup_bench.py
+"""
+Dashboard startup benchmark — lazy pages vs eager construction.
+
+Builds ``DupeZDashboard`` against a dry-run ``AppController`` in a fresh
+subprocess per mode (so resident memory is not polluted by the previous
+run) and reports:
+
+    * construct   — ``DupeZDashboard(...)`` wall time
+    * first-paint — constructor start → first paint event on the window
+    * rss@paint   — process RSS right after the first paint
+    * rss@settled — RSS once the idle prewarmer has drained (or after the
+                    same wait when it is disabled)
+
+Modes:
+
+    eager    — ``lazy_views=False`` (every page built in the constructor)
+    lazy     — ``lazy_views=True, prewarm_views=False`` (first use only)
+    prewarm  — ``lazy_views=True, prewarm_views=True`` (the default)
+
+QtWebEngine is disabled (``DUPEZ_DISABLE_WEBENGINE=1``) so the numbers
+describe the Qt widget pages, not Chromium.
+
+Run:
+    python bench/dashboard_startup_bench.py
+    python bench/dashboard_startup_bench.py --runs 5 --settle 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_MODES = {
+    "eager": (False, False),
+    "lazy": (True, False),
+    "prewarm": (True, True),
+}
+
+_CHILD = r"""
+import json, sys, time
+import psutil
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+
+lazy, prewarm, settle = sys.argv[1] == "1", sys.argv[2] == "1", float(sys.argv[3])
+app = QApplication([])
+from app.core.controller import AppController
+from app.core.safety_policy import SafetyPolicy
+from app.gui.dashboard import DupeZDashboard
+
+controller = AppController(safety_policy=SafetyPolicy(dry_run=True))
+proc = psutil.Process()
+painted = []
+
+class _PaintProbe(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not painted:
+            painted.append(time.perf_counter())
+        return False
+
+t0 = time.perf_counter()
+window = DupeZDashboard(
+    controller=controller, lazy_views=lazy, prewarm_views=prewarm,
+)
+constructed = time.perf_counter()
+probe = _PaintProbe()
+window.installEventFilter(probe)
+window.show()
+while not painted and time.perf_counter() - constructed < 10:
+    app.processEvents()
+rss_paint = proc.memory_info().rss
+deadline = time.perf_counter() + settle
+while time.perf_counter() < deadline:
+    app.processEvents()
+    time.sleep(0.01)
+rss_settled = proc.memory_info().rss
+built = sorted(k for k, h in window._view_hosts.items() if h.is_loaded)
+window._force_quit = True
+window.close()
+app.processEvents()
+print("RESULT " + json.dumps({
+    "construct_ms": (constructed - t0) * 1000,
+    "paint_ms": ((painted[0] if painted else constructed) - t0) * 1000,
+    "rss_paint": rss_paint,
+    "rss_settled": rss_settled,
+    "built": built,
+}))
+"""
+
+
+def _run_child(mode: str, settle: float, workdir: str) -> Dict[str, object]:
+    lazy, prewarm = _MODES[mode]
+    env = os.environ.copy()
+    env.update({
+        "QT_QPA_PLATFORM": "offscreen",
+        "DUPEZ_DISABLE_WEBENGINE": "1",
+        "DUPEZ_ARCH": "inproc",
+        "DUPEZ_FORCE_USER_DATA": "1",
+        "DUPEZ_USER_ROOT": os.path.join(workdir, mode),
+    })
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(int(lazy)), str(int(prewarm)), str(settle)],
+        cwd=_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    for line in out.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"{mode} run failed:\n{out.stderr[-2000:]}")
+
+
+def _report(mode: str, runs: List[Dict[str, object]]) -> None:
+    def med(key: str) -> float:
+        return statistics.median(float(r[key]) for r in runs)
+
+    mib = 1024 * 1024
+    print(f"  {mode:8s} construct={med('construct_ms'):7.1f} ms  "
+          f"first-paint={med('paint_ms'):7.1f} ms  "
+          f"rss@paint={med('rss_paint') / mib:6.1f} MiB  "
+          f"rss@settled={med('rss_settled') / mib:6.1f} MiB")
+    print(f"  {'':8s} built after settle: {', '.join(runs[-1]['built'])}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--settle", type=float, default=4.0,
+                    help="seconds of idle event loop after first paint")
+    ap.add_argument("--mode", choices=["all", *_MODES], default="all")
+    args = ap.parse_args()
+
+    print("=" * 70)
+    print(f"DupeZ dashboard startup benchmark (median of {args.runs})")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory(prefix="dupez-dash-bench-") as workdir:
+        for mode in _MODES:
+            if args.mode not in ("all", mode):
+                continue
+            runs = [_run_child(mode, args.settle, workdir) for _ in range(args.runs)]
+            _report(mode, runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
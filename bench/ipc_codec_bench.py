@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# bench/ipc_codec_bench.py
+"""
+Helper IPC codec benchmark — JSON frames vs negotiated binary frames.
+
+Builds a ``get_engine_stats`` result shaped like the real manager's
+aggregation (totals plus one ``per_device`` entry per disrupted target,
+each with native-engine counters, per-module stats and module activity)
+and measures, for both wire modes:
+
+    * bytes       — encoded response frame size
+    * encode      — ``Response.encode`` / ``Response.encode_binary``
+    * decode      — ``Response.decode`` / ``Response.decode_binary``
+    * round-trip  — ``LoopbackClient.get_engine_stats()`` through
+                    ``inproc_harness`` (request + dispatch + response)
+
+Run:
+    python bench/ipc_codec_bench.py
+    python bench/ipc_codec_bench.py --devices 32 --iters 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_MODULES = ("LagModule", "DropModule", "DuplicateModule", "ThrottleModule")
+
+
+def _device_stats(i: int) -> Dict[str, Any]:
+    methods = ["lag", "drop", "duplicate", "throttle"]
+    activity = {
+        m: {"method": m, "state": "effective", "count": 1000 + i, "direction": "both"}
+        for m in methods
+    }
+    return {
+        "packets_processed": 1_250_000 + i,
+        "packets_dropped": 31_000 + i,
+        "packets_inbound": 600_000 + i,
+        "packets_outbound": 650_000 + i,
+        "packets_passed": 1_219_000 + i,
+        "send_attempted": 1_219_000 + i,
+        "send_succeeded": 1_218_990 + i,
+        "send_failed": 10,
+        "send_short": 0,
+        "alive": True,
+        "target_ip": f"192.168.1.{10 + i}",
+        "engine": "native",
+        "engine_preference": "auto",
+        "telemetry_available": True,
+        "methods": methods,
+        "module_stats": {
+            name: {"queue_depth": j * 3, "released": 50_000 + j, "dropped": 120 + j,
+                   "delayed": 4_000 + j, "duplicated": 0}
+            for j, name in enumerate(_MODULES)
+        },
+        "module_activity": activity,
+        "configured_methods": methods,
+        "effective_methods": methods,
+        "shadowed_methods": [],
+        "startup_verified": True,
+        "runtime_verification_available": True,
+        "runtime_verified": True,
+        "local_effect_verified": True,
+        "verification_state": "verified",
+        "arp_spoof_active": True,
+        "arp_packets_sent": 8_400 + i,
+    }
+
+
+def build_engine_stats(devices: int) -> Dict[str, Any]:
+    per_device = {f"192.168.1.{10 + i}": _device_stats(i) for i in range(devices)}
+    totals: Dict[str, Any] = {
+        k: sum(d[k] for d in per_device.values())
+        for k in ("packets_processed", "packets_dropped", "packets_inbound",
+                  "packets_outbound", "packets_passed")
+    }
+    totals.update(active_engines=devices, per_device=per_device)
+    return totals
+
+
+class _StatsDM:
+    def __init__(self, stats: Dict[str, Any]) -> None:
+        self._stats = stats
+
+    def get_engine_stats(self) -> Dict[str, Any]:
+        return self._stats
+
+
+def _time_us(fn: Callable[[], Any], iters: int) -> List[float]:
+    for _ in range(min(50, iters)):
+        fn()
+    pc = time.perf_counter_ns
+    samples = []
+    for _ in range(iters):
+        t0 = pc()
+        fn()
+        samples.append((pc() - t0) / 1000.0)
+    samples.sort()
+    return samples
+
+
+def _fmt(samples: List[float]) -> str:
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50={p50:8.1f}  p99={p99:8.1f}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--devices", type=int, default=16)
+    ap.add_argument("--iters", type=int, default=1000)
+    args = ap.parse_args()
+
+    from app.firewall_helper.inproc_harness import LoopbackClient
+    from app.firewall_helper.protocol import BINARY_HEADER, Response
+
+    stats = build_engine_stats(args.devices)
+    response = Response.success(1, stats)
+    json_frame = response.encode()
+    binary_frame = response.encode_binary()
+    json_body = json_frame.rstrip(b"\n")
+    binary_body = binary_frame[BINARY_HEADER.size:]
+    assert Response.decode_binary(binary_body) == Response.decode(json_body)
+
+    print("=" * 70)
+    print(f"DupeZ helper IPC codec benchmark — get_engine_stats, "
+          f"{args.devices} devices, iters={args.iters}")
+    print("=" * 70)
+    modes = {
+        "json": (response.encode, lambda: Response.decode(json_body), len(json_frame)),
+        "binary": (response.encode_binary, lambda: Response.decode_binary(binary_body),
+                   len(binary_frame)),
+    }
+    for mode, (encode, decode, size) in modes.items():
+        client = LoopbackClient(_StatsDM(stats), binary=(mode == "binary"))
+        print(f"\n[{mode}] frame={size:,} bytes "
+              f"({size / len(json_frame):.0%} of JSON)")
+        print(f"  encode      {_fmt(_time_us(encode, args.iters))}   (µs)")
+        print(f"  decode      {_fmt(_time_us(decode, args.iters))}   (µs)")
+        print(f"  round-trip  {_fmt(_time_us(client.get_engine_stats, args.iters))}   (µs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
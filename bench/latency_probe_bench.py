@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# bench/latency_probe_bench.py
+"""
+Latency sampler benchmark — one ``ping`` subprocess per sample vs the
+shared multi-target probe round.
+
+Samples N loopback targets (127.0.0.1 … 127.0.0.N, all answered by the
+local stack) the way the overlays do, once per "second", and reports the
+cost of one sampling round:
+
+    subprocess — the old path: one ``ping -c 1`` / ``ping -n 1`` per
+                 target per round, through ``safe_subprocess.run``
+    probe      — ``_Prober.probe`` over every target in one select
+                 (ICMP when this process may open an ICMP socket, else
+                 TCP/UDP connect timing)
+
+Reported: wall time per round and CPU time per round (this process plus
+reaped children), so spawn cost shows up even though ``ping`` itself is
+cheap.
+
+Run:
+    python bench/latency_probe_bench.py
+    python bench/latency_probe_bench.py --targets 16 --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from typing import Callable, Dict
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+def _cpu() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _measure(fn: Callable[[], object], rounds: int) -> Dict[str, float]:
+    fn()  # warm-up (imports, socket open)
+    wall0, cpu0 = time.perf_counter(), _cpu()
+    for _ in range(rounds):
+        fn()
+    return {
+        "wall_ms": (time.perf_counter() - wall0) * 1000.0 / rounds,
+        "cpu_ms": (_cpu() - cpu0) * 1000.0 / rounds,
+    }
+
+
+def _subprocess_round(targets) -> Callable[[], object]:
+    from app.core import safe_subprocess as _safe_sp
+
+    if sys.platform == "win32":
+        ping_path = _safe_sp.PING or _safe_sp.resolve_system_binary("PING")
+        flag, wait = "-n", ["-w", "1000"]
+    else:
+        ping_path = _safe_sp.resolve_system_binary("ping")
+        flag, wait = "-c", ["-W", "1"]
+
+    def _round() -> None:
+        for ip in targets:
+            _safe_sp.run(
+                [ping_path, flag, "1", *wait, ip],
+                timeout=5.0,
+                expect_returncode=None,
+                intent="bench.ping_rtt",
+            )
+
+    return _round
+
+
+def _report(name: str, r: Dict[str, float]) -> None:
+    print(f"  {name:14s} wall={r['wall_ms']:8.2f} ms/round  cpu={r['cpu_ms']:8.2f} ms/round")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--targets", type=int, default=8)
+    ap.add_argument("--rounds", type=int, default=10)
+    args = ap.parse_args()
+
+    from app.network.latency_probe import _Prober
+
+    targets = [f"127.0.0.{i}" for i in range(1, args.targets + 1)]
+    if sys.platform != "linux":
+        targets = ["127.0.0.1"] * args.targets  # only .1 answers everywhere
+    keys = [(ip, None) for ip in targets]
+
+    print("=" * 70)
+    print(f"DupeZ latency sampler benchmark — {args.targets} targets, "
+          f"{args.rounds} rounds")
+    print("=" * 70)
+
+    if shutil.which("ping") or sys.platform == "win32":
+        try:
+            _report("subprocess", _measure(_subprocess_round(targets), args.rounds))
+        except Exception as exc:
+            print(f"  subprocess     skipped: {exc}")
+    else:
+        print("  subprocess     skipped: no ping binary on PATH")
+
+    for label, icmp in (("probe/icmp", None), ("probe/tcp+udp", False)):
+        prober = _Prober(icmp=icmp)
+        _report(label, _measure(lambda p=prober: p.probe(keys, 1.0), args.rounds))
+        if icmp is None:
+            print(f"  {'':14s} icmp socket: {prober.icmp_mode}")
+        prober.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,23 @@ run in the steady state:
 Reports min / p50 / p95 / p99 / p999 / max for each (path, op) pair so
 the regression is visible at a glance.
 
+The ``split-unix`` path runs the same ops across a real process boundary:
+it spawns ``app.firewall_helper.fake_backend`` (the real HelperDispatcher
+over a fake manager) and talks to it through ``UnixSocketProxy``. Linux /
+macOS only; it is the closest stand-in for the named pipe off Windows.
+
+The ``snapshot`` path polls a realistic ``get_engine_stats`` payload
+with full replies, with ``since_generation`` deltas, and with deltas plus
+the helper's rebuild interval, reporting latency, bytes per reply and
+helper rebuilds per poll.
+
+The ``concurrency`` path drives ``get_status`` from 1, 4 and 16 caller
+threads sharing one client over a real socket pair (the same session code
+the named pipe uses), once with pipelining negotiated and once in the
+legacy one-request-at-a-time mode, and reports p50 / p99 per call. Each
+handled status query sleeps ``--service-us`` to stand in for helper work.
+``--transport unix`` runs it against the fake backend process instead.
+
 CRITICAL: this benchmark does NOT exercise the packet path. That is
 intentional — the packet path runs 100% inside the helper process under
 split mode, bit-for-bit identical to inproc. The only thing that changes
@@ -29,15 +46,22 @@ Run:
     python bench/latency_regression.py            # both paths
     python bench/latency_regression.py --iters 5000
     python bench/latency_regression.py --path split
+    python bench/latency_regression.py --path split-unix
+    python bench/latency_regression.py --path snapshot
+    python bench/latency_regression.py --path concurrency --service-us 500
+    python bench/latency_regression.py --path concurrency --transport unix
 """
 
 from __future__ import annotations
 
 import argparse
 import os
+import socket
 import sys
+import tempfile
+import threading
 import time
-from typing import Callable, List
+from typing import Callable, List, Sequence
 
 # Ensure app.* imports resolve when run from repo root.
 _HERE = os.path.dirname(os.path.abspath(__file__))
@@ -46,58 +70,10 @@ if _ROOT not in sys.path:
     sys.path.insert(0, _ROOT)
 
 
-# ── Fake disruption_manager (no WinDivert, no Qt) ─────────────────────
-# Matches the API shape used by both the inproc path and HelperDispatcher.
-# The numbers are deliberately cheap so the benchmark measures transport
-# overhead, not engine work.
-
-class _FakeDM:
-    def __init__(self) -> None:
-        self._started = False
-        self._disrupted: set[str] = set()
-
-    def initialize(self) -> bool:
-        return True
-
-    def start(self) -> None:
-        self._started = True
-
-    def stop(self) -> None:
-        self._started = False
-
-    def disrupt_device(self, ip, methods=None, params=None, **kwargs) -> bool:
-        self._disrupted.add(ip)
-        return True
-
-    def stop_device(self, ip) -> bool:
-        self._disrupted.discard(ip)
-        return True
-
-    def stop_all_devices(self) -> bool:
-        self._disrupted.clear()
-        return True
-
-    def get_disrupted_devices(self) -> list:
-        return list(self._disrupted)
-
-    def get_device_status(self, ip) -> dict:
-        return {"ip": ip, "active": ip in self._disrupted}
-
-    def get_status(self) -> dict:
-        return {
-            "started": self._started,
-            "count": len(self._disrupted),
-            "mode": "bench",
-        }
-
-    def get_engine_stats(self) -> dict:
-        return {"fps": 60, "queue_depth": 0}
-
-    def hotkey_trigger(self, action, payload) -> bool:
-        return True
-
+# Fake disruption_manager (no WinDivert, no Qt) — shared with the
+# cross-process fake backend so every path measures the same work.
+from app.firewall_helper.fake_backend import FakeDisruptionManager as _FakeDM  # noqa: E402
 
-# ── Percentile helper ─────────────────────────────────────────────────
 
 def _pct(samples: List[float], q: float) -> float:
     if not samples:
@@ -167,6 +143,92 @@ def run_split_loopback(iters: int) -> None:
             _bench(lambda: client.disrupt_device("10.0.0.5", None, None), iters))
 
 
+def run_split_unix(iters: int) -> None:
+    """Same four ops through UnixSocketProxy to a fake backend process."""
+    print(f"\n[split/unix] proxy -> AF_UNIX -> helper process, iters={iters}")
+    from app.firewall_helper.auth import generate_token
+    from app.firewall_helper.fake_backend import spawn_fake_backend
+    from app.firewall_helper.unix_transport import UnixSocketProxy
+
+    secret = generate_token()
+    with tempfile.TemporaryDirectory(prefix="dupez-bench-") as tmp:
+        path = os.path.join(tmp, "helper.sock")
+        proc = spawn_fake_backend(path, secret)
+        proxy = UnixSocketProxy(secret, path)
+        try:
+            _report("get_status",       _bench(lambda: proxy.get_status(), iters))
+            _report("hotkey_trigger",
+                    _bench(lambda: proxy.hotkey_trigger("HIT", {}), iters))
+            _report("get_engine_stats", _bench(lambda: proxy.get_engine_stats(), iters))
+            _report("disrupt_device",
+                    _bench(lambda: proxy.disrupt_device("10.0.0.5"), iters))
+        finally:
+            proxy.shutdown_helper()
+            proc.stdin.close()
+            proc.wait(timeout=5)
+
+
+class _TickingStatsDM(_FakeDM):
+    """get_engine_stats shaped like the real aggregation; a few devices'
+    counters advance on every call, the rest stay put."""
+
+    def __init__(self, devices: int, busy: int) -> None:
+        super().__init__()
+        from ipc_codec_bench import build_engine_stats
+
+        self._stats = build_engine_stats(devices)
+        self._busy = list(self._stats["per_device"].values())[:busy]
+        self.calls = 0
+
+    def get_engine_stats(self) -> dict:
+        self.calls += 1
+        for dev in self._busy:
+            dev["packets_processed"] += 7
+            dev["packets_passed"] += 7
+        return self._stats
+
+
+def run_snapshot(iters: int, devices: int = 16, busy: int = 2) -> None:
+    print(
+        f"\n[split/snapshot] get_engine_stats, {devices} devices "
+        f"({busy} changing per poll), iters={iters}"
+    )
+    from app.firewall_helper.inproc_harness import LoopbackClient
+    from app.firewall_helper.snapshot_cache import SNAPSHOT_INTERVAL_SEC
+
+    variants = (
+        ("full",             False, 0.0),
+        ("delta",            True,  0.0),
+        ("delta+cache",      True,  SNAPSHOT_INTERVAL_SEC),
+    )
+    for label, snapshots, interval in variants:
+        dm = _TickingStatsDM(devices, busy)
+        client = LoopbackClient(
+            dm,
+            snapshots=snapshots,
+            snapshot_interval_sec=interval,
+        )
+        samples = _bench(lambda: client.get_engine_stats(), iters)
+        rebuilds = dm.calls / (iters + min(200, iters // 10 or 1))
+        # Reply sizes from a separate pass so encoding them isn't timed.
+        dispatch = client.dispatcher.dispatch
+        sizes: List[int] = []
+
+        def _measured(request, _dispatch=dispatch, _sizes=sizes):
+            response = _dispatch(request)
+            _sizes.append(len(response.encode()))
+            return response
+
+        client.dispatcher.dispatch = _measured
+        for _ in range(200):
+            client.get_engine_stats()
+        _report(label, samples)
+        print(
+            f"  {'':24s}  bytes/poll={sum(sizes) / len(sizes):9.0f}  "
+            f"rebuilds/poll={rebuilds:5.2f}"
+        )
+
+
 def run_real_pipe(iters: int, pipe_name: str) -> None:
     """Measure latency through the real Windows named-pipe transport.
 
@@ -228,14 +290,147 @@ def run_real_pipe(iters: int, pipe_name: str) -> None:
     client.close()
 
 
+def _concurrent_samples(call: Callable[[], None], callers: int, iters: int) -> List[float]:
+    """Per-call latency (µs) with *callers* threads issuing *iters* calls in total."""
+    per_thread = max(1, iters // callers)
+    samples: List[float] = []
+    lock = threading.Lock()
+    start = threading.Barrier(callers)
+    pc = time.perf_counter_ns
+
+    def _worker() -> None:
+        local: List[float] = []
+        start.wait()
+        for _ in range(per_thread):
+            t0 = pc()
+            call()
+            local.append((pc() - t0) / 1000.0)
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=_worker) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples
+
+
+def _socketpair_session(service_us: float):
+    """Serve a fresh in-process session; return (connect, cleanup)."""
+    from app.firewall_helper.protocol import CAP_PIPELINE, OP_GET_STATUS
+    from app.firewall_helper.server import HelperDispatcher
+    from app.firewall_helper.transport import FramedClient, SocketStream, serve_stream
+    dispatcher = HelperDispatcher(_FakeDM())
+
+    def handler(request):
+        if request.op == OP_GET_STATUS and service_us > 0:
+            time.sleep(service_us / 1e6)
+        return dispatcher.dispatch(request)
+
+    def _connect(secret: bytes, pipeline: bool):
+        server_sock, client_sock = socket.socketpair()
+        threading.Thread(
+            target=serve_stream,
+            args=(SocketStream(server_sock), handler, secret),
+            kwargs={"capabilities": (CAP_PIPELINE,)},
+            daemon=True,
+        ).start()
+        client = FramedClient(secret, pipeline=pipeline)
+        client.attach(SocketStream(client_sock))
+        return client
+
+    return _connect, lambda: None
+
+
+def _unix_session(service_us: float, secret: bytes):
+    """Spawn the fake backend process; return (connect, cleanup)."""
+    from app.firewall_helper.fake_backend import spawn_fake_backend
+    from app.firewall_helper.unix_transport import UnixSocketClient
+
+    tmp = tempfile.TemporaryDirectory(prefix="dupez-bench-")
+    path = os.path.join(tmp.name, "helper.sock")
+    proc = spawn_fake_backend(path, secret, service_us=service_us)
+
+    def _connect(secret: bytes, pipeline: bool):
+        client = UnixSocketClient(secret, path, pipeline=pipeline, binary=False)
+        client.connect()
+        return client
+
+    def _cleanup() -> None:
+        proc.stdin.close()
+        proc.wait(timeout=5)
+        tmp.cleanup()
+
+    return _connect, _cleanup
+
+
+def run_concurrency(
+    iters: int,
+    service_us: float,
+    callers: Sequence[int] = (1, 4, 16),
+    transport: str = "socketpair",
+) -> None:
+    print(
+        f"\n[split/concurrency] {transport} session, get_status, "
+        f"service={service_us:.0f} µs, iters={iters}"
+    )
+    from app.firewall_helper.auth import generate_token
+    from app.firewall_helper.protocol import OP_GET_STATUS, Request
+
+    secret = generate_token()
+    if transport == "unix":
+        connect, cleanup = _unix_session(service_us, secret)
+    else:
+        connect, cleanup = _socketpair_session(service_us)
+    try:
+        for label, pipeline in (("serialized", False), ("pipelined", True)):
+            client = connect(secret, pipeline)
+
+            def _status() -> None:
+                client.call(Request(op=OP_GET_STATUS))
+
+            for _ in range(50):
+                _status()
+            for n in callers:
+                t0 = time.perf_counter()
+                samples = _concurrent_samples(_status, n, iters)
+                rate = len(samples) / (time.perf_counter() - t0)
+                print(
+                    f"  {label:10s} callers={n:<3d} "
+                    f"p50={_pct(samples, 0.50):9.2f}  "
+                    f"p99={_pct(samples, 0.99):9.2f} (µs)  "
+                    f"{rate:8.0f} calls/s"
+                )
+            client.close()
+    finally:
+        cleanup()
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--iters", type=int, default=2000)
     ap.add_argument(
         "--path",
-        choices=["inproc", "split", "real-pipe", "both"],
+        choices=[
+            "inproc", "split", "split-unix", "snapshot", "real-pipe",
+            "concurrency", "both",
+        ],
         default="both",
     )
+    ap.add_argument(
+        "--service-us",
+        type=float,
+        default=500.0,
+        help="Simulated helper work per get_status for --path concurrency",
+    )
+    ap.add_argument(
+        "--transport",
+        choices=["socketpair", "unix"],
+        default="socketpair",
+        help="Session for --path concurrency: in-process socketpair, or a "
+             "fake helper process over a Unix socket",
+    )
     ap.add_argument(
         "--pipe",
         default=r"\\.\pipe\dupez_firewall_helper",
@@ -256,6 +451,16 @@ def main() -> int:
         except Exception as e:
             print(f"\n[split/loopback] FAILED: {e}")
             return 1
+    if args.path == "split-unix":
+        try:
+            run_split_unix(args.iters)
+        except Exception as e:
+            print(f"\n[split/unix] FAILED: {e}")
+            return 1
+    if args.path == "snapshot":
+        run_snapshot(args.iters)
+    if args.path == "concurrency":
+        run_concurrency(args.iters, args.service_us, transport=args.transport)
     if args.path == "real-pipe":
         try:
             run_real_pipe(args.iters, args.pipe)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# bench/oui_lookup_bench.py
+"""
+OUI vendor table — load time, memory and lookup cost.
+
+Compares the bundled database (``app/resources/oui.bin`` through
+``app.network.oui_db``) with the scapy ``MANUFDB`` fallback it replaced.
+Every load runs in a fresh interpreter, so each figure includes the
+imports it needs beyond what the app has loaded anyway:
+
+    * load ms   — wall time for import + load, best of ``--repeats``
+    * memory    — bytes still allocated after loading (tracemalloc,
+                  measured in a separate run so it does not skew timing)
+    * lookup ns — per ``lookup`` over a mix of hits and misses
+
+scapy keeps a pickled cache of its parsed table between runs; its
+figures are for a warm cache unless you clear that first. It is skipped
+if scapy is not installed.
+
+Run:
+    python bench/oui_lookup_bench.py
+    python bench/oui_lookup_bench.py --repeats 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, Optional
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+
+_MACS = [
+    "b8:27:eb:11:22:33", "00:50:56:aa:bb:cc", "3c:5a:b4:01:02:03",
+    "00:55:da:11:22:33", "70:b3:d5:f2:a0:01", "02:11:22:33:44:55",
+    "fc:fb:fb:01:02:03", "da:a1:19:00:00:01",
+]
+
+# (setup, load): setup runs before the clock starts — app.network.oui_db
+# pulls in the app logger, which every DupeZ process has loaded anyway.
+_LOADERS = {
+    "bundled": (
+        "from app.network.oui_db import OUIDatabase",
+        "lookup = OUIDatabase.load().lookup",
+    ),
+    "scapy": (
+        "",
+        "from scapy.data import MANUFDB; lookup = MANUFDB.lookup",
+    ),
+}
+
+_PROBE = """
+import json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+mode = {mode!r}
+{setup}
+if mode == "memory":
+    tracemalloc.start()
+t0 = time.perf_counter()
+{loader}
+elapsed = time.perf_counter() - t0
+out = {{"load_ms": elapsed * 1000}}
+if mode == "memory":
+    out["memory"] = tracemalloc.get_traced_memory()[0]
+else:
+    macs = {macs!r}
+    n = 20000
+    t0 = time.perf_counter_ns()
+    for i in range(n):
+        lookup(macs[i % len(macs)])
+    out["lookup_ns"] = (time.perf_counter_ns() - t0) / n
+print(json.dumps(out))
+"""
+
+
+def _probe(name: str, mode: str) -> Optional[Dict[str, float]]:
+    setup, loader = _LOADERS[name]
+    code = _PROBE.format(root=_ROOT, mode=mode, setup=setup, loader=loader, macs=_MACS)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                          text=True, cwd=_ROOT)
+    if proc.returncode != 0:
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeats", type=int, default=5)
+    args = ap.parse_args()
+
+    print("=" * 70)
+    print(f"DupeZ OUI vendor table — repeats={args.repeats}")
+    print("=" * 70)
+    print(f"  {'source':<10} {'load ms':>9} {'memory KiB':>11} {'lookup ns':>10}")
+    for name in _LOADERS:
+        runs = [_probe(name, "time") for _ in range(args.repeats)]
+        if any(r is None for r in runs):
+            print(f"  {name:<10} (unavailable)")
+            continue
+        mem = _probe(name, "memory")
+        load = min(r["load_ms"] for r in runs)
+        lookup = min(r["lookup_ns"] for r in runs)
+        memory = f"{mem['memory'] / 1024:11,.0f}" if mem else f"{'?':>11}"
+        print(f"  {name:<10} {load:9.1f} {memory} {lookup:10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# bench/plugin_host_bench.py
+"""
+Plugin host benchmark — GUI frame time next to a CPU-bound plugin.
+
+Simulates the dashboard's frame loop on the main thread (a fixed slice
+of Python work every 16.7 ms, like a repaint plus status-bus callbacks)
+and reports how long after its due time each frame finishes, in three
+configurations:
+
+    1. ``baseline``   — no plugin loaded
+    2. ``in-process`` — a deliberately CPU-bound plugin loaded the way
+                        ``PluginLoader`` always has (its worker thread
+                        shares the GIL with the frame loop)
+    3. ``hosted``     — the same plugin in a ``PluginHostPool`` worker
+
+Every frame also publishes one event to the plugin, and the hosted run
+prints the pool's per-plugin CPU and call-latency report.
+
+Run:
+    python bench/plugin_host_bench.py
+    python bench/plugin_host_bench.py --seconds 5 --work-ms 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import types
+from typing import Callable, List
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_FRAME_SEC = 1 / 60
+
+_HOG = textwrap.dedent('''
+    import threading
+
+    from app.plugins.base import GenericPlugin
+
+
+    class CpuHogPlugin(GenericPlugin):
+        """Burns CPU on a background thread, like a busy analysis plugin."""
+
+        def activate(self, controller):
+            super().activate(controller)
+            self.events = 0
+            threading.Thread(target=self._burn, daemon=True).start()
+            return True
+
+        def _burn(self):
+            while self._enabled:
+                sum(i * i for i in range(20000))
+
+        def on_event(self, event, payload):
+            self.events += 1
+''')
+
+
+def _calibrate(work_ms: float) -> Callable[[], None]:
+    """Return a function doing roughly *work_ms* of pure-Python work."""
+    n = 1000
+    while True:
+        t0 = time.perf_counter()
+        sum(i * i for i in range(n))
+        elapsed = time.perf_counter() - t0
+        if elapsed > 0.005:
+            break
+        n *= 2
+    n = max(1, int(n * (work_ms / 1000.0) / elapsed))
+    return lambda: sum(i * i for i in range(n))
+
+
+def _frames(work: Callable[[], None], publish: Callable[[int], None], seconds: float) -> List[float]:
+    samples: List[float] = []
+    deadline = time.perf_counter() + seconds
+    next_frame = time.perf_counter()
+    i = 0
+    while time.perf_counter() < deadline:
+        work()
+        publish(i)
+        # Measured from when the frame was due: includes waiting for
+        # the GIL (or the CPU) after waking up.
+        samples.append((time.perf_counter() - next_frame) * 1000.0)
+        i += 1
+        next_frame += _FRAME_SEC
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    samples.sort()
+    return samples
+
+
+def _fmt(samples: List[float]) -> str:
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"frames={len(samples):5d}  p50={p50:6.2f}  p99={p99:6.2f}  max={samples[-1]:6.2f}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--work-ms", type=float, default=2.0)
+    args = ap.parse_args()
+
+    from app.plugins.host import PluginHostPool
+    from app.plugins.loader import import_plugin_class
+    from app.plugins.sandbox import activate_sandbox, plugin_scope
+
+    activate_sandbox()
+    work = _calibrate(args.work_ms)
+    tmp = tempfile.mkdtemp(prefix="dupez-plugin-bench-")
+    plugin_dir = os.path.join(tmp, "cpu_hog")
+    os.makedirs(plugin_dir)
+    with open(os.path.join(plugin_dir, "plugin.py"), "w", encoding="utf-8") as f:
+        f.write(_HOG)
+
+    print("=" * 70)
+    print(f"DupeZ plugin host benchmark — frame work {args.work_ms:.1f} ms, "
+          f"{args.seconds:.0f} s per run, cpus={os.cpu_count()}  (ms)")
+    print("=" * 70)
+
+    print(f"  baseline    {_fmt(_frames(work, lambda i: None, args.seconds))}")
+
+    _, cls = import_plugin_class("cpu_hog", plugin_dir, "plugin.py", "generic")
+    plugin = cls()
+    with plugin_scope("cpu_hog", ()):
+        plugin.activate(None)
+
+    def _publish_inproc(i: int) -> None:
+        with plugin_scope("cpu_hog", ()):
+            plugin.on_event("frame", {"n": i})
+
+    print(f"  in-process  {_fmt(_frames(work, _publish_inproc, args.seconds))}")
+    plugin.deactivate()
+    time.sleep(0.1)
+
+    pool = PluginHostPool()
+    manifest = types.SimpleNamespace(
+        name="cpu_hog", plugin_dir=plugin_dir, entry_point="plugin.py",
+        plugin_type="generic", capabilities=frozenset(), entry_sha384="",
+        host_group="",
+    )
+    pool.load(manifest)
+    try:
+        samples = _frames(work, lambda i: pool.publish("frame", {"n": i}), args.seconds)
+        print(f"  hosted      {_fmt(samples)}")
+        stats = pool.stats()["cpu_hog"]
+        print(f"\nhosted cpu_hog: worker cpu={stats.get('worker_cpu_sec', 0):.2f}s  "
+              f"events={stats.get('events')}  "
+              f"event p99={stats.get('event_wall_ms', {}).get('p99', 0):.3f} ms  "
+              f"dropped={stats.get('dropped_events')}")
+    finally:
+        pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
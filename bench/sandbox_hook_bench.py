@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# bench/sandbox_hook_bench.py
+"""
+Plugin sandbox audit-hook overhead — cost per audited event.
+
+Every ``sys.audit`` event in the process goes through the sandbox hook
+once it is installed, so its cost matters even outside plugin code.
+Measures, in nanoseconds per event:
+
+    * no hook        — ``sys.audit`` before the hook is installed
+    * no scope       — hook installed, no plugin scope on this thread
+    * scope/miss     — inside a scope, an event no rule mentions
+    * scope/allowed  — inside a scope, a rule hit the plugin may do
+    * scope/open     — inside a scope, a read-only ``open`` (conditional rule)
+
+and the same in-scope cases through the previous regex-list hook
+(called directly) for comparison.
+
+Run:
+    python bench/sandbox_hook_bench.py
+    python bench/sandbox_hook_bench.py --events 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+_CAPS = ("network.scan", "fs.read_user_data")
+
+
+def _ns_per_call(fn: Callable[[], None], n: int, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / n)
+    return best
+
+
+def _legacy_hook(sandbox):
+    """The pre-compiled-table hook: walk a regex list on every event."""
+    patterns = [
+        (re.compile(r"^socket\.(connect|bind|sendto|recvfrom)$"), sandbox._RULES[0]),
+        (re.compile(r"^(http\.client|urllib\.Request|ssl\.wrap_socket)"), sandbox._RULES[1]),
+        (re.compile(r"^(subprocess\.Popen|os\.(system|popen|exec|spawn))"), sandbox._RULES[2]),
+        (re.compile(r"^open$"), sandbox._RULES[3]),
+        (re.compile(r"^os\.(remove|unlink|rename|rmdir|chmod|chown)$"), sandbox._RULES[4]),
+        (re.compile(r"^(exec|compile)$"), sandbox._RULES[5]),
+        (re.compile(r"^import$"), sandbox._RULES[6]),
+        (re.compile(r"^ctypes\."), sandbox._RULES[7]),
+    ]
+
+    def hook(event, args):
+        s = sandbox._thread_local.stack
+        if not s:
+            return
+        ctx = s[-1]
+        for pattern, rule in patterns:
+            if not pattern.match(event):
+                continue
+            if rule.condition is not None and not rule.condition(args):
+                continue
+            if rule.capability is None or rule.capability not in ctx.capabilities:
+                raise sandbox.SandboxViolation(event)
+            return
+
+    return hook
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=200_000)
+    args = ap.parse_args()
+    n = args.events
+
+    from app.plugins import sandbox
+
+    audit = sys.audit
+    cases = {
+        "scope/miss": ("dupez.bench", ()),
+        "scope/allowed": ("socket.connect", (None, ("127.0.0.1", 9))),
+        "scope/open": ("open", ("x", "rb", 0)),
+    }
+
+    print("=" * 70)
+    print(f"DupeZ plugin sandbox audit-hook overhead — events={n:,} (ns/event)")
+    print("=" * 70)
+
+    base = _ns_per_call(lambda: audit("dupez.bench", 1), n)
+    print(f"  no hook         {base:7.1f}")
+    sandbox.activate_sandbox()
+    print(f"  no scope        {_ns_per_call(lambda: audit('dupez.bench', 1), n):7.1f}")
+
+    legacy = _legacy_hook(sandbox)
+    hook = sandbox._audit_hook
+    with sandbox.plugin_scope("bench", _CAPS):
+        for name, (event, event_args) in cases.items():
+            via_audit = _ns_per_call(lambda: audit(event, *event_args), n)
+            direct = _ns_per_call(lambda: hook(event, event_args), n)
+            old = _ns_per_call(lambda: legacy(event, event_args), n)
+            print(f"  {name:<14}  {via_audit:7.1f}   hook={direct:6.1f}  "
+                  f"regex hook={old:6.1f}")
+
+    print(f"\ncounters: {sandbox.sandbox_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# bench/status_bus_bench.py
+"""
+Status bus benchmark — Qt-thread wakeups and IPC calls per second.
+
+Runs the GUI's steady-state status consumers for a fixed wall-clock
+window in two configurations against the split-mode proxy (the
+in-process ``LoopbackClient`` stand-in for the named pipe, so every
+getter is a real encode → dispatch → decode round-trip):
+
+    1. ``polling`` — the pre-bus model: dashboard status bar (3 s),
+       Clumsy engine banner (2 s) and live stats panel (1.5 s) each on
+       their own QTimer, each tick spawning a worker thread that calls
+       the controller and emits the result back to the Qt thread.
+    2. ``bus``     — the same three consumers subscribed to one
+       ``app.core.status_bus.StatusBus`` at the rates they use now.
+
+Each configuration runs twice: ``idle`` (nothing changes, the common
+case while the app sits in the tray) and ``active`` (one disruption
+running, engine counters moving on every sample).
+
+Reported per second:
+
+    * wakeups — Qt-thread callbacks (timer fires + queued signal slots)
+    * ipc     — proxy round-trips that reached the helper dispatcher
+    * threads — worker threads spawned
+
+Run:
+    python bench/status_bus_bench.py               # 12 s per scenario
+    python bench/status_bus_bench.py --seconds 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+# Ensure app.* imports resolve when run from repo root.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.abspath(os.path.join(_HERE, ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+# ── Fake disruption_manager (no WinDivert) ────────────────────────────
+# Same shape as the real manager's status getters; ``active`` makes the
+# engine counters move on every call the way a live disruption does.
+
+class _FakeDM:
+    def __init__(self, active: bool) -> None:
+        self._active = active
+        self._packets = 0
+        self._disrupted = ["192.0.2.10"] if active else []
+
+    def get_disrupted_devices(self) -> list:
+        return list(self._disrupted)
+
+    def get_status(self) -> dict:
+        return {
+            "is_running": True,
+            "disrupted_devices_count": len(self._disrupted),
+            "disrupted_devices": list(self._disrupted),
+        }
+
+    def get_engine_stats(self) -> dict:
+        if self._active:
+            self._packets += 97
+        return {
+            "packets_processed": self._packets,
+            "packets_dropped": self._packets // 2,
+            "active_engines": 1 if self._active else 0,
+            "per_device": {},
+        }
+
+
+class _BenchController:
+    """Just the controller getters the status consumers call."""
+
+    def __init__(self, active: bool) -> None:
+        from app.firewall_helper.inproc_harness import LoopbackClient
+
+        self.ipc_calls = 0
+        self._proxy = LoopbackClient(_FakeDM(active))
+        pipe = self._proxy._client
+        real_call = pipe.call
+
+        def _counted(request, timeout_ms=0):
+            self.ipc_calls += 1
+            return real_call(request, timeout_ms)
+
+        pipe.call = _counted
+        self._devices = [object()] * 12
+
+    def get_devices(self) -> list:
+        return self._devices
+
+    def get_disrupted_devices(self) -> list:
+        return self._proxy.get_disrupted_devices()
+
+    def get_clumsy_status(self) -> dict:
+        return self._proxy.get_status()
+
+    def get_engine_stats(self) -> dict:
+        return self._proxy.get_engine_stats()
+
+
+def _make_sink():
+    from PyQt6.QtCore import QObject, pyqtSignal
+
+    class _Sink(QObject):
+        delivered = pyqtSignal(str, object)
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.wakeups = 0
+            self.threads = 0
+            self.delivered.connect(self._on_delivered)
+
+        def _on_delivered(self, _name: str, _payload: object) -> None:
+            self.wakeups += 1
+
+    return _Sink()
+
+
+def _run_polling(qapp, controller: _BenchController, seconds: float) -> Dict[str, float]:
+    from PyQt6.QtCore import QTimer
+
+    sink = _make_sink()
+    timers: List[QTimer] = []
+
+    def _poller(name: str, fetch) -> None:
+        sink.wakeups += 1  # the QTimer timeout itself
+
+        def _worker() -> None:
+            sink.delivered.emit(name, fetch())
+
+        sink.threads += 1
+        threading.Thread(target=_worker, daemon=True).start()
+
+    for name, interval_ms, fetch in (
+        ("dashboard", 3000, lambda: (len(controller.get_devices()),
+                                     controller.get_disrupted_devices())),
+        ("clumsy", 2000, lambda: (controller.get_clumsy_status(),
+                                  controller.get_disrupted_devices())),
+        ("stats", 1500, controller.get_engine_stats),
+    ):
+        timer = QTimer()
+        timer.timeout.connect(lambda n=name, f=fetch: _poller(n, f))
+        timer.start(interval_ms)
+        timers.append(timer)
+
+    _pump(qapp, seconds)
+    for timer in timers:
+        timer.stop()
+    return _rates(sink.wakeups, controller.ipc_calls, sink.threads, seconds)
+
+
+def _run_bus(qapp, controller: _BenchController, seconds: float) -> Dict[str, float]:
+    from app.core.status_bus import (
+        FIELD_DEVICE_COUNT,
+        FIELD_DISRUPTED,
+        FIELD_ENGINE_STATS,
+        FIELD_ENGINE_STATUS,
+        StatusBus,
+    )
+
+    sink = _make_sink()
+    bus = StatusBus.for_controller(controller)
+    for name, fields, rate in (
+        ("dashboard", (FIELD_DEVICE_COUNT, FIELD_DISRUPTED), 0.5),
+        ("clumsy", (FIELD_ENGINE_STATUS, FIELD_DISRUPTED), 0.5),
+        ("stats", (FIELD_ENGINE_STATS,), 1 / 1.5),
+    ):
+        bus.subscribe(
+            lambda update, n=name: sink.delivered.emit(n, update),
+            fields,
+            max_rate_hz=rate,
+        )
+    _pump(qapp, seconds)
+    bus.stop()
+    return _rates(sink.wakeups, controller.ipc_calls, 1, seconds)
+
+
+def _pump(qapp, seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    qapp.processEvents()
+
+
+def _rates(wakeups: int, ipc: int, threads: int, seconds: float) -> Dict[str, float]:
+    return {
+        "wakeups": wakeups / seconds,
+        "ipc": ipc / seconds,
+        "threads": threads / seconds,
+    }
+
+
+def _report(name: str, r: Dict[str, float]) -> None:
+    print(f"  {name:16s} wakeups={r['wakeups']:6.2f}/s  "
+          f"ipc={r['ipc']:6.2f}/s  threads={r['threads']:6.2f}/s")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=12.0)
+    args = ap.parse_args()
+
+    from PyQt6.QtCore import QCoreApplication
+    qapp = QCoreApplication.instance() or QCoreApplication([])
+
+    print("=" * 70)
+    print("DupeZ status bus benchmark — polling vs push")
+    print("=" * 70)
+    for scenario, active in (("idle", False), ("active", True)):
+        print(f"\n[{scenario}] {args.seconds:.0f} s per run")
+        _report("polling", _run_polling(qapp, _BenchController(active), args.seconds))
+        _report("bus", _run_bus(qapp, _BenchController(active), args.seconds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -139,16 +139,6 @@ def _hidden_imports() -> list:
             "win32com",
             "win32com.client",
             "pythoncom",
-            # mDNS hostname resolution — soft-imported by
-            # app/network/enhanced_scanner.py::_mdns_lookup. Listed
-            # here so PyInstaller bundles zeroconf + its submodules
-            # into the frozen exe; without this, the scanner's 4th
-            # stage silently falls through to the synthesized
-            # fallback even when zeroconf is installed in dev.
-            "zeroconf",
-            "zeroconf._utils.ipaddress",
-            "zeroconf._services.browser",
-            "zeroconf._services.info",
         ]
     )
 
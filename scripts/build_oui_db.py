@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+build_oui_db.py — build the bundled OUI database (app/resources/oui.bin).
+
+From the IEEE registry CSVs (MA-L, MA-M, MA-S and the legacy IAB list):
+
+    python scripts/build_oui_db.py \\
+        --csv oui.csv --csv mam.csv --csv oui36.csv --csv iab.csv
+
+The CSVs are published at https://standards-oui.ieee.org/ (``oui/oui.csv``,
+``oui28/mam.csv``, ``oui36/oui36.csv``, ``iab/iab.csv``). Wireshark's
+``manuf`` file — the same registry, merged with Wireshark's own
+corrections — is accepted too, for offline builds:
+
+    python scripts/build_oui_db.py --manuf /usr/share/wireshark/manuf
+
+Sources are applied in the order given, so a later file overrides an
+earlier one for the same prefix. The output is written atomically and
+read back through the loader before the script reports success.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from pathlib import Path
+from typing import Iterator, Tuple
+
+_HERE = Path(__file__).resolve().parent
+_ROOT = _HERE.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from app.network.oui_db import DEFAULT_PATH, OUIDatabase, build_database  # noqa: E402
+
+Entry = Tuple[int, int, str]
+
+
+def read_registry_csv(path: Path) -> Iterator[Entry]:
+    """IEEE registry CSV: ``Registry,Assignment,Organization Name,...``;
+    the assignment's hex length gives the prefix length."""
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        for row in csv.DictReader(fh):
+            assignment = (row.get("Assignment") or "").strip()
+            name = " ".join((row.get("Organization Name") or "").split())
+            if not assignment or not name:
+                continue
+            bits = len(assignment) * 4
+            if bits not in (24, 28, 36):
+                continue
+            yield bits, int(assignment, 16), name
+
+
+def read_manuf(path: Path) -> Iterator[Entry]:
+    """Wireshark ``manuf``: ``AA:BB:CC[:DD:E0/28]<tab>short<tab>long``."""
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split("\t")
+            spec = parts[0].strip()
+            name = " ".join((parts[2] if len(parts) > 2 else parts[-1]).split())
+            mac, _, length = spec.partition("/")
+            bits = int(length) if length else 24
+            if bits not in (24, 28, 36) or not name:
+                continue
+            digits = mac.replace(":", "").replace("-", "").replace(".", "")
+            value = int(digits, 16) << max(0, 48 - len(digits) * 4)
+            yield bits, value >> (48 - bits), name
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--csv", type=Path, action="append", default=[],
+                    help="IEEE registry CSV (repeatable)")
+    ap.add_argument("--manuf", type=Path, action="append", default=[],
+                    help="Wireshark manuf file (repeatable)")
+    ap.add_argument("--out", type=Path, default=Path(DEFAULT_PATH))
+    args = ap.parse_args()
+    if not args.csv and not args.manuf:
+        ap.error("give at least one --csv or --manuf source")
+
+    entries = []
+    for path in args.manuf:
+        entries.extend(read_manuf(path))
+    for path in args.csv:
+        entries.extend(read_registry_csv(path))
+
+    data = build_database(entries)
+    tmp = args.out.with_suffix(args.out.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, args.out)
+
+    db = OUIDatabase.load(str(args.out))
+    print(f"{args.out}: {len(db)} prefixes, {len(data) / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
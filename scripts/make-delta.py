@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+make-delta.py — build a binary delta between two DupeZ installers.
+
+Run on the release host after building the new installer and before
+signing it:
+
+    python scripts/make-delta.py \\
+        --from dist/old/DupeZ_Setup.exe --from-version 5.8.0 \\
+        --to dist/DupeZ_Setup.exe
+
+This writes ``dist/DupeZ_Setup.exe.from-5.8.0.dzpatch`` and prints how
+much it saves. Pass the patch to ``sign-release.py --patch`` so the
+signed manifest lists it, and upload it next to the installer.
+
+A patch that saves little (``--min-saving``, default 20%) is deleted
+and the script exits 2 — the installer's solid LZMA compression means
+a change early in the payload can reshuffle everything after it, and
+there is no point publishing a patch that is nearly the full size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+_ROOT = _HERE.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from app.core.update_delta import (  # noqa: E402
+    DEFAULT_BLOCK_SIZE,
+    apply_patch,
+    make_patch,
+    read_patch_header,
+)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--from", dest="old", type=Path, required=True,
+                    help="installer of the earlier release")
+    ap.add_argument("--from-version", required=True, help="version of --from")
+    ap.add_argument("--to", dest="new", type=Path, required=True,
+                    help="installer of the new release")
+    ap.add_argument("--out", type=Path, default=None, help="override patch path")
+    ap.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    ap.add_argument("--min-saving", type=float, default=0.2,
+                    help="delete the patch unless it saves this fraction")
+    args = ap.parse_args()
+
+    out = args.out or args.new.with_name(
+        f"{args.new.name}.from-{args.from_version}.dzpatch"
+    )
+    stats = make_patch(args.old, args.new, out, block_size=args.block_size)
+
+    # Prove the patch reproduces the new installer before anyone signs it.
+    _, new_size, _, new_sha = read_patch_header(out)
+    check = out.with_name(out.name + ".check")
+    try:
+        apply_patch(args.old, out, check, expected_sha256=new_sha, expected_size=new_size)
+    finally:
+        check.unlink(missing_ok=True)
+
+    saving = 1 - stats["patch_size"] / stats["new_size"] if stats["new_size"] else 0.0
+    print(f"Patch written: {out}")
+    print(f"  from:      {args.old} ({stats['old_size']} bytes)")
+    print(f"  to:        {args.new} ({stats['new_size']} bytes)")
+    print(f"  reused:    {stats['copied']} bytes, new: {stats['inserted']} bytes")
+    print(f"  patch:     {stats['patch_size']} bytes ({saving:.0%} saved per download)")
+    if saving < args.min_saving:
+        out.unlink()
+        print(f"Saving below {args.min_saving:.0%}; patch discarded.")
+        return 2
+    print()
+    print("Next: sign-release.py --sign ... "
+          f"--patch {out}:{args.from_version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
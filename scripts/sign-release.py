@@ -30,6 +30,14 @@ Sign an installer for release:
         --installer dist/DupeZ_Setup.exe \\
         --version 5.8.0
 
+Binary deltas from earlier releases (built with ``make-delta.py``)
+are listed in the signed manifest with one ``--patch`` per patch:
+
+    python scripts/sign-release.py --sign ... \\
+        --patch dist/DupeZ_Setup.exe.from-5.8.0.dzpatch:5.8.0
+
+Upload each ``.dzpatch`` next to the installer as well.
+
 This writes:
 
     dist/DupeZ_Setup.exe.manifest.json
@@ -78,6 +86,7 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Sequence, Tuple
 
 # Make repo root importable so we share constants with the client.
 _HERE = Path(__file__).resolve().parent
@@ -85,6 +94,7 @@ _ROOT = _HERE.parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
+from app.core.update_delta import read_patch_header  # noqa: E402
 from app.core.update_verify import (  # noqa: E402
     MANIFEST_SCHEMA,
     SIGNATURE_SIZE,
@@ -156,14 +166,35 @@ def _hash_file(path: Path) -> tuple[str, int]:
     return h.hexdigest(), size
 
 
+def _patch_entry(path: Path, from_version: str, sha256_hex: str, size: int) -> dict:
+    """Manifest entry for a ``.dzpatch``; its header names the source."""
+    old_size, new_size, old_sha, new_sha = read_patch_header(path)
+    if (new_sha, new_size) != (sha256_hex, size):
+        raise ValueError(f"{path} does not produce this installer")
+    patch_sha, patch_size = _hash_file(path)
+    return {
+        "from_version": from_version,
+        "from_sha256": old_sha,
+        "from_size": old_size,
+        "filename": path.name,
+        "sha256": patch_sha,
+        "size": patch_size,
+    }
+
+
 def sign_release(
     priv_path: Path,
     installer_path: Path,
     version: str,
     out_manifest: Path,
     out_sig: Path,
+    patches: Sequence[Tuple[Path, str]] = (),
 ) -> None:
-    """Build, serialize, and sign an update manifest for *installer_path*."""
+    """Build, serialize, and sign an update manifest for *installer_path*.
+
+    *patches* are ``(patch_path, from_version)`` pairs; each must
+    rebuild exactly this installer.
+    """
     from cryptography.hazmat.primitives import serialization
     from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
@@ -199,6 +230,11 @@ def sign_release(
             "size": size_bytes,
         },
     }
+    if patches:
+        manifest_obj["patches"] = [
+            _patch_entry(path, from_version, sha256_hex, size_bytes)
+            for path, from_version in patches
+        ]
     # Canonical JSON: sorted keys, no trailing newline, UTF-8.
     # The client verifies the signature over these EXACT bytes, so we
     # write them once and never re-serialize.
@@ -236,6 +272,9 @@ def sign_release(
     print(f"  installer:   {parsed.installer_filename}")
     print(f"  sha256:      {parsed.installer_sha256}")
     print(f"  size:        {parsed.installer_size}")
+    for patch in parsed.patches:
+        print(f"  patch:       {patch.filename} (from {patch.from_version}, "
+              f"{patch.size} bytes)")
     print(f"  fingerprint: {fingerprint.hex()}")
     print()
     print("Self-verify: OK. Ready to upload to the release alongside the installer.")
@@ -286,6 +325,9 @@ def main() -> int:
     ap.add_argument("--out-sig", type=Path, default=None,
                     help="override output signature path")
 
+    ap.add_argument("--patch", action="append", default=[], metavar="PATCH:FROM_VERSION",
+                    help="list a delta patch in the manifest (repeatable)")
+
     ap.add_argument("--verify", action="store_true",
                     help="re-verify an already-signed installer using a pubkey PEM")
     ap.add_argument("--pub", type=Path, help="pubkey PEM (for --verify)")
@@ -307,7 +349,14 @@ def main() -> int:
         out_sig = args.out_sig or args.installer.with_name(
             args.installer.name + ".manifest.sig"
         )
-        sign_release(args.priv, args.installer, args.version, out_manifest, out_sig)
+        patches = []
+        for spec in args.patch:
+            path, sep, from_version = spec.rpartition(":")
+            if not sep or not path or not from_version:
+                ap.error(f"--patch expects PATCH:FROM_VERSION, got {spec!r}")
+            patches.append((Path(path), from_version))
+        sign_release(args.priv, args.installer, args.version, out_manifest, out_sig,
+                     patches=patches)
         return 0
 
     if args.verify:
@@ -68,6 +68,16 @@ def data_dir(tmp_path):
     return str(d)
 
 
+@pytest.fixture(autouse=True)
+def isolate_query_cache():
+    """Never let one test's stubbed subprocess output answer another's."""
+    from app.core.query_cache import get_query_cache
+
+    get_query_cache().clear()
+    yield
+    get_query_cache().clear()
+
+
 @pytest.fixture(autouse=True)
 def isolate_operation_journal(monkeypatch, tmp_path):
     """Never let tests write the host user's crash-recovery marker."""
@@ -0,0 +1,219 @@
+"""Shared A2S cache: TTLs, single-flight, challenge reuse, subscribers."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.network import a2s_cache, a2s_probe
+from app.network.a2s_cache import A2SCache
+from app.network.a2s_probe import A2SSnapshot
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _snap(players: int = 10, reachable: bool = True) -> A2SSnapshot:
+    return A2SSnapshot(
+        ts=time.time(), reachable=reachable,
+        player_count=players if reachable else None, max_players=60,
+        server_name="srv", rtt_ms=20.0, error=None if reachable else "timeout",
+    )
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Stub for the blocking A2S helpers; records every call."""
+
+    class Server:
+        calls = []
+        players = 10
+        reachable = True
+        delay = 0.0
+        challenge = b"\x01\x02\x03\x04"
+
+        def info(self, host, port, timeout_s=1.0, challenge=None):
+            self.calls.append(("info", host, port, challenge))
+            if self.delay:
+                time.sleep(self.delay)
+            return _snap(self.players, self.reachable), self.challenge
+
+        def roster(self, host, port, timeout_s=1.0, challenge=None):
+            self.calls.append(("players", host, port, challenge))
+            if self.delay:
+                time.sleep(self.delay)
+            return ("alice", "bob"), None, self.challenge
+
+    stub = Server()
+    stub.calls = []
+    monkeypatch.setattr(a2s_probe, "_query_info", stub.info)
+    monkeypatch.setattr(a2s_probe, "_query_players", stub.roster)
+    return stub
+
+
+def test_fresh_entries_are_served_from_cache(server) -> None:
+    clock = _Clock()
+    cache = A2SCache(ttl_s=2.0, clock=clock)
+
+    first = cache.get_info("10.0.0.1", 2303)
+    clock.now += 1.0
+    assert cache.get_info("10.0.0.1", 2303) is first
+    # A caller needing fresher data than the entry's age triggers a query.
+    assert cache.get_info("10.0.0.1", 2303, max_age=0.5) is not first
+    clock.now += 2.5
+    cache.get_info("10.0.0.1", 2303)
+
+    assert len(server.calls) == 3
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+
+def test_negative_results_expire_quickly(server) -> None:
+    clock = _Clock()
+    cache = A2SCache(ttl_s=5.0, negative_ttl_s=0.5, clock=clock)
+    server.reachable = False
+
+    assert not cache.get_info("10.0.0.1", 2303).reachable
+    clock.now += 0.4
+    cache.get_info("10.0.0.1", 2303)
+    assert len(server.calls) == 1 and cache.stats()["negative_hits"] == 1
+
+    server.reachable = True
+    clock.now += 0.2
+    assert cache.get_info("10.0.0.1", 2303).reachable
+    assert len(server.calls) == 2
+
+
+def test_concurrent_misses_share_one_query(server) -> None:
+    cache = A2SCache()
+    server.delay = 0.2
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_info("10.0.0.1", 2303))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert len(server.calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["coalesced"] == 7 and stats["in_flight"] == 0
+
+
+@pytest.mark.parametrize("kind", ["info", "players"])
+def test_waiter_timeout_keeps_the_result_shape(server, kind) -> None:
+    cache = A2SCache()
+    server.delay = 1.5
+    get = getattr(cache, "get_info" if kind == "info" else "get_players")
+    leader = threading.Thread(target=get, args=("10.0.0.1", 2303), kwargs={"timeout_s": 2.0})
+    leader.start()
+    time.sleep(0.1)
+
+    # Waits at most 2 * 0.05 + 1 s for a leader that needs 1.5 s.
+    result = get("10.0.0.1", 2303, timeout_s=0.05)
+    leader.join(5)
+
+    assert cache.stats()["coalesced"] == 1
+    if kind == "info":
+        assert not result.reachable and result.error == "timeout"
+    else:
+        names, error = result
+        assert names == () and error == "timeout"
+
+
+def test_challenge_is_cached_per_server(server) -> None:
+    clock = _Clock()
+    cache = A2SCache(ttl_s=0.0, challenge_ttl_s=30.0, clock=clock)
+
+    cache.get_info("10.0.0.1", 2303)
+    clock.now += 1
+    cache.get_players("10.0.0.1", 2303)
+    clock.now += 1
+    cache.get_info("10.0.0.2", 2303)
+    clock.now += 40
+    cache.get_info("10.0.0.1", 2303)
+
+    assert [c[3] for c in server.calls] == [None, server.challenge, None, None]
+    assert cache.stats()["challenge_reuse"] == 1
+
+
+def test_players_are_cached_separately(server) -> None:
+    cache = A2SCache()
+
+    assert cache.get_players("10.0.0.1", 2303) == (("alice", "bob"), None)
+    assert cache.get_players("10.0.0.1", 2303) == (("alice", "bob"), None)
+    cache.get_info("10.0.0.1", 2303)
+
+    assert [c[0] for c in server.calls] == ["players", "info"]
+
+
+def test_subscribers_hear_every_refresh(server) -> None:
+    clock = _Clock()
+    cache = A2SCache(ttl_s=1.0, clock=clock)
+    seen = []
+    cache.subscribe("10.0.0.1", 2303, lambda key, snap: seen.append((key, snap.player_count)))
+    cache.subscribe("10.0.0.1", 2303, lambda key, snap: 1 / 0)  # must not break others
+
+    cache.get_info("10.0.0.1", 2303)
+    cache.get_info("10.0.0.1", 2303)
+    server.players = 9
+    clock.now += 2
+    cache.get_info("10.0.0.1", 2303)
+
+    assert seen == [(("10.0.0.1", 2303, "info"), 10), (("10.0.0.1", 2303, "info"), 9)]
+
+
+def test_probes_of_one_server_share_queries(server, monkeypatch) -> None:
+    monkeypatch.setattr(a2s_cache, "_cache", A2SCache())
+    probes = [a2s_probe.A2SProbe("10.0.0.1", 2303, interval_s=0.5) for _ in range(3)]
+    for p in probes:
+        p.start()
+    try:
+        deadline = time.monotonic() + 2
+        while any(p.latest() is None for p in probes) and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        for p in probes:
+            p.stop()
+
+    assert all(p.baseline_count() == 10 for p in probes)
+    assert len([c for c in server.calls if c[0] == "info"]) == 1
+
+
+def test_batch_lookup_reuses_cache_and_queries_misses_together(server, monkeypatch) -> None:
+    from app.network import a2s_engine
+
+    batches = []
+
+    class Engine:
+        def __init__(self, **kw):
+            pass
+
+        def iter_info(self, targets):
+            targets = list(targets)
+            batches.append(targets)
+            for h, p in targets:
+                yield a2s_engine.A2SQueryResult(h, p, _snap(players=p % 100))
+
+    monkeypatch.setattr(a2s_engine, "A2SQueryEngine", Engine)
+    cache = A2SCache()
+    cache.get_info("10.0.0.1", 2303)
+
+    results = cache.get_info_many([("10.0.0.1", 2303), ("10.0.0.2", 2305), ("10.0.0.3", 2307)])
+
+    assert batches == [[("10.0.0.2", 2305), ("10.0.0.3", 2307)]]
+    assert {r.host for r in results} == {"10.0.0.1", "10.0.0.2", "10.0.0.3"}
+    assert cache.get_info("10.0.0.3", 2307).player_count == 7
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,280 @@
+"""Concurrent A2S_INFO engine against a local fake A2S server."""
+
+from __future__ import annotations
+
+import bz2
+import json
+import selectors
+import socket
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import pytest
+
+from app.network import a2s_engine, a2s_probe
+from app.network.a2s_engine import A2SQueryEngine, configured_servers, query_info_many
+
+_CHALLENGE = b"\x11\x22\x33\x44"
+_QUERY = b"\xff\xff\xff\xffTSource Engine Query\x00"
+_SHIPPED_SERVERS = Path(a2s_engine.__file__).parents[1] / "config" / "dayz_servers.json"
+
+
+def _info(name: str, players: int, max_players: int = 60) -> bytes:
+    return (
+        b"\xff\xff\xff\xffI\x11"
+        + name.encode() + b"\x00" + b"chernarusplus\x00" + b"dayz\x00" + b"DayZ\x00"
+        + b"\x00\x00"  # app id
+        + bytes([players, max_players]) + b"\x00dw\x00\x00"
+    )
+
+
+def _split(packet: bytes, pid: int, *, compress: bool = False, size: int = 1200):
+    body = packet
+    if compress:
+        pid |= 0x80000000
+        body = struct.pack("<II", len(packet), zlib.crc32(packet)) + bz2.compress(packet)
+    chunks = [body[i:i + size] for i in range(0, len(body), size)]
+    return [
+        b"\xfe\xff\xff\xff" + struct.pack("<IBBH", pid, len(chunks), n, size) + c
+        for n, c in enumerate(chunks)
+    ]
+
+
+class _FakeServers:
+    """Many fake A2S servers on loopback, served by one selector thread.
+
+    Per-port behaviour: ``delay`` before answering, ``challenge`` (demand
+    S2C_CHALLENGE first), ``split`` (None, "plain" or "bz2"), ``silent``.
+    """
+
+    def __init__(self) -> None:
+        self.sel = selectors.DefaultSelector()
+        self.behaviour = {}
+        self.received = []  # (port, monotonic time, payload)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def add(self, name: str, players: int = 10, **behaviour) -> int:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.setblocking(False)
+        port = sock.getsockname()[1]
+        self.behaviour[port] = dict(name=name, players=players, **behaviour)
+        self.sel.register(sock, selectors.EVENT_READ, port)
+        return port
+
+    def start(self) -> "_FakeServers":
+        self._thread.start()
+        return self
+
+    def _answer(self, sock, port, data, addr) -> None:
+        b = self.behaviour[port]
+        if b.get("silent") or not data.startswith(_QUERY):
+            return
+        suffix = data[len(_QUERY):]
+        if b.get("challenge") and suffix != _CHALLENGE:
+            replies = [b"\xff\xff\xff\xffA" + _CHALLENGE]
+        else:
+            packet = _info(b["name"], b["players"])
+            split = b.get("split")
+            replies = _split(packet, port, compress=split == "bz2") if split else [packet]
+            if b.get("reverse"):
+                replies.reverse()
+        delay = b.get("delay", 0.0)
+
+        def send():
+            for r in replies:
+                sock.sendto(r, addr)
+
+        if delay:
+            threading.Timer(delay, send).start()
+        else:
+            send()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            for key, _ in self.sel.select(0.05):
+                try:
+                    data, addr = key.fileobj.recvfrom(2048)
+                except OSError:
+                    continue
+                self.received.append((key.data, time.monotonic(), data))
+                self._answer(key.fileobj, key.data, data, addr)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(2)
+        for key in list(self.sel.get_map().values()):
+            key.fileobj.close()
+        self.sel.close()
+
+
+@pytest.fixture
+def fake():
+    servers = _FakeServers()
+    yield servers
+    servers.close()
+
+
+def test_many_servers_in_parallel_stream_back_sorted_by_rtt(fake) -> None:
+    ports = {fake.add(f"srv{i}", delay=0.05 * (i % 5)): i for i in range(150)}
+    fake.start()
+    streamed = []
+
+    t0 = time.monotonic()
+    results = query_info_many(
+        [("127.0.0.1", p) for p in ports], timeout_s=2.0, send_rate=5000,
+        on_result=streamed.append,
+    )
+    elapsed = time.monotonic() - t0
+
+    assert len(results) == 150 and all(r.reachable for r in results)
+    # Sequentially this would be ~150 × 0.1 s on average.
+    assert elapsed < 2.0
+    rtts = [r.rtt_ms for r in results]
+    assert rtts == sorted(rtts)
+    assert results[0].snapshot.server_name.startswith("srv")
+    assert ports[results[-1].port] % 5 == 4
+    # Streaming order already tracks RTT closely.
+    assert ports[streamed[0].port] % 5 == 0
+
+
+def test_challenge_and_split_responses(fake) -> None:
+    long_name = "x" * 3000
+    plain = fake.add(long_name, split="plain", reverse=True)
+    packed = fake.add(long_name, players=7, split="bz2", challenge=True)
+    chall = fake.add("challenged", players=3, challenge=True)
+    fake.start()
+
+    by_port = {r.port: r for r in query_info_many(
+        [("127.0.0.1", p) for p in (plain, packed, chall)], timeout_s=2.0,
+    )}
+
+    assert by_port[plain].snapshot.server_name == long_name
+    assert by_port[packed].snapshot.player_count == 7
+    assert by_port[chall].snapshot.player_count == 3
+    assert [d for p, _, d in fake.received if p == chall] == [_QUERY, _QUERY + _CHALLENGE]
+
+
+def test_blocking_single_query_reassembles_split_responses(fake) -> None:
+    port = fake.add("y" * 2500, players=4, split="bz2", challenge=True)
+    fake.start()
+
+    snap = a2s_probe.query_info_once("127.0.0.1", port, timeout_s=2.0)
+
+    assert snap.reachable and snap.player_count == 4
+
+
+def test_silent_servers_time_out_without_holding_up_the_rest(fake) -> None:
+    up = fake.add("up")
+    down = fake.add("down", silent=True)
+    fake.start()
+
+    engine = A2SQueryEngine(timeout_s=0.3)
+    t0 = time.monotonic()
+    results = engine.query_info([("127.0.0.1", down), ("127.0.0.1", up)])
+
+    assert time.monotonic() - t0 < 1.0
+    assert [(r.port, r.reachable) for r in results] == [(up, True), (down, False)]
+    assert results[1].snapshot.error == "timeout"
+
+
+def test_sends_are_rate_limited(fake) -> None:
+    ports = [fake.add(f"s{i}") for i in range(72)]
+    fake.start()
+
+    query_info_many([("127.0.0.1", p) for p in ports], send_rate=100, timeout_s=2.0)
+
+    stamps = sorted(t for _, t, _ in fake.received)
+    # 32-query burst, then 40 more at 100/s.
+    assert stamps[-1] - stamps[0] >= 0.3
+
+
+def test_in_flight_window_is_bounded(fake) -> None:
+    ports = [fake.add(f"s{i}", delay=0.1) for i in range(20)]
+    fake.start()
+
+    results = query_info_many([("127.0.0.1", p) for p in ports],
+                              max_in_flight=5, timeout_s=2.0)
+
+    assert all(r.reachable for r in results)
+    stamps = sorted(t for _, t, _ in fake.received)
+    assert stamps[-1] - stamps[0] >= 0.3  # four waves of five
+
+
+def test_names_resolve_on_a_pool_before_the_event_loop(fake, monkeypatch) -> None:
+    ports = [fake.add(f"named{i}") for i in range(4)]
+    fake.start()
+    real = socket.getaddrinfo
+    lookups = []
+
+    def slow_getaddrinfo(host, port, *args, flags=0, **kwargs):
+        if host.endswith(".test"):
+            if flags & socket.AI_NUMERICHOST:
+                raise socket.gaierror(socket.EAI_NONAME, "not numeric")
+            lookups.append(threading.current_thread().name)
+            if host == "missing.test":
+                raise socket.gaierror(socket.EAI_NONAME, "no such host")
+            time.sleep(0.3)
+            host = "127.0.0.1"
+        return real(host, port, *args, flags=flags, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    targets = [(f"srv{i}.test", p) for i, p in enumerate(ports)] + [("missing.test", 1)]
+
+    t0 = time.monotonic()
+    results = query_info_many(targets, timeout_s=2.0)
+
+    # Four 0.3 s lookups in parallel, none on the querying thread.
+    assert time.monotonic() - t0 < 1.0
+    assert len(lookups) == 5
+    assert all(name.startswith("DupeZA2SResolve") for name in lookups)
+    assert sum(r.reachable for r in results) == 4
+    assert results[-1].host == "missing.test"
+    assert results[-1].snapshot.error.startswith("resolve failed")
+
+
+@pytest.fixture
+def populated_servers_json(tmp_path):
+    """The shipped dayz_servers.json with both server lists filled in."""
+    shipped = json.loads(_SHIPPED_SERVERS.read_text(encoding="utf-8"))
+    shipped["favorites"] = [
+        "203.0.113.10:27016",
+        "[2001:db8::10]:27016",
+        {"ip": "203.0.113.11", "query_port": 27017, "name": "Community 1"},
+        "203.0.113.12",                              # no port
+        {"ip": "203.0.113.13", "query_port": "27016"},  # port not an int
+    ]
+    shipped["known_servers"] = [
+        {"host": "dayz.example.org", "port": 2303},
+        {"address": "203.0.113.14", "port": 70000},  # out of range
+        "203.0.113.10:27016",
+    ]
+    path = tmp_path / "dayz_servers.json"
+    path.write_text(json.dumps(shipped), encoding="utf-8")
+    return path
+
+
+def test_configured_servers_reads_favorites_and_known(populated_servers_json, monkeypatch,
+                                                      tmp_path) -> None:
+    warnings = []
+    monkeypatch.setattr(a2s_engine, "log_warning", warnings.append)
+
+    assert configured_servers(populated_servers_json) == [
+        ("203.0.113.10", 27016), ("2001:db8::10", 27016), ("203.0.113.11", 27017),
+        ("dayz.example.org", 2303),
+    ]
+    assert [w.split("skipping ")[1].split(";")[0] for w in warnings] == [
+        "favorites[3]", "favorites[4]", "known_servers[1]",
+    ]
+    assert configured_servers(tmp_path / "missing.json") == []
+
+
+def test_shipped_server_list_parses_cleanly(monkeypatch) -> None:
+    warnings = []
+    monkeypatch.setattr(a2s_engine, "log_warning", warnings.append)
+    assert configured_servers(_SHIPPED_SERVERS) == []
+    assert warnings == []
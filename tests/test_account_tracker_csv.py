@@ -94,6 +94,15 @@ def _load_tracker_helpers():
         "_normalize_header", "_canon_status", "_canon_station",
         "_account_text_blob", "_infer_dayz_map", "_has_open_needs",
         "_value_bucket", "_filter_dayz_accounts",
+        # streaming import / export pipeline
+        "TABLE_HEADERS", "STATUS_COLORS",
+        "_CSV_CHUNK_ROWS", "_XLSX_PROGRESS_ROWS", "_IMPORT_ERROR_SAMPLE",
+        "_XLSX_HEADER_SCAN_ROWS", "_XLSX_INFER_SAMPLE_ROWS",
+        "_XLSX_BASE_HEADERS", "_TransferCancelled", "_ImportSummary",
+        "_account_key", "_validate_account_row", "_cell_text",
+        "_check_cancel", "_iter_csv_account_rows", "_map_csv_row",
+        "_iter_xlsx_account_rows", "_stream_import_accounts",
+        "_estimate_row_count", "_write_accounts_csv", "_write_accounts_xlsx",
     }
     new_body = []
     for node in tree.body:
@@ -112,12 +121,28 @@ def _load_tracker_helpers():
         elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
             if node.target.id in keep_names:
                 new_body.append(node)
-        elif isinstance(node, ast.FunctionDef) and node.name in keep_names:
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in keep_names:
             new_body.append(node)
 
     tree.body = new_body
     ast.fix_missing_locations(tree)
-    ns: dict = {"__name__": "tracker_helpers", "__builtins__": __builtins__}
+
+    class _Color:
+        def __init__(self, r, g, b):
+            self._rgb = (r, g, b)
+        def red(self): return self._rgb[0]
+        def green(self): return self._rgb[1]
+        def blue(self): return self._rgb[2]
+
+    # @dataclass resolves string annotations through sys.modules, so the
+    # extracted helpers need a real (registered) module namespace; the
+    # ``tracker`` fixture unregisters it again.
+    _quiet = lambda *a, **kw: None
+    module = types.ModuleType("tracker_helpers")
+    module.__dict__.update(QColor=_Color, log_info=_quiet,
+                           log_warning=_quiet, log_error=_quiet)
+    sys.modules["tracker_helpers"] = module
+    ns = module.__dict__
     code = compile(tree, "dayz_account_tracker_helpers", "exec")
     exec(code, ns)
     return ns
@@ -125,7 +150,12 @@ def _load_tracker_helpers():
 
 @pytest.fixture(scope="module")
 def tracker():
-    return _load_tracker_helpers()
+    # Module-scoped, so no monkeypatch: drop the stub module by hand so
+    # its fake QColor / log_* never reach later tests.
+    try:
+        yield _load_tracker_helpers()
+    finally:
+        sys.modules.pop("tracker_helpers", None)
 
 
 # ── Header normalisation ──────────────────────────────────────────────
@@ -308,3 +338,112 @@ def test_xlsx_default_fields_matches_account_fields(tracker):
         "positional mapping field list must equal ACCOUNT_FIELDS — "
         "any drift here is the off-by-one regression that dropped 'value'"
     )
+
+
+# ── Streaming import / export pipeline ────────────────────────────────
+
+def test_stream_csv_maps_headers_and_dedupes(tracker, tmp_path):
+    path = tmp_path / "accounts.csv"
+    path.write_text(
+        "\ufeffCharacter;E-Mail;Kit;State;Mystery\n"
+        "Alpha;a@x.io;raider kit;ready;?\n"
+        "alpha;dup@x.io;;;\n"
+        "Bravo;not-an-email;;;\n"
+        "Existing;;;;\n"
+        "Charlie;;;storage;\n",
+        encoding="utf-8",
+    )
+    summary = tracker["_stream_import_accounts"](str(path), {"existing"})
+
+    names = [a["account"] for a in summary.accounts]
+    assert names == ["Alpha", "Charlie"]
+    assert summary.delimiter == ";"
+    assert summary.accounts[0]["station"] == "Raider Kit"
+    assert summary.accounts[0]["status"] == "Ready"
+    assert summary.accounts[1]["status"] == "Storage"
+    assert summary.imported == 2
+    assert summary.duplicates == 2
+    assert summary.skipped == 3
+    assert summary.unmapped == ["Mystery"]
+    assert len(summary.errors) == 1 and "bad email" in summary.errors[0]
+    assert len({a["id"] for a in summary.accounts}) == 2
+
+
+def test_stream_csv_positional_fallback_imports_every_row(tracker, tmp_path):
+    path = tmp_path / "headerless.csv"
+    path.write_text("Main,m@x.io,Tisy\nMule,,Coast\nFresh,,Elektro\n", encoding="utf-8")
+    summary = tracker["_stream_import_accounts"](str(path), set())
+    assert [a["account"] for a in summary.accounts] == ["Main", "Mule", "Fresh"]
+    assert summary.accounts[2]["location"] == "Elektro"
+
+
+def test_stream_xlsx_infers_blank_account_header_and_counts_bases(tracker, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["DayZ roster"])
+    ws.append([None, "Email", "Status", "Notes"])
+    ws.append(["Main", "m@x.io", "READY", "north"])
+    ws.append(["Mule", None, "storage", None])
+    ws.append([None, None, None, None])
+    ws.append(["Bases", None])
+    ws.append(["Tisy stash", "1234"])
+    ws.append(["Coast shed", None])
+    path = tmp_path / "roster.xlsx"
+    wb.save(path)
+
+    summary = tracker["_stream_import_accounts"](str(path), set())
+    assert [a["account"] for a in summary.accounts] == ["Main", "Mule"]
+    assert summary.accounts[0]["status"] == "Ready"
+    assert summary.accounts[1]["status"] == "Storage"
+    assert summary.bases == 2
+    assert summary.fmt == "XLSX"
+
+
+def test_stream_import_honours_cancel(tracker, tmp_path):
+    import threading
+    path = tmp_path / "big.csv"
+    rows = "\n".join(f"acct{i},a{i}@x.io" for i in range(5000))
+    path.write_text("account,email\n" + rows + "\n", encoding="utf-8")
+    cancel = threading.Event()
+    seen = []
+
+    def _progress(done, total):
+        seen.append(done)
+        cancel.set()
+
+    with pytest.raises(tracker["_TransferCancelled"]):
+        tracker["_stream_import_accounts"](
+            str(path), set(), progress=_progress, cancel_event=cancel,
+        )
+    assert seen and seen[0] < 5000
+
+
+@pytest.mark.parametrize("ext", ["csv", "xlsx"])
+def test_export_round_trips_through_import(tracker, tmp_path, ext):
+    if ext == "xlsx":
+        pytest.importorskip("openpyxl")
+    accounts = _sample_accounts()
+    for a in accounts:
+        a["email"] = ""
+    path = tmp_path / f"export.{ext}"
+    writer = tracker["_write_accounts_xlsx" if ext == "xlsx" else "_write_accounts_csv"]
+    assert writer(str(path), accounts) == len(accounts)
+    assert not (tmp_path / f"export.{ext}.part").exists()
+
+    summary = tracker["_stream_import_accounts"](str(path), set())
+    fields = tracker["ACCOUNT_FIELDS"]
+    got = [{f: a[f] for f in fields} for a in summary.accounts]
+    want = [{f: a.get(f, "") for f in fields} for a in accounts]
+    assert got == want
+
+
+def test_cancelled_export_leaves_no_file(tracker, tmp_path):
+    import threading
+    cancel = threading.Event()
+    cancel.set()
+    path = tmp_path / "out.csv"
+    with pytest.raises(tracker["_TransferCancelled"]):
+        tracker["_write_accounts_csv"](str(path), _sample_accounts(), cancel_event=cancel)
+    assert not path.exists()
+    assert not (tmp_path / "out.csv.part").exists()
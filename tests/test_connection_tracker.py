@@ -0,0 +1,219 @@
+"""Connection tracker diffs, caches and backoff; the mapper's diff-driven table."""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from app.network.connection_tracker import ConnectionKey, ConnectionTracker
+
+
+def _sock(lport, rip, rport, *, pid=100, status="ESTABLISHED", udp=False):
+    return SimpleNamespace(
+        laddr=SimpleNamespace(ip="192.0.2.10", port=lport),
+        raddr=SimpleNamespace(ip=rip, port=rport) if rip else (),
+        type=socket.SOCK_DGRAM if udp else socket.SOCK_STREAM,
+        status="NONE" if udp else status,
+        pid=pid,
+    )
+
+
+class _Table:
+    """Mutable fake socket table plus counting process / DNS lookups."""
+
+    def __init__(self, *socks) -> None:
+        self.socks = list(socks)
+        self.names = {100: "DayZ_x64.exe", 200: "chrome.exe"}
+        self.name_calls = []
+        self.dns_calls = []
+
+    def read(self):
+        return list(self.socks)
+
+    def process_name(self, pid):
+        self.name_calls.append(pid)
+        return self.names.get(pid, "")
+
+    def resolve(self, ip):
+        self.dns_calls.append(ip)
+        return f"host-{ip}"
+
+    def tracker(self, **kwargs) -> ConnectionTracker:
+        return ConnectionTracker(reader=self.read, process_namer=self.process_name,
+                                 resolver=self.resolve, **kwargs)
+
+
+def test_samples_diff_by_socket_identity() -> None:
+    table = _Table(
+        _sock(50000, "198.51.100.7", 2302),
+        _sock(50001, "203.0.113.9", 443, pid=200),
+        _sock(50002, "127.0.0.1", 8080),       # loopback: ignored
+        _sock(50003, None, 0),                 # listening: ignored
+        _sock(50004, "198.51.100.7", 2303, udp=True),
+    )
+    tracker = table.tracker()
+
+    first = tracker.sample()
+    assert len(first.added) == 3 and not first.removed and not first.changed
+    assert first.total == 3
+    game = next(c for c in first.added if c.rport == 2302)
+    assert game.key == ConnectionKey(("192.0.2.10", 50000), ("198.51.100.7", 2302), "TCP", 100)
+    assert game.process == "DayZ_x64.exe"
+    assert {c.proto for c in first.added} == {"TCP", "UDP"}
+
+    assert not tracker.sample()
+
+    table.socks[0] = _sock(50000, "198.51.100.7", 2302, status="CLOSE_WAIT")
+    del table.socks[1]
+    table.socks.append(_sock(50005, "203.0.113.20", 443, pid=200))
+    diff = tracker.sample()
+    assert [c.state for c in diff.changed] == ["CLOSE_WAIT"]
+    assert [k.raddr for k in diff.removed] == [("203.0.113.9", 443)]
+    assert [c.rip for c in diff.added] == ["203.0.113.20"]
+    # Unchanged sockets keep their object between samples.
+    udp = next(c for c in first.added if c.proto == "UDP")
+    assert any(c is udp for c in tracker.connections())
+
+
+def test_process_names_are_cached_until_the_pid_goes_away() -> None:
+    table = _Table(_sock(50000, "198.51.100.7", 2302), _sock(50001, "198.51.100.8", 2302),
+                   _sock(50002, "203.0.113.9", 443, pid=200))
+    tracker = table.tracker()
+
+    for _ in range(3):
+        tracker.sample()
+    assert sorted(table.name_calls) == [100, 200]
+
+    # pid 200 exits; a new process reusing the pid is looked up afresh.
+    del table.socks[2]
+    tracker.sample()
+    assert tracker.stats()["cached_processes"] == 1
+    table.names[200] = "launcher.exe"
+    table.socks.append(_sock(50003, "203.0.113.9", 443, pid=200))
+    diff = tracker.sample()
+    assert [c.process for c in diff.added] == ["launcher.exe"]
+    assert tracker.stats()["process_lookups"] == 3
+
+
+def test_hostnames_resolve_once_per_ip_and_arrive_as_changes() -> None:
+    table = _Table(_sock(50000, "198.51.100.7", 2302), _sock(50001, "198.51.100.7", 2303))
+    tracker = table.tracker()
+    tracker.sample()
+    assert table.dns_calls == []
+
+    tracker.resolve_hostnames = True
+    diff = tracker.sample()
+    assert {c.hostname for c in diff.changed} == {"host-198.51.100.7"}
+    assert len(diff.changed) == 2
+    tracker.sample()
+    assert table.dns_calls == ["198.51.100.7"]
+
+
+def test_interval_backs_off_while_idle_and_resets_on_change() -> None:
+    table = _Table(_sock(50000, "198.51.100.7", 2302))
+    tracker = table.tracker(min_interval_s=1.0, max_interval_s=6.0)
+
+    tracker.sample()
+    assert tracker.interval_s == 1.0
+    intervals = []
+    for _ in range(4):
+        tracker.sample()
+        intervals.append(tracker.interval_s)
+    assert intervals == [2.0, 4.0, 6.0, 6.0]
+    assert tracker.stats()["unchanged"] == 4
+
+    table.socks.append(_sock(50001, "198.51.100.8", 2302))
+    tracker.sample()
+    assert tracker.interval_s == 1.0
+
+
+def test_thread_delivers_only_non_empty_diffs() -> None:
+    table = _Table(_sock(50000, "198.51.100.7", 2302))
+    tracker = table.tracker(min_interval_s=0.1, max_interval_s=0.2)
+    diffs = []
+    got = threading.Event()
+
+    def on_change(diff):
+        diffs.append(diff)
+        got.set()
+
+    tracker.start(on_change)
+    try:
+        assert got.wait(2.0)
+        got.clear()
+        table.socks.append(_sock(50001, "198.51.100.8", 2302))
+        tracker.wake()
+        assert got.wait(2.0)
+    finally:
+        tracker.stop(timeout=2.0)
+    assert [len(d.added) for d in diffs] == [1, 1]
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def test_table_model_applies_row_level_diffs(qapp) -> None:
+    from app.gui.network_tools import ConnectionTableModel
+
+    table = _Table(*(_sock(50000 + i, f"198.51.100.{i}", 443) for i in range(6)))
+    tracker = table.tracker()
+    model = ConnectionTableModel()
+    events = []
+    model.rowsRemoved.connect(lambda _p, first, last: events.append(("removed", first, last)))
+    model.rowsInserted.connect(lambda _p, first, last: events.append(("inserted", first, last)))
+    model.dataChanged.connect(lambda tl, br, _r=None: events.append(("changed", tl.row(), br.row())))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+
+    model.apply(tracker.sample())
+    assert events == [("inserted", 0, 5)]
+    events.clear()
+
+    # Drop rows 1, 2 and 4; change 5; add one.
+    socks = table.socks
+    table.socks = [socks[0], socks[3], _sock(50005, "198.51.100.5", 443, status="TIME_WAIT"),
+                   _sock(50009, "203.0.113.1", 3074)]
+    model.apply(tracker.sample())
+
+    assert events == [("removed", 4, 4), ("removed", 1, 2), ("changed", 2, 2),
+                      ("inserted", 3, 3)]
+    rows = [(model.data(model.index(r, 2)), model.data(model.index(r, 4)))
+            for r in range(model.rowCount())]
+    assert rows == [("198.51.100.0", "ESTABLISHED"), ("198.51.100.3", "ESTABLISHED"),
+                    ("198.51.100.5", "TIME_WAIT"), ("203.0.113.1", "ESTABLISHED")]
+    assert model.data(model.index(0, 6)) == "DayZ_x64.exe"
+
+
+def test_mapper_filters_without_resampling(qapp) -> None:
+    from app.gui.network_tools import ConnectionMapperWidget
+
+    table = _Table(_sock(50000, "198.51.100.7", 2302, udp=True),
+                   _sock(50001, "203.0.113.9", 443, pid=200),
+                   _sock(50002, "203.0.113.9", 80, pid=200, status="TIME_WAIT"))
+    tracker = table.tracker()
+    widget = ConnectionMapperWidget(tracker=tracker)
+    try:
+        widget._apply_changes(tracker.sample())
+        assert widget.table.model().rowCount() == 3
+        assert "3 connections | 2 unique IPs" in widget.summary_label.text()
+
+        widget.filter_combo.setCurrentText("Gaming Ports")
+        assert widget.table.model().rowCount() == 1
+        assert "198.51.100.7" in widget.topo_label.text()
+        assert "203.0.113.9" not in widget.topo_label.text()
+
+        widget.filter_combo.setCurrentText("Established Only")
+        assert widget.table.model().rowCount() == 1
+        assert tracker.stats()["samples"] == 1
+    finally:
+        widget.cleanup()
+        widget.deleteLater()
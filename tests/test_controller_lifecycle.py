@@ -342,8 +342,12 @@ def test_active_operation_snapshot_exposes_deadline_not_params() -> None:
 
     controller._arm_operation_deadline("192.168.1.22", 30)
     snapshot = controller.get_active_operations()
+    detailed = controller.get_active_operations(detail=True)
     controller._cancel_all_operation_deadlines()
 
+    assert "ip" not in snapshot[0] and "preset" not in snapshot[0]
+    assert detailed[0]["ip"] == "192.168.1.22" and detailed[0]["preset"] is None
+
     assert len(snapshot) == 1
     operation = snapshot[0]
     assert operation["target"] == "192.168.1.x"
@@ -441,3 +445,13 @@ def test_auto_scan_stop_wakes_and_joins_sleeping_thread() -> None:
     assert controller._scan_stop_event.is_set()
     assert controller.scan_thread is not None
     assert not controller.scan_thread.is_alive()
+
+
+def test_shutdown_stops_the_status_bus() -> None:
+    controller, *_rest = _controller()
+    controller.start()
+
+    controller.shutdown()
+
+    assert controller.status_bus.stats()["subscribers"] == 0
+    assert controller.status_bus._stopped is True
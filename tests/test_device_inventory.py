@@ -0,0 +1,216 @@
+"""Persistent LAN inventory: diffs, freshness, enrichment TTLs, aging."""
+
+from __future__ import annotations
+
+import socket
+
+import pytest
+
+from app.core.state import AppState
+from app.network import device_scan
+from app.network.inventory import DeviceChanges, DeviceInventory
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Store:
+    """In-memory stand-in for an AutoSaveMixin data type."""
+
+    def __init__(self) -> None:
+        self.data = None
+        self.saves = 0
+
+    def load_saved_data(self, default=None):
+        return self.data if self.data is not None else default
+
+    def save_changes(self, data, force=False):
+        import json
+        self.data = json.loads(json.dumps(data))
+        self.saves += 1
+        return True
+
+
+def _dev(ip, mac="aa:bb:cc:00:00:01", hostname="box", vendor="Acme"):
+    return {"ip": ip, "mac": mac, "hostname": hostname, "vendor": vendor}
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+def test_scans_report_added_changed_and_removed(clock) -> None:
+    inv = DeviceInventory(store=None, clock=clock)
+    a, b = _dev("10.0.0.2"), _dev("10.0.0.3", mac="aa:bb:cc:00:00:02")
+
+    first = inv.record_scan([a, b])
+    assert [d["ip"] for d in first.added] == ["10.0.0.2", "10.0.0.3"]
+
+    clock.now += 300
+    assert not inv.record_scan([a, b])
+
+    clock.now += 300
+    moved = inv.record_scan([{**a, "ip": "10.0.0.9"}])
+    assert moved.added == [] and [d["ip"] for d in moved.changed] == ["10.0.0.9"]
+    assert [d["mac"] for d in moved.removed] == ["aa:bb:cc:00:00:02"]
+    assert [d["ip"] for d in moved.devices] == ["10.0.0.9"]
+
+
+def test_stale_devices_age_out(clock) -> None:
+    inv = DeviceInventory(store=None, clock=clock, age_out_s=3600)
+    inv.record_scan([_dev("10.0.0.2"), _dev("10.0.0.3", mac="aa:bb:cc:00:00:02")])
+
+    clock.now += 1800
+    inv.record_scan([_dev("10.0.0.2")])
+    assert len(inv) == 2
+    clock.now += 2000
+    inv.record_scan([_dev("10.0.0.2")])
+
+    assert len(inv) == 1 and inv.entry("10.0.0.3") is None
+
+
+def test_plan_skips_recently_seen_hosts(clock) -> None:
+    inv = DeviceInventory(store=None, clock=clock, fresh_s=120)
+    inv.record_scan([_dev("10.0.0.2")])
+    clock.now += 60
+
+    probe, carried = inv.plan(["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+    assert probe == ["10.0.0.1", "10.0.0.3"]
+    assert [d["ip"] for d in carried] == ["10.0.0.2"]
+    # Carried hosts stay present but are not re-stamped as seen.
+    assert not inv.record_scan([_dev("10.0.0.2")])
+    assert inv.entry("10.0.0.2")["last_seen"] == clock.now - 60
+
+    clock.now += 120
+    assert inv.plan(["10.0.0.2"]) == (["10.0.0.2"], [])
+
+
+def test_enrichment_is_reused_until_its_ttl(clock) -> None:
+    inv = DeviceInventory(store=None, clock=clock, enrich_ttls={"hostname": 100})
+    inv.observe(_dev("10.0.0.2"), {"hostname": "tv.lan"})
+    inv.commit_scan()
+
+    clock.now += 50
+    assert inv.cached_enrichment("10.0.0.2", None, "hostname") == "tv.lan"
+    assert inv.cached_enrichment("10.0.0.2", "AA-BB-CC-00-00-01", "hostname") == "tv.lan"
+    assert inv.cached_enrichment("10.0.0.2", None, "ports") is None
+    # A plain re-observation does not restart the enrichment TTL.
+    inv.observe(_dev("10.0.0.2"))
+    clock.now += 60
+    assert inv.cached_enrichment("10.0.0.2", None, "hostname") is None
+
+
+def test_mac_learned_later_keeps_history(clock) -> None:
+    inv = DeviceInventory(store=None, clock=clock)
+    inv.record_scan([_dev("10.0.0.2", mac="Unknown")])
+    first_seen = inv.entry("10.0.0.2")["first_seen"]
+
+    clock.now += 10
+    changes = inv.record_scan([_dev("10.0.0.2", mac="aa:bb:cc:00:00:07")])
+
+    assert len(inv) == 1
+    assert inv.entry("10.0.0.2")["first_seen"] == first_seen
+    assert [d["mac"] for d in changes.changed] == ["aa:bb:cc:00:00:07"]
+
+
+def test_reused_address_with_a_new_mac_is_a_new_device(clock) -> None:
+    inv = DeviceInventory(store=None, clock=clock, enrich_ttls={"hostname": 100})
+    inv.observe(_dev("10.0.0.2"), {"hostname": "tv.lan"})
+    inv.commit_scan()
+
+    # DHCP hands the address to a different machine.
+    assert inv.cached_enrichment("10.0.0.2", "aa:bb:cc:00:00:09", "hostname") is None
+    assert inv.entry("10.0.0.2", "aa:bb:cc:00:00:09") is None
+
+    clock.now += 10
+    changes = inv.record_scan([_dev("10.0.0.2", mac="aa:bb:cc:00:00:09", hostname="phone")])
+    assert len(inv) == 2
+    assert inv.entry("10.0.0.2", "aa:bb:cc:00:00:09")["first_seen"] == clock.now
+    assert inv.entry("10.0.0.2", "aa:bb:cc:00:00:01")["device"]["hostname"] == "box"
+    assert [d["mac"] for d in changes.added] == ["aa:bb:cc:00:00:09"]
+
+
+def test_inventory_persists_across_instances(clock) -> None:
+    store = _Store()
+    DeviceInventory(store=store, clock=clock).record_scan([_dev("10.0.0.2")])
+    assert store.saves == 1
+
+    clock.now += 600
+    reloaded = DeviceInventory(store=store, clock=clock)
+    assert [d["ip"] for d in reloaded.devices()] == ["10.0.0.2"]
+    assert not reloaded.record_scan([_dev("10.0.0.2")])
+    assert [d["ip"] for d in reloaded.record_scan([]).removed] == ["10.0.0.2"]
+
+
+def test_rescan_probes_only_unknown_addresses(clock, monkeypatch) -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(8)
+        monkeypatch.setattr(device_scan, "_PROBE_PORTS", [listener.getsockname()[1]])
+        lookups = []
+        monkeypatch.setattr(device_scan, "_resolve_hostname",
+                            lambda ip: lookups.append(ip) or f"h{ip[-1]}")
+        inv = DeviceInventory(store=None, clock=clock)
+
+        first = device_scan.scan_network_range_advanced(
+            "127.0.0", start=1, end=2, inventory=inv)
+        assert [d["hostname"] for d in first] == ["h1", "h2"]
+        assert len(inv.commit_scan().added) == 2
+
+        clock.now += 30
+        streamed = []
+        again = device_scan.scan_network_range_advanced(
+            "127.0.0", start=1, end=3, inventory=inv, on_device=streamed.append)
+        changes = inv.commit_scan()
+
+    assert [d["ip"] for d in again] == ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+    assert sorted(lookups) == ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+    assert [d["ip"] for d in changes.added] == ["127.0.0.3"] and not changes.removed
+    assert {d["ip"] for d in streamed} == {"127.0.0.1", "127.0.0.2", "127.0.0.3"}
+
+
+def test_app_state_applies_diffs(tmp_path) -> None:
+    state = AppState(config_file=str(tmp_path / "settings.json"))
+    events = []
+    state.add_observer(lambda event, data: events.append((event, data)))
+    state.update_devices([_dev("10.0.0.2"), _dev("10.0.0.3", mac="aa:bb:cc:00:00:02"),
+                          _dev("10.0.0.5", mac="aa:bb:cc:00:00:05")])
+    state.devices[1].blocked = True
+    state.devices[2].last_seen = "2000-01-01T00:00:00"
+
+    state.apply_device_changes(DeviceChanges(
+        added=[_dev("10.0.0.4", mac="aa:bb:cc:00:00:03")],
+        changed=[_dev("10.0.0.3", mac="aa:bb:cc:00:00:02", hostname="renamed")],
+        removed=[_dev("10.0.0.2")],
+        devices=[_dev("10.0.0.5", mac="aa:bb:cc:00:00:05"),
+                 _dev("10.0.0.3", mac="aa:bb:cc:00:00:02", hostname="renamed"),
+                 _dev("10.0.0.4", mac="aa:bb:cc:00:00:03")],
+    ))
+
+    assert [(d.ip, d.hostname, d.blocked) for d in state.devices] == [
+        ("10.0.0.5", "box", False), ("10.0.0.3", "renamed", True), ("10.0.0.4", "box", False),
+    ]
+    assert state.devices[0].last_seen > "2000-01-01T00:00:00"
+    (event, data), updated = events[-2:]
+    assert event == "devices_changed" and data["removed"] == ["10.0.0.2"]
+    assert updated == ("devices_updated", state.devices)
+
+    # An unchanged rescan still tells list observers.
+    del events[:]
+    state.apply_device_changes(DeviceChanges(devices=[
+        _dev("10.0.0.5", mac="aa:bb:cc:00:00:05"),
+        _dev("10.0.0.3", mac="aa:bb:cc:00:00:02", hostname="renamed"),
+        _dev("10.0.0.4", mac="aa:bb:cc:00:00:03"),
+    ]))
+    assert [e for e, _ in events] == ["devices_updated"]
+
+    # A diff against some other base falls back to a full replace.
+    state.apply_device_changes(DeviceChanges(devices=[_dev("10.0.0.9")]))
+    assert [d.ip for d in state.devices] == ["10.0.0.9"]
+    assert events[-1][0] == "devices_updated"
@@ -0,0 +1,134 @@
+"""Shared file digest service and its persistent identity cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import types
+
+import pytest
+
+from app.core import file_integrity
+from app.core.file_integrity import FileTooLargeError, IntegrityCache, hash_file
+
+KEY = b"k" * 32
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    """Count real file reads made through :func:`hash_file`."""
+    calls = []
+    real = file_integrity.hash_file
+
+    def _hash(path, algorithms=("sha256",), **kw):
+        algorithms = list(algorithms)
+        calls.append(algorithms)
+        return real(path, algorithms, **kw)
+
+    monkeypatch.setattr(file_integrity, "hash_file", _hash)
+    return calls
+
+
+@pytest.fixture
+def shared(monkeypatch):
+    cache = IntegrityCache()
+    monkeypatch.setattr(file_integrity, "_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize("mmap_threshold", [1 << 30, 1])
+def test_hash_file_computes_several_digests_in_one_pass(tmp_path, monkeypatch, mmap_threshold) -> None:
+    monkeypatch.setattr(file_integrity, "MMAP_THRESHOLD", mmap_threshold)
+    monkeypatch.setattr(file_integrity, "_MMAP_SLICE", 4096)
+    data = os.urandom(50_000)
+    path = tmp_path / "blob.bin"
+    path.write_bytes(data)
+
+    out = hash_file(path, ("sha256", "sha384", "sha256"))
+
+    assert out == {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "sha384": hashlib.sha384(data).hexdigest(),
+    }
+
+
+def test_hash_file_enforces_max_bytes(tmp_path) -> None:
+    path = tmp_path / "big.bin"
+    path.write_bytes(b"x" * 2048)
+
+    with pytest.raises(FileTooLargeError):
+        hash_file(path, max_bytes=1024)
+
+
+def test_unchanged_file_costs_a_stat(tmp_path, hashes) -> None:
+    path = tmp_path / "exe.bin"
+    path.write_bytes(b"first")
+    cache = IntegrityCache()
+
+    assert cache.digest(path) == hashlib.sha256(b"first").hexdigest()
+    assert cache.digest(path) == hashlib.sha256(b"first").hexdigest()
+    assert len(hashes) == 1
+
+    cache.digests(path, ("sha256", "sha384"))
+    assert hashes[-1] == ["sha384"]
+
+    path.write_bytes(b"second, longer")
+    assert cache.digest(path) == hashlib.sha256(b"second, longer").hexdigest()
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+
+def test_cache_persists_under_hmac(tmp_path, hashes) -> None:
+    path = tmp_path / "installer.exe"
+    path.write_bytes(b"payload")
+    cache_path = tmp_path / "cache" / "file_integrity.json"
+
+    first = IntegrityCache(cache_path, KEY)
+    first.digest(path)
+    first.save()
+
+    assert IntegrityCache(cache_path, KEY).digest(path) == hashlib.sha256(b"payload").hexdigest()
+    assert len(hashes) == 1
+
+    IntegrityCache(cache_path, b"x" * 32).digest(path)
+    assert len(hashes) == 2
+
+    raw = json.loads(cache_path.read_text())
+    (record,) = raw["records"].values()
+    record["digests"]["sha256"] = "0" * 64
+    cache_path.write_text(json.dumps(raw))
+
+    forged = IntegrityCache(cache_path, KEY)
+    assert forged.digest(path) == hashlib.sha256(b"payload").hexdigest()
+    assert len(hashes) == 3
+
+
+def test_installer_check_reuses_cached_digest(tmp_path, hashes, shared) -> None:
+    from app.core.update_verify import SigVerifyError, verify_installer_sha256
+
+    data = b"installer bytes"
+    path = tmp_path / "setup.exe"
+    path.write_bytes(data)
+    manifest = types.SimpleNamespace(
+        installer_size=len(data), installer_sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+    verify_installer_sha256(str(path), manifest)
+    verify_installer_sha256(str(path), manifest)
+    assert len(hashes) == 1
+
+    path.write_bytes(b"installer BYTES")
+    with pytest.raises(SigVerifyError, match="hash mismatch"):
+        verify_installer_sha256(str(path), manifest)
+
+
+def test_plugin_entry_cap_still_applies(tmp_path, shared) -> None:
+    from app.plugins import signing
+
+    path = tmp_path / "plugin.py"
+    path.write_bytes(b"#" * 64)
+
+    with pytest.raises(signing.PluginSigError, match="exceeds"):
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(signing, "MAX_ENTRY_BYTES", 16)
+            signing._sha384_file(path, cached=True)
@@ -18,6 +18,7 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from app.core.status_bus import StatusBus
 from app.gui.clumsy_control import ClumsyControlView
 from app.gui.dashboard import DupeZDashboard
 
@@ -43,7 +44,7 @@ class _ClumsyHarness(ClumsyControlView):
         QWidget.__init__(self)
         self.controller = controller
         self._status_poll_generation = 0
-        self._status_poll_in_flight = False
+        self._status_subscription = None
         self._clumsy_status_snapshot = {}
         self._disrupted_devices_snapshot = frozenset()
         self._status_snapshot_ready.connect(self._apply_status_snapshot)
@@ -88,32 +89,41 @@ class _BlockingClumsyController:
         return ["192.0.2.10"]
 
 
-def test_clumsy_status_poll_is_nonblocking_and_single_flight(qapp):
+def test_clumsy_status_is_pushed_by_bus_off_the_qt_thread(qapp):
     controller = _BlockingClumsyController()
+    controller.status_bus = StatusBus.for_controller(controller)
     view = _ClumsyHarness(controller)
     main_thread_id = threading.get_ident()
 
     try:
         started = time.monotonic()
-        view._refresh_disruption_status()
+        view._subscribe_status_bus()
         assert time.monotonic() - started < 0.5
         assert controller.entered.wait(1.0)
 
+        # A manual refresh while the sampler is blocked queues one
+        # follow-up sample instead of a second concurrent fetch.
+        view._refresh_disruption_status()
         view._refresh_disruption_status()
         assert controller.status_calls == 1
-        assert view._status_poll_in_flight is True
 
         controller.release.set()
-        _pump_until(qapp, lambda: not view._status_poll_in_flight)
+        _pump_until(
+            qapp,
+            lambda: view.clumsy_status_label.text().startswith(
+                "Engine: ACTIVE"
+            ),
+        )
 
         assert controller.worker_thread_id != main_thread_id
-        assert controller.disrupted_calls == 1
+        assert controller.status_calls <= 2
         assert view._disrupted_devices_snapshot == frozenset(
             {"192.0.2.10"}
         )
-        assert view.clumsy_status_label.text().startswith("Engine: ACTIVE")
     finally:
         controller.release.set()
+        view.stop_background_refresh()
+        controller.status_bus.stop()
 
 
 class _ForbiddenDevicePoll:
@@ -141,7 +151,6 @@ def test_clumsy_filter_and_table_render_from_cached_devices(qapp):
 def test_clumsy_status_ignores_stale_generation(qapp):
     view = _ClumsyHarness(None)
     view._status_poll_generation = 2
-    view._status_poll_in_flight = True
     view._disrupted_devices_snapshot = frozenset({"192.0.2.1"})
 
     view._apply_status_snapshot(
@@ -150,30 +159,30 @@ def test_clumsy_status_ignores_stale_generation(qapp):
         ["192.0.2.99"],
     )
 
-    assert view._status_poll_in_flight is True
     assert view._disrupted_devices_snapshot == frozenset({"192.0.2.1"})
 
 
-def test_clumsy_shutdown_stops_timers_and_invalidates_worker(qapp):
-    view = _ClumsyHarness(None)
-    for timer_name in (
-        "status_timer",
-        "session_timer",
-        "stats_refresh_timer",
-    ):
-        timer = QTimer(view)
-        timer.start(1000)
-        setattr(view, timer_name, timer)
+def test_clumsy_shutdown_unsubscribes_and_invalidates_late_results(qapp):
+    controller = _BlockingClumsyController()
+    controller.release.set()
+    controller.status_bus = StatusBus.for_controller(controller)
+    view = _ClumsyHarness(controller)
+    view.session_timer = QTimer(view)
+    view.session_timer.start(1000)
+    view._subscribe_status_bus()
+    subscription = view._status_subscription
     view._status_poll_generation = 4
-    view._status_poll_in_flight = True
 
-    view.stop_background_refresh()
+    try:
+        view.stop_background_refresh()
 
-    assert view._status_poll_generation == 5
-    assert view._status_poll_in_flight is False
-    assert not view.status_timer.isActive()
-    assert not view.session_timer.isActive()
-    assert not view.stats_refresh_timer.isActive()
+        assert view._status_poll_generation == 5
+        assert view._status_subscription is None
+        assert subscription.active is False
+        assert controller.status_bus.stats()["subscribers"] == 0
+        assert not view.session_timer.isActive()
+    finally:
+        controller.status_bus.stop()
 
 
 def test_recovery_safe_mode_disables_new_actions_but_keeps_stop(qapp):
@@ -221,7 +230,7 @@ class _DashboardHarness(DupeZDashboard):
         QMainWindow.__init__(self)
         self.controller = controller
         self._dashboard_poll_generation = 0
-        self._dashboard_poll_in_flight = False
+        self._status_subscription = None
         self._device_count_snapshot = 0
         self._disrupted_devices_snapshot = frozenset()
         self._dashboard_snapshot_ready.connect(
@@ -255,42 +264,45 @@ class _BlockingDashboardController:
         return ["198.51.100.7", "198.51.100.8"]
 
 
-def test_dashboard_uses_one_nonblocking_snapshot_for_status_and_tray(qapp):
+def test_dashboard_status_and_tray_share_one_bus_snapshot(qapp):
     controller = _BlockingDashboardController()
+    controller.status_bus = StatusBus.for_controller(controller)
     dashboard = _DashboardHarness(controller)
     main_thread_id = threading.get_ident()
 
     try:
         started = time.monotonic()
-        dashboard._update_status_bar()
+        dashboard._subscribe_status_bus()
         assert time.monotonic() - started < 0.5
         assert controller.entered.wait(1.0)
 
         dashboard._update_status_bar()
         assert controller.disrupted_calls == 1
-        assert dashboard._dashboard_poll_in_flight is True
 
         controller.release.set()
-        _pump_until(qapp, lambda: not dashboard._dashboard_poll_in_flight)
+        _pump_until(
+            qapp,
+            lambda: dashboard.disruption_status_label.text()
+            == "Disruptions: 2",
+        )
 
         assert controller.worker_thread_id != main_thread_id
         assert dashboard.device_status_label.text() == "Devices: 3"
-        assert dashboard.disruption_status_label.text() == "Disruptions: 2"
         assert dashboard.tray_action_status.text == "Disruptions: 2"
         assert "2 active disruptions" in dashboard.tray_icon.tooltip
     finally:
         controller.release.set()
+        dashboard._unsubscribe_status_bus()
+        controller.status_bus.stop()
 
 
 def test_dashboard_ignores_stale_generation(qapp):
     dashboard = _DashboardHarness(None)
     dashboard._dashboard_poll_generation = 3
-    dashboard._dashboard_poll_in_flight = True
     dashboard._disrupted_devices_snapshot = frozenset({"192.0.2.1"})
 
     dashboard._apply_dashboard_status_snapshot(2, 99, ["192.0.2.2"])
 
-    assert dashboard._dashboard_poll_in_flight is True
     assert dashboard._device_count_snapshot == 0
     assert dashboard._disrupted_devices_snapshot == frozenset(
         {"192.0.2.1"}
@@ -366,6 +366,6 @@ def test_vendor_resolution_resolves_known_oui() -> None:
         return
 
     raise AssertionError(
-        "scapy MANUFDB fallback not resolving any tested OUI. "
+        "bundled OUI database not resolving any tested OUI. "
         f"Tested: {[mac for mac, _ in candidates]}. Failures: {failures}"
     )
@@ -0,0 +1,183 @@
+"""Negotiated binary framing for the split-elevation IPC protocol."""
+
+from __future__ import annotations
+
+import enum
+import json
+import socket
+import threading
+
+import pytest
+
+from app.firewall_helper import transport
+from app.firewall_helper.auth import generate_token
+from app.firewall_helper.binary_codec import STATIC_KEYS, pack, unpack
+from app.firewall_helper.inproc_harness import LoopbackClient
+from app.firewall_helper.protocol import (
+    BINARY_HEADER,
+    CAP_BINARY,
+    CAP_PIPELINE,
+    OP_GET_ENGINE_STATS,
+    OP_PING,
+    Request,
+    Response,
+)
+
+SECRET = generate_token()
+
+
+class _Mode(enum.IntEnum):
+    FAST = 7
+
+
+def _json_roundtrip(value):
+    return json.loads(json.dumps(value))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        0,
+        127,
+        128,
+        -1,
+        2**31,
+        -(2**63),
+        2**80,
+        -(2**80),
+        1.5,
+        "",
+        "x" * 31,
+        "y" * 32,
+        "z" * 300,
+        "séance ✓",
+        [],
+        list(range(40)),
+        {"per_device": {"10.0.0.5": {"packets_processed": 10**12, "alive": True}}},
+        {str(i): i for i in range(20)},
+        {"new_key": [{"new_key": 1}, {"new_key": 2}]},
+    ],
+)
+def test_binary_values_match_json_semantics(value) -> None:
+    assert unpack(pack(value)) == _json_roundtrip(value)
+
+
+def test_key_coercion_and_subclasses_follow_json() -> None:
+    value = {2: "a", 2.5: "b", True: "c", None: "d", "m": _Mode.FAST, "t": (1, 2)}
+
+    assert unpack(pack(value)) == _json_roundtrip(value)
+
+
+def test_static_keys_are_unique() -> None:
+    assert len(set(STATIC_KEYS)) == len(STATIC_KEYS)
+
+
+def test_repeated_keys_are_interned() -> None:
+    rows = [{"custom_counter_name": i} for i in range(10)]
+    once = len(pack([{"custom_counter_name": 0}]))
+
+    assert len(pack(rows)) < once * 3
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"\xd2\x00", b"\xa5ab", b"\x81\xfe\x05\x00ab", b"\x81\xf0\x01", b"\xc1", b"\x01\x02"],
+)
+def test_malformed_binary_is_rejected(data) -> None:
+    with pytest.raises(ValueError):
+        unpack(data)
+
+
+def test_unserializable_value_raises_type_error() -> None:
+    with pytest.raises(TypeError):
+        pack({"x": object()})
+
+
+def test_binary_request_keeps_allow_list_and_version() -> None:
+    request = Request(op=OP_PING, args={"a": 1}, version=1)
+    decoded = Request.decode_binary(request.encode_binary()[BINARY_HEADER.size:])
+
+    assert decoded == request
+
+    forged = pack([1, 5, "format_disk", {}])
+    with pytest.raises(ValueError, match="disallowed op"):
+        Request.decode_binary(forged)
+
+
+def test_binary_response_matches_json_response() -> None:
+    response = Response.success(9, {"per_device": {"10.0.0.5": {"send_failed": 0}}})
+    frame = response.encode_binary()
+
+    assert BINARY_HEADER.unpack_from(frame)[0] == len(frame) - BINARY_HEADER.size
+    assert Response.decode_binary(frame[BINARY_HEADER.size:]) == Response.decode(
+        response.encode().rstrip(b"\n")
+    )
+
+
+def test_frame_reader_switches_to_length_prefix() -> None:
+    frames = [b'{"type":"handshake_ok"}\n' + Response.success(1, "a").encode_binary()[:5],
+              Response.success(1, "a").encode_binary()[5:], b""]
+    reader = transport.FrameReader(lambda: frames.pop(0))
+
+    assert reader.read_frame() == b'{"type":"handshake_ok"}'
+    reader.use_binary()
+    assert Response.decode_binary(reader.read_frame()).result == "a"
+    assert reader.read_frame() is None
+
+
+def _session(client_binary, server_caps):
+    server_sock, client_sock = socket.socketpair()
+    threading.Thread(
+        target=transport.serve_stream,
+        args=(
+            transport.SocketStream(server_sock),
+            lambda r: Response.success(r.request_id, {"op": r.op, "n": [1, 2.5]}),
+            SECRET,
+        ),
+        kwargs={"capabilities": server_caps},
+        daemon=True,
+    ).start()
+    client = transport.FramedClient(SECRET, binary=client_binary)
+    client.attach(transport.SocketStream(client_sock))
+    return client
+
+
+@pytest.mark.parametrize(
+    ("client_binary", "server_caps", "expected"),
+    [
+        (True, (CAP_PIPELINE, CAP_BINARY), True),
+        (False, (CAP_PIPELINE, CAP_BINARY), False),
+        (True, (CAP_PIPELINE,), False),
+        (True, (CAP_BINARY,), True),
+    ],
+)
+def test_binary_mode_is_negotiated_with_json_fallback(
+    client_binary, server_caps, expected,
+) -> None:
+    client = _session(client_binary, server_caps)
+    try:
+        assert client.binary is expected
+        response = client.call(Request(op=OP_GET_ENGINE_STATS))
+        assert response.result == {"op": OP_GET_ENGINE_STATS, "n": [1, 2.5]}
+    finally:
+        client.close()
+
+
+def test_binary_offer_defaults_to_environment(monkeypatch) -> None:
+    monkeypatch.delenv(transport.BINARY_ENV_VAR, raising=False)
+    assert CAP_BINARY not in transport.FramedClient(SECRET)._offer
+    monkeypatch.setenv(transport.BINARY_ENV_VAR, "1")
+    assert CAP_BINARY in transport.FramedClient(SECRET)._offer
+
+
+def test_loopback_client_binary_roundtrip() -> None:
+    stats = {"packets_processed": 3, "per_device": {"10.0.0.5": {"alive": True}}}
+
+    class _DM:
+        def get_engine_stats(self):
+            return stats
+
+    assert LoopbackClient(_DM(), binary=True).get_engine_stats() == stats
+    assert LoopbackClient(_DM()).get_engine_stats() == stats
@@ -0,0 +1,229 @@
+"""Persistent reader, request demultiplexing and pipelining on the helper IPC."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from app.firewall_helper import transport
+from app.firewall_helper.auth import HandshakeError, generate_token, handshake_client
+from app.firewall_helper.protocol import (
+    CAP_PIPELINE,
+    OP_DISRUPT_DEVICE,
+    OP_GET_STATUS,
+    OP_HOTKEY_TRIGGER,
+    OP_PING,
+    OP_STOP_DEVICE,
+    Request,
+    Response,
+)
+
+SECRET = generate_token()
+
+
+def _connect(handler, *, server_caps=(CAP_PIPELINE,), pipeline=True):
+    server_sock, client_sock = socket.socketpair()
+    server_stream = transport.SocketStream(server_sock)
+    server = threading.Thread(
+        target=transport.serve_stream,
+        args=(server_stream, handler, SECRET),
+        kwargs={"capabilities": server_caps},
+        daemon=True,
+    )
+    server.start()
+    client = transport.FramedClient(SECRET, pipeline=pipeline)
+    client.attach(transport.SocketStream(client_sock))
+    return client, server
+
+
+def _echo(request: Request) -> Response:
+    return Response.success(request.request_id, {"op": request.op})
+
+
+def test_frame_reader_splits_coalesced_and_partial_frames() -> None:
+    chunks = [b'{"a":1}\n{"b"', b':2}\n{"c":3}\n', b""]
+    reader = transport.FrameReader(lambda: chunks.pop(0))
+
+    assert reader.read_frame() == b'{"a":1}'
+    assert reader.read_frame() == b'{"b":2}'
+    assert reader.read_frame() == b'{"c":3}'
+    assert reader.read_frame() is None
+
+
+def test_frame_reader_rejects_oversized_frame() -> None:
+    reader = transport.FrameReader(lambda: b"x" * 4096)
+
+    with pytest.raises(ValueError, match="without terminator"):
+        reader.read_frame()
+
+
+@pytest.mark.parametrize(
+    ("server_caps", "pipeline", "expected"),
+    [
+        ((CAP_PIPELINE,), True, True),
+        ((), True, False),
+        ((CAP_PIPELINE,), False, False),
+    ],
+)
+def test_pipelining_is_negotiated_by_both_sides(server_caps, pipeline, expected) -> None:
+    client, _ = _connect(_echo, server_caps=server_caps, pipeline=pipeline)
+    try:
+        assert client.pipelined is expected
+        assert client.call(Request(op=OP_PING)).result == {"op": OP_PING}
+    finally:
+        client.close()
+
+
+def test_client_hello_without_caps_matches_legacy_handshake() -> None:
+    sent = []
+    frames = iter([None])
+
+    with pytest.raises(HandshakeError):
+        handshake_client(SECRET, lambda: next(frames), sent.append)
+
+    assert "caps" not in json.loads(sent[0])
+
+
+def test_concurrent_queries_are_in_flight_together() -> None:
+    barrier = threading.Barrier(transport.QUERY_WORKERS, timeout=2.0)
+
+    def handler(request: Request) -> Response:
+        barrier.wait()  # breaks (and fails the call) if queries serialize
+        return Response.success(request.request_id, True)
+
+    client, _ = _connect(handler)
+    results = []
+
+    def _worker() -> None:
+        results.append(client.call(Request(op=OP_GET_STATUS), timeout_ms=3000))
+
+    threads = [threading.Thread(target=_worker) for _ in range(transport.QUERY_WORKERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+    client.close()
+
+    assert len(results) == transport.QUERY_WORKERS
+    assert all(r.ok for r in results)
+    assert len({r.request_id for r in results}) == transport.QUERY_WORKERS
+
+
+def test_mutations_keep_arrival_order_and_queries_overtake() -> None:
+    handled = []
+
+    def handler(request: Request) -> Response:
+        if request.op in (OP_DISRUPT_DEVICE, OP_STOP_DEVICE):
+            time.sleep(0.1)
+        handled.append(request.request_id)
+        return Response.success(request.request_id, True)
+
+    server_sock, client_sock = socket.socketpair()
+    threading.Thread(
+        target=transport._serve_frames,
+        args=(
+            transport.FrameReader(transport.SocketStream(server_sock).read_chunk),
+            server_sock.sendall,
+            handler,
+            frozenset({CAP_PIPELINE}),
+            threading.Event(),
+        ),
+        daemon=True,
+    ).start()
+    client_sock.sendall(
+        Request(op=OP_DISRUPT_DEVICE, request_id=1).encode()
+        + Request(op=OP_STOP_DEVICE, request_id=2).encode()
+        + Request(op=OP_PING, request_id=3).encode()
+        + Request(op=OP_HOTKEY_TRIGGER, request_id=4).encode()
+    )
+    reader = transport.FrameReader(lambda: client_sock.recv(4096))
+    order = [Response.decode(reader.read_frame()).request_id for _ in range(4)]
+    client_sock.close()
+
+    # The hotkey is quick but queued behind the slow disrupt/stop.
+    assert order == [3, 1, 2, 4]
+    assert handled.index(1) < handled.index(2) < handled.index(4)
+
+
+def test_pipelined_timeout_abandons_only_that_call() -> None:
+    release = threading.Event()
+
+    def handler(request: Request) -> Response:
+        if request.op == OP_GET_STATUS:
+            release.wait(2.0)
+        return Response.success(request.request_id, request.op)
+
+    client, _ = _connect(handler)
+    try:
+        with pytest.raises(TimeoutError, match="op=get_status"):
+            client.call(Request(op=OP_GET_STATUS), timeout_ms=50)
+
+        # The connection survives and the late response is discarded.
+        assert client.pipelined
+        assert client.call(Request(op=OP_PING)).result == OP_PING
+        release.set()
+        time.sleep(0.05)
+        assert client.call(Request(op=OP_PING)).result == OP_PING
+    finally:
+        release.set()
+        client.close()
+
+
+def test_legacy_connection_serializes_concurrent_callers() -> None:
+    active = []
+    overlap = []
+
+    def handler(request: Request) -> Response:
+        active.append(request.request_id)
+        if len(active) > 1:
+            overlap.append(request.request_id)
+        time.sleep(0.01)
+        active.remove(request.request_id)
+        return Response.success(request.request_id, True)
+
+    client, _ = _connect(handler, server_caps=())
+    threads = [
+        threading.Thread(target=client.call, args=(Request(op=OP_GET_STATUS),))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+    client.close()
+
+    assert overlap == []
+
+
+def test_peer_disconnect_fails_in_flight_calls() -> None:
+    started = threading.Event()
+
+    def handler(request: Request) -> Response:
+        started.set()
+        time.sleep(5.0)
+        return Response.success(request.request_id, True)
+
+    client, _ = _connect(handler)
+    session = client._session
+    errors = []
+
+    def _call() -> None:
+        try:
+            client.call(Request(op=OP_GET_STATUS), timeout_ms=3000)
+        except Exception as exc:
+            errors.append(exc)
+
+    caller = threading.Thread(target=_call)
+    caller.start()
+    assert started.wait(2.0)
+    session.stream.close()
+    caller.join(2.0)
+
+    assert len(errors) == 1 and isinstance(errors[0], ConnectionError)
+    assert client._session is None
+    with pytest.raises(RuntimeError, match="before connect"):
+        client.call(Request(op=OP_PING))
@@ -0,0 +1,210 @@
+"""Helper-side snapshot cache and since_generation deltas."""
+
+from __future__ import annotations
+
+import socket
+import threading
+
+import pytest
+
+from app.firewall_helper import transport
+from app.firewall_helper.auth import generate_token
+from app.firewall_helper.inproc_harness import LoopbackClient, _LoopbackPipeClient
+from app.firewall_helper.protocol import CAP_SNAPSHOT, OP_GET_STATUS, Request, Response
+from app.firewall_helper.server import HelperDispatcher
+from app.firewall_helper.snapshot_cache import (
+    SnapshotCache,
+    SnapshotMirror,
+    apply_patches,
+    copy_tree,
+    diff_snapshots,
+)
+
+
+class _StatsDM:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.stats = {
+            "packets_processed": 10,
+            "per_device": {
+                "10.0.0.5": {"packets_processed": 5, "methods": ["lag"]},
+                "10.0.0.6": {"packets_processed": 5, "methods": ["drop"]},
+            },
+        }
+
+    def get_engine_stats(self):
+        self.calls += 1
+        return self.stats
+
+    def get_status(self):
+        self.calls += 1
+        return {"count": len(self.stats["per_device"])}
+
+    def stop_device(self, ip):
+        self.stats["per_device"].pop(ip, None)
+        return True
+
+
+def test_diff_and_apply_roundtrip_nested_changes() -> None:
+    old = {"a": 1, "keep": {"x": [1]}, "dev": {"1": {"n": 1, "m": 2}}, "gone": 0}
+    new = {"a": 2, "keep": {"x": [1]}, "dev": {"1": {"n": 3, "m": 2}, "2": {}}}
+
+    patches = diff_snapshots(old, new)
+
+    assert patches == [[["a"], 2], [["dev", "1", "n"], 3], [["dev", "2"], {}], [["gone"]]]
+    assert apply_patches(old, patches) == new
+    assert old["dev"]["1"]["n"] == 1  # base untouched
+    assert diff_snapshots([1], {"a": 1}) is None
+
+
+def test_apply_rejects_patch_through_missing_path() -> None:
+    with pytest.raises(ValueError):
+        apply_patches({"a": 1}, [[["a", "b"], 1]])
+
+
+def test_copy_tree_follows_json_semantics() -> None:
+    value = {1: (1, 2), None: {"x": [True]}}
+
+    copied = copy_tree(value)
+
+    assert copied == {"1": [1, 2], "null": {"x": [True]}}
+    copied["null"]["x"].append(False)
+    assert value[None]["x"] == [True]
+
+
+def test_cache_rebuilds_once_per_interval_until_invalidated() -> None:
+    cache = SnapshotCache(interval_sec=60)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"n": len(builds)}
+
+    assert cache.get("k", build) == {"n": 1}
+    assert cache.get("k", build) == {"n": 1}
+    cache.invalidate()
+    assert cache.get("k", build) == {"n": 2}
+    assert cache.rebuilds == 2
+
+
+def test_since_replies_not_modified_patches_and_full() -> None:
+    cache = SnapshotCache(interval_sec=0)
+    state = {"n": 1, "fixed": "x"}
+
+    first = cache.since("k", lambda: state, 0, None)
+    assert first["full"] == state and first["generation"] == 1
+    epoch = first["epoch"]
+
+    assert cache.since("k", lambda: state, 1, epoch)["not_modified"] is True
+
+    state = {"n": 2, "fixed": "x"}
+    delta = cache.since("k", lambda: state, 1, epoch)
+    assert delta["generation"] == 2 and delta["patches"] == [[["n"], 2]]
+
+    assert "full" in cache.since("k", lambda: state, 1, "other-epoch")
+    assert "full" in cache.since("k", lambda: state, 99, epoch)
+
+
+def test_mirror_merges_and_hands_out_private_copies() -> None:
+    cache = SnapshotCache(interval_sec=0)
+    mirror = SnapshotMirror()
+    state = {"dev": {"n": 1}}
+
+    def poll():
+        reply = cache.since("k", lambda: state, **mirror.request_args("k"))
+        return mirror.merge("k", reply)
+
+    assert poll() == {"dev": {"n": 1}}
+    state = {"dev": {"n": 2}}
+    value = poll()
+    assert value == {"dev": {"n": 2}}
+    value["dev"]["n"] = 99
+    assert poll() == {"dev": {"n": 2}}
+
+
+def test_mirror_ignores_out_of_order_replies() -> None:
+    cache = SnapshotCache(interval_sec=0)
+    mirror = SnapshotMirror()
+    state = {"n": 1, "m": 1}
+    mirror.merge("k", cache.since("k", lambda: state, **mirror.request_args("k")))
+
+    # Two pipelined polls, both sent while the mirror held generation 1.
+    args = mirror.request_args("k")
+    state = {"n": 2, "m": 1}
+    older = cache.since("k", lambda: state, **args)
+    state = {"n": 2, "m": 3}
+    newer = cache.since("k", lambda: state, **args)
+    assert (older["since_generation"], newer["since_generation"]) == (1, 1)
+
+    assert mirror.merge("k", newer) == {"n": 2, "m": 3}
+    # The older reply arrives second: dropped, not applied over generation 3.
+    assert mirror.merge("k", older) == {"n": 2, "m": 3}
+    assert mirror.request_args("k")["since_generation"] == newer["generation"]
+
+    # A delta whose base is not the generation held is refused and the
+    # entry dropped, so the next poll asks for a full copy.
+    state = {"n": 4, "m": 3}
+    stale_base = cache.since("k", lambda: state, 2, args["epoch"])
+    with pytest.raises(ValueError):
+        mirror.merge("k", stale_base)
+    assert mirror.request_args("k")["since_generation"] == 0
+    full = cache.since("k", lambda: state, **mirror.request_args("k"))
+    assert "full" in full and mirror.merge("k", full) == {"n": 4, "m": 3}
+
+
+def test_dispatcher_serves_cached_snapshot_and_invalidates_on_mutation() -> None:
+    dm = _StatsDM()
+    dispatcher = HelperDispatcher(dm, snapshot_interval_sec=60)
+
+    for _ in range(3):
+        resp = dispatcher.dispatch(Request(op=OP_GET_STATUS))
+    assert resp.result == {"count": 2}
+    assert dm.calls == 1
+
+    dispatcher.dispatch(Request(op="stop_device", args={"ip": "10.0.0.6"}))
+    assert dispatcher.dispatch(Request(op=OP_GET_STATUS)).result == {"count": 1}
+    assert dm.calls == 2
+
+
+def test_proxy_mirror_matches_full_replies() -> None:
+    dm = _StatsDM()
+    plain = LoopbackClient(dm)
+    delta = LoopbackClient(dm, snapshots=True)
+
+    assert delta.get_engine_stats() == plain.get_engine_stats()
+    dm.stats["per_device"]["10.0.0.5"]["packets_processed"] = 50
+    del dm.stats["per_device"]["10.0.0.6"]
+    assert delta.get_engine_stats() == plain.get_engine_stats()
+    assert delta.get_status() == {"count": 1}
+
+
+def test_proxy_refetches_after_helper_restart() -> None:
+    dm = _StatsDM()
+    client = LoopbackClient(dm, snapshots=True)
+    client.get_engine_stats()
+
+    # A new helper: fresh dispatcher, new epoch, generations restart.
+    client._client = _LoopbackPipeClient(HelperDispatcher(dm), snapshots=True)
+    dm.stats["packets_processed"] = 11
+
+    assert client.get_engine_stats()["packets_processed"] == 11
+
+
+def test_snapshot_capability_is_negotiated() -> None:
+    secret = generate_token()
+    server_sock, client_sock = socket.socketpair()
+    threading.Thread(
+        target=transport.serve_stream,
+        args=(
+            transport.SocketStream(server_sock),
+            lambda r: Response.success(r.request_id, None),
+            secret,
+        ),
+        daemon=True,
+    ).start()
+    client = transport.FramedClient(secret)
+    client.attach(transport.SocketStream(client_sock))
+    try:
+        assert CAP_SNAPSHOT in client.capabilities
+    finally:
+        client.close()
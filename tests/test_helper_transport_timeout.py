@@ -17,38 +17,37 @@ from app.firewall_helper.protocol import (
 )
 
 
-class _Win32File:
-    def __init__(self, closed: threading.Event) -> None:
-        self.closed = closed
-        self.handles = []
+class _StalledStream:
+    """Stream whose peer never answers; reads unblock only on close."""
 
-    def CloseHandle(self, handle) -> None:
-        self.handles.append(handle)
-        self.closed.set()
+    def __init__(self) -> None:
+        self.closed = threading.Event()
+        self.writes = []
 
+    def read_chunk(self) -> bytes:
+        self.closed.wait(timeout=1.0)
+        return b""
 
-def test_pipe_call_times_out_and_poisons_connection(monkeypatch) -> None:
-    closed = threading.Event()
-    win32file = _Win32File(closed)
-    client = transport.PipeClient(shared_secret=b"x" * 32)
-    client._handle = 123
-    client._win32file = win32file
-    client._pywintypes = object()
-    monkeypatch.setattr(transport, "_write_frame", lambda *_args: None)
+    def write(self, data: bytes) -> None:
+        self.writes.append(data)
 
-    def _blocked_read(*_args):
-        closed.wait(timeout=1.0)
-        return None
+    def close(self) -> None:
+        self.closed.set()
 
-    monkeypatch.setattr(transport, "_read_frame", _blocked_read)
+
+def test_pipe_call_times_out_and_poisons_connection() -> None:
+    stream = _StalledStream()
+    client = transport.PipeClient(shared_secret=b"x" * 32)
+    client._start_session(stream, transport.FrameReader(stream.read_chunk), ())
     started = time.monotonic()
 
     with pytest.raises(TimeoutError, match="op=ping"):
         client.call(Request(op=OP_PING), timeout_ms=20)
 
     assert time.monotonic() - started < 0.5
-    assert client._handle is None
-    assert win32file.handles == [123]
+    assert client._session is None
+    assert stream.closed.is_set()
+    assert len(stream.writes) == 1
 
 
 def test_proxy_resets_poisoned_client_after_timeout() -> None:
@@ -0,0 +1,119 @@
+"""Unix-domain-socket transport for the split-elevation IPC."""
+
+from __future__ import annotations
+
+import os
+import socket
+import stat
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"),
+    reason="AF_UNIX transport is POSIX-only",
+)
+
+from app.firewall_helper.auth import (  # noqa: E402
+    AuthenticationError,
+    HandshakeError,
+    generate_token,
+)
+from app.firewall_helper.protocol import (  # noqa: E402
+    OP_GET_STATUS,
+    OP_PING,
+    Request,
+    Response,
+)
+from app.firewall_helper.unix_transport import (  # noqa: E402
+    UnixSocketClient,
+    UnixSocketProxy,
+    UnixSocketServer,
+)
+
+SECRET = generate_token()
+
+
+def _echo(request: Request) -> Response:
+    return Response.success(request.request_id, {"op": request.op})
+
+
+@pytest.fixture
+def sock_path(tmp_path):
+    # AF_UNIX paths are capped near 108 bytes; pytest's tmp_path can be long.
+    path = os.path.join(str(tmp_path), "h.sock")
+    if len(path) > 100:
+        pytest.skip("tmp path too long for AF_UNIX")
+    return path
+
+
+@pytest.fixture
+def server(sock_path):
+    srv = UnixSocketServer(_echo, SECRET, sock_path)
+    srv.start()
+    yield srv
+    srv.stop()
+
+
+def test_roundtrip_negotiates_pipeline_and_binary(server, sock_path) -> None:
+    client = UnixSocketClient(SECRET, sock_path, binary=True)
+    client.connect(timeout_ms=2000)
+    try:
+        assert client.pipelined and client.binary
+        assert client.call(Request(op=OP_PING)).result == {"op": OP_PING}
+    finally:
+        client.close()
+
+
+def test_socket_and_directory_are_owner_only(server, sock_path) -> None:
+    assert stat.S_IMODE(os.stat(sock_path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(sock_path)).st_mode) == 0o700
+
+
+def test_wrong_secret_is_rejected_and_server_keeps_serving(server, sock_path) -> None:
+    bad = UnixSocketClient(generate_token(), sock_path)
+    with pytest.raises(AuthenticationError):
+        bad.connect(timeout_ms=2000)
+
+    good = UnixSocketClient(SECRET, sock_path)
+    good.connect(timeout_ms=2000)
+    try:
+        assert good.call(Request(op=OP_GET_STATUS)).ok
+    finally:
+        good.close()
+
+
+def test_disallowed_peer_uid_is_dropped_before_handshake(sock_path) -> None:
+    srv = UnixSocketServer(_echo, SECRET, sock_path, allowed_uids={os.getuid() + 1})
+    srv.start()
+    try:
+        client = UnixSocketClient(SECRET, sock_path)
+        # Dropped mid-handshake: EOF on read or EPIPE on write.
+        with pytest.raises((HandshakeError, OSError)):
+            client.connect(timeout_ms=1000)
+    finally:
+        srv.stop()
+
+
+def test_stop_removes_socket(sock_path) -> None:
+    srv = UnixSocketServer(_echo, SECRET, sock_path)
+    srv.start()
+    srv.stop()
+
+    assert not os.path.exists(sock_path)
+
+
+def test_proxy_reaches_fake_backend_process(sock_path) -> None:
+    from app.firewall_helper.fake_backend import spawn_fake_backend
+
+    proc = spawn_fake_backend(sock_path, SECRET)
+    try:
+        proxy = UnixSocketProxy(SECRET, sock_path)
+        assert proxy.disrupt_device("192.168.1.5", ["lag"]) is True
+        assert proxy.get_disrupted_devices() == ["192.168.1.5"]
+        assert proxy.get_status()["count"] == 1
+        proxy.shutdown_helper()
+        assert proc.wait(timeout=10) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
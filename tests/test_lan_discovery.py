@@ -0,0 +1,180 @@
+"""Asyncio LAN discovery engine: streaming, limits, ARP, enrichment."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+
+import pytest
+
+from app.network import device_scan
+from app.network.discovery import DiscoveryEngine, HostEnriched, HostFound
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def _closed_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_hosts_stream_before_enrichment_finishes() -> None:
+    def enrich(ip, mac):
+        time.sleep(0.3)
+        return {"hostname": f"h-{ip}"}
+
+    def icmp(ip):
+        if ip != "10.0.0.1":
+            time.sleep(0.1)
+        return ip == "10.0.0.1"
+
+    engine = DiscoveryEngine(
+        tcp_ports=(), icmp_probe=icmp,
+        arp_reader=lambda: {"10.0.0.200": "aa:bb:cc:00:00:01",
+                            "10.9.9.9": "aa:bb:cc:00:00:02"},
+        enricher=enrich,
+    )
+    t0 = time.monotonic()
+    stamped = [(time.monotonic() - t0, e)
+               for e in engine.run(["10.0.0.1", "10.0.0.200", "10.0.0.3"])]
+
+    found = {e.ip: e for _, e in stamped if isinstance(e, HostFound)}
+    assert set(found) == {"10.0.0.1", "10.0.0.200"}  # off-target ARP ignored
+    assert found["10.0.0.1"].method == "icmp"
+    assert found["10.0.0.200"] == HostFound("10.0.0.200", "aa:bb:cc:00:00:01", "arp")
+    first_found = min(t for t, e in stamped if isinstance(e, HostFound))
+    assert first_found < 0.1 and stamped[-1][0] >= 0.3
+    enriched = [e for _, e in stamped if isinstance(e, HostEnriched)]
+    assert sorted(e.info["hostname"] for e in enriched) == ["h-10.0.0.1", "h-10.0.0.200"]
+
+
+def test_refused_connection_counts_as_alive() -> None:
+    engine = DiscoveryEngine(tcp_ports=[_closed_port()], arp_reader=None)
+
+    events = list(engine.run(["127.0.0.1"]))
+
+    assert [(e.ip, e.method) for e in events] == [("127.0.0.1", "tcp")]
+
+
+def test_host_concurrency_is_bounded() -> None:
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def icmp(ip):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.05)
+        with lock:
+            state["now"] -= 1
+        return ip.endswith("7")
+
+    engine = DiscoveryEngine(tcp_ports=(), icmp_probe=icmp, arp_reader=None, concurrency=8,
+                             icmp_concurrency=8)
+    t0 = time.monotonic()
+    events = list(engine.run(f"198.51.100.{n}" for n in range(1, 41)))
+    elapsed = time.monotonic() - t0
+
+    assert state["peak"] == 8
+    assert elapsed < 1.0  # sequential would be 2 s
+    assert sorted(e.ip for e in events) == ["198.51.100.17", "198.51.100.27", "198.51.100.37",
+                                            "198.51.100.7"]
+    assert {e.method for e in events} == {"icmp"}
+
+
+def test_icmp_runs_only_after_tcp_misses_and_is_capped(listener) -> None:
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0, "asked": []}
+
+    def icmp(ip):
+        with lock:
+            state["asked"].append(ip)
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.05)
+        with lock:
+            state["now"] -= 1
+        return False
+
+    engine = DiscoveryEngine(tcp_ports=[listener], icmp_probe=icmp, arp_reader=None)
+    events = list(engine.run(["127.0.0.1"]))
+    assert [(e.ip, e.method) for e in events] == [("127.0.0.1", "tcp")]
+    assert state["asked"] == []
+
+    engine = DiscoveryEngine(tcp_ports=(), icmp_probe=icmp, arp_reader=None,
+                             concurrency=32, icmp_concurrency=3)
+    assert list(engine.run(f"198.51.100.{n}" for n in range(1, 13))) == []
+    assert len(state["asked"]) == 12 and state["peak"] == 3
+
+
+def test_icmp_echo_reply_must_match_probe() -> None:
+    import struct
+
+    ip_header = bytes([0x45]) + bytes(19)
+
+    def reply(icmp_type, ident, seq):
+        return ip_header + struct.pack("!BBHHH", icmp_type, 0, 0, ident, seq) + b"x"
+
+    assert device_scan._is_echo_reply(reply(0, 77, 5), 77, 5)
+    assert not device_scan._is_echo_reply(reply(0, 77, 6), 77, 5)   # another probe
+    assert not device_scan._is_echo_reply(reply(0, 78, 5), 77, 5)   # another process
+    assert not device_scan._is_echo_reply(reply(8, 77, 5), 77, 5)   # echo request
+    assert not device_scan._is_echo_reply(ip_header + b"\x00\x00", 77, 5)
+
+
+def test_late_arp_entries_attach_macs(listener) -> None:
+    reads = []
+
+    def arp():
+        reads.append(1)
+        return {} if len(reads) == 1 else {"127.0.0.1": "aa:bb:cc:00:00:03"}
+
+    events = list(DiscoveryEngine(tcp_ports=[listener], arp_reader=arp).run(["127.0.0.1"]))
+
+    assert events == [
+        HostFound("127.0.0.1", None, "tcp", events[0].rtt_ms),
+        HostEnriched("127.0.0.1", {"mac": "aa:bb:cc:00:00:03"}),
+    ]
+
+
+def test_closing_the_stream_early_stops_waiting(listener) -> None:
+    def icmp(ip):
+        time.sleep(0.8)
+        return False
+
+    engine = DiscoveryEngine(tcp_ports=[listener], icmp_probe=icmp, arp_reader=None)
+    t0 = time.monotonic()
+    stream = engine.run(["127.0.0.1"] + [f"10.0.1.{n}" for n in range(1, 50)])
+
+    assert next(stream).ip == "127.0.0.1"
+    stream.close()
+
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_device_scan_sweep_streams_device_dicts(listener, monkeypatch) -> None:
+    monkeypatch.setattr(device_scan, "_PROBE_PORTS", [listener])
+    monkeypatch.setattr(device_scan, "_resolve_hostname", lambda ip: f"box-{ip.rsplit('.', 1)[1]}")
+    streamed = []
+
+    devices = device_scan.scan_network_range_advanced(
+        "127.0.0", start=1, end=3, on_device=streamed.append,
+    )
+
+    assert [d["ip"] for d in devices] == ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+    assert [d["hostname"] for d in devices] == ["box-1", "box-2", "box-3"]
+    # Each host is published once when found and again once named.
+    assert len(streamed) == 6
+    first = {}
+    for d in streamed:
+        first.setdefault(d["ip"], d["hostname"])
+    assert not any(name.startswith("box-") for name in first.values())
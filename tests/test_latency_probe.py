@@ -0,0 +1,257 @@
+"""Tests for the shared multi-target latency sampler.
+
+Real probes only ever target 127.0.0.1: the loopback harness below gives
+each test a listening TCP port, a UDP echo port, a UDP port that never
+answers, and a closed port.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+
+import pytest
+
+from app.network.latency_probe import (
+    LatencyProbeService,
+    LatencyWindow,
+    _Prober,
+    probe_once,
+)
+from app.utils.helpers import ping_host
+
+LOOPBACK = "127.0.0.1"
+
+
+class _LoopbackHarness:
+    """Loopback endpoints with known answering behaviour."""
+
+    def __init__(self) -> None:
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.bind((LOOPBACK, 0))
+        self._tcp.listen(16)
+        self.tcp_port = self._tcp.getsockname()[1]
+
+        self._echo = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._echo.bind((LOOPBACK, 0))
+        self._echo.settimeout(0.1)
+        self.udp_echo_port = self._echo.getsockname()[1]
+
+        # Bound but never read: datagrams vanish without an ICMP error.
+        self._sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sink.bind((LOOPBACK, 0))
+        self.udp_silent_port = self._sink.getsockname()[1]
+
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind((LOOPBACK, 0))
+        self.closed_port = probe.getsockname()[1]
+        probe.close()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._serve_echo, daemon=True)
+        self._thread.start()
+
+    def _serve_echo(self) -> None:
+        while self._running:
+            try:
+                data, addr = self._echo.recvfrom(512)
+            except (socket.timeout, OSError):
+                continue
+            self._echo.sendto(data, addr)
+
+    def close(self) -> None:
+        self._running = False
+        self._thread.join(1.0)
+        for sock in (self._tcp, self._echo, self._sink):
+            sock.close()
+
+
+@pytest.fixture
+def loopback():
+    harness = _LoopbackHarness()
+    try:
+        yield harness
+    finally:
+        harness.close()
+
+
+def _fake_clock():
+    now = [100.0]
+    return now, (lambda: now[0])
+
+
+# ── Ring statistics ──────────────────────────────────────────────────
+
+def test_window_precomputes_mean_jitter_loss_and_percentiles() -> None:
+    window = LatencyWindow("192.0.2.10", size=5)
+    for rtt in (10.0, 20.0, None, 30.0, 20.0):
+        window.push(rtt, "icmp")
+
+    stats = window.stats
+
+    assert stats.mean_ms == pytest.approx(20.0)
+    assert stats.jitter_ms == pytest.approx((10 + 10 + 10) / 3)
+    assert stats.loss_pct == pytest.approx(20.0)
+    assert (stats.min_ms, stats.p50_ms, stats.max_ms) == (10.0, 20.0, 30.0)
+    assert stats.p95_ms == 30.0
+    assert stats.history == (10.0, 20.0, None, 30.0, 20.0)
+
+
+def test_window_evicts_oldest_samples() -> None:
+    window = LatencyWindow("192.0.2.10", size=3)
+    for rtt in (None, None, 5.0, 7.0, 9.0):
+        window.push(rtt)
+
+    assert window.stats.sent == 3
+    assert window.stats.loss_pct == 0.0
+    assert window.stats.mean_ms == pytest.approx(7.0)
+
+
+def test_lost_sample_clears_last_but_keeps_rolling_mean() -> None:
+    window = LatencyWindow("192.0.2.10")
+    window.push(12.0, "tcp")
+    stats = window.push(None)
+
+    assert not stats.reachable
+    assert stats.mean_ms == 12.0
+    assert stats.method == "tcp"
+
+
+# ── Loopback probes ──────────────────────────────────────────────────
+
+def test_tcp_connect_timing_to_listener_and_closed_port(loopback) -> None:
+    prober = _Prober(icmp=False)
+    open_key = (LOOPBACK, loopback.tcp_port)
+    closed_key = (LOOPBACK, loopback.closed_port)
+
+    results = prober.probe([open_key, closed_key], 1.0)
+
+    # A refused connect is still an answer from the host.
+    for key in (open_key, closed_key):
+        rtt, method = results[key]
+        assert method == "tcp" and 0.0 <= rtt < 1000.0
+
+
+def test_udp_fallback_times_echo_and_port_unreachable(loopback) -> None:
+    for port in (loopback.udp_echo_port, loopback.closed_port):
+        prober = _Prober(icmp=False, fallback=("udp",), udp_port=port)
+        rtt, method = prober.probe([(LOOPBACK, None)], 1.0)[(LOOPBACK, None)]
+        assert method == "udp" and rtt >= 0.0
+
+
+def test_silent_target_is_recorded_as_loss(loopback) -> None:
+    prober = _Prober(icmp=False, fallback=("udp",), udp_port=loopback.udp_silent_port)
+
+    assert prober.probe([(LOOPBACK, None)], 0.1) == {(LOOPBACK, None): None}
+
+
+def test_icmp_echo_to_loopback_when_permitted() -> None:
+    prober = _Prober(icmp=True)
+    try:
+        result = prober.probe([(LOOPBACK, None)], 1.0)[(LOOPBACK, None)]
+        if prober.icmp_mode not in ("raw", "dgram"):
+            pytest.skip("no ICMP socket permitted in this environment")
+        assert result is not None and result[1] == "icmp"
+    finally:
+        prober.close()
+
+
+def test_probe_once_and_ping_host(loopback) -> None:
+    assert probe_once(LOOPBACK, 1.0, port=loopback.tcp_port) is not None
+    assert probe_once("not-an-ip") is None
+    assert ping_host("not-an-ip") == (False, 0.0)
+
+
+# ── Service ──────────────────────────────────────────────────────────
+
+def _service(results, **kwargs):
+    now, clock = _fake_clock()
+    calls = []
+
+    def prober(keys, _timeout):
+        calls.append(list(keys))
+        return {key: results.get(key) for key in keys}
+
+    service = LatencyProbeService(prober=prober, clock=clock, **kwargs)
+    service.start = lambda: None  # drive rounds synchronously via tick()
+    return service, calls, now
+
+
+def test_one_round_probes_every_target_once() -> None:
+    service, calls, _now = _service({
+        ("192.0.2.10", None): (20.0, "icmp"),
+        ("192.0.2.11", 2302): (35.0, "tcp"),
+    })
+    seen = []
+    service.watch("192.0.2.10", seen.append)
+    service.watch("192.0.2.10", seen.append)  # shared, not probed twice
+    service.watch("192.0.2.11", port=2302)
+
+    delay = service.tick()
+
+    assert calls == [[("192.0.2.10", None), ("192.0.2.11", 2302)]]
+    assert [s.last_ms for s in seen] == [20.0, 20.0]
+    assert service.stats("192.0.2.11", 2302).method == "tcp"
+    assert delay == pytest.approx(1.0)
+
+
+def test_rounds_follow_the_interval() -> None:
+    service, calls, now = _service({})
+    service.watch("192.0.2.10")
+    service.tick()
+
+    now[0] += 0.4
+    assert service.tick() == pytest.approx(0.6)
+    now[0] += 0.6
+    service.tick()
+
+    assert len(calls) == 2
+    assert service.stats("192.0.2.10").loss_pct == 100.0
+
+
+def test_closing_last_watch_stops_sampling_target() -> None:
+    service, calls, now = _service({})
+    first = service.watch("192.0.2.10")
+    second = service.watch("192.0.2.10")
+    service.tick()
+
+    first.close()
+    assert service.snapshot()
+    second.close()
+    now[0] += 5.0
+
+    assert service.tick() is None
+    assert service.snapshot() == {}
+    assert len(calls) == 1
+
+
+def test_callback_for_deleted_widget_drops_its_watch() -> None:
+    service, _calls, now = _service({})
+
+    def deleted(_stats):
+        raise RuntimeError("wrapped C/C++ object has been deleted")
+
+    watch = service.watch("192.0.2.10", deleted)
+    service.tick()
+
+    assert watch.closed
+    assert service.snapshot() == {}
+
+
+def test_invalid_target_is_rejected() -> None:
+    service, _calls, _now = _service({})
+    with pytest.raises(ValueError):
+        service.watch("example.invalid")
+
+
+def test_sampler_thread_measures_loopback(loopback) -> None:
+    service = LatencyProbeService(interval_s=0.05, timeout_s=0.5, icmp=False)
+    got = threading.Event()
+    try:
+        service.watch(LOOPBACK, lambda s: s.reachable and got.set(),
+                      port=loopback.tcp_port)
+        assert got.wait(3.0)
+        stats = service.snapshot()[f"{LOOPBACK}:{loopback.tcp_port}"]
+        assert stats.method == "tcp" and stats.mean_ms is not None
+    finally:
+        service.stop()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication, QLabel, QStackedWidget, QWidget
+
+from app.gui.lazy_view import LazyView, ViewPrewarmer
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    return QApplication.instance() or QApplication([])
+
+
+def _pump_until(qapp, predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        if predicate():
+            return
+        time.sleep(0.01)
+    qapp.processEvents()
+    assert predicate()
+
+
+class _TimedView(QWidget):
+    def __init__(self) -> None:
+        super().__init__()
+        self.timer = QTimer(self)
+        self.timer.start(1000)
+
+
+def test_view_is_built_on_first_show_only(qapp) -> None:
+    calls: list[int] = []
+
+    def factory() -> QWidget:
+        calls.append(1)
+        return QLabel("ready")
+
+    stack = QStackedWidget()
+    stack.addWidget(QLabel("landing"))
+    lazy = LazyView(factory, name="Accounts")
+    stack.addWidget(lazy)
+    stack.show()
+    qapp.processEvents()
+
+    assert calls == []
+
+    stack.setCurrentIndex(1)
+    _pump_until(qapp, lambda: lazy.is_loaded)
+
+    stack.setCurrentIndex(0)
+    stack.setCurrentIndex(1)
+    qapp.processEvents()
+    assert calls == [1]
+    assert isinstance(lazy.widget, QLabel)
+    stack.deleteLater()
+
+
+def test_hidden_view_pauses_and_resumes_its_timers(qapp) -> None:
+    stack = QStackedWidget()
+    stack.addWidget(LazyView(widget=QLabel("landing")))
+    host = LazyView(_TimedView)
+    stack.addWidget(host)
+    host.load_now()
+    view = host.widget
+
+    # Built while hidden: timers stay parked until first shown.
+    assert not view.timer.isActive()
+
+    stack.show()
+    stack.setCurrentIndex(1)
+    qapp.processEvents()
+    assert view.timer.isActive()
+
+    stack.setCurrentIndex(0)
+    qapp.processEvents()
+    assert not view.timer.isActive()
+
+    stack.setCurrentIndex(1)
+    qapp.processEvents()
+    assert view.timer.isActive()
+    stack.deleteLater()
+
+
+def test_background_hooks_replace_generic_timer_pausing(qapp) -> None:
+    class _Hooked(_TimedView):
+        def __init__(self) -> None:
+            super().__init__()
+            self.events: list[str] = []
+
+        def pause_background(self) -> None:
+            self.events.append("pause")
+
+        def resume_background(self) -> None:
+            self.events.append("resume")
+
+    host = LazyView(_Hooked)
+    host.load_now()
+    view = host.widget
+    host.resume_timers()
+
+    assert view.events == ["pause", "resume"]
+    assert view.timer.isActive()
+    host.deleteLater()
+
+
+def test_adopted_and_opted_out_views_keep_their_timers(qapp) -> None:
+    stack = QStackedWidget()
+    stack.addWidget(QLabel("landing"))
+    adopted = LazyView(widget=_TimedView())
+    plugin = LazyView(_TimedView, pause_hidden=False)
+    stack.addWidget(adopted)
+    stack.addWidget(plugin)
+    plugin.load_now()
+    stack.show()
+
+    for index in (1, 2, 0):
+        stack.setCurrentIndex(index)
+        qapp.processEvents()
+        assert adopted.widget.timer.isActive()
+        assert plugin.widget.timer.isActive()
+    stack.deleteLater()
+
+
+def test_factory_without_a_view_marks_the_page_empty(qapp) -> None:
+    lazy = LazyView(lambda: None, name="Plugin")
+    emptied: list[bool] = []
+    lazy.empty.connect(lambda: emptied.append(True))
+
+    assert lazy.load_now() is False
+    lazy.retry()
+
+    assert emptied == [True]
+    assert lazy.is_empty and not lazy.is_loaded
+    assert not lazy._retry.isVisible()
+    lazy.deleteLater()
+
+
+def test_failed_factory_can_retry(qapp) -> None:
+    attempts: list[str] = []
+
+    def failing() -> QWidget:
+        attempts.append("failed")
+        raise RuntimeError("boom")
+
+    lazy = LazyView(failing, name="Network Tools")
+    assert lazy.load_now() is False
+    assert "boom" in lazy._status.text()
+
+    lazy._factory = lambda: attempts.append("loaded") or QWidget()
+    lazy.retry()
+
+    assert attempts == ["failed", "loaded"]
+    assert lazy.is_loaded is True
+    lazy.deleteLater()
+
+
+def test_prewarmer_builds_pending_views_in_priority_order(qapp) -> None:
+    order: list[str] = []
+
+    def factory(name: str):
+        return lambda: order.append(name) or QLabel(name)
+
+    first = LazyView(factory("accounts"), name="accounts")
+    second = LazyView(factory("nettools"), name="nettools")
+    already = LazyView(widget=QLabel("help"), name="help")
+    prewarmer = ViewPrewarmer(
+        [first, already, second], start_delay_ms=0, gap_ms=0,
+    )
+    done: list[bool] = []
+    prewarmer.finished.connect(lambda: done.append(True))
+
+    prewarmer.start()
+    _pump_until(qapp, lambda: bool(done))
+
+    assert order == ["accounts", "nettools"]
+    assert prewarmer.pending == []
+    for view in (first, second, already):
+        view.deleteLater()
+
+
+def test_stopped_prewarmer_builds_nothing(qapp) -> None:
+    built: list[int] = []
+    lazy = LazyView(lambda: built.append(1) or QWidget(), name="x")
+    prewarmer = ViewPrewarmer([lazy], start_delay_ms=0, gap_ms=0)
+
+    prewarmer.start()
+    prewarmer.stop()
+    for _ in range(5):
+        qapp.processEvents()
+        time.sleep(0.01)
+
+    assert built == []
+    lazy.deleteLater()
@@ -0,0 +1,143 @@
+"""Shared mDNS resolver: batching, caching, wire format."""
+
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+
+import pytest
+
+from app.network import mdns
+from app.network.mdns import MDNSResolver, build_query, parse_response
+
+
+def _name(name: str) -> bytes:
+    return b"".join(bytes([len(p)]) + p.encode() for p in name.split(".")) + b"\x00"
+
+
+def _ptr_response(answers, ttl=120) -> bytes:
+    """Response carrying one PTR answer per ``(reverse_owner, target)``."""
+    body = b""
+    for owner, target in answers:
+        rdata = _name(target)
+        body += _name(owner) + struct.pack("!HHIH", 12, 0x8001, ttl, len(rdata)) + rdata
+    return struct.pack("!HHHHHH", 0, 0x8400, 0, len(answers), 0, 0) + body
+
+
+class _Responder:
+    """Answers reverse PTR questions from a fixed ``{ip: name}`` table."""
+
+    def __init__(self, names, ttl=120) -> None:
+        self.names, self.ttl = names, ttl
+        self.queries = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(9000)
+            except (socket.timeout, OSError):
+                continue
+            qd = struct.unpack_from("!H", data, 4)[0]
+            owners, off = [], 12
+            for _ in range(qd):
+                owner, off = mdns._read_name(data, off)
+                owners.append(owner)
+                off += 4
+            self.queries.append(owners)
+            answers = [(o, self.names[ip]) for o in owners
+                       if (ip := mdns._ip_from_reverse(o)) in self.names]
+            if answers:
+                self.sock.sendto(_ptr_response(answers, self.ttl), addr)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def responder():
+    r = _Responder({"192.168.77.2": "tv.local.", "192.168.77.3": "printer.local."})
+    yield r
+    r.close()
+
+
+def _resolver(responder, **kwargs) -> MDNSResolver:
+    # Unicast copies go to the (unroutable) targets themselves; only the
+    # "group" address reaches the fake responder.
+    return MDNSResolver(group=("127.0.0.1", responder.port), unicast_port=9,
+                        window_s=0.3, **kwargs)
+
+
+def test_concurrent_lookups_share_one_window(responder) -> None:
+    resolver = _resolver(responder, gather_s=0.1)
+    ips = ["192.168.77.2", "192.168.77.3", "192.168.77.4"]
+    results = {}
+
+    threads = [threading.Thread(target=lambda ip=ip: results.update({ip: resolver.resolve(ip)}))
+               for ip in ips]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {"192.168.77.2": "tv.local", "192.168.77.3": "printer.local",
+                       "192.168.77.4": ""}
+    assert resolver.windows == 1
+    assert len(responder.queries) == 1 and len(responder.queries[0]) == 3
+
+
+def test_names_and_misses_are_cached_for_their_ttl(responder) -> None:
+    clock = _Clock()
+    resolver = _resolver(responder, gather_s=0, negative_ttl_s=30, clock=clock)
+
+    assert resolver.resolve_many(["192.168.77.2", "192.168.77.9"]) == {"192.168.77.2": "tv.local"}
+    assert resolver.resolve("192.168.77.2") == "tv.local"
+    assert resolver.resolve("192.168.77.9") == ""
+    assert resolver.windows == 1
+
+    clock.now += 31
+    assert resolver.cached("192.168.77.9") is None
+    assert resolver.cached("192.168.77.2") == "tv.local"
+    clock.now += 100
+    assert resolver.cached("192.168.77.2") is None
+
+
+def test_goodbye_records_are_ignored() -> None:
+    r = _Responder({"192.168.77.2": "gone.local."}, ttl=0)
+    try:
+        resolver = _resolver(r, gather_s=0)
+        assert resolver.resolve("192.168.77.2") == ""
+    finally:
+        r.close()
+
+
+def test_parse_response_follows_compression_pointers() -> None:
+    owner = _name("2.77.168.192.in-addr.arpa")
+    # Second record's owner and target both point back into the first.
+    target = b"\x03box" + b"\xc0\x0c"
+    buf = (struct.pack("!HHHHHH", 0, 0x8400, 0, 2, 0, 0)
+           + owner + struct.pack("!HHIH", 12, 1, 60, len(target)) + target
+           + b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4) + socket.inet_aton("192.168.77.2"))
+
+    assert parse_response(buf) == [
+        ("2.77.168.192.in-addr.arpa", 12, 60, "box.2.77.168.192.in-addr.arpa"),
+        ("2.77.168.192.in-addr.arpa", 1, 60, "192.168.77.2"),
+    ]
+    assert parse_response(build_query(["192.168.77.2"])) == []  # queries ignored
@@ -126,3 +126,29 @@ def test_adapter_summary_contains_no_identifiers(monkeypatch) -> None:
     assert summary["up_adapter_count"] == 1
     assert summary["max_link_speed_mbps"] == 866
     assert "Example Wi-Fi" not in json.dumps(summary)
+
+
+def test_latency_summary_masks_targets_and_never_starts_sampler(monkeypatch) -> None:
+    import app.core.network_health as health
+    import app.network.latency_probe as latency
+
+    monkeypatch.setattr(latency, "_service", None)
+    assert health._collect_latency_summary() == {
+        "available": False, "icmp": None, "targets": [],
+    }
+    assert latency._service is None
+
+    service = latency.LatencyProbeService(
+        prober=lambda keys, _timeout: {key: (12.5, "tcp") for key in keys},
+    )
+    monkeypatch.setattr(service, "start", lambda: None)
+    monkeypatch.setattr(latency, "_service", service)
+    service.watch("192.168.1.25", port=2302)
+    service.tick()
+
+    summary = health._collect_latency_summary()
+
+    assert summary["available"] is True
+    assert summary["targets"][0]["target"] == "192.168.1.x:2302"
+    assert summary["targets"][0]["mean_ms"] == 12.5
+    assert "192.168.1.25" not in json.dumps(summary)
@@ -0,0 +1,88 @@
+"""Bundled OUI database: format, longest-prefix lookup, generator inputs."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.network import shared
+from app.network.oui_db import OUIDatabase, build_database, get_oui_database
+from scripts.build_oui_db import read_manuf, read_registry_csv
+
+
+@pytest.fixture
+def db() -> OUIDatabase:
+    return OUIDatabase(build_database([
+        (24, 0x70B3D5, "IEEE Registration Authority"),
+        (28, 0x70B3D5F, "Block Holder Ltd"),
+        (36, 0x70B3D5F2A, "Tiny Sensor GmbH"),
+        (24, 0xB827EB, "Raspberry Pi Foundation"),
+        (24, 0x000C29, "VMware, Inc."),
+        (24, 0x00000C, "Cisco Systems, Inc"),
+        (24, 0x00000D, "Cisco Systems, Inc"),
+    ]))
+
+
+def test_longest_registered_prefix_wins(db) -> None:
+    assert db.lookup("70:b3:d5:f2:a1:23") == "Tiny Sensor GmbH"
+    assert db.lookup("70:b3:d5:f2:b1:23") == "Block Holder Ltd"
+    assert db.lookup("70:b3:d5:12:34:56") == "IEEE Registration Authority"
+    assert db.lookup("70:b3:d6:12:34:56") is None
+    assert len(db) == 7
+
+
+def test_common_notations_and_junk(db) -> None:
+    for mac in ("B8:27:EB:01:02:03", "b8-27-eb-01-02-03", "b827.eb01.0203"):
+        assert db.lookup(mac) == "Raspberry Pi Foundation"
+    for junk in ("", "Unknown", "b8:27:eb", "zz:27:eb:01:02:03"):
+        assert db.lookup(junk) is None
+
+
+def test_names_are_stored_once() -> None:
+    one = build_database([(24, 0x00000C, "Cisco Systems, Inc")])
+    two = build_database([(24, 0x00000C, "Cisco Systems, Inc"),
+                          (24, 0x00000D, "Cisco Systems, Inc")])
+    assert len(two) - len(one) == 4 + 2  # one key + one index, no new string
+
+
+def test_corrupt_files_are_rejected(db) -> None:
+    data = build_database([(24, 0xB827EB, "Raspberry Pi Foundation")])
+    with pytest.raises(ValueError):
+        OUIDatabase(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        OUIDatabase(data[:-3])
+    with pytest.raises(ValueError):
+        build_database([(32, 0x1, "x")])
+
+
+def test_generator_reads_registry_csv_and_manuf(tmp_path) -> None:
+    csv_path = tmp_path / "mam.csv"
+    csv_path.write_text(
+        "Registry,Assignment,Organization Name,Organization Address\n"
+        "MA-L,B827EB,Raspberry Pi Foundation,Cambridge GB\n"
+        'MA-M,70B3D5F,"Block  Holder, Ltd",Somewhere\n'
+        "MA-S,70B3D5F2A,Tiny Sensor GmbH,Berlin DE\n", encoding="utf-8")
+    manuf = tmp_path / "manuf"
+    manuf.write_text(
+        "# comment\n"
+        "00:00:0C\tCisco\tCisco Systems, Inc\n"
+        "00:55:DA:10/28\tKoolPOS\tKoolPOS Inc.\n"
+        "00:1B:C5:00:10/36\tOpenRB\tOpenRB.com, Direct SIA\n", encoding="utf-8")
+
+    assert list(read_registry_csv(csv_path)) == [
+        (24, 0xB827EB, "Raspberry Pi Foundation"),
+        (28, 0x70B3D5F, "Block Holder, Ltd"),
+        (36, 0x70B3D5F2A, "Tiny Sensor GmbH"),
+    ]
+    assert list(read_manuf(manuf)) == [
+        (24, 0x00000C, "Cisco Systems, Inc"),
+        (28, 0x0055DA1, "KoolPOS Inc."),
+        (36, 0x001BC5001, "OpenRB.com, Direct SIA"),
+    ]
+
+
+def test_lookup_vendor_uses_bundled_database() -> None:
+    assert get_oui_database() is not None
+    # Curated table first, then the bundled registry.
+    assert shared.lookup_vendor("b4:0a:d8:11:22:33") == "Sony Interactive Entertainment"
+    assert "raspberry" in shared.lookup_vendor("b8:27:eb:11:22:33").lower()
+    assert shared.lookup_vendor("02:00:00:00:00:01") == "Unknown"
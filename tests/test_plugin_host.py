@@ -0,0 +1,237 @@
+"""Out-of-process plugin host: event ring, worker calls, budgets."""
+
+from __future__ import annotations
+
+import json
+import textwrap
+import types
+
+import pytest
+
+from app.plugins.host import PluginHostError, PluginHostPool, PluginHostTimeout
+from app.plugins.loader import PluginLoader, PluginManifest
+from app.plugins.shm_ring import ShmRing
+
+_PLUGIN = textwrap.dedent('''
+    import socket
+    import threading
+    import time
+
+    from app.plugins.base import ScannerPlugin
+
+
+    class ProbePlugin(ScannerPlugin):
+        def activate(self, controller):
+            self.controller = controller
+            self.seen = []
+            self._enabled = True
+            return True
+
+        def deactivate(self):
+            return True
+
+        def get_scan_types(self):
+            return ["spin", "sleep", "status", "events", "thread_connect"]
+
+        def on_event(self, event, payload):
+            self.seen.append([event, payload])
+
+        def scan(self, scan_type, params=None):
+            params = params or {}
+            if scan_type == "spin":
+                end = time.thread_time() + params["sec"]
+                while time.thread_time() < end:
+                    pass
+                return []
+            if scan_type == "sleep":
+                time.sleep(params["sec"])
+                return []
+            if scan_type == "status":
+                return [self.controller.get_status()]
+            if scan_type == "events":
+                return self.seen
+            if scan_type == "thread_connect":
+                out = {}
+
+                def run():
+                    try:
+                        socket.socket().connect(("127.0.0.1", 9))
+                    except Exception as e:
+                        out["error"] = type(e).__name__
+
+                worker = threading.Thread(target=run)
+                worker.start()
+                worker.join()
+                return [out]
+''')
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    pdir = tmp_path / "plugins" / "probe"
+    pdir.mkdir(parents=True)
+    (pdir / "plugin.py").write_text(_PLUGIN)
+    return pdir
+
+
+def _manifest(plugin_dir, **overrides):
+    values = dict(
+        name="probe", plugin_dir=str(plugin_dir), entry_point="plugin.py",
+        plugin_type="scanner", capabilities=frozenset(), entry_sha384="",
+        host_group="",
+    )
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+@pytest.fixture
+def pool():
+    pool = PluginHostPool(call_timeout_sec=5.0)
+    yield pool
+    pool.shutdown()
+
+
+def test_ring_wraps_and_drops_when_full() -> None:
+    producer = ShmRing.create(64)
+    consumer = ShmRing.attach(producer.name)
+    try:
+        for i in range(20):
+            assert producer.push(b"x" * 20 + bytes([i]))
+            assert consumer.pop() == b"x" * 20 + bytes([i])
+        assert consumer.pop() is None
+
+        assert producer.push(b"a" * 30)
+        assert not producer.push(b"b" * 30)
+        assert producer.dropped == 1
+        assert consumer.pop() == b"a" * 30
+    finally:
+        consumer.close()
+        producer.close()
+
+
+def test_interleaved_push_and_drain_never_strand_records() -> None:
+    """Lost-wakeup stress: the worker parks between drains, the host
+    pushes concurrently, and only kicks may wake the worker."""
+    import queue
+    import threading
+
+    from app.plugins import host, host_worker
+
+    total = 20000
+    ring = ShmRing.create(4096)
+    consumer = ShmRing.attach(ring.name)
+    kicks: "queue.Queue[dict]" = queue.Queue()
+    handle = object.__new__(host._WorkerHandle)
+    handle.ring, handle.alive, handle._kicked = ring, True, 0
+    handle._push_lock = threading.Lock()
+    handle._send = kicks.put
+    worker = host_worker._Worker("stress", consumer, None)
+    delivered = []
+    worker.controller.update = lambda v: delivered.append(v["n"])
+    stop = threading.Event()
+
+    def produce():
+        for n in range(total):
+            record = json.dumps({"k": "status", "v": {"n": n}}).encode()
+            while not handle.push(record):
+                if stop.is_set():
+                    return
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    try:
+        while len(delivered) < total:
+            worker.drain()
+            if len(delivered) < total:
+                try:
+                    kicks.get(timeout=2.0)
+                except queue.Empty:
+                    pytest.fail(f"worker parked with records pending after {len(delivered)}")
+    finally:
+        stop.set()
+        producer.join()
+        consumer.close()
+        ring.close()
+    assert delivered == list(range(total))
+    # Kicks are coalesced to at most one per park.
+    assert kicks.qsize() <= 1
+
+
+def test_hosted_plugin_calls_events_and_status(pool, plugin_dir) -> None:
+    plugin = pool.load(_manifest(plugin_dir))
+
+    assert plugin.enabled
+    assert "spin" in plugin.get_scan_types()
+    pool.publish_status({"devices": [{"ip": "192.0.2.7"}]})
+    pool.publish("disruption_started", {"ip": "192.0.2.7"})
+    plugin.on_event("only_probe", {})
+
+    assert plugin.scan("status") == [{"devices": [{"ip": "192.0.2.7"}]}]
+    assert plugin.scan("events") == [
+        ["disruption_started", {"ip": "192.0.2.7"}], ["only_probe", {}],
+    ]
+    stats = pool.stats()["probe"]
+    assert stats["hosted"] and stats["calls"] == 3 and stats["events"] == 2
+    assert stats["call_latency_ms"]["p50"] > 0
+
+
+def test_threads_started_by_hosted_plugin_are_sandboxed(pool, plugin_dir) -> None:
+    plugin = pool.load(_manifest(plugin_dir))
+
+    assert plugin.scan("thread_connect") == [{"error": "SandboxViolation"}]
+
+
+def test_call_timeout_stops_worker(plugin_dir) -> None:
+    pool = PluginHostPool(call_timeout_sec=0.5)
+    try:
+        plugin = pool.load(_manifest(plugin_dir))
+        with pytest.raises(PluginHostTimeout):
+            plugin.scan("sleep", {"sec": 5})
+
+        assert not plugin.enabled
+        assert pool.stats()["probe"]["timeouts"] == 1
+        with pytest.raises(PluginHostError):
+            plugin.get_scan_types()
+    finally:
+        pool.shutdown()
+
+
+def test_cpu_budget_strikes_stop_worker(plugin_dir) -> None:
+    pool = PluginHostPool(cpu_budget_sec=0.01, max_strikes=2)
+    try:
+        plugin = pool.load(_manifest(plugin_dir))
+        plugin.scan("spin", {"sec": 0.03})
+        assert plugin.enabled
+        plugin.scan("spin", {"sec": 0.03})
+
+        assert not plugin.enabled
+        assert pool.stats()["probe"]["strikes"] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_changed_entry_file_is_refused(pool, plugin_dir) -> None:
+    with pytest.raises(PluginHostError, match="changed since verification"):
+        pool.load(_manifest(plugin_dir, entry_sha384="0" * 96))
+
+
+def test_loader_routes_hostable_plugins_to_host(pool, plugin_dir, monkeypatch) -> None:
+    monkeypatch.setenv("DUPEZ_SECOND_FACTOR_DISABLED", "1")
+    data = {
+        "name": "probe", "version": "1.0.0", "description": "test",
+        "type": "scanner", "entry_point": "plugin.py",
+    }
+    (plugin_dir / "manifest.json").write_text(json.dumps(data))
+    loader = PluginLoader(str(plugin_dir.parent), host=pool)
+    loader.manifests = {"probe": PluginManifest(data, str(plugin_dir))}
+
+    loaded = loader.load_all(None)
+
+    assert [p.name for p in loaded] == ["probe"]
+    assert loader.get_scanner_plugins()[0].instance.get_scan_types()[0] == "spin"
+    loader.publish_event("tick", {"n": 1})
+    assert loaded[0].instance.scan("events") == [["tick", {"n": 1}]]
+    assert "probe" in loader.get_host_stats()
+
+    assert loader.unload_plugin("probe")
+    assert pool.stats()["probe"]["hosted"] is False
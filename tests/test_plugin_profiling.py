@@ -0,0 +1,180 @@
+"""Per-plugin hook timing, soft/hard budgets, and their reporting."""
+
+from __future__ import annotations
+
+import argparse
+import textwrap
+
+import pytest
+
+from app import cli
+from app.plugins import profiling
+from app.plugins.loader import PluginLoader, PluginManifest
+from app.plugins.profiling import PluginDisabledError, PluginProfiler, instrument
+
+_PLUGIN = textwrap.dedent('''
+    import time
+
+    from app.plugins.base import ScannerPlugin
+
+
+    class SlowScanner(ScannerPlugin):
+        def activate(self, controller):
+            self._enabled = True
+            return True
+
+        def deactivate(self):
+            self._enabled = False
+            return True
+
+        def get_scan_types(self):
+            return ["slow"]
+
+        def scan(self, scan_type, params=None):
+            time.sleep((params or {}).get("sec", 0))
+            return []
+''')
+
+
+class _Plugin:
+    def __init__(self) -> None:
+        self.deactivated = 0
+
+    def scan(self, scan_type, params=None):
+        return [scan_type]
+
+    def deactivate(self):
+        self.deactivated += 1
+        return True
+
+
+def test_records_counts_max_and_histogram() -> None:
+    profiler = PluginProfiler(soft_budget_ms=1000, hard_budget_ms=2000)
+    for ns in (50_000, 500_000, 3_000_000, 20_000_000):
+        profiler.record("p", "scan", ns)
+
+    hook = profiler.snapshot("p")["hooks"]["scan"]
+
+    assert hook["calls"] == 4
+    assert hook["max_ms"] == pytest.approx(20.0)
+    assert hook["total_ms"] == pytest.approx(23.55)
+    assert hook["histogram"]["<=0.1ms"] == 1
+    assert hook["histogram"]["<=1ms"] == 1
+    assert hook["histogram"]["<=5ms"] == 1
+    assert hook["histogram"]["<=50ms"] == 1
+
+
+def test_instrumented_instance_keeps_behaviour() -> None:
+    profiler = PluginProfiler()
+    plugin = instrument(_Plugin(), "p", profiler)
+    instrument(plugin, "p", profiler)
+
+    assert plugin.scan("arp") == ["arp"]
+    assert profiler.snapshot("p")["hooks"]["scan"]["calls"] == 1
+    assert not getattr(_Plugin.scan, "__dupez_profiled__", False)
+
+
+def test_soft_budget_only_warns(monkeypatch) -> None:
+    warnings = []
+    monkeypatch.setattr(profiling, "log_warning", warnings.append)
+    disabled = []
+    profiler = PluginProfiler(
+        soft_budget_ms=1, hard_budget_ms=1000, on_disable=lambda *a: disabled.append(a),
+    )
+
+    for _ in range(3):
+        profiler.record("p", "on_event", 2_000_000)
+
+    assert len(warnings) == 1 and "soft budget" in warnings[0]
+    assert profiler.snapshot("p")["hooks"]["on_event"]["soft_overruns"] == 3
+    assert not disabled
+
+
+def test_hard_budget_disables_after_repeated_overruns() -> None:
+    disabled = []
+    profiler = PluginProfiler(
+        soft_budget_ms=1, hard_budget_ms=2, max_overruns=2,
+        on_disable=lambda name, reason: disabled.append((name, reason)),
+    )
+    profiler.record("p", "activate", 10_000_000)  # activation is soft-only
+    plugin = instrument(_Plugin(), "p", profiler)
+
+    for _ in range(3):
+        profiler.record("p", "on_event", 5_000_000)
+
+    assert [name for name, _ in disabled] == ["p"]
+    assert profiler.is_disabled("p") and "on_event: 2 ms" in disabled[0][1]
+    assert profiler.snapshot("p")["disabled"]
+    with pytest.raises(PluginDisabledError):
+        plugin.scan("arp")
+    assert plugin.deactivate() is True
+
+    profiler.reset("p")
+    assert plugin.scan("arp") == ["arp"]
+
+
+def test_long_running_hooks_have_their_own_budget() -> None:
+    disabled = []
+    profiler = PluginProfiler(
+        soft_budget_ms=16, hard_budget_ms=1000, max_overruns=1,
+        on_disable=lambda name, reason: disabled.append(name),
+    )
+
+    # A multi-second subnet sweep or apply is normal work, not a hang.
+    profiler.record("p", "scan", 5_000_000_000)
+    profiler.record("p", "apply", 5_000_000_000)
+    assert profiler.budgets_for("scan") == (
+        profiling.DEFAULT_LONG_SOFT_BUDGET_MS, profiling.DEFAULT_LONG_HARD_BUDGET_MS)
+    assert not disabled and profiler.snapshot("p")["hard_overruns"] == 0
+
+    profiler.record("p", "on_event", 2_000_000_000)
+    assert disabled == ["p"]
+
+
+def test_loader_profiles_plugins_and_disables_slow_ones(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DUPEZ_SECOND_FACTOR_DISABLED", "1")
+    pdir = tmp_path / "plugins" / "slow"
+    pdir.mkdir(parents=True)
+    (pdir / "plugin.py").write_text(_PLUGIN)
+    data = {
+        "name": "slow", "version": "1.0.0", "description": "test",
+        "type": "scanner", "entry_point": "plugin.py",
+    }
+    loader = PluginLoader(
+        str(tmp_path / "plugins"),
+        profiler=PluginProfiler(long_soft_budget_ms=1, long_hard_budget_ms=5, max_overruns=2),
+    )
+    loader.manifests = {"slow": PluginManifest(data, str(pdir))}
+    (plugin,) = loader.load_all(None)
+
+    plugin.instance.scan("slow")
+    info = loader.get_plugin_info()[0]["profile"]
+    assert set(info["hooks"]) == {"activate", "scan"}
+    assert not info["disabled"]
+
+    for _ in range(2):
+        plugin.instance.scan("slow", {"sec": 0.02})
+
+    assert not plugin.active
+    assert plugin.error.startswith("disabled:")
+    assert loader.get_scanner_plugins() == []
+    assert loader.get_plugin_info()[0]["profile"]["disabled"]
+
+
+def test_cli_plugins_profile_prints_hook_table(capsys) -> None:
+    profiler = PluginProfiler()
+    profiler.record("slow", "scan", 3_000_000)
+
+    class _Controller:
+        def get_plugin_info(self):
+            return [{
+                "name": "slow", "version": "1.0.0", "type": "scanner",
+                "active": True, "description": "test",
+                "profile": profiler.snapshot("slow"),
+            }]
+
+    cli.cmd_plugins(_Controller(), argparse.Namespace(profile=True))
+
+    out = capsys.readouterr().out
+    assert "slow: 1 call(s)" in out
+    assert "scan" in out and "<=5ms:1" in out
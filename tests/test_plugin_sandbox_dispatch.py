@@ -0,0 +1,92 @@
+"""Compiled event dispatch for the plugin sandbox audit hook."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from app.plugins import sandbox
+from app.plugins.sandbox import SandboxViolation, plugin_scope, sandbox_stats
+
+# The regexes the rule list was originally written as; the compiled
+# table must resolve every event to the same rules.
+_REGEXES = [
+    r"^socket\.(connect|bind|sendto|recvfrom)$",
+    r"^(http\.client|urllib\.Request|ssl\.wrap_socket)",
+    r"^(subprocess\.Popen|os\.(system|popen|exec|spawn))",
+    r"^open$",
+    r"^os\.(remove|unlink|rename|rmdir|chmod|chown)$",
+    r"^(exec|compile)$",
+    r"^import$",
+    r"^ctypes\.",
+]
+
+_EVENTS = [
+    "socket.connect", "socket.connect_ex", "socket.getaddrinfo", "socket.bind",
+    "http.client.connect", "http.client.send", "urllib.Request", "ssl.wrap_socket",
+    "subprocess.Popen", "os.system", "os.posix_spawn", "os.spawnv", "os.exec",
+    "os.execv", "os.popen", "os.remove", "os.removexattr", "os.rename", "os.listdir",
+    "open", "opened", "exec", "execute", "compile", "import", "ctypes.dlopen",
+    "ctypes", "object.__getattr__", "", "o",
+]
+
+
+def _call(event: str, args: tuple = ()) -> None:
+    sandbox._audit_hook(event, args)
+
+
+def test_rule_table_matches_regex_semantics() -> None:
+    assert len(_REGEXES) == len(sandbox._RULES)
+    for event in _EVENTS:
+        expected = tuple(
+            rule for rule, pattern in zip(sandbox._RULES, _REGEXES)
+            if re.match(pattern, event)
+        )
+        assert sandbox._resolve(event) == expected, event
+
+
+def test_decisions_follow_capabilities() -> None:
+    with plugin_scope("dispatch_allowed", ["network.scan", "fs.write_user_data"]):
+        _call("socket.connect", (None, None))
+        _call("open", ("f", "w", 0))
+        _call("object.__getattr__", (object(), "x"))
+        with pytest.raises(SandboxViolation, match="process.spawn"):
+            _call("os.spawnv", ("/bin/true",))
+        with pytest.raises(SandboxViolation, match="disallowed op"):
+            _call("ctypes.dlopen", ("libc",))
+
+    with plugin_scope("dispatch_denied", []):
+        _call("open", ("f", "rb", 0))
+        _call("import", ("json",))
+        with pytest.raises(SandboxViolation, match="fs.write_user_data"):
+            _call("open", ("f", "a", 0))
+        with pytest.raises(SandboxViolation, match="disallowed op"):
+            _call("import", ("ctypes.util",))
+
+
+def test_decisions_are_memoized_per_plugin() -> None:
+    before = sandbox_stats()
+    for _ in range(3):
+        with plugin_scope("dispatch_memo", ["network.scan"]):
+            _call("socket.bind", (None, None))
+            with pytest.raises(SandboxViolation):
+                _call("os.remove", ("x",))
+    after = sandbox_stats()
+
+    assert after["scoped_events"] - before["scoped_events"] == 6
+    assert after["rule_checks"] - before["rule_checks"] == 6
+    assert after["decision_cache_hits"] - before["decision_cache_hits"] == 4
+    assert after["violations"] - before["violations"] == 3
+
+    # Same name, different capabilities: a separate memo.
+    with plugin_scope("dispatch_memo", ["network.scan", "fs.write_user_data"]):
+        _call("os.remove", ("x",))
+
+
+def test_events_outside_a_scope_are_not_counted() -> None:
+    before = sandbox_stats()
+    _call("os.remove", ("x",))
+    _call("ctypes.dlopen", ("libc",))
+
+    assert sandbox_stats() == before
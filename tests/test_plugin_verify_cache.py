@@ -0,0 +1,188 @@
+"""Cached plugin verification and parallel discovery."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (  # noqa: E402
+    Ed25519PrivateKey,
+)
+
+from app.plugins import signing  # noqa: E402
+from app.plugins.loader import PluginLoader  # noqa: E402
+from app.plugins.signing import (  # noqa: E402
+    PluginSigError,
+    PluginSigState,
+    sign_manifest,
+    verify_plugin_manifest,
+)
+from app.plugins.verify_cache import VerificationCache  # noqa: E402
+
+KEY = b"k" * 32
+
+
+@pytest.fixture
+def keypair(tmp_path):
+    priv = Ed25519PrivateKey.generate()
+    priv_path = tmp_path / "priv.pem"
+    priv_path.write_bytes(priv.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    pub_pem = priv.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+    return str(priv_path), pub_pem
+
+
+def _make_plugin(root: Path, name: str, priv_path: str) -> Path:
+    pdir = root / name
+    pdir.mkdir(parents=True)
+    (pdir / "plugin.py").write_text("VALUE = 1\n" + "#" * 4096 + "\n")
+    (pdir / "manifest.json").write_text(json.dumps({
+        "name": name, "version": "1.0.0", "description": "test",
+        "type": "generic", "entry_point": "plugin.py",
+    }))
+    sign_manifest(priv_path, str(pdir))
+    return pdir / "manifest.json"
+
+
+def _count_work(monkeypatch):
+    """Count entry hashes and Ed25519 key loads from here on."""
+    calls = {"hash": 0, "ed25519": 0}
+    real_hash, real_load = signing._sha384_file, signing._load_ed25519_pubkey
+
+    def _hash(path):
+        calls["hash"] += 1
+        return real_hash(path)
+
+    def _load(pem):
+        calls["ed25519"] += 1
+        return real_load(pem)
+
+    monkeypatch.setattr(signing, "_sha384_file", _hash)
+    monkeypatch.setattr(signing, "_load_ed25519_pubkey", _load)
+    return calls
+
+
+def test_unchanged_plugin_is_not_rehashed_or_reverified(tmp_path, keypair, monkeypatch) -> None:
+    priv, pub = keypair
+    manifest = _make_plugin(tmp_path / "plugins", "alpha", priv)
+    counters = _count_work(monkeypatch)
+    cache_path = tmp_path / "cache.json"
+
+    first = VerificationCache(cache_path, KEY)
+    verify_plugin_manifest(str(manifest), [pub], cache=first)
+    first.save()
+    assert counters == {"hash": 1, "ed25519": 1}
+
+    second = VerificationCache(cache_path, KEY)
+    result = verify_plugin_manifest(str(manifest), [pub], cache=second)
+
+    assert result.sig_state is PluginSigState.VERIFIED
+    assert counters == {"hash": 1, "ed25519": 1}
+    assert second.hits == 2
+
+
+def test_changed_entry_file_is_rehashed_and_rejected(tmp_path, keypair, monkeypatch) -> None:
+    priv, pub = keypair
+    manifest = _make_plugin(tmp_path / "plugins", "alpha", priv)
+    counters = _count_work(monkeypatch)
+    cache = VerificationCache(tmp_path / "cache.json", KEY)
+    verify_plugin_manifest(str(manifest), [pub], cache=cache)
+
+    entry = manifest.parent / "plugin.py"
+    st = os.stat(entry)
+    entry.write_text("VALUE = 2\n" + "#" * 4096 + "\n")
+    os.utime(entry, ns=(st.st_atime_ns, st.st_mtime_ns))  # same size and mtime
+
+    with pytest.raises(PluginSigError, match="hash mismatch"):
+        verify_plugin_manifest(str(manifest), [pub], cache=cache)
+    assert counters["hash"] == 2
+
+
+def test_forged_cache_record_is_ignored(tmp_path, keypair, monkeypatch) -> None:
+    priv, pub = keypair
+    manifest = _make_plugin(tmp_path / "plugins", "alpha", priv)
+    counters = _count_work(monkeypatch)
+    cache_path = tmp_path / "cache.json"
+    cache = VerificationCache(cache_path, KEY)
+    verify_plugin_manifest(str(manifest), [pub], cache=cache)
+    cache.save()
+
+    raw = json.loads(cache_path.read_text())
+    for record in raw["records"].values():
+        record["digest"] = "0" * 96
+    cache_path.write_text(json.dumps(raw))
+
+    forged = VerificationCache(cache_path, KEY)
+    verify_plugin_manifest(str(manifest), [pub], cache=forged)
+    assert forged.hits == 0
+    assert counters == {"hash": 2, "ed25519": 2}
+
+    other_key = VerificationCache(cache_path, b"x" * 32)
+    verify_plugin_manifest(str(manifest), [pub], cache=other_key)
+    assert other_key.hits == 0
+
+
+def test_pinned_key_change_invalidates_records(tmp_path, keypair, monkeypatch) -> None:
+    priv, pub = keypair
+    manifest = _make_plugin(tmp_path / "plugins", "alpha", priv)
+    counters = _count_work(monkeypatch)
+    cache = VerificationCache(tmp_path / "cache.json", KEY)
+    verify_plugin_manifest(str(manifest), [pub], cache=cache)
+
+    extra = Ed25519PrivateKey.generate().public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+    verify_plugin_manifest(str(manifest), [pub, extra], cache=cache)
+
+    assert counters == {"hash": 2, "ed25519": 2}
+
+
+def test_disabled_cache_verifies_everything(tmp_path, keypair, monkeypatch) -> None:
+    priv, pub = keypair
+    manifest = _make_plugin(tmp_path / "plugins", "alpha", priv)
+    counters = _count_work(monkeypatch)
+    cache = VerificationCache(None, None)
+
+    for _ in range(2):
+        verify_plugin_manifest(str(manifest), [pub], cache=cache)
+    cache.save()
+
+    assert not cache.enabled
+    assert counters == {"hash": 2, "ed25519": 2}
+
+
+def test_background_discovery_feeds_discover(tmp_path, keypair, monkeypatch) -> None:
+    priv, pub = keypair
+    monkeypatch.setattr(signing, "TRUSTED_PUBKEYS_PEM", [pub])
+    plugins = tmp_path / "plugins"
+    for name in ("gamma", "alpha", "beta"):
+        _make_plugin(plugins, name, priv)
+    (plugins / "no_manifest").mkdir()
+
+    cache = VerificationCache(tmp_path / "cache.json", KEY)
+    loader = PluginLoader(str(plugins), verify_cache=cache)
+    future = loader.start_discovery()
+    assert loader.start_discovery() is future
+
+    found = loader.discover()
+
+    assert [m.name for m in found] == ["alpha", "beta", "gamma"]
+    assert set(loader.manifests) == {"alpha", "beta", "gamma"}
+    assert (tmp_path / "cache.json").is_file()
+
+    again = PluginLoader(str(plugins), verify_cache=VerificationCache(tmp_path / "cache.json", KEY))
+    again.discover()
+    assert again._verify_cache.hits == 6
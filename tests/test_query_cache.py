@@ -0,0 +1,191 @@
+"""System-query cache: TTL reuse, single-flight, invalidation, audit."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pytest
+
+from app.core import query_cache, safe_subprocess
+from app.core.query_cache import SubprocessQueryCache
+from app.core.safe_subprocess import SafeSubprocessError, SubprocessResult
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeRun:
+    """Stands in for safe_subprocess.run; counts real spawns."""
+
+    def __init__(self, delay: float = 0.0, returncode: int = 0) -> None:
+        self.delay, self.returncode = delay, returncode
+        self.calls = []
+        self.error = None
+
+    def __call__(self, argv, **kwargs):
+        self.calls.append((tuple(argv), kwargs["intent"]))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return SubprocessResult(
+            argv=tuple(argv), returncode=self.returncode,
+            stdout=f"out {len(self.calls)}", stderr="", duration_s=self.delay,
+            timed_out=False,
+        )
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    fake = _FakeRun()
+    monkeypatch.setattr(safe_subprocess, "run", fake)
+    return fake
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+def test_results_are_reused_for_the_intent_ttl(fake_run, clock) -> None:
+    cache = SubprocessQueryCache(ttls={"q.arp": 2.0}, clock=clock)
+
+    first = cache.run(["/bin/arp", "-a"], intent="q.arp")
+    clock.now += 1.5
+    assert cache.run(["/bin/arp", "-a"], intent="q.arp") is first
+    # Different argv or intent is a different entry; max_age can demand fresher.
+    cache.run(["/bin/arp", "-n"], intent="q.arp")
+    cache.run(["/bin/arp", "-a"], intent="q.arp", max_age=1.0)
+    clock.now += 2.0
+    cache.run(["/bin/arp", "-a"], intent="q.arp")
+    # Unlisted intents are never reused.
+    cache.run(["/bin/ping"], intent="q.ping")
+    cache.run(["/bin/ping"], intent="q.ping")
+
+    assert len(fake_run.calls) == 6
+    stats = cache.stats()
+    assert (stats["spawns"], stats["hits"], stats["saved"]) == (6, 1, 1)
+    assert stats["saved_by_intent"] == {"q.arp": 1}
+
+
+def test_concurrent_identical_queries_share_one_spawn(fake_run) -> None:
+    fake_run.delay = 0.2
+    cache = SubprocessQueryCache(ttls={})
+    results = []
+
+    def ask():
+        results.append(cache.run(["/usr/bin/netsh", "show"], intent="q.netsh"))
+
+    threads = [threading.Thread(target=ask) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fake_run.calls) == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    assert cache.stats()["coalesced"] == 4
+    # TTL 0: coalesced only, the next call spawns again.
+    cache.run(["/usr/bin/netsh", "show"], intent="q.netsh")
+    assert len(fake_run.calls) == 2
+
+
+def test_failures_reach_waiters_and_are_not_cached(fake_run) -> None:
+    fake_run.delay = 0.2
+    fake_run.error = SafeSubprocessError("timed out")
+    cache = SubprocessQueryCache(ttls={"q": 60.0})
+    errors = []
+
+    def ask():
+        try:
+            cache.run(["/bin/q"], intent="q")
+        except SafeSubprocessError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=ask) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(errors) == 3 and len(fake_run.calls) == 1
+
+    fake_run.error, fake_run.delay = None, 0.0
+    assert cache.run(["/bin/q"], intent="q").stdout == "out 2"
+
+
+def test_each_caller_checks_its_own_returncode(fake_run) -> None:
+    fake_run.returncode = 1
+    cache = SubprocessQueryCache(ttls={"q": 60.0})
+
+    assert cache.run(["/bin/q"], intent="q", expect_returncode=None).returncode == 1
+    with pytest.raises(SafeSubprocessError, match="rc=1"):
+        cache.run(["/bin/q"], intent="q")
+    assert len(fake_run.calls) == 1
+
+
+def test_invalidation_drops_stored_and_in_flight_answers(fake_run) -> None:
+    cache = SubprocessQueryCache(ttls={"q.rules": 60.0, "q.other": 60.0})
+    cache.run(["/bin/rules"], intent="q.rules")
+    cache.run(["/bin/other"], intent="q.other")
+
+    cache.invalidate("q.rules")
+    cache.run(["/bin/rules"], intent="q.rules")
+    cache.run(["/bin/other"], intent="q.other")
+    assert len(fake_run.calls) == 3
+
+    # A rule change that lands while a query is running: the answer goes
+    # to its caller but is not kept.
+    fake_run.delay = 0.2
+    cache.invalidate("q.rules")
+    worker = threading.Thread(target=cache.run, args=(["/bin/rules"],),
+                              kwargs={"intent": "q.rules"})
+    worker.start()
+    time.sleep(0.05)
+    cache.invalidate("q.rules")
+    worker.join()
+    fake_run.delay = 0.0
+    cache.run(["/bin/rules"], intent="q.rules")
+    assert len(fake_run.calls) == 5
+
+
+def test_audit_trail_separates_spawns_from_hits(monkeypatch) -> None:
+    events = []
+    monkeypatch.setattr(safe_subprocess, "_audit", lambda e, p: events.append((e, p)))
+    cache = SubprocessQueryCache(ttls={"q.python": 60.0})
+    argv = [sys.executable, "-c", "print('hi')"]
+
+    for _ in range(3):
+        assert cache.run(argv, intent="q.python", trusted_executable=True,
+                         timeout=30).stdout.strip() == "hi"
+
+    kinds = [e for e, _ in events]
+    assert kinds == ["subprocess_spawn", "subprocess_exit",
+                     "subprocess_cache_hit", "subprocess_cache_hit"]
+    assert events[-1][1]["intent"] == "q.python" and not events[-1][1]["coalesced"]
+
+
+def test_firewall_rule_changes_invalidate_rule_queries(fake_run, monkeypatch) -> None:
+    from app.firewall import blocker
+    from app.firewall_helper import feature_flag
+
+    monkeypatch.setattr(feature_flag, "is_split_mode", lambda: False)
+    monkeypatch.setattr("platform.system", lambda: "Windows")
+    monkeypatch.setattr(blocker, "_resolve_netsh", lambda: r"C:\Windows\System32\netsh.exe")
+
+    hits_before = query_cache.get_query_cache().stats()["hits"]
+    blocker.get_blocked_ips()
+    blocker.get_blocked_ips()
+    assert len(fake_run.calls) == 1
+
+    blocker._netsh("add", "rule", "name=DupeZBlock_10.0.0.5_In", intent="blocker.add")
+    blocker.get_blocked_ips()
+    assert [intent for _, intent in fake_run.calls] == [
+        "blocker.list_blocked_ips", "blocker.add", "blocker.list_blocked_ips",
+    ]
+    assert query_cache.get_query_cache().stats()["hits"] - hits_before == 1
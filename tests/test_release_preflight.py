@@ -31,6 +31,9 @@ def test_release_data_manifest_is_valid_and_explicit() -> None:
     assert errors == []
     assert "app.config.settings.json" in names
     assert "app.resources.dupez.ico" in names
+    # Loaded at runtime by app.network.oui_db; a frozen build without it
+    # silently falls back to scapy's vendor table.
+    assert "app.resources.oui.bin" in names
     assert not any("__pycache__" in name for name in names)
     assert not any(name.endswith(".py") for name in names)
     assert not any(name.endswith(".hmac") for name in names)
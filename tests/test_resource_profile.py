@@ -88,3 +88,23 @@ def test_summary_contains_only_aggregate_capacity_data() -> None:
     assert "memory=8.0 GiB" in summary
     assert "available=3.0 GiB" in summary
     assert "low_resource=True" in summary
+
+
+def test_view_laziness_defaults_and_overrides() -> None:
+    capable = detect_startup_resource_profile(
+        cpu_count=8,
+        total_memory_bytes=32 * _GIB,
+        available_memory_bytes=16 * _GIB,
+        environ={},
+    )
+    constrained = detect_startup_resource_profile(
+        cpu_count=2,
+        total_memory_bytes=4 * _GIB,
+        available_memory_bytes=1 * _GIB,
+        environ={"DUPEZ_LAZY_VIEWS": "0"},
+    )
+
+    assert capable.lazy_views is True
+    assert capable.prewarm_views is True
+    assert constrained.lazy_views is False
+    assert constrained.prewarm_views is False
@@ -0,0 +1,229 @@
+"""Pooled keep-alive HTTPS client and conditional cache, against a local TLS server."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import ssl
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+
+from app.core import cert_pinning, secure_http  # noqa: E402
+from app.core.cert_pinning import PinViolation  # noqa: E402
+
+RELEASE = json.dumps({"tag_name": "v99.0.0"}).encode()
+
+
+def _self_signed(tmp_path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM)
+    (tmp_path / "cert.pem").write_bytes(cert_pem)
+    (tmp_path / "key.pem").write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    return cert, cert_pem.decode()
+
+
+class _TlsStandIn:
+    def __init__(self, tmp_path) -> None:
+        self.cert, self.cert_pem = _self_signed(tmp_path)
+        self.connections = 0
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                stand_in.connections += 1
+                super().setup()
+
+            def _send(self, status, body=b"", headers=()):
+                self.send_response(status)
+                for k, v in headers:
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                stand_in.requests.append((self.path, dict(self.headers)))
+                if self.path == "/release.json":
+                    if self.headers.get("If-None-Match") == '"r1"':
+                        self._send(304, headers=[("ETag", '"r1"')])
+                    else:
+                        self._send(200, RELEASE, [("ETag", '"r1"')])
+                elif self.path == "/hangup":
+                    # Keep-alive response, then drop the idle connection.
+                    self._send(200, b"ok")
+                    self.close_connection = True
+                elif self.path == "/big":
+                    self._send(200, b"x" * 200_000)
+                elif self.path == "/moved":
+                    self._send(302, headers=[("Location", "/release.json")])
+                else:
+                    self._send(404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                stand_in.requests.append((self.path, self.rfile.read(length)))
+                if self.path == "/drop":
+                    # Acted on the request, then lost the connection.
+                    self.close_connection = True
+                    return
+                self._send(200, b"posted")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(tmp_path / "cert.pem", tmp_path / "key.pem")
+        self.server.socket = ctx.wrap_socket(self.server.socket, server_side=True)
+        self.base = f"https://localhost:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    stand_in = _TlsStandIn(tmp_path)
+    ctx = secure_http._create_tls_context()
+    ctx.load_verify_locations(cadata=stand_in.cert_pem)
+    monkeypatch.setattr(secure_http, "_tls_context", ctx)
+    # validate_url rejects loopback by design; the stand-in lives there.
+    monkeypatch.setattr(secure_http, "validate_url", lambda url, **kw: url)
+    monkeypatch.setattr(secure_http, "_pool", secure_http._ConnectionPool())
+    yield stand_in
+    secure_http._pool.close_all()
+    stand_in.close()
+
+
+def test_back_to_back_gets_share_one_tls_connection(server) -> None:
+    for _ in range(3):
+        assert secure_http.secure_get(server.base + "/release.json") == RELEASE
+
+    assert server.connections == 1
+    assert secure_http.pool_stats()["reused"] == 2
+
+
+def test_idle_connections_are_evicted(server, monkeypatch) -> None:
+    monkeypatch.setattr(secure_http, "_pool", secure_http._ConnectionPool(idle_timeout=0))
+
+    secure_http.secure_get(server.base + "/release.json")
+    secure_http.secure_get(server.base + "/release.json")
+
+    assert server.connections == 2
+    assert secure_http.pool_stats()["evicted"] >= 1
+
+
+def test_get_on_connection_closed_by_server_is_retried(server) -> None:
+    assert secure_http.secure_get(server.base + "/hangup") == b"ok"
+    assert secure_http.secure_get(server.base + "/release.json") == RELEASE
+    assert server.connections == 2
+
+
+def test_post_on_connection_closed_by_server_is_never_sent_twice(server) -> None:
+    assert secure_http.secure_get(server.base + "/hangup") == b"ok"
+
+    # Whether the stale connection fails on the send (resent on a fresh
+    # connection) or on the status line (given up) depends on timing.
+    try:
+        resp = secure_http.secure_request("POST", server.base + "/submit", body=b"payload")
+    except urllib.error.URLError:
+        assert server.requests[-1][0] == "/hangup"
+    else:
+        assert resp.body == b"posted"
+        assert [r for r in server.requests if r[0] == "/submit"] == [("/submit", b"payload")]
+
+
+def test_post_dropped_after_sending_is_sent_exactly_once(server) -> None:
+    assert secure_http.secure_get(server.base + "/release.json") == RELEASE
+
+    with pytest.raises(urllib.error.URLError):
+        secure_http.secure_request("POST", server.base + "/drop", body=b"event")
+
+    assert [r for r in server.requests if r[0] == "/drop"] == [("/drop", b"event")]
+    assert server.connections == 1
+
+
+def test_only_idempotent_methods_retry_once_the_request_is_out() -> None:
+    assert secure_http._may_retry_stale("POST", sent=False)
+    assert not secure_http._may_retry_stale("POST", sent=True)
+    assert secure_http._may_retry_stale("GET", sent=True)
+    assert secure_http._may_retry_stale("HEAD", sent=True)
+
+
+def test_pool_idle_timeout_stays_under_server_keep_alive() -> None:
+    assert secure_http._ConnectionPool().idle_timeout <= 15.0
+
+
+def test_size_cap_is_enforced_while_streaming(server) -> None:
+    with pytest.raises(ValueError, match="max size"):
+        secure_http.secure_request("GET", server.base + "/big", max_bytes=50_000)
+
+    assert secure_http.pool_stats()["idle"] == 0
+
+
+def test_redirects_are_followed_and_errors_raise(server) -> None:
+    import urllib.error
+
+    assert secure_http.secure_get(server.base + "/moved") == RELEASE
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        secure_http.secure_get(server.base + "/missing")
+    assert exc.value.code == 404
+
+
+def test_unchanged_resource_costs_a_304(server, tmp_path, monkeypatch) -> None:
+    cache = secure_http._HttpCache(tmp_path / "http", b"k" * 32)
+    monkeypatch.setattr(secure_http, "_http_cache", cache)
+    url = server.base + "/release.json"
+
+    assert secure_http.secure_get_json(url, use_cache=True) == {"tag_name": "v99.0.0"}
+    assert secure_http.secure_get_json(url, use_cache=True) == {"tag_name": "v99.0.0"}
+    assert [h.get("If-None-Match") for _, h in server.requests] == [None, '"r1"']
+
+    (entry,) = (tmp_path / "http").glob("*.json")
+    raw = json.loads(entry.read_text())
+    raw["body"] = "e30="  # "{}"
+    entry.write_text(json.dumps(raw))
+    assert secure_http.secure_get_json(url, use_cache=True) == {"tag_name": "v99.0.0"}
+    assert server.requests[-1][1].get("If-None-Match") is None
+
+
+def test_pinned_host_is_checked_on_new_connections(server, monkeypatch) -> None:
+    pin = cert_pinning.spki_hash(server.cert.public_bytes(serialization.Encoding.DER))
+    monkeypatch.setitem(cert_pinning.PINS, "localhost", frozenset({"00" * 32}))
+
+    with pytest.raises(PinViolation):
+        secure_http.secure_get(server.base + "/release.json")
+
+    monkeypatch.setitem(cert_pinning.PINS, "localhost", frozenset({pin}))
+    assert secure_http.secure_get(server.base + "/release.json") == RELEASE
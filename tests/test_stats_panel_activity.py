@@ -54,12 +54,14 @@ def test_device_banner_surfaces_actual_engine_and_arp_state() -> None:
 
 
 def test_stop_refresh_invalidates_late_worker_generation() -> None:
+    closed = []
     panel = SimpleNamespace(
         _stats_generation=4,
-        _stats_in_flight=True,
+        _stats_subscription=SimpleNamespace(close=lambda: closed.append(1)),
     )
 
     StatsPanel.stop_refresh(panel)
 
     assert panel._stats_generation == 5
-    assert panel._stats_in_flight is False
+    assert panel._stats_subscription is None
+    assert closed == [1]
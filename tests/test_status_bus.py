@@ -0,0 +1,294 @@
+"""Tests for the push-based controller status bus."""
+
+from __future__ import annotations
+
+import json
+import threading
+from types import MappingProxyType
+
+import pytest
+
+from app.core.overlay_server import build_state_snapshot
+from app.core.status_bus import (
+    FIELD_DEVICE_COUNT,
+    FIELD_DISRUPTED,
+    FIELD_ENGINE_STATS,
+    FIELD_ENGINE_STATUS,
+    FIELD_OPERATIONS,
+    StatusBus,
+    get_status_bus,
+    thaw,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Controller:
+    def __init__(self) -> None:
+        self.calls = {
+            "status": 0, "disrupted": 0, "devices": 0, "stats": 0, "ops": 0,
+        }
+        self.disrupted = ["192.0.2.10"]
+        self.packets = 0
+        self.status_error = None
+
+    def get_clumsy_status(self):
+        self.calls["status"] += 1
+        if self.status_error:
+            raise RuntimeError(self.status_error)
+        return {"is_running": True, "disrupted_devices_count": len(self.disrupted)}
+
+    def get_disrupted_devices(self):
+        self.calls["disrupted"] += 1
+        return list(self.disrupted)
+
+    def get_devices(self):
+        self.calls["devices"] += 1
+        return [object(), object()]
+
+    def get_engine_stats(self):
+        self.calls["stats"] += 1
+        return {"packets_processed": self.packets, "per_device": {}}
+
+    def get_active_operations(self, *, detail=False):
+        self.calls["ops"] += 1
+        return []
+
+
+def _bus(controller=None):
+    clock = _Clock()
+    controller = controller or _Controller()
+    bus = StatusBus.for_controller(controller, clock=clock)
+    # Drive the sampler synchronously through tick(); never start the thread.
+    bus.start = lambda: None
+    return bus, controller, clock
+
+
+def test_only_subscribed_fields_are_sampled_and_shared() -> None:
+    bus, controller, _clock = _bus()
+    seen_a, seen_b = [], []
+    bus.subscribe(seen_a.append, (FIELD_DISRUPTED,))
+    bus.subscribe(seen_b.append, (FIELD_DISRUPTED, FIELD_DEVICE_COUNT))
+
+    bus.tick()
+
+    assert controller.calls["disrupted"] == 1
+    assert controller.calls["devices"] == 1
+    assert controller.calls["status"] == 0
+    assert controller.calls["stats"] == 0
+    assert seen_a[0].values[FIELD_DISRUPTED] == ("192.0.2.10",)
+    assert seen_b[0].values[FIELD_DEVICE_COUNT] == 2
+
+
+def test_unchanged_samples_are_coalesced() -> None:
+    bus, controller, clock = _bus()
+    seen = []
+    bus.subscribe(seen.append, (FIELD_DISRUPTED,), max_rate_hz=1.0)
+    bus.tick()
+    version = bus.latest().version
+
+    for _ in range(5):
+        clock.now += 1.0
+        bus.tick()
+
+    assert controller.calls["disrupted"] == 6
+    assert len(seen) == 1
+    assert bus.latest().version == version
+    assert bus.stats()["coalesced"] == 5
+
+
+def test_max_rate_defers_changes_until_the_window_opens() -> None:
+    bus, controller, clock = _bus()
+    fast, slow = [], []
+    bus.subscribe(fast.append, (FIELD_ENGINE_STATS,), max_rate_hz=10.0)
+    bus.subscribe(slow.append, (FIELD_ENGINE_STATS,), max_rate_hz=1.0)
+    bus.tick()
+
+    controller.packets = 5
+    clock.now += 0.1
+    delay = bus.tick()
+
+    assert [u.values[FIELD_ENGINE_STATS]["packets_processed"] for u in fast] == [0, 5]
+    assert len(slow) == 1
+    assert delay is not None and delay <= 0.1
+
+    clock.now += 0.9
+    bus.tick()
+
+    assert slow[-1].values[FIELD_ENGINE_STATS]["packets_processed"] == 5
+    assert len(slow) == 2
+
+
+def test_delta_subscribers_receive_only_changed_fields() -> None:
+    bus, controller, clock = _bus()
+    full, delta = [], []
+    fields = (FIELD_DISRUPTED, FIELD_ENGINE_STATS)
+    bus.subscribe(full.append, fields)
+    bus.subscribe(delta.append, fields, deltas=True)
+    bus.tick()
+
+    controller.packets = 9
+    clock.now += 1.0
+    bus.tick()
+
+    assert set(full[-1].values) == set(fields)
+    assert set(delta[-1].values) == {FIELD_ENGINE_STATS}
+    assert delta[-1].changed == frozenset({FIELD_ENGINE_STATS})
+
+
+def test_disrupted_is_derived_from_engine_status_when_available() -> None:
+    controller = _Controller()
+    original = controller.get_clumsy_status
+
+    def status_with_devices():
+        status = original()
+        status["disrupted_devices"] = list(controller.disrupted)
+        return status
+
+    controller.get_clumsy_status = status_with_devices
+    bus, controller, _clock = _bus(controller)
+    seen = []
+    bus.subscribe(seen.append, (FIELD_ENGINE_STATUS, FIELD_DISRUPTED))
+
+    bus.tick()
+
+    assert controller.calls["status"] == 1
+    assert controller.calls["disrupted"] == 0
+    assert seen[0].values[FIELD_DISRUPTED] == ("192.0.2.10",)
+
+
+def test_fetch_errors_keep_last_value_and_clear_on_recovery() -> None:
+    bus, controller, clock = _bus()
+    seen = []
+    bus.subscribe(seen.append, (FIELD_ENGINE_STATUS,))
+    bus.tick()
+
+    controller.status_error = "pipe closed"
+    clock.now += 1.0
+    bus.tick()
+
+    assert "pipe closed" in seen[-1].errors[FIELD_ENGINE_STATUS]
+    assert seen[-1].values[FIELD_ENGINE_STATUS]["is_running"] is True
+
+    controller.status_error = None
+    clock.now += 1.0
+    bus.tick()
+
+    assert dict(seen[-1].errors) == {}
+
+
+def test_request_refresh_bypasses_the_interval() -> None:
+    bus, controller, clock = _bus()
+    seen = []
+    bus.subscribe(seen.append, (FIELD_DISRUPTED,), max_rate_hz=0.5)
+    bus.tick()
+
+    controller.disrupted = []
+    clock.now += 0.2
+    bus.tick()
+    assert len(seen) == 1
+
+    bus.request_refresh((FIELD_DISRUPTED,))
+    bus.tick()
+
+    assert controller.calls["disrupted"] == 2
+    assert seen[-1].values[FIELD_DISRUPTED] == ()
+
+
+def test_snapshots_are_immutable_and_thaw_to_plain_containers() -> None:
+    bus, _controller, _clock = _bus()
+    bus.subscribe(lambda _u: None, (FIELD_ENGINE_STATS,))
+    bus.tick()
+
+    stats = bus.latest().get(FIELD_ENGINE_STATS)
+
+    assert isinstance(stats, MappingProxyType)
+    with pytest.raises(TypeError):
+        stats["packets_processed"] = 1  # type: ignore[index]
+    plain = thaw(stats)
+    assert isinstance(plain, dict) and isinstance(plain["per_device"], dict)
+
+
+def test_unsubscribed_fields_stop_being_sampled() -> None:
+    bus, controller, clock = _bus()
+    sub = bus.subscribe(lambda _u: None, (FIELD_ENGINE_STATS,))
+    bus.tick()
+    sub.close()
+
+    clock.now += 5.0
+    assert bus.tick() is None
+    assert controller.calls["stats"] == 1
+
+
+def test_unknown_field_is_rejected() -> None:
+    bus, _controller, _clock = _bus()
+    with pytest.raises(KeyError):
+        bus.subscribe(lambda _u: None, ("no_such_field",))
+
+
+def test_sampler_thread_pushes_and_stops() -> None:
+    controller = _Controller()
+    bus = StatusBus.for_controller(controller)
+    try:
+        got = threading.Event()
+        bus.subscribe(lambda _u: got.set(), (FIELD_DISRUPTED,), max_rate_hz=20)
+        assert got.wait(2.0)
+    finally:
+        bus.stop()
+    calls = controller.calls["disrupted"]
+    bus.request_refresh()
+    assert controller.calls["disrupted"] == calls
+
+
+def test_get_status_bus_ignores_foreign_attributes() -> None:
+    class _Stub:
+        status_bus = object()
+
+    assert get_status_bus(_Stub()) is None
+    assert get_status_bus(None) is None
+
+
+def test_overlay_renders_from_bus_snapshot_without_controller_calls() -> None:
+    controller = _Controller()
+    # Two targets in one /24 mask to the same string; stats must still
+    # be joined to the right one.
+    controller.get_active_operations = lambda *, detail=False: [
+        {"target": "192.0.2.x", "methods": ["drop"], "started_at": 50.0,
+         **({"ip": "192.0.2.10", "preset": "God Mode"} if detail else {})},
+        {"target": "192.0.2.x", "methods": ["lag"], "started_at": 60.0,
+         **({"ip": "192.0.2.20", "preset": None} if detail else {})},
+    ]
+    controller.get_engine_stats = lambda: {
+        "per_device": {
+            "192.0.2.10": {
+                "cut_state": "severed",
+                "packets_processed": 7,
+                "packets_dropped": 3,
+            },
+            "192.0.2.20": {
+                "cut_state": "open",
+                "packets_processed": 90,
+                "packets_dropped": 0,
+            },
+        },
+    }
+    bus, _controller, _clock = _bus(controller)
+    bus.subscribe(lambda _u: None, (FIELD_OPERATIONS, FIELD_ENGINE_STATS))
+    bus.tick()
+
+    snap = build_state_snapshot(object(), bus.latest())
+
+    assert len(snap["active_targets"]) == 2
+    by_method = {t["methods"][0]: t for t in snap["active_targets"]}
+    drop, lag = by_method["drop"], by_method["lag"]
+    assert drop["target_ip"] == lag["target_ip"] == "192.0.2.x"
+    assert (drop["preset"], drop["cut_state"], drop["packets_processed"]) == (
+        "God Mode", "severed", 7)
+    assert (lag["preset"], lag["cut_state"], lag["packets_processed"]) == ("?", "open", 90)
+    assert "192.0.2.10" not in json.dumps(snap)
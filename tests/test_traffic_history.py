@@ -0,0 +1,175 @@
+"""Tests for multi-resolution traffic history and the traffic monitor table."""
+
+from __future__ import annotations
+
+import os
+import socket
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from app.network.traffic_history import (
+    MultiResolutionSeries,
+    RingBuffer,
+    TrafficSampler,
+    downsample,
+)
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.nics = {"eth0": [0, 0]}
+
+    def clock(self) -> float:
+        return self.now
+
+    def read(self):
+        return {
+            name: SimpleNamespace(bytes_sent=sent, bytes_recv=recv)
+            for name, (sent, recv) in self.nics.items()
+        }
+
+    def step(self, seconds: float, sent: int = 0, recv: int = 0, nic: str = "eth0") -> None:
+        self.now += seconds
+        self.nics[nic][0] += sent
+        self.nics[nic][1] += recv
+
+
+def _sampler(counters: _Counters) -> TrafficSampler:
+    return TrafficSampler(reader=counters.read, clock=counters.clock)
+
+
+def test_ring_buffer_wraps_oldest_first() -> None:
+    ring = RingBuffer(3)
+    for value in (1.0, 2.0, 3.0, 4.0, 5.0):
+        ring.append(value)
+
+    assert ring.values() == [3.0, 4.0, 5.0]
+    assert ring.values(2) == [4.0, 5.0]
+    assert len(ring) == 3
+
+
+def test_coarse_tiers_hold_time_weighted_bucket_means() -> None:
+    series = MultiResolutionSeries({"1s": (1.0, 10), "10s": (10.0, 4)})
+    for t in range(1, 21):
+        series.add(float(t), 100.0 if t <= 10 else 300.0, 1.0)
+
+    # t=1..9 fall in bucket 0, t=10..19 in bucket 1, t=20 opens bucket 2.
+    assert series.values("10s") == [100.0, pytest.approx(280.0), 300.0]
+    assert len(series.values("1s")) == 10
+
+
+def test_sampling_gap_fills_missed_buckets_with_gap_average() -> None:
+    series = MultiResolutionSeries({"1s": (1.0, 10)})
+    series.add(1.0, 10.0, 1.0)
+    series.add(5.0, 40.0, 4.0)
+
+    assert series.values("1s") == [10.0, 40.0, 40.0, 40.0, 40.0]
+
+
+def test_rates_use_measured_elapsed_time() -> None:
+    counters = _Counters()
+    sampler = _sampler(counters)
+    sampler.sample()
+
+    counters.step(2.5, sent=5000, recv=20000)
+    sampler.sample()
+
+    rates = sampler.latest()["eth0"]
+    assert rates.sent_rate == pytest.approx(2000.0)
+    assert rates.recv_rate == pytest.approx(8000.0)
+
+
+def test_counter_reset_and_back_to_back_reads_do_not_spike() -> None:
+    counters = _Counters()
+    counters.nics["eth0"] = [10_000_000, 10_000_000]
+    sampler = _sampler(counters)
+    sampler.sample()
+
+    counters.step(0.01, sent=4096)
+    sampler.sample()  # too close to the baseline: ignored
+    assert sampler.latest()["eth0"].sent_rate == 0.0
+
+    counters.now += 1.0
+    counters.nics["eth0"] = [100, 100]  # adapter re-enabled
+    sampler.sample()
+    assert sampler.latest()["eth0"].total_rate == 0.0
+
+    counters.step(1.0, sent=1024)
+    sampler.sample()
+    assert sampler.latest()["eth0"].sent_rate == pytest.approx(1024.0)
+
+
+def test_removed_interfaces_are_dropped_and_totals_align() -> None:
+    counters = _Counters()
+    sampler = _sampler(counters)
+    sampler.sample()
+    counters.step(1.0, sent=100)
+    sampler.sample()
+    counters.nics["wlan0"] = [0, 0]
+    counters.step(1.0, sent=100)
+    sampler.sample()
+    counters.step(1.0, sent=100, recv=0)
+    counters.nics["wlan0"][1] += 50
+    sampler.sample()
+
+    assert sampler.total_history(["eth0", "wlan0"], "1s")[-1] == pytest.approx(150.0)
+
+    del counters.nics["wlan0"]
+    counters.step(1.0)
+    sampler.sample()
+    assert set(sampler.latest()) == {"eth0"}
+
+
+def test_downsample_keeps_peaks() -> None:
+    values = [0.0] * 100
+    values[37] = 9.0
+
+    reduced = downsample(values, 10)
+
+    assert len(reduced) == 10
+    assert reduced[3] == 9.0
+    assert downsample([1.0, 2.0], 10) == [1.0, 2.0]
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def test_monitor_updates_cells_in_place(qapp, monkeypatch) -> None:
+    import psutil
+
+    from app.gui.network_tools import TrafficMonitorWidget
+
+    addr = SimpleNamespace(family=socket.AF_INET, address="192.0.2.10")
+    monkeypatch.setattr(psutil, "net_if_addrs", lambda: {"eth0": [addr], "lo": [addr]})
+    counters = _Counters()
+    counters.nics["lo"] = [0, 0]
+    sampler = _sampler(counters)
+    sampler.sample()
+    counters.step(1.0, sent=2048)
+    sampler.sample()
+
+    widget = TrafficMonitorWidget(sampler=sampler)
+    try:
+        widget.cleanup()
+        assert widget.table.rowCount() == 1
+        name_item = widget.table.item(0, 0)
+        assert widget.table.item(0, 4).text() == "2.0"
+
+        counters.step(1.0, sent=4096)
+        sampler.sample()
+        widget._refresh()
+
+        assert widget.table.item(0, 0) is name_item
+        assert widget.table.item(0, 4).text() == "4.0"
+        assert widget.table.item(0, 5).text()
+        assert "peak" in widget.history_label.text()
+    finally:
+        widget.deleteLater()
@@ -0,0 +1,246 @@
+"""Binary delta updates: patch round trip, signed manifest entries, fallback."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import random
+from urllib.error import URLError
+
+import pytest
+
+from app.core import update_delta
+from app.core.update_delta import DeltaError, apply_patch, fetch_via_patch, make_patch
+from app.core.update_verify import (
+    MANIFEST_SCHEMA,
+    SigVerifyError,
+    UpdateManifest,
+    UpdatePatch,
+    verify_manifest,
+)
+
+_rng = random.Random(42)
+OLD = bytes(_rng.getrandbits(8) for _ in range(400_000))
+
+
+def _edited(old: bytes) -> bytes:
+    """A 'next release': inserts, a deletion and an in-place change."""
+    new = bytearray(old)
+    new[50_000:50_000] = b"\x90" * 3000                       # insert
+    del new[150_000:160_000]                                  # delete
+    new[250_000:252_000] = bytes(_rng.getrandbits(8) for _ in range(2000))
+    new += b"tail of the new release" * 100                   # append
+    return bytes(new)
+
+
+NEW = _edited(OLD)
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def files(tmp_path):
+    old, new, patch = tmp_path / "old.exe", tmp_path / "new.exe", tmp_path / "p.dzpatch"
+    old.write_bytes(OLD)
+    new.write_bytes(NEW)
+    return old, new, patch
+
+
+def test_patch_rebuilds_the_new_installer_byte_for_byte(files, tmp_path) -> None:
+    old, new, patch = files
+
+    stats = make_patch(old, new, patch)
+    out = tmp_path / "rebuilt.exe"
+    digest = apply_patch(old, patch, out, expected_sha256=_sha(NEW), expected_size=len(NEW))
+
+    assert out.read_bytes() == NEW
+    assert digest == _sha(NEW)
+    assert stats["copied"] + stats["inserted"] == len(NEW)
+    # Only the ~17 KB that changed travel; the rest is copied locally.
+    assert stats["inserted"] < 20_000
+    assert stats["patch_size"] < len(NEW) // 10
+
+
+def test_unrelated_files_still_round_trip(tmp_path) -> None:
+    old, new, patch, out = (tmp_path / n for n in ("a", "b", "p", "o"))
+    old.write_bytes(b"x" * 10)
+    new.write_bytes(os.urandom(70_000))
+
+    make_patch(old, new, patch)
+    apply_patch(old, patch, out, expected_sha256=_sha(new.read_bytes()),
+                expected_size=70_000)
+
+    assert out.read_bytes() == new.read_bytes()
+
+
+def test_patch_against_the_wrong_source_is_refused(files, tmp_path) -> None:
+    old, new, patch = files
+    make_patch(old, new, patch)
+    wrong = tmp_path / "wrong.exe"
+    wrong.write_bytes(bytes(reversed(OLD)))
+    out = tmp_path / "rebuilt.exe"
+
+    with pytest.raises(DeltaError, match="mismatch"):
+        apply_patch(wrong, patch, out, expected_sha256=_sha(NEW), expected_size=len(NEW))
+    assert not out.exists()
+    assert not (tmp_path / "rebuilt.exe.applying").exists()
+
+
+def test_patch_for_another_release_and_corrupt_patches_are_refused(files, tmp_path) -> None:
+    old, new, patch = files
+    make_patch(old, new, patch)
+    out = tmp_path / "rebuilt.exe"
+
+    with pytest.raises(DeltaError, match="signed installer"):
+        apply_patch(old, patch, out, expected_sha256="0" * 64, expected_size=len(NEW))
+
+    raw = bytearray(patch.read_bytes())
+    raw[-40] ^= 0xFF
+    patch.write_bytes(bytes(raw))
+    with pytest.raises(DeltaError):
+        apply_patch(old, patch, out, expected_sha256=_sha(NEW), expected_size=len(NEW))
+
+    patch.write_bytes(b"MZ not a patch")
+    with pytest.raises(DeltaError, match="not a DupeZ delta"):
+        apply_patch(old, patch, out, expected_sha256=_sha(NEW), expected_size=len(NEW))
+    assert not out.exists()
+
+
+# ── Signed manifest entries ──────────────────────────────────────────
+
+def _signed(doc: dict):
+    crypto = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+    from cryptography.hazmat.primitives import serialization
+
+    from app.core.update_verify import pubkey_fingerprint
+
+    priv = crypto.Ed25519PrivateKey.generate()
+    pub_pem = priv.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    body = json.dumps(doc, sort_keys=True, separators=(",", ":")).encode()
+    return body, pubkey_fingerprint(pub_pem) + priv.sign(body), pub_pem
+
+
+def _doc(**patch_overrides) -> dict:
+    entry = {
+        "from_version": "5.8.0", "from_sha256": _sha(OLD), "from_size": len(OLD),
+        "filename": "DupeZ_Setup.exe.from-5.8.0.dzpatch",
+        "sha256": "ab" * 32, "size": 1234,
+    }
+    entry.update(patch_overrides)
+    return {
+        "schema": MANIFEST_SCHEMA, "version": "5.9.0",
+        "released_at": "2026-01-01T00:00:00Z",
+        "installer": {"filename": "DupeZ_Setup.exe", "sha256": _sha(NEW), "size": len(NEW)},
+        "patches": [entry],
+    }
+
+
+def test_manifest_patches_are_parsed_and_validated() -> None:
+    body, sig, pub = _signed(_doc())
+    (patch,) = verify_manifest(body, sig, trusted_pubkeys_pem=[pub]).patches
+    assert patch == UpdatePatch("5.8.0", _sha(OLD), len(OLD),
+                                "DupeZ_Setup.exe.from-5.8.0.dzpatch", "ab" * 32, 1234)
+
+    for bad in ({"filename": "../evil.dzpatch"}, {"size": True}, {"from_sha256": "xyz"}):
+        body, sig, pub = _signed(_doc(**bad))
+        with pytest.raises(SigVerifyError):
+            verify_manifest(body, sig, trusted_pubkeys_pem=[pub])
+
+
+# ── Updater path ─────────────────────────────────────────────────────
+
+class _Resp(io.BytesIO):
+    status = 200
+
+    def __init__(self, body: bytes) -> None:
+        super().__init__(body)
+        self.headers = {"ETag": '"p1"'}
+
+
+@pytest.fixture
+def release(files, tmp_path, monkeypatch):
+    """A cached 5.8.0 installer and a 5.9.0 manifest with a patch from it."""
+    old, new, patch = files
+    make_patch(old, new, patch)
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(update_delta, "installer_cache_dir", lambda: cache)
+    update_delta.remember_installer(old, UpdateManifest(
+        version="5.8.0", released_at="", installer_filename="DupeZ_Setup.exe",
+        installer_sha256=_sha(OLD), installer_size=len(OLD),
+    ))
+    body = patch.read_bytes()
+    manifest = UpdateManifest(
+        version="5.9.0", released_at="", installer_filename="DupeZ_Setup.exe",
+        installer_sha256=_sha(NEW), installer_size=len(NEW),
+        patches=(UpdatePatch("5.8.0", _sha(OLD), len(OLD), "p.dzpatch",
+                             _sha(body), len(body)),),
+    )
+    return manifest, body
+
+
+def test_update_downloads_only_the_patch(release, tmp_path) -> None:
+    manifest, body = release
+    requested = []
+
+    def opener(req, timeout):
+        requested.append(req.full_url)
+        return _Resp(body)
+
+    dest = tmp_path / "DupeZ_Setup.exe"
+    assert fetch_via_patch("https://example.invalid/v5.9.0/DupeZ_Setup.exe", str(dest),
+                           manifest, opener=opener, sleep=lambda s: None)
+
+    assert dest.read_bytes() == NEW
+    assert requested == ["https://example.invalid/v5.9.0/p.dzpatch"]
+    # Bandwidth: the patch is a small fraction of the installer.
+    assert len(body) * 10 < len(NEW)
+    assert not list(tmp_path.glob("DupeZ_Setup.exe.*"))
+
+
+def test_any_patch_failure_falls_back_to_full_download(release, tmp_path) -> None:
+    manifest, body = release
+    dest = tmp_path / "DupeZ_Setup.exe"
+
+    def tampered(req, timeout):
+        return _Resp(body[:-1] + b"\x00")
+
+    def offline(req, timeout):
+        raise URLError("down")
+
+    for opener in (tampered, offline):
+        assert not fetch_via_patch("https://example.invalid/DupeZ_Setup.exe", str(dest),
+                                   manifest, opener=opener, max_retries=0,
+                                   sleep=lambda s: None)
+        assert not dest.exists()
+
+
+def test_no_cached_source_means_no_patch_request(release, tmp_path, monkeypatch) -> None:
+    manifest, _ = release
+    monkeypatch.setattr(update_delta, "installer_cache_dir", lambda: tmp_path / "empty")
+
+    def opener(req, timeout):
+        raise AssertionError("patch must not be fetched")
+
+    assert not fetch_via_patch("https://example.invalid/DupeZ_Setup.exe",
+                               str(tmp_path / "DupeZ_Setup.exe"), manifest, opener=opener)
+
+
+def test_installer_cache_keeps_the_newest_few(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(update_delta, "installer_cache_dir", lambda: tmp_path / "cache")
+    for i in range(4):
+        src = tmp_path / f"{i}.exe"
+        src.write_bytes(bytes([i]) * 100)
+        update_delta.remember_installer(src, UpdateManifest(
+            version=f"5.{i}.0", released_at="", installer_filename="DupeZ_Setup.exe",
+            installer_sha256=_sha(src.read_bytes()), installer_size=100,
+        ))
+        os.utime(tmp_path / "cache" / f"{_sha(src.read_bytes())}.exe", (i, i))
+
+    kept = sorted(p.name for p in (tmp_path / "cache").glob("*.exe"))
+    assert len(kept) == update_delta.MAX_CACHED_INSTALLERS
@@ -0,0 +1,218 @@
+"""Resumable installer download against a local HTTP stand-in."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+
+import pytest
+
+from app.core import update_download
+from app.core.update_download import download_installer, partial_paths
+from app.core.update_verify import SigVerifyError, UpdateManifest
+
+PAYLOAD = os.urandom(300_000)
+
+
+class _StandIn:
+    """Serves one file with Range support, scripted drops and throttling."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.cut_after = []          # per request: bytes to send before dropping
+        self.ignore_range = False
+        self.throttle_bps = 0
+        self.requests = []
+        self.bytes_sent = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in.requests.append(dict(self.headers))
+                start = 0
+                rng = self.headers.get("Range")
+                if rng and not stand_in.ignore_range:
+                    start = int(rng.split("=")[1].split("-")[0])
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range",
+                        f"bytes {start}-{len(stand_in.body) - 1}/{len(stand_in.body)}",
+                    )
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(stand_in.body) - start))
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                data = stand_in.body[start:]
+                cut = stand_in.cut_after.pop(0) if stand_in.cut_after else None
+                if cut is not None:
+                    data = data[:cut]
+                for i in range(0, len(data), 16384):
+                    block = data[i:i + 16384]
+                    self.wfile.write(block)
+                    stand_in.bytes_sent += len(block)
+                    if stand_in.throttle_bps:
+                        time.sleep(len(block) / stand_in.throttle_bps)
+                if cut is not None:
+                    self.wfile.flush()
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    self.close_connection = True
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/DupeZ_Setup.exe"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    stand_in = _StandIn(PAYLOAD)
+    yield stand_in
+    stand_in.close()
+
+
+def _manifest(body: bytes = PAYLOAD, **overrides) -> UpdateManifest:
+    values = dict(
+        version="99.0.0", released_at="2026-01-01T00:00:00Z",
+        installer_filename="DupeZ_Setup.exe",
+        installer_sha256=hashlib.sha256(body).hexdigest(),
+        installer_size=len(body),
+    )
+    values.update(overrides)
+    return UpdateManifest(**values)
+
+
+def _download(server, dest, manifest=None, **kw):
+    kw.setdefault("sleep", lambda s: None)
+    return download_installer(server.url, str(dest), manifest or _manifest(), timeout=5, **kw)
+
+
+def test_download_verifies_while_streaming(server, tmp_path) -> None:
+    dest = tmp_path / "DupeZ_Setup.exe"
+    progress = []
+
+    digest = _download(server, dest, on_progress=progress.append)
+
+    assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+    assert dest.read_bytes() == PAYLOAD
+    assert not any(os.path.exists(p) for p in partial_paths(str(dest)))
+    assert progress[-1].done == progress[-1].total == len(PAYLOAD)
+    assert progress[-1].rate_bps > 0 and progress[-1].eta_sec == 0
+
+
+def test_dropped_connection_resumes_with_range(server, tmp_path) -> None:
+    server.cut_after = [100_000, 50_000]
+    dest = tmp_path / "DupeZ_Setup.exe"
+
+    _download(server, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert [r.get("Range") for r in server.requests] == [
+        None, "bytes=100000-", "bytes=150000-",
+    ]
+    assert server.requests[1]["If-Range"] == '"v1"'
+    assert server.bytes_sent == len(PAYLOAD)
+
+
+def test_partial_from_an_earlier_run_is_resumed(server, tmp_path) -> None:
+    dest = tmp_path / "DupeZ_Setup.exe"
+    part, meta = partial_paths(str(dest))
+    with open(part, "wb") as f:
+        f.write(PAYLOAD[:120_000])
+    with open(meta, "w") as f:
+        json.dump({"sha256": _manifest().installer_sha256, "size": len(PAYLOAD),
+                   "validator": '"v1"'}, f)
+
+    _download(server, dest)
+
+    assert server.requests[0]["Range"] == "bytes=120000-"
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_partial_for_another_manifest_is_discarded(server, tmp_path) -> None:
+    dest = tmp_path / "DupeZ_Setup.exe"
+    part, meta = partial_paths(str(dest))
+    with open(part, "wb") as f:
+        f.write(b"x" * 1000)
+    with open(meta, "w") as f:
+        json.dump({"sha256": "0" * 64, "size": len(PAYLOAD)}, f)
+
+    _download(server, dest)
+
+    assert "Range" not in server.requests[0]
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_server_ignoring_range_restarts_from_zero(server, tmp_path) -> None:
+    server.cut_after = [100_000]
+    server.ignore_range = True
+    dest = tmp_path / "DupeZ_Setup.exe"
+
+    _download(server, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert len(server.requests) == 2
+
+
+def test_hash_mismatch_deletes_partial(server, tmp_path) -> None:
+    dest = tmp_path / "DupeZ_Setup.exe"
+
+    with pytest.raises(SigVerifyError, match="hash mismatch"):
+        _download(server, dest, _manifest(installer_sha256="0" * 64))
+
+    assert not dest.exists()
+    assert not any(os.path.exists(p) for p in partial_paths(str(dest)))
+
+
+def test_stream_longer_than_signed_size_is_refused(server, tmp_path) -> None:
+    dest = tmp_path / "DupeZ_Setup.exe"
+    short = PAYLOAD[:1000]
+
+    with pytest.raises(SigVerifyError, match="exceeded signed size"):
+        _download(server, dest, _manifest(short))
+
+
+def test_retries_give_up_after_consecutive_failures(tmp_path) -> None:
+    calls = []
+
+    def _opener(req, timeout):
+        calls.append(req)
+        raise URLError("down")
+
+    dest = tmp_path / "DupeZ_Setup.exe"
+    with pytest.raises(URLError):
+        download_installer("https://updates.invalid/DupeZ_Setup.exe", str(dest),
+                           _manifest(), opener=_opener, max_retries=2,
+                           sleep=lambda s: None)
+
+    assert len(calls) == 3
+    assert not dest.exists()
+
+
+def test_read_size_follows_throughput(server, tmp_path) -> None:
+    meter = update_download._Throughput()
+    for _ in range(10):
+        meter.update(meter.chunk, 0.01)
+    assert meter.chunk == update_download.MAX_CHUNK
+
+    for _ in range(40):
+        meter.update(meter.chunk, 5.0)
+    assert meter.chunk == update_download.MIN_CHUNK
+
+    server.throttle_bps = 2_000_000
+    progress = []
+    _download(server, tmp_path / "DupeZ_Setup.exe", on_progress=progress.append)
+    mid = [p for p in progress if 0 < p.done < p.total]
+    assert mid and all(p.eta_sec is not None and p.eta_sec > 0 for p in mid)